@@ -11,6 +11,7 @@ Features:
 - Fast in-memory filtering
 - No external dependencies
 - Ideal for temporary layers
+- Columnar NumPy fast path for simple attribute predicates (v4.2.0)
 
 Author: FilterMate Team
 Date: January 2026
@@ -43,13 +44,20 @@ class MemoryBackend(BackendPort):
     # Maximum recommended features for memory backend
     MAX_RECOMMENDED_FEATURES = 50000
 
+    # Minimum features before trying the columnar path (below, the
+    # per-feature loop is already fast enough)
+    VECTORIZED_MIN_FEATURES = 1000
+
     def __init__(self):
         """Initialize Memory backend."""
         self._metrics = {
             'executions': 0,
             'features_processed': 0,
             'total_time_ms': 0.0,
-            'errors': 0
+            'errors': 0,
+            'vectorized_executions': 0,
+            'iterative_executions': 0,
+            'last_path': None
         }
 
         logger.debug("Memory backend initialized")
@@ -69,7 +77,10 @@ class MemoryBackend(BackendPort):
             'executions': 0,
             'features_processed': 0,
             'total_time_ms': 0.0,
-            'errors': 0
+            'errors': 0,
+            'vectorized_executions': 0,
+            'iterative_executions': 0,
+            'last_path': None
         }
 
     def execute(
@@ -129,17 +140,26 @@ class MemoryBackend(BackendPort):
             context.appendScopes(QgsExpressionContextUtils.globalProjectLayerScopes(layer))
             qgs_expr.prepare(context)
 
-            # Memory layers are fast - iterate directly
-            feature_ids: List[int] = []
-            features_processed = 0
+            feature_ids = self._execute_vectorized(qgs_expr, expression, layer_info, layer)
+            if feature_ids is not None:
+                features_processed = layer_info.feature_count
+                self._metrics['vectorized_executions'] += 1
+                self._metrics['last_path'] = 'vectorized'
+            else:
+                # Memory layers are fast - iterate directly
+                feature_ids = []
+                features_processed = 0
+
+                for feature in layer.getFeatures():
+                    context.setFeature(feature)
 
-            for feature in layer.getFeatures():
-                context.setFeature(feature)
+                    if qgs_expr.evaluate(context):
+                        feature_ids.append(feature.id())
 
-                if qgs_expr.evaluate(context):
-                    feature_ids.append(feature.id())
+                    features_processed += 1
 
-                features_processed += 1
+                self._metrics['iterative_executions'] += 1
+                self._metrics['last_path'] = 'iterative'
 
             self._metrics['features_processed'] += features_processed
             execution_time = (time.time() - start_time) * 1000
@@ -171,6 +191,37 @@ class MemoryBackend(BackendPort):
                 backend_name=self.name
             )
 
+    def _execute_vectorized(
+        self,
+        qgs_expr,
+        expression: FilterExpression,
+        layer_info: LayerInfo,
+        layer
+    ) -> Optional[List[int]]:
+        """
+        Try the columnar NumPy path (see columnar.py).
+
+        Returns:
+            List of matching FIDs, or None to use the per-feature loop
+        """
+        if expression.is_spatial or layer_info.feature_count < self.VECTORIZED_MIN_FEATURES:
+            return None
+
+        try:
+            from .columnar import NUMPY_AVAILABLE, UnsupportedExpressionError, evaluate_expression_columnar
+        except ImportError:
+            return None
+        if not NUMPY_AVAILABLE:
+            return None
+
+        try:
+            return evaluate_expression_columnar(layer, qgs_expr).tolist()
+        except UnsupportedExpressionError as e:
+            logger.debug(f"Columnar path not applicable ({e}), using per-feature evaluation")
+        except (OverflowError, TypeError, ValueError) as e:
+            logger.debug(f"Columnar path failed ({e}), using per-feature evaluation")
+        return None
+
     def supports_layer(self, layer_info: LayerInfo) -> bool:
         """Check if backend supports layer."""
         return layer_info.provider_type == ProviderType.MEMORY
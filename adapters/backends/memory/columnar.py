@@ -0,0 +1,435 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar (vectorized) expression evaluation for the Memory backend.
+
+Evaluating a QgsExpression feature by feature is dominated by Python call
+overhead on large memory layers. For simple attribute predicates this
+module instead:
+
+1. Reads only the referenced attributes once (NoGeometry +
+   setSubsetOfAttributes) into NumPy arrays with a null mask per column.
+2. Compiles the expression AST into array operations.
+3. Returns the matching FIDs in bulk.
+
+Supported nodes: AND, OR, NOT, comparisons (=, <>, <, <=, >, >=),
+IN / NOT IN, BETWEEN / NOT BETWEEN, IS [NOT] NULL, LIKE / ILIKE (and NOT),
+column references and literals. Anything else raises
+UnsupportedExpressionError and the caller falls back to the per-feature
+loop. NULL handling follows QGIS three-valued logic.
+
+NumPy is optional: check NUMPY_AVAILABLE before use.
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger('FilterMate.Backend.Memory.Columnar')
+
+
+class UnsupportedExpressionError(Exception):
+    """Expression (or column data) cannot be evaluated on the columnar path."""
+
+
+# =============================================================================
+# QGIS AST enum mapping
+# =============================================================================
+
+_COMPARISONS = ('=', '<>', '<', '<=', '>', '>=')
+_LIKE_OPS = ('LIKE', 'NOT LIKE', 'ILIKE', 'NOT ILIKE')
+
+
+def _load_qgis_enums() -> Tuple[Dict[Any, str], Dict[Any, str], Dict[Any, str]]:
+    """
+    Map QGIS expression node enums to the names used by the compiler.
+
+    Returns:
+        Tuple of (node types, binary operators, unary operators) dicts
+    """
+    from qgis.core import (
+        QgsExpressionNode,
+        QgsExpressionNodeBinaryOperator as Binary,
+        QgsExpressionNodeUnaryOperator as Unary,
+    )
+    node_types = {
+        QgsExpressionNode.ntBinaryOperator: 'binary',
+        QgsExpressionNode.ntUnaryOperator: 'unary',
+        QgsExpressionNode.ntInOperator: 'in',
+        QgsExpressionNode.ntLiteral: 'literal',
+        QgsExpressionNode.ntColumnRef: 'column',
+    }
+    # BETWEEN nodes exist since QGIS 3.26
+    if hasattr(QgsExpressionNode, 'ntBetweenOperator'):
+        node_types[QgsExpressionNode.ntBetweenOperator] = 'between'
+    binary_ops = {
+        Binary.boAnd: 'AND', Binary.boOr: 'OR',
+        Binary.boEQ: '=', Binary.boNE: '<>',
+        Binary.boLT: '<', Binary.boLE: '<=', Binary.boGT: '>', Binary.boGE: '>=',
+        Binary.boIs: 'IS', Binary.boIsNot: 'IS NOT',
+        Binary.boLike: 'LIKE', Binary.boNotLike: 'NOT LIKE',
+        Binary.boILike: 'ILIKE', Binary.boNotILike: 'NOT ILIKE',
+    }
+    unary_ops = {Unary.uoNot: 'NOT', Unary.uoMinus: '-'}
+    return node_types, binary_ops, unary_ops
+
+
+# =============================================================================
+# Column loading
+# =============================================================================
+
+def _is_null(value: Any) -> bool:
+    if value is None:
+        return True
+    is_null = getattr(value, 'isNull', None)
+    return bool(is_null and is_null())
+
+
+def _to_column(values: List[Any]) -> Tuple['np.ndarray', 'np.ndarray']:
+    """
+    Convert raw attribute values to (data, null_mask) arrays.
+
+    Raises:
+        UnsupportedExpressionError: For mixed or non-scalar column types
+    """
+    nulls = np.fromiter((_is_null(v) for v in values), dtype=bool, count=len(values))
+    present = [v for v, n in zip(values, nulls) if not n]
+
+    if all(isinstance(v, bool) for v in present):
+        fill, dtype = False, bool
+    elif all(isinstance(v, int) and not isinstance(v, bool) for v in present):
+        fill, dtype = 0, np.int64
+    elif all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        fill, dtype = 0.0, np.float64
+    elif all(isinstance(v, str) for v in present):
+        fill, dtype = '', object
+    else:
+        raise UnsupportedExpressionError("Column holds non-scalar or mixed-type values")
+
+    data = np.array([fill if n else v for v, n in zip(values, nulls)], dtype=dtype)
+    return data, nulls
+
+
+def load_columns(layer, field_names: List[str]) -> Tuple['np.ndarray', Dict[str, Tuple]]:
+    """
+    Read FIDs and the given attributes in one pass without geometry.
+
+    Args:
+        layer: QgsVectorLayer
+        field_names: Attribute names to read
+
+    Returns:
+        Tuple of (fids int64 array, {name: (data, null_mask)})
+
+    Raises:
+        UnsupportedExpressionError: If a field is missing or not scalar
+    """
+    from qgis.core import QgsFeatureRequest
+
+    fields = layer.fields()
+    indexes = []
+    for name in field_names:
+        idx = fields.lookupField(name)
+        if idx < 0:
+            raise UnsupportedExpressionError(f"Unknown field: {name}")
+        indexes.append(idx)
+
+    request = QgsFeatureRequest()
+    request.setFlags(QgsFeatureRequest.NoGeometry)
+    request.setSubsetOfAttributes(indexes)
+
+    fids: List[int] = []
+    raw: List[List[Any]] = [[] for _ in indexes]
+    for feature in layer.getFeatures(request):
+        fids.append(feature.id())
+        attrs = feature.attributes()
+        for column, idx in zip(raw, indexes):
+            column.append(attrs[idx])
+
+    columns = {name: _to_column(values) for name, values in zip(field_names, raw)}
+    return np.array(fids, dtype=np.int64), columns
+
+
+# =============================================================================
+# Compiler
+# =============================================================================
+
+def _like_to_regex(pattern: str, case_insensitive: bool):
+    parts = []
+    for char in pattern:
+        if char == '%':
+            parts.append('.*')
+        elif char == '_':
+            parts.append('.')
+        else:
+            parts.append(re.escape(char))
+    return re.compile(''.join(parts) + r'\Z', re.DOTALL | (re.IGNORECASE if case_insensitive else 0))
+
+
+def _and3(left, right):
+    """Three-valued AND of (is_true, is_null) pairs."""
+    is_true = left[0] & right[0]
+    is_false = (~left[0] & ~left[1]) | (~right[0] & ~right[1])
+    return is_true, ~is_true & ~is_false
+
+
+def _or3(left, right):
+    """Three-valued OR of (is_true, is_null) pairs."""
+    is_true = left[0] | right[0]
+    is_false = (~left[0] & ~left[1]) & (~right[0] & ~right[1])
+    return is_true, ~is_true & ~is_false
+
+
+def _not3(value):
+    """Three-valued NOT of an (is_true, is_null) pair."""
+    return ~value[0] & ~value[1], value[1]
+
+
+class ColumnarEvaluator:
+    """
+    Evaluate a parsed QgsExpression over column arrays.
+
+    Boolean sub-results are (is_true, is_null) mask pairs so that AND/OR/NOT
+    follow SQL three-valued logic; only rows evaluating to TRUE match.
+
+    Example:
+        evaluator = ColumnarEvaluator(qgs_expr.rootNode())
+        fids = evaluator.evaluate_layer(layer, qgs_expr.referencedColumns())
+    """
+
+    def __init__(self, root_node, enums=None):
+        """
+        Args:
+            root_node: QgsExpression.rootNode()
+            enums: Optional (node types, binary ops, unary ops) override
+
+        Raises:
+            UnsupportedExpressionError: If NumPy is missing
+        """
+        if not NUMPY_AVAILABLE:
+            raise UnsupportedExpressionError("NumPy is not available")
+        self._root = root_node
+        self._node_types, self._binary_ops, self._unary_ops = enums or _load_qgis_enums()
+        self._columns: Dict[str, Tuple] = {}
+        self._size = 0
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def evaluate_layer(self, layer, referenced_columns) -> 'np.ndarray':
+        """
+        Load referenced columns from ``layer`` and return matching FIDs.
+
+        Raises:
+            UnsupportedExpressionError: If the columnar path cannot be used
+        """
+        fids, columns = load_columns(layer, sorted(referenced_columns))
+        return fids[self.evaluate(columns, len(fids))]
+
+    def evaluate(self, columns: Dict[str, Tuple], size: int) -> 'np.ndarray':
+        """
+        Evaluate the expression on preloaded columns.
+
+        Args:
+            columns: {name: (data, null_mask)}
+            size: Number of rows
+
+        Returns:
+            Boolean mask of matching rows
+        """
+        self._columns = columns
+        self._size = size
+        is_true, _ = self._boolean(self._root)
+        return is_true
+
+    # -------------------------------------------------------------------------
+    # Node dispatch
+    # -------------------------------------------------------------------------
+
+    def _kind(self, node) -> str:
+        kind = self._node_types.get(node.nodeType())
+        if kind is None:
+            raise UnsupportedExpressionError(f"Unsupported node type: {node.nodeType()}")
+        return kind
+
+    def _boolean(self, node) -> Tuple['np.ndarray', 'np.ndarray']:
+        kind = self._kind(node)
+
+        if kind == 'binary':
+            op = self._binary_ops.get(node.op())
+            if op in ('AND', 'OR'):
+                combine = _and3 if op == 'AND' else _or3
+                return combine(self._boolean(node.opLeft()), self._boolean(node.opRight()))
+            if op in ('IS', 'IS NOT'):
+                return self._is_null_test(node, negate=(op == 'IS NOT'))
+            if op in _COMPARISONS:
+                return self._compare(op, self._value(node.opLeft()), self._value(node.opRight()))
+            if op in _LIKE_OPS:
+                return self._like(op, node)
+            raise UnsupportedExpressionError(f"Unsupported binary operator: {node.op()}")
+
+        if kind == 'unary':
+            if self._unary_ops.get(node.op()) != 'NOT':
+                raise UnsupportedExpressionError("Only NOT is supported as boolean unary operator")
+            return _not3(self._boolean(node.operand()))
+
+        if kind == 'in':
+            return self._in(node)
+
+        if kind == 'between':
+            value = self._value(node.node())
+            result = _and3(
+                self._compare('>=', value, self._value(node.lowerBound())),
+                self._compare('<=', value, self._value(node.higherBound())),
+            )
+            return _not3(result) if node.isNotBetween() else result
+
+        if kind == 'column':
+            data, nulls = self._column(node.name())
+            if data.dtype != bool:
+                raise UnsupportedExpressionError("Non-boolean column used as condition")
+            return data & ~nulls, nulls
+
+        if kind == 'literal':
+            value = node.value()
+            if _is_null(value):
+                return np.zeros(self._size, dtype=bool), np.ones(self._size, dtype=bool)
+            return np.full(self._size, bool(value)), np.zeros(self._size, dtype=bool)
+
+        raise UnsupportedExpressionError(f"Unsupported boolean node: {kind}")
+
+    # -------------------------------------------------------------------------
+    # Values
+    # -------------------------------------------------------------------------
+
+    def _column(self, name: str) -> Tuple['np.ndarray', 'np.ndarray']:
+        try:
+            return self._columns[name]
+        except KeyError:
+            raise UnsupportedExpressionError(f"Column not loaded: {name}") from None
+
+    def _value(self, node):
+        """Return (data, null_mask) for a column, or a Python scalar for a literal."""
+        kind = self._kind(node)
+        if kind == 'column':
+            return self._column(node.name())
+        if kind == 'literal':
+            value = node.value()
+            return None if _is_null(value) else value
+        if kind == 'unary' and self._unary_ops.get(node.op()) == '-':
+            operand = self._value(node.operand())
+            if isinstance(operand, (int, float)) and not isinstance(operand, bool):
+                return -operand
+        raise UnsupportedExpressionError(f"Unsupported value node: {kind}")
+
+    @staticmethod
+    def _check_types(data: 'np.ndarray', other) -> None:
+        numeric = data.dtype.kind in 'if'
+        if isinstance(other, tuple):
+            other_numeric = other[0].dtype.kind in 'if'
+            if numeric != other_numeric or (data.dtype == bool) != (other[0].dtype == bool):
+                raise UnsupportedExpressionError("Column type mismatch")
+        elif isinstance(other, bool) or data.dtype == bool:
+            raise UnsupportedExpressionError("Boolean comparison not supported")
+        elif numeric != isinstance(other, (int, float)):
+            raise UnsupportedExpressionError("Literal type does not match column type")
+
+    def _compare(self, op: str, left, right) -> Tuple['np.ndarray', 'np.ndarray']:
+        if left is None or right is None:
+            return np.zeros(self._size, dtype=bool), np.ones(self._size, dtype=bool)
+        if not isinstance(left, tuple):
+            if not isinstance(right, tuple):
+                raise UnsupportedExpressionError("Literal-only comparison")
+            left, right = right, left
+            op = {'<': '>', '<=': '>=', '>': '<', '>=': '<='}.get(op, op)
+
+        data, nulls = left
+        self._check_types(data, right)
+        if isinstance(right, tuple):
+            other, nulls = right[0], nulls | right[1]
+        else:
+            other = right
+
+        result = {
+            '=': lambda: data == other,
+            '<>': lambda: data != other,
+            '<': lambda: data < other,
+            '<=': lambda: data <= other,
+            '>': lambda: data > other,
+            '>=': lambda: data >= other,
+        }[op]()
+        return np.asarray(result, dtype=bool) & ~nulls, nulls
+
+    def _is_null_test(self, node, negate: bool) -> Tuple['np.ndarray', 'np.ndarray']:
+        left, right = node.opLeft(), node.opRight()
+        if self._kind(right) != 'literal' or not _is_null(right.value()):
+            raise UnsupportedExpressionError("IS only supported against NULL")
+        value = self._value(left)
+        if not isinstance(value, tuple):
+            raise UnsupportedExpressionError("IS NULL on a literal")
+        nulls = value[1]
+        return (~nulls if negate else nulls.copy()), np.zeros(self._size, dtype=bool)
+
+    def _in(self, node) -> Tuple['np.ndarray', 'np.ndarray']:
+        value = self._value(node.node())
+        if not isinstance(value, tuple):
+            raise UnsupportedExpressionError("IN on a literal")
+        data, nulls = value
+        items = [self._value(item) for item in node.list().list()]
+        if any(item is None or isinstance(item, tuple) for item in items):
+            raise UnsupportedExpressionError("IN list must contain non-NULL literals")
+        for item in items:
+            self._check_types(data, item)
+        if data.dtype.kind in 'iu':
+            # Casting to the column dtype would truncate 1.5 to 1: non-integral literals never match
+            items = [int(item) for item in items if float(item).is_integer()]
+        result = np.isin(data, np.array(items, dtype=data.dtype)) & ~nulls, nulls
+        return _not3(result) if node.isNotIn() else result
+
+    def _like(self, op: str, node) -> Tuple['np.ndarray', 'np.ndarray']:
+        value = self._value(node.opLeft())
+        pattern = self._value(node.opRight())
+        if not isinstance(value, tuple) or not isinstance(pattern, str):
+            raise UnsupportedExpressionError("LIKE requires a column and a string pattern")
+        data, nulls = value
+        if data.dtype != object:
+            raise UnsupportedExpressionError("LIKE on non-string column")
+        regex = _like_to_regex(pattern, case_insensitive=op in ('ILIKE', 'NOT ILIKE'))
+        is_true = np.fromiter((regex.match(v) is not None for v in data), dtype=bool, count=len(data))
+        result = is_true & ~nulls, nulls
+        return _not3(result) if op.startswith('NOT') else result
+
+
+def evaluate_expression_columnar(layer, qgs_expr) -> 'np.ndarray':
+    """
+    Evaluate a parsed QgsExpression on ``layer`` using the columnar path.
+
+    Args:
+        layer: QgsVectorLayer
+        qgs_expr: Parsed QgsExpression (without parser errors)
+
+    Returns:
+        int64 array of matching FIDs
+
+    Raises:
+        UnsupportedExpressionError: If the expression needs the per-feature loop
+    """
+    if qgs_expr.needsGeometry():
+        raise UnsupportedExpressionError("Expression needs geometry")
+    return ColumnarEvaluator(qgs_expr.rootNode()).evaluate_layer(layer, qgs_expr.referencedColumns())
+
+
+__all__ = [
+    'NUMPY_AVAILABLE',
+    'UnsupportedExpressionError',
+    'ColumnarEvaluator',
+    'load_columns',
+    'evaluate_expression_columnar',
+]
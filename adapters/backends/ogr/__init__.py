@@ -15,6 +15,12 @@ from .filter_executor import (  # noqa: F401
     build_ogr_simple_filter,
     apply_ogr_subset,
     combine_ogr_filters,
+    # v4.2.0: Range-compressed PK predicates
+    compress_pk_ranges,
+    build_ogr_pk_predicate,
+    release_ogr_fid_tables,
+    ensure_ogr_fid_tables,
+    set_ogr_subset_string,
     # EPIC-1 Phase E4-S8: OGR Reset and Unfilter Actions
     execute_reset_action_ogr,
     execute_unfilter_action_ogr,
@@ -29,6 +35,16 @@ from .filter_executor import (  # noqa: F401
     # EPIC-1 Phase E4-S7b: OGR Spatial Selection
     OGRSpatialSelectionContext,
     execute_ogr_spatial_selection,
+    # v4.2.0: OGR process pool jobs
+    ogr_predicate_codes,
+    build_ogr_fid_job,
+)
+
+# v4.2.0: Native in-process spatial selection (replaces qgis:selectbylocation)
+from .spatial_selection import (  # noqa: F401
+    NativeSpatialSelectionEngine,
+    NativeSelectionStats,
+    select_by_location_native,
 )
 
 # v4.1.0: Expression Builder (migrated from before_migration)
@@ -44,6 +60,12 @@ __all__ = [
     'build_ogr_simple_filter',
     'apply_ogr_subset',
     'combine_ogr_filters',
+    # v4.2.0: Range-compressed PK predicates
+    'compress_pk_ranges',
+    'build_ogr_pk_predicate',
+    'release_ogr_fid_tables',
+    'ensure_ogr_fid_tables',
+    'set_ogr_subset_string',
     # EPIC-1 Phase E4-S8: Reset and Unfilter
     'execute_reset_action_ogr',
     'execute_unfilter_action_ogr',
@@ -58,6 +80,13 @@ __all__ = [
     # EPIC-1 Phase E4-S7b
     'OGRSpatialSelectionContext',
     'execute_ogr_spatial_selection',
+    # v4.2.0: OGR process pool jobs
+    'ogr_predicate_codes',
+    'build_ogr_fid_job',
+    # v4.2.0: Native spatial selection
+    'NativeSpatialSelectionEngine',
+    'NativeSelectionStats',
+    'select_by_location_native',
     # v4.1.0: Expression Builder
     'OGRExpressionBuilder',
     'CancellableFeedback',
@@ -5,12 +5,13 @@ OGR Expression Builder.
 v4.1.0: Migrated from before_migration/modules/backends/ogr_backend.py
 
 This module contains the filter logic for OGR-based layers (Shapefiles, etc.).
-Unlike PostgreSQL/Spatialite, OGR uses QGIS processing algorithms for filtering.
+Unlike PostgreSQL/Spatialite, OGR filters by selecting features in QGIS and
+applying the matching FIDs as a subset string.
 
 It implements the GeometricFilterPort interface for backward compatibility.
 
 Features:
-- QGIS processing selectbylocation algorithm
+- Native indexed spatial selection (v4.2.0), selectbylocation as fallback
 - Memory layer optimization for PostgreSQL
 - Spatial index auto-creation
 - Thread-safe reference management
@@ -255,7 +256,7 @@ class OGRExpressionBuilder(GeometricFilterPort):
         combine_operator: Optional[str] = None
     ) -> bool:
         """
-        Apply filter using QGIS processing selectbylocation algorithm.
+        Apply filter by spatial selection and a FID subset string.
 
         Thread Safety:
         - Uses lock for concurrent access detection
@@ -325,6 +326,10 @@ class OGRExpressionBuilder(GeometricFilterPort):
             # Map predicates to QGIS codes
             predicate_codes = []
             for pred in predicates:
+                if isinstance(pred, int) or str(pred).isdigit():
+                    # Already a selectbylocation code (as in ogr_predicate_codes)
+                    predicate_codes.append(int(pred))
+                    continue
                 pred_lower = pred.lower().replace('st_', '')
                 code = self.PREDICATE_CODES.get(pred_lower, 0)
                 predicate_codes.append(code)
@@ -332,24 +337,33 @@ class OGRExpressionBuilder(GeometricFilterPort):
             # Create feedback for cancellation
             self._feedback = CancellableFeedback()
 
-            # Run selectbylocation
-            try:
-                processing.run(
-                    'native:selectbylocation',
-                    {
-                        'INPUT': layer,
-                        'INTERSECT': source_layer,
-                        'PREDICATE': predicate_codes,
-                        'METHOD': 0  # New selection
-                    },
-                    feedback=self._feedback
-                )
-            except Exception as e:
-                self.log_error(f"Processing failed: {e}")
-                return False
+            # v4.2.0: FIDs precomputed by the OGR process pool (same unbuffered source),
+            # else native indexed selection, selectbylocation only as a fallback
+            selected_ids = None
+            if source_layer is self.source_geom:
+                selected_ids = self._take_precomputed_fids(layer, source_layer, predicate_codes)
+            if selected_ids is None:
+                selected_ids = self._select_fids_native(layer, source_layer, predicate_codes)
+            if selected_ids is None:
+                try:
+                    processing.run(
+                        'native:selectbylocation',
+                        {
+                            'INPUT': layer,
+                            'INTERSECT': source_layer,
+                            'PREDICATE': predicate_codes,
+                            'METHOD': 0  # New selection
+                        },
+                        feedback=self._feedback
+                    )
+                except Exception as e:
+                    self.log_error(f"Processing failed: {e}")
+                    return False
+                selected_ids = list(layer.selectedFeatureIds())
 
-            # Get selected feature IDs
-            selected_ids = list(layer.selectedFeatureIds())
+            if self._feedback.isCanceled():
+                self.log_warning("OGR filter canceled")
+                return False
             self.log_info(f"  - Selected: {len(selected_ids)} features")
 
             if not selected_ids:
@@ -443,6 +457,49 @@ class OGRExpressionBuilder(GeometricFilterPort):
     # Private Helper Methods
     # =========================================================================
 
+    def _take_precomputed_fids(self, layer, source_layer, predicate_codes: list) -> Optional[list]:
+        """
+        FIDs computed by the OGR process pool for this exact request (v4.2.0).
+
+        Args:
+            layer: Target layer (its current subset must match the job's)
+            source_layer: Comparison layer the job was built from
+            predicate_codes: selectbylocation predicate codes
+
+        Returns:
+            List of matching FIDs, or None if nothing matching was precomputed
+        """
+        try:
+            from .filter_executor import _take_precomputed_fids
+            fids = _take_precomputed_fids(layer, source_layer, predicate_codes)
+        except Exception as e:
+            self.log_debug(f"Precomputed FIDs unavailable: {e}")
+            return None
+        if fids is None:
+            return None
+        self.log_info(f"  - Using {len(fids)} FIDs precomputed by the OGR process pool")
+        return list(fids)
+
+    def _select_fids_native(self, layer, source_layer, predicate_codes: list) -> Optional[list]:
+        """
+        Compute matching FIDs with NativeSpatialSelectionEngine (v4.2.0).
+
+        Args:
+            layer: Target layer
+            source_layer: Comparison layer (already buffered)
+            predicate_codes: selectbylocation predicate codes
+
+        Returns:
+            List of matching FIDs, or None to fall back to selectbylocation
+        """
+        try:
+            from .spatial_selection import NativeSpatialSelectionEngine
+            engine = NativeSpatialSelectionEngine(source_layer, self._feedback)
+            return list(engine.select_fids(layer, predicate_codes))
+        except Exception as e:
+            self.log_warning(f"Native spatial selection failed, using selectbylocation: {e}")
+            return None
+
     def _build_fid_filter(self, layer, fids: list) -> str:
         """
         Build FID-based filter expression for OGR layers (v4.0.7).
@@ -453,6 +510,9 @@ class OGRExpressionBuilder(GeometricFilterPort):
         - GeoPackage: "fid" IN (1, 2, 3)
         - Shapefiles: fid IN (1, 2, 3)
 
+        v4.2.0: Numeric lists go through build_ogr_pk_predicate() (contiguous
+        runs as BETWEEN, huge GeoPackage selections as an ID table).
+
         Args:
             layer: QGIS vector layer
             fids: List of feature IDs
@@ -485,31 +545,32 @@ class OGRExpressionBuilder(GeometricFilterPort):
         except Exception:
             pass
 
-        # Build value list based on PK type
-        if is_numeric_pk:
-            fid_list = ", ".join(str(fid) for fid in fids)
-        else:
-            # Quote string values (UUID, etc.)
-            fid_list = ", ".join(f"'{fid}'" for fid in fids)
+        # v4.2.0: BETWEEN ranges for contiguous runs, GeoPackage ID table for huge selections
+        from .filter_executor import build_ogr_pk_predicate, get_ogr_gpkg_path
+
+        def predicate(field_name: str, quote_name: bool = True, db_path: str = None) -> str:
+            return build_ogr_pk_predicate(
+                field_name, fids, is_numeric=is_numeric_pk, db_path=db_path, quote_name=quote_name
+            )
 
         # Shapefile special case: QGIS 3.x requires lowercase 'fid' for setSubsetString
         if 'shapefile' in storage_type or 'esri' in storage_type:
             self.log_info("  - Shapefile detected: using lowercase 'fid' for QGIS subset")
-            return f'fid IN ({fid_list})'
+            return predicate('fid', quote_name=False)
 
         # GeoPackage and SQLite-based formats: use quoted field name
         if 'geopackage' in storage_type or 'gpkg' in storage_type or 'sqlite' in storage_type:
             self.log_info(f"  - GeoPackage/SQLite detected: using quoted '{pk_field}'")
-            return f'"{pk_field}" IN ({fid_list})'
+            return predicate(pk_field, db_path=get_ogr_gpkg_path(layer))
 
         # For other OGR formats with detected primary key
         if pk_field and pk_field_lower not in ['fid']:
             self.log_info(f"  - Using detected primary key: {pk_field}")
-            return f'"{pk_field}" IN ({fid_list})'
+            return predicate(pk_field)
 
         # Default: try lowercase fid (more compatible with QGIS setSubsetString)
         self.log_info(f"  - Unknown format ({storage_type}): using lowercase 'fid' syntax")
-        return f'fid IN ({fid_list})'
+        return predicate('fid', quote_name=False)
 
     def _build_fid_filter_with_values(self, layer, pk_values: list, pk_field: str) -> str:
         """
@@ -16,12 +16,64 @@ Author: FilterMate Team
 Created: January 2026 (EPIC-1 Phase E4)
 """
 
+import hashlib
 import logging
+import os
 import re
+import sqlite3
 import threading
+from collections import OrderedDict
 
 logger = logging.getLogger('FilterMate.Adapters.Backends.OGR.FilterExecutor')
 
+# =============================================================================
+# PK PREDICATE SIZE CONTROL (v4.2.0)
+# Huge selections produce multi-megabyte "pk IN (...)" subset strings that OGR
+# re-parses on every provider request. Contiguous runs are emitted as BETWEEN
+# ranges; above OGR_FID_TABLE_THRESHOLD remaining terms, GeoPackage layers
+# reference an indexed ID table stored in the same file instead. ID tables are
+# dropped as soon as no layer subset references them (subset change, layer
+# removal); the IDs of the most recently used tables stay in memory so undo
+# can rebuild them.
+# =============================================================================
+
+OGR_PK_RANGE_MIN_RUN = 5            # Shortest run emitted as BETWEEN instead of IN items
+OGR_FID_TABLE_THRESHOLD = 20000     # Predicate terms above which an ID table is used (0 = never)
+OGR_FID_TABLE_PREFIX = 'fm_tmp_ids_'
+OGR_FID_TABLE_MAX_CACHED_IDS = 2000000  # IDs kept in memory for rebuilds, least recently used evicted
+
+_fid_table_lock = threading.Lock()
+_fid_table_ids = OrderedDict()  # table name -> sorted IDs (LRU order), used to rebuild released tables
+_fid_table_cached_count = 0
+
+
+def _remember_fid_table(table_name: str, ordered: list) -> None:
+    """Keep the IDs of ``table_name`` for rebuilds, evicting the least recently used."""
+    global _fid_table_cached_count
+    with _fid_table_lock:
+        previous = _fid_table_ids.pop(table_name, None)
+        if previous is not None:
+            _fid_table_cached_count -= len(previous)
+        _fid_table_ids[table_name] = ordered
+        _fid_table_cached_count += len(ordered)
+        # The newest entry is always kept, even if larger than the budget
+        while _fid_table_cached_count > OGR_FID_TABLE_MAX_CACHED_IDS and len(_fid_table_ids) > 1:
+            evicted, ids = _fid_table_ids.popitem(last=False)
+            _fid_table_cached_count -= len(ids)
+            logger.debug(f"[OGR] Forgot IDs of table {evicted} ({len(ids)} IDs); it can no longer be rebuilt")
+
+
+# =============================================================================
+# OGR PROCESS POOL (v4.2.0)
+# Large file-based layers can have their spatial selection computed in worker
+# processes (infrastructure/parallel/ogr_process_pool.py). Only formats whose
+# OGR FIDs are the QGIS feature ids are eligible; small layers are not worth
+# a process round trip.
+# =============================================================================
+
+OGR_PROCESS_POOL_MIN_FEATURES = 50000
+OGR_PROCESS_POOL_EXTENSIONS = ('.gpkg', '.shp', '.fgb', '.sqlite')
+
 # =============================================================================
 # TEMPORARY LAYER REGISTRY
 # Tracks temporary layers created for garbage collection prevention.
@@ -150,10 +202,14 @@ def build_ogr_filter_from_selection(
         return None, None
 
     # Build IN clause based on key type
+    # v4.2.0: Numeric keys are range-compressed, and very large ID sets on
+    # GeoPackage layers are moved to an indexed ID table (see build_ogr_pk_predicate)
     if param_distant_primary_key_is_numeric:
-        param_expression = '"{pk}" IN ({ids})'.format(
-            pk=param_distant_primary_key_name,
-            ids=", ".join(features_ids)
+        param_expression = build_ogr_pk_predicate(
+            param_distant_primary_key_name,
+            features_ids,
+            is_numeric=True,
+            db_path=get_ogr_gpkg_path(layer)
         )
     else:
         # Quote string values
@@ -212,6 +268,295 @@ def format_ogr_pk_values(
         return ', '.join(formatted)
 
 
+def _as_integer_pk(value) -> int:
+    """Convert an integer-valued key to int, rejecting fractional values."""
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"Non-integer key value: {value}")
+    return int(value)
+
+
+def compress_pk_ranges(
+    values: list,
+    min_run: int = OGR_PK_RANGE_MIN_RUN
+) -> tuple:
+    """
+    Split integer primary key values into contiguous runs and loose values.
+
+    Args:
+        values: Integer values (ints or integer strings), any order, duplicates allowed
+        min_run: Shortest run length reported as a range
+
+    Returns:
+        tuple: (ranges, singles) where ranges is a list of inclusive (low, high)
+        tuples and singles a sorted list of remaining values
+
+    Raises:
+        ValueError: If a value is not an integer
+    """
+    ordered = sorted({_as_integer_pk(v) for v in values})
+    ranges, singles = [], []
+    i = 0
+    while i < len(ordered):
+        j = i
+        while j + 1 < len(ordered) and ordered[j + 1] == ordered[j] + 1:
+            j += 1
+        if j - i + 1 >= min_run:
+            ranges.append((ordered[i], ordered[j]))
+        else:
+            singles.extend(ordered[i:j + 1])
+        i = j + 1
+    return ranges, singles
+
+
+def get_ogr_gpkg_path(layer) -> str:
+    """
+    Return the GeoPackage file behind an OGR layer, or None.
+
+    Args:
+        layer: QGIS vector layer
+
+    Returns:
+        str: Path to the .gpkg file, None for other formats
+    """
+    try:
+        if layer.providerType() != 'ogr':
+            return None
+        path = layer.source().split('|')[0]
+    except Exception:
+        return None
+    if path.lower().endswith('.gpkg') and os.path.isfile(path):
+        return path
+    return None
+
+
+def _fid_table_names(subset_string: str) -> set:
+    """Names of the ID tables referenced by a subset string."""
+    if not subset_string or OGR_FID_TABLE_PREFIX not in subset_string:
+        return set()
+    return set(re.findall(rf'{OGR_FID_TABLE_PREFIX}[0-9a-f]+', subset_string))
+
+
+def _write_fid_table(conn, table_name: str, ordered: list) -> bool:
+    """Create and fill ``table_name`` unless it already exists."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,)
+    ).fetchone()
+    if exists:
+        return False
+    # INTEGER PRIMARY KEY is the rowid: the semi-join is an index lookup
+    conn.execute(f'CREATE TABLE "{table_name}" (id INTEGER PRIMARY KEY)')  # nosec B608
+    conn.executemany(
+        f'INSERT INTO "{table_name}" (id) VALUES (?)',  # nosec B608
+        ((v,) for v in ordered)
+    )
+    conn.commit()
+    return True
+
+
+def create_ogr_fid_table(db_path: str, values: list) -> str:
+    """
+    Store integer IDs in an indexed table inside a GeoPackage.
+
+    Table names are derived from a hash of the sorted IDs, so the same
+    selection reuses the same table. Tables live as long as subset strings
+    reference them and are dropped by release_ogr_fid_tables(); the IDs are
+    kept in memory (bounded by OGR_FID_TABLE_MAX_CACHED_IDS) for
+    ensure_ogr_fid_tables().
+
+    Args:
+        db_path: GeoPackage file path
+        values: Integer IDs
+
+    Returns:
+        str: Table name
+    """
+    ordered = sorted({_as_integer_pk(v) for v in values})
+    digest = hashlib.sha1(",".join(map(str, ordered)).encode(), usedforsecurity=False).hexdigest()[:16]
+    table_name = f"{OGR_FID_TABLE_PREFIX}{digest}"
+
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        if _write_fid_table(conn, table_name, ordered):
+            logger.debug(f"[OGR] Created ID table {table_name} with {len(ordered)} IDs in {db_path}")
+    finally:
+        conn.close()
+    _remember_fid_table(table_name, ordered)
+    return table_name
+
+
+def ensure_ogr_fid_tables(layer, subset_string: str) -> int:
+    """
+    Recreate released ID tables referenced by ``subset_string``.
+
+    Call before applying a subset string that may come from history
+    (undo/redo): its ID tables were dropped when the layer moved on.
+
+    Args:
+        layer: Layer the subset string is applied to
+        subset_string: Subset string about to be applied
+
+    Returns:
+        int: Number of tables recreated
+    """
+    tables = _fid_table_names(subset_string)
+    db_path = get_ogr_gpkg_path(layer) if tables else None
+    if not db_path:
+        return 0
+
+    with _fid_table_lock:
+        known = {t: _fid_table_ids[t] for t in tables if t in _fid_table_ids}
+        for table_name in known:
+            _fid_table_ids.move_to_end(table_name)
+    if len(known) < len(tables):
+        logger.warning(f"[OGR] ID tables {sorted(tables - set(known))} cannot be rebuilt (IDs unknown)")
+
+    created = 0
+    conn = sqlite3.connect(db_path, timeout=30)
+    try:
+        for table_name, ordered in known.items():
+            created += _write_fid_table(conn, table_name, ordered)
+    finally:
+        conn.close()
+    if created:
+        logger.debug(f"[OGR] Rebuilt {created} ID table(s) in {db_path}")
+    return created
+
+
+def release_ogr_fid_tables(layer, subset_string: str, removed_layer_ids=None) -> int:
+    """
+    Drop ID tables referenced by ``subset_string`` once no layer uses them.
+
+    Call after the layer's subset string was replaced, or with the layer in
+    ``removed_layer_ids`` when it is about to leave the project.
+
+    Args:
+        layer: Layer whose subset string is being cleared/replaced
+        subset_string: The subset string that is going away
+        removed_layer_ids: IDs of layers being removed (their subsets do not count)
+
+    Returns:
+        int: Number of tables dropped
+    """
+    tables = _fid_table_names(subset_string)
+    db_path = get_ogr_gpkg_path(layer) if tables else None
+    if not db_path:
+        return 0
+
+    removed = set(removed_layer_ids or ())
+    try:
+        from qgis.core import QgsProject
+        for other in QgsProject.instance().mapLayers().values():
+            if other.id() in removed or not hasattr(other, 'subsetString'):
+                continue
+            other_subset = other.subsetString() or ''
+            tables = {t for t in tables if t not in other_subset}
+    except Exception as e:
+        logger.debug(f"[OGR] Could not check other layers for ID table usage: {e}")
+        return 0
+
+    dropped = 0
+    if tables:
+        conn = sqlite3.connect(db_path, timeout=30)
+        try:
+            for table in tables:
+                conn.execute(f'DROP TABLE IF EXISTS "{table}"')  # nosec B608
+                dropped += 1
+            conn.commit()
+        finally:
+            conn.close()
+        logger.debug(f"[OGR] Dropped {dropped} ID table(s) from {db_path}")
+    return dropped
+
+
+def set_ogr_subset_string(layer, subset_string: str) -> bool:
+    """
+    Apply a subset string and keep the layer's ID tables in step.
+
+    Rebuilds ID tables the new subset needs and drops the ones only the
+    old subset referenced. Main thread only.
+
+    Args:
+        layer: QGIS vector layer
+        subset_string: SQL subset string
+
+    Returns:
+        bool: setSubsetString() result
+    """
+    old_subset = layer.subsetString() or ''
+    try:
+        ensure_ogr_fid_tables(layer, subset_string)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"[OGR] Could not rebuild ID tables: {e}")
+
+    result = layer.setSubsetString(subset_string)
+    if result:
+        try:
+            release_ogr_fid_tables(layer, old_subset)
+        except (sqlite3.Error, OSError) as e:
+            logger.debug(f"[OGR] ID table release skipped: {e}")
+    return result
+
+
+def build_ogr_pk_predicate(
+    primary_key_name: str,
+    values: list,
+    is_numeric: bool = True,
+    min_run: int = OGR_PK_RANGE_MIN_RUN,
+    db_path: str = None,
+    table_threshold: int = OGR_FID_TABLE_THRESHOLD,
+    quote_name: bool = True
+) -> str:
+    """
+    Build a compact primary key predicate for an OGR subset string.
+
+    Numeric keys: contiguous runs of at least ``min_run`` values become
+    ``"pk" BETWEEN a AND b`` and remaining values a single IN list, OR-ed
+    together. If more than ``table_threshold`` terms remain and ``db_path``
+    is a GeoPackage, the IDs are stored in an indexed table in that file and
+    referenced with ``"pk" IN (SELECT id FROM ...)`` (GeoPackage subset
+    strings are evaluated by SQLite, which supports subqueries; OGR SQL for
+    Shapefiles does not, so they keep the range form).
+
+    Args:
+        primary_key_name: Primary key field name
+        values: Primary key values
+        is_numeric: Whether PK is numeric (text keys always use a plain IN list)
+        min_run: Shortest run emitted as BETWEEN
+        db_path: GeoPackage path enabling the ID-table form, or None
+        table_threshold: Term count above which the ID table is used (0 disables)
+        quote_name: Quote the field name (Shapefile subsets need a bare ``fid``)
+
+    Returns:
+        str: Predicate, '' if ``values`` is empty
+    """
+    if not values:
+        return ""
+    pk = f'"{primary_key_name}"' if quote_name else primary_key_name
+
+    if not is_numeric:
+        return f'{pk} IN ({format_ogr_pk_values(values, is_numeric=False)})'
+
+    try:
+        ranges, singles = compress_pk_ranges(values, min_run)
+    except (TypeError, ValueError):
+        # Non-integer numeric keys (e.g. REAL): keep the plain list
+        return f'{pk} IN ({format_ogr_pk_values(values, is_numeric=True)})'
+
+    if db_path and table_threshold and len(ranges) + len(singles) > table_threshold:
+        try:
+            table_name = create_ogr_fid_table(db_path, values)
+            return f'{pk} IN (SELECT id FROM "{table_name}")'  # nosec B608
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"[OGR] Could not create ID table in {db_path}, using ranges: {e}")
+
+    terms = [f'{pk} BETWEEN {low} AND {high}' for low, high in ranges]
+    if singles:
+        terms.append(f'{pk} IN ({", ".join(map(str, singles))})')
+    if len(terms) == 1:
+        return terms[0]
+    return '(' + ' OR '.join(terms) + ')'
+
+
 def normalize_column_names_for_ogr(
     expression: str,
     field_names: list
@@ -281,8 +626,7 @@ def build_ogr_simple_filter(
     if not feature_ids:
         return ""
 
-    formatted_ids = format_ogr_pk_values(feature_ids, is_numeric)
-    return f'"{primary_key_name}" IN ({formatted_ids})'
+    return build_ogr_pk_predicate(primary_key_name, feature_ids, is_numeric)
 
 
 def apply_ogr_subset(
@@ -310,7 +654,7 @@ def apply_ogr_subset(
     else:
         # Direct application (only safe from main thread)
         try:
-            return layer.setSubsetString(subset_string)
+            return set_ogr_subset_string(layer, subset_string)
         except Exception as e:
             logger.error(f"[OGR] Failed to apply OGR subset: {e}")
             return False
@@ -383,7 +727,8 @@ def execute_reset_action_ogr(
             logger.debug(f"[OGR] Reset: Queued empty subset for {layer.name()}")
         else:
             # Direct application (only safe from main thread)
-            layer.setSubsetString('')
+            # v4.2.0: also drops ID tables that no layer references any more
+            set_ogr_subset_string(layer, '')
             logger.debug(f"[OGR] Reset: Applied empty subset directly for {layer.name()}")
 
         logger.debug(f"[OGR] OGR Reset completed for layer: {layer.name()}")
@@ -429,7 +774,7 @@ def execute_unfilter_action_ogr(
             )
         else:
             # Direct application (only safe from main thread)
-            layer.setSubsetString(subset_to_apply)
+            set_ogr_subset_string(layer, subset_to_apply)
             logger.debug(
                 f"Unfilter: Applied {'previous' if previous_subset else 'empty'} "
                 f"subset directly for {layer.name()}"
@@ -903,6 +1248,189 @@ class OGRSpatialSelectionContext:
     # Callback for spatial index verification
     verify_and_create_spatial_index: Optional[Callable] = None
 
+    # v4.2.0: Use the in-process engine (spatial_selection.py) instead of
+    # processing.run("qgis:selectbylocation"); Processing remains the fallback
+    use_native_engine: bool = True
+
+
+def ogr_predicate_codes(current_predicates: dict) -> list:
+    """
+    Extract numeric selectbylocation predicate codes from current_predicates.
+
+    Keys may be numeric codes (int or digit strings) or SQL predicate names;
+    defaults to [0] (intersects) when nothing can be converted.
+    """
+    predicate_list = []
+    for key in current_predicates.keys():
+        if isinstance(key, int):
+            # C'est déjà un code numérique QGIS
+            predicate_list.append(key)
+            logger.debug(f"[OGR]    Found numeric key: {key}")
+        elif isinstance(key, str) and key.isdigit():
+            # C'est un string numérique
+            predicate_list.append(int(key))
+            logger.debug(f"[OGR]    Found string-numeric key: {key} -> {int(key)}")
+
+    # Si aucun code numérique trouvé, tenter de convertir les noms SQL en codes
+    if not predicate_list:
+        logger.warning(f"[OGR] No numeric QGIS predicate codes found in current_predicates: {current_predicates}")
+        # DIAGNOSTIC 2026-01-16: Try to recover from SQL names
+        sql_name_to_code = {
+            'ST_Intersects': 0, 'intersects': 0,
+            'ST_Contains': 1, 'contains': 1,
+            'ST_Disjoint': 2, 'disjoint': 2,
+            'ST_Equals': 3, 'equals': 3,
+            'ST_Touches': 4, 'touches': 4,
+            'ST_Overlaps': 5, 'overlaps': 5,
+            'ST_Within': 6, 'within': 6,
+            'ST_Crosses': 7, 'crosses': 7,
+        }
+        for key in current_predicates.keys():
+            if isinstance(key, str) and key in sql_name_to_code:
+                code = sql_name_to_code[key]
+                predicate_list.append(code)
+                logger.info(f"[OGR]    ✓ Converted SQL name '{key}' to QGIS code {code}")
+
+        if not predicate_list:
+            logger.warning("[OGR]    ⚠️ Could not convert any predicates - Defaulting to 'intersects' (code 0)")
+            predicate_list = [0]
+
+    return predicate_list
+
+
+def build_ogr_fid_job(
+    target_layer: Any,
+    ogr_source_geom: Any,
+    current_predicates: dict,
+    attribute_filter: Optional[str] = None
+):
+    """
+    Build the OGR process pool job of a distant layer.
+
+    Source geometries are repaired, transformed to the target CRS and
+    serialized as WKB once per layer; the worker never sees QGIS objects.
+
+    Args:
+        target_layer: Distant QgsVectorLayer (OGR provider)
+        ogr_source_geom: Prepared source QgsVectorLayer
+        current_predicates: Task predicates (see ogr_predicate_codes)
+        attribute_filter: Subset string active during the selection
+                          (defaults to the layer's current subset string)
+
+    Returns:
+        OgrFidJob, or None if the layer is not eligible
+    """
+    try:
+        from ....infrastructure.parallel.ogr_process_pool import OgrFidJob, ogr_layer_location
+    except ImportError:
+        return None
+    from qgis.core import QgsCoordinateTransform, QgsFeatureRequest, QgsProject
+
+    if target_layer is None or ogr_source_geom is None or target_layer.providerType() != 'ogr':
+        return None
+    path, layer_name, layer_index = ogr_layer_location(target_layer.source())
+    if not path.lower().endswith(OGR_PROCESS_POOL_EXTENSIONS) or not os.path.isfile(path):
+        return None
+    if target_layer.featureCount() < OGR_PROCESS_POOL_MIN_FEATURES:
+        return None
+
+    subset = target_layer.subsetString() if attribute_filter is None else attribute_filter
+    if subset and subset.lstrip().upper().startswith('SELECT'):
+        return None  # Full SQL statements are not attribute filters
+
+    transform = None
+    if ogr_source_geom.crs() != target_layer.crs():
+        transform = QgsCoordinateTransform(ogr_source_geom.crs(), target_layer.crs(), QgsProject.instance())
+
+    wkbs = []
+    for feature in ogr_source_geom.getFeatures(QgsFeatureRequest().setNoAttributes()):
+        geom = feature.geometry()
+        if geom is None or geom.isNull() or geom.isEmpty():
+            continue
+        if not geom.isGeosValid():
+            geom = geom.makeValid()
+            if geom is None or geom.isNull() or geom.isEmpty():
+                continue
+        if transform is not None:
+            geom.transform(transform)
+        wkbs.append(bytes(geom.asWkb()))
+
+    return OgrFidJob(
+        layer_id=target_layer.id(),
+        data_source=path,
+        layer_name=layer_name,
+        layer_index=layer_index,
+        predicates=tuple(sorted(set(ogr_predicate_codes(current_predicates)))),
+        source_wkbs=tuple(wkbs),
+        attribute_filter=subset or '',
+        source_key=ogr_source_geom.id(),
+    )
+
+
+def _take_precomputed_fids(current_layer: Any, ogr_source_geom: Any, predicate_list: list):
+    """FIDs computed by the OGR process pool for this exact request, or None."""
+    try:
+        from ....infrastructure.parallel.ogr_process_pool import take_precomputed_fids
+    except ImportError:
+        return None
+    fids = take_precomputed_fids(
+        current_layer.id(), ogr_source_geom.id(), predicate_list, current_layer.subsetString()
+    )
+    return fids if isinstance(fids, frozenset) else None
+
+
+def _execute_native_spatial_selection(
+    current_layer: Any,
+    ogr_source_geom: Any,
+    predicate_list: list,
+    param_old_subset: str,
+    context: OGRSpatialSelectionContext,
+    safe_set_subset_string: Callable
+) -> bool:
+    """
+    Apply the spatial selection with NativeSpatialSelectionEngine.
+
+    Mirrors the METHOD handling of the Processing path below.
+
+    Returns:
+        bool: True if the selection was applied, False to fall back to Processing
+    """
+    from .spatial_selection import (
+        select_by_location_native, METHOD_NEW_SELECTION, METHOD_ADD_TO_SELECTION,
+        METHOD_SELECT_WITHIN_SELECTION, METHOD_REMOVE_FROM_SELECTION
+    )
+
+    verify_index = context.verify_and_create_spatial_index
+    method = METHOD_NEW_SELECTION
+    try:
+        if verify_index:
+            verify_index(ogr_source_geom, "intersection layer")
+            verify_index(current_layer)
+
+        if context.has_combine_operator:
+            current_layer.selectAll()
+            op = context.param_other_layers_combine_operator
+            if op == 'OR':
+                safe_set_subset_string(current_layer, param_old_subset)
+                current_layer.selectAll()
+                safe_set_subset_string(current_layer, '')
+                method = METHOD_ADD_TO_SELECTION
+            elif op == 'AND':
+                method = METHOD_SELECT_WITHIN_SELECTION
+            elif op == 'NOT AND':
+                method = METHOD_REMOVE_FROM_SELECTION
+
+        precomputed = _take_precomputed_fids(current_layer, ogr_source_geom, predicate_list)
+        fids = select_by_location_native(
+            current_layer, ogr_source_geom, predicate_list, method, fids=precomputed
+        )
+        origin = "process pool" if precomputed is not None else "native"
+        logger.info(f"[OGR] ✓ Spatial selection ({origin}): {len(fids)} matching features (method={method})")
+        return True
+    except Exception as e:
+        logger.warning(f"[OGR] Native spatial selection failed, falling back to Processing: {e}")
+        return False
+
 
 def execute_ogr_spatial_selection(
     layer: Any,
@@ -918,6 +1446,9 @@ def execute_ogr_spatial_selection(
     STABILITY FIX v2.3.9: Added comprehensive validation before calling selectbylocation
     to prevent access violations from invalid geometries.
 
+    v4.2.0: Runs the native engine from spatial_selection.py first and only
+    falls back to Processing (with GEOS-safe layer copies) if it fails.
+
     Args:
         layer: Original layer
         current_layer: Potentially reprojected working layer
@@ -987,40 +1518,6 @@ def execute_ogr_spatial_selection(
                f"features={feature_count}, "
                f"geomType={QgsWkbTypes.displayString(ogr_source_geom.wkbType())}")
 
-    # Configure processing context
-    proc_context = QgsProcessingContext()
-    proc_context.setInvalidGeometryCheck(QgsFeatureRequest.GeometrySkipInvalid)
-    feedback = QgsProcessingFeedback()
-
-    # Create GEOS-safe source layer
-    logger.info("[OGR] 🛡️ Creating GEOS-safe source layer...")
-    if create_geos_safe_layer:
-        safe_source_geom = create_geos_safe_layer(ogr_source_geom, "_safe_source")
-    else:
-        safe_source_geom = ogr_source_geom
-
-    if safe_source_geom is None:
-        logger.warning("[OGR] create_geos_safe_layer returned None, using original")  # nosec B608
-        safe_source_geom = ogr_source_geom
-
-    if not safe_source_geom.isValid() or safe_source_geom.featureCount() == 0:
-        logger.error("[OGR] No valid source geometries available")
-        raise Exception("Source geometry layer has no valid geometries")
-
-    logger.info(f"[OGR] ✓ Safe source layer: {safe_source_geom.featureCount()} features")
-
-    # Process target layer for smaller datasets
-    safe_current_layer = current_layer
-    use_safe_current = False
-    target_count = current_layer.featureCount()
-    if target_count and target_count <= 50000 and create_geos_safe_layer:
-        logger.debug("[OGR] 🛡️ Creating GEOS-safe target layer...")
-        temp_safe = create_geos_safe_layer(current_layer, "_safe_target")
-        if temp_safe and temp_safe.isValid() and temp_safe.featureCount() > 0:
-            safe_current_layer = temp_safe
-            use_safe_current = True
-            logger.info(f"[OGR] ✓ Safe target layer: {safe_current_layer.featureCount()} features")
-
     # FIX 2026-01-15: Extract numeric QGIS predicate codes from current_predicates
     # current_predicates peut contenir:
     #   - Des noms SQL comme clés: {'ST_Intersects': 'ST_Intersects'}
@@ -1044,40 +1541,7 @@ def execute_ogr_spatial_selection(
         logger.warning("[OGR]    ⚠️ context.current_predicates is EMPTY!")
     logger.info("=" * 70)
 
-    predicate_list = []
-    for key in context.current_predicates.keys():
-        if isinstance(key, int):
-            # C'est déjà un code numérique QGIS
-            predicate_list.append(key)
-            logger.debug(f"[OGR]    Found numeric key: {key}")
-        elif isinstance(key, str) and key.isdigit():
-            # C'est un string numérique
-            predicate_list.append(int(key))
-            logger.debug(f"[OGR]    Found string-numeric key: {key} -> {int(key)}")
-
-    # Si aucun code numérique trouvé, tenter de convertir les noms SQL en codes
-    if not predicate_list:
-        logger.warning(f"[OGR] No numeric QGIS predicate codes found in current_predicates: {context.current_predicates}")
-        # DIAGNOSTIC 2026-01-16: Try to recover from SQL names
-        sql_name_to_code = {
-            'ST_Intersects': 0, 'intersects': 0,
-            'ST_Contains': 1, 'contains': 1,
-            'ST_Disjoint': 2, 'disjoint': 2,
-            'ST_Equals': 3, 'equals': 3,
-            'ST_Touches': 4, 'touches': 4,
-            'ST_Overlaps': 5, 'overlaps': 5,
-            'ST_Within': 6, 'within': 6,
-            'ST_Crosses': 7, 'crosses': 7,
-        }
-        for key in context.current_predicates.keys():
-            if isinstance(key, str) and key in sql_name_to_code:
-                code = sql_name_to_code[key]
-                predicate_list.append(code)
-                logger.info(f"[OGR]    ✓ Converted SQL name '{key}' to QGIS code {code}")
-
-        if not predicate_list:
-            logger.warning("[OGR]    ⚠️ Could not convert any predicates - Defaulting to 'intersects' (code 0)")
-            predicate_list = [0]
+    predicate_list = ogr_predicate_codes(context.current_predicates)
 
     # DIAGNOSTIC LOGS 2026-01-15: Trace OGR spatial selection execution
     logger.info("=" * 70)
@@ -1092,6 +1556,46 @@ def execute_ogr_spatial_selection(
     logger.info(f"[OGR]    Old subset: {param_old_subset[:100] if param_old_subset else 'None'}...")
     logger.info("=" * 70)
 
+    # v4.2.0: Native in-process selection (no Processing, no memory layer copies)
+    if context.use_native_engine and _execute_native_spatial_selection(
+        current_layer, ogr_source_geom, predicate_list, param_old_subset, context, safe_set_subset_string
+    ):
+        return
+
+    # Configure processing context
+    proc_context = QgsProcessingContext()
+    proc_context.setInvalidGeometryCheck(QgsFeatureRequest.GeometrySkipInvalid)
+    feedback = QgsProcessingFeedback()
+
+    # Create GEOS-safe source layer
+    logger.info("[OGR] 🛡️ Creating GEOS-safe source layer...")
+    if create_geos_safe_layer:
+        safe_source_geom = create_geos_safe_layer(ogr_source_geom, "_safe_source")
+    else:
+        safe_source_geom = ogr_source_geom
+
+    if safe_source_geom is None:
+        logger.warning("[OGR] create_geos_safe_layer returned None, using original")  # nosec B608
+        safe_source_geom = ogr_source_geom
+
+    if not safe_source_geom.isValid() or safe_source_geom.featureCount() == 0:
+        logger.error("[OGR] No valid source geometries available")
+        raise Exception("Source geometry layer has no valid geometries")
+
+    logger.info(f"[OGR] ✓ Safe source layer: {safe_source_geom.featureCount()} features")
+
+    # Process target layer for smaller datasets
+    safe_current_layer = current_layer
+    use_safe_current = False
+    target_count = current_layer.featureCount()
+    if target_count and target_count <= 50000 and create_geos_safe_layer:
+        logger.debug("[OGR] 🛡️ Creating GEOS-safe target layer...")
+        temp_safe = create_geos_safe_layer(current_layer, "_safe_target")
+        if temp_safe and temp_safe.isValid() and temp_safe.featureCount() > 0:
+            safe_current_layer = temp_safe
+            use_safe_current = True
+            logger.info(f"[OGR] ✓ Safe target layer: {safe_current_layer.featureCount()} features")
+
     def map_selection_to_original():
         """Map selection back to original layer if we used safe layer."""
         if use_safe_current and safe_current_layer is not current_layer:
@@ -0,0 +1,350 @@
+"""
+OGR Native Spatial Selection Engine.
+
+v4.2.0: In-process replacement for processing.run("qgis:selectbylocation").
+
+The Processing algorithm pays framework overhead and, in FilterMate, two
+full GEOS-safe memory copies (source and target) per filter. This engine
+works directly on the layers instead:
+
+1. Source geometries are read once into a QgsSpatialIndex (bbox only),
+   reprojected into the target layer CRS when the two differ.
+2. Each source geometry gets a GEOS prepared geometry, built lazily the
+   first time it is a candidate for a target feature.
+3. Target features are streamed with a bbox QgsFeatureRequest limited to
+   the source extent and without attributes.
+4. Matching FIDs are returned as a set; no memory layer is created.
+
+Predicate codes and semantics match selectbylocation: a target feature is
+selected when ``target <predicate> source`` holds for at least one source
+feature, and Disjoint (2) selects targets intersecting no source feature.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set
+
+from qgis.core import (
+    QgsCoordinateTransform,
+    QgsFeatureRequest,
+    QgsGeometry,
+    QgsProject,
+    QgsRectangle,
+    QgsSpatialIndex,
+)
+
+logger = logging.getLogger('FilterMate.Adapters.Backends.OGR.SpatialSelection')
+
+# QGIS selectbylocation predicate codes
+PREDICATE_INTERSECTS = 0
+PREDICATE_CONTAINS = 1
+PREDICATE_DISJOINT = 2
+PREDICATE_EQUALS = 3
+PREDICATE_TOUCHES = 4
+PREDICATE_OVERLAPS = 5
+PREDICATE_WITHIN = 6
+PREDICATE_CROSSES = 7
+
+# selectbylocation METHOD codes
+METHOD_NEW_SELECTION = 0
+METHOD_ADD_TO_SELECTION = 1
+METHOD_SELECT_WITHIN_SELECTION = 2
+METHOD_REMOVE_FROM_SELECTION = 3
+
+# Target predicate -> prepared *source* engine call.
+# "target contains source" is "source within target" and vice versa.
+_ENGINE_PREDICATES = {
+    PREDICATE_INTERSECTS: 'intersects',
+    PREDICATE_CONTAINS: 'within',
+    PREDICATE_EQUALS: 'isEqual',
+    PREDICATE_TOUCHES: 'touches',
+    PREDICATE_OVERLAPS: 'overlaps',
+    PREDICATE_WITHIN: 'contains',
+    PREDICATE_CROSSES: 'crosses',
+}
+
+# How often (in target features) cancellation is checked
+CANCEL_CHECK_INTERVAL = 1000
+
+
+@dataclass
+class NativeSelectionStats:
+    """Counters for one native spatial selection run."""
+    source_features: int = 0
+    source_skipped: int = 0
+    prepared_geometries: int = 0
+    target_scanned: int = 0
+    predicate_tests: int = 0
+    matched: int = 0
+    index_build_ms: float = 0.0
+    scan_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return dict(self.__dict__)
+
+
+class NativeSpatialSelectionEngine:
+    """
+    Select target FIDs by location against an indexed, prepared source layer.
+
+    The source index is built once per target CRS and may be reused for
+    several target layers (e.g. all distant layers of one filter run).
+
+    Example:
+        engine = NativeSpatialSelectionEngine(source_layer)
+        fids = engine.select_fids(target_layer, [PREDICATE_INTERSECTS])
+        target_layer.selectByIds(list(fids))
+    """
+
+    def __init__(self, source_layer, feedback=None):
+        """
+        Args:
+            source_layer: QgsVectorLayer providing the comparison geometries
+            feedback: Optional QgsFeedback checked for cancellation
+        """
+        self._source_layer = source_layer
+        self._feedback = feedback
+        self._index: Optional[QgsSpatialIndex] = None
+        self._geometries: Dict[int, QgsGeometry] = {}
+        self._engines: Dict[int, object] = {}
+        self._extent: Optional[QgsRectangle] = None
+        self._index_crs = None
+        self.stats = NativeSelectionStats()
+
+    # -------------------------------------------------------------------------
+    # Source preparation
+    # -------------------------------------------------------------------------
+
+    def _is_canceled(self) -> bool:
+        return bool(self._feedback and self._feedback.isCanceled())
+
+    def build(self, target_crs=None) -> bool:
+        """
+        Read source geometries and build the spatial index.
+
+        Invalid geometries are repaired with makeValid(); null, empty or
+        unrepairable ones are skipped, like GeometrySkipInvalid.
+
+        Args:
+            target_crs: CRS of the layer the index will be tested against;
+                        source geometries are transformed into it when it
+                        differs from the source layer CRS. None keeps the
+                        source CRS (or the CRS of an existing index).
+
+        Returns:
+            bool: True if at least one usable source geometry was indexed
+        """
+        if self._index is not None and (target_crs is None or target_crs == self._index_crs):
+            return bool(self._geometries)
+
+        source_crs = self._source_layer.crs()
+        if target_crs is None:
+            target_crs = source_crs
+        transform = None
+        if target_crs != source_crs:
+            transform = QgsCoordinateTransform(source_crs, target_crs, QgsProject.instance())
+
+        start = time.perf_counter()
+        self._index = QgsSpatialIndex()
+        self._index_crs = target_crs
+        self._geometries = {}
+        self._engines = {}
+        self._extent = None
+        self.stats.source_features = 0
+        self.stats.source_skipped = 0
+        request = QgsFeatureRequest().setSubsetOfAttributes([])
+
+        key = 0
+        for feature in self._source_layer.getFeatures(request):
+            geom = feature.geometry()
+            self.stats.source_features += 1
+            if geom is None or geom.isNull() or geom.isEmpty():
+                self.stats.source_skipped += 1
+                continue
+            if not geom.isGeosValid():
+                geom = geom.makeValid()
+                if geom is None or geom.isNull() or geom.isEmpty():
+                    self.stats.source_skipped += 1
+                    continue
+            if transform is not None:
+                geom.transform(transform)
+
+            bbox = geom.boundingBox()
+            self._index.addFeature(key, bbox)
+            self._geometries[key] = geom
+            if self._extent is None:
+                self._extent = QgsRectangle(bbox)
+            else:
+                self._extent.combineExtentWith(bbox)
+            key += 1
+
+            if key % CANCEL_CHECK_INTERVAL == 0 and self._is_canceled():
+                break
+
+        self.stats.index_build_ms = (time.perf_counter() - start) * 1000
+        logger.debug(
+            f"[OGR Native] Source index: {len(self._geometries)} geometries "
+            f"({self.stats.source_skipped} skipped) in {self.stats.index_build_ms:.1f}ms"
+        )
+        return bool(self._geometries)
+
+    def _prepared_engine(self, key: int):
+        engine = self._engines.get(key)
+        if engine is None:
+            engine = QgsGeometry.createGeometryEngine(self._geometries[key].constGet())
+            engine.prepareGeometry()
+            self._engines[key] = engine
+            self.stats.prepared_geometries += 1
+        return engine
+
+    # -------------------------------------------------------------------------
+    # Selection
+    # -------------------------------------------------------------------------
+
+    def select_fids(self, target_layer, predicate_codes: Iterable[int]) -> Set[int]:
+        """
+        Compute the target FIDs matching any of the predicates.
+
+        Args:
+            target_layer: QgsVectorLayer to test (its subset string applies);
+                          the source is reprojected into its CRS if needed
+            predicate_codes: selectbylocation predicate codes (0-7)
+
+        Returns:
+            Set[int]: Matching target FIDs (empty if canceled)
+
+        Raises:
+            ValueError: If a predicate code is unknown
+        """
+        codes = set(predicate_codes) or {PREDICATE_INTERSECTS}
+        unknown = codes - set(_ENGINE_PREDICATES) - {PREDICATE_DISJOINT}
+        if unknown:
+            raise ValueError(f"Unsupported selectbylocation predicate codes: {sorted(unknown)}")
+
+        check_disjoint = PREDICATE_DISJOINT in codes
+        methods: List[str] = [_ENGINE_PREDICATES[c] for c in sorted(codes) if c != PREDICATE_DISJOINT]
+
+        if not self.build(target_layer.crs()):
+            # No usable source: every target is disjoint, nothing else matches
+            if not check_disjoint:
+                return set()
+            return {f.id() for f in target_layer.getFeatures(
+                QgsFeatureRequest().setNoAttributes().setFlags(QgsFeatureRequest.NoGeometry))}
+
+        start = time.perf_counter()
+        request = QgsFeatureRequest().setSubsetOfAttributes([])
+        if not check_disjoint:
+            # Every positive predicate implies bbox intersection with some source
+            request.setFilterRect(self._extent)
+
+        matched: Set[int] = set()
+        stats = self.stats
+        for scanned, feature in enumerate(target_layer.getFeatures(request), 1):
+            if scanned % CANCEL_CHECK_INTERVAL == 0 and self._is_canceled():
+                logger.info("[OGR Native] Selection canceled")
+                return set()
+
+            stats.target_scanned += 1
+            geom = feature.geometry()
+            if geom is None or geom.isNull() or geom.isEmpty():
+                if check_disjoint:
+                    matched.add(feature.id())
+                continue
+
+            target = geom.constGet()
+            is_match = False
+            intersects_any = False
+            for key in self._index.intersects(geom.boundingBox()):
+                engine = self._prepared_engine(key)
+                for method in methods:
+                    stats.predicate_tests += 1
+                    if getattr(engine, method)(target):
+                        is_match = True
+                        break
+                if is_match:
+                    break
+                if check_disjoint and not intersects_any:
+                    stats.predicate_tests += 1
+                    intersects_any = engine.intersects(target)
+                    if intersects_any and not methods:
+                        break
+
+            if is_match or (check_disjoint and not intersects_any):
+                matched.add(feature.id())
+
+        stats.matched = len(matched)
+        stats.scan_ms = (time.perf_counter() - start) * 1000
+        logger.info(
+            f"[OGR Native] {target_layer.name()}: {stats.matched} / {stats.target_scanned} matched, "
+            f"{stats.predicate_tests} predicate tests, {stats.prepared_geometries} prepared "
+            f"(index {stats.index_build_ms:.0f}ms, scan {stats.scan_ms:.0f}ms)"
+        )
+        return matched
+
+
+def _select_behavior(method: int):
+    """Map a selectbylocation METHOD code to the QGIS selection behavior enum."""
+    from qgis.core import Qgis, QgsVectorLayer
+    behaviors = getattr(Qgis, 'SelectBehavior', QgsVectorLayer)
+    return {
+        METHOD_NEW_SELECTION: behaviors.SetSelection,
+        METHOD_ADD_TO_SELECTION: behaviors.AddToSelection,
+        METHOD_SELECT_WITHIN_SELECTION: behaviors.IntersectSelection,
+        METHOD_REMOVE_FROM_SELECTION: behaviors.RemoveFromSelection,
+    }[method]
+
+
+def select_by_location_native(
+    target_layer,
+    source_layer,
+    predicate_codes: Iterable[int],
+    method: int = METHOD_NEW_SELECTION,
+    feedback=None,
+    engine: Optional[NativeSpatialSelectionEngine] = None,
+    fids: Optional[Iterable[int]] = None
+) -> Set[int]:
+    """
+    Drop-in equivalent of qgis:selectbylocation on ``target_layer``.
+
+    Args:
+        target_layer: Layer whose selection is modified
+        source_layer: Comparison (INTERSECT) layer
+        predicate_codes: selectbylocation predicate codes
+        method: selectbylocation METHOD code (0-3)
+        feedback: Optional QgsFeedback for cancellation
+        engine: Optional engine already built on ``source_layer``
+        fids: Matching FIDs computed elsewhere (e.g. by the OGR process
+              pool); only ``method`` is applied
+
+    Returns:
+        Set[int]: FIDs matching the predicates (before applying ``method``)
+    """
+    if fids is not None:
+        fids = set(fids)
+    else:
+        engine = engine or NativeSpatialSelectionEngine(source_layer, feedback)
+        fids = engine.select_fids(target_layer, predicate_codes)
+    if feedback is not None and feedback.isCanceled():
+        return set()
+    target_layer.selectByIds(list(fids), _select_behavior(method))
+    return fids
+
+
+__all__ = [
+    'NativeSpatialSelectionEngine',
+    'NativeSelectionStats',
+    'select_by_location_native',
+    'PREDICATE_INTERSECTS',
+    'PREDICATE_CONTAINS',
+    'PREDICATE_DISJOINT',
+    'PREDICATE_EQUALS',
+    'PREDICATE_TOUCHES',
+    'PREDICATE_OVERLAPS',
+    'PREDICATE_WITHIN',
+    'PREDICATE_CROSSES',
+    'METHOD_NEW_SELECTION',
+    'METHOD_ADD_TO_SELECTION',
+    'METHOD_SELECT_WITHIN_SELECTION',
+    'METHOD_REMOVE_FROM_SELECTION',
+]
@@ -54,6 +54,12 @@ from .filter_chain_optimizer import (  # noqa: F401
     optimize_filter_chain,
 )
 
+# v4.2.0: Content-addressed materialized view cache
+from .mv_cache import MaterializedViewCache, get_mv_cache, remove_change_counters  # noqa: F401
+
+# v4.2.0: Tiled, resumable EXISTS evaluation of very large sources
+from .tiled_exists import TiledExistsEvaluator, TiledExistsResult  # noqa: F401
+
 # v4.1.1: Backward compatibility alias (legacy name from modules/)
 # This alias allows code that imports PostgreSQLGeometricFilter to work
 # with the renamed PostgreSQLBackend class
@@ -106,4 +112,11 @@ __all__ = [
     'execute_unfilter_action_postgresql',
     # v4.1.0: Expression Builder
     'PostgreSQLExpressionBuilder',
+    # v4.2.0: Materialized view cache
+    'MaterializedViewCache',
+    'get_mv_cache',
+    'remove_change_counters',
+    # v4.2.0: Tiled EXISTS evaluation
+    'TiledExistsEvaluator',
+    'TiledExistsResult',
 ]
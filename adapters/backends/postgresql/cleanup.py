@@ -274,6 +274,10 @@ class PostgreSQLCleanupService:
 
             # Filter to views not belonging to known sessions
             for view_name in all_views:
+                # v4.2.0: Cached views are shared across sessions, evicted by the MV cache quota
+                if view_name.startswith('fm_temp_mv_cache_'):
+                    continue
+
                 # Extract session ID from view name
                 # New format: fm_temp_mv_{session_id}_{...}
                 # Legacy format: mv_{session_id}_{...}
@@ -522,6 +526,7 @@ class PostgreSQLCleanupService:
         patterns = [
             'filtermate_mv_%',      # Main MV pattern
             'fm_temp_mv_%',         # New temp MV pattern
+            'fm_temp_pk_%',         # v4.2.0: PK-only result tables
             'fm_temp_buf_%',        # Buffer tables
             'filtermate_temp_%',    # Legacy temp objects
         ]
@@ -177,7 +177,8 @@ class PostgreSQLExpressionBuilder(GeometricFilterPort):
             buffer_expression: Dynamic buffer expression
             source_filter: Source layer filter (for EXISTS)
             use_centroids: Use centroid optimization
-            **kwargs: source_wkt, source_srid, source_feature_count
+            **kwargs: source_wkt, source_srid, source_feature_count,
+                tiled_exists_config, cancel_check, progress_handler (v4.2.0)
 
         Returns:
             PostGIS SQL expression string
@@ -248,15 +249,30 @@ class PostgreSQLExpressionBuilder(GeometricFilterPort):
 
         # Determine strategy
         wkt_length = len(source_wkt) if source_wkt else 0
-        use_simple_wkt = (
+        simple_candidate = (
             source_wkt is not None and
             source_srid is not None and
             source_feature_count is not None and
-            source_feature_count <= self.SIMPLE_WKT_THRESHOLD and
-            wkt_length <= self.MAX_WKT_LENGTH
+            source_feature_count <= self.SIMPLE_WKT_THRESHOLD
         )
 
-        if use_simple_wkt:
+        # v4.2.0: Large source geometries are uploaded once as WKB and
+        # referenced by id, so MAX_WKT_LENGTH no longer forces EXISTS mode.
+        # The batch planner may already have uploaded it for this connection.
+        source_geom_ref = None
+        if simple_candidate and layer_props.get('source_geometry_srid') == source_srid:
+            source_geom_ref = layer_props.get('source_geometry_ref')
+        if simple_candidate and source_geom_ref is None:
+            source_geom_ref = self._upload_source_geometry(
+                layer, kwargs.get('temp_schema'), source_wkt, source_srid, kwargs.get('source_wkb')
+            )
+        use_simple_wkt = simple_candidate and (
+            wkt_length <= self.MAX_WKT_LENGTH or source_geom_ref is not None
+        )
+
+        if use_simple_wkt and source_geom_ref:
+            self.log_info(f"📝 Using SIMPLE mode with uploaded WKB source ({source_feature_count} features)")
+        elif use_simple_wkt:
             self.log_info(f"📝 Using SIMPLE WKT mode ({source_feature_count} features, {wkt_length} chars)")
         else:
             self.log_info("📝 Using EXISTS subquery mode")
@@ -355,7 +371,8 @@ class PostgreSQLExpressionBuilder(GeometricFilterPort):
                     predicate_func=predicate_func,
                     source_wkt=source_wkt,
                     source_srid=source_srid,
-                    buffer_value=buffer_value
+                    buffer_value=buffer_value,
+                    source_geom_ref=source_geom_ref
                 )
             else:
                 # CRITICAL: Use unqualified geom_expr for EXISTS subquery
@@ -395,6 +412,14 @@ class PostgreSQLExpressionBuilder(GeometricFilterPort):
             self.log_info(f"🔗 Filter chaining: Combined {len(all_exists)} EXISTS clauses at top level")
             self.log_debug(f"   Final chained expression preview: {final_expr[:300]}...")
 
+        # v4.2.0: Very large sources are evaluated tile by tile into a PK table
+        if not use_simple_wkt:
+            tiled_expr = self._evaluate_tiled_exists(
+                layer, layer_props, schema, table, geom_field, final_expr, source_feature_count, kwargs
+            )
+            if tiled_expr:
+                final_expr = tiled_expr
+
         # DIAGNOSTIC: Log the final expression
         self.log_info(f"✅ PostgreSQL expression built: {final_expr[:200]}...")
 
@@ -1098,7 +1123,8 @@ class PostgreSQLExpressionBuilder(GeometricFilterPort):
         predicate_func: str,
         source_wkt: str,
         source_srid: int,
-        buffer_value: Optional[float] = None
+        buffer_value: Optional[float] = None,
+        source_geom_ref: Optional[str] = None
     ) -> str:
         """
         Build simple PostGIS expression using direct WKT.
@@ -1109,12 +1135,17 @@ class PostgreSQLExpressionBuilder(GeometricFilterPort):
             source_wkt: Source geometry WKT
             source_srid: Source SRID
             buffer_value: Optional buffer distance
+            source_geom_ref: Reference to the uploaded source geometry
+                (already made valid); replaces the WKT literal when set
 
         Returns:
             PostGIS SQL expression
         """
         # Build source geometry with ST_MakeValid
-        source_geom_sql = f"ST_MakeValid(ST_GeomFromText('{source_wkt}', {source_srid}))"
+        if source_geom_ref:
+            source_geom_sql = source_geom_ref
+        else:
+            source_geom_sql = f"ST_MakeValid(ST_GeomFromText('{source_wkt}', {source_srid}))"
 
         # Apply buffer if specified
         if buffer_value is not None and buffer_value != 0:
@@ -1133,6 +1164,149 @@ class PostgreSQLExpressionBuilder(GeometricFilterPort):
 
         return f"{predicate_func}({geom_expr}, {source_geom_sql})"
 
+    def _upload_source_geometry(
+        self,
+        layer,
+        schema: str,
+        source_wkt: str,
+        source_srid: int,
+        source_wkb: Optional[bytes] = None
+    ) -> Optional[str]:
+        """
+        Upload the source geometry once as bound WKB (v4.2.0).
+
+        Skipped for small WKT, where an inline literal is cheaper than the
+        round trip.
+
+        Args:
+            layer: Target layer (provides the connection)
+            schema: FilterMate temp schema, never the layer's data schema
+                (None: no upload)
+            source_wkt: Source geometry WKT
+            source_srid: Source SRID
+            source_wkb: Source geometry WKB if already available
+
+        Returns:
+            SQL reference to the uploaded geometry, or None to use inline WKT
+        """
+        try:
+            from ....infrastructure.constants import (
+                GEOMETRY_TRANSPORT_ENABLED,
+                GEOMETRY_TRANSPORT_MIN_WKT_LENGTH,
+            )
+            from ....infrastructure.database.geometry_transport import (
+                postgresql_source_geometry_ref,
+                upload_source_geometry_postgresql,
+                wkt_to_wkb,
+            )
+            from ....infrastructure.database.connection_pool import pooled_connection_from_layer
+        except ImportError:
+            return None
+
+        if not GEOMETRY_TRANSPORT_ENABLED or not layer or not schema:
+            return None
+        if len(source_wkt) < GEOMETRY_TRANSPORT_MIN_WKT_LENGTH and not source_wkb:
+            return None
+
+        wkb = source_wkb or wkt_to_wkb(source_wkt)
+        if not wkb:
+            return None
+
+        with pooled_connection_from_layer(layer) as (connexion, _):
+            if not connexion:
+                return None
+            geom_id = upload_source_geometry_postgresql(connexion, schema, wkb, source_srid)
+        if not geom_id:
+            return None
+        self.log_info(f"📦 Source geometry referenced by id {geom_id} ({len(wkb)} bytes WKB)")
+        return postgresql_source_geometry_ref(schema, geom_id)
+
+    def _evaluate_tiled_exists(
+        self,
+        layer,
+        layer_props: Dict,
+        schema: str,
+        table: str,
+        geom_field: str,
+        expression: str,
+        source_feature_count: Optional[int],
+        options: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Evaluate an EXISTS expression tile by tile (v4.2.0).
+
+        Used from TILED_EXISTS.min_source_features source features: the
+        matches accumulate in a PK table, with per-tile progress, and a
+        canceled run resumes from its completed tiles (see tiled_exists).
+        layer_props['_execution_strategy'] ('direct' or 'progressive', set
+        from the learned cost model) overrides that threshold.
+
+        Args:
+            layer: Target layer (provides the connection)
+            layer_props: Layer properties (primary key)
+            schema: Target schema
+            table: Target table
+            geom_field: Target geometry column
+            expression: EXISTS expression built for the target
+            source_feature_count: Source features of the filter
+            options: build_expression() kwargs (tiled_exists_config,
+                     temp_schema, cancel_check, progress_handler)
+
+        Returns:
+            "pk" IN (SELECT ...) expression, or None to keep the single statement
+        """
+        config = options.get('tiled_exists_config') or {}
+        primary_key_name = layer_props.get('primary_key_name')
+        temp_schema = options.get('temp_schema')
+        if not (layer and primary_key_name and temp_schema and config.get('enabled')):
+            return None
+        # The learned cost model may override the size threshold (FilterOrchestrator)
+        strategy = layer_props.get('_execution_strategy')
+        if source_feature_count is None or strategy == 'direct':
+            return None
+        if strategy != 'progressive' and source_feature_count < config.get('min_source_features', 100000):
+            return None
+
+        try:
+            from ....infrastructure.database.connection_pool import pooled_connection_from_layer
+            from ....infrastructure.database.query_profiler import get_query_profiler
+            from .schema_manager import ensure_temp_schema_exists
+            from .tiled_exists import TiledExistsEvaluator
+        except ImportError:
+            return None
+
+        # Same normalization as apply_filter(), the tiles run the expression as is
+        expression = self._normalize_column_case(expression, layer)
+        expression = self._apply_numeric_type_casting(expression, layer)
+
+        evaluator = TiledExistsEvaluator(
+            rows_per_tile=config.get('rows_per_tile', 50000),
+            tile_timeout_seconds=config.get('tile_timeout_seconds', 60),
+            profiler=get_query_profiler()
+        )
+        self.log_info(f"🧩 Tiled EXISTS evaluation ({source_feature_count} source features)")
+        try:
+            with pooled_connection_from_layer(layer) as (connexion, _):
+                if not connexion:
+                    return None
+                # The result tables never go to a data schema
+                if ensure_temp_schema_exists(connexion, temp_schema) != temp_schema:
+                    self.log_warning(f"Temp schema {temp_schema} unavailable, using a single statement")
+                    return None
+                result = evaluator.evaluate(
+                    connexion, schema, table, geom_field, primary_key_name, expression, temp_schema,
+                    cancel_check=options.get('cancel_check'),
+                    progress_handler=options.get('progress_handler'),
+                    layer_name=layer_props.get('layer_name')
+                )
+        except Exception as e:
+            self.log_warning(f"Tiled EXISTS evaluation failed, using a single statement: {e}")
+            return None
+
+        if result is None or not result.complete:
+            return None
+        return result.expression
+
     def _build_exists_expression(
         self,
         geom_expr: str,
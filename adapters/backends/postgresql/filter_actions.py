@@ -18,7 +18,7 @@ Created: January 2026 (EPIC-1 Phase E5/E6)
 import logging
 import re
 import time
-from typing import Optional, Tuple, Callable
+from typing import Any, Callable, Dict, Optional, Tuple
 
 # EPIC-1 E4-S9: Import centralized HistoryRepository
 from ...repositories.history_repository import HistoryRepository
@@ -59,6 +59,40 @@ STYLE_PATTERNS = [
 # Helper Functions
 # =============================================================================
 
+def _mv_subset_string(primary_key_name: str, schema: str, mv_name: str) -> str:
+    """Build the layer subset string selecting the primary keys stored in an MV or PK table."""
+    return (
+        f'"{primary_key_name}" IN '
+        f'(SELECT "{mv_name}"."{primary_key_name}" FROM "{schema}"."{mv_name}")'  # nosec B608
+    )
+
+
+def _acquire_cached_view(connexion, schema, sql_subset_string, geom_key_name, layer,
+                         create_simple_mv_fn, mv_cache_config, primary_key_name):
+    """
+    Get the content-addressed MV (or PK table) of a query (v4.2.0).
+
+    Returns:
+        CachedView, or None when the cache is disabled or the query cannot be cached
+    """
+    from .mv_cache import get_mv_cache
+
+    cache = get_mv_cache()
+    if mv_cache_config:
+        cache.configure(**mv_cache_config)
+    return cache.acquire(
+        connexion, schema, sql_subset_string, geom_key_name, layer.id(), create_simple_mv_fn,
+        primary_key_name=primary_key_name
+    )
+
+
+def _release_cached_view(layer):
+    """Release the cached MV a layer's previous filter used (v4.2.0)."""
+    from .mv_reference_tracker import get_mv_reference_tracker
+
+    get_mv_reference_tracker().release_cached_reference(layer.id())
+
+
 def has_expensive_spatial_expression(sql_string: str) -> bool:
     """
     Check if SQL contains complex spatial predicates that are expensive to re-execute.
@@ -286,7 +320,8 @@ def execute_filter_action_postgresql(
     current_mv_schema: str = "filter_mate_temp",
     project_uuid: str = None,
     session_id: str = None,
-    param_buffer_expression: str = None
+    param_buffer_expression: str = None,
+    mv_cache_config: Optional[Dict[str, Any]] = None
 ) -> bool:
     """
     Execute filter action using PostgreSQL backend.
@@ -327,6 +362,7 @@ def execute_filter_action_postgresql(
         project_uuid: Project UUID for history
         session_id: Session ID for view naming
         param_buffer_expression: Buffer expression for custom mode
+        mv_cache_config: MATERIALIZED_VIEW_CACHE settings (quota_mb, max_age_hours)
 
     Returns:
         bool: True if successful
@@ -401,7 +437,8 @@ def execute_filter_action_postgresql(
             current_mv_schema=current_mv_schema,
             project_uuid=project_uuid,
             session_id=session_id,
-            param_buffer_expression=param_buffer_expression
+            param_buffer_expression=param_buffer_expression,
+            mv_cache_config=mv_cache_config
         )
     else:
         # Small dataset - use direct setSubsetString
@@ -409,6 +446,8 @@ def execute_filter_action_postgresql(
             f"PostgreSQL: Small dataset ({feature_count:,} features < {MATERIALIZED_VIEW_THRESHOLD:,}). "
             "Using direct setSubsetString for simplicity."
         )
+        # v4.2.0: The cached MV of the previous filter is no longer used by this layer
+        _release_cached_view(layer)
 
         return execute_filter_action_postgresql_direct(
             layer=layer,
@@ -452,7 +491,8 @@ def execute_filter_action_postgresql(
                 current_mv_schema=current_mv_schema,
                 project_uuid=project_uuid,
                 session_id=session_id,
-                param_buffer_expression=param_buffer_expression
+                param_buffer_expression=param_buffer_expression,
+                mv_cache_config=mv_cache_config
             )
         )
 
@@ -587,7 +627,8 @@ def execute_filter_action_postgresql_materialized(
     current_mv_schema: str = "filter_mate_temp",
     project_uuid: str = None,
     session_id: str = None,
-    param_buffer_expression: str = None
+    param_buffer_expression: str = None,
+    mv_cache_config: Optional[Dict[str, Any]] = None
 ) -> bool:
     """
     Execute PostgreSQL filter using materialized views (for large datasets).
@@ -624,6 +665,7 @@ def execute_filter_action_postgresql_materialized(
         project_uuid: Project UUID for history
         session_id: Session ID for view naming
         param_buffer_expression: Buffer expression for custom mode
+        mv_cache_config: MATERIALIZED_VIEW_CACHE settings (quota_mb, max_age_hours)
 
     Returns:
         bool: True if successful
@@ -650,6 +692,21 @@ def execute_filter_action_postgresql_materialized(
     # Ensure source table has statistics for query optimization
     ensure_stats_fn(connexion, source_schema, source_table, geom_key_name)
 
+    # v4.2.0: Reuse the MV of an identical query (undo/redo, favorites, shared source query)
+    if not custom:
+        cached_view = _acquire_cached_view(
+            connexion, schema, sql_subset_string, geom_key_name, layer,
+            create_simple_mv_fn, mv_cache_config, primary_key_name
+        )
+        if cached_view is not None:
+            insert_history_fn(cur, conn, layer, sql_subset_string, seq_order)
+            queue_subset_fn(layer, _mv_subset_string(primary_key_name, schema, cached_view.name))
+            logger.info(
+                f"Filter result ({cached_view.result_store}) {'reused' if cached_view.reused else 'created'} "
+                f"in {time.time() - start_time:.2f}s. Filter queued for application on main thread."
+            )
+            return True
+
     # Build SQL commands using session-prefixed name (v4.4.4: fm_temp_mv_ prefix)
     sql_drop = (
         f'DROP INDEX IF EXISTS {schema}_{session_name}_cluster CASCADE; '
@@ -716,10 +773,8 @@ def execute_filter_action_postgresql_materialized(
 
     # Set subset string on layer using session-prefixed view name
     # THREAD SAFETY: Queue for application in finished()
-    layer_subset_string = (
-        f'"{primary_key_name}" IN '
-        f'(SELECT "mv_{session_name}"."{primary_key_name}" FROM "{schema}"."mv_{session_name}")'  # nosec B608
-    )
+    # v4.2.0: Reference the fm_temp_mv_ view actually created
+    layer_subset_string = _mv_subset_string(primary_key_name, schema, f"fm_temp_mv_{session_name}")
     logger.debug(f"[PostgreSQL] Layer subset string: {layer_subset_string}")
     queue_subset_fn(layer, layer_subset_string)
 
@@ -800,12 +855,17 @@ def execute_reset_action_postgresql(
 
     sql_drop = f'DROP MATERIALIZED VIEW IF EXISTS "{schema}"."mv_{session_name}" CASCADE;'
     sql_drop += f' DROP MATERIALIZED VIEW IF EXISTS "{schema}"."mv_{session_name}_dump" CASCADE;'
+    sql_drop += f' DROP MATERIALIZED VIEW IF EXISTS "{schema}"."fm_temp_mv_{session_name}" CASCADE;'
+    sql_drop += f' DROP MATERIALIZED VIEW IF EXISTS "{schema}"."fm_temp_mv_{session_name}_dump" CASCADE;'
     sql_drop += f' DROP INDEX IF EXISTS {schema}_{session_name}_cluster CASCADE;'
 
     connexion = get_connection_fn()
     execute_commands_fn(connexion, [sql_drop])
     logger.debug(f"[PostgreSQL] Materialized View Dropped - Schema: {schema} - Session: {session_name}")
 
+    # v4.2.0: Cached MVs are shared, they stay until evicted
+    _release_cached_view(layer)
+
     # THREAD SAFETY: Queue subset clear for application in finished()
     queue_subset_fn(layer, '')
     logger.info(f"[PostgreSQL] Reset Complete - Layer: {layer.name()} - Filter cleared")
@@ -828,13 +888,17 @@ def execute_unfilter_action_postgresql(
     create_simple_mv_fn: Callable,
     # Context parameters
     project_uuid: str = None,
-    current_mv_schema: str = "filter_mate_temp"
+    current_mv_schema: str = "filter_mate_temp",
+    mv_cache_config: Optional[Dict[str, Any]] = None
 ) -> bool:
     """
     Execute unfilter action for PostgreSQL (restore previous filter state).
 
     Removes the most recent filter and restores the previous one from history.
 
+    v4.2.0: The previous filter's MV is usually still cached, restoring it
+    then only rewrites the layer subset string.
+
     Args:
         layer: QgsVectorLayer to unfilter
         primary_key_name: Primary key field name
@@ -850,6 +914,7 @@ def execute_unfilter_action_postgresql(
         create_simple_mv_fn: Function to create simple MV SQL
         project_uuid: Project UUID for history
         current_mv_schema: Schema for materialized views
+        mv_cache_config: MATERIALIZED_VIEW_CACHE settings (quota_mb, max_age_hours)
 
     Returns:
         bool: True if successful
@@ -877,41 +942,55 @@ def execute_unfilter_action_postgresql(
                 f"[PostgreSQL] Empty Previous Subset - Layer: {layer.name()} - "
                 "History entry exists but subset string is empty. Clearing filter."
             )
+            _release_cached_view(layer)
             queue_subset_fn(layer, '')
             return True
 
         schema = current_mv_schema
+        connexion = get_connection_fn()
+
+        # v4.2.0: Undo/redo usually finds the previous filter's MV in the cache
+        cached_view = _acquire_cached_view(
+            connexion, schema, sql_subset_string, geom_key_name, layer,
+            create_simple_mv_fn, mv_cache_config, primary_key_name
+        )
+        if cached_view is not None:
+            queue_subset_fn(layer, _mv_subset_string(primary_key_name, schema, cached_view.name))
+            logger.info(
+                f"[PostgreSQL] Unfilter Complete - Layer: {layer.name()} - Previous state restored "
+                f"({'cached view reused' if cached_view.reused else 'view rebuilt'})"
+            )
+            return True
+
         session_name = get_session_name_fn(name)
+        mv_name = f"fm_temp_mv_{session_name}"
 
+        # v4.2.0: Use the fm_temp_mv_ name create_simple_mv_fn creates
         sql_drop = (
             f'DROP INDEX IF EXISTS {schema}_{session_name}_cluster CASCADE; '
-            f'DROP MATERIALIZED VIEW IF EXISTS "{schema}"."mv_{session_name}" CASCADE;'
+            f'DROP MATERIALIZED VIEW IF EXISTS "{schema}"."{mv_name}" CASCADE;'
         )
         sql_create = create_simple_mv_fn(schema, session_name, sql_subset_string)
         sql_create_index = (
             f'CREATE INDEX IF NOT EXISTS {schema}_{session_name}_cluster '
-            f'ON "{schema}"."mv_{session_name}" USING GIST ({geom_key_name});'
+            f'ON "{schema}"."{mv_name}" USING GIST ({geom_key_name});'
         )
         sql_cluster = (
-            f'ALTER MATERIALIZED VIEW IF EXISTS "{schema}"."mv_{session_name}" '
+            f'ALTER MATERIALIZED VIEW IF EXISTS "{schema}"."{mv_name}" '
             f'CLUSTER ON {schema}_{session_name}_cluster;'
         )
-        sql_analyze = f'ANALYZE VERBOSE "{schema}"."mv_{session_name}";'
+        sql_analyze = f'ANALYZE VERBOSE "{schema}"."{mv_name}";'
 
         sql_create = sql_create.replace('\n', '').replace('\t', '').replace('  ', ' ').strip()
 
-        connexion = get_connection_fn()
         execute_commands_fn(connexion, [sql_drop, sql_create, sql_create_index, sql_cluster, sql_analyze])
         logger.debug(f"[PostgreSQL] Materialized View Recreated - Schema: {schema} - Session: {session_name} - Previous filter restored")
 
-        layer_subset_string = (
-            f'"{primary_key_name}" IN '
-            f'(SELECT "mv_{session_name}"."{primary_key_name}" FROM "{schema}"."mv_{session_name}")'  # nosec B608
-        )
-        queue_subset_fn(layer, layer_subset_string)
+        queue_subset_fn(layer, _mv_subset_string(primary_key_name, schema, mv_name))
         logger.info(f"[PostgreSQL] Unfilter Complete - Layer: {layer.name()} - Previous state restored")
     else:
         # No previous filter - clear
+        _release_cached_view(layer)
         queue_subset_fn(layer, '')
         logger.info(f"[PostgreSQL] No Previous Filter - Layer: {layer.name()} - Filter cleared")
 
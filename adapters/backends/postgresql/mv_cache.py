@@ -0,0 +1,813 @@
+# -*- coding: utf-8 -*-
+"""
+FilterMate PostgreSQL Materialized View Cache
+
+v4.2.0 - Content-addressed MV reuse (October 2026)
+
+Materialized views built for a filter are named after a hash of the
+normalized defining query and of the versions of the tables it reads.
+Re-applying an identical query (undo/redo, a favorite, two layers sharing
+a source query) finds the MV already built and reuses it instead of
+running CREATE / INDEX / ANALYZE again.
+
+Table versions:
+    The relations a query reads are taken from its plan (EXPLAIN VERBOSE),
+    so unqualified names, views and subqueries resolve to the tables
+    actually scanned. Foreign tables and materialized views not built by
+    FilterMate make the query uncacheable. Two versioning modes exist
+    (MATERIALIZED_VIEW_CACHE.table_versioning):
+
+    statistics (default): no DDL on user objects. A table version is its
+        relfilenode (changed by TRUNCATE, VACUUM FULL, CLUSTER) and its
+        cumulative pg_stat insert/update/delete counters. Tables of at most
+        STATISTICS_EXACT_MAX_PAGES pages also get count(*) and max(xmin),
+        which change with every committed write. On larger tables a write
+        may go unseen until the writer's statistics are flushed (about a
+        second, longer for idle sessions): a stale MV can be reused in
+        that window. Without track_counts, large tables are uncacheable.
+
+    triggers (opt-in): each table gets a statement-level trigger
+        (fm_change_counter, SECURITY DEFINER) appending to the
+        fm_table_versions change log of the temp schema, in the writer's
+        transaction: a committed write always changes the table version
+        and the stale MV is never reused. Creating the trigger waits for
+        the writers in progress (lock_timeout) and requires owning the
+        table. The change log is not a fm_temp_* object: session cleanups
+        keep it. remove_change_counters() drops the triggers, the function
+        and the log (dropping the temp schema also removes them); switching
+        back to statistics does not.
+
+Result stores (v4.2.0):
+    materialized_view: full rows with a GiST index, usable as a source by
+        chained filters.
+    pk_table: an UNLOGGED table holding only the primary keys, filled with
+        INSERT ... SELECT and indexed with a btree. Layers only ever read it
+        through "pk" IN (SELECT "pk" FROM ...), so geometries are not copied.
+        Temporary tables are not an option: the QGIS provider reads the
+        subset through its own connection. The catalog table is UNLOGGED
+        too, so a crash that empties the result tables also forgets them.
+
+Lifecycle:
+    MVReferenceTracker refcounts cached MVs per layer. A cached MV no layer
+    uses is kept for later reuse until the schema quota (total size) or the
+    maximum idle age is exceeded, least recently used first. Usage is
+    recorded in the fm_temp_mv_cache table of the temp schema so that MVs
+    left by other sessions are evicted too.
+
+    The layers using a cached MV hold a lease in fm_temp_mv_cache_leases,
+    renewed by each cache access of their QGIS instance. Leased MVs are
+    never evicted, whichever session runs the eviction; leases of
+    instances that stopped renewing them expire after LEASE_TTL_HOURS.
+    An MV is only dropped if its catalog entry was not touched since the
+    eviction read it, so a concurrent reuse keeps it.
+
+Author: FilterMate Team
+Date: October 2026
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .mv_reference_tracker import MVReferenceTracker, get_mv_reference_tracker
+
+logger = logging.getLogger('FilterMate.PostgreSQL.MVCache')
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+MV_CACHE_PREFIX = "fm_temp_mv_cache_"
+PK_CACHE_PREFIX = "fm_temp_pk_cache_"
+MV_CACHE_CATALOG = "fm_temp_mv_cache"
+MV_CACHE_LEASES = "fm_temp_mv_cache_leases"
+DEFAULT_QUOTA_MB = 1024
+DEFAULT_MAX_AGE_HOURS = 24
+
+# Leases not renewed for this long belong to a closed or crashed QGIS instance
+LEASE_TTL_HOURS = 72
+
+# Identifies the leases of this QGIS instance
+LEASE_HOLDER = uuid.uuid4().hex
+
+RESULT_STORE_MATERIALIZED_VIEW = 'materialized_view'
+RESULT_STORE_PK_TABLE = 'pk_table'
+RESULT_STORES = (RESULT_STORE_MATERIALIZED_VIEW, RESULT_STORE_PK_TABLE)
+
+# Change log of the tables read by cached queries (see change_counter_commands())
+CHANGE_LOG_TABLE = "fm_table_versions"
+CHANGE_LOG_FUNCTION = "fm_log_table_change"
+CHANGE_LOG_TRIGGER = "fm_change_counter"
+# Log rows of one table beyond which they are summed into one row
+CHANGE_LOG_COMPACT_ROWS = 1000
+# Wait for the writers in progress before giving up on a trigger
+TRIGGER_LOCK_TIMEOUT = '2s'
+
+# Table versioning modes (see the module docstring)
+VERSIONING_STATISTICS = 'statistics'
+VERSIONING_TRIGGERS = 'triggers'
+VERSIONING_MODES = (VERSIONING_STATISTICS, VERSIONING_TRIGGERS)
+# Tables up to this size (8 kB pages) get an exact count(*)/max(xmin) check
+STATISTICS_EXACT_MAX_PAGES = 1280
+
+# Materialized views built by FilterMate: replaced (new relfilenode), never refreshed concurrently
+FILTERMATE_VIEW_PREFIXES = ('fm_', 'filtermate_')
+
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+
+RELATIONS_SQL = """
+    SELECT n.nspname, c.relname, c.oid, c.relkind, c.relfilenode,
+           CASE WHEN c.relispartition THEN pg_partition_root(c.oid) END
+    FROM unnest(%s::text[], %s::text[]) AS t(schema_name, table_name)
+    JOIN pg_namespace n ON n.nspname = t.schema_name
+    JOIN pg_class c ON c.relnamespace = n.oid AND c.relname = t.table_name
+"""
+
+CHANGE_LOG_OIDS_SQL = "SELECT to_regclass(%s)::oid, to_regprocedure(%s)::oid"
+
+STATISTICS_SQL = """
+    SELECT c.oid, c.oid::regclass::text,
+           pg_relation_size(c.oid) / current_setting('block_size')::int,
+           pg_stat_get_tuples_inserted(c.oid), pg_stat_get_tuples_updated(c.oid),
+           pg_stat_get_tuples_deleted(c.oid), current_setting('track_counts')::bool
+    FROM pg_class c
+    WHERE c.oid = ANY(%s::oid[])
+"""
+
+
+# =============================================================================
+# Content key
+# =============================================================================
+
+def normalize_query(sql: str) -> str:
+    """
+    Normalize a query for hashing: collapse whitespace outside string literals.
+
+    Args:
+        sql: SQL query
+
+    Returns:
+        str: Normalized query
+    """
+    parts = []
+    last = 0
+    for match in _LITERAL_RE.finditer(sql):
+        parts.append(re.sub(r'\s+', ' ', sql[last:match.start()]))
+        parts.append(match.group(0))
+        last = match.end()
+    parts.append(re.sub(r'\s+', ' ', sql[last:]))
+    return ''.join(parts).strip().rstrip(';').strip()
+
+
+def referenced_tables(connexion, sql: str) -> List[Tuple[str, str]]:
+    """
+    List the relations a query scans, from its plan.
+
+    EXPLAIN VERBOSE resolves unqualified names through the search_path and
+    expands views, CTEs and subqueries into the tables they read. Tables
+    only read inside non-inlined SQL functions are not seen.
+
+    Args:
+        connexion: psycopg2 connection
+        sql: SELECT query
+
+    Returns:
+        List of (schema, name) tuples, without duplicates
+    """
+    with connexion.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (VERBOSE, FORMAT JSON) {normalize_query(sql)}')
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    tables = []
+    nodes = [entry['Plan'] for entry in plan]
+    while nodes:
+        node = nodes.pop(0)
+        if 'Relation Name' in node:
+            table = (node.get('Schema'), node['Relation Name'])
+            if table not in tables:
+                tables.append(table)
+        nodes.extend(node.get('Plans', []))
+    return tables
+
+
+def change_counter_commands(schema: str) -> List[str]:
+    """
+    Statements creating the change log and its trigger function in the temp schema.
+
+    The function runs as its owner (SECURITY DEFINER), so writers of a
+    source table need no privilege on the temp schema. A missing log table
+    never makes their writes fail; it is recreated with a new oid, which
+    is part of every version.
+    """
+    log = f'"{schema}"."{CHANGE_LOG_TABLE}"'
+    return [
+        f'CREATE TABLE IF NOT EXISTS {log} (relid oid NOT NULL, n bigint NOT NULL DEFAULT 1)',
+        f'CREATE INDEX IF NOT EXISTS "{CHANGE_LOG_TABLE}_relid" ON {log} (relid)',
+        f'''CREATE OR REPLACE FUNCTION "{schema}"."{CHANGE_LOG_FUNCTION}"() RETURNS trigger
+            LANGUAGE plpgsql SECURITY DEFINER SET search_path = pg_catalog, pg_temp AS $fm$
+            BEGIN
+                INSERT INTO {log} (relid) VALUES (TG_RELID);
+                RETURN NULL;
+            EXCEPTION WHEN undefined_table THEN
+                RETURN NULL;
+            END
+            $fm$''',
+    ]
+
+
+def _change_counts(connexion, schema: str, relids: List[int]) -> Dict[int, str]:
+    """
+    Install the change triggers of tables and read their write counts.
+
+    Raises:
+        Database errors (not owner, lock timeout): the tables cannot be versioned
+    """
+    log = f'"{schema}"."{CHANGE_LOG_TABLE}"'
+    function = f'"{schema}"."{CHANGE_LOG_FUNCTION}"'
+    with connexion.cursor() as cursor:
+        cursor.execute(CHANGE_LOG_OIDS_SQL, (log, f'{function}()'))
+        log_oid, function_oid = cursor.fetchone()
+        if log_oid is None or function_oid is None:
+            for command in change_counter_commands(schema):
+                cursor.execute(command)
+            cursor.execute(CHANGE_LOG_OIDS_SQL, (log, f'{function}()'))
+            log_oid, function_oid = cursor.fetchone()
+
+        trigger_sql = 'SELECT tgrelid, oid FROM pg_trigger WHERE tgname = %s AND tgfoid = %s AND tgrelid = ANY(%s::oid[])'
+        cursor.execute(trigger_sql, (CHANGE_LOG_TRIGGER, function_oid, relids))
+        triggers = dict(cursor.fetchall())
+        missing = [relid for relid in relids if relid not in triggers]
+        if missing:
+            cursor.execute(f"SET LOCAL lock_timeout = '{TRIGGER_LOCK_TIMEOUT}'")
+            cursor.execute('SELECT oid, oid::regclass::text FROM pg_class WHERE oid = ANY(%s::oid[])', (missing,))
+            for relid, qualified in cursor.fetchall():
+                cursor.execute(
+                    f'CREATE TRIGGER "{CHANGE_LOG_TRIGGER}" AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE '
+                    f'ON {qualified} FOR EACH STATEMENT EXECUTE PROCEDURE {function}()'
+                )
+                logger.info(f"[MVCache] Change counter installed on {qualified}")
+            cursor.execute(trigger_sql, (CHANGE_LOG_TRIGGER, function_oid, relids))
+            triggers = dict(cursor.fetchall())
+
+        cursor.execute(
+            f'SELECT relid, sum(n), count(*) FROM {log} WHERE relid = ANY(%s::oid[]) GROUP BY relid',  # nosec B608
+            (relids,)
+        )
+        counts = {}
+        compact = []
+        for relid, total, rows in cursor.fetchall():
+            counts[relid] = int(total)
+            if rows > CHANGE_LOG_COMPACT_ROWS:
+                compact.append(relid)
+        if compact:
+            # Sum preserved: the version does not change
+            cursor.execute(
+                f'WITH logged AS (DELETE FROM {log} WHERE relid = ANY(%s::oid[]) RETURNING relid, n) '  # nosec B608
+                f'INSERT INTO {log} (relid, n) SELECT relid, sum(n) FROM logged GROUP BY relid',
+                (compact,)
+            )
+    return {relid: f"{log_oid}.{triggers[relid]}.{counts.get(relid, 0)}" for relid in relids}
+
+
+def _statistics_counts(connexion, relids: List[int]) -> Optional[Dict[int, str]]:
+    """
+    Versions of tables from their statistics counters, without DDL.
+
+    Returns:
+        Dict of relid -> version, or None when a large table cannot be
+        versioned (track_counts off)
+    """
+    counts = {}
+    with connexion.cursor() as cursor:
+        cursor.execute(STATISTICS_SQL, (relids,))
+        for relid, qualified, pages, inserted, updated, deleted, track_counts in cursor.fetchall():
+            version = f"s{inserted or 0}.{updated or 0}.{deleted or 0}"
+            if pages <= STATISTICS_EXACT_MAX_PAGES:
+                cursor.execute(f'SELECT count(*), max(xmin::text::bigint) FROM {qualified}')  # nosec B608
+                rows, newest = cursor.fetchone()
+                version += f".{rows}.{newest or 0}"
+            elif not track_counts:
+                logger.debug(f"[MVCache] {qualified}: track_counts is off, table cannot be versioned")
+                return None
+            counts[relid] = version
+    return counts
+
+
+def remove_change_counters(connexion, schema: str) -> int:
+    """
+    Remove everything the triggers versioning mode installed.
+
+    Drops the fm_change_counter trigger of every table, the trigger
+    function and the fm_table_versions change log of ``schema``. Commits.
+
+    Args:
+        connexion: psycopg2 connection
+        schema: Temp schema holding the change log
+
+    Returns:
+        int: Number of triggers dropped
+
+    Raises:
+        Database errors (not owner, lock timeout), after rollback
+    """
+    log = f'"{schema}"."{CHANGE_LOG_TABLE}"'
+    function = f'"{schema}"."{CHANGE_LOG_FUNCTION}"'
+    try:
+        with connexion.cursor() as cursor:
+            cursor.execute(CHANGE_LOG_OIDS_SQL, (log, f'{function}()'))
+            _, function_oid = cursor.fetchone()
+            tables = []
+            if function_oid is not None:
+                cursor.execute(
+                    'SELECT tgrelid::regclass::text FROM pg_trigger WHERE tgname = %s AND tgfoid = %s',
+                    (CHANGE_LOG_TRIGGER, function_oid)
+                )
+                tables = [row[0] for row in cursor.fetchall()]
+            cursor.execute(f"SET LOCAL lock_timeout = '{TRIGGER_LOCK_TIMEOUT}'")
+            for qualified in tables:
+                cursor.execute(f'DROP TRIGGER IF EXISTS "{CHANGE_LOG_TRIGGER}" ON {qualified}')
+                logger.info(f"[MVCache] Change counter removed from {qualified}")
+            cursor.execute(f'DROP FUNCTION IF EXISTS {function}()')
+            cursor.execute(f'DROP TABLE IF EXISTS {log}')
+        connexion.commit()
+    except Exception:
+        connexion.rollback()
+        raise
+    return len(tables)
+
+
+def fetch_table_versions(
+    connexion,
+    schema: str,
+    tables: Sequence[Tuple[str, str]],
+    mode: str = VERSIONING_STATISTICS
+) -> Optional[Dict[Tuple[str, str], str]]:
+    """
+    Fetch the version of each relation a query reads.
+
+    In triggers mode, tables (and the root of a partition) get their change
+    trigger on first use. The caller commits.
+
+    Args:
+        connexion: psycopg2 connection
+        schema: Temp schema holding the change log (triggers mode)
+        tables: (schema, name) relations from referenced_tables()
+        mode: VERSIONING_STATISTICS or VERSIONING_TRIGGERS
+
+    Returns:
+        Dict of (schema, name) -> version string, or None when a relation
+        cannot be versioned (foreign table, external materialized view...)
+        or none was found
+
+    Raises:
+        Database errors while installing a trigger (not owner, lock timeout)
+    """
+    if not tables:
+        return None
+    with connexion.cursor() as cursor:
+        cursor.execute(
+            RELATIONS_SQL,
+            ([table_schema for table_schema, _ in tables], [name for _, name in tables])
+        )
+        rows = cursor.fetchall()
+    if len(rows) < len(set(tables)):
+        return None
+    relations = {}
+    counted = []
+    for table_schema, name, relid, relkind, relfilenode, root in rows:
+        if relkind == 'm' and name.startswith(FILTERMATE_VIEW_PREFIXES):
+            relations[(table_schema, name)] = (relfilenode, [])
+        elif relkind == 'r':
+            relids = [relid] + ([root] if root else [])
+            relations[(table_schema, name)] = (relfilenode, relids)
+            counted.extend(relid for relid in relids if relid not in counted)
+        else:
+            logger.debug(f"[MVCache] {table_schema}.{name} (relkind {relkind}) cannot be versioned")
+            return None
+    if not relations:
+        return None
+    counts = {}
+    if counted and mode == VERSIONING_TRIGGERS:
+        counts = _change_counts(connexion, schema, counted)
+    elif counted:
+        counts = _statistics_counts(connexion, counted)
+        if counts is None:
+            return None
+    return {
+        table: ':'.join([str(relfilenode)] + [counts[relid] for relid in relids])
+        for table, (relfilenode, relids) in relations.items()
+    }
+
+
+def content_key(sql: str, versions: Dict[Tuple[str, str], str], variant: str = '') -> str:
+    """
+    Hash a normalized query and the versions of the tables it reads.
+
+    Args:
+        sql: SQL query
+        versions: Table versions from fetch_table_versions()
+        variant: Distinguishes stores of the same query (e.g. the PK column)
+
+    Returns:
+        str: 20 hex characters
+    """
+    digest = hashlib.sha256(normalize_query(sql).encode('utf-8'))
+    if variant:
+        digest.update(f"\x00{variant}".encode('utf-8'))
+    for (schema, name), version in sorted(versions.items()):
+        digest.update(f"\x00{schema}.{name}={version}".encode('utf-8'))
+    return digest.hexdigest()[:20]
+
+
+def pk_table_commands(schema: str, table_name: str, sql_subset_string: str, primary_key_name: str) -> List[str]:
+    """
+    Build the statements storing the primary keys selected by a query.
+
+    Args:
+        schema: Temp schema
+        table_name: Result table name
+        sql_subset_string: Defining SELECT query
+        primary_key_name: Primary key column of the filtered layer
+
+    Returns:
+        List of SQL statements: create, fill, index, analyze
+    """
+    qualified = f'"{schema}"."{table_name}"'
+    source = f'SELECT "{primary_key_name}" FROM ({normalize_query(sql_subset_string)}) AS fm_result'  # nosec B608
+    return [
+        f'CREATE UNLOGGED TABLE {qualified} AS {source} WITH NO DATA',
+        f'INSERT INTO {qualified} {source}',  # nosec B608
+        f'CREATE INDEX IF NOT EXISTS "{table_name}_pk" ON {qualified} USING btree ("{primary_key_name}")',
+        f'ANALYZE {qualified}',
+    ]
+
+
+def _drop_statement(schema: str, name: str) -> str:
+    kind = 'TABLE' if name.startswith(PK_CACHE_PREFIX) else 'MATERIALIZED VIEW'
+    return f'DROP {kind} IF EXISTS "{schema}"."{name}" CASCADE'
+
+
+def select_evictions(
+    entries: Iterable[Tuple[str, int, float]],
+    quota_bytes: int,
+    max_age_seconds: float,
+    is_evictable: Callable[[str], bool]
+) -> List[str]:
+    """
+    Choose the cached MVs to drop.
+
+    Entries idle for longer than max_age_seconds go first, then the least
+    recently used ones until the total size fits in quota_bytes. MVs that
+    are not evictable (in use) are kept and still count in the total.
+
+    Args:
+        entries: (mv_name, size_bytes, idle_seconds) tuples
+        quota_bytes: Total size allowed
+        max_age_seconds: Idle time after which an entry is dropped
+        is_evictable: Returns False for MVs that must be kept
+
+    Returns:
+        List of MV names to drop
+    """
+    entries = sorted(entries, key=lambda entry: entry[2], reverse=True)
+    total = sum(size for _, size, _ in entries)
+    evicted = []
+    for name, size, idle in entries:
+        if idle <= max_age_seconds and total <= quota_bytes:
+            break
+        if is_evictable(name):
+            evicted.append(name)
+            total -= size
+    return evicted
+
+
+# =============================================================================
+# Cache
+# =============================================================================
+
+@dataclass
+class CachedView:
+    """Result of MaterializedViewCache.acquire()."""
+    name: str
+    reused: bool
+    elapsed_ms: float
+    result_store: str = RESULT_STORE_MATERIALIZED_VIEW
+
+
+class MaterializedViewCache:
+    """
+    Content-addressed materialized views shared by layers, sessions and undo/redo.
+
+    Usage:
+        cache = get_mv_cache()
+        view = cache.acquire(connexion, schema, sql, "geom", layer.id(),
+                             create_simple_materialized_view_sql)
+        if view is None:
+            ...  # not cacheable: build a session MV as before
+        subset = f'"pk" IN (SELECT "pk" FROM "{schema}"."{view.name}")'
+
+    v4.2.0: With result_store='pk_table', results are stored as PK-only
+    UNLOGGED tables (pass primary_key_name to acquire()).
+    """
+
+    def __init__(
+        self,
+        quota_mb: float = DEFAULT_QUOTA_MB,
+        max_age_hours: float = DEFAULT_MAX_AGE_HOURS,
+        tracker: Optional[MVReferenceTracker] = None,
+        result_store: str = RESULT_STORE_MATERIALIZED_VIEW,
+        table_versioning: str = VERSIONING_STATISTICS
+    ):
+        self.quota_bytes = int(quota_mb * 1024 * 1024)
+        self.max_age_seconds = max_age_hours * 3600
+        self.result_store = result_store
+        self.table_versioning = table_versioning
+        self._tracker = tracker or get_mv_reference_tracker()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._stats = {'hits': 0, 'misses': 0, 'uncacheable': 0, 'evictions': 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.quota_bytes > 0
+
+    def configure(
+        self,
+        quota_mb: Optional[float] = None,
+        max_age_hours: Optional[float] = None,
+        result_store: Optional[str] = None,
+        table_versioning: Optional[str] = None
+    ):
+        """Apply the MATERIALIZED_VIEW_CACHE settings."""
+        if quota_mb is not None:
+            self.quota_bytes = int(quota_mb * 1024 * 1024)
+        if max_age_hours is not None:
+            self.max_age_seconds = max_age_hours * 3600
+        if result_store is not None:
+            if result_store not in RESULT_STORES:
+                logger.warning(f"[MVCache] Unknown result store '{result_store}', using materialized views")
+                result_store = RESULT_STORE_MATERIALIZED_VIEW
+            self.result_store = result_store
+        if table_versioning is not None:
+            if table_versioning not in VERSIONING_MODES:
+                logger.warning(f"[MVCache] Unknown table versioning '{table_versioning}', using statistics")
+                table_versioning = VERSIONING_STATISTICS
+            self.table_versioning = table_versioning
+
+    def acquire(
+        self,
+        connexion,
+        schema: str,
+        sql_subset_string: str,
+        geom_key_name: str,
+        layer_id: str,
+        create_mv_fn: Callable[[str, str, str], str],
+        primary_key_name: Optional[str] = None
+    ) -> Optional[CachedView]:
+        """
+        Get the MV materializing a query, building it only if needed.
+
+        The layer's reference moves to the returned MV; the MV it used
+        before stays cached for undo/redo.
+
+        Args:
+            connexion: psycopg2 connection
+            schema: Temp schema of the MVs
+            sql_subset_string: Defining SELECT query
+            geom_key_name: Geometry column to index
+            layer_id: Layer whose filter uses the MV
+            create_mv_fn: create_simple_materialized_view_sql(schema, name, sql)
+            primary_key_name: Layer primary key, required by the pk_table store
+
+        Returns:
+            CachedView, or None when the cache is disabled or the query
+            cannot be versioned
+        """
+        if not self.enabled:
+            return None
+        start = time.perf_counter()
+
+        try:
+            versions = fetch_table_versions(
+                connexion, schema, referenced_tables(connexion, sql_subset_string), self.table_versioning
+            )
+            connexion.commit()
+            if versions is not None:
+                self._ensure_catalog(connexion, schema)
+        except Exception as e:  # catalog access must not break filtering
+            connexion.rollback()
+            logger.warning(f"[MVCache] Cache unavailable, building a session view: {e}")
+            versions = None
+        if versions is None:
+            self._count('uncacheable')
+            return None
+
+        result_store = self.result_store
+        if result_store == RESULT_STORE_PK_TABLE and primary_key_name:
+            key = content_key(sql_subset_string, versions, f"pk:{primary_key_name}")
+            mv_name = PK_CACHE_PREFIX + key
+            commands = pk_table_commands(schema, mv_name, sql_subset_string, primary_key_name)
+        else:
+            result_store = RESULT_STORE_MATERIALIZED_VIEW
+            key = content_key(sql_subset_string, versions)
+            mv_name = MV_CACHE_PREFIX + key
+            qualified = f'"{schema}"."{mv_name}"'
+            commands = [
+                create_mv_fn(schema, f"cache_{key}", sql_subset_string),
+                f'CREATE INDEX IF NOT EXISTS "{mv_name}_gist" ON {qualified} USING GIST ("{geom_key_name}")',
+                f'ANALYZE {qualified}',
+            ]
+
+        with self._key_lock(mv_name):
+            reused = self._touch(connexion, schema, mv_name)
+            if not reused:
+                self._build(connexion, schema, mv_name, commands)
+            released = self._tracker.assign_cached_reference(mv_name, layer_id)
+
+        self._count('hits' if reused else 'misses')
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info(
+            f"[MVCache] {'Reused' if reused else 'Built'} {schema}.{mv_name} "
+            f"in {elapsed_ms:.0f}ms (released: {len(released)})"
+        )
+
+        try:
+            self.evict(connexion, schema)
+        except Exception as e:  # eviction is best effort
+            connexion.rollback()
+            logger.warning(f"[MVCache] Eviction failed: {e}")
+
+        return CachedView(mv_name, reused, elapsed_ms, result_store)
+
+    def release(self, layer_id: str) -> Set[str]:
+        """
+        Release the cached MV used by a layer (filter reset or cleared).
+
+        The MV stays cached until evicted.
+        """
+        return self._tracker.release_cached_reference(layer_id)
+
+    def evict(self, connexion, schema: str) -> List[str]:
+        """
+        Drop cached MVs over the quota or idle for too long.
+
+        Args:
+            connexion: psycopg2 connection
+            schema: Temp schema of the MVs
+
+        Returns:
+            List of dropped MV names
+        """
+        catalog = f'"{schema}"."{MV_CACHE_CATALOG}"'
+        leases = f'"{schema}"."{MV_CACHE_LEASES}"'
+        with connexion.cursor() as cursor:
+            self._renew_leases(cursor, schema)
+            cursor.execute(
+                f"DELETE FROM {leases} WHERE renewed_at < now() - interval '{LEASE_TTL_HOURS} hours'"  # nosec B608
+            )
+            # Forget entries whose MV was dropped by other cleanups
+            cursor.execute(
+                f"DELETE FROM {catalog} c WHERE to_regclass(format('%%I.%%I', %s, c.mv_name)) IS NULL",  # nosec B608
+                (schema,)
+            )
+            cursor.execute(
+                f'SELECT mv_name, size_bytes, EXTRACT(EPOCH FROM now() - last_used_at), last_used_at, '  # nosec B608
+                f'EXISTS (SELECT 1 FROM {leases} l WHERE l.mv_name = c.mv_name) FROM {catalog} c'
+            )
+            rows = cursor.fetchall()
+            entries = [(name, int(size), float(idle)) for name, size, idle, _, _ in rows]
+            last_used = {name: used for name, _, _, used, _ in rows}
+            leased = {name for name, _, _, _, has_lease in rows if has_lease}
+            candidates = select_evictions(
+                entries, self.quota_bytes, self.max_age_seconds,
+                lambda name: name not in leased and self._tracker.is_evictable(name)
+            )
+            evicted = []
+            for mv_name in candidates:
+                # Skip MVs reused by another session since they were read
+                cursor.execute(
+                    f'DELETE FROM {catalog} WHERE mv_name = %s AND last_used_at = %s RETURNING mv_name',  # nosec B608
+                    (mv_name, last_used[mv_name])
+                )
+                if cursor.fetchone() is None:
+                    continue
+                cursor.execute(_drop_statement(schema, mv_name))
+                evicted.append(mv_name)
+        connexion.commit()
+
+        for mv_name in evicted:
+            self._tracker.forget_cached(mv_name)
+        if evicted:
+            self._count('evictions', len(evicted))
+            logger.info(f"[MVCache] Evicted {len(evicted)} cached view(s) from {schema}")
+        return evicted
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction counters."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['quota_bytes'] = self.quota_bytes
+        return stats
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _ensure_catalog(self, connexion, schema: str):
+        with connexion.cursor() as cursor:
+            cursor.execute(
+                f'CREATE UNLOGGED TABLE IF NOT EXISTS "{schema}"."{MV_CACHE_CATALOG}" ('
+                'mv_name text PRIMARY KEY, '
+                'created_at timestamptz NOT NULL DEFAULT now(), '
+                'last_used_at timestamptz NOT NULL DEFAULT now(), '
+                'size_bytes bigint NOT NULL DEFAULT 0, '
+                'hits integer NOT NULL DEFAULT 0)'
+            )
+            cursor.execute(
+                f'CREATE UNLOGGED TABLE IF NOT EXISTS "{schema}"."{MV_CACHE_LEASES}" ('
+                'mv_name text NOT NULL, '
+                'holder text NOT NULL, '
+                'layer_id text NOT NULL, '
+                'renewed_at timestamptz NOT NULL DEFAULT now(), '
+                'PRIMARY KEY (mv_name, holder, layer_id))'
+            )
+        connexion.commit()
+
+    def _renew_leases(self, cursor, schema: str):
+        """Replace the leases of this QGIS instance by the cached MVs its layers use."""
+        leases = f'"{schema}"."{MV_CACHE_LEASES}"'
+        references = sorted(self._tracker.cached_references())
+        cursor.execute(f'DELETE FROM {leases} WHERE holder = %s', (LEASE_HOLDER,))  # nosec B608
+        if references:
+            cursor.execute(
+                f'INSERT INTO {leases} (mv_name, holder, layer_id) '  # nosec B608
+                'SELECT mv_name, %s, layer_id FROM unnest(%s::text[], %s::text[]) AS t(mv_name, layer_id) '
+                'ON CONFLICT DO NOTHING',
+                (LEASE_HOLDER, [mv_name for mv_name, _ in references], [layer_id for _, layer_id in references])
+            )
+
+    def _touch(self, connexion, schema: str, mv_name: str) -> bool:
+        """Record a use of an existing, complete cached MV."""
+        with connexion.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE "{schema}"."{MV_CACHE_CATALOG}" '  # nosec B608
+                'SET last_used_at = now(), hits = hits + 1 '
+                "WHERE mv_name = %s AND to_regclass(format('%%I.%%I', %s, %s)) IS NOT NULL",
+                (mv_name, schema, mv_name)
+            )
+            found = cursor.rowcount > 0
+        connexion.commit()
+        return found
+
+    def _build(self, connexion, schema: str, mv_name: str, commands: List[str]):
+        """Run the build statements of a result store, then record it in the catalog."""
+        qualified = f'"{schema}"."{mv_name}"'
+        try:
+            with connexion.cursor() as cursor:
+                # A relation without catalog entry is left over from an interrupted build
+                cursor.execute(_drop_statement(schema, mv_name))
+                for sql in commands:
+                    cursor.execute(sql)
+                cursor.execute('SELECT pg_total_relation_size(%s::regclass)', (qualified,))
+                size_bytes = cursor.fetchone()[0]
+                cursor.execute(
+                    f'INSERT INTO "{schema}"."{MV_CACHE_CATALOG}" (mv_name, size_bytes) VALUES (%s, %s) '  # nosec B608
+                    'ON CONFLICT (mv_name) DO UPDATE SET size_bytes = EXCLUDED.size_bytes, last_used_at = now()',
+                    (mv_name, size_bytes)
+                )
+            connexion.commit()
+        except Exception:
+            connexion.rollback()
+            raise
+
+
+# Global singleton instance
+_global_cache: Optional[MaterializedViewCache] = None
+_global_cache_lock = threading.Lock()
+
+
+def get_mv_cache() -> MaterializedViewCache:
+    """
+    Get the global materialized view cache instance.
+
+    Returns:
+        Singleton MaterializedViewCache instance
+    """
+    global _global_cache
+
+    with _global_cache_lock:
+        if _global_cache is None:
+            _global_cache = MaterializedViewCache()
+        return _global_cache
@@ -17,12 +17,17 @@ Solution:
 Reference counting. Each MV tracks how many layers reference it.
 Only drop the MV when reference count reaches zero.
 
+v4.2.0: Cached MVs (content-addressed, see mv_cache.py) are refcounted
+too, but are never reported droppable here: a released cached MV stays
+available for undo/redo and is only dropped by the cache's quota eviction.
+Each layer holds at most one cached MV (the one its current filter uses).
+
 Author: FilterMate Team
 Date: January 2026
 """
 
 import logging
-from typing import Dict, Set, Optional
+from typing import Dict, Set, Optional, Tuple
 from threading import Lock
 
 logger = logging.getLogger('FilterMate.PostgreSQL.MVRefTracker')
@@ -54,6 +59,9 @@ class MVReferenceTracker:
         # mv_name -> set of layer_ids that reference it
         self._references: Dict[str, Set[str]] = {}
 
+        # v4.2.0: Content-addressed MVs owned by the MV cache
+        self._cached: Set[str] = set()
+
         # Thread safety lock
         self._lock = Lock()
 
@@ -108,6 +116,9 @@ class MVReferenceTracker:
             if count == 0:
                 # No more references - safe to drop
                 del self._references[mv_name]
+                if mv_name in self._cached:
+                    # v4.2.0: Kept for reuse, the MV cache decides when to drop it
+                    return False
                 logger.debug(
                     f"[MVRefTracker] Last reference removed: MV={mv_name}, "
                     f"layer={layer_id[:8]} → Safe to drop"
@@ -168,6 +179,9 @@ class MVReferenceTracker:
 
         Useful when a layer is removed from the project.
 
+        v4.2.0: References to cached MVs are left in place, they follow
+        the layer's current filter (see assign_cached_reference()).
+
         Args:
             layer_id: Layer ID to clean up
 
@@ -178,6 +192,8 @@ class MVReferenceTracker:
             can_drop = set()
 
             for mv_name in list(self._references.keys()):
+                if mv_name in self._cached:
+                    continue
                 if layer_id in self._references[mv_name]:
                     self._references[mv_name].discard(layer_id)
 
@@ -205,7 +221,7 @@ class MVReferenceTracker:
             Set of all tracked MV names
         """
         with self._lock:
-            mv_names = set(self._references.keys())
+            mv_names = set(self._references.keys()) - self._cached
             self._references.clear()
 
             logger.debug(
@@ -215,18 +231,101 @@ class MVReferenceTracker:
 
             return mv_names
 
+    def assign_cached_reference(self, mv_name: str, layer_id: str) -> Set[str]:
+        """
+        Make a cached MV the one referenced by a layer's current filter.
+
+        v4.2.0 - Content-addressed MV reuse (October 2026)
+
+        Args:
+            mv_name: Cached materialized view name
+            layer_id: Layer ID whose filter now uses the MV
+
+        Returns:
+            Set of cached MV names the layer released (still cached, not dropped)
+        """
+        with self._lock:
+            self._cached.add(mv_name)
+            released = self._release_cached(layer_id, keep=mv_name)
+            self._references.setdefault(mv_name, set()).add(layer_id)
+            return released
+
+    def release_cached_reference(self, layer_id: str) -> Set[str]:
+        """
+        Release the cached MV referenced by a layer (filter reset or cleared).
+
+        Args:
+            layer_id: Layer ID
+
+        Returns:
+            Set of cached MV names the layer released
+        """
+        with self._lock:
+            return self._release_cached(layer_id)
+
+    def _release_cached(self, layer_id: str, keep: Optional[str] = None) -> Set[str]:
+        """Drop the layer's references to cached MVs other than keep. Lock held."""
+        released = set()
+        for mv_name in self._cached:
+            refs = self._references.get(mv_name)
+            if mv_name == keep or not refs or layer_id not in refs:
+                continue
+            refs.discard(layer_id)
+            if not refs:
+                del self._references[mv_name]
+            released.add(mv_name)
+        return released
+
+    def is_evictable(self, mv_name: str) -> bool:
+        """
+        Check if the MV cache may drop a cached MV.
+
+        Args:
+            mv_name: Materialized view name
+
+        Returns:
+            True if no layer references the MV
+        """
+        return not self.is_referenced(mv_name)
+
+    def cached_references(self) -> Set[Tuple[str, str]]:
+        """
+        Get the layers using cached MVs (leases of this QGIS instance).
+
+        Returns:
+            Set of (mv_name, layer_id) tuples
+        """
+        with self._lock:
+            return {
+                (mv_name, layer_id)
+                for mv_name in self._cached
+                for layer_id in self._references.get(mv_name, ())
+            }
+
+    def forget_cached(self, mv_name: str):
+        """
+        Stop tracking a cached MV (dropped by the MV cache).
+
+        Args:
+            mv_name: Materialized view name
+        """
+        with self._lock:
+            self._cached.discard(mv_name)
+            self._references.pop(mv_name, None)
+
     def get_stats(self) -> Dict[str, int]:
         """
         Get tracker statistics.
 
         Returns:
-            Dictionary with stats: tracked_mvs, total_references
+            Dictionary with stats: tracked_mvs, total_references, cached_mvs
         """
         with self._lock:
             total_refs = sum(len(refs) for refs in self._references.values())
             return {
                 'tracked_mvs': len(self._references),
-                'total_references': total_refs
+                'total_references': total_refs,
+                'cached_mvs': len(self._cached)
             }
 
 
@@ -19,6 +19,7 @@ import logging
 from typing import Optional, Tuple
 
 from ....infrastructure.database.sql_utils import sanitize_sql_identifier
+from ....infrastructure.database.query_profiler import get_query_profiler
 
 logger = logging.getLogger('FilterMate.PostgreSQL.SchemaManager')
 
@@ -232,6 +233,8 @@ def execute_commands(connexion, commands: list) -> bool:
     """
     Execute PostgreSQL commands with transaction handling.
 
+    v4.2.0: Commands go through the query profiler (a plain execute when it is disabled).
+
     Args:
         connexion: psycopg2 connection
         commands: List of SQL commands to execute
@@ -239,10 +242,11 @@ def execute_commands(connexion, commands: list) -> bool:
     Returns:
         bool: True if all commands succeeded
     """
+    profiler = get_query_profiler()
     try:
         with connexion.cursor() as cursor:
             for command in commands:
-                cursor.execute(command)
+                profiler.execute('postgresql', cursor, command)
                 connexion.commit()
         return True
     except Exception as e:
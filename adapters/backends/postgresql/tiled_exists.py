@@ -0,0 +1,498 @@
+# -*- coding: utf-8 -*-
+"""
+Tiled, resumable EXISTS evaluation for very large source selections.
+
+v4.2.0 - Chunked EXISTS evaluation (October 2026)
+
+With a source selection of 100k+ features, the EXISTS expression built by
+PostgreSQLExpressionBuilder runs as one statement: it takes minutes, cannot
+report progress and loses everything when the task is canceled.
+
+In tiled mode the target table is partitioned on a grid computed from
+ST_EstimatedExtent(). Each tile runs
+
+    INSERT INTO <result> SELECT "pk" FROM <target>
+    WHERE <target inside tile> AND (<EXISTS expression>)
+
+and commits, so the matching primary keys accumulate in an UNLOGGED table
+of the FilterMate temp schema, read by the layer through
+"pk" IN (SELECT "pk" FROM <result>). Nothing is written to the schema of
+the target table.
+
+Partitioning:
+    The target extent is tiled rather than the source extent: a target
+    belongs to exactly one tile (the one holding the center of its bounding
+    box, half-open intervals), so the union of the tiles is the result of
+    the single statement whatever the predicates, buffers or chained EXISTS.
+    The && test on the tile envelope keeps the target GiST index in use.
+    A last "rest" tile holds the centers outside the estimated extent and
+    empty geometries.
+
+Progress and resume:
+    A companion <result>_done table records each committed tile in the same
+    transaction as its rows, with the tile plan. The result table is named
+    after the content key of the query and of the versions of the tables
+    it reads (see mv_cache.fetch_table_versions(), in the versioning mode of
+    the materialized view cache), so re-running the same
+    filter after a cancel finds the completed tiles and only evaluates the
+    rest. A finished result is reused directly. When the tables cannot be
+    versioned the result table gets a unique name and is never resumed.
+
+Timeouts:
+    Each tile runs under SET LOCAL statement_timeout. A tile hitting it is
+    split into 4 sub-tiles (quadtree), up to MAX_SPLIT_DEPTH levels; the
+    deepest level runs without timeout.
+
+Usage:
+    evaluator = TiledExistsEvaluator(rows_per_tile=50000)
+    result = evaluator.evaluate(connexion, "public", "parcels", "geom", "gid",
+                                expression, "filter_mate_temp",
+                                cancel_check=task.isCanceled)
+    if result and result.complete:
+        layer.setSubsetString(result.expression)
+
+Author: FilterMate Team
+Date: October 2026
+"""
+
+import json
+import logging
+import math
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .mv_cache import content_key, fetch_table_versions, get_mv_cache, referenced_tables
+
+logger = logging.getLogger('FilterMate.PostgreSQL.TiledExists')
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+TILED_TABLE_PREFIX = "fm_temp_pk_tiles_"
+DONE_TABLE_SUFFIX = "_done"
+
+DEFAULT_ROWS_PER_TILE = 50000
+DEFAULT_TILE_TIMEOUT_SECONDS = 60
+MIN_TILES = 4
+MAX_TILES = 1024
+MAX_SPLIT_DEPTH = 3
+
+# Progress table keys
+PLAN_KEY = '#plan'
+COMPLETE_KEY = '*'
+SPLIT_INFO = 'split'
+REST_TILE_KEY = 'rest'
+
+# SQLSTATE of a statement canceled by statement_timeout
+QUERY_CANCELED = '57014'
+
+# Progress units of a top-level tile, divisible down to the deepest split
+TILE_UNITS = 4 ** MAX_SPLIT_DEPTH
+
+PLAN_SQL = """
+    SELECT ST_XMin(extent.e), ST_YMin(extent.e), ST_XMax(extent.e), ST_YMax(extent.e),
+           Find_SRID(%s, %s, %s),
+           (SELECT reltuples FROM pg_class WHERE oid = %s::regclass)
+    FROM (SELECT ST_EstimatedExtent(%s, %s, %s) AS e) AS extent
+"""
+
+
+# =============================================================================
+# Tiles
+# =============================================================================
+
+@dataclass
+class Tile:
+    """
+    Part of the target extent, holding the targets whose bbox center is in it.
+
+    Intervals are half-open ([xmin, xmax)); the last column and row of the
+    grid are closed so the estimated extent is covered entirely. The rest
+    tile has no envelope and holds every target outside the grid.
+    """
+    key: str
+    envelope: Optional[Tuple[float, float, float, float]] = None
+    closed_x: bool = False
+    closed_y: bool = False
+    depth: int = 0
+
+    @property
+    def units(self) -> int:
+        return TILE_UNITS // (4 ** self.depth)
+
+    @property
+    def splittable(self) -> bool:
+        return self.envelope is not None and self.depth < MAX_SPLIT_DEPTH
+
+    def condition(self, geom_expr: str, srid: int, extent: Tuple[float, float, float, float]) -> str:
+        """
+        SQL condition selecting the targets of this tile.
+
+        Args:
+            geom_expr: Target geometry column ("table"."geom")
+            srid: SRID of the target geometry column
+            extent: Grid extent, used by the rest tile
+
+        Returns:
+            str: Boolean SQL expression
+        """
+        center_x = f'(ST_XMin({geom_expr}) + ST_XMax({geom_expr})) / 2'
+        center_y = f'(ST_YMin({geom_expr}) + ST_YMax({geom_expr})) / 2'
+        if self.envelope is None:
+            xmin, ymin, xmax, ymax = extent
+            return (
+                f'COALESCE(NOT ({center_x} BETWEEN {xmin!r} AND {xmax!r} '
+                f'AND {center_y} BETWEEN {ymin!r} AND {ymax!r}), TRUE)'
+            )
+        xmin, ymin, xmax, ymax = self.envelope
+        return (
+            f'{geom_expr} && ST_MakeEnvelope({xmin!r}, {ymin!r}, {xmax!r}, {ymax!r}, {srid}) '
+            f'AND {center_x} >= {xmin!r} AND {center_x} {"<=" if self.closed_x else "<"} {xmax!r} '
+            f'AND {center_y} >= {ymin!r} AND {center_y} {"<=" if self.closed_y else "<"} {ymax!r}'
+        )
+
+    def split(self) -> List['Tile']:
+        """Split the tile into 4 quadrants, which inherit its closed edges."""
+        xmin, ymin, xmax, ymax = self.envelope
+        xmid = (xmin + xmax) / 2
+        ymid = (ymin + ymax) / 2
+        return [
+            Tile(f"{self.key}/0", (xmin, ymin, xmid, ymid), False, False, self.depth + 1),
+            Tile(f"{self.key}/1", (xmid, ymin, xmax, ymid), self.closed_x, False, self.depth + 1),
+            Tile(f"{self.key}/2", (xmin, ymid, xmid, ymax), False, self.closed_y, self.depth + 1),
+            Tile(f"{self.key}/3", (xmid, ymid, xmax, ymax), self.closed_x, self.closed_y, self.depth + 1),
+        ]
+
+
+def grid_size(row_estimate: float, rows_per_tile: int, max_tiles: int = MAX_TILES) -> int:
+    """
+    Number of columns (and rows) of the tile grid.
+
+    Args:
+        row_estimate: Estimated target row count (reltuples, -1 if unknown)
+        rows_per_tile: Wanted targets per tile
+        max_tiles: Upper bound of the tile count
+
+    Returns:
+        int: Grid side, at least 2
+    """
+    tiles = math.ceil(max(row_estimate, 0) / max(rows_per_tile, 1))
+    tiles = min(max(tiles, MIN_TILES), max_tiles)
+    return max(2, math.isqrt(tiles - 1) + 1)
+
+
+def plan_tiles(extent: Tuple[float, float, float, float], side: int) -> List[Tile]:
+    """
+    Tile an extent on a side x side grid, followed by the rest tile.
+
+    Args:
+        extent: (xmin, ymin, xmax, ymax)
+        side: Grid columns and rows
+
+    Returns:
+        List[Tile]
+    """
+    xmin, ymin, xmax, ymax = extent
+    width = (xmax - xmin) / side
+    height = (ymax - ymin) / side
+    tiles = []
+    for row in range(side):
+        y0 = ymin + row * height
+        y1 = ymax if row == side - 1 else ymin + (row + 1) * height
+        for column in range(side):
+            x0 = xmin + column * width
+            x1 = xmax if column == side - 1 else xmin + (column + 1) * width
+            tiles.append(Tile(str(row * side + column), (x0, y0, x1, y1), column == side - 1, row == side - 1))
+    tiles.append(Tile(REST_TILE_KEY))
+    return tiles
+
+
+# =============================================================================
+# Evaluator
+# =============================================================================
+
+@dataclass
+class TiledExistsResult:
+    """Outcome of a tiled evaluation."""
+    table_name: str
+    expression: str
+    tiles_total: int
+    tiles_done: int
+    tiles_resumed: int
+    rows: int
+    complete: bool
+
+
+class TiledExistsEvaluator:
+    """
+    Evaluates a filter expression on a PostgreSQL table tile by tile.
+
+    The connection is used in transaction mode (autocommit is restored
+    afterwards); every tile is committed on its own.
+    """
+
+    def __init__(
+        self,
+        rows_per_tile: int = DEFAULT_ROWS_PER_TILE,
+        tile_timeout_seconds: float = DEFAULT_TILE_TIMEOUT_SECONDS,
+        max_tiles: int = MAX_TILES,
+        profiler=None
+    ):
+        """
+        Args:
+            rows_per_tile: Target rows per tile of the initial grid
+            tile_timeout_seconds: Timeout before a tile is split (0 = never split)
+            max_tiles: Upper bound of the initial grid
+            profiler: QueryProfiler recording the tile statements
+        """
+        self.rows_per_tile = rows_per_tile
+        self.tile_timeout_seconds = tile_timeout_seconds
+        self.max_tiles = max_tiles
+        self._profiler = profiler
+
+    def evaluate(
+        self,
+        connexion,
+        schema: str,
+        table: str,
+        geom_field: str,
+        primary_key_name: str,
+        expression: str,
+        temp_schema: str,
+        cancel_check: Optional[Callable[[], bool]] = None,
+        progress_handler=None,
+        layer_name: Optional[str] = None
+    ) -> Optional[TiledExistsResult]:
+        """
+        Evaluate expression on "schema"."table" into an accumulating PK table.
+
+        Args:
+            connexion: psycopg2 connection to the target database
+            schema: Target schema
+            table: Target table
+            geom_field: Target geometry column
+            primary_key_name: Target primary key column
+            expression: Filter expression referencing the target as "table"
+            temp_schema: FilterMate temp schema, receives the result tables
+            cancel_check: Callable() -> bool, checked between tiles
+            progress_handler: ProgressHandler receiving one update per tile
+            layer_name: Layer name for logs and profiling
+
+        Returns:
+            TiledExistsResult (complete=False when canceled), or None when
+            the table extent cannot be estimated (no statistics)
+
+        Raises:
+            Database errors other than a tile timeout, after rollback
+        """
+        target = f'"{schema}"."{table}"'
+        base_sql = f'SELECT "{primary_key_name}" FROM {target} WHERE {expression}'  # nosec B608
+        layer_name = layer_name or table
+
+        autocommit = getattr(connexion, 'autocommit', False)
+        if autocommit:
+            connexion.autocommit = False
+        try:
+            try:
+                versions = fetch_table_versions(
+                    connexion, temp_schema, referenced_tables(connexion, base_sql), get_mv_cache().table_versioning
+                )
+                connexion.commit()
+            except Exception as e:  # not owner of a table, lock timeout
+                connexion.rollback()
+                logger.info(f"[TiledExists] {layer_name}: tables not versioned, run not resumable: {e}")
+                versions = None
+            if versions:
+                name = TILED_TABLE_PREFIX + content_key(base_sql, versions, variant=primary_key_name)
+            else:
+                # Not versioned: results cannot be trusted across runs
+                name = TILED_TABLE_PREFIX + uuid.uuid4().hex[:20]
+            result_table = f'"{temp_schema}"."{name}"'
+            done_table = f'"{temp_schema}"."{name}{DONE_TABLE_SUFFIX}"'
+            result_expression = f'"{primary_key_name}" IN (SELECT "{primary_key_name}" FROM {result_table})'  # nosec B608
+
+            done = self._read_progress(connexion, done_table)
+            if COMPLETE_KEY in done:
+                top_tiles = json.loads(done[PLAN_KEY])['tiles']
+                logger.info(f"[TiledExists] {layer_name}: reusing complete result {name}")
+                return TiledExistsResult(name, result_expression, top_tiles, top_tiles, top_tiles,
+                                         int(done[COMPLETE_KEY]), True)
+
+            if PLAN_KEY in done:
+                plan = json.loads(done[PLAN_KEY])
+            else:
+                plan = self._plan(connexion, schema, table, geom_field)
+                if plan is None:
+                    logger.info(f"[TiledExists] {layer_name}: no extent statistics, tiling skipped")
+                    return None
+                self._create_tables(connexion, result_table, done_table, name, target, primary_key_name, plan)
+
+            return self._run_tiles(
+                connexion, plan, done, name, result_table, done_table, result_expression,
+                target, f'"{table}"."{geom_field}"', primary_key_name, expression,
+                cancel_check, progress_handler, layer_name
+            )
+        except Exception:
+            connexion.rollback()
+            raise
+        finally:
+            if autocommit:
+                connexion.autocommit = True
+
+    # -------------------------------------------------------------------------
+    # Setup
+    # -------------------------------------------------------------------------
+
+    def _read_progress(self, connexion, done_table: str) -> Dict[str, str]:
+        """Completed tiles and plan of a previous run, {} if none."""
+        with connexion.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s)", (done_table,))
+            if cursor.fetchone()[0] is None:
+                connexion.commit()
+                return {}
+            cursor.execute(f'SELECT tile, info FROM {done_table}')  # nosec B608
+            done = dict(cursor.fetchall())
+        connexion.commit()
+        return done
+
+    def _plan(self, connexion, schema: str, table: str, geom_field: str) -> Optional[Dict]:
+        """Grid extent, side and SRID from the table statistics."""
+        with connexion.cursor() as cursor:
+            cursor.execute(PLAN_SQL, (schema, table, geom_field, f'"{schema}"."{table}"', schema, table, geom_field))
+            xmin, ymin, xmax, ymax, srid, row_estimate = cursor.fetchone()
+        connexion.commit()
+        if xmin is None or srid is None:
+            return None
+        side = grid_size(row_estimate or 0, self.rows_per_tile, self.max_tiles)
+        return {
+            'extent': [xmin, ymin, xmax, ymax],
+            'side': side,
+            'srid': srid,
+            'tiles': side * side + 1,
+        }
+
+    def _create_tables(self, connexion, result_table, done_table, name, target, primary_key_name, plan):
+        """Create the result and progress tables and store the plan."""
+        with connexion.cursor() as cursor:
+            cursor.execute(
+                f'CREATE UNLOGGED TABLE IF NOT EXISTS {result_table} AS '  # nosec B608
+                f'SELECT "{primary_key_name}" FROM {target} WITH NO DATA'
+            )
+            cursor.execute(
+                f'CREATE UNIQUE INDEX IF NOT EXISTS "{name}_pk" ON {result_table} USING btree ("{primary_key_name}")'
+            )
+            cursor.execute(f'CREATE UNLOGGED TABLE IF NOT EXISTS {done_table} (tile text PRIMARY KEY, info text)')
+            cursor.execute(f'INSERT INTO {done_table} (tile, info) VALUES (%s, %s)',  # nosec B608
+                           (PLAN_KEY, json.dumps(plan)))
+        connexion.commit()
+
+    # -------------------------------------------------------------------------
+    # Tiles
+    # -------------------------------------------------------------------------
+
+    def _run_tiles(
+        self, connexion, plan, done, name, result_table, done_table, result_expression,
+        target, geom_expr, primary_key_name, expression, cancel_check, progress_handler, layer_name
+    ) -> TiledExistsResult:
+        extent = tuple(plan['extent'])
+        srid = plan['srid']
+        top_tiles = plan_tiles(extent, plan['side'])
+        total_units = len(top_tiles) * TILE_UNITS
+
+        # Skip the tiles committed by a previous run, expanding recorded splits
+        pending = []
+        stack = list(reversed(top_tiles))
+        done_units = resumed = rows = 0
+        while stack:
+            tile = stack.pop()
+            info = done.get(tile.key)
+            if info == SPLIT_INFO:
+                stack.extend(reversed(tile.split()))
+            elif info is not None:
+                done_units += tile.units
+                rows += int(info)
+                resumed += 1
+            else:
+                pending.append(tile)
+        if resumed:
+            logger.info(f"[TiledExists] {layer_name}: resuming {name}, {resumed} tile(s) already done")
+        self._report(progress_handler, done_units, total_units, len(pending), rows)
+
+        evaluated = 0
+        while pending:
+            if cancel_check and cancel_check():
+                logger.info(
+                    f"[TiledExists] {layer_name}: canceled with {len(pending)} tile(s) left, "
+                    f"run the filter again to resume"
+                )
+                return TiledExistsResult(name, result_expression, len(top_tiles),
+                                         evaluated + resumed, resumed, rows, False)
+            tile = pending.pop(0)
+            tile_rows = self._run_tile(connexion, tile, srid, extent, result_table, done_table,
+                                       target, geom_expr, primary_key_name, expression, layer_name)
+            if tile_rows is None:
+                logger.info(f"[TiledExists] {layer_name}: tile {tile.key} timed out, splitting")
+                pending[:0] = tile.split()
+                continue
+            evaluated += 1
+            rows += tile_rows
+            done_units += tile.units
+            self._report(progress_handler, done_units, total_units, len(pending), rows)
+
+        with connexion.cursor() as cursor:
+            cursor.execute(f'INSERT INTO {done_table} (tile, info) VALUES (%s, %s)',  # nosec B608
+                           (COMPLETE_KEY, str(rows)))
+            cursor.execute(f'ANALYZE {result_table}')
+        connexion.commit()
+        logger.info(f"[TiledExists] {layer_name}: {rows} match(es) in {name} ({evaluated} tile(s) evaluated)")
+        return TiledExistsResult(name, result_expression, len(top_tiles), evaluated + resumed, resumed, rows, True)
+
+    def _run_tile(
+        self, connexion, tile, srid, extent, result_table, done_table,
+        target, geom_expr, primary_key_name, expression, layer_name
+    ) -> Optional[int]:
+        """
+        Evaluate one tile and record it, in one transaction.
+
+        Returns:
+            int: Rows inserted, or None if the tile timed out and was split
+        """
+        timeout_ms = int(self.tile_timeout_seconds * 1000) if tile.splittable else 0
+        sql = (
+            f'INSERT INTO {result_table} SELECT "{primary_key_name}" FROM {target} '  # nosec B608
+            f'WHERE {tile.condition(geom_expr, srid, extent)} AND ({expression}) ON CONFLICT DO NOTHING'
+        )
+        try:
+            with connexion.cursor() as cursor:
+                cursor.execute(f'SET LOCAL statement_timeout = {timeout_ms}')
+                if self._profiler is not None:
+                    self._profiler.execute('postgresql', cursor, sql, layer=layer_name)
+                else:
+                    cursor.execute(sql)
+                tile_rows = max(cursor.rowcount, 0)
+                cursor.execute(f'INSERT INTO {done_table} (tile, info) VALUES (%s, %s)',  # nosec B608
+                               (tile.key, str(tile_rows)))
+            connexion.commit()
+            return tile_rows
+        except Exception as e:
+            if getattr(e, 'pgcode', None) != QUERY_CANCELED or not tile.splittable:
+                raise
+            connexion.rollback()
+        with connexion.cursor() as cursor:
+            cursor.execute(f'INSERT INTO {done_table} (tile, info) VALUES (%s, %s)',  # nosec B608
+                           (tile.key, SPLIT_INFO))
+        connexion.commit()
+        return None
+
+    @staticmethod
+    def _report(progress_handler, done_units, total_units, pending, rows):
+        if progress_handler is None:
+            return
+        progress_handler.update(
+            done_units, total_units,
+            f"Spatial filter: {pending} tile(s) left, {rows} match(es)",
+            items_processed=rows
+        )
@@ -8,12 +8,13 @@ Spatialite/GeoPackage specific implementations including:
 - Temporary table support
 - Source geometry preparation (EPIC-1 Phase E4-S8)
 - Filter actions (reset/unfilter) - Phase 1 v4.1
+- Cancellable pooled read queries with streamed batches - v4.2.0
 
 Part of Phase 4 Backend Refactoring (ARCH-040 through ARCH-043).
 """
 from .backend import SpatialiteBackend, create_spatialite_backend, spatialite_connect  # noqa: F401
 from .cache import SpatialiteCache, CacheStats, create_cache  # noqa: F401
-from .index_manager import RTreeIndexManager, IndexInfo, create_index_manager  # noqa: F401
+from .index_manager import RTreeIndexManager, RTreeLayout, IndexInfo, create_index_manager  # noqa: F401
 from .executor_wrapper import SpatialiteFilterExecutor  # noqa: F401
 from .filter_executor import (  # noqa: F401
     # EPIC-1 Phase E4-S8: Source geometry preparation
@@ -52,6 +53,14 @@ from .interruptible_query import (  # noqa: F401
     USE_OGR_FALLBACK,
 )
 
+# v4.2.0: Pooled read-only query execution with streamed batches
+from .query_service import (  # noqa: F401
+    SpatialiteQueryService,
+    SpatialiteQueryHandle,
+    QueryTimeoutError,
+    get_spatialite_query_service,
+)
+
 # v4.1.0: Expression Builder (migrated from before_migration)
 from .expression_builder import SpatialiteExpressionBuilder  # noqa: F401
 
@@ -72,6 +81,7 @@ __all__ = [
     'create_cache',
     # Index Manager
     'RTreeIndexManager',
+    'RTreeLayout',
     'IndexInfo',
     'create_index_manager',
     # v4.2: Temp Table Manager (MV equivalent)
@@ -106,6 +116,11 @@ __all__ = [
     'SPATIALITE_QUERY_TIMEOUT',
     'SPATIALITE_BATCH_SIZE',
     'USE_OGR_FALLBACK',
+    # v4.2.0: Query service
+    'SpatialiteQueryService',
+    'QueryTimeoutError',
+    'SpatialiteQueryHandle',
+    'get_spatialite_query_service',
     # v4.1.0: Expression Builder
     'SpatialiteExpressionBuilder',
 ]
@@ -31,6 +31,7 @@ from ....core.domain.layer_info import LayerInfo
 
 from .cache import SpatialiteCache, create_cache
 from .index_manager import RTreeIndexManager, create_index_manager
+from .query_service import get_spatialite_query_service
 
 logger = logging.getLogger('FilterMate.Backend.Spatialite')
 
@@ -409,16 +410,21 @@ class SpatialiteBackend(BackendPort):
         layer_info: LayerInfo
     ) -> List[int]:
         """Execute filter query and return feature IDs."""
-        self._get_table_name(layer_info)
-        self._get_pk_column(layer_info)
+        table_name = self._get_table_name(layer_info)
+        pk_column = self._get_pk_column(layer_info)
 
         # Convert expression to Spatialite SQL if needed
-        self._convert_to_spatialite(expression.sql)
+        sql = self._convert_to_spatialite(expression.sql)
 
-        query = """
-            SELECT "{pk_column}" FROM "{table_name}"
-            WHERE {sql}
-        """
+        query = f'SELECT "{pk_column}" FROM "{table_name}" WHERE {sql}'  # nosec B608
+
+        # v4.2.0: Stream ids from the read-only pool when the file is known
+        if self._db_path:
+            feature_ids: List[int] = []
+            for batch in get_spatialite_query_service().iter_batches(
+                    self._db_path, query, layer=layer_info.name):
+                feature_ids.extend(row[0] for row in batch)
+            return feature_ids
 
         cursor = self._conn.cursor()
         cursor.execute(query)
@@ -9,7 +9,9 @@ It implements the GeometricFilterPort interface for Spatialite backends.
 
 Features:
 - GeoPackage support with GeomFromGPB conversion
-- R-tree spatial index optimization
+- R-tree spatial index optimization: predicates run on R-tree candidates
+  only, with the source geometry evaluated once per statement (v4.2.0)
+- Per-layer filter timings (v4.2.0)
 - WKT simplification for large geometries
 - Centroid optimization
 - CRS transformation handling
@@ -19,6 +21,9 @@ Date: January 2026
 """
 
 import logging
+import sqlite3
+import time
+from pathlib import Path
 from typing import Dict, Optional, Any
 
 try:
@@ -100,6 +105,9 @@ class SpatialiteExpressionBuilder(GeometricFilterPort):
         """
         super().__init__(task_params)
         self._logger = logger
+        self._rtree_cache: Dict[tuple, Any] = {}
+        self._prepass_layers = set()
+        self.layer_timings: Dict[str, float] = {}
 
     def get_backend_name(self) -> str:
         """Get backend name."""
@@ -193,8 +201,17 @@ class SpatialiteExpressionBuilder(GeometricFilterPort):
             self.log_warning("GeometryCollection detected - returning OGR fallback")
             return USE_OGR_FALLBACK
 
+        # v4.2.0: Upload large source geometries once as WKB; the uploaded
+        # geometry is exact, so it is not simplified
+        source_srid = self._get_source_srid()
+        source_geom_ref = None
+        if layer_props.get('source_geometry_srid') == source_srid:
+            source_geom_ref = layer_props.get('source_geometry_ref')  # Staged by the batch planner
+        if source_geom_ref is None:
+            source_geom_ref = self._upload_source_geometry(layer, source_geom, source_srid)
+
         # Simplify large WKT
-        if wkt_length >= SPATIALITE_WKT_SIMPLIFY_THRESHOLD:
+        if source_geom_ref is None and wkt_length >= SPATIALITE_WKT_SIMPLIFY_THRESHOLD:
             source_geom = self._simplify_wkt(source_geom)
             wkt_length = len(source_geom)
             self.log_info(f"WKT simplified to {wkt_length} chars")
@@ -214,16 +231,21 @@ class SpatialiteExpressionBuilder(GeometricFilterPort):
 
         # Get SRIDs
         target_srid = self._get_layer_srid(layer)
-        source_srid = self._get_source_srid()
 
         self.log_debug(f"SRIDs: source={source_srid}, target={target_srid}")
 
         # Build source geometry SQL
         # FIX v4.2.11: Pass buffer_expression for dynamic buffer support
         source_geom_sql = self._build_source_geometry_sql(
-            source_geom, source_srid, target_srid, buffer_value, buffer_expression
+            source_geom, source_srid, target_srid, buffer_value, buffer_expression,
+            source_geom_ref=source_geom_ref
         )
 
+        # v4.2.0: An uncorrelated subquery is evaluated once per statement,
+        # and Spatialite reuses a prepared GEOS geometry when the same blob is
+        # passed row after row, instead of parsing the source for each row
+        source_geom_sql = f"(SELECT {source_geom_sql})"
+
         # Build predicate expressions
         predicate_expressions = []
 
@@ -247,9 +269,59 @@ class SpatialiteExpressionBuilder(GeometricFilterPort):
             return "1 = 0"
 
         if len(predicate_expressions) == 1:
-            return predicate_expressions[0]
+            predicate_sql = predicate_expressions[0]
         else:
-            return f"({' OR '.join(predicate_expressions)})"
+            predicate_sql = f"({' OR '.join(predicate_expressions)})"
+
+        # v4.2.0: Evaluate the predicates on R-tree candidates only. Disjoint
+        # holds outside the source bounding box, so it cannot use the R-tree.
+        active = {name.lower().replace('st_', '') for name, value in predicates.items() if value}
+        rtree = None if 'disjoint' in active else self._find_layer_rtree(layer, layer_props, geom_field, is_geopackage)
+        if rtree is None:
+            return predicate_sql
+
+        self._prepass_layers.add(layer.id())
+        self.log_info(f"R-tree pre-pass through {rtree.table_name}")
+        return f"{rtree.candidate_sql(source_geom_sql)} AND {predicate_sql}"
+
+    def _find_layer_rtree(self, layer, layer_props: Dict[str, Any], geom_field: str, is_geopackage: bool):
+        """
+        R-tree of the target layer's geometry column (v4.2.0).
+
+        Looked up once per table with a read-only sqlite3 connection.
+
+        Returns:
+            RTreeLayout, or None if the layer has no usable spatial index
+        """
+        if not layer:
+            return None
+        try:
+            from ....infrastructure.database.geometry_transport import sqlite_database_path
+            from .index_manager import RTreeIndexManager
+        except ImportError:
+            return None
+
+        db_path = sqlite_database_path(layer)
+        table_name = layer_props.get("layer_table_name") or layer_props.get("layer_name")
+        if not isinstance(db_path, str) or not isinstance(table_name, str):
+            return None
+
+        key = (db_path, table_name, geom_field)
+        if key not in self._rtree_cache:
+            layout = None
+            conn = None
+            try:
+                conn = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True, timeout=5.0)
+                layout = RTreeIndexManager(conn).find_rtree(table_name, geom_field, geopackage=is_geopackage)
+            except (sqlite3.Error, ValueError) as e:
+                self.log_debug(f"R-tree lookup failed for {table_name}: {e}")
+            finally:
+                if conn is not None:
+                    conn.close()
+            if layout is None:
+                self.log_info(f"No spatial index on {table_name}.{geom_field}: predicates evaluated on every row")
+            self._rtree_cache[key] = layout
+        return self._rtree_cache[key]
 
     def apply_filter(
         self,
@@ -290,10 +362,13 @@ class SpatialiteExpressionBuilder(GeometricFilterPort):
             else:
                 final_expression = expression
 
-            # Apply filter
+            # Apply filter (the provider evaluates it when counting)
+            start = time.perf_counter()
             success = safe_set_subset_string(layer, final_expression)
 
             if success:
+                feature_count = layer.featureCount()
+                self._report_layer_timing(layer, (time.perf_counter() - start) * 1000.0, feature_count)
                 self.log_info("✓ Filter applied successfully")
             else:
                 self.log_error("✗ Failed to apply filter")
@@ -311,6 +386,13 @@ class SpatialiteExpressionBuilder(GeometricFilterPort):
     # NOTE v4.0.1: _detect_geometry_column, _apply_centroid_transform,
     # _get_layer_srid, _get_source_srid are inherited from GeometricFilterPort
 
+    def _report_layer_timing(self, layer, elapsed_ms: float, feature_count) -> None:
+        """Log and keep the filter time of a layer (v4.2.0)."""
+        self.layer_timings[layer.name()] = elapsed_ms
+        kind = "GeoPackage" if self._is_geopackage(layer) else "Spatialite"
+        prepass = "R-tree candidates" if layer.id() in self._prepass_layers else "full scan"
+        self.log_info(f"⏱️ {kind} layer {layer.name()}: {elapsed_ms:.0f} ms, {feature_count} features ({prepass})")
+
     def _is_geopackage(self, layer) -> bool:
         """Check if layer is from a GeoPackage."""
         if not layer:
@@ -324,7 +406,8 @@ class SpatialiteExpressionBuilder(GeometricFilterPort):
         source_srid: int,
         target_srid: int,
         buffer_value: Optional[float],
-        buffer_expression: Optional[str] = None
+        buffer_expression: Optional[str] = None,
+        source_geom_ref: Optional[str] = None
     ) -> str:
         """
         Build SQL for source geometry.
@@ -337,12 +420,17 @@ class SpatialiteExpressionBuilder(GeometricFilterPort):
             target_srid: Target SRID for transformation
             buffer_value: Static buffer value
             buffer_expression: Dynamic buffer expression (QGIS syntax)
+            source_geom_ref: Reference to the uploaded WKB source geometry;
+                replaces the WKT literal when set (v4.2.0)
         """
-        # Escape single quotes in WKT
-        escaped_wkt = source_wkt.replace("'", "''")
+        if source_geom_ref:
+            source_geom_sql = source_geom_ref
+        else:
+            # Escape single quotes in WKT
+            escaped_wkt = source_wkt.replace("'", "''")
 
-        # Build base geometry
-        source_geom_sql = f"GeomFromText('{escaped_wkt}', {source_srid})"
+            # Build base geometry
+            source_geom_sql = f"GeomFromText('{escaped_wkt}', {source_srid})"
 
         # Apply MakeValid
         source_geom_sql = f"MakeValid({source_geom_sql})"
@@ -373,6 +461,47 @@ class SpatialiteExpressionBuilder(GeometricFilterPort):
 
         return source_geom_sql
 
+    def _upload_source_geometry(self, layer, source_wkt: str, source_srid: int) -> Optional[str]:
+        """
+        Upload the source geometry into the layer's database as WKB (v4.2.0).
+
+        Skipped for small WKT, where an inline literal is cheaper, and unless
+        writing to local files is enabled (GEOMETRY_TRANSPORT.local_files).
+
+        Returns:
+            SQL reference to the uploaded geometry, or None to use inline WKT
+        """
+        try:
+            from ....infrastructure.constants import (
+                GEOMETRY_TRANSPORT_ENABLED,
+                GEOMETRY_TRANSPORT_MIN_WKT_LENGTH,
+            )
+            from ....infrastructure.database.geometry_transport import (
+                local_file_transport_enabled,
+                sqlite_database_path,
+                sqlite_source_geometry_ref,
+                upload_source_geometry_sqlite,
+                wkt_to_wkb,
+            )
+        except ImportError:
+            return None
+
+        if not GEOMETRY_TRANSPORT_ENABLED or not layer:
+            return None
+        if len(source_wkt) < GEOMETRY_TRANSPORT_MIN_WKT_LENGTH or not local_file_transport_enabled():
+            return None
+
+        db_path = sqlite_database_path(layer)
+        wkb = wkt_to_wkb(source_wkt) if db_path else None
+        if not wkb:
+            return None
+
+        geom_id = upload_source_geometry_sqlite(db_path, wkb, source_srid)
+        if not geom_id:
+            return None
+        self.log_info(f"📦 Source geometry referenced by id {geom_id} ({len(wkb)} bytes WKB)")
+        return sqlite_source_geometry_ref(geom_id, source_srid)
+
     def _simplify_wkt(self, wkt: str) -> str:
         """Simplify WKT geometry to reduce complexity."""
         try:
@@ -406,7 +535,8 @@ class SpatialiteExpressionBuilder(GeometricFilterPort):
             'DISJOINT',
             'BUFFER',
             'GEOMFROMTEXT',
-            'GEOMFROMGPB'
+            'GEOMFROMGPB',
+            'GEOMFROMWKB'
         ]
 
         return any(p in subset_upper for p in geometric_patterns)
@@ -635,14 +635,21 @@ def prepare_spatialite_source_geom(context: SpatialiteSourceContext) -> Spatiali
     logger.debug(f"[Spatialite] Target CRS: {context.source_layer_crs_authid}")
 
     # Step 4: Check cache with proper key
+    # v4.2.0: the task cache is persistent, the disk tier is keyed by source
+    # and checked against the source fingerprint
+    cache_kwargs = {}
     if context.geom_cache:
-        cached_geom = context.geom_cache.get(
-            features,
-            context.param_buffer_value,
-            context.source_layer_crs_authid,
+        from ....infrastructure.cache.disk_geometry_cache import layer_source_fingerprint
+        cache_kwargs = dict(
             layer_id=layer_id,
-            subset_string=current_subset
+            feature_ids=[f.id() for f in features],
+            buffer_value=context.param_buffer_value,
+            target_crs_authid=context.source_layer_crs_authid,
+            subset_string=current_subset,
+            layer_source=source_layer.source(),
+            source_fingerprint=layer_source_fingerprint(source_layer)
         )
+        cached_geom = context.geom_cache.get(**cache_kwargs)
 
         if cached_geom is not None:
             cached_wkt = cached_geom.get('wkt')
@@ -701,14 +708,7 @@ def prepare_spatialite_source_geom(context: SpatialiteSourceContext) -> Spatiali
 
     # Step 7: Store in cache
     if context.geom_cache:
-        context.geom_cache.put(
-            features,
-            context.param_buffer_value,
-            context.source_layer_crs_authid,
-            {'wkt': wkt},
-            layer_id=layer_id,
-            subset_string=current_subset
-        )
+        context.geom_cache.put(geometry={'wkt': wkt}, **cache_kwargs)
         logger.info("[Spatialite] ✓ Source geometry computed and CACHED")
 
     return SpatialiteSourceResult(
@@ -1144,13 +1144,13 @@ def cleanup_session_temp_tables(
     Returns:
         int: Number of tables cleaned up
     """
-    import sqlite3
+    from ....infrastructure.utils.task_utils import spatialite_connect
 
     if not session_id or not db_path:
         return 0
 
     try:
-        conn = sqlite3.connect(db_path)
+        conn = spatialite_connect(db_path)
         cur = conn.cursor()
 
         # Find all temp tables for this session (both new and legacy prefixes v4.4.4)
@@ -12,6 +12,7 @@ Features:
 - Index status checking
 - Index rebuild/optimize operations
 - Batch index management
+- R-tree candidate subqueries for Spatialite and GeoPackage layers (v4.2.0)
 
 Author: FilterMate Team
 Date: January 2026
@@ -19,7 +20,7 @@ Date: January 2026
 
 import logging
 from typing import Optional, List
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 logger = logging.getLogger('FilterMate.Spatialite.IndexManager')
 
@@ -35,6 +36,55 @@ class IndexInfo:
     size_bytes: int = 0
 
 
+@dataclass(frozen=True)
+class RTreeLayout:
+    """
+    R-tree virtual table behind a layer's spatial index.
+
+    Spatialite names it ``idx_<table>_<geom>`` with columns
+    ``pkid, xmin, xmax, ymin, ymax``; GeoPackage names it
+    ``rtree_<table>_<geom>`` with ``id, minx, maxx, miny, maxy``.
+    In both cases the id is the ROWID of the feature table.
+    """
+    table_name: str
+    id_column: str
+    min_x: str
+    max_x: str
+    min_y: str
+    max_y: str
+
+    @classmethod
+    def spatialite(cls, table_name: str, geometry_column: str) -> 'RTreeLayout':
+        return cls(f"idx_{table_name}_{geometry_column}", "pkid", "xmin", "xmax", "ymin", "ymax")
+
+    @classmethod
+    def geopackage(cls, table_name: str, geometry_column: str) -> 'RTreeLayout':
+        return cls(f"rtree_{table_name}_{geometry_column}", "id", "minx", "maxx", "miny", "maxy")
+
+    def candidate_sql(self, frame_sql: str, key: str = "ROWID") -> str:
+        """
+        Predicate keeping the rows whose R-tree box overlaps a geometry's MBR.
+
+        The frame is read once in a derived table, so its bounds are computed
+        once per statement and the R-tree is searched with them.
+
+        Args:
+            frame_sql: SQL expression of the geometry to search with
+            key: Feature table column matching the R-tree id
+
+        Returns:
+            str: ``key IN (SELECT id FROM rtree ...)``
+        """
+        rtree = self.table_name.replace('"', '""')
+        return (
+            f'{key} IN (SELECT r."{self.id_column}" FROM "{rtree}" AS r, '  # nosec B608
+            f'(SELECT MbrMinX(g) AS x0, MbrMinY(g) AS y0, MbrMaxX(g) AS x1, MbrMaxY(g) AS y1 '
+            f'FROM (SELECT {frame_sql} AS g)) AS f '
+            f'WHERE r."{self.min_x}" <= f.x1 AND r."{self.max_x}" >= f.x0 '
+            f'AND r."{self.min_y}" <= f.y1 AND r."{self.max_y}" >= f.y0)'
+        )
+
+
 class RTreeIndexManager:
     """
     Manages R-tree spatial indexes in Spatialite.
@@ -100,6 +150,37 @@ class RTreeIndexManager:
             logger.debug(f"[Spatialite] Error checking index existence: {e}")
             return False
 
+    def find_rtree(
+        self,
+        table_name: str,
+        geometry_column: str,
+        geopackage: bool = False
+    ) -> Optional[RTreeLayout]:
+        """
+        Find the R-tree table of a layer, whatever the case of its name.
+
+        Only reads sqlite_master, so a plain sqlite3 connection is enough.
+
+        Args:
+            table_name: Feature table name
+            geometry_column: Geometry column name
+            geopackage: Look for the GeoPackage layout instead of Spatialite's
+
+        Returns:
+            RTreeLayout or None if the layer has no spatial index
+        """
+        factory = RTreeLayout.geopackage if geopackage else RTreeLayout.spatialite
+        layout = factory(table_name, geometry_column)
+        try:
+            row = self._conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND lower(name) = lower(?)",
+                (layout.table_name,)
+            ).fetchone()
+        except Exception as e:
+            logger.debug(f"[Spatialite] Error looking up R-tree of {table_name}: {e}")
+            return None
+        return replace(layout, table_name=row[0]) if row else None
+
     def create_index(
         self,
         table_name: str,
@@ -0,0 +1,616 @@
+# -*- coding: utf-8 -*-
+"""
+Spatialite Query Service Module
+
+Asynchronous, cancellable read queries on Spatialite/GeoPackage files with
+estimated progress and streamed row batches.
+
+v4.2.0 - Spatialite execution service (October 2026)
+
+Features:
+- Small pool of read-only connections per database file, with mod_spatialite
+  loaded and mmap_size/cache_size tuned once per connection
+- Queries run on a worker thread; rows are handed over in batches through a
+  bounded queue, so the consuming QgsTask never holds the full result
+- sqlite3 progress handler called every few hundred VM instructions: it
+  aborts the statement as soon as cancellation is requested and counts the
+  work done for the progress estimate
+- Progress is estimated from the expected row count when known, else from
+  the VM instruction count of the previous run of the same statement
+- Finished statements are handed to the query profiler, when enabled, with
+  the connection still held so slow ones get their EXPLAIN QUERY PLAN
+
+Compared with InterruptibleSQLiteQuery, which polls every 0.5 s and returns
+all rows at once, cancellation takes effect within milliseconds and the
+result is consumed while it is produced.
+
+Usage:
+    service = get_spatialite_query_service()
+    handle = service.submit(db_path, 'SELECT fid FROM roads WHERE ...',
+                            cancel_check=task.isCanceled)
+    for batch in handle.batches(progress_callback=lambda p: task.setProgress(p * 100)):
+        fids.extend(row[0] for row in batch)
+    if handle.error:
+        ...
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .interruptible_query import SPATIALITE_BATCH_SIZE, SPATIALITE_QUERY_TIMEOUT
+
+logger = logging.getLogger('FilterMate.Adapters.Backends.Spatialite.QueryService')
+
+SPATIALITE_POOL_SIZE = 2                    # Read-only connections per database file
+SPATIALITE_MMAP_SIZE = 256 * 1024 * 1024    # PRAGMA mmap_size (bytes)
+SPATIALITE_CACHE_SIZE_KB = 64 * 1024        # PRAGMA cache_size (negative value = KiB)
+SPATIALITE_PROGRESS_OPCODES = 500           # VM instructions between progress handler calls
+SPATIALITE_STREAM_QUEUE_BATCHES = 4         # Batches buffered ahead of the consumer
+SPATIALITE_POLL_INTERVAL = 0.05             # Consumer wake-up for progress/cancel (seconds)
+SPATIALITE_PROGRESS_HALF_STEPS = 20000      # Handler calls at which an unknown query shows 50%
+SPATIALITE_COST_HISTORY_SIZE = 256          # Statements whose cost is remembered
+
+_SPATIALITE_EXTENSIONS = ('mod_spatialite', 'mod_spatialite.dll', 'libspatialite')
+
+# Sentinel put on the stream queue when the worker is finished
+_END = object()
+
+
+class QueryCancelledError(Exception):
+    """Raised inside the worker when a query is cancelled or times out."""
+
+
+class QueryTimeoutError(Exception):
+    """Error of a query aborted after its timeout, raised by iter_batches()."""
+
+
+def open_read_only_connection(
+    db_path: str,
+    mmap_size: int = SPATIALITE_MMAP_SIZE,
+    cache_size_kb: int = SPATIALITE_CACHE_SIZE_KB
+) -> sqlite3.Connection:
+    """
+    Open a read-only connection tuned for large scans.
+
+    The connection uses check_same_thread=False: it is reused by several
+    worker threads (one at a time) and interrupted from the consumer thread.
+    A missing mod_spatialite is logged, not raised, so plain SQL still works.
+
+    Args:
+        db_path: Path to the Spatialite/GeoPackage file
+        mmap_size: PRAGMA mmap_size in bytes (0 disables memory mapping)
+        cache_size_kb: Page cache size in KiB
+
+    Returns:
+        sqlite3.Connection opened with mode=ro
+    """
+    uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False, timeout=SPATIALITE_QUERY_TIMEOUT)
+
+    loaded = False
+    try:
+        conn.enable_load_extension(True)
+        for extension in _SPATIALITE_EXTENSIONS:
+            try:
+                conn.load_extension(extension)
+                loaded = True
+                break
+            except (OSError, sqlite3.OperationalError):
+                continue
+        conn.enable_load_extension(False)
+    except AttributeError:
+        # Python built without extension loading
+        pass
+    if not loaded:
+        logger.debug(f"[QueryService] mod_spatialite not loaded for {Path(db_path).name}")
+
+    conn.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+    conn.execute(f"PRAGMA cache_size = {-int(cache_size_kb)}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+class _ReadOnlyConnectionPool:
+    """Lazily filled LIFO pool of read-only connections to one file."""
+
+    def __init__(self, db_path: str, size: int, connect: Callable[[str], sqlite3.Connection]):
+        self.db_path = db_path
+        self._size = max(1, size)
+        self._connect = connect
+        self._idle: List[sqlite3.Connection] = []
+        self._created = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout: float) -> sqlite3.Connection:
+        """Take an idle connection, open one, or wait for one to be released."""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise sqlite3.OperationalError(f"Connection pool closed: {self.db_path}")
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self._size:
+                    self._created += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise sqlite3.OperationalError(f"No idle connection for {self.db_path} after {timeout}s")
+                self._condition.wait(remaining)
+        try:
+            return self._connect(self.db_path)
+        except Exception:
+            with self._condition:
+                self._created -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """Return a connection; it is closed instead if the pool was closed."""
+        conn.set_progress_handler(None, 0)
+        if conn.in_transaction:
+            conn.rollback()
+        with self._condition:
+            if self._closed:
+                self._created -= 1
+                conn.close()
+            else:
+                self._idle.append(conn)
+            self._condition.notify()
+
+    def close(self) -> None:
+        """Close idle connections; busy ones are closed on release."""
+        with self._condition:
+            self._closed = True
+            for conn in self._idle:
+                conn.close()
+            self._created -= len(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+
+class SpatialiteQueryHandle:
+    """
+    A submitted query: streamed batches, estimated progress and cancellation.
+
+    Attributes:
+        sql: SQL statement
+        error: Exception if the query failed, was cancelled or timed out
+        cancelled: True when the query stopped because of cancel()/cancel_check
+        timed_out: True when the query was aborted after its timeout
+            (error is then a QueryTimeoutError)
+        row_count: Rows delivered so far
+        elapsed_time: Seconds from submit to completion (or now)
+    """
+
+    def __init__(
+        self,
+        sql: str,
+        params: Sequence[Any],
+        batch_size: int,
+        cancel_check: Optional[Callable[[], bool]],
+        timeout: float,
+        expected_rows: Optional[int],
+        expected_steps: Optional[int],
+        layer: Optional[str] = None
+    ):
+        self.sql = sql
+        self.layer = layer
+        self.params = tuple(params)
+        self.batch_size = max(1, batch_size)
+        self.error: Optional[Exception] = None
+        self.cancelled = False
+        self.timed_out = False
+        self.row_count = 0
+        self.steps = 0
+        self._cancel_check = cancel_check
+        self._timeout = timeout
+        self._expected_rows = expected_rows
+        self._expected_steps = expected_steps
+        self._queue: "queue.Queue" = queue.Queue(maxsize=SPATIALITE_STREAM_QUEUE_BATCHES)
+        self._cancel_event = threading.Event()
+        self._stop_reason: Optional[str] = None  # 'cancel' or 'timeout', first one wins
+        self._done = threading.Event()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._start_time = time.monotonic()
+        self._end_time: Optional[float] = None
+
+    # === Consumer side ===
+
+    def cancel(self) -> None:
+        """Request cancellation; the running statement is aborted immediately."""
+        self._stop('cancel')
+        conn = self._conn
+        if conn is not None:
+            try:
+                conn.interrupt()
+            except Exception as e:
+                logger.debug(f"[QueryService] interrupt() failed: {e}")
+
+    def batches(
+        self,
+        progress_callback: Optional[Callable[[float], None]] = None
+    ) -> Iterator[List[Tuple]]:
+        """
+        Yield row batches as the worker produces them.
+
+        Wakes up every SPATIALITE_POLL_INTERVAL while waiting, to report
+        progress and forward cancel_check to the worker. Iteration stops
+        early on cancellation or error; check `error` afterwards.
+
+        Args:
+            progress_callback: Optional callback(progress), progress in 0.0-1.0,
+                called on the consumer's thread
+        """
+        last_progress = -1.0
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=SPATIALITE_POLL_INTERVAL)
+                except queue.Empty:
+                    item = None
+                    if self._done.is_set():
+                        # Batches queued just before the end, then the end
+                        # marker if it did not fit in a full queue
+                        try:
+                            item = self._queue.get_nowait()
+                        except queue.Empty:
+                            item = _END
+                    elif self._should_stop():
+                        self.cancel()
+
+                if progress_callback is not None:
+                    progress = self.progress
+                    if progress != last_progress:
+                        last_progress = progress
+                        try:
+                            progress_callback(progress)
+                        except Exception:
+                            pass  # Ignore callback errors
+
+                if item is _END:
+                    return
+                if item is not None:
+                    yield item
+        finally:
+            if not self._done.is_set():
+                # Consumer stopped early: stop the worker and drain the queue
+                self.cancel()
+                self._drain()
+
+    def fetch_all(
+        self,
+        progress_callback: Optional[Callable[[float], None]] = None
+    ) -> Tuple[List[Tuple], Optional[Exception]]:
+        """Collect every batch, with the (results, error) contract of InterruptibleSQLiteQuery."""
+        rows: List[Tuple] = []
+        for batch in self.batches(progress_callback):
+            rows.extend(batch)
+        if self.error is not None:
+            return [], self.error
+        return rows, None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the worker to finish; batches must be consumed for it to end."""
+        return self._done.wait(timeout)
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def progress(self) -> float:
+        """Estimated progress, 0.0-1.0; below 1.0 until the last row is read."""
+        if self._done.is_set():
+            return 1.0
+        if self._expected_rows:
+            estimate = self.row_count / self._expected_rows
+        elif self._expected_steps:
+            estimate = self.steps / self._expected_steps
+        else:
+            estimate = self.steps / (self.steps + SPATIALITE_PROGRESS_HALF_STEPS)
+        return min(estimate, 0.99)
+
+    @property
+    def elapsed_time(self) -> float:
+        end = self._end_time if self._end_time is not None else time.monotonic()
+        return end - self._start_time
+
+    # === Worker side ===
+
+    def _stop(self, reason: str) -> None:
+        if self._stop_reason is None:
+            self._stop_reason = reason
+        self._cancel_event.set()
+
+    def _should_stop(self) -> bool:
+        if self._cancel_event.is_set():
+            return True
+        if time.monotonic() - self._start_time > self._timeout:
+            self._stop('timeout')
+            return True
+        if self._cancel_check is not None:
+            try:
+                if self._cancel_check():
+                    self._stop('cancel')
+                    return True
+            except Exception as e:
+                logger.warning(f"[QueryService] Cancel check failed: {e}")
+        return False
+
+    def _on_progress(self) -> int:
+        """sqlite3 progress handler: a non-zero return aborts the statement."""
+        self.steps += 1
+        return 1 if self._should_stop() else 0
+
+    def _put(self, item: Any) -> None:
+        """Hand an item to the consumer, giving up if the query is cancelled."""
+        while True:
+            try:
+                self._queue.put(item, timeout=SPATIALITE_POLL_INTERVAL)
+                return
+            except queue.Full:
+                if self._should_stop():
+                    raise QueryCancelledError()
+
+    def _run(self, conn: sqlite3.Connection) -> None:
+        self._conn = conn
+        conn.set_progress_handler(self._on_progress, SPATIALITE_PROGRESS_OPCODES)
+        cursor = conn.cursor()
+        try:
+            cursor.execute(self.sql, self.params)
+            while True:
+                batch = cursor.fetchmany(self.batch_size)
+                if not batch:
+                    break
+                self.row_count += len(batch)
+                self._put(batch)
+        finally:
+            cursor.close()
+            self._conn = None
+
+    def _finish(self, error: Optional[Exception]) -> None:
+        if error is not None:
+            if isinstance(error, QueryCancelledError) or self._should_stop():
+                if self._stop_reason == 'timeout':
+                    self.timed_out = True
+                    error = QueryTimeoutError(f"Query timeout after {self._timeout}s")
+                else:
+                    self.cancelled = True
+                    error = Exception("Query cancelled by user")
+            self.error = error
+        self._end_time = time.monotonic()
+        self._done.set()
+        try:
+            self._queue.put_nowait(_END)
+        except queue.Full:
+            # Consumer is gone or will drain; batches() also stops on _done
+            pass
+
+    def _drain(self) -> None:
+        self._done.wait(self._timeout)
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+
+class SpatialiteQueryService:
+    """
+    Runs read queries on pooled read-only connections, one worker thread each.
+
+    Concurrency per file is bounded by the pool size: a worker waits for an
+    idle connection before executing. The VM instruction count of each
+    finished statement is remembered to estimate progress on its next run.
+
+    Example:
+        >>> service = SpatialiteQueryService()
+        >>> handle = service.submit("/data/city.gpkg", 'SELECT fid FROM "roads"')
+        >>> rows, error = handle.fetch_all()
+        >>> service.close()
+    """
+
+    def __init__(
+        self,
+        pool_size: int = SPATIALITE_POOL_SIZE,
+        batch_size: int = SPATIALITE_BATCH_SIZE,
+        mmap_size: int = SPATIALITE_MMAP_SIZE,
+        cache_size_kb: int = SPATIALITE_CACHE_SIZE_KB,
+        connect: Optional[Callable[[str], sqlite3.Connection]] = None,
+        profiler=None
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            pool_size: Read-only connections kept per database file
+            batch_size: Default rows per streamed batch
+            mmap_size: PRAGMA mmap_size for new connections
+            cache_size_kb: Page cache size in KiB for new connections
+            connect: Connection factory (defaults to open_read_only_connection)
+            profiler: QueryProfiler recording finished statements (v4.2.0)
+        """
+        self._pool_size = pool_size
+        self._batch_size = batch_size
+        self._connect = connect or (
+            lambda path: open_read_only_connection(path, mmap_size, cache_size_kb)
+        )
+        self._pools: Dict[str, _ReadOnlyConnectionPool] = {}
+        self._costs: "OrderedDict[str, int]" = OrderedDict()
+        self._profiler = profiler
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        db_path: str,
+        sql: str,
+        params: Sequence[Any] = (),
+        batch_size: Optional[int] = None,
+        cancel_check: Optional[Callable[[], bool]] = None,
+        timeout: float = SPATIALITE_QUERY_TIMEOUT,
+        expected_rows: Optional[int] = None,
+        layer: Optional[str] = None
+    ) -> SpatialiteQueryHandle:
+        """
+        Start a read query on a worker thread.
+
+        Args:
+            db_path: Spatialite/GeoPackage file
+            sql: SELECT statement
+            params: Statement parameters
+            batch_size: Rows per batch (default: service batch size)
+            cancel_check: Callable returning True to cancel (e.g. task.isCanceled);
+                polled by the progress handler, so it must be thread-safe
+            timeout: Maximum seconds before the query is aborted
+            expected_rows: Row count estimate used for progress, if known
+            layer: Layer name recorded by the query profiler
+
+        Returns:
+            SpatialiteQueryHandle to consume with batches() or fetch_all()
+        """
+        with self._lock:
+            expected_steps = self._costs.get(sql)
+        handle = SpatialiteQueryHandle(
+            sql, params, batch_size or self._batch_size,
+            cancel_check, timeout, expected_rows, expected_steps, layer
+        )
+        pool = self._get_pool(db_path)
+        thread = threading.Thread(
+            target=self._work, args=(pool, handle), daemon=True,
+            name="FilterMate-SpatialiteQuery"
+        )
+        thread.start()
+        return handle
+
+    def iter_batches(
+        self,
+        db_path: str,
+        sql: str,
+        params: Sequence[Any] = (),
+        progress_callback: Optional[Callable[[float], None]] = None,
+        **kwargs
+    ) -> Iterator[List[Tuple]]:
+        """
+        Submit a query and yield its batches; raises the query error, if any.
+
+        Cancellation is not an error here: iteration just stops. A timeout
+        raises QueryTimeoutError, the rows yielded before being incomplete.
+        """
+        handle = self.submit(db_path, sql, params, **kwargs)
+        yield from handle.batches(progress_callback)
+        if handle.error is not None and not handle.cancelled:
+            raise handle.error
+
+    def close(self, db_path: Optional[str] = None) -> None:
+        """Close the pool of one file, or every pool."""
+        with self._lock:
+            if db_path is None:
+                pools = list(self._pools.values())
+                self._pools.clear()
+            else:
+                pool = self._pools.pop(self._pool_key(db_path), None)
+                pools = [pool] if pool else []
+        for pool in pools:
+            pool.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool sizes per file."""
+        with self._lock:
+            return {
+                'pools': {path: pool.idle_count for path, pool in self._pools.items()},
+                'known_statement_costs': len(self._costs),
+            }
+
+    # === Private Methods ===
+
+    @staticmethod
+    def _pool_key(db_path: str) -> str:
+        return str(Path(db_path).resolve())
+
+    def _get_pool(self, db_path: str) -> _ReadOnlyConnectionPool:
+        key = self._pool_key(db_path)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = _ReadOnlyConnectionPool(key, self._pool_size, self._connect)
+                self._pools[key] = pool
+            return pool
+
+    def _work(self, pool: _ReadOnlyConnectionPool, handle: SpatialiteQueryHandle) -> None:
+        error: Optional[Exception] = None
+        try:
+            conn = pool.acquire(handle._timeout)
+        except Exception as e:
+            handle._finish(e)
+            return
+        try:
+            handle._run(conn)
+            if self._profiler is not None and self._profiler.enabled:
+                # v4.2.0: Before release, the plan is taken on the same connection
+                self._profiler.record_spatialite(
+                    conn, handle.sql, handle.elapsed_time * 1000, handle.row_count,
+                    handle.params, handle.layer
+                )
+        except Exception as e:
+            error = e
+        finally:
+            pool.release(conn)
+
+        if error is None:
+            self._remember_cost(handle.sql, handle.steps)
+            logger.debug(
+                f"[QueryService] {handle.row_count} rows in {handle.elapsed_time:.2f}s "
+                f"({handle.steps * SPATIALITE_PROGRESS_OPCODES} VM steps)"
+            )
+        elif not isinstance(error, QueryCancelledError):
+            logger.debug(f"[QueryService] Query stopped after {handle.elapsed_time:.2f}s: {error}")
+        handle._finish(error)
+
+    def _remember_cost(self, sql: str, steps: int) -> None:
+        if steps <= 0:
+            return
+        with self._lock:
+            self._costs[sql] = steps
+            self._costs.move_to_end(sql)
+            while len(self._costs) > SPATIALITE_COST_HISTORY_SIZE:
+                self._costs.popitem(last=False)
+
+
+_query_service: Optional[SpatialiteQueryService] = None
+_query_service_lock = threading.Lock()
+
+
+def get_spatialite_query_service() -> SpatialiteQueryService:
+    """Get the process-wide SpatialiteQueryService."""
+    global _query_service
+    with _query_service_lock:
+        if _query_service is None:
+            from ....infrastructure.database.query_profiler import get_query_profiler
+            _query_service = SpatialiteQueryService(profiler=get_query_profiler())
+        return _query_service
+
+
+__all__ = [
+    'SpatialiteQueryService',
+    'SpatialiteQueryHandle',
+    'QueryCancelledError',
+    'open_read_only_connection',
+    'get_spatialite_query_service',
+    'SPATIALITE_POOL_SIZE',
+    'SPATIALITE_MMAP_SIZE',
+    'SPATIALITE_CACHE_SIZE_KB',
+    'SPATIALITE_PROGRESS_OPCODES',
+]
@@ -9,6 +9,9 @@ to the hexagonal architecture.
 Part of FilterMate Hexagonal Architecture v3.0
 """
 
+import hashlib
+import os
+import random
 import time
 import sqlite3
 from typing import Dict, List, Optional, Tuple, Set, Any, Callable
@@ -36,6 +39,12 @@ from ...core.ports.filter_optimizer import (
     LayerStatistics,
     PlanBuilderConfig,
 )
+from ...core.optimization.spatial_statistics import (
+    SpatialStatistics,
+    SpatialStatisticsBuilder,
+    SpatialStatisticsStore,
+    default_statistics_path,
+)
 
 # Singleton instances
 _optimizer_instance: Optional["QgisFilterOptimizer"] = None
@@ -60,14 +69,22 @@ class QgisSelectivityEstimator(ISelectivityEstimator):
     """
     QGIS implementation of selectivity estimation.
 
-    Uses sampling-based estimation since QGIS backends
-    don't have PostgreSQL-style statistics.
+    QGIS backends don't have PostgreSQL-style statistics, so one scan of
+    the layer builds a SpatialStatistics object (density grid, vertex
+    histogram, column null fractions and distinct estimates). It is
+    persisted and recomputed only when the layer signature (source, subset,
+    feature count, extent, file modification time) changes.
     """
 
     # Statistics cache
     _stats_cache: Dict[str, LayerStatistics] = {}
     _cache_timestamps: Dict[str, float] = {}
-    _cache_max_age: float = 300.0  # 5 minutes
+    _cache_signatures: Dict[str, str] = {}
+    _spatial_stats: Dict[str, SpatialStatistics] = {}
+    _stats_store: Optional[SpatialStatisticsStore] = None
+
+    # Larger layers are scanned through a uniform random sample of FIDs
+    STATISTICS_SCAN_LIMIT = 100000
 
     def __init__(self):
         """Initialize estimator."""
@@ -78,28 +95,58 @@ class QgisSelectivityEstimator(ISelectivityEstimator):
         force_refresh: bool = False
     ) -> LayerStatistics:
         """Get or compute statistics for a layer."""
-        current_time = time.time()
-
-        # Check cache
-        if not force_refresh and layer_id in self._stats_cache:
-            cache_age = current_time - self._cache_timestamps.get(layer_id, 0)
-            if cache_age < self._cache_max_age:
-                return self._stats_cache[layer_id]
-
         # Get QGIS layer
         layer = self._get_layer(layer_id)
         if layer is None:
             return LayerStatistics(feature_count=0)
 
+        # Check cache (valid while the layer is unchanged)
+        signature = self._layer_signature(layer)
+        if (not force_refresh and layer_id in self._stats_cache
+                and self._cache_signatures.get(layer_id) == signature):
+            return self._stats_cache[layer_id]
+
         # Compute stats
-        stats = self._compute_statistics(layer)
+        stats = self._compute_statistics(layer, signature, force_refresh)
 
         # Cache
         self._stats_cache[layer_id] = stats
-        self._cache_timestamps[layer_id] = current_time
+        self._cache_timestamps[layer_id] = time.time()
+        self._cache_signatures[layer_id] = signature
 
         return stats
 
+    def has_statistics(self, layer_id: str) -> bool:
+        """True if scanned statistics are loaded for the layer."""
+        return layer_id in self._spatial_stats
+
+    def get_spatial_statistics(self, layer_id: str) -> Optional[SpatialStatistics]:
+        """Scanned statistics of a layer, computed on first use."""
+        self.get_layer_statistics(layer_id)
+        return self._spatial_stats.get(layer_id)
+
+    @classmethod
+    def _store(cls) -> SpatialStatisticsStore:
+        if cls._stats_store is None:
+            cls._stats_store = SpatialStatisticsStore(default_statistics_path())
+        return cls._stats_store
+
+    @staticmethod
+    def _layer_signature(layer: QgsVectorLayer) -> str:
+        """Hash of what invalidates layer statistics when it changes."""
+        source = layer.source()
+        extent = layer.extent()
+        parts = [
+            source,
+            layer.subsetString(),
+            str(layer.featureCount()),
+            extent.toString() if extent is not None and not extent.isNull() else '',
+        ]
+        path = source.split('|')[0]
+        if os.path.isfile(path):
+            parts.append(str(os.path.getmtime(path)))
+        return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
     def _get_layer(self, layer_id: str) -> Optional[QgsVectorLayer]:
         """Get QGIS layer by ID."""
         project = QgsProject.instance()
@@ -109,8 +156,13 @@ class QgisSelectivityEstimator(ISelectivityEstimator):
             return layer
         return None
 
-    def _compute_statistics(self, layer: QgsVectorLayer) -> LayerStatistics:
-        """Compute statistics by sampling layer."""
+    def _compute_statistics(
+        self,
+        layer: QgsVectorLayer,
+        signature: str,
+        force_refresh: bool = False
+    ) -> LayerStatistics:
+        """Compute statistics from the (persisted or scanned) layer statistics."""
         # Get safe feature count
         raw_count = layer.featureCount()
         feature_count = raw_count if raw_count is not None and raw_count >= 0 else 0
@@ -146,32 +198,58 @@ class QgisSelectivityEstimator(ISelectivityEstimator):
             estimated_complexity=1.0
         )
 
-        # Sample for vertex complexity
-        sample_size = min(100, feature_count) if feature_count > 0 else 0
+        spatial_stats = None if force_refresh else self._store().get(layer.id(), signature)
+        if spatial_stats is None:
+            spatial_stats = self._scan_statistics(layer, signature, feature_count, extent_bounds)
+            self._store().put(layer.id(), spatial_stats)
+        self._spatial_stats[layer.id()] = spatial_stats
+
+        if spatial_stats.vertices.sample:
+            stats.avg_vertices_per_feature = spatial_stats.avg_vertices
+            stats.estimated_complexity = max(
+                1.0,
+                stats.avg_vertices_per_feature / 10.0
+            )
 
-        if sample_size > 0:
-            total_vertices = 0
-            sampled = 0
+        return stats
 
-            request = QgsFeatureRequest()
-            request.setLimit(sample_size)
+    def _scan_statistics(
+        self,
+        layer: QgsVectorLayer,
+        signature: str,
+        feature_count: int,
+        extent_bounds: Optional[tuple]
+    ) -> SpatialStatistics:
+        """Read the layer once (or a uniform FID sample of it) into statistics."""
+        request = QgsFeatureRequest()
+        sample_size = None
+        if feature_count > self.STATISTICS_SCAN_LIMIT:
+            fids = list(layer.allFeatureIds())
+            if len(fids) > self.STATISTICS_SCAN_LIMIT:
+                sampled = random.sample(fids, self.STATISTICS_SCAN_LIMIT)
+                request.setFilterFids(sampled)
+                sample_size = len(sampled)
+
+        builder = SpatialStatisticsBuilder(
+            extent_bounds if layer.isSpatial() else None,
+            feature_count,
+            layer.fields().names(),
+            sample_size
+        )
+        if not layer.isSpatial():
+            request.setFlags(QgsFeatureRequest.NoGeometry)
 
-            for feat in layer.getFeatures(request):
-                geom = feat.geometry()
-                if geom and not geom.isEmpty():
-                    wkt = geom.asWkt()
-                    vertex_count = wkt.count(',') + 1
-                    total_vertices += vertex_count
-                    sampled += 1
-
-            if sampled > 0:
-                stats.avg_vertices_per_feature = total_vertices / sampled
-                stats.estimated_complexity = max(
-                    1.0,
-                    stats.avg_vertices_per_feature / 10.0
-                )
+        for feat in layer.getFeatures(request):
+            bbox = None
+            vertex_count = None
+            geom = feat.geometry()
+            if geom and not geom.isEmpty():
+                box = geom.boundingBox()
+                bbox = (box.xMinimum(), box.yMinimum(), box.xMaximum(), box.yMaximum())
+                vertex_count = geom.constGet().nCoordinates()
+            builder.add_feature(bbox, vertex_count, feat.attributes())
 
-        return stats
+        return builder.build(signature)
 
     def estimate_attribute_selectivity(
         self,
@@ -191,6 +269,13 @@ class QgisSelectivityEstimator(ISelectivityEstimator):
         if feature_count == 0:
             return 0.0
 
+        # Simple column predicates: null fractions and distinct estimates
+        spatial_stats = self.get_spatial_statistics(layer_id)
+        if spatial_stats is not None:
+            estimate = spatial_stats.attribute_selectivity(expression)
+            if estimate is not None:
+                return estimate
+
         try:
             expr = QgsExpression(expression)
             if expr.hasParserError():
@@ -201,9 +286,11 @@ class QgisSelectivityEstimator(ISelectivityEstimator):
                 QgsExpressionContextUtils.globalProjectLayerScopes(layer)
             )
 
-            actual_sample = min(sample_size, feature_count)
+            # Uniform FID sample rather than the first features
             request = QgsFeatureRequest()
-            request.setLimit(actual_sample)
+            if feature_count > sample_size:
+                fids = list(layer.allFeatureIds())
+                request.setFilterFids(random.sample(fids, min(sample_size, len(fids))))
 
             matching = 0
             evaluated = 0
@@ -237,6 +324,14 @@ class QgisSelectivityEstimator(ISelectivityEstimator):
         if layer is None:
             return 0.5
 
+        # Density grid of feature bboxes
+        spatial_stats = self.get_spatial_statistics(layer_id)
+        if spatial_stats is not None:
+            estimate = spatial_stats.spatial_selectivity(tuple(source_extent))
+            if estimate is not None:
+                return estimate
+
+        # No grid: assume uniform density over the layer extent
         target_extent = layer.extent()
         if target_extent is None or target_extent.isNull():
             return 0.5
@@ -272,11 +367,17 @@ class QgisSelectivityEstimator(ISelectivityEstimator):
                 removed += 1
             if layer_id in self._cache_timestamps:
                 del self._cache_timestamps[layer_id]
+            self._cache_signatures.pop(layer_id, None)
+            self._spatial_stats.pop(layer_id, None)
+            self._store().remove(layer_id)
             return removed
         else:
             count = len(self._stats_cache)
             self._stats_cache.clear()
             self._cache_timestamps.clear()
+            self._cache_signatures.clear()
+            self._spatial_stats.clear()
+            self._store().remove()
             return count
 
 
@@ -360,9 +461,15 @@ class QgisFilterOptimizer(IFilterOptimizer):
                 use_spatial_index=False
             )
 
-        # Attribute-first strategy if attribute filter is very selective
+        # Attribute-first strategy if attribute filter is very selective.
+        # With scanned statistics both estimates are measured: run first
+        # the step that leaves fewer features.
+        attribute_first = attr_selectivity < self.config.attribute_first_selectivity_threshold
+        if has_spatial_filter and spatial_extent and self.estimator.has_statistics(layer_id):
+            attribute_first = attr_selectivity <= spatial_selectivity
+
         if (attribute_filter and
-            attr_selectivity < self.config.attribute_first_selectivity_threshold and
+            attribute_first and
                 feature_count > self.config.small_dataset_threshold):
 
             estimated_after_attr = int(feature_count * attr_selectivity)
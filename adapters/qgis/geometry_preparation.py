@@ -20,7 +20,7 @@ Date: January 2026
 """
 
 import logging
-from typing import Optional, List, Dict, Union
+from typing import Optional, List, Dict, Tuple, Union
 from dataclasses import dataclass
 
 from qgis.core import (
@@ -66,6 +66,7 @@ class GeometryPreparationResult:
         geometry: Prepared geometry (for single geometry results)
         layer: Prepared layer (for layer results)
         wkt: WKT string (for WKT results)
+        wkb: WKB bytes (for binary transport results, v4.2.0)
         feature_count: Number of features processed
         valid_count: Number of valid geometries
         repaired_count: Number of geometries that were repaired
@@ -75,6 +76,7 @@ class GeometryPreparationResult:
     geometry: Optional[QgsGeometry] = None
     layer: Optional[QgsVectorLayer] = None
     wkt: Optional[str] = None
+    wkb: Optional[bytes] = None
     feature_count: int = 0
     valid_count: int = 0
     repaired_count: int = 0
@@ -127,6 +129,7 @@ class GeometryPreparationAdapter:
             'geometries_validated': 0,
             'geometries_repaired': 0,
             'wkt_generated': 0,
+            'wkb_generated': 0,
         }
 
     @property
@@ -602,73 +605,11 @@ class GeometryPreparationAdapter:
         Returns:
             GeometryPreparationResult with WKT string
         """
-        if not features:
-            return GeometryPreparationResult(
-                success=False,
-                error_message="No features provided"
-            )
-
-        # Setup transform if needed
-        transform = None
-        if target_crs and source_crs:
-            transform = QgsCoordinateTransform(
-                source_crs, target_crs, self._project
-            )
-
-        # Collect geometries
-        geometries = []
-        for feature in features:
-            if not feature.hasGeometry():
-                continue
-
-            geom = QgsGeometry(feature.geometry())  # Copy
-            if geom.isEmpty():
-                continue
-
-            # Apply centroid if requested
-            if use_centroids:
-                centroid = geom.centroid()
-                if centroid and not centroid.isEmpty():
-                    geom = centroid
-
-            # Transform if needed
-            if transform:
-                geom.transform(transform)
-
-            # Validate
-            if self._config.validate_geometries and not geom.isGeosValid():
-                if self._config.repair_geometries:
-                    geom = self._repair_geometry(geom)
-                    if not geom or not geom.isGeosValid():
-                        continue
-                else:
-                    continue
-
-            geometries.append(geom)
-
-        if not geometries:
-            return GeometryPreparationResult(
-                success=False,
-                error_message="No valid geometries found"
-            )
-
-        # Dissolve geometries
-        if dissolve and len(geometries) > 1:
-            try:
-                collected = QgsGeometry.collectGeometry(geometries)
-                if collected and not collected.isEmpty():
-                    dissolved = collected.unaryUnion()
-                    if dissolved and not dissolved.isEmpty():
-                        final_geom = dissolved
-                    else:
-                        final_geom = collected
-                else:
-                    final_geom = geometries[0]
-            except Exception as e:
-                logger.warning(f"Dissolve failed: {e}, using first geometry")
-                final_geom = geometries[0]
-        else:
-            final_geom = geometries[0] if len(geometries) == 1 else QgsGeometry.collectGeometry(geometries)
+        final_geom, geometries, error = self._collect_geometries(
+            features, target_crs, source_crs, dissolve, use_centroids
+        )
+        if final_geom is None:
+            return GeometryPreparationResult(success=False, error_message=error)
 
         # Determine WKT precision
         if wkt_precision is None:
@@ -694,6 +635,55 @@ class GeometryPreparationAdapter:
             valid_count=len(geometries)
         )
 
+    def features_to_wkb(
+        self,
+        features: List[QgsFeature],
+        target_crs: Optional[QgsCoordinateReferenceSystem] = None,
+        source_crs: Optional[QgsCoordinateReferenceSystem] = None,
+        dissolve: bool = True,
+        use_centroids: bool = False
+    ) -> GeometryPreparationResult:
+        """
+        Convert features to WKB for binary geometry transport.
+
+        v4.2.0: Same preparation as features_to_wkt(), without the lossy
+        float-to-text conversion. The WKB is meant to be bound as a query
+        parameter (see infrastructure.database.geometry_transport), never
+        embedded in SQL text.
+
+        Args:
+            features: List of features with geometries
+            target_crs: Target CRS (if reprojection needed)
+            source_crs: Source CRS (required if reprojecting)
+            dissolve: Whether to dissolve geometries
+            use_centroids: Convert to centroids before processing
+
+        Returns:
+            GeometryPreparationResult with WKB bytes and the geometry
+        """
+        final_geom, geometries, error = self._collect_geometries(
+            features, target_crs, source_crs, dissolve, use_centroids
+        )
+        if final_geom is None:
+            return GeometryPreparationResult(success=False, error_message=error)
+
+        wkb = bytes(final_geom.asWkb())
+
+        self._metrics['wkb_generated'] += 1
+
+        logger.debug(
+            f"features_to_wkb: {len(features)} features → "
+            f"{len(geometries)} geometries → {len(wkb)} bytes WKB"
+        )
+
+        return GeometryPreparationResult(
+            success=True,
+            geometry=final_geom,
+            wkb=wkb,
+            feature_count=len(features),
+            valid_count=len(geometries)
+        )
+
     def features_to_wkt_with_simplification(
         self,
         features: List[QgsFeature],
@@ -1083,6 +1073,86 @@ class GeometryPreparationAdapter:
 
         return None
 
+    def _collect_geometries(
+        self,
+        features: List[QgsFeature],
+        target_crs: Optional[QgsCoordinateReferenceSystem],
+        source_crs: Optional[QgsCoordinateReferenceSystem],
+        dissolve: bool,
+        use_centroids: bool
+    ) -> Tuple[Optional[QgsGeometry], List[QgsGeometry], Optional[str]]:
+        """
+        Collect, transform, validate and optionally dissolve feature geometries.
+
+        Shared by features_to_wkt() and features_to_wkb().
+
+        Returns:
+            Tuple of (final geometry or None, valid geometries, error message)
+        """
+        if not features:
+            return None, [], "No features provided"
+
+        # Setup transform if needed
+        transform = None
+        if target_crs and source_crs:
+            transform = QgsCoordinateTransform(
+                source_crs, target_crs, self._project
+            )
+
+        # Collect geometries
+        geometries = []
+        for feature in features:
+            if not feature.hasGeometry():
+                continue
+
+            geom = QgsGeometry(feature.geometry())  # Copy
+            if geom.isEmpty():
+                continue
+
+            # Apply centroid if requested
+            if use_centroids:
+                centroid = geom.centroid()
+                if centroid and not centroid.isEmpty():
+                    geom = centroid
+
+            # Transform if needed
+            if transform:
+                geom.transform(transform)
+
+            # Validate
+            if self._config.validate_geometries and not geom.isGeosValid():
+                if self._config.repair_geometries:
+                    geom = self._repair_geometry(geom)
+                    if not geom or not geom.isGeosValid():
+                        continue
+                else:
+                    continue
+
+            geometries.append(geom)
+
+        if not geometries:
+            return None, [], "No valid geometries found"
+
+        # Dissolve geometries
+        if dissolve and len(geometries) > 1:
+            try:
+                collected = QgsGeometry.collectGeometry(geometries)
+                if collected and not collected.isEmpty():
+                    dissolved = collected.unaryUnion()
+                    if dissolved and not dissolved.isEmpty():
+                        final_geom = dissolved
+                    else:
+                        final_geom = collected
+                else:
+                    final_geom = geometries[0]
+            except Exception as e:
+                logger.warning(f"Dissolve failed: {e}, using first geometry")
+                final_geom = geometries[0]
+        else:
+            final_geom = geometries[0] if len(geometries) == 1 else QgsGeometry.collectGeometry(geometries)
+
+        return final_geom, geometries, None
+
     def _is_geographic_crs(self, crs_authid: Optional[str]) -> bool:
         """Check if CRS is geographic based on auth ID."""
         if not crs_authid:
@@ -8,6 +8,7 @@ This module provides filter expression operations:
 - Expression sanitization and optimization
 - Primary key formatting for SQL
 - Expression combiners (AND, OR, NOT, REPLACE)
+- Incremental refinement of narrowing filters (v4.2.0)
 
 Used by FilterEngineTask for building complex filter expressions.
 
@@ -40,6 +41,15 @@ from .expression_combiner import (  # noqa: F401
     CombineOperator,
 )
 
+# Incremental refinement (v4.2.0)
+from .refinement import (  # noqa: F401
+    FilterSignature,
+    RefinementEngine,
+    RefinementKind,
+    detect_refinement,
+    get_refinement_engine,
+)
+
 # Source filter builders (Phase E5)
 from .source_filter_builder import (  # noqa: F401
     should_skip_source_subset,
@@ -67,6 +77,12 @@ __all__ = [
     'apply_combine_operator',
     'combine_with_old_subset',
     'CombineOperator',
+    # Incremental refinement
+    'FilterSignature',
+    'RefinementEngine',
+    'RefinementKind',
+    'detect_refinement',
+    'get_refinement_engine',
     # Source filter builders (Phase E5)
     'should_skip_source_subset',
     'get_primary_key_field',
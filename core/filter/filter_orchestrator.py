@@ -9,6 +9,10 @@ the FilterEngineTask God Class (7,015 lines). It coordinates:
 3. Filter expression building delegation
 4. Backend execution with intelligent fallback mechanisms
 5. Subset string management and combination strategies
+6. Incremental refinement: a filter that only narrows the previous run
+   on a layer is evaluated over that run's result (v4.2.0)
+7. Backend latency learning: each successful run is timed and recorded
+   in the AutoBackendSelector cost model (v4.2.0)
 
 Part of EPIC-1 Phase E12 (Filter Orchestration Extraction).
 
@@ -18,20 +22,29 @@ Hexagonal Architecture:
 - Delegates to: ExpressionBuilder, ResultProcessor
 """
 
+import dataclasses
 import logging
+import re
+import time
 from typing import Optional, Dict, Any, Tuple
 from qgis.core import (
+    QgsFeatureRequest,
     QgsVectorLayer,
     QgsMessageLog,
     Qgis
 )
 
 from ..ports import get_backend_services
+from .refinement import FilterSignature, MAX_HELD_FEATURES, get_refinement_engine, strip_restriction
+from ...infrastructure.cache.fid_set import FidSet
 from ...infrastructure.constants import (
     PROVIDER_POSTGRES, PROVIDER_SPATIALITE, PROVIDER_OGR, PROVIDER_MEMORY,
     QGIS_PROVIDER_POSTGRES,
 )
 
+# Leading geometry keyword of a WKT string (source vertex count for the cost model)
+_WKT_RE = re.compile(r'^\s*(?:SRID=\d+;)?\s*(?:MULTI)?(?:POINT|LINESTRING|POLYGON|GEOMETRYCOLLECTION)\b', re.IGNORECASE)
+
 _backend_services = get_backend_services()
 BackendFactory = _backend_services.get_backend_factory()
 
@@ -84,6 +97,8 @@ class FilterOrchestrator:
         self.task_parameters['_subset_queue_callback'] = subset_queue_callback
         self.task_parameters['_parent_task'] = parent_task
 
+        self._refinement_engine = get_refinement_engine()
+
         logger.debug("FilterOrchestrator initialized with callback pattern (predicates fetched lazily)")
 
     def orchestrate_geometric_filter(
@@ -214,6 +229,14 @@ class FilterOrchestrator:
             logger.info(f"   Layer: {layer.name()}")
             logger.info(f"   Source geom type: {type(source_geom).__name__}")
 
+            # v4.2.0: The learned cost model picks the execution strategy
+            # (PostgreSQL: tiled or single statement) once it can compare them.
+            # Timing starts here: tiled runs do their work while building.
+            cost_features = self._cost_features(layer, source_geom)
+            predicate = next(iter(current_predicates), None)
+            layer_props['_execution_strategy'] = self._recommended_strategy(layer, backend_name, predicate, cost_features)
+            run_start = time.perf_counter()
+
             expression = expression_builder.build_backend_expression(
                 backend=backend,
                 layer_props=layer_props,
@@ -244,6 +267,31 @@ class FilterOrchestrator:
             # ==========================================
             old_subset, combine_operator = self._determine_subset_strategy(layer)
 
+            # v4.2.0: Evaluate a narrowing filter over the previous result only.
+            # Only when the new subset replaces the old one: a combined subset
+            # is not the previous run's result.
+            subset_before = layer.subsetString()
+            refinement_signature = None
+            data_version = None
+            refined = False
+            if not (old_subset and combine_operator):
+                refinement_signature = self._build_refinement_signature(
+                    layer_props, backend_name, current_predicates
+                )
+            if refinement_signature is not None:
+                # Taken before the run: a change during the run invalidates the held result
+                data_version = self._layer_data_version(layer, backend_name)
+                plan = self._refinement_engine.plan(layer.id(), refinement_signature, subset_before, data_version)
+                if plan.is_refinement:
+                    expression = plan.apply(expression)
+                    refined = True
+                    logger.info(
+                        f"  ♻️ Refinement ({plan.decision.reason}): evaluating over "
+                        f"{plan.held.feature_count} previous features of {layer.name()}"
+                    )
+                else:
+                    logger.debug(f"  Full run for {layer.name()}: {plan.decision.reason}")
+
             # ==========================================
             # 7. BACKEND EXECUTION
             # ==========================================
@@ -263,6 +311,12 @@ class FilterOrchestrator:
                 logger.info(f"   {expression}")
 
             result = backend.apply_filter(layer, expression, old_subset, combine_operator)
+            elapsed_ms = (time.perf_counter() - run_start) * 1000.0
+            if result:
+                self._record_backend_latency(
+                    layer, backend_name, predicate, cost_features, elapsed_ms,
+                    self._executed_strategy(expression, refined), subset_before
+                )
 
             logger.info(f"   → apply_filter() result: {result}")
             if not result:
@@ -275,6 +329,11 @@ class FilterOrchestrator:
             # Collect warnings from backend
             self._collect_backend_warnings(backend)
 
+            if refinement_signature is not None and result:
+                self._hold_refinement_result(layer, layer_props, refinement_signature, subset_before, data_version)
+            else:
+                self._refinement_engine.forget(layer.id())
+
             # ==========================================
             # 8. FALLBACK HANDLING
             # ==========================================
@@ -424,10 +483,11 @@ class FilterOrchestrator:
             return
 
         # Check if this is a VALID EXISTS expression (well-formed)
-        # Pattern: EXISTS (SELECT ... FROM ... AS __source WHERE ...)
+        # Pattern: EXISTS (SELECT ... FROM ... AS __source WHERE ...),
+        # possibly behind a refinement key restriction (v4.2.0)
         is_valid_exists = bool(re.match(
             r'^\s*EXISTS\s*\(\s*SELECT\s+.+\s+FROM\s+.+\s+AS\s+__source\s+WHERE\s+.+\)\s*$',
-            current_subset,
+            strip_restriction(current_subset),
             re.IGNORECASE | re.DOTALL
         ))
 
@@ -534,6 +594,137 @@ class FilterOrchestrator:
             logger.info("  → Reason: Preserving user's attribute filter with geometric filter")
             return old_subset, combine_operator
 
+    def _build_refinement_signature(
+        self,
+        layer_props: Dict[str, Any],
+        backend_name: str,
+        current_predicates: Dict[str, Any]
+    ) -> Optional[FilterSignature]:
+        """
+        Describe the pending run for incremental refinement.
+
+        Only SQL backends take a primary key restriction (the OGR backend
+        filters through processing), and the key must be known.
+
+        Returns:
+            FilterSignature, or None when the run cannot be refined
+        """
+        primary_key_name = layer_props.get("primary_key_name")
+        if backend_name not in (PROVIDER_POSTGRES, PROVIDER_SPATIALITE) or not primary_key_name:
+            return None
+
+        task = self.task_parameters.get("task", {})
+        features = task.get("features") or []
+        source_fids = None
+        source_filter = None
+        if features and features[0] != "":
+            source_fids = [f.id() if hasattr(f, 'id') else f for f in features]
+            if not all(isinstance(fid, int) for fid in source_fids):
+                return None
+        else:
+            source_filter = getattr(self.parent_task, 'param_source_new_subset', None) or task.get("expression")
+
+        parent = self.parent_task
+        return FilterSignature.create(
+            source_filter=source_filter,
+            source_fids=source_fids,
+            predicates=current_predicates.keys(),
+            buffer_value=getattr(parent, 'param_buffer_value', None),
+            buffer_expression=getattr(parent, 'param_buffer_expression', None),
+            context=(
+                getattr(parent, 'param_source_layer_id', None),
+                backend_name,
+                primary_key_name,
+                bool(task.get("skip_source_filter", False)),
+                getattr(parent, 'param_use_centroids_source_layer', False),
+                getattr(parent, 'param_use_centroids_distant_layers', False),
+                getattr(parent, 'param_buffer_type', None),
+                getattr(parent, 'param_buffer_segments', None),
+            ),
+        )
+
+    def _hold_refinement_result(
+        self,
+        layer: QgsVectorLayer,
+        layer_props: Dict[str, Any],
+        signature: FilterSignature,
+        subset_before: str,
+        data_version: Optional[str] = None
+    ) -> None:
+        """
+        Keep the primary keys of the filtered layer for the next run.
+
+        Skipped when the subset was not applied on this thread (queued),
+        when the result is too large, when the key is not an integer, or
+        when the table version is unknown (v4.2.0: other clients of the
+        database could change it unnoticed).
+        """
+        layer_id = layer.id()
+        subset = layer.subsetString()
+        count = layer.featureCount()
+        primary_key_name = layer_props.get("primary_key_name")
+        field_index = layer.fields().lookupField(primary_key_name)
+        if (not subset or subset == subset_before or count < 0 or count > MAX_HELD_FEATURES
+                or field_index < 0 or data_version is None):
+            self._refinement_engine.forget(layer_id)
+            return
+
+        request = QgsFeatureRequest()
+        request.setFlags(QgsFeatureRequest.NoGeometry)
+        request.setSubsetOfAttributes([field_index])
+        keys = []
+        for i, feature in enumerate(layer.getFeatures(request)):
+            value = feature.attribute(field_index)
+            if not isinstance(value, int) or (i % 10000 == 0 and self.parent_task and self.parent_task.isCanceled()):
+                self._refinement_engine.forget(layer_id)
+                return
+            keys.append(value)
+
+        self._refinement_engine.record(layer_id, signature, subset, primary_key_name, FidSet.from_fids(keys), data_version)
+        self._refinement_engine.watch(layer)
+        logger.debug(f"  Held {len(keys)} result keys of {layer.name()} for refinement")
+
+    def _layer_data_version(self, layer: QgsVectorLayer, backend_name: str) -> Optional[str]:
+        """
+        Version of the data behind a layer, as seen by all database clients (v4.2.0).
+
+        PostgreSQL: the statistics version of the table (mv_cache, no
+        triggers). Spatialite/GeoPackage: size and modification time of the
+        database file and its WAL.
+
+        Returns:
+            str, or None when it cannot be determined
+        """
+        try:
+            if backend_name == PROVIDER_POSTGRES:
+                from qgis.core import QgsDataSourceUri
+                from ...adapters.backends.postgresql.mv_cache import VERSIONING_STATISTICS, fetch_table_versions
+                from ...infrastructure.database.connection_pool import pooled_connection_from_layer
+
+                uri = QgsDataSourceUri(layer.source())
+                table = (uri.schema() or 'public', uri.table())
+                with pooled_connection_from_layer(layer) as (connexion, _):
+                    if not connexion:
+                        return None
+                    try:
+                        versions = fetch_table_versions(connexion, table[0], [table], VERSIONING_STATISTICS)
+                    finally:
+                        connexion.rollback()
+                return versions.get(table) if versions else None
+
+            if backend_name == PROVIDER_SPATIALITE:
+                import os
+                from ...infrastructure.database.geometry_transport import sqlite_database_path
+
+                path = sqlite_database_path(layer)
+                if not path:
+                    return None
+                stats = [os.stat(name) for name in (path, f"{path}-wal") if os.path.exists(name)]
+                return ";".join(f"{st.st_size}.{st.st_mtime_ns}" for st in stats) or None
+        except Exception as e:
+            logger.debug(f"  Data version of {layer.name()} unavailable: {e}")
+        return None
+
     def _get_combine_operator(self) -> Optional[str]:
         """
         Get the logical operator for combining filters.
@@ -737,6 +928,114 @@ class FilterOrchestrator:
             )
             return False
 
+    def _cost_features(self, layer: QgsVectorLayer, source_geom: Any = None):
+        """Execution characteristics of this run for the backend cost model (selectivity set once known)."""
+        from ..optimization.cost_model import CostFeatures
+        try:
+            buffer_distance = float(getattr(self.parent_task, 'param_buffer_value', None) or 0.0)
+        except (TypeError, ValueError):
+            buffer_distance = 0.0
+        return CostFeatures(
+            feature_count=max(0, layer.featureCount()),
+            vertex_count=self._source_vertex_count(source_geom),
+            buffer_distance=buffer_distance,
+        )
+
+    def _source_vertex_count(self, source_geom: Any) -> int:
+        """Vertices of the source geometry: coordinates in its WKT (0 when there is none)."""
+        for wkt in (getattr(self.parent_task, 'spatialite_source_geom', None), source_geom):
+            if isinstance(wkt, str) and _WKT_RE.match(wkt):
+                return wkt.count(',') + 1
+        return 0
+
+    def _recommended_strategy(self, layer: QgsVectorLayer, backend_name: str, predicate, cost_features) -> Optional[str]:
+        """
+        Execution strategy the learned cost model picks for the selected backend.
+
+        Only direct vs progressive (PostgreSQL tiled EXISTS) is chosen here,
+        and only once the model predicts both: a strategy that never runs
+        would never be learned. Two-phase runs are refinements over a
+        previous result, which only exist after a previous run.
+
+        Returns:
+            'direct', 'progressive' or None to keep the configured thresholds
+        """
+        try:
+            from ..optimization.auto_backend_selector import get_auto_backend_selector
+            from ..optimization.cost_model import STRATEGY_DIRECT, STRATEGY_PROGRESSIVE
+            recommendation = get_auto_backend_selector().recommend_execution(
+                layer,
+                {
+                    'predicate': predicate,
+                    'vertex_count': cost_features.vertex_count,
+                    'buffer_distance': cost_features.buffer_distance,
+                },
+                [PROVIDER_POSTGRES, PROVIDER_SPATIALITE, PROVIDER_OGR],
+            )
+        except Exception as e:
+            logger.debug(f"Backend recommendation unavailable for {layer.name()}: {e}")
+            return None
+        if not recommendation.from_model:
+            logger.debug(f"  Backend recommendation: {recommendation.reason}")
+            return None
+        if recommendation.backend_type != backend_name:
+            logger.info(f"  💡 {recommendation.reason} (selected: {backend_name})")
+
+        # Candidates are ranked by predicted latency
+        candidates = [{'backend': recommendation.backend_type, 'strategy': recommendation.strategy, 'from_model': True}]
+        candidates.extend(recommendation.alternatives)
+        predicted = [
+            c['strategy'] for c in candidates
+            if c.get('from_model') and c['backend'] == backend_name and c['strategy'] in (STRATEGY_DIRECT, STRATEGY_PROGRESSIVE)
+        ]
+        if set(predicted) != {STRATEGY_DIRECT, STRATEGY_PROGRESSIVE}:
+            return None
+        logger.info(f"  💡 Cost model strategy for {layer.name()}: {predicted[0]}")
+        return predicted[0]
+
+    def _executed_strategy(self, expression: str, refined: bool) -> str:
+        """Strategy the run actually used, as recorded in the cost model."""
+        from ..optimization.cost_model import STRATEGY_DIRECT, STRATEGY_PROGRESSIVE, STRATEGY_TWO_PHASE
+        if refined:
+            return STRATEGY_TWO_PHASE
+        try:
+            from ...adapters.backends.postgresql.tiled_exists import TILED_TABLE_PREFIX
+        except ImportError:
+            return STRATEGY_DIRECT
+        return STRATEGY_PROGRESSIVE if TILED_TABLE_PREFIX in (expression or '') else STRATEGY_DIRECT
+
+    def _record_backend_latency(
+        self,
+        layer: QgsVectorLayer,
+        backend_name: str,
+        predicate,
+        cost_features,
+        elapsed_ms: float,
+        strategy: str,
+        subset_before: Optional[str]
+    ) -> None:
+        """
+        Train the backend cost model with the measured duration of the run.
+
+        The selectivity is the share of the features returned. Runs whose
+        subset was queued for the main thread are skipped: their duration
+        does not include the filter's execution.
+        """
+        if backend_name not in (PROVIDER_POSTGRES, PROVIDER_SPATIALITE, PROVIDER_OGR):
+            return
+        if layer.subsetString() == subset_before:
+            return
+        count = layer.featureCount()
+        if cost_features.feature_count > 0 and count >= 0:
+            cost_features = dataclasses.replace(cost_features, selectivity=min(1.0, count / cost_features.feature_count))
+        try:
+            from ..optimization.auto_backend_selector import get_auto_backend_selector
+            get_auto_backend_selector().record_performance(
+                backend_name, layer.id(), int(elapsed_ms), features=cost_features, strategy=strategy, predicate=predicate
+            )
+        except Exception as e:
+            logger.debug(f"Could not record backend latency for {layer.name()}: {e}")
+
     def _collect_backend_warnings(self, backend: Any) -> None:
         """
         Collect user warnings from backend for display in finished().
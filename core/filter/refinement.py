@@ -0,0 +1,509 @@
+"""
+Incremental Filter Refinement
+
+Detects when a geometric filter only narrows the previous run on a layer
+and evaluates it over the previous result instead of the whole table.
+
+v4.2.0 - Incremental refinement (October 2026)
+
+A distant layer keeps a feature when at least one source feature satisfies
+one of the spatial predicates against it. The result can only shrink when,
+all other parameters being equal:
+
+- AND-append: the source filter gains top-level AND conditions;
+- selection subset: the selected source features are a subset of the
+  previous selection;
+- buffer shrink: a positive static buffer gets smaller. Only for
+  intersects/within: a smaller buffer can make contains or overlaps true.
+
+The new result is then the previous result intersected with the new
+expression. The previous result is held as a FidSet of primary keys
+(infrastructure.cache.fid_set) and turned into a compact primary key
+predicate that prefixes the new expression, so the database evaluates
+the spatial predicate only on the previous result rows. Anything else
+(another predicate, a larger buffer, a layer subset changed by undo or by
+hand, a combined subset) falls back to a full run.
+
+A held result is also dropped when the layer's data changes: edits
+committed in this QGIS (layer signals, see RefinementEngine.watch()) and,
+for databases shared with other clients, a changed table version checked
+before reuse (data_version in plan()/record()).
+
+Usage:
+    engine = get_refinement_engine()
+    plan = engine.plan(layer_id, signature, layer.subsetString(), data_version)
+    if plan.is_refinement:
+        expression = plan.apply(expression)
+    ...
+    engine.record(layer_id, signature, layer.subsetString(), pk_name, fid_set, data_version)
+    engine.watch(layer)
+"""
+
+import logging
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, FrozenSet, Iterable, List, Optional, Tuple
+
+from .expression_combiner import normalize_expression
+
+logger = logging.getLogger('FilterMate.Core.Filter.Refinement')
+
+# Predicates for which a smaller source set gives a smaller result
+# (existential: "some source feature satisfies P"). Disjoint is excluded.
+SOURCE_MONOTONE_PREDICATES = frozenset({
+    'intersects', 'contains', 'within', 'overlaps', 'touches',
+    'crosses', 'covers', 'coveredby', 'equals',
+})
+
+# Predicates for which a smaller buffer around the source gives a smaller result
+BUFFER_MONOTONE_PREDICATES = frozenset({'intersects', 'within', 'coveredby'})
+
+# Shortest run of consecutive keys written as BETWEEN in the restriction
+RESTRICTION_MIN_RUN = 3
+
+# Restriction terms above which the previous result is not worth reusing. The
+# restriction is part of the subset string the provider re-parses on every
+# request and that is kept in the filter history, so it stays short
+MAX_RESTRICTION_TERMS = 2000
+
+# Previous results above this many features are not captured
+MAX_HELD_FEATURES = 200000
+
+# Layers whose previous result is kept in memory
+MAX_HELD_LAYERS = 64
+
+# Layer signals after which a held result no longer matches the data
+DATA_CHANGE_SIGNALS = (
+    'committedFeaturesAdded',
+    'committedFeaturesRemoved',
+    'committedGeometriesChanges',
+    'committedAttributeValuesChanges',
+    'dataChanged',
+)
+
+
+class RefinementKind(Enum):
+    """How a run relates to the previous run on the same layer."""
+    FULL = "full"
+    UNCHANGED = "unchanged"
+    AND_APPEND = "and_append"
+    SELECTION_SUBSET = "selection_subset"
+    BUFFER_SHRINK = "buffer_shrink"
+
+
+def split_conjuncts(expression: Optional[str]) -> Tuple[str, ...]:
+    """
+    Split an expression on its top-level AND operators.
+
+    Parentheses, quoted strings and identifiers, and the AND of
+    ``BETWEEN a AND b`` are respected. An expression with a top-level OR
+    is a single conjunct (AND binds tighter). Each conjunct is normalized with
+    normalize_expression() so that whitespace and redundant outer
+    parentheses do not matter.
+
+    Args:
+        expression: SQL or QGIS expression (None or empty for no filter)
+
+    Returns:
+        Tuple[str, ...]: Normalized conjuncts, empty for no filter
+    """
+    expression = normalize_expression(expression or '')
+    if not expression:
+        return ()
+
+    parts = []
+    depth = 0
+    quote = None
+    start = 0
+    pending_between = False
+    upper = expression.upper()
+    i = 0
+    while i < len(expression):
+        char = expression[i]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif depth == 0 and char.isalpha() and (i == 0 or not _is_word_char(expression[i - 1])):
+            end = i
+            while end < len(expression) and _is_word_char(expression[end]):
+                end += 1
+            word = upper[i:end]
+            if word == 'BETWEEN':
+                pending_between = True
+            elif word == 'OR':
+                return (expression,)
+            elif word == 'AND':
+                if pending_between:
+                    pending_between = False
+                else:
+                    parts.append(expression[start:i])
+                    start = end
+            i = end
+            continue
+        i += 1
+    parts.append(expression[start:])
+    parts = [part for part in parts if part.strip()]
+    if len(parts) == 1:
+        return (normalize_expression(parts[0]),)
+
+    # Flatten nested groups: "(a AND b) AND c" -> a, b, c
+    conjuncts: List[str] = []
+    for part in parts:
+        for conjunct in split_conjuncts(part):
+            if conjunct not in conjuncts:
+                conjuncts.append(conjunct)
+    return tuple(conjuncts)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+def _predicate_name(name: str) -> str:
+    """'ST_Intersects' -> 'intersects'."""
+    name = name.lower()
+    return name[3:] if name.startswith('st_') else name
+
+
+@dataclass(frozen=True)
+class FilterSignature:
+    """
+    Parameters that determine a geometric filter result on one layer.
+
+    Attributes:
+        source_conjuncts: Top-level AND conditions of the source filter
+        source_fids: Selected source feature IDs (None when not a selection)
+        predicates: Normalized predicate names ('intersects', 'within', ...)
+        buffer_value: Static buffer distance (None or 0 for no buffer)
+        buffer_expression: Dynamic buffer expression (never compared by size)
+        context: Anything else that must be identical between runs
+            (source layer, backend, centroid options, buffer style, key)
+    """
+    source_conjuncts: Tuple[str, ...] = ()
+    source_fids: Optional[FrozenSet[int]] = None
+    predicates: FrozenSet[str] = frozenset()
+    buffer_value: Optional[float] = None
+    buffer_expression: Optional[str] = None
+    context: Tuple[Any, ...] = ()
+
+    @classmethod
+    def create(
+        cls,
+        source_filter: Optional[str] = None,
+        source_fids: Optional[Iterable[int]] = None,
+        predicates: Iterable[str] = (),
+        buffer_value: Optional[float] = None,
+        buffer_expression: Optional[str] = None,
+        context: Tuple[Any, ...] = ()
+    ) -> 'FilterSignature':
+        """Build a signature from raw task parameters."""
+        return cls(
+            source_conjuncts=split_conjuncts(source_filter),
+            source_fids=frozenset(source_fids) if source_fids is not None else None,
+            predicates=frozenset(_predicate_name(p) for p in predicates),
+            buffer_value=float(buffer_value) if buffer_value else None,
+            buffer_expression=(buffer_expression or '').strip() or None,
+            context=tuple(context),
+        )
+
+
+@dataclass(frozen=True)
+class RefinementDecision:
+    """Result of comparing two signatures."""
+    kind: RefinementKind
+    reason: str
+    narrowed_by: Tuple[RefinementKind, ...] = ()
+
+    @property
+    def is_refinement(self) -> bool:
+        return self.kind is not RefinementKind.FULL
+
+
+def detect_refinement(previous: FilterSignature, current: FilterSignature) -> RefinementDecision:
+    """
+    Decide whether ``current`` can only return a subset of ``previous``.
+
+    Args:
+        previous: Signature of the run that produced the held result
+        current: Signature of the run about to execute
+
+    Returns:
+        RefinementDecision: FULL unless every difference is a monotone narrowing
+    """
+    def full(reason: str) -> RefinementDecision:
+        return RefinementDecision(RefinementKind.FULL, reason)
+
+    if current.context != previous.context:
+        return full("source layer, backend or options changed")
+    if current.predicates != previous.predicates:
+        return full("predicates changed")
+    if current.buffer_expression != previous.buffer_expression:
+        return full("dynamic buffer changed")
+
+    narrowed = []
+
+    # Source filter: previous conditions must all still apply
+    if current.source_conjuncts != previous.source_conjuncts:
+        if not set(previous.source_conjuncts) < set(current.source_conjuncts):
+            return full("source filter is not an AND extension of the previous one")
+        narrowed.append(RefinementKind.AND_APPEND)
+
+    # Source selection
+    if current.source_fids != previous.source_fids:
+        if current.source_fids is None or previous.source_fids is None:
+            return full("source selection mode changed")
+        if not current.source_fids < previous.source_fids:
+            return full("source selection is not a subset of the previous one")
+        narrowed.append(RefinementKind.SELECTION_SUBSET)
+
+    if narrowed and not current.predicates <= SOURCE_MONOTONE_PREDICATES:
+        return full("predicate is not monotone in the source set")
+
+    # Static buffer
+    if current.buffer_value != previous.buffer_value:
+        old, new = previous.buffer_value or 0.0, current.buffer_value or 0.0
+        if current.buffer_expression:
+            return full("buffer changed with a dynamic buffer expression")
+        if not (old > 0 and 0 <= new < old):
+            return full("buffer did not shrink from a positive distance")
+        if not current.predicates <= BUFFER_MONOTONE_PREDICATES:
+            return full("predicate is not monotone in the buffer distance")
+        narrowed.append(RefinementKind.BUFFER_SHRINK)
+
+    if not narrowed:
+        return RefinementDecision(RefinementKind.UNCHANGED, "same parameters")
+    return RefinementDecision(
+        narrowed[0],
+        ", ".join(kind.value for kind in narrowed),
+        tuple(narrowed),
+    )
+
+
+def build_restriction(primary_key_name: str, fid_set: Any, min_run: int = RESTRICTION_MIN_RUN) -> str:
+    """
+    Build a primary key predicate matching a FidSet.
+
+    Runs of at least ``min_run`` keys become ``"pk" BETWEEN a AND b``, the
+    rest one IN list, OR-ed together. An empty set gives ``1 = 0``.
+
+    Args:
+        primary_key_name: Integer primary key column
+        fid_set: FidSet of the previous result (anything with runs())
+        min_run: Shortest run written as BETWEEN
+
+    Returns:
+        str: SQL predicate valid for PostgreSQL and Spatialite
+    """
+    pk = '"{}"'.format(primary_key_name.replace('"', '""'))
+    terms: List[str] = []
+    singles: List[str] = []
+    for start, end in fid_set.runs():
+        if end - start >= min_run:
+            terms.append(f"{pk} BETWEEN {start} AND {end - 1}")
+        else:
+            singles.extend(str(fid) for fid in range(start, end))
+    if singles:
+        terms.append(f"{pk} IN ({', '.join(singles)})")
+    if not terms:
+        return "1 = 0"
+    return " OR ".join(terms)
+
+
+_RESTRICTION_TERM = r'(?:"(?:[^"]|"")+" (?:BETWEEN -?\d+ AND -?\d+|IN \(-?\d+(?:, -?\d+)*\))|1 = 0)'
+_RESTRICTED_RE = re.compile(
+    r'^\(' + _RESTRICTION_TERM + r'(?: OR ' + _RESTRICTION_TERM + r')*\) AND \((.*)\)$',
+    re.DOTALL,
+)
+
+
+def strip_restriction(subset: str) -> str:
+    """Return the expression of a subset written by RefinementPlan.apply() without its key restriction."""
+    match = _RESTRICTED_RE.match(subset or '')
+    return match.group(1) if match else subset
+
+
+def restriction_terms(fid_set: Any, min_run: int = RESTRICTION_MIN_RUN) -> int:
+    """Number of BETWEEN terms plus IN values build_restriction() would emit."""
+    return sum(1 if end - start >= min_run else end - start for start, end in fid_set.runs())
+
+
+@dataclass(frozen=True)
+class HeldResult:
+    """Result of the last run on a layer, valid while its subset and data are unchanged."""
+    signature: FilterSignature
+    subset: str
+    primary_key_name: str
+    fid_set: Any
+    data_version: Optional[str] = None
+
+    @property
+    def feature_count(self) -> int:
+        return len(self.fid_set)
+
+
+@dataclass(frozen=True)
+class RefinementPlan:
+    """How to run a filter on a layer: in full, or over a held result."""
+    decision: RefinementDecision
+    held: Optional[HeldResult] = None
+
+    @property
+    def is_refinement(self) -> bool:
+        return self.held is not None and self.decision.is_refinement
+
+    def apply(self, expression: str) -> str:
+        """Restrict ``expression`` to the held result (unchanged for a full run)."""
+        if not self.is_refinement:
+            return expression
+        restriction = build_restriction(self.held.primary_key_name, self.held.fid_set)
+        return f"({restriction}) AND ({expression})"
+
+
+class RefinementEngine:
+    """
+    Holds the last result of each layer and plans the next run against it.
+
+    Thread-safe: distant layers may be filtered from several workers.
+    """
+
+    def __init__(self, max_layers: int = MAX_HELD_LAYERS, max_terms: int = MAX_RESTRICTION_TERMS):
+        self._held: 'OrderedDict[str, HeldResult]' = OrderedDict()
+        self._max_layers = max_layers
+        self._max_terms = max_terms
+        self._watched = set()
+        self._lock = threading.Lock()
+
+    def plan(
+        self,
+        layer_id: str,
+        signature: FilterSignature,
+        current_subset: Optional[str],
+        data_version: Optional[str] = None
+    ) -> RefinementPlan:
+        """
+        Compare a pending run with the result held for the layer.
+
+        Args:
+            layer_id: Layer being filtered
+            signature: Signature of the pending run
+            current_subset: The layer's subset string right now
+            data_version: Version of the layer's table right now
+                (compared with the version recorded with the held result)
+
+        Returns:
+            RefinementPlan: a refinement only when the held result is still
+            the layer's subset, its data did not change and the new run can
+            only narrow it
+        """
+        with self._lock:
+            held = self._held.get(layer_id)
+            if held is not None:
+                self._held.move_to_end(layer_id)
+        if held is None:
+            return RefinementPlan(RefinementDecision(RefinementKind.FULL, "no previous result"))
+        if (current_subset or '') != held.subset:
+            return RefinementPlan(RefinementDecision(RefinementKind.FULL, "layer subset changed since the previous run"))
+        if data_version != held.data_version:
+            self.forget(layer_id)
+            return RefinementPlan(RefinementDecision(RefinementKind.FULL, "layer data changed since the previous run"))
+
+        decision = detect_refinement(held.signature, signature)
+        if not decision.is_refinement:
+            return RefinementPlan(decision)
+        if restriction_terms(held.fid_set) > self._max_terms:
+            return RefinementPlan(RefinementDecision(RefinementKind.FULL, "previous result too fragmented"))
+        return RefinementPlan(decision, held)
+
+    def record(
+        self,
+        layer_id: str,
+        signature: FilterSignature,
+        subset: str,
+        primary_key_name: str,
+        fid_set: Any,
+        data_version: Optional[str] = None
+    ) -> None:
+        """Hold the result of a successful run applied as ``subset`` on data at ``data_version``."""
+        with self._lock:
+            self._held[layer_id] = HeldResult(signature, subset, primary_key_name, fid_set, data_version)
+            self._held.move_to_end(layer_id)
+            while len(self._held) > self._max_layers:
+                self._held.popitem(last=False)
+
+    def forget(self, layer_id: Optional[str] = None) -> None:
+        """Drop the held result of one layer, or of all layers."""
+        with self._lock:
+            if layer_id is None:
+                self._held.clear()
+            else:
+                self._held.pop(layer_id, None)
+
+    def watch(self, layer: Any) -> None:
+        """
+        Forget the layer's held result when its data changes in this QGIS.
+
+        Connects once per layer to DATA_CHANGE_SIGNALS. Changes made by other
+        clients of a shared database are caught by the data_version check.
+        """
+        layer_id = layer.id()
+        with self._lock:
+            if layer_id in self._watched:
+                return
+            self._watched.add(layer_id)
+
+        def forget(*_args):
+            self.forget(layer_id)
+
+        def unwatch(*_args):
+            with self._lock:
+                self._watched.discard(layer_id)
+            self.forget(layer_id)
+
+        for name in DATA_CHANGE_SIGNALS:
+            signal = getattr(layer, name, None)
+            if signal is not None:
+                signal.connect(forget)
+        signal = getattr(layer, 'willBeDeleted', None)
+        if signal is not None:
+            signal.connect(unwatch)
+
+    def held(self, layer_id: str) -> Optional[HeldResult]:
+        with self._lock:
+            return self._held.get(layer_id)
+
+
+_refinement_engine: Optional[RefinementEngine] = None
+_refinement_engine_lock = threading.Lock()
+
+
+def get_refinement_engine() -> RefinementEngine:
+    """Get the process-wide RefinementEngine."""
+    global _refinement_engine
+    with _refinement_engine_lock:
+        if _refinement_engine is None:
+            _refinement_engine = RefinementEngine()
+        return _refinement_engine
+
+
+__all__ = [
+    'RefinementKind',
+    'RefinementDecision',
+    'RefinementPlan',
+    'RefinementEngine',
+    'FilterSignature',
+    'HeldResult',
+    'split_conjuncts',
+    'detect_refinement',
+    'build_restriction',
+    'strip_restriction',
+    'get_refinement_engine',
+]
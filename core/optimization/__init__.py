@@ -19,6 +19,14 @@ Exported Symbols:
     - BackendRecommendation: Backend recommendation dataclass (v4.1 Phase 2)
     - BackendType: Enum of backend types (v4.1 Phase 2)
     - get_auto_backend_selector: Singleton factory for AutoBackendSelector (v4.1 Phase 2)
+    - ExecutionRecommendation: Backend + strategy recommendation (v4.2.0)
+    - AdaptiveCostModel: Learned per-backend/strategy latency model (v4.2.0)
+    - CostFeatures: Execution characteristics for the cost model (v4.2.0)
+    - replay_samples: Score the cost model against logged executions (v4.2.0)
+    - SpatialStatistics: Density grid / vertex / column statistics of a layer (v4.2.0)
+    - SpatialStatisticsStore: Persisted SpatialStatistics keyed by layer (v4.2.0)
+    - PgTableStatistics: pg_stats-based selectivity of a PostgreSQL table (v4.2.0)
+    - get_pg_statistics_cache: Per-table statistics cache keyed by reltuples (v4.2.0)
     - MultiStepFilterOptimizer: Complex filter decomposition (v4.1 Phase 2)
     - FilterStep: Single filter step dataclass (v4.1 Phase 2)
     - get_multi_step_optimizer: Singleton factory for MultiStepFilterOptimizer (v4.1 Phase 2)
@@ -40,6 +48,9 @@ Migration History:
     - v3.0: Migrated from modules/tasks/combined_query_optimizer.py
     - v4.1.0-beta.2: Added AutoBackendSelector (Phase 2)
     - v4.1.0-beta.2: Added MultiStepFilterOptimizer (Phase 2)
+    - v4.2.0: Added AdaptiveCostModel and AutoBackendSelector.recommend_execution()
+    - v4.2.0: Added SpatialStatistics for histogram-based selectivity estimation
+    - v4.2.0: Added PgTableStatistics (pg_stats selectivity for PostgreSQL)
 """
 
 from .combined_query_optimizer import (  # noqa: F401
@@ -61,9 +72,29 @@ from .auto_backend_selector import (  # noqa: F401
     AutoBackendSelector,
     BackendRecommendation,
     BackendType,
+    ExecutionRecommendation,
     get_auto_backend_selector
 )
 
+from .cost_model import (  # noqa: F401
+    AdaptiveCostModel,
+    CostFeatures,
+    replay_samples,
+)
+
+from .spatial_statistics import (  # noqa: F401
+    SpatialStatistics,
+    SpatialStatisticsBuilder,
+    SpatialStatisticsStore,
+)
+
+from .pg_statistics import (  # noqa: F401
+    PgColumnStatistics,
+    PgTableStatistics,
+    PgStatisticsCache,
+    get_pg_statistics_cache,
+)
+
 from .multi_step_filter import (  # noqa: F401
     MultiStepFilterOptimizer,
     FilterStep,
@@ -103,6 +134,19 @@ __all__ = [
     'BackendRecommendation',
     'BackendType',
     'get_auto_backend_selector',
+    'ExecutionRecommendation',
+    # Adaptive Cost Model (v4.2.0)
+    'AdaptiveCostModel',
+    'CostFeatures',
+    'replay_samples',
+    # Layer statistics (v4.2.0)
+    'SpatialStatistics',
+    'SpatialStatisticsBuilder',
+    'SpatialStatisticsStore',
+    'PgColumnStatistics',
+    'PgTableStatistics',
+    'PgStatisticsCache',
+    'get_pg_statistics_cache',
     # Multi-Step Filter Optimizer (v4.1 Phase 2)
     'MultiStepFilterOptimizer',
     'FilterStep',
@@ -6,13 +6,30 @@ Phase 2 (v4.1.0-beta.2): Restoration from v2.5.10 auto_optimizer.py
 Architecture: Hexagonal Core - Domain Service
 
 v4.1.5: BackendType removed - use canonical ProviderType from core.domain.filter_expression
+
+v4.2.0: recommend_execution() chooses backend AND strategy (direct, two-phase,
+progressive) from latencies predicted by AdaptiveCostModel (cost_model.py),
+which learns from record_performance() samples and is persisted in the
+plugin config directory. FilterOrchestrator records the measured duration
+of every successful apply_filter(). The fixed-constant heuristics remain the
+cold-start fallback.
 """
 
-from dataclasses import dataclass
-from typing import Optional, Dict, List
+from dataclasses import dataclass, field
+from typing import Any, Optional, Dict, List
 import logging
+import os
+import threading
 
 from ..domain.filter_expression import ProviderType
+from .cost_model import (
+    AdaptiveCostModel,
+    CostFeatures,
+    STRATEGIES,
+    STRATEGY_DIRECT,
+    STRATEGY_PROGRESSIVE,
+    STRATEGY_TWO_PHASE,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +56,34 @@ class BackendRecommendation:
     fallback_backend: Optional[str] = None
 
 
+@dataclass
+class ExecutionRecommendation:
+    """
+    Recommended backend and execution strategy.
+
+    Attributes:
+        backend_type: Recommended backend ('postgresql', 'spatialite', 'ogr')
+        strategy: 'direct', 'two_phase' or 'progressive'
+        estimated_time_ms: Predicted (or heuristic) execution time
+        confidence: Confidence score 0.0-1.0
+        reason: Human-readable explanation
+        from_model: True if predicted by the learned cost model
+        lower_ms / upper_ms: 95% prediction interval (model only)
+        fallback_backend: Alternative backend if primary fails
+        alternatives: Other ranked candidates (backend, strategy, estimate)
+    """
+    backend_type: str
+    strategy: str
+    estimated_time_ms: int
+    confidence: float
+    reason: str
+    from_model: bool = False
+    lower_ms: Optional[int] = None
+    upper_ms: Optional[int] = None
+    fallback_backend: Optional[str] = None
+    alternatives: List[Dict[str, Any]] = field(default_factory=list)
+
+
 class AutoBackendSelector:
     """
     Automatically selects optimal backend for filtering operations.
@@ -76,14 +121,30 @@ class AutoBackendSelector:
     SPATIAL_FILTER_MULTIPLIER = 2.5  # Spatial predicates (ST_Intersects, etc.)
     COMPLEX_FILTER_MULTIPLIER = 5.0  # Complex expressions (multiple AND/OR)
 
-    def __init__(self):
-        """Initialize selector with empty performance history."""
+    # Cold-start strategy thresholds (v4.2.0)
+    TWO_PHASE_THRESHOLD = 10000  # Spatial filters on >= 10k features: bbox pre-filter first
+    PROGRESSIVE_THRESHOLD = 500000  # >= 500k features: chunked streaming
+
+    # Persist the cost model every N recorded samples
+    AUTOSAVE_INTERVAL = 10
+
+    def __init__(self, cost_model: Optional[AdaptiveCostModel] = None):
+        """
+        Initialize selector with empty performance history.
+
+        Args:
+            cost_model: Learned latency model (default: empty, in-memory)
+        """
         # Performance history: backend → {layer_id: [execution_times_ms]}
         self.performance_history: Dict[str, Dict[str, List[int]]] = {
             'postgresql': {},
             'spatialite': {},
             'ogr': {}
         }
+        self.cost_model = cost_model if cost_model is not None else AdaptiveCostModel()
+        self._unsaved_samples = 0
+        # Filter runs of several layers record concurrently
+        self._lock = threading.Lock()
 
     def recommend_backend(
         self,
@@ -210,11 +271,121 @@ class AutoBackendSelector:
             fallback_backend=None
         )
 
+    def recommend_execution(
+        self,
+        layer,
+        filter_params: dict,
+        available_backends: List[str]
+    ) -> ExecutionRecommendation:
+        """
+        Recommend backend and execution strategy from predicted latency.
+
+        Every (compatible backend, strategy) pair with a warm cost model is
+        ranked by predicted latency. Predictions (measured milliseconds) and
+        the fixed-constant heuristic estimates are not comparable, so
+        backends still in cold start only decide when no pair is warm; they
+        are listed after the predicted pairs otherwise.
+
+        Args:
+            layer: QgsVectorLayer instance
+            filter_params: Same keys as recommend_backend(), plus optional:
+                - predicate: Spatial predicate name (e.g. 'intersects')
+                - vertex_count: Source geometry vertex count
+                - buffer_distance: Buffer applied to the source
+                - selectivity: Expected share of features returned (0-1)
+            available_backends: List of available backends
+
+        Returns:
+            ExecutionRecommendation
+        """
+        feature_count = layer.featureCount()
+        provider_type = layer.providerType()
+        expression = filter_params.get('expression', '')
+        has_spatial = bool(filter_params.get('spatial_op') or self._has_spatial_predicates(expression))
+        complexity_multiplier = self._get_complexity_multiplier(expression, has_spatial)
+        predicate = filter_params.get('predicate') or filter_params.get('spatial_op')
+        features = CostFeatures(
+            feature_count=max(0, feature_count or 0),
+            vertex_count=filter_params.get('vertex_count', 0.0) or 0.0,
+            buffer_distance=filter_params.get('buffer_distance', 0.0) or 0.0,
+            selectivity=filter_params.get('selectivity', 1.0),
+        )
+
+        backends = self._compatible_backends(provider_type, layer, available_backends)
+        if not backends:
+            heuristic = self.recommend_backend(layer, filter_params, available_backends)
+            return ExecutionRecommendation(
+                backend_type=heuristic.backend_type,
+                strategy=self._heuristic_strategy(features, has_spatial),
+                estimated_time_ms=heuristic.estimated_time_ms,
+                confidence=heuristic.confidence,
+                reason=heuristic.reason,
+                fallback_backend=heuristic.fallback_backend,
+            )
+
+        predicted = []  # (latency_ms, backend, strategy, prediction)
+        cold = []  # (heuristic estimate, backend, strategy, None)
+        for backend in backends:
+            predictions = self.cost_model.rank(
+                [(backend, strategy) for strategy in STRATEGIES], predicate, features
+            )
+            if predictions:
+                predicted.extend((p.latency_ms, backend, p.strategy, p) for p in predictions)
+            else:
+                estimate = self._heuristic_estimate(backend, features.feature_count, complexity_multiplier)
+                cold.append((estimate, backend, self._heuristic_strategy(features, has_spatial), None))
+        # Each group is ranked in its own unit
+        predicted.sort(key=lambda c: (c[0], c[3].upper_ms))
+        cold.sort(key=lambda c: c[0])
+        candidates = predicted + cold
+
+        estimate, backend, strategy, prediction = candidates[0]
+        fallback = next((c[1] for c in candidates if c[1] != backend), None)
+        alternatives = [
+            {'backend': b, 'strategy': st, 'estimated_time_ms': int(e), 'from_model': p is not None}
+            for e, b, st, p in candidates[1:]
+        ]
+
+        if prediction is not None:
+            reason = (
+                f"Cost model: {backend}/{strategy} predicted {prediction.latency_ms:.0f}ms "
+                f"[{prediction.lower_ms:.0f}-{prediction.upper_ms:.0f}] for {feature_count:,} features "
+                f"({prediction.effective_samples:.0f} samples{', pooled' if prediction.pooled else ''})"
+            )
+            recommendation = ExecutionRecommendation(
+                backend_type=backend,
+                strategy=strategy,
+                estimated_time_ms=int(prediction.latency_ms),
+                confidence=prediction.confidence,
+                reason=reason,
+                from_model=True,
+                lower_ms=int(prediction.lower_ms),
+                upper_ms=int(prediction.upper_ms),
+                fallback_backend=fallback,
+                alternatives=alternatives,
+            )
+        else:
+            recommendation = ExecutionRecommendation(
+                backend_type=backend,
+                strategy=strategy,
+                estimated_time_ms=int(estimate),
+                confidence=0.6,
+                reason=f"Heuristic estimate (cold start) for {backend}/{strategy}, {feature_count:,} features",
+                fallback_backend=fallback,
+                alternatives=alternatives,
+            )
+
+        logger.debug(f"AutoBackendSelector: {recommendation.reason}")
+        return recommendation
+
     def record_performance(
         self,
         backend_type: str,
         layer_id: str,
-        execution_time_ms: int
+        execution_time_ms: int,
+        features: Optional[CostFeatures] = None,
+        strategy: str = STRATEGY_DIRECT,
+        predicate: Optional[str] = None
     ):
         """
         Record actual execution time for learning.
@@ -223,6 +394,10 @@ class AutoBackendSelector:
             backend_type: Backend used ('postgresql', 'spatialite', 'ogr')
             layer_id: QGIS layer ID
             execution_time_ms: Actual execution time in milliseconds
+            features: Execution characteristics; when given, the sample also
+                      trains the cost model (v4.2.0)
+            strategy: Execution strategy used
+            predicate: Spatial predicate name (None for attribute filters)
 
         Example:
             >>> selector.record_performance('postgresql', 'layer_123', 450)
@@ -231,14 +406,21 @@ class AutoBackendSelector:
             logger.warning(f"Unknown backend type: {backend_type}")
             return
 
-        if layer_id not in self.performance_history[backend_type]:
-            self.performance_history[backend_type][layer_id] = []
+        with self._lock:
+            if features is not None:
+                self.cost_model.record(backend_type, strategy, predicate, features, execution_time_ms)
+                self._unsaved_samples += 1
+                if self.cost_model.path and self._unsaved_samples >= self.AUTOSAVE_INTERVAL:
+                    self.save_cost_model()
 
-        # Keep last 10 measurements (rolling window)
-        history = self.performance_history[backend_type][layer_id]
-        history.append(execution_time_ms)
-        if len(history) > 10:
-            history.pop(0)
+            if layer_id not in self.performance_history[backend_type]:
+                self.performance_history[backend_type][layer_id] = []
+
+            # Keep last 10 measurements (rolling window)
+            history = self.performance_history[backend_type][layer_id]
+            history.append(execution_time_ms)
+            if len(history) > 10:
+                history.pop(0)
 
         logger.debug(
             f"Performance recorded: {backend_type}/{layer_id[:8]}... → {execution_time_ms}ms "
@@ -304,6 +486,47 @@ class AutoBackendSelector:
         base_time = int(feature_count * 0.1 * complexity)
         return max(base_time, 20)
 
+    def save_cost_model(self) -> bool:
+        """Persist the cost model samples (no-op without a model path)."""
+        saved = self.cost_model.save()
+        if saved:
+            self._unsaved_samples = 0
+        return saved
+
+    def _compatible_backends(self, provider_type: str, layer, available_backends: List[str]) -> List[str]:
+        """Backends able to filter a layer of this provider, in preference order."""
+        if provider_type == 'postgres':
+            backends = ['postgresql', 'ogr']
+        elif provider_type == 'spatialite':
+            backends = ['spatialite', 'ogr']
+        elif provider_type == 'ogr':
+            backends = ['ogr']
+            try:
+                path = layer.source().split('|')[0].lower()
+            except (AttributeError, RuntimeError):
+                path = ''
+            if path.endswith(('.gpkg', '.sqlite')):
+                backends.insert(0, 'spatialite')
+        else:
+            backends = ['ogr']
+        return [b for b in backends if b in available_backends]
+
+    def _heuristic_strategy(self, features: CostFeatures, has_spatial: bool) -> str:
+        """Cold-start strategy choice from feature count and filter shape."""
+        if features.feature_count >= self.PROGRESSIVE_THRESHOLD:
+            return STRATEGY_PROGRESSIVE
+        if (has_spatial or features.buffer_distance) and features.feature_count >= self.TWO_PHASE_THRESHOLD:
+            return STRATEGY_TWO_PHASE
+        return STRATEGY_DIRECT
+
+    def _heuristic_estimate(self, backend: str, feature_count: int, complexity: float) -> int:
+        """Fixed-constant estimate of a backend (cold start)."""
+        if backend == 'postgresql':
+            return self._estimate_postgresql_time(feature_count, complexity)
+        if backend == 'spatialite':
+            return self._estimate_spatialite_time(feature_count, complexity)
+        return self._estimate_ogr_time(feature_count, complexity)
+
     def _get_average_performance(self, backend_type: str, layer_id: str) -> Optional[int]:
         """Get average performance from history."""
         history = self.performance_history.get(backend_type, {}).get(layer_id)
@@ -314,6 +537,22 @@ class AutoBackendSelector:
 
 # Singleton instance
 _selector_instance = None
+_selector_lock = threading.Lock()
+
+# Cost model file in the plugin config directory
+COST_MODEL_FILENAME = 'backend_cost_model.json'
+
+
+def _default_cost_model_path() -> Optional[str]:
+    """Path of the persisted cost model, or None outside the plugin."""
+    try:
+        from ...config.config import ENV_VARS
+    except ImportError:
+        return None
+    plugin_dir = ENV_VARS.get("PLUGIN_CONFIG_DIRECTORY")
+    if not isinstance(plugin_dir, str) or not plugin_dir:
+        return None
+    return os.path.join(plugin_dir, COST_MODEL_FILENAME)
 
 
 def get_auto_backend_selector() -> AutoBackendSelector:
@@ -328,7 +567,9 @@ def get_auto_backend_selector() -> AutoBackendSelector:
         >>> recommendation = selector.recommend_backend(layer, params, backends)
     """
     global _selector_instance
-    if _selector_instance is None:
-        _selector_instance = AutoBackendSelector()
-        logger.info("AutoBackendSelector singleton created")
+    with _selector_lock:
+        if _selector_instance is None:
+            cost_model = AdaptiveCostModel(path=_default_cost_model_path()).load()
+            _selector_instance = AutoBackendSelector(cost_model)
+            logger.info(f"AutoBackendSelector singleton created ({cost_model.sample_count} cost samples)")
     return _selector_instance
@@ -788,6 +788,9 @@ class CombinedQueryOptimizer:
         # Pattern captures: (1)pk_column, (2)select_column, (3)schema, (4)view_name
         match = self.FILTERMATE_MV_PATTERN.search(expression)
         if match:
+            # v4.2.0: PK-only result tables hold no geometry to filter on
+            if match.group(4).lower().startswith('fm_temp_pk_'):
+                return None
             return MaterializedViewInfo(
                 primary_key=match.group(1),  # The column in IN clause (e.g., "fid")
                 schema=match.group(3),       # Schema name (e.g., "public")
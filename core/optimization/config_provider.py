@@ -18,6 +18,16 @@ from typing import Dict, Any, Optional
 logger = logging.getLogger('FilterMate.Core.Optimization.ConfigProvider')
 
 
+def _get_app_section(task_parameters: Dict[str, Any], section: str) -> Dict[str, Any]:
+    """
+    Get a configuration section stored under APP.OPTIONS (config.json layout).
+
+    v4.2.0: APP.SETTINGS is still read as a fallback for older configurations.
+    """
+    app_config = task_parameters.get('config', {}).get('APP', {})
+    return app_config.get('OPTIONS', {}).get(section) or app_config.get('SETTINGS', {}).get(section) or {}
+
+
 # Default optimization thresholds
 DEFAULT_OPTIMIZATION_THRESHOLDS = {
     'large_dataset_warning': 50000,
@@ -121,3 +131,126 @@ def get_simplification_config(task_parameters: Optional[Dict[str, Any]] = None)
         'max_tolerance_meters': simp_config.get('max_tolerance_meters', {}).get('value', DEFAULT_SIMPLIFICATION_CONFIG['max_tolerance_meters']),
         'show_warnings': simp_config.get('show_simplification_warnings', {}).get('value', DEFAULT_SIMPLIFICATION_CONFIG['show_warnings'])
     }
+
+
+# v4.2.0: Default materialized view cache quota (October 2026)
+DEFAULT_MV_CACHE_CONFIG = {
+    'quota_mb': 1024,
+    'max_age_hours': 24,
+    'result_store': 'materialized_view',
+    'table_versioning': 'statistics'
+}
+
+
+def get_mv_cache_config(task_parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Get PostgreSQL materialized view cache configuration from task parameters or defaults.
+
+    v4.2.0 - Content-addressed MV reuse (October 2026)
+
+    Configuration controls:
+    - quota_mb: Disk space allowed for cached MVs in the temp schema (0 disables the cache)
+    - max_age_hours: Idle time after which a cached MV is dropped
+    - result_store: 'materialized_view' (full rows) or 'pk_table' (UNLOGGED primary key table)
+    - table_versioning: 'statistics' (pg_stat counters, no DDL) or 'triggers' (opt-in change triggers)
+
+    Args:
+        task_parameters: Task parameters dict containing config section
+
+    Returns:
+        dict: Materialized view cache configuration
+    """
+    if not task_parameters:
+        return DEFAULT_MV_CACHE_CONFIG.copy()
+
+    cache_config = _get_app_section(task_parameters, 'MATERIALIZED_VIEW_CACHE')
+
+    if not cache_config:
+        return DEFAULT_MV_CACHE_CONFIG.copy()
+
+    return {
+        'quota_mb': cache_config.get('quota_mb', {}).get('value', DEFAULT_MV_CACHE_CONFIG['quota_mb']),
+        'max_age_hours': cache_config.get('max_age_hours', {}).get('value', DEFAULT_MV_CACHE_CONFIG['max_age_hours']),
+        'result_store': cache_config.get('result_store', {}).get('value', DEFAULT_MV_CACHE_CONFIG['result_store']),
+        'table_versioning': cache_config.get('table_versioning', {}).get('value', DEFAULT_MV_CACHE_CONFIG['table_versioning'])
+    }
+
+
+# v4.2.0: Slow-query profiler, disabled by default (October 2026)
+DEFAULT_QUERY_PROFILER_CONFIG = {
+    'enabled': False,
+    'explain_threshold_ms': 500,
+    'capacity': 5000
+}
+
+
+def get_query_profiler_config(task_parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Get query profiler configuration from task parameters or defaults.
+
+    v4.2.0 - Statement-level EXPLAIN capture (October 2026)
+
+    Configuration controls:
+    - enabled: Record wall time and row count of backend statements
+    - explain_threshold_ms: Statements slower than this also record their plan
+    - capacity: Records kept in the local ring buffer
+
+    Args:
+        task_parameters: Task parameters dict containing config section
+
+    Returns:
+        dict: Query profiler configuration
+    """
+    if not task_parameters:
+        return DEFAULT_QUERY_PROFILER_CONFIG.copy()
+
+    profiler_config = _get_app_section(task_parameters, 'QUERY_PROFILER')
+
+    if not profiler_config:
+        return DEFAULT_QUERY_PROFILER_CONFIG.copy()
+
+    return {
+        key: profiler_config.get(key, {}).get('value', default)
+        for key, default in DEFAULT_QUERY_PROFILER_CONFIG.items()
+    }
+
+
+# v4.2.0: Tiled EXISTS evaluation of very large source selections (October 2026)
+DEFAULT_TILED_EXISTS_CONFIG = {
+    'enabled': True,
+    'min_source_features': 100000,
+    'rows_per_tile': 50000,
+    'tile_timeout_seconds': 60
+}
+
+
+def get_tiled_exists_config(task_parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Get PostgreSQL tiled EXISTS configuration from task parameters or defaults.
+
+    v4.2.0 - Chunked, resumable EXISTS evaluation (October 2026)
+
+    Configuration controls:
+    - enabled: Evaluate EXISTS filters tile by tile for very large sources
+    - min_source_features: Source feature count from which tiling is used
+    - rows_per_tile: Target rows per tile of the initial grid
+    - tile_timeout_seconds: Tiles running longer are split in 4
+
+    Args:
+        task_parameters: Task parameters dict containing config section
+
+    Returns:
+        dict: Tiled EXISTS configuration
+    """
+    if not task_parameters:
+        return DEFAULT_TILED_EXISTS_CONFIG.copy()
+
+    tiled_config = _get_app_section(task_parameters, 'TILED_EXISTS')
+
+    if not tiled_config:
+        return DEFAULT_TILED_EXISTS_CONFIG.copy()
+
+    return {
+        key: tiled_config.get(key, {}).get('value', default)
+        for key, default in DEFAULT_TILED_EXISTS_CONFIG.items()
+    }
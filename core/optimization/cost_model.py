@@ -0,0 +1,549 @@
+"""
+Adaptive Cost Model
+Learns backend/strategy latencies from recorded filter executions.
+
+v4.2.0 - Adaptive backend selection (October 2026)
+Architecture: Hexagonal Core - Domain Service (pure Python, no QGIS)
+
+One weighted least-squares model is fitted per (backend, strategy, predicate):
+
+    latency_ms = b0 + b1*n + b2*v + b3*n*buffer + b4*n*selectivity
+
+where n is the target feature count and v the source vertex count (both in
+thousands), buffer is 1 when a buffer is applied and selectivity the share
+of target features returned. Samples are weighted by age with an exponential
+half-life, so the model follows data and hardware changes. Predictions carry
+a 95% interval from the weighted residual variance.
+
+Cold start: a key with too few (effective) samples predicts nothing and the
+caller keeps its heuristics. A predicate-specific key that is cold falls
+back to the pooled samples of its (backend, strategy).
+
+Samples are persisted as JSON; the same file is the execution log used by
+replay_samples() to score the model's choices after the fact.
+
+Usage:
+    model = AdaptiveCostModel(path="/path/cost_model.json").load()
+    model.record('postgresql', STRATEGY_DIRECT, 'intersects', CostFeatures(120000), 830.0)
+    prediction = model.predict('postgresql', STRATEGY_DIRECT, 'intersects', CostFeatures(90000))
+    if prediction:
+        print(prediction.latency_ms, prediction.lower_ms, prediction.upper_ms)
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger('FilterMate.Optimizer.CostModel')
+
+# Execution strategies (values match core.strategies.progressive_filter.FilterStrategy)
+STRATEGY_DIRECT = 'direct'
+STRATEGY_TWO_PHASE = 'two_phase'
+STRATEGY_PROGRESSIVE = 'progressive'
+STRATEGIES = (STRATEGY_DIRECT, STRATEGY_TWO_PHASE, STRATEGY_PROGRESSIVE)
+
+# Predicate key for attribute-only filters
+PREDICATE_ATTRIBUTE = 'attribute'
+# Predicate key of the pooled (any predicate) model
+PREDICATE_ANY = '*'
+
+DEFAULT_HALF_LIFE_DAYS = 14.0       # Sample weight halves every N days
+DEFAULT_MAX_SAMPLES = 200           # Samples kept per (backend, strategy, predicate)
+DEFAULT_MIN_SAMPLES = 8             # Effective samples required before predicting
+RIDGE_PENALTY = 1e-3                # Keeps the fit stable with collinear samples
+Z_95 = 1.96
+MODEL_FILE_VERSION = 1
+
+_TERM_COUNT = 5
+
+
+# =============================================================================
+# Data classes
+# =============================================================================
+
+@dataclass(frozen=True)
+class CostFeatures:
+    """
+    Execution characteristics the latency is modelled on.
+
+    Attributes:
+        feature_count: Target layer feature count
+        vertex_count: Vertices of the source geometry
+        buffer_distance: Buffer applied to the source (0 = none)
+        selectivity: Share of target features returned (0.0-1.0)
+    """
+    feature_count: int
+    vertex_count: float = 0.0
+    buffer_distance: float = 0.0
+    selectivity: float = 1.0
+
+    def terms(self) -> Tuple[float, ...]:
+        """Regression terms (see module docstring)."""
+        n = max(0, self.feature_count) / 1000.0
+        v = max(0.0, self.vertex_count) / 1000.0
+        buffered = 1.0 if self.buffer_distance else 0.0
+        selectivity = min(1.0, max(0.0, self.selectivity))
+        return (1.0, n, v, n * buffered, n * selectivity)
+
+
+@dataclass
+class CostSample:
+    """One recorded execution."""
+    backend: str
+    strategy: str
+    predicate: str
+    features: CostFeatures
+    latency_ms: float
+    timestamp: float
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data['features'] = asdict(self.features)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CostSample':
+        return cls(
+            backend=data['backend'],
+            strategy=data['strategy'],
+            predicate=data['predicate'],
+            features=CostFeatures(**data['features']),
+            latency_ms=float(data['latency_ms']),
+            timestamp=float(data['timestamp']),
+        )
+
+
+@dataclass
+class CostPrediction:
+    """
+    Predicted latency with its 95% interval.
+
+    Attributes:
+        backend: Backend the prediction is for
+        strategy: Execution strategy
+        latency_ms: Predicted latency
+        lower_ms / upper_ms: 95% prediction interval
+        effective_samples: Decay-weighted sample size behind the fit
+        pooled: True if fitted on all predicates of (backend, strategy)
+    """
+    backend: str
+    strategy: str
+    latency_ms: float
+    lower_ms: float
+    upper_ms: float
+    effective_samples: float
+    pooled: bool = False
+
+    @property
+    def confidence(self) -> float:
+        """0.5-0.99 score derived from the relative interval width."""
+        relative_width = (self.upper_ms - self.lower_ms) / max(self.latency_ms, 1.0)
+        return round(min(0.99, max(0.5, 1.0 - relative_width / 4.0)), 2)
+
+
+@dataclass
+class ReplayReport:
+    """Scores of a replay over logged executions (see replay_samples)."""
+    samples: int = 0
+    predictions: int = 0
+    cold_predictions: int = 0
+    abs_pct_error_sum: float = 0.0
+    interval_hits: int = 0
+    decisions: int = 0
+    cold_decisions: int = 0
+    optimal_decisions: int = 0
+    regret_ms: float = 0.0
+    best_possible_ms: float = 0.0
+    decisions_log: List[Dict] = field(default_factory=list)
+
+    @property
+    def mean_abs_pct_error(self) -> Optional[float]:
+        return self.abs_pct_error_sum / self.predictions if self.predictions else None
+
+    @property
+    def interval_coverage(self) -> Optional[float]:
+        return self.interval_hits / self.predictions if self.predictions else None
+
+    @property
+    def optimal_rate(self) -> Optional[float]:
+        return self.optimal_decisions / self.decisions if self.decisions else None
+
+    def to_dict(self) -> Dict:
+        return {
+            'samples': self.samples,
+            'predictions': self.predictions,
+            'cold_predictions': self.cold_predictions,
+            'mean_abs_pct_error': self.mean_abs_pct_error,
+            'interval_coverage': self.interval_coverage,
+            'decisions': self.decisions,
+            'cold_decisions': self.cold_decisions,
+            'optimal_rate': self.optimal_rate,
+            'regret_ms': round(self.regret_ms, 1),
+            'best_possible_ms': round(self.best_possible_ms, 1),
+        }
+
+
+def normalize_predicate(predicate: Optional[str]) -> str:
+    """'ST_Intersects' / 'intersects' -> 'intersects'; empty -> 'attribute'."""
+    if not predicate:
+        return PREDICATE_ATTRIBUTE
+    name = str(predicate).strip().lower()
+    return name[3:] if name.startswith('st_') else name
+
+
+# =============================================================================
+# Linear algebra helpers (5x5 systems, no NumPy needed)
+# =============================================================================
+
+def _invert(matrix: List[List[float]]) -> Optional[List[List[float]]]:
+    """Gauss-Jordan inverse with partial pivoting; None if singular."""
+    size = len(matrix)
+    work = [row[:] + [1.0 if i == j else 0.0 for j in range(size)] for i, row in enumerate(matrix)]
+    for col in range(size):
+        pivot = max(range(col, size), key=lambda r: abs(work[r][col]))
+        if abs(work[pivot][col]) < 1e-12:
+            return None
+        work[col], work[pivot] = work[pivot], work[col]
+        scale = work[col][col]
+        work[col] = [value / scale for value in work[col]]
+        for row in range(size):
+            if row != col and work[row][col]:
+                factor = work[row][col]
+                work[row] = [a - factor * b for a, b in zip(work[row], work[col])]
+    return [row[size:] for row in work]
+
+
+@dataclass
+class _Fit:
+    coefficients: List[float]
+    covariance: List[List[float]]  # (X'WX)^-1 with weights normalized to n_eff
+    sigma2: float
+    effective_samples: float
+
+
+def _fit(samples: Sequence[CostSample], now: float, half_life_days: float) -> Optional[_Fit]:
+    """Decay-weighted ridge least squares over the samples."""
+    if not samples:
+        return None
+    half_life_s = max(half_life_days, 1e-6) * 86400.0
+    weights = [0.5 ** (max(0.0, now - s.timestamp) / half_life_s) for s in samples]
+    total = sum(weights)
+    if total <= 0:
+        return None
+    effective = total * total / sum(w * w for w in weights)
+    weights = [w * effective / total for w in weights]
+
+    rows = [s.features.terms() for s in samples]
+    xtwx = [[0.0] * _TERM_COUNT for _ in range(_TERM_COUNT)]
+    xtwy = [0.0] * _TERM_COUNT
+    for w, x, sample in zip(weights, rows, samples):
+        for i in range(_TERM_COUNT):
+            xtwy[i] += w * x[i] * sample.latency_ms
+            for j in range(_TERM_COUNT):
+                xtwx[i][j] += w * x[i] * x[j]
+    for i in range(1, _TERM_COUNT):  # Intercept is not penalized
+        xtwx[i][i] += RIDGE_PENALTY
+
+    covariance = _invert(xtwx)
+    if covariance is None:
+        return None
+    coefficients = [sum(covariance[i][j] * xtwy[j] for j in range(_TERM_COUNT)) for i in range(_TERM_COUNT)]
+
+    residual = sum(
+        w * (sample.latency_ms - sum(c * t for c, t in zip(coefficients, x))) ** 2
+        for w, x, sample in zip(weights, rows, samples)
+    )
+    dof = max(effective - _TERM_COUNT, 1.0)
+    return _Fit(coefficients, covariance, residual / dof, effective)
+
+
+# =============================================================================
+# Model
+# =============================================================================
+
+class AdaptiveCostModel:
+    """
+    Per-backend, per-strategy, per-predicate latency model.
+
+    Thread-safe; fits are cached until a new sample arrives for their key.
+
+    Example:
+        >>> model = AdaptiveCostModel()
+        >>> model.record('spatialite', 'direct', 'intersects', CostFeatures(5000), 120.0)
+        >>> model.predict('spatialite', 'direct', 'intersects', CostFeatures(6000))  # None until warm
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        half_life_days: float = DEFAULT_HALF_LIFE_DAYS,
+        max_samples: int = DEFAULT_MAX_SAMPLES,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        Args:
+            path: JSON file used by load()/save() (None = in-memory only)
+            half_life_days: Age at which a sample counts half
+            max_samples: Samples kept per key (oldest dropped first)
+            min_samples: Effective samples needed before predicting
+            clock: Time source (seconds), injectable for replays and tests
+        """
+        self.path = path
+        self.half_life_days = half_life_days
+        self.max_samples = max(1, max_samples)
+        self.min_samples = max(min_samples, _TERM_COUNT + 2)
+        self._clock = clock
+        self._samples: Dict[Tuple[str, str, str], Deque[CostSample]] = defaultdict(
+            lambda: deque(maxlen=self.max_samples)
+        )
+        self._fits: Dict[Tuple[str, str, str], Optional[_Fit]] = {}
+        self._lock = threading.RLock()
+        self._dirty = False
+
+    # -------------------------------------------------------------------------
+    # Samples
+    # -------------------------------------------------------------------------
+
+    def record(
+        self,
+        backend: str,
+        strategy: str,
+        predicate: Optional[str],
+        features: CostFeatures,
+        latency_ms: float,
+        timestamp: Optional[float] = None
+    ) -> None:
+        """Add one observed execution."""
+        if latency_ms is None or latency_ms < 0 or not math.isfinite(latency_ms):
+            return
+        sample = CostSample(
+            backend, strategy, normalize_predicate(predicate), features, float(latency_ms),
+            self._clock() if timestamp is None else float(timestamp)
+        )
+        self._add(sample)
+
+    def _add(self, sample: CostSample) -> None:
+        key = (sample.backend, sample.strategy, sample.predicate)
+        with self._lock:
+            self._samples[key].append(sample)
+            self._fits.pop(key, None)
+            self._fits.pop((sample.backend, sample.strategy, PREDICATE_ANY), None)
+            self._dirty = True
+
+    def samples(self) -> List[CostSample]:
+        """All samples, oldest first."""
+        with self._lock:
+            return sorted((s for q in self._samples.values() for s in q), key=lambda s: s.timestamp)
+
+    @property
+    def sample_count(self) -> int:
+        with self._lock:
+            return sum(len(q) for q in self._samples.values())
+
+    # -------------------------------------------------------------------------
+    # Prediction
+    # -------------------------------------------------------------------------
+
+    def _get_fit(self, key: Tuple[str, str, str]) -> Optional[_Fit]:
+        with self._lock:
+            if key not in self._fits:
+                backend, strategy, predicate = key
+                if predicate == PREDICATE_ANY:
+                    samples = [s for (b, st, _), q in self._samples.items()
+                               if b == backend and st == strategy for s in q]
+                else:
+                    samples = list(self._samples.get(key, ()))
+                fit = _fit(samples, self._clock(), self.half_life_days)
+                self._fits[key] = fit if fit and fit.effective_samples >= self.min_samples else None
+            return self._fits[key]
+
+    def predict(
+        self,
+        backend: str,
+        strategy: str,
+        predicate: Optional[str],
+        features: CostFeatures
+    ) -> Optional[CostPrediction]:
+        """
+        Predict the latency of one (backend, strategy) execution.
+
+        Returns:
+            CostPrediction, or None during cold start
+        """
+        predicate = normalize_predicate(predicate)
+        pooled = False
+        fit = self._get_fit((backend, strategy, predicate))
+        if fit is None:
+            fit = self._get_fit((backend, strategy, PREDICATE_ANY))
+            pooled = True
+        if fit is None:
+            return None
+
+        x = features.terms()
+        latency = sum(c * t for c, t in zip(fit.coefficients, x))
+        leverage = sum(x[i] * fit.covariance[i][j] * x[j] for i in range(_TERM_COUNT) for j in range(_TERM_COUNT))
+        margin = Z_95 * math.sqrt(max(fit.sigma2 * (1.0 + leverage), 0.0))
+        latency = max(latency, 0.0)
+        return CostPrediction(
+            backend=backend,
+            strategy=strategy,
+            latency_ms=latency,
+            lower_ms=max(latency - margin, 0.0),
+            upper_ms=latency + margin,
+            effective_samples=fit.effective_samples,
+            pooled=pooled,
+        )
+
+    def rank(
+        self,
+        candidates: Iterable[Tuple[str, str]],
+        predicate: Optional[str],
+        features: CostFeatures
+    ) -> List[CostPrediction]:
+        """Predictions of the warm (backend, strategy) candidates, fastest first."""
+        predictions = [self.predict(b, s, predicate, features) for b, s in candidates]
+        return sorted((p for p in predictions if p is not None), key=lambda p: (p.latency_ms, p.upper_ms))
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def load(self, path: Optional[str] = None) -> 'AdaptiveCostModel':
+        """Load samples from JSON; a missing or unreadable file leaves the model empty."""
+        path = path or self.path
+        if not path or not os.path.isfile(path):
+            return self
+        try:
+            with open(path, 'r', encoding='utf-8') as handle:
+                data = json.load(handle)
+            if data.get('version') != MODEL_FILE_VERSION:
+                logger.info(f"Ignoring cost model file with version {data.get('version')}: {path}")
+                return self
+            for item in data.get('samples', []):
+                self._add(CostSample.from_dict(item))
+            self._dirty = False
+            logger.debug(f"Cost model loaded: {self.sample_count} samples from {path}")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Could not load cost model from {path}: {e}")
+        return self
+
+    def save(self, path: Optional[str] = None) -> bool:
+        """Write samples to JSON atomically. Returns False on failure."""
+        path = path or self.path
+        if not path:
+            return False
+        data = {
+            'version': MODEL_FILE_VERSION,
+            'half_life_days': self.half_life_days,
+            'samples': [s.to_dict() for s in self.samples()],
+        }
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as handle:
+                json.dump(data, handle)
+            os.replace(tmp_path, path)
+            self._dirty = False
+            return True
+        except OSError as e:
+            logger.warning(f"Could not save cost model to {path}: {e}")
+            return False
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+
+# =============================================================================
+# Replay harness
+# =============================================================================
+
+def replay_samples(
+    samples: Iterable[CostSample],
+    model_factory: Optional[Callable[[Callable[[], float]], AdaptiveCostModel]] = None
+) -> ReplayReport:
+    """
+    Score the model against logged executions, in time order.
+
+    Each sample is first predicted by a model trained only on the samples
+    before it (prediction error, interval coverage), then recorded.
+
+    Executions of the same case (same predicate and features) with
+    different (backend, strategy) pairs - e.g. benchmark runs - are also
+    scored as decisions: the model ranks the pairs observed for the case and
+    the regret is the latency of its pick minus the fastest one.
+
+    Args:
+        samples: Logged executions (e.g. AdaptiveCostModel.load().samples())
+        model_factory: Callable(clock) -> empty AdaptiveCostModel
+
+    Returns:
+        ReplayReport
+    """
+    ordered = sorted(samples, key=lambda s: s.timestamp)
+    current = {'now': ordered[0].timestamp if ordered else 0.0}
+    clock = lambda: current['now']  # noqa: E731
+    model = model_factory(clock) if model_factory else AdaptiveCostModel(clock=clock)
+    report = ReplayReport()
+    cases: Dict[Tuple[str, CostFeatures], Dict[Tuple[str, str], float]] = defaultdict(dict)
+
+    for sample in ordered:
+        current['now'] = sample.timestamp
+        report.samples += 1
+
+        prediction = model.predict(sample.backend, sample.strategy, sample.predicate, sample.features)
+        if prediction is None:
+            report.cold_predictions += 1
+        else:
+            report.predictions += 1
+            report.abs_pct_error_sum += abs(prediction.latency_ms - sample.latency_ms) / max(sample.latency_ms, 1.0)
+            if prediction.lower_ms <= sample.latency_ms <= prediction.upper_ms:
+                report.interval_hits += 1
+
+        case = cases[(sample.predicate, sample.features)]
+        case[(sample.backend, sample.strategy)] = sample.latency_ms
+        if len(case) >= 2:
+            ranking = model.rank(case.keys(), sample.predicate, sample.features)
+            if not ranking:
+                report.cold_decisions += 1
+            else:
+                chosen = (ranking[0].backend, ranking[0].strategy)
+                best = min(case.values())
+                report.decisions += 1
+                report.best_possible_ms += best
+                report.regret_ms += case[chosen] - best
+                if case[chosen] == best:
+                    report.optimal_decisions += 1
+                report.decisions_log.append({
+                    'predicate': sample.predicate,
+                    'feature_count': sample.features.feature_count,
+                    'chosen': chosen,
+                    'best': min(case, key=case.get),
+                    'regret_ms': case[chosen] - best,
+                })
+
+        model._add(sample)
+
+    return report
+
+
+__all__ = [
+    'STRATEGY_DIRECT',
+    'STRATEGY_TWO_PHASE',
+    'STRATEGY_PROGRESSIVE',
+    'STRATEGIES',
+    'CostFeatures',
+    'CostSample',
+    'CostPrediction',
+    'ReplayReport',
+    'AdaptiveCostModel',
+    'normalize_predicate',
+    'replay_samples',
+]
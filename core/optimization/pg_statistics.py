@@ -0,0 +1,379 @@
+"""
+PostgreSQL Planner Statistics for Selectivity Estimation
+Attribute selectivity from pg_stats, cached per table.
+
+v4.2.0 - Database-derived selectivity for the multi-step planner (October 2026)
+Architecture: Hexagonal Core - Domain Service (pure Python, no database access)
+
+The multi-step planner used fixed selectivities ('=': 0.01, IN: 0.05 per
+value...). ANALYZE already stores what is needed to do better, per column:
+
+- null_frac: share of NULL rows
+- n_distinct: distinct values (negative: fraction of the row count)
+- most_common_vals / most_common_freqs: the MCV list and its frequencies
+- histogram_bounds: equal-frequency bucket bounds of the non-MCV values
+
+PgTableStatistics applies the same rules as the PostgreSQL planner
+(eqsel / scalarineqsel) to simple predicates. Anything it cannot parse is
+left to an EXPLAIN estimate by the caller.
+
+PgStatisticsCache keeps one entry per table, keyed by connection and
+table and versioned by pg_class.reltuples: a new ANALYZE (or autovacuum)
+changes reltuples and invalidates the column statistics and every
+estimate cached with them.
+
+Usage:
+    stats = PgTableStatistics(reltuples=120000, columns={
+        'status': PgColumnStatistics(null_frac=0.0, n_distinct=4,
+                                     most_common_vals=['active', 'closed'],
+                                     most_common_freqs=[0.6, 0.3]),
+    })
+    stats.attribute_selectivity("\\"status\\" = 'closed'")   # 0.3
+"""
+
+import json
+import logging
+import re
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger('FilterMate.Optimizer.PgStatistics')
+
+# Planner defaults when a column has no usable statistics (selfuncs.h)
+DEFAULT_EQ_SEL = 0.005
+DEFAULT_INEQ_SEL = 1.0 / 3.0
+
+# Estimates (EXPLAIN rows, _postgis_selectivity) kept per table entry
+PG_ESTIMATE_CACHE_SIZE = 256
+
+# Tables kept in the process-wide cache
+PG_STATISTICS_CACHE_SIZE = 128
+
+_COLUMN = r'"?(?P<column>[A-Za-z_][\w]*)"?'
+_LITERAL = r'(?:\'(?:[^\']|\'\')*\'|-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)'
+_COMPARE_RE = re.compile(_COLUMN + r'\s*(?P<op><=|>=|<>|!=|==|=|<|>)\s*(?P<value>' + _LITERAL + r')\s*$')
+_IN_RE = re.compile(_COLUMN + r'\s+(?P<negated>NOT\s+)?IN\s*\((?P<values>[^)]*)\)\s*$', re.IGNORECASE)
+_NULL_RE = re.compile(_COLUMN + r'\s+IS\s+(?P<negated>NOT\s+)?NULL\s*$', re.IGNORECASE)
+_BETWEEN_RE = re.compile(
+    _COLUMN + r'\s+BETWEEN\s+(?P<low>' + _LITERAL + r')\s+AND\s+(?P<high>' + _LITERAL + r')\s*$',
+    re.IGNORECASE
+)
+_AND_RE = re.compile(r'\s+AND\s+', re.IGNORECASE)
+_BETWEEN_TAIL_RE = re.compile(r'\bBETWEEN\s+' + _LITERAL + r'\s*$', re.IGNORECASE)
+_LITERAL_RE = re.compile(_LITERAL)
+
+
+def _parse_literal(token: str):
+    """SQL literal -> float for numbers, str for quoted strings."""
+    token = token.strip()
+    if token.startswith("'"):
+        return token[1:-1].replace("''", "'")
+    return float(token)
+
+
+def _as_number(value) -> Optional[float]:
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _same_value(stored: str, value) -> bool:
+    if isinstance(value, float):
+        number = _as_number(stored)
+        return number is not None and number == value
+    return stored == value
+
+
+def _less_than(stored: str, value) -> bool:
+    """``stored < value`` with numeric comparison when both are numbers."""
+    if isinstance(value, float):
+        number = _as_number(stored)
+        if number is not None:
+            return number < value
+    return str(stored) < str(value)
+
+
+def _split_conjunction(expression: str) -> List[str]:
+    """Split on AND, keeping the AND of ``x BETWEEN a AND b`` in its term."""
+    terms: List[str] = []
+    for part in _AND_RE.split(expression.strip()):
+        if terms and _BETWEEN_TAIL_RE.search(terms[-1]):
+            terms[-1] = f"{terms[-1]} AND {part}"
+        else:
+            terms.append(part)
+    cleaned = []
+    for term in terms:
+        term = term.strip()
+        while term.startswith('(') and term.endswith(')'):
+            term = term[1:-1].strip()
+        cleaned.append(term)
+    return cleaned
+
+
+@dataclass
+class PgColumnStatistics:
+    """One pg_stats row; array columns are read as text arrays."""
+    null_frac: float = 0.0
+    n_distinct: float = 0.0
+    most_common_vals: List[str] = field(default_factory=list)
+    most_common_freqs: List[float] = field(default_factory=list)
+    histogram_bounds: List[str] = field(default_factory=list)
+
+    @property
+    def mcv_total(self) -> float:
+        return min(1.0, sum(self.most_common_freqs))
+
+    @property
+    def histogram_share(self) -> float:
+        """Share of rows described by the histogram (non-null, non-MCV)."""
+        return max(0.0, 1.0 - self.null_frac - self.mcv_total)
+
+    def distinct(self, row_count: float) -> float:
+        if self.n_distinct > 0:
+            return self.n_distinct
+        if self.n_distinct < 0:
+            return -self.n_distinct * max(row_count, 1.0)
+        return 0.0
+
+    def equal_selectivity(self, value, row_count: float) -> float:
+        """eqsel: MCV frequency, else the non-MCV share spread evenly."""
+        for stored, freq in zip(self.most_common_vals, self.most_common_freqs):
+            if _same_value(stored, value):
+                return freq
+        distinct = self.distinct(row_count)
+        if distinct <= 0:
+            return DEFAULT_EQ_SEL
+        others = distinct - len(self.most_common_vals)
+        if others <= 0:
+            # Every value is an MCV and this one is not among them
+            return 0.0
+        return self.histogram_share / others
+
+    def less_than_selectivity(self, value, inclusive: bool = False) -> float:
+        """scalarineqsel for ``col < value`` (``<=`` when inclusive)."""
+        mcv_part = 0.0
+        for stored, freq in zip(self.most_common_vals, self.most_common_freqs):
+            if _less_than(stored, value) or (inclusive and _same_value(stored, value)):
+                mcv_part += freq
+        if len(self.histogram_bounds) >= 2:
+            hist_part = self._histogram_fraction(value)
+        else:
+            hist_part = DEFAULT_INEQ_SEL
+        return min(1.0, mcv_part + hist_part * self.histogram_share)
+
+    def _histogram_fraction(self, value) -> float:
+        """Fraction of histogram rows below ``value`` (linear within a bucket)."""
+        bounds = self.histogram_bounds
+        buckets = len(bounds) - 1
+        numbers = [_as_number(b) for b in bounds] if isinstance(value, float) else None
+        if numbers is not None and all(n is not None for n in numbers):
+            if value <= numbers[0]:
+                return 0.0
+            if value >= numbers[-1]:
+                return 1.0
+            i = bisect_left(numbers, value) - 1
+            low, high = numbers[i], numbers[i + 1]
+            within = (value - low) / (high - low) if high > low else 0.5
+            return (i + within) / buckets
+        text = str(value)
+        position = bisect_left([str(b) for b in bounds], text)
+        if position == 0:
+            return 0.0
+        if position > buckets:
+            return 1.0
+        return (position - 0.5) / buckets
+
+
+@dataclass
+class PgTableStatistics:
+    """pg_class and pg_stats figures of one table at one reltuples version."""
+    reltuples: float = -1.0
+    columns: Dict[str, PgColumnStatistics] = field(default_factory=dict)
+
+    @property
+    def analyzed(self) -> bool:
+        """False for tables never analyzed (reltuples = -1 since PG 14)."""
+        return self.reltuples >= 0 and bool(self.columns)
+
+    def column(self, name: str) -> Optional[PgColumnStatistics]:
+        if name in self.columns:
+            return self.columns[name]
+        lowered = name.lower()
+        for key, column in self.columns.items():
+            if key.lower() == lowered:
+                return column
+        return None
+
+    def attribute_selectivity(self, expression: str) -> Optional[float]:
+        """
+        Selectivity of simple column predicates from pg_stats.
+
+        Handles comparisons with a literal, [NOT] IN, IS [NOT] NULL and
+        BETWEEN, and AND-combinations of them (assumed independent, as
+        the planner does). Returns None for anything else.
+        """
+        if not expression or not expression.strip():
+            return 1.0
+        selectivity = 1.0
+        for term in _split_conjunction(expression):
+            term_selectivity = self._term_selectivity(term)
+            if term_selectivity is None:
+                return None
+            selectivity *= term_selectivity
+        return min(1.0, max(0.0, selectivity))
+
+    def _term_selectivity(self, term: str) -> Optional[float]:
+        for pattern in (_NULL_RE, _BETWEEN_RE, _IN_RE, _COMPARE_RE):
+            match = pattern.match(term)
+            if match:
+                break
+        else:
+            return None
+        column = self.column(match.group('column'))
+        if column is None:
+            return None
+        non_null = 1.0 - column.null_frac
+        rows = self.reltuples
+
+        try:
+            if pattern is _NULL_RE:
+                return non_null if match.group('negated') else column.null_frac
+            if pattern is _BETWEEN_RE:
+                low = _parse_literal(match.group('low'))
+                high = _parse_literal(match.group('high'))
+                share = column.less_than_selectivity(high, inclusive=True) - column.less_than_selectivity(low)
+                return max(0.0, share)
+            if pattern is _IN_RE:
+                values = [_parse_literal(v) for v in _LITERAL_RE.findall(match.group('values'))]
+                if not values:
+                    return None
+                share = min(non_null, sum(column.equal_selectivity(v, rows) for v in values))
+                return non_null - share if match.group('negated') else share
+            op = match.group('op')
+            value = _parse_literal(match.group('value'))
+        except ValueError:
+            return None
+
+        if op in ('=', '=='):
+            return column.equal_selectivity(value, rows)
+        if op in ('<>', '!='):
+            return max(0.0, non_null - column.equal_selectivity(value, rows))
+        if op in ('<', '<='):
+            return column.less_than_selectivity(value, inclusive=(op == '<='))
+        # col > v is the complement of col <= v among non-null rows
+        return max(0.0, non_null - column.less_than_selectivity(value, inclusive=(op == '>')))
+
+
+class _CacheEntry:
+    __slots__ = ('version', 'statistics', 'estimates')
+
+    def __init__(self, version: float, statistics):
+        self.version = version
+        self.statistics = statistics
+        self.estimates: 'OrderedDict[str, float]' = OrderedDict()
+
+
+class PgStatisticsCache:
+    """
+    Table statistics and estimates, invalidated when reltuples changes.
+
+    Keys are (connection key, schema, table). ``statistics`` is whatever
+    the caller stores (LayerStatistics for the multi-step planner).
+    """
+
+    def __init__(self, max_tables: int = PG_STATISTICS_CACHE_SIZE,
+                 max_estimates: int = PG_ESTIMATE_CACHE_SIZE):
+        self.max_tables = max_tables
+        self.max_estimates = max_estimates
+        self._entries: 'OrderedDict[Tuple, _CacheEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple, version: float):
+        """Cached statistics for ``key`` if stored at ``version``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry.statistics
+
+    def put(self, key: Tuple, version: float, statistics) -> None:
+        with self._lock:
+            self._entries[key] = _CacheEntry(version, statistics)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_tables:
+                self._entries.popitem(last=False)
+
+    def get_estimate(self, key: Tuple, version: float, estimate_key: str) -> Optional[float]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version:
+                return None
+            value = entry.estimates.get(estimate_key)
+            if value is not None:
+                entry.estimates.move_to_end(estimate_key)
+            return value
+
+    def put_estimate(self, key: Tuple, version: float, estimate_key: str, value: float) -> None:
+        """Store an estimate; ignored when the table entry is missing or stale."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version:
+                return
+            entry.estimates[estimate_key] = value
+            entry.estimates.move_to_end(estimate_key)
+            while len(entry.estimates) > self.max_estimates:
+                entry.estimates.popitem(last=False)
+
+    def invalidate(self, key: Optional[Tuple] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+def explain_plan_rows(explain_output) -> Optional[float]:
+    """Top plan node row estimate from ``EXPLAIN (FORMAT JSON)`` output."""
+    if isinstance(explain_output, (str, bytes)):
+        try:
+            explain_output = json.loads(explain_output)
+        except ValueError:
+            return None
+    if isinstance(explain_output, list) and explain_output:
+        explain_output = explain_output[0]
+    if not isinstance(explain_output, dict):
+        return None
+    plan = explain_output.get('Plan')
+    if not isinstance(plan, dict):
+        return None
+    rows = plan.get('Plan Rows')
+    return float(rows) if rows is not None else None
+
+
+_pg_statistics_cache: Optional[PgStatisticsCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_pg_statistics_cache() -> PgStatisticsCache:
+    """Process-wide cache shared by the PostgreSQL planners."""
+    global _pg_statistics_cache
+    with _cache_lock:
+        if _pg_statistics_cache is None:
+            _pg_statistics_cache = PgStatisticsCache()
+        return _pg_statistics_cache
+
+
+__all__ = [
+    'PgColumnStatistics',
+    'PgTableStatistics',
+    'PgStatisticsCache',
+    'explain_plan_rows',
+    'get_pg_statistics_cache',
+]
@@ -0,0 +1,527 @@
+"""
+Layer Statistics for Selectivity Estimation
+Density grid, vertex histogram and column sketches for non-PostgreSQL layers.
+
+v4.2.0 - Histogram-based selectivity estimation (October 2026)
+Architecture: Hexagonal Core - Domain Service (pure Python, no QGIS)
+
+QGIS providers other than PostgreSQL have no planner statistics. The
+optimizer used to sample the first features of a layer (a biased sample)
+and to assume a uniform feature density over the layer extent. A
+SpatialStatistics object holds what a scan of the layer can tell instead:
+
+- DensityGrid: feature bounding box centres counted on a regular grid,
+  with the mean bbox size. A bbox intersects a query box when its centre
+  lies in the query box grown by half the bbox size, so the estimate is
+  the grid count over the grown query box.
+- VertexHistogram: vertex counts of a reservoir sample of features.
+- ColumnStatistics: null fraction and a HyperLogLog distinct estimate per
+  column.
+
+The statistics carry the layer signature they were computed for. They are
+persisted as JSON by SpatialStatisticsStore and recomputed when the
+signature changes.
+
+Usage:
+    builder = SpatialStatisticsBuilder((0, 0, 100, 100), 5000, ['name', 'type'])
+    for bbox, vertices, values in scanned_features:
+        builder.add_feature(bbox, vertices, values)
+    stats = builder.build(signature)
+    stats.spatial_selectivity((10, 10, 20, 20))
+    stats.attribute_selectivity('"type" = \\'road\\'')
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger('FilterMate.Optimizer.SpatialStatistics')
+
+DEFAULT_GRID_SIZE = 64              # Cells per axis of the density grid
+DEFAULT_VERTEX_RESERVOIR = 1000     # Features kept for the vertex histogram
+DEFAULT_HLL_PRECISION = 10          # 1024 registers, ~3% standard error
+STATISTICS_FILE_VERSION = 1
+
+Bounds = Tuple[float, float, float, float]
+
+
+# =============================================================================
+# Sketches
+# =============================================================================
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-value counter (Flajolet et al. 2007).
+
+    Values are hashed with BLAKE2b, so estimates are stable across
+    sessions and can be persisted.
+    """
+
+    def __init__(self, precision: int = DEFAULT_HLL_PRECISION, registers: Optional[bytearray] = None):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = registers if registers is not None else bytearray(self.size)
+
+    def add(self, value) -> None:
+        digest = hashlib.blake2b(f"{type(value).__name__}:{value}".encode('utf-8', 'replace'), digest_size=8).digest()
+        hashed = int.from_bytes(digest, 'big')
+        bits = 64 - self.precision
+        index = hashed >> bits
+        rank = bits - (hashed & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def estimate(self) -> float:
+        m = self.size
+        alpha = 0.7213 / (1.0 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)  # Linear counting for small sets
+        return raw
+
+    def to_dict(self) -> Dict:
+        return {'precision': self.precision, 'registers': bytes(self.registers).hex()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'HyperLogLog':
+        return cls(data['precision'], bytearray.fromhex(data['registers']))
+
+
+class DensityGrid:
+    """Feature bbox centres counted on a regular grid over the layer extent."""
+
+    def __init__(self, extent: Bounds, size: int = DEFAULT_GRID_SIZE,
+                 cells: Optional[List[float]] = None, width_sum: float = 0.0,
+                 height_sum: float = 0.0, count: float = 0.0):
+        self.extent = tuple(extent)
+        self.size = size
+        self.cells = cells if cells is not None else [0.0] * (size * size)
+        self.width_sum = width_sum
+        self.height_sum = height_sum
+        self.count = count
+        xmin, ymin, xmax, ymax = self.extent
+        self._cell_w = (xmax - xmin) / size or 1.0
+        self._cell_h = (ymax - ymin) / size or 1.0
+
+    def _column(self, x: float) -> int:
+        return min(self.size - 1, max(0, int((x - self.extent[0]) / self._cell_w)))
+
+    def _row(self, y: float) -> int:
+        return min(self.size - 1, max(0, int((y - self.extent[1]) / self._cell_h)))
+
+    def add(self, bbox: Bounds, weight: float = 1.0) -> None:
+        xmin, ymin, xmax, ymax = bbox
+        cell = self._row((ymin + ymax) / 2.0) * self.size + self._column((xmin + xmax) / 2.0)
+        self.cells[cell] += weight
+        self.width_sum += (xmax - xmin) * weight
+        self.height_sum += (ymax - ymin) * weight
+        self.count += weight
+
+    def estimate(self, bbox: Bounds) -> float:
+        """Expected number of feature bboxes intersecting ``bbox``."""
+        if not self.count:
+            return 0.0
+        half_w = self.width_sum / self.count / 2.0
+        half_h = self.height_sum / self.count / 2.0
+        qxmin, qymin = bbox[0] - half_w, bbox[1] - half_h
+        qxmax, qymax = bbox[2] + half_w, bbox[3] + half_h
+        xmin, ymin, xmax, ymax = self.extent
+        if qxmax < xmin or qxmin > xmax or qymax < ymin or qymin > ymax:
+            return 0.0
+
+        total = 0.0
+        for row in range(self._row(qymin), self._row(qymax) + 1):
+            y0 = ymin + row * self._cell_h
+            # Degenerate (zero height) extents put every centre in one row
+            fy = 1.0 if ymax == ymin else _overlap(y0, y0 + self._cell_h, qymin, qymax) / self._cell_h
+            if fy <= 0:
+                continue
+            for column in range(self._column(qxmin), self._column(qxmax) + 1):
+                value = self.cells[row * self.size + column]
+                if not value:
+                    continue
+                x0 = xmin + column * self._cell_w
+                fx = 1.0 if xmax == xmin else _overlap(x0, x0 + self._cell_w, qxmin, qxmax) / self._cell_w
+                total += value * fx * fy
+        return total
+
+    def to_dict(self) -> Dict:
+        return {
+            'extent': list(self.extent), 'size': self.size, 'cells': self.cells,
+            'width_sum': self.width_sum, 'height_sum': self.height_sum, 'count': self.count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'DensityGrid':
+        return cls(tuple(data['extent']), data['size'], list(data['cells']),
+                   data['width_sum'], data['height_sum'], data['count'])
+
+
+def _overlap(a0: float, a1: float, b0: float, b1: float) -> float:
+    return max(0.0, min(a1, b1) - max(a0, b0))
+
+
+class VertexHistogram:
+    """Vertex counts of a reservoir sample of features (Algorithm R)."""
+
+    def __init__(self, capacity: int = DEFAULT_VERTEX_RESERVOIR, sample: Optional[List[int]] = None,
+                 seen: int = 0, rng: Optional[random.Random] = None):
+        self.capacity = max(1, capacity)
+        self.sample = sample if sample is not None else []
+        self.seen = seen
+        self._rng = rng or random.Random()
+
+    def offer(self, vertex_count: int) -> None:
+        self.seen += 1
+        if len(self.sample) < self.capacity:
+            self.sample.append(vertex_count)
+        else:
+            slot = self._rng.randrange(self.seen)
+            if slot < self.capacity:
+                self.sample[slot] = vertex_count
+
+    @property
+    def mean(self) -> float:
+        return sum(self.sample) / len(self.sample) if self.sample else 0.0
+
+    def quantile(self, q: float) -> float:
+        if not self.sample:
+            return 0.0
+        ordered = sorted(self.sample)
+        return float(ordered[min(len(ordered) - 1, int(q * len(ordered)))])
+
+    def buckets(self) -> Dict[int, int]:
+        """Sample counts per power-of-two bucket (upper bound -> count)."""
+        result: Dict[int, int] = {}
+        for count in self.sample:
+            bound = 1 << max(0, int(count) - 1).bit_length()
+            result[bound] = result.get(bound, 0) + 1
+        return dict(sorted(result.items()))
+
+    def to_dict(self) -> Dict:
+        return {'capacity': self.capacity, 'sample': self.sample, 'seen': self.seen}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'VertexHistogram':
+        return cls(data['capacity'], list(data['sample']), data['seen'])
+
+
+class ColumnStatistics:
+    """Null fraction and distinct estimate of one column."""
+
+    def __init__(self, rows: int = 0, nulls: int = 0, sketch: Optional[HyperLogLog] = None):
+        self.rows = rows
+        self.nulls = nulls
+        self.sketch = sketch or HyperLogLog()
+
+    def add(self, value) -> None:
+        self.rows += 1
+        if value is None or _is_qgis_null(value):
+            self.nulls += 1
+        else:
+            self.sketch.add(value)
+
+    @property
+    def null_fraction(self) -> float:
+        return self.nulls / self.rows if self.rows else 0.0
+
+    def distinct(self, total_rows: Optional[int] = None) -> float:
+        """Distinct non-null values, scaled to ``total_rows`` if sampled.
+
+        A column whose sampled values are (nearly) all different is taken
+        to stay unique in the whole layer; otherwise the sample already
+        saw most values.
+        """
+        observed = min(self.sketch.estimate(), float(self.rows - self.nulls))
+        non_null = self.rows - self.nulls
+        if not total_rows or total_rows <= self.rows or not non_null:
+            return max(observed, 1.0 if non_null else 0.0)
+        if observed >= 0.9 * non_null:
+            return observed * total_rows / self.rows
+        return max(observed, 1.0)
+
+    def to_dict(self) -> Dict:
+        return {'rows': self.rows, 'nulls': self.nulls, 'sketch': self.sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ColumnStatistics':
+        return cls(data['rows'], data['nulls'], HyperLogLog.from_dict(data['sketch']))
+
+
+def _is_qgis_null(value) -> bool:
+    """QVariant NULL without importing Qt."""
+    is_null = getattr(value, 'isNull', None)
+    return type(value).__name__ == 'QVariant' and callable(is_null) and is_null()
+
+
+# =============================================================================
+# Layer statistics
+# =============================================================================
+
+# "col" = literal / "col" <> literal / "col" IN (...) / "col" IS [NOT] NULL
+_COLUMN = r'"?(?P<column>[A-Za-z_][\w]*)"?'
+_EQUALITY_RE = re.compile(_COLUMN + r'\s*(?P<op>=|==|<>|!=)\s*(?P<value>\'(?:[^\']|\'\')*\'|-?[\d.]+)\s*$')
+_IN_RE = re.compile(_COLUMN + r'\s+(?P<negated>NOT\s+)?IN\s*\((?P<values>[^)]*)\)\s*$', re.IGNORECASE)
+_NULL_RE = re.compile(_COLUMN + r'\s+IS\s+(?P<negated>NOT\s+)?NULL\s*$', re.IGNORECASE)
+_AND_RE = re.compile(r'\s+AND\s+', re.IGNORECASE)
+
+
+class SpatialStatistics:
+    """
+    Statistics of one layer at one signature.
+
+    Attributes:
+        signature: Layer state the statistics describe
+        feature_count: Layer feature count at scan time
+        scanned: Features read by the scan (feature_count if not sampled)
+        grid: DensityGrid of feature bboxes (None for tables)
+        vertices: VertexHistogram of scanned features
+        columns: Column name -> ColumnStatistics
+    """
+
+    def __init__(self, signature: str, feature_count: int, scanned: int,
+                 grid: Optional[DensityGrid], vertices: VertexHistogram,
+                 columns: Dict[str, ColumnStatistics], computed_at: Optional[float] = None):
+        self.signature = signature
+        self.feature_count = feature_count
+        self.scanned = scanned
+        self.grid = grid
+        self.vertices = vertices
+        self.columns = columns
+        self.computed_at = computed_at if computed_at is not None else time.time()
+
+    @property
+    def avg_vertices(self) -> float:
+        return self.vertices.mean
+
+    def spatial_selectivity(self, bbox: Bounds) -> Optional[float]:
+        """Share of features whose bbox intersects ``bbox``; None without grid."""
+        if self.grid is None or not self.grid.count:
+            return None
+        return min(1.0, max(0.0, self.grid.estimate(bbox) / self.grid.count))
+
+    def attribute_selectivity(self, expression: str) -> Optional[float]:
+        """
+        Selectivity of simple column predicates from column statistics.
+
+        Handles ``col = v``, ``col <> v``, ``col [NOT] IN (...)`` and
+        ``col IS [NOT] NULL``, and AND-combinations of them (assumed
+        independent). Returns None for anything else.
+        """
+        if not expression or not expression.strip():
+            return 1.0
+        selectivity = 1.0
+        for part in _AND_RE.split(expression.strip()):
+            term = part.strip()
+            while term.startswith('(') and term.endswith(')'):
+                term = term[1:-1].strip()
+            term = self._term_selectivity(term)
+            if term is None:
+                return None
+            selectivity *= term
+        return min(1.0, max(0.0, selectivity))
+
+    def _term_selectivity(self, term: str) -> Optional[float]:
+        for pattern in (_NULL_RE, _IN_RE, _EQUALITY_RE):
+            match = pattern.match(term)
+            if match:
+                break
+        else:
+            return None
+        column = self._column(match.group('column'))
+        if column is None:
+            return None
+        null_fraction = column.null_fraction
+        non_null = 1.0 - null_fraction
+
+        if pattern is _NULL_RE:
+            return non_null if match.group('negated') else null_fraction
+        distinct = max(column.distinct(self.feature_count), 1.0)
+        if pattern is _IN_RE:
+            values = [v for v in match.group('values').split(',') if v.strip()]
+            share = min(1.0, len(values) / distinct) * non_null
+            return non_null - share if match.group('negated') else share
+        equal = non_null / distinct
+        return non_null - equal if match.group('op') in ('<>', '!=') else equal
+
+    def _column(self, name: str) -> Optional[ColumnStatistics]:
+        if name in self.columns:
+            return self.columns[name]
+        lowered = name.lower()
+        for key, column in self.columns.items():
+            if key.lower() == lowered:
+                return column
+        return None
+
+    def to_dict(self) -> Dict:
+        return {
+            'signature': self.signature,
+            'feature_count': self.feature_count,
+            'scanned': self.scanned,
+            'grid': self.grid.to_dict() if self.grid else None,
+            'vertices': self.vertices.to_dict(),
+            'columns': {name: column.to_dict() for name, column in self.columns.items()},
+            'computed_at': self.computed_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SpatialStatistics':
+        return cls(
+            signature=data['signature'],
+            feature_count=data['feature_count'],
+            scanned=data['scanned'],
+            grid=DensityGrid.from_dict(data['grid']) if data.get('grid') else None,
+            vertices=VertexHistogram.from_dict(data['vertices']),
+            columns={name: ColumnStatistics.from_dict(c) for name, c in data.get('columns', {}).items()},
+            computed_at=data.get('computed_at'),
+        )
+
+
+class SpatialStatisticsBuilder:
+    """
+    Accumulates SpatialStatistics over one scan of a layer.
+
+    When the scan reads a uniform sample of the layer, bbox counts are
+    weighted by feature_count / sampled features.
+    """
+
+    def __init__(self, extent: Optional[Bounds], feature_count: int, column_names: Sequence[str],
+                 sample_size: Optional[int] = None, grid_size: int = DEFAULT_GRID_SIZE,
+                 reservoir: int = DEFAULT_VERTEX_RESERVOIR, rng: Optional[random.Random] = None):
+        self.feature_count = max(0, feature_count)
+        self.grid = DensityGrid(extent, grid_size) if extent else None
+        self.vertices = VertexHistogram(reservoir, rng=rng)
+        self.column_names = list(column_names)
+        self.columns = {name: ColumnStatistics() for name in self.column_names}
+        self.weight = self.feature_count / sample_size if sample_size and self.feature_count > sample_size else 1.0
+        self.scanned = 0
+
+    def add_feature(self, bbox: Optional[Bounds], vertex_count: Optional[int], values: Iterable) -> None:
+        self.scanned += 1
+        if bbox is not None and self.grid is not None:
+            self.grid.add(bbox, self.weight)
+        if vertex_count is not None:
+            self.vertices.offer(vertex_count)
+        for name, value in zip(self.column_names, values):
+            self.columns[name].add(value)
+
+    def build(self, signature: str) -> SpatialStatistics:
+        return SpatialStatistics(
+            signature, self.feature_count, self.scanned, self.grid, self.vertices, self.columns
+        )
+
+
+# =============================================================================
+# Persistence
+# =============================================================================
+
+class SpatialStatisticsStore:
+    """
+    JSON file of SpatialStatistics keyed by layer id.
+
+    get() only returns statistics whose signature matches the layer's
+    current one, so edits, subset changes and file rewrites invalidate
+    them lazily.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._entries: Dict[str, SpatialStatistics] = {}
+        self._lock = threading.RLock()
+        self._loaded = False
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not os.path.isfile(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as handle:
+                data = json.load(handle)
+            if data.get('version') != STATISTICS_FILE_VERSION:
+                logger.info(f"Ignoring layer statistics file with version {data.get('version')}: {self.path}")
+                return
+            for layer_id, item in data.get('layers', {}).items():
+                self._entries[layer_id] = SpatialStatistics.from_dict(item)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Could not load layer statistics from {self.path}: {e}")
+
+    def get(self, layer_id: str, signature: str) -> Optional[SpatialStatistics]:
+        with self._lock:
+            self._load()
+            stats = self._entries.get(layer_id)
+            return stats if stats is not None and stats.signature == signature else None
+
+    def put(self, layer_id: str, stats: SpatialStatistics) -> None:
+        with self._lock:
+            self._load()
+            self._entries[layer_id] = stats
+            self.save()
+
+    def remove(self, layer_id: Optional[str] = None) -> int:
+        with self._lock:
+            self._load()
+            if layer_id is None:
+                count = len(self._entries)
+                self._entries.clear()
+            else:
+                count = 1 if self._entries.pop(layer_id, None) is not None else 0
+            if count:
+                self.save()
+            return count
+
+    def save(self) -> bool:
+        """Write all entries atomically. Returns False on failure."""
+        if not self.path:
+            return False
+        data = {
+            'version': STATISTICS_FILE_VERSION,
+            'layers': {layer_id: stats.to_dict() for layer_id, stats in self._entries.items()},
+        }
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as handle:
+                json.dump(data, handle)
+            os.replace(tmp_path, self.path)
+            return True
+        except OSError as e:
+            logger.warning(f"Could not save layer statistics to {self.path}: {e}")
+            return False
+
+
+# Statistics file in the plugin config directory
+STATISTICS_FILENAME = 'layer_statistics.json'
+
+
+def default_statistics_path() -> Optional[str]:
+    """Path of the persisted layer statistics, or None outside the plugin."""
+    try:
+        from ...config.config import ENV_VARS
+    except ImportError:
+        return None
+    plugin_dir = ENV_VARS.get("PLUGIN_CONFIG_DIRECTORY")
+    if not isinstance(plugin_dir, str) or not plugin_dir:
+        return None
+    return os.path.join(plugin_dir, STATISTICS_FILENAME)
+
+
+__all__ = [
+    'HyperLogLog',
+    'DensityGrid',
+    'VertexHistogram',
+    'ColumnStatistics',
+    'SpatialStatistics',
+    'SpatialStatisticsBuilder',
+    'SpatialStatisticsStore',
+    'default_statistics_path',
+]
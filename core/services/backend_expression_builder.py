@@ -107,6 +107,11 @@ class BackendExpressionBuilder:
         self.ogr_source_geom: Optional[Any] = None
         self.source_layer_crs_authid: Optional[str] = None
 
+        # v4.2.0: Cancellation and per-tile progress of tiled EXISTS (PostgreSQL)
+        self.is_canceled_callback: Optional[Callable[[], bool]] = None
+        self.progress_handler: Optional[Any] = None
+        self.temp_schema: Optional[str] = None
+
     def get_created_mvs(self) -> List[str]:
         """Get list of MVs created during expression building (for cleanup)."""
         return self._source_selection_mvs.copy()
@@ -666,6 +671,19 @@ class BackendExpressionBuilder:
         # Check auto-optimizations
         use_centroids = self._check_auto_optimizations(layer, source_wkt)
 
+        # v4.2.0: Very large PostgreSQL sources may be evaluated tile by tile
+        backend_options = {}
+        tiled_table_prefix = None
+        if backend.get_backend_name() == 'PostgreSQL':
+            from ..optimization.config_provider import get_tiled_exists_config
+            from ...adapters.backends.postgresql.tiled_exists import TILED_TABLE_PREFIX as tiled_table_prefix
+            backend_options = {
+                'tiled_exists_config': get_tiled_exists_config(self.task_parameters),
+                'temp_schema': self.temp_schema,
+                'cancel_check': self.is_canceled_callback,
+                'progress_handler': self.progress_handler,
+            }
+
         # Step 5: Call backend.build_expression()
         expression = backend.build_expression(
             layer_props=layer_props,
@@ -677,7 +695,8 @@ class BackendExpressionBuilder:
             source_wkt=source_wkt,
             source_srid=source_srid,
             source_feature_count=source_feature_count,
-            use_centroids=use_centroids
+            use_centroids=use_centroids,
+            **backend_options
         )
 
         # Check for OGR fallback sentinel
@@ -691,7 +710,13 @@ class BackendExpressionBuilder:
             return None
 
         # Step 6: Store in cache
-        if cache_key and self.expr_cache:
+        # v4.2.0: Tiled results live in a table dropped by session cleanup and a
+        # canceled tiled run must resume on the next one: both are found through
+        # the content key of the tiled table instead
+        cacheable = not (tiled_table_prefix and tiled_table_prefix in expression) and not (
+            self.is_canceled_callback and self.is_canceled_callback()
+        )
+        if cache_key and self.expr_cache and cacheable:
             self.expr_cache.put(cache_key, expression)
             logger.debug(f"Expression cached for {layer.name() if layer else 'unknown'}")
 
@@ -47,6 +47,7 @@ from .multi_step_filter import (  # noqa: F401
     FilterStep,
     LayerStatistics,
     SelectivityEstimator,
+    PostgresSelectivityEstimator,
     FilterPlanBuilder,
     MultiStepFilterExecutor,
     MultiStepFilterOptimizer,
@@ -70,6 +71,7 @@ __all__ = [
     'FilterStep',
     'LayerStatistics',
     'SelectivityEstimator',
+    'PostgresSelectivityEstimator',
     'FilterPlanBuilder',
     'MultiStepFilterExecutor',
     'MultiStepFilterOptimizer',
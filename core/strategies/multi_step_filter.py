@@ -36,8 +36,10 @@ v2.5.10 - Performance optimization for large datasets (January 2026)
 
 import time
 import re
+import uuid
+from array import array
 from typing import (
-    Dict, List, Optional, Tuple, Callable
+    TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Callable
 )
 from dataclasses import dataclass, field
 from enum import Enum, auto
@@ -46,6 +48,16 @@ from ...infrastructure.logging import get_logger
 
 logger = get_logger(__name__)
 
+from ..optimization.pg_statistics import (
+    PgColumnStatistics,
+    PgTableStatistics,
+    explain_plan_rows,
+    get_pg_statistics_cache,
+)
+
+if TYPE_CHECKING:
+    from ..optimization.spatial_statistics import SpatialStatistics
+
 # Centralized psycopg2 availability (v2.8.6 refactoring)
 from ...infrastructure.database.postgresql_support import PSYCOPG2_AVAILABLE
 
@@ -97,7 +109,7 @@ class FilterStepResult:
 class FilterPlanResult:
     """Result of executing a complete filter plan."""
     success: bool
-    feature_ids: Optional[List[int]] = None
+    feature_ids: Optional[Sequence[int]] = None  # array('q') for integer keys
     feature_count: int = 0
     strategy_used: FilterStrategy = FilterStrategy.DIRECT
     total_execution_time_ms: float = 0.0
@@ -146,7 +158,47 @@ class FilterStep:
     priority: int = 0  # Lower = execute first
     estimated_selectivity: float = 1.0  # 0.0-1.0, lower = more selective
     requires_previous_ids: bool = False  # If True, uses IDs from previous step
-    chunk_size: int = 10000  # For chunked processing
+    chunk_size: Optional[int] = None  # Rows per fetch when the step returns the result (None: executor default)
+
+
+def _quote_ident(name: str) -> str:
+    """Quote a PostgreSQL identifier."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _connection_key(conn) -> str:
+    """Cache key for a connection: its DSN (password masked by psycopg2)."""
+    dsn = getattr(conn, 'dsn', None)
+    return dsn if isinstance(dsn, str) else f"conn-{id(conn)}"
+
+
+def _estimate_query(conn, query: str, params: Optional[Tuple] = None) -> Optional[tuple]:
+    """
+    Run a statistics/estimate query, returning its first row or None.
+
+    Outside autocommit the query runs inside a savepoint, so a failure
+    (no PostGIS statistics, unparsable expression) does not abort the
+    caller's transaction.
+    """
+    savepoint = not getattr(conn, 'autocommit', True)
+    try:
+        with conn.cursor() as cur:
+            if savepoint:
+                cur.execute("SAVEPOINT fm_estimate")
+            try:
+                cur.execute(query, params)
+                row = cur.fetchone()
+            except Exception as e:
+                if savepoint:
+                    cur.execute("ROLLBACK TO SAVEPOINT fm_estimate")
+                logger.debug(f"Estimate query failed: {e}")
+                return None
+            if savepoint:
+                cur.execute("RELEASE SAVEPOINT fm_estimate")
+            return row
+    except Exception as e:
+        logger.debug(f"Estimate query failed: {e}")
+        return None
 
 
 @dataclass
@@ -160,25 +212,50 @@ class LayerStatistics:
     column_statistics: Dict[str, Dict] = field(default_factory=dict)
     bbox: Optional[Tuple[float, float, float, float]] = None
     last_analyzed: Optional[str] = None
+    geometry_column: str = "geom"
+    pg_statistics: Optional[PgTableStatistics] = None
+    # pg_class.reltuples the statistics were read at (cache version)
+    reltuples_version: float = -1.0
 
     @classmethod
-    def from_postgresql(cls, conn, schema: str, table: str) -> 'LayerStatistics':
-        """Fetch statistics from PostgreSQL system catalogs."""
-        stats = cls(table_name=table, schema=schema)
+    def from_postgresql(
+        cls,
+        conn,
+        schema: str,
+        table: str,
+        geometry_column: str = "geom",
+        use_cache: bool = True
+    ) -> 'LayerStatistics':
+        """Fetch statistics from PostgreSQL system catalogs.
+
+        v4.2.0: Column statistics include the MCV lists and histogram
+        bounds of pg_stats. The result is cached per table and reused
+        until pg_class.reltuples changes (a new ANALYZE).
+        """
+        stats = cls(table_name=table, schema=schema, geometry_column=geometry_column)
+
+        # Get row estimate (cache version)
+        row = _estimate_query(conn, """
+            SELECT c.reltuples::float8
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = %s AND c.relname = %s
+        """, (schema, table))
+        if row is None or row[0] is None:
+            return stats
+        reltuples = float(row[0])
+        stats.reltuples_version = reltuples
+        stats.estimated_rows = max(0, int(reltuples))
+
+        cache = get_pg_statistics_cache()
+        cache_key = (_connection_key(conn), schema, table)
+        if use_cache:
+            cached = cache.get(cache_key, reltuples)
+            if cached is not None and cached.geometry_column == geometry_column:
+                return cached
 
         try:
             with conn.cursor() as cur:
-                # Get row estimate
-                cur.execute("""
-                    SELECT reltuples::bigint
-                    FROM pg_class c
-                    JOIN pg_namespace n ON n.oid = c.relnamespace
-                    WHERE n.nspname = %s AND c.relname = %s
-                """, (schema, table))
-                row = cur.fetchone()
-                if row:
-                    stats.estimated_rows = max(0, int(row[0]))
-
                 # Check for spatial index
                 cur.execute("""
                     SELECT COUNT(*) > 0
@@ -191,32 +268,44 @@ class LayerStatistics:
 
                 # Get column statistics for selectivity estimation
                 cur.execute("""
-                    SELECT attname, n_distinct, null_frac
+                    SELECT attname, n_distinct, null_frac,
+                           most_common_vals::text::text[],
+                           most_common_freqs::float8[],
+                           histogram_bounds::text::text[]
                     FROM pg_stats
                     WHERE schemaname = %s AND tablename = %s
                 """, (schema, table))
+                columns = {}
                 for row in cur.fetchall():
-                    col_name, n_distinct, null_frac = row
+                    col_name, n_distinct, null_frac, mcv, mcf, bounds = row
                     stats.column_statistics[col_name] = {
                         'n_distinct': n_distinct,
                         'null_frac': null_frac or 0.0
                     }
-
-                # Get table bbox from geometry_columns if available
-                cur.execute("""
-                    SELECT ST_XMin(bbox), ST_YMin(bbox), ST_XMax(bbox), ST_YMax(bbox)
-                    FROM (
-                        SELECT ST_EstimatedExtent(%s, %s, 'geom') as bbox
-                    ) sub
-                    WHERE bbox IS NOT NULL
-                """, (schema, table))
-                row = cur.fetchone()
-                if row and all(v is not None for v in row):
-                    stats.bbox = tuple(row)
-
+                    columns[col_name] = PgColumnStatistics(
+                        null_frac=float(null_frac or 0.0),
+                        n_distinct=float(n_distinct or 0.0),
+                        most_common_vals=list(mcv or []),
+                        most_common_freqs=[float(f) for f in (mcf or [])],
+                        histogram_bounds=list(bounds or [])
+                    )
+                stats.pg_statistics = PgTableStatistics(reltuples=reltuples, columns=columns)
         except Exception as e:
             logger.debug(f"Could not fetch full statistics for {schema}.{table}: {e}")
 
+        # Get table bbox from the geometry column statistics
+        row = _estimate_query(conn, """
+            SELECT ST_XMin(bbox), ST_YMin(bbox), ST_XMax(bbox), ST_YMax(bbox)
+            FROM (
+                SELECT ST_EstimatedExtent(%s, %s, %s) as bbox
+            ) sub
+            WHERE bbox IS NOT NULL
+        """, (schema, table, geometry_column))
+        if row and all(v is not None for v in row):
+            stats.bbox = tuple(row)
+
+        if stats.pg_statistics is not None:
+            cache.put(cache_key, reltuples, stats)
         return stats
 
 
@@ -226,6 +315,10 @@ class SelectivityEstimator:
 
     Selectivity = fraction of rows that pass the filter (0.0 to 1.0).
     Lower selectivity = more rows filtered out = more efficient to apply first.
+
+    v4.2.0: With layer statistics (density grid and column sketches, see
+    core.optimization.spatial_statistics), estimates come from them and the
+    defaults below are only used for predicates they cannot answer.
     """
 
     # Default selectivity estimates for common operators
@@ -250,9 +343,24 @@ class SelectivityEstimator:
         '&&': 0.20,  # Bbox operator
     }
 
-    def __init__(self, layer_stats: Optional[LayerStatistics] = None):
-        """Initialize estimator with optional layer statistics."""
+    def __init__(
+        self,
+        layer_stats: Optional[LayerStatistics] = None,
+        statistics: Optional['SpatialStatistics'] = None
+    ):
+        """Initialize estimator with optional layer statistics.
+
+        Args:
+            layer_stats: PostgreSQL catalog statistics
+            statistics: Scanned layer statistics (density grid, column sketches)
+        """
         self.layer_stats = layer_stats
+        self.statistics = statistics
+
+    @property
+    def has_statistics(self) -> bool:
+        """True when estimates come from scanned layer statistics."""
+        return self.statistics is not None
 
     def estimate_attribute_selectivity(
         self,
@@ -269,6 +377,11 @@ class SelectivityEstimator:
         Returns:
             Estimated selectivity (0.0 to 1.0)
         """
+        if self.statistics is not None:
+            estimate = self.statistics.attribute_selectivity(expression)
+            if estimate is not None:
+                return estimate
+
         expr_upper = expression.upper()
 
         # Check for equality conditions
@@ -336,9 +449,40 @@ class SelectivityEstimator:
         Returns:
             Estimated selectivity (0.0 to 1.0)
         """
-        if layer_bbox is None:
+        base_selectivity = self._bbox_selectivity(source_bbox, layer_bbox)
+        if base_selectivity is None:
             # Use default estimate
             return self.DEFAULT_SELECTIVITY.get(predicate, 0.10)
+        if base_selectivity == 0.0:
+            return 0.0
+
+        # Apply predicate-specific adjustment
+
+        # Adjust based on predicate type
+        predicate_upper = predicate.upper()
+        if 'CONTAINS' in predicate_upper or 'WITHIN' in predicate_upper:
+            base_selectivity *= 0.5  # These are more restrictive
+        elif 'TOUCHES' in predicate_upper:
+            base_selectivity *= 0.1  # Very restrictive (boundary only)
+        elif 'DISJOINT' in predicate_upper:
+            base_selectivity = 1.0 - base_selectivity
+
+        return max(0.001, min(1.0, base_selectivity))
+
+    def _bbox_selectivity(
+        self,
+        source_bbox: Tuple[float, float, float, float],
+        layer_bbox: Optional[Tuple[float, float, float, float]]
+    ) -> Optional[float]:
+        """Share of rows whose bbox intersects ``source_bbox``, or None."""
+        # Density grid: share of feature bboxes intersecting the source bbox
+        if self.statistics is not None:
+            grid_selectivity = self.statistics.spatial_selectivity(source_bbox)
+            if grid_selectivity is not None:
+                return grid_selectivity
+
+        if layer_bbox is None:
+            return None
 
         # Calculate bbox overlap ratio
         src_xmin, src_ymin, src_xmax, src_ymax = source_bbox
@@ -354,7 +498,6 @@ class SelectivityEstimator:
             return 0.0  # No overlap
 
         # Calculate areas
-        (src_xmax - src_xmin) * (src_ymax - src_ymin)
         lyr_area = (lyr_xmax - lyr_xmin) * (lyr_ymax - lyr_ymin)
         int_area = (int_xmax - int_xmin) * (int_ymax - int_ymin)
 
@@ -362,19 +505,7 @@ class SelectivityEstimator:
             return 0.5
 
         # Selectivity is roughly intersection/layer ratio
-        # Apply predicate-specific adjustment
-        base_selectivity = int_area / lyr_area
-
-        # Adjust based on predicate type
-        predicate_upper = predicate.upper()
-        if 'CONTAINS' in predicate_upper or 'WITHIN' in predicate_upper:
-            base_selectivity *= 0.5  # These are more restrictive
-        elif 'TOUCHES' in predicate_upper:
-            base_selectivity *= 0.1  # Very restrictive (boundary only)
-        elif 'DISJOINT' in predicate_upper:
-            base_selectivity = 1.0 - base_selectivity
-
-        return max(0.001, min(1.0, base_selectivity))
+        return int_area / lyr_area
 
     def estimate_combined_selectivity(
         self,
@@ -402,12 +533,129 @@ class SelectivityEstimator:
         return (attr_sel, spatial_sel)
 
 
+class PostgresSelectivityEstimator(SelectivityEstimator):
+    """
+    Selectivity from the database's own statistics.
+
+    v4.2.0: In order of preference:
+    - attribute predicates: pg_stats (MCV lists, histogram bounds,
+      n_distinct, null_frac), then the planner row estimate of
+      ``EXPLAIN (FORMAT JSON)`` for expressions pg_stats cannot answer;
+    - bbox selectivity: PostGIS ``_postgis_selectivity`` on the geometry
+      column statistics, then ``EXPLAIN`` of the ``&&`` filter.
+
+    Falls back to the defaults of SelectivityEstimator when neither is
+    available. Estimates are cached with the table statistics and dropped
+    when pg_class.reltuples changes.
+    """
+
+    def __init__(
+        self,
+        connection,
+        layer_stats: LayerStatistics,
+        statistics: Optional['SpatialStatistics'] = None
+    ):
+        super().__init__(layer_stats, statistics)
+        self.connection = connection
+        self._cache = get_pg_statistics_cache()
+        self._cache_key = (_connection_key(connection), layer_stats.schema, layer_stats.table_name)
+
+    @property
+    def has_statistics(self) -> bool:
+        """True when the table has been analyzed."""
+        pg_statistics = self.layer_stats.pg_statistics
+        return bool(pg_statistics and pg_statistics.analyzed) or super().has_statistics
+
+    def estimate_attribute_selectivity(
+        self,
+        expression: str,
+        column_stats: Optional[Dict] = None
+    ) -> float:
+        """Estimate from pg_stats, then EXPLAIN, then the defaults."""
+        pg_statistics = self.layer_stats.pg_statistics
+        if pg_statistics is not None and pg_statistics.analyzed:
+            estimate = pg_statistics.attribute_selectivity(expression)
+            if estimate is not None:
+                return estimate
+
+        estimate = self._explain_selectivity(expression)
+        if estimate is not None:
+            return estimate
+        return super().estimate_attribute_selectivity(expression, column_stats)
+
+    def _bbox_selectivity(
+        self,
+        source_bbox: Tuple[float, float, float, float],
+        layer_bbox: Optional[Tuple[float, float, float, float]]
+    ) -> Optional[float]:
+        """PostGIS && selectivity for the bbox, then EXPLAIN, then overlap."""
+        key = "bbox:" + ",".join(f"{v:.9g}" for v in source_bbox)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        stats = self.layer_stats
+        xmin, ymin, xmax, ymax = source_bbox
+        row = _estimate_query(self.connection, """
+            SELECT _postgis_selectivity(%s::regclass, %s, ST_MakeEnvelope(%s, %s, %s, %s))
+        """, (
+            f"{_quote_ident(stats.schema)}.{_quote_ident(stats.table_name)}",
+            stats.geometry_column, xmin, ymin, xmax, ymax
+        ))
+        if row and row[0] is not None:
+            selectivity = min(1.0, max(0.0, float(row[0])))
+            self._store(key, selectivity)
+            return selectivity
+
+        selectivity = self._explain_selectivity(
+            f"{_quote_ident(stats.geometry_column)} && ST_SetSRID(ST_MakeEnvelope({xmin}, {ymin}, {xmax}, {ymax}), "
+            f"ST_SRID({_quote_ident(stats.geometry_column)}))"
+        )
+        if selectivity is not None:
+            return selectivity
+        return super()._bbox_selectivity(source_bbox, layer_bbox)
+
+    def _explain_selectivity(self, expression: str) -> Optional[float]:
+        """Planner row estimate of the expression over the table row estimate."""
+        rows = self.layer_stats.estimated_rows
+        if not expression or not expression.strip() or rows <= 0:
+            return None
+        key = "explain:" + expression
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        stats = self.layer_stats
+        row = _estimate_query(
+            self.connection,
+            f"EXPLAIN (FORMAT JSON) SELECT 1 FROM {_quote_ident(stats.schema)}.{_quote_ident(stats.table_name)} "
+            f"WHERE {expression}"
+        )
+        plan_rows = explain_plan_rows(row[0]) if row else None
+        if plan_rows is None:
+            return None
+        selectivity = min(1.0, max(0.0, plan_rows / rows))
+        self._store(key, selectivity)
+        return selectivity
+
+    def _cached(self, key: str) -> Optional[float]:
+        return self._cache.get_estimate(self._cache_key, self.layer_stats.reltuples_version, key)
+
+    def _store(self, key: str, value: float) -> None:
+        self._cache.put_estimate(self._cache_key, self.layer_stats.reltuples_version, key, value)
+
+
 class FilterPlanBuilder:
     """
     Builds optimal filter execution plans based on query analysis.
 
     Uses selectivity estimates to determine the most efficient
     ordering of filter steps.
+
+    v4.2.0: When the estimator has measured statistics (scanned layer
+    statistics or pg_stats), the step that leaves fewer candidates runs
+    first; the fixed selectivity thresholds below only apply to default
+    estimates. The fetch size of the result follows the estimates.
     """
 
     # Thresholds for strategy selection
@@ -420,6 +668,10 @@ class FilterPlanBuilder:
     HIGH_SELECTIVITY = 0.1  # Filters out >90% of rows
     MEDIUM_SELECTIVITY = 0.3
 
+    # Fetch batches of the result: round trips aimed at, batch bounds
+    FETCH_ROUND_TRIPS = 10
+    MIN_CHUNK_SIZE = 1000
+
     def __init__(
         self,
         layer_stats: Optional[LayerStatistics] = None,
@@ -451,6 +703,19 @@ class FilterPlanBuilder:
         if feature_count == 0 and self.layer_stats:
             feature_count = self.layer_stats.estimated_rows
 
+        strategy, steps = self._build_plan(attribute_expr, spatial_expr, source_bbox, feature_count)
+        self._assign_chunk_sizes(steps, feature_count)
+        return (strategy, steps)
+
+    def _build_plan(
+        self,
+        attribute_expr: Optional[str],
+        spatial_expr: Optional[str],
+        source_bbox: Optional[Tuple[float, float, float, float]],
+        feature_count: int
+    ) -> Tuple[FilterStrategy, List[FilterStep]]:
+        """Choose the strategy and order the steps."""
+
         # Estimate selectivities
         attr_sel, spatial_sel = self.estimator.estimate_combined_selectivity(
             attribute_expr, spatial_expr, source_bbox
@@ -472,6 +737,13 @@ class FilterPlanBuilder:
         has_spatial = spatial_expr is not None and spatial_expr.strip()
         has_bbox = source_bbox is not None
 
+        if getattr(self.estimator, 'has_statistics', False):
+            return self._build_plan_from_statistics(
+                attribute_expr if has_attribute else None,
+                spatial_expr if has_spatial else None,
+                source_bbox, feature_count, attr_sel, spatial_sel
+            )
+
         # Calculate estimated intermediate sizes
         after_attribute = int(feature_count * attr_sel) if has_attribute else feature_count
         after_bbox = int(feature_count * min(spatial_sel * 3, 1.0)) if has_bbox else feature_count  # Bbox is less precise
@@ -596,6 +868,95 @@ class FilterPlanBuilder:
         # Fallback: Direct execution
         return self._build_direct_plan(attribute_expr, spatial_expr)
 
+    def _assign_chunk_sizes(self, steps: List[FilterStep], feature_count: int) -> None:
+        """
+        Size the fetch batches of the step that returns the result.
+
+        Intermediate candidates stay in the database; only the last step
+        is fetched. Its expected row count is split into about
+        FETCH_ROUND_TRIPS batches of MIN_CHUNK_SIZE to MAX_CHUNK_SIZE rows.
+        """
+        if not steps:
+            return
+        expected = float(feature_count)
+        for step in steps:
+            expected *= min(1.0, max(0.0, step.estimated_selectivity))
+        size = int(expected / self.FETCH_ROUND_TRIPS)
+        steps[-1].chunk_size = max(
+            self.MIN_CHUNK_SIZE,
+            min(MultiStepFilterExecutor.MAX_CHUNK_SIZE, size)
+        )
+        logger.debug(f"~{int(expected):,} result rows expected, fetch size {steps[-1].chunk_size:,}")
+
+    def _build_plan_from_statistics(
+        self,
+        attribute_expr: Optional[str],
+        spatial_expr: Optional[str],
+        source_bbox: Optional[Tuple[float, float, float, float]],
+        feature_count: int,
+        attr_sel: float,
+        spatial_sel: float
+    ) -> Tuple[FilterStrategy, List[FilterStep]]:
+        """Order steps by the candidates they leave, from statistics estimates.
+
+        The density grid estimates bbox selectivity directly, so the bbox
+        step is not inflated as it is for default estimates.
+        """
+        after_attribute = int(feature_count * attr_sel) if attribute_expr else feature_count
+        after_bbox = int(feature_count * spatial_sel) if source_bbox else feature_count
+
+        if attribute_expr and (source_bbox is None or after_attribute <= after_bbox):
+            strategy = FilterStrategy.ATTRIBUTE_FIRST
+            first = FilterStep(
+                step_type=FilterStepType.ATTRIBUTE_FILTER,
+                expression=attribute_expr,
+                priority=1,
+                estimated_selectivity=attr_sel
+            )
+            second = None
+            if source_bbox is not None and after_attribute > 1000:
+                second = FilterStep(
+                    step_type=FilterStepType.BBOX_PREFILTER,
+                    expression=self._build_bbox_expression(source_bbox),
+                    priority=2,
+                    estimated_selectivity=spatial_sel,
+                    requires_previous_ids=True
+                )
+        elif source_bbox is not None:
+            strategy = FilterStrategy.BBOX_THEN_FULL
+            first = FilterStep(
+                step_type=FilterStepType.BBOX_PREFILTER,
+                expression=self._build_bbox_expression(source_bbox),
+                priority=1,
+                estimated_selectivity=spatial_sel
+            )
+            second = None
+            if attribute_expr and after_bbox > 1000:
+                second = FilterStep(
+                    step_type=FilterStepType.ATTRIBUTE_FILTER,
+                    expression=attribute_expr,
+                    priority=2,
+                    estimated_selectivity=attr_sel,
+                    requires_previous_ids=True
+                )
+        else:
+            return self._build_direct_plan(attribute_expr, spatial_expr)
+
+        logger.debug(
+            f"Statistics plan: {strategy.value} "
+            f"(after attribute={after_attribute:,}, after bbox={after_bbox:,})"
+        )
+        steps = [first] + ([second] if second else [])
+        if spatial_expr:
+            steps.append(FilterStep(
+                step_type=FilterStepType.SPATIAL_PREDICATE,
+                expression=spatial_expr,
+                priority=3,
+                estimated_selectivity=spatial_sel,
+                requires_previous_ids=True
+            ))
+        return (strategy, steps)
+
     def _build_direct_plan(
         self,
         attribute_expr: Optional[str],
@@ -637,14 +998,22 @@ class MultiStepFilterExecutor:
     Executes multi-step filter plans efficiently.
 
     Handles:
-    - Intermediate result caching
-    - Chunked processing for large candidate sets
+    - Intermediate candidate sets kept in the database
+    - Streaming of the final result
     - Progress reporting
     - Error recovery
+
+    v4.2.0: Candidate ids no longer cross the wire between steps. Each
+    intermediate step stores its ids in an indexed session temp table that
+    the next step joins; only the last step's ids are fetched, through a
+    named server-side cursor, into an ``array('q')``. Where temp tables
+    cannot be created (read-only transaction, hot standby), the remaining
+    steps are chained as materialized CTEs in one streamed query. Python
+    memory is the final result only, whatever the intermediate sizes.
     """
 
-    DEFAULT_CHUNK_SIZE = 10000
-    MAX_IN_CLAUSE_SIZE = 50000
+    DEFAULT_CHUNK_SIZE = 10000  # Rows per fetch of the result cursor
+    MAX_CHUNK_SIZE = 50000
 
     def __init__(
         self,
@@ -664,6 +1033,7 @@ class MultiStepFilterExecutor:
         self.geometry_column = geometry_column
         self.srid = srid
         self.chunk_size = chunk_size or self.DEFAULT_CHUNK_SIZE
+        self._run_id = ""
 
     def execute_plan(
         self,
@@ -684,7 +1054,10 @@ class MultiStepFilterExecutor:
         result = FilterPlanResult(success=True)
         result.steps_executed = 0
 
-        candidate_ids = None  # None means "all rows"
+        self._run_id = f"fm_ms_{uuid.uuid4().hex[:12]}"
+        temp_tables: List[str] = []
+        previous = None  # Temp table holding the previous step's ids
+        feature_ids: Sequence[int] = array('q')
         current_count = 0
 
         try:
@@ -695,6 +1068,7 @@ class MultiStepFilterExecutor:
             # Execute each step
             for i, step in enumerate(steps):
                 step_start = time.time()
+                is_last = i == len(steps) - 1
 
                 if progress_callback:
                     progress_callback(step.step_type.name, i + 1, len(steps))
@@ -704,23 +1078,42 @@ class MultiStepFilterExecutor:
                     f"(candidates: {current_count:,})"
                 )
 
-                # Execute step
-                new_ids = self._execute_step(step, candidate_ids)
+                query = self._step_query(step, previous)
+                executed = [step]
+                if is_last:
+                    feature_ids = self._stream_ids(query, step.chunk_size)
+                    new_count = len(feature_ids)
+                else:
+                    materialized = self._materialize(query, i)
+                    if materialized is None:
+                        # No temp tables here: run the rest as one chained query
+                        logger.info("   → Temp tables unavailable, chaining remaining steps as CTEs")
+                        executed = steps[i:]
+                        feature_ids = self._stream_ids(
+                            self._chained_query(executed, previous), steps[-1].chunk_size
+                        )
+                        new_count = len(feature_ids)
+                        is_last = True
+                    else:
+                        previous, new_count = materialized
+                        temp_tables.append(previous)
 
                 # Calculate statistics
                 step_time = (time.time() - step_start) * 1000
-                new_count = len(new_ids) if new_ids is not None else current_count
                 reduction = 1.0 - (new_count / max(1, current_count))
 
-                step_result = FilterStepResult(
-                    step_type=step.step_type,
-                    candidate_count=new_count,
-                    execution_time_ms=step_time,
-                    reduction_ratio=reduction,
-                    expression_used=step.expression[:100] + "..." if len(step.expression) > 100 else step.expression
-                )
-                result.step_results.append(step_result)
-                result.steps_executed += 1
+                for executed_step in executed:
+                    result.step_results.append(FilterStepResult(
+                        step_type=executed_step.step_type,
+                        candidate_count=new_count,
+                        execution_time_ms=step_time / len(executed),
+                        reduction_ratio=reduction if executed_step is executed[0] else 0.0,
+                        expression_used=(
+                            executed_step.expression[:100] + "..."
+                            if len(executed_step.expression) > 100 else executed_step.expression
+                        )
+                    ))
+                result.steps_executed += len(executed)
 
                 logger.info(
                     f"   → {new_count:,} candidates remaining "
@@ -728,17 +1121,20 @@ class MultiStepFilterExecutor:
                 )
 
                 # Update for next iteration
-                candidate_ids = new_ids
                 current_count = new_count
 
+                if is_last:
+                    break
+
                 # Early termination if no candidates left
                 if new_count == 0:
                     logger.info("   → No candidates remaining, stopping early")
+                    feature_ids = array('q')
                     break
 
             # Finalize result
-            result.feature_ids = candidate_ids or []
-            result.feature_count = len(result.feature_ids)
+            result.feature_ids = feature_ids
+            result.feature_count = len(feature_ids)
             result.final_count = result.feature_count
             result.total_execution_time_ms = (time.time() - start_time) * 1000
             result.overall_reduction_ratio = (
@@ -758,140 +1154,109 @@ class MultiStepFilterExecutor:
             import traceback
             logger.debug(traceback.format_exc())
 
+        finally:
+            self._drop_temp_tables(temp_tables)
+
         return result
 
-    def _execute_step(
-        self,
-        step: FilterStep,
-        candidate_ids: Optional[List[int]]
-    ) -> List[int]:
-        """Execute a single filter step."""
-
-        if step.step_type == FilterStepType.BBOX_PREFILTER:
-            return self._execute_bbox_step(step, candidate_ids)
-        elif step.step_type == FilterStepType.ATTRIBUTE_FILTER:
-            return self._execute_attribute_step(step, candidate_ids)
-        elif step.step_type == FilterStepType.SPATIAL_PREDICATE:
-            return self._execute_spatial_step(step, candidate_ids)
-        else:
+    @property
+    def _qualified_table(self) -> str:
+        return f"{_quote_ident(self.schema)}.{_quote_ident(self.table)}"
+
+    def _step_query(self, step: FilterStep, previous: Optional[str]) -> str:
+        """SELECT of the step's ids, restricted to the previous step's ids."""
+        if step.step_type not in (
+            FilterStepType.BBOX_PREFILTER,
+            FilterStepType.ATTRIBUTE_FILTER,
+            FilterStepType.SPATIAL_PREDICATE
+        ):
             raise ValueError(f"Unknown step type: {step.step_type}")
 
-    def _execute_bbox_step(
-        self,
-        step: FilterStep,
-        candidate_ids: Optional[List[int]]
-    ) -> List[int]:
-        """Execute bounding box pre-filter."""
-        if candidate_ids is not None and len(candidate_ids) == 0:
-            return []
-
-        if candidate_ids is not None and len(candidate_ids) <= self.MAX_IN_CLAUSE_SIZE:
-            # Filter within candidate set
-            ','.join(str(id) for id in candidate_ids)
-            query = """
-                SELECT "{self.primary_key}"
-                FROM "{self.schema}"."{self.table}"
-                WHERE "{self.primary_key}" IN ({ids_str})
-                  AND {step.expression}
-            """
-        else:
-            # Full table scan with bbox
-            query = """
-                SELECT "{self.primary_key}"
-                FROM "{self.schema}"."{self.table}"
-                WHERE {step.expression}
-            """
-
-        return self._fetch_ids(query)
-
-    def _execute_attribute_step(
-        self,
-        step: FilterStep,
-        candidate_ids: Optional[List[int]]
-    ) -> List[int]:
-        """Execute attribute filter."""
-        if candidate_ids is not None and len(candidate_ids) == 0:
-            return []
-
-        if candidate_ids is not None:
-            # Process in chunks if needed
-            if len(candidate_ids) > self.MAX_IN_CLAUSE_SIZE:
-                return self._execute_chunked(step, candidate_ids)
-
-            ','.join(str(id) for id in candidate_ids)
-            query = """
-                SELECT "{self.primary_key}"
-                FROM "{self.schema}"."{self.table}"
-                WHERE "{self.primary_key}" IN ({ids_str})
-                  AND ({step.expression})
-            """
-        else:
-            query = """
-                SELECT "{self.primary_key}"
-                FROM "{self.schema}"."{self.table}"
-                WHERE {step.expression}
-            """
-
-        return self._fetch_ids(query)
-
-    def _execute_spatial_step(
-        self,
-        step: FilterStep,
-        candidate_ids: Optional[List[int]]
-    ) -> List[int]:
-        """Execute spatial predicate filter."""
-        if candidate_ids is not None and len(candidate_ids) == 0:
-            return []
-
-        if candidate_ids is not None:
-            if len(candidate_ids) > self.MAX_IN_CLAUSE_SIZE:
-                return self._execute_chunked(step, candidate_ids)
-
-            ','.join(str(id) for id in candidate_ids)
-            query = """
-                SELECT "{self.primary_key}"
-                FROM "{self.schema}"."{self.table}"
-                WHERE "{self.primary_key}" IN ({ids_str})
-                  AND ({step.expression})
-            """
-        else:
-            query = """
-                SELECT "{self.primary_key}"
-                FROM "{self.schema}"."{self.table}"
-                WHERE {step.expression}
-            """
-
-        return self._fetch_ids(query)
+        pk = _quote_ident(self.primary_key)
+        query = (
+            f"SELECT {pk} AS id FROM {self._qualified_table} "
+            f"WHERE ({step.expression})"
+        )
+        if previous:
+            query += f" AND {pk} IN (SELECT id FROM {_quote_ident(previous)})"
+        return query
+
+    def _chained_query(self, steps: List[FilterStep], previous: Optional[str]) -> str:
+        """All steps as CTEs, each restricted to the ids of the one before."""
+        # PostgreSQL 12+ inlines single-use CTEs unless told otherwise
+        materialized = "MATERIALIZED " if getattr(self.connection, 'server_version', 0) >= 120000 else ""
+        ctes = []
+        for i, step in enumerate(steps):
+            ctes.append(f"s{i} AS {materialized}({self._step_query(step, previous)})")
+            previous = f"s{i}"
+        return f"WITH {', '.join(ctes)} SELECT id FROM s{len(steps) - 1}"
+
+    def _materialize(self, query: str, index: int) -> Optional[Tuple[str, int]]:
+        """
+        Store the step's ids in an indexed temp table.
 
-    def _execute_chunked(
-        self,
-        step: FilterStep,
-        candidate_ids: List[int]
-    ) -> List[int]:
-        """Execute step in chunks for very large candidate sets."""
-        results = []
-
-        for i in range(0, len(candidate_ids), self.chunk_size):
-            chunk = candidate_ids[i:i + self.chunk_size]
-            ','.join(str(id) for id in chunk)
-
-            query = """
-                SELECT "{self.primary_key}"
-                FROM "{self.schema}"."{self.table}"
-                WHERE "{self.primary_key}" IN ({ids_str})
-                  AND ({step.expression})
-            """
-
-            chunk_results = self._fetch_ids(query)
-            results.extend(chunk_results)
-
-        return results
-
-    def _fetch_ids(self, query: str) -> List[int]:
-        """Execute query and fetch result IDs."""
+        Returns:
+            (table name, row count), or None when temp tables cannot be
+            created (the failure is rolled back to a savepoint).
+        """
+        name = f"{self._run_id}_{index}"
+        savepoint = not getattr(self.connection, 'autocommit', True)
         with self.connection.cursor() as cur:
-            cur.execute(query)
-            return [row[0] for row in cur.fetchall()]
+            if savepoint:
+                cur.execute("SAVEPOINT fm_materialize")
+            try:
+                cur.execute(f"CREATE TEMP TABLE {_quote_ident(name)} AS {query}")
+                count = cur.rowcount
+            except Exception as e:
+                if savepoint:
+                    cur.execute("ROLLBACK TO SAVEPOINT fm_materialize")
+                logger.debug(f"Could not create temp table {name}: {e}")
+                return None
+            if savepoint:
+                cur.execute("RELEASE SAVEPOINT fm_materialize")
+            cur.execute(f"CREATE INDEX ON {_quote_ident(name)} (id)")
+            cur.execute(f"ANALYZE {_quote_ident(name)}")
+            if count is None or count < 0:
+                cur.execute(f"SELECT count(*) FROM {_quote_ident(name)}")
+                count = cur.fetchone()[0]
+        return name, int(count)
+
+    def _stream_ids(self, query: str, fetch_size: Optional[int] = None) -> Sequence[int]:
+        """
+        Fetch the ids of a query through a named server-side cursor.
+
+        Integer keys are packed into an ``array('q')`` (8 bytes per id);
+        other key types are returned as a list.
+        """
+        fetch_size = min(self.MAX_CHUNK_SIZE, fetch_size or self.chunk_size)
+        cursor = self.connection.cursor(
+            name=f"{self._run_id}_result",
+            withhold=bool(getattr(self.connection, 'autocommit', False))
+        )
+        ids = None
+        try:
+            cursor.itersize = fetch_size
+            cursor.execute(query)
+            while True:
+                rows = cursor.fetchmany(fetch_size)
+                if not rows:
+                    break
+                if ids is None:
+                    ids = array('q') if isinstance(rows[0][0], int) else []
+                ids.extend(row[0] for row in rows)
+        finally:
+            cursor.close()
+        return ids if ids is not None else array('q')
+
+    def _drop_temp_tables(self, names: List[str]) -> None:
+        """Drop the step tables (they would otherwise live until the session ends)."""
+        if not names:
+            return
+        try:
+            with self.connection.cursor() as cur:
+                cur.execute("DROP TABLE IF EXISTS " + ", ".join(_quote_ident(n) for n in names))
+        except Exception as e:
+            logger.debug(f"Could not drop step tables {names}: {e}")
 
     def _get_row_count_estimate(self) -> int:
         """Get estimated row count from PostgreSQL statistics."""
@@ -930,7 +1295,8 @@ class MultiStepFilterOptimizer:
         self,
         connection,
         layer_props: Dict,
-        use_statistics: bool = True
+        use_statistics: bool = True,
+        spatial_statistics: Optional['SpatialStatistics'] = None
     ):
         """
         Initialize optimizer.
@@ -939,6 +1305,7 @@ class MultiStepFilterOptimizer:
             connection: psycopg2 database connection
             layer_props: Layer properties dictionary
             use_statistics: Whether to fetch PostgreSQL statistics
+            spatial_statistics: Scanned layer statistics for the estimator
         """
         self.connection = connection
         self.schema = layer_props.get('layer_schema', layer_props.get('schema', 'public'))
@@ -951,12 +1318,15 @@ class MultiStepFilterOptimizer:
         self.layer_stats = None
         if use_statistics and POSTGRESQL_AVAILABLE:
             self.layer_stats = LayerStatistics.from_postgresql(
-                connection, self.schema, self.table
+                connection, self.schema, self.table, self.geometry_column
             )
             logger.debug(f"Layer statistics: {self.layer_stats.estimated_rows:,} rows estimated")
 
         # Initialize components
-        self.estimator = SelectivityEstimator(self.layer_stats)
+        if self.layer_stats is not None:
+            self.estimator = PostgresSelectivityEstimator(connection, self.layer_stats, spatial_statistics)
+        else:
+            self.estimator = SelectivityEstimator(self.layer_stats, spatial_statistics)
         self.plan_builder = FilterPlanBuilder(self.layer_stats, self.estimator)
         self.executor = MultiStepFilterExecutor(
             connection,
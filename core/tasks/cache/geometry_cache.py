@@ -18,6 +18,8 @@ from typing import Optional, List, Any
 
 # Import infrastructure cache
 from ....infrastructure.cache import SourceGeometryCache
+from ....infrastructure.cache.disk_geometry_cache import get_disk_geometry_cache
+from ....infrastructure.constants import DISK_GEOMETRY_CACHE_ENABLED
 from ....infrastructure.cache.cache_manager import (
     CacheManager,
     CacheConfig,
@@ -57,14 +59,16 @@ class GeometryCache:
         cache.invalidate_layer("layer_123")
     """
 
-    def __init__(self, max_size: int = 100):
+    def __init__(self, max_size: int = 100, persistent: bool = False):
         """
         Initialize geometry cache.
 
         Args:
             max_size: Maximum number of cached geometries (default: 100)
+            persistent: Back the cache with the on-disk geometry tier
         """
-        self._underlying_cache = SourceGeometryCache(max_size=max_size)
+        disk_cache = get_disk_geometry_cache() if persistent and DISK_GEOMETRY_CACHE_ENABLED else None
+        self._underlying_cache = SourceGeometryCache(max_size=max_size, disk_cache=disk_cache)
         self._max_size = max_size
 
         # Register in global CacheManager (only if not already registered)
@@ -75,7 +79,7 @@ class GeometryCache:
                 max_size=max_size,
                 ttl_seconds=None  # No TTL for geometries
             )
-            cache_manager.register_cache("geometry_task", cache_config)
+            cache_manager.register_cache("geometry_task", self._underlying_cache, cache_config)
             logger.debug(
                 f"GeometryCache initialized (max_size={max_size}) "
                 "and registered in CacheManager"
@@ -92,7 +96,9 @@ class GeometryCache:
         feature_ids: Optional[List[int]] = None,
         buffer_value: Optional[float] = None,
         target_crs_authid: Optional[str] = None,
-        subset_string: Optional[str] = None
+        subset_string: Optional[str] = None,
+        layer_source: Optional[str] = None,
+        source_fingerprint: Optional[str] = None
     ) -> Optional[Any]:
         """
         Get cached geometry for layer and context.
@@ -103,6 +109,8 @@ class GeometryCache:
             buffer_value: Optional buffer distance
             target_crs_authid: Optional target CRS
             subset_string: Optional active subset string
+            layer_source: Optional source URI (persistent tier key)
+            source_fingerprint: Optional source fingerprint (persistent tier validity)
 
         Returns:
             Cached geometry data or None if not found
@@ -118,7 +126,9 @@ class GeometryCache:
             buffer_value=buffer,
             target_crs_authid=crs,
             layer_id=layer_id,
-            subset_string=subset_string
+            subset_string=subset_string,
+            layer_source=layer_source,
+            source_fingerprint=source_fingerprint
         )
 
         if cached_data:
@@ -135,7 +145,9 @@ class GeometryCache:
         feature_ids: Optional[List[int]] = None,
         buffer_value: Optional[float] = None,
         target_crs_authid: Optional[str] = None,
-        subset_string: Optional[str] = None
+        subset_string: Optional[str] = None,
+        layer_source: Optional[str] = None,
+        source_fingerprint: Optional[str] = None
     ):
         """
         Store geometry in cache with context.
@@ -147,6 +159,8 @@ class GeometryCache:
             buffer_value: Optional buffer distance
             target_crs_authid: Optional target CRS
             subset_string: Optional active subset string
+            layer_source: Optional source URI (persistent tier key)
+            source_fingerprint: Optional source fingerprint (persistent tier validity)
         """
         features = feature_ids if feature_ids else []
         buffer = buffer_value if buffer_value is not None else 0.0
@@ -158,7 +172,9 @@ class GeometryCache:
             target_crs_authid=crs,
             geometry_data=geometry,
             layer_id=layer_id,
-            subset_string=subset_string
+            subset_string=subset_string,
+            layer_source=layer_source,
+            source_fingerprint=source_fingerprint
         )
 
         logger.debug(f"Cached geometry for layer {layer_id}")
@@ -211,7 +227,7 @@ class GeometryCache:
             Shared GeometryCache instance
         """
         if not hasattr(cls, '_shared_instance'):
-            cls._shared_instance = cls(max_size=100)
+            cls._shared_instance = cls(max_size=100, persistent=True)
             logger.debug("Created shared GeometryCache instance")
 
         return cls._shared_instance
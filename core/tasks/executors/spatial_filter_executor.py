@@ -38,6 +38,7 @@ from ....infrastructure.utils import (
 
 # Import geometry cache
 from ..cache.geometry_cache import GeometryCache
+from ....infrastructure.cache.disk_geometry_cache import layer_source_fingerprint
 
 logger = logging.getLogger('FilterMate.Tasks.SpatialFilterExecutor')
 
@@ -266,6 +267,8 @@ class SpatialFilterExecutor:
         # Build cache key components
         layer_id = self.source_layer.id() if self.source_layer else None
         subset_string = self.source_layer.subsetString() if self.source_layer else None
+        layer_source = self.source_layer.source() if self.source_layer else None
+        source_fingerprint = layer_source_fingerprint(self.source_layer) if self.source_layer else None
         target_crs = layer_info.get('crs_authid', 'EPSG:4326')
 
         # Try cache first (if enabled)
@@ -275,7 +278,9 @@ class SpatialFilterExecutor:
                 feature_ids=feature_ids,
                 buffer_value=buffer_value,
                 target_crs_authid=target_crs,
-                subset_string=subset_string
+                subset_string=subset_string,
+                layer_source=layer_source,
+                source_fingerprint=source_fingerprint
             )
             if cached_geom:
                 logger.debug(f"Using cached geometry for layer {layer_id}")
@@ -287,15 +292,17 @@ class SpatialFilterExecutor:
             if not executor:
                 return None, "No backend executor available"
 
-            # Prepare geometry via executor
-            result = executor.prepare_source_geometry(
+            # Prepare geometry via executor (executors return (geometry, error))
+            result, error = executor.prepare_source_geometry(
                 layer_info=layer_info,
                 feature_ids=feature_ids,
                 buffer_value=buffer_value,
                 use_centroids=use_centroids
             )
+            if error:
+                return None, error
 
-            # Cache the result (if enabled)
+            # Cache the geometry only (if enabled)
             if use_cache and layer_id and result:
                 self._geometry_cache.put(
                     layer_id=layer_id,
@@ -303,7 +310,9 @@ class SpatialFilterExecutor:
                     feature_ids=feature_ids,
                     buffer_value=buffer_value,
                     target_crs_authid=target_crs,
-                    subset_string=subset_string
+                    subset_string=subset_string,
+                    layer_source=layer_source,
+                    source_fingerprint=source_fingerprint
                 )
                 logger.debug(f"Cached geometry for layer {layer_id}")
 
@@ -463,7 +463,8 @@ class ExportHandler:
                     output_path=output_path,
                     format=export_format,
                     progress_callback=progress_callback,
-                    cancel_check=is_canceled
+                    cancel_check=is_canceled,
+                    target_crs=projection
                 )
 
                 if not result.get('success', False):
@@ -0,0 +1,393 @@
+"""
+Filter Batch Planner
+
+Groups the distant layers of a filter run by database connection so that
+work shared by every layer of a group happens once per group instead of
+once per layer.
+
+v4.2.0 - Cross-layer batching (October 2026)
+
+For each group (one PostgreSQL database, one GeoPackage/Spatialite file):
+    - The prepared source geometry is uploaded once, as bound WKB, on a
+      single pooled connection (see infrastructure.database.geometry_transport).
+      GeoPackage/Spatialite files only when GEOMETRY_TRANSPORT.local_files
+      is enabled.
+      Every layer of the group receives the reference in
+      ``layer_props['source_geometry_ref']`` (and its SRID in
+      ``'source_geometry_srid'``); the expression builders then skip their
+      own per-layer upload.
+    - Layers of a group are filtered consecutively, so per-connection state
+      (pooled connection, SQLite page cache) stays warm.
+    - Staging and filtering times are recorded per group and logged.
+
+Layers whose connection cannot be shared (shapefiles, memory layers, web
+services) form single-layer groups and are filtered exactly as before.
+
+Location: core/tasks/filter_batch_planner.py (Application Layer)
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ...infrastructure.logging import setup_logger
+from ...infrastructure.constants import PROVIDER_POSTGRES, PROVIDER_SPATIALITE
+from ...config.config import ENV_VARS
+
+logger = setup_logger(
+    'FilterMate.Tasks.FilterBatchPlanner',
+    os.path.join(ENV_VARS.get("PATH_ABSOLUTE_PROJECT", "."), 'logs', 'filtermate_tasks.log'),
+    level=logging.INFO
+)
+
+# key=value pairs of a QGIS data source URI (values optionally single-quoted)
+_URI_PARAM_PATTERN = re.compile(r"(\w+)=('(?:[^'\\]|\\.)*'|\S+)")
+
+# URI parameters identifying one PostgreSQL server connection
+_POSTGRES_CONNECTION_PARAMS = ('service', 'host', 'port', 'dbname', 'user')
+
+_SQLITE_EXTENSIONS = ('.gpkg', '.sqlite', '.db')
+
+
+def _uri_params(source: str) -> Dict[str, str]:
+    """Parse the key=value parameters of a data source URI."""
+    return {
+        key: value.strip("'")
+        for key, value in _URI_PARAM_PATTERN.findall(source or '')
+    }
+
+
+@dataclass
+class LayerBatchGroup:
+    """
+    Target layers sharing one database connection.
+
+    Attributes:
+        key: Connection identifier (database URI or file path)
+        provider_type: FilterMate provider type of the layers
+        layers: (layer, layer_props) tuples, in filtering order
+        source_geometry_ref: SQL reference to the uploaded source geometry
+        staging_ms: Time spent uploading the source geometry
+        filtering_ms: Cumulated filtering time of the group's layers
+        succeeded: Number of layers filtered successfully
+        failed: Number of layers that failed
+    """
+    key: str
+    provider_type: str
+    layers: List[Tuple[Any, Dict]] = field(default_factory=list)
+    source_geometry_ref: Optional[str] = None
+    staging_ms: float = 0.0
+    filtering_ms: float = 0.0
+    succeeded: int = 0
+    failed: int = 0
+
+    @property
+    def is_shared(self) -> bool:
+        """True if several layers share the group's connection."""
+        return len(self.layers) > 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Timing summary of the group."""
+        return {
+            'key': self.key,
+            'provider_type': self.provider_type,
+            'layer_count': len(self.layers),
+            'source_uploaded': self.source_geometry_ref is not None,
+            'staging_ms': round(self.staging_ms, 1),
+            'filtering_ms': round(self.filtering_ms, 1),
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+        }
+
+
+class FilterBatchPlanner:
+    """Plans and instruments a filter run grouped by database connection.
+
+    Usage:
+        planner = FilterBatchPlanner()
+        groups = planner.plan(layers)
+        planner.stage_source_geometry(groups, source_wkt, source_srid, temp_schema=temp_schema)
+        ordered = planner.ordered_layers(groups)
+        callback = planner.timed_filter_callback(groups, execute_geometric_filtering)
+        ...
+        planner.log_group_timings(groups)
+    """
+
+    def __init__(self, min_group_size: int = 2):
+        """
+        Args:
+            min_group_size: Minimum number of layers in a group before the
+                source geometry is staged for it
+        """
+        self.min_group_size = max(1, min_group_size)
+
+    # =========================================================================
+    # Planning
+    # =========================================================================
+
+    @staticmethod
+    def connection_key(layer, provider_type: str) -> Optional[str]:
+        """
+        Identify the database connection behind a layer.
+
+        Returns:
+            str: Connection key, or None if the layer cannot share a connection
+        """
+        try:
+            source = layer.source()
+        except (RuntimeError, AttributeError):
+            return None
+        if not isinstance(source, str):
+            return None
+
+        if provider_type == PROVIDER_POSTGRES:
+            params = _uri_params(source)
+            parts = [f"{name}={params[name]}" for name in _POSTGRES_CONNECTION_PARAMS if params.get(name)]
+            return f"postgresql:{' '.join(parts)}" if parts else None
+
+        if provider_type == PROVIDER_SPATIALITE:
+            path = _uri_params(source).get('dbname') or source.split('|')[0]
+        else:
+            path = source.split('|')[0]
+        if path.lower().endswith(_SQLITE_EXTENSIONS):
+            return f"sqlite:{os.path.normcase(os.path.abspath(path))}"
+        return None
+
+    def plan(self, layers: Dict[str, List]) -> List[LayerBatchGroup]:
+        """
+        Group layers by provider type and connection.
+
+        Groups keep the order in which their first layer appears, and layers
+        keep their relative order inside a group.
+
+        Args:
+            layers: Dict of (layer, layer_props) lists keyed by provider type
+
+        Returns:
+            List of LayerBatchGroup
+        """
+        groups: Dict[Tuple[str, str], LayerBatchGroup] = {}
+        for provider_type, layer_list in layers.items():
+            for layer, layer_props in layer_list:
+                key = self.connection_key(layer, provider_type)
+                if key is None:
+                    try:
+                        key = f"layer:{layer.id()}"
+                    except (RuntimeError, AttributeError):
+                        key = f"layer:{id(layer)}"
+                group = groups.get((provider_type, key))
+                if group is None:
+                    group = groups[(provider_type, key)] = LayerBatchGroup(key, provider_type)
+                group.layers.append((layer, layer_props))
+
+        planned = list(groups.values())
+        shared = [g for g in planned if g.is_shared]
+        logger.info(
+            f"Batch plan: {sum(len(g.layers) for g in planned)} layers in {len(planned)} group(s), "
+            f"{len(shared)} shared connection(s)"
+        )
+        return planned
+
+    @staticmethod
+    def ordered_layers(groups: List[LayerBatchGroup]) -> Dict[str, List]:
+        """
+        Rebuild the provider-keyed layers dict with each group's layers adjacent.
+
+        Returns:
+            Dict of (layer, layer_props) lists keyed by provider type
+        """
+        ordered: Dict[str, List] = {}
+        for group in groups:
+            ordered.setdefault(group.provider_type, []).extend(group.layers)
+        return ordered
+
+    # =========================================================================
+    # Source staging
+    # =========================================================================
+
+    def stage_source_geometry(
+        self,
+        groups: List[LayerBatchGroup],
+        source_wkt: Optional[str],
+        source_srid: Optional[int],
+        is_canceled: Optional[Callable[[], bool]] = None,
+        temp_schema: Optional[str] = None
+    ) -> int:
+        """
+        Upload the source geometry once per shared database group.
+
+        Failures are not fatal: layers of a group without a reference build
+        their expressions with inline WKT, as before.
+
+        Args:
+            groups: Planned groups
+            source_wkt: Prepared source geometry WKT
+            source_srid: SRID of the source geometry
+            is_canceled: Optional cancellation check
+            temp_schema: FilterMate temp schema receiving PostgreSQL uploads
+                (None: PostgreSQL groups are not staged)
+
+        Returns:
+            Number of groups whose source geometry was staged
+        """
+        # Never reuse a reference staged by a previous run
+        for group in groups:
+            group.source_geometry_ref = None
+            for _, layer_props in group.layers:
+                layer_props.pop('source_geometry_ref', None)
+                layer_props.pop('source_geometry_srid', None)
+
+        if not source_wkt or not source_srid:
+            return 0
+
+        try:
+            from ...infrastructure.constants import (
+                GEOMETRY_TRANSPORT_ENABLED,
+                GEOMETRY_TRANSPORT_MIN_WKT_LENGTH,
+            )
+            from ...infrastructure.database.geometry_transport import (
+                local_file_transport_enabled,
+                wkt_to_wkb,
+            )
+        except ImportError:
+            return 0
+
+        if not GEOMETRY_TRANSPORT_ENABLED or len(source_wkt) < GEOMETRY_TRANSPORT_MIN_WKT_LENGTH:
+            return 0
+
+        # GeoPackage/Spatialite files are only written to on opt-in
+        providers = [PROVIDER_POSTGRES] if temp_schema else []
+        if local_file_transport_enabled():
+            providers.append(PROVIDER_SPATIALITE)
+        candidates = [
+            g for g in groups
+            if len(g.layers) >= self.min_group_size and g.provider_type in providers
+        ]
+        if not candidates:
+            return 0
+
+        wkb = wkt_to_wkb(source_wkt)
+        if not wkb:
+            return 0
+        staged = 0
+        for group in candidates:
+            if is_canceled and is_canceled():
+                break
+            start = time.perf_counter()
+            if group.provider_type == PROVIDER_POSTGRES:
+                ref = self._stage_postgresql(group, wkb, int(source_srid), temp_schema)
+            else:
+                ref = self._stage_sqlite(group, wkb, int(source_srid))
+            group.staging_ms = (time.perf_counter() - start) * 1000.0
+
+            if ref:
+                group.source_geometry_ref = ref
+                for _, layer_props in group.layers:
+                    layer_props['source_geometry_ref'] = ref
+                    layer_props['source_geometry_srid'] = int(source_srid)
+                staged += 1
+        return staged
+
+    def _stage_postgresql(self, group: LayerBatchGroup, wkb: bytes, srid: int, schema: str) -> Optional[str]:
+        """Upload the source geometry into ``schema`` on one pooled connection of the group."""
+        try:
+            from ...infrastructure.database.connection_pool import pooled_connection_from_layer
+            from ...infrastructure.database.geometry_transport import (
+                postgresql_source_geometry_ref,
+                upload_source_geometry_postgresql,
+            )
+        except ImportError:
+            return None
+
+        layer, _ = group.layers[0]
+        try:
+            with pooled_connection_from_layer(layer) as (connexion, _):
+                if connexion is None:
+                    return None
+                geom_id = upload_source_geometry_postgresql(connexion, schema, wkb, srid)
+        except (RuntimeError, OSError, AttributeError) as e:
+            logger.warning(f"Batch staging failed for {group.key}: {e}")
+            return None
+        return postgresql_source_geometry_ref(schema, geom_id) if geom_id else None
+
+    def _stage_sqlite(self, group: LayerBatchGroup, wkb: bytes, srid: int) -> Optional[str]:
+        """Upload the source geometry into the group's database file."""
+        try:
+            from ...infrastructure.database.geometry_transport import (
+                sqlite_source_geometry_ref,
+                upload_source_geometry_sqlite,
+            )
+        except ImportError:
+            return None
+
+        db_path = group.key.split(':', 1)[1]
+        geom_id = upload_source_geometry_sqlite(db_path, wkb, srid)
+        return sqlite_source_geometry_ref(geom_id, srid) if geom_id else None
+
+    # =========================================================================
+    # Timing
+    # =========================================================================
+
+    @staticmethod
+    def timed_filter_callback(groups: List[LayerBatchGroup], callback: Callable) -> Callable:
+        """
+        Wrap a per-layer filter callback to record per-group timings.
+
+        The wrapper is thread-safe, so it can be used by the parallel executor.
+
+        Args:
+            groups: Planned groups
+            callback: Callable(provider_type, layer, layer_props) -> bool
+
+        Returns:
+            Callable with the same signature
+        """
+        group_by_props = {id(props): group for group in groups for _, props in group.layers}
+        lock = threading.Lock()
+
+        def timed(provider_type, layer, layer_props):
+            group = group_by_props.get(id(layer_props))
+            if group is None:
+                group = next(
+                    (g for g in groups for lyr, _ in g.layers if lyr is layer),
+                    None
+                )
+            start = time.perf_counter()
+            success = False
+            try:
+                success = callback(provider_type, layer, layer_props)
+                return success
+            finally:
+                if group is not None:
+                    elapsed = (time.perf_counter() - start) * 1000.0
+                    with lock:
+                        group.filtering_ms += elapsed
+                        if success:
+                            group.succeeded += 1
+                        else:
+                            group.failed += 1
+
+        return timed
+
+    @staticmethod
+    def log_group_timings(groups: List[LayerBatchGroup]) -> List[Dict[str, Any]]:
+        """
+        Log per-group timings.
+
+        Returns:
+            List of group timing summaries (see LayerBatchGroup.to_dict)
+        """
+        summaries = [group.to_dict() for group in groups]
+        for summary in summaries:
+            if summary['layer_count'] < 2 and not summary['source_uploaded']:
+                continue
+            logger.info(
+                f"  Batch group {summary['key']}: {summary['layer_count']} layer(s), "
+                f"staging {summary['staging_ms']:.0f}ms, filtering {summary['filtering_ms']:.0f}ms "
+                f"({summary['succeeded']} ok, {summary['failed']} failed)"
+            )
+        return summaries
@@ -70,7 +70,7 @@ POSTGRESQL_AVAILABLE = _pg_availability.postgresql_available
 # Import constants (migrated to infrastructure)
 from ...infrastructure.constants import (
     PROVIDER_POSTGRES, PROVIDER_SPATIALITE, PROVIDER_OGR,
-    QGIS_PROVIDER_POSTGRES,
+    QGIS_PROVIDER_POSTGRES, DISK_GEOMETRY_CACHE_ENABLED,
 )
 
 # Backend architecture (migrated to adapters.backends)
@@ -98,7 +98,7 @@ from ...infrastructure.utils import (
 )
 
 # Import from infrastructure (EPIC-1 migration)
-from ...infrastructure.cache import SourceGeometryCache
+from ...infrastructure.cache import SourceGeometryCache, get_disk_geometry_cache
 
 # Phase 3 C1: Import extracted handlers (February 2026)
 from .cleanup_handler import CleanupHandler
@@ -238,7 +238,9 @@ class FilterEngineTask(QgsTask):
             SourceGeometryCache: The shared geometry cache instance.
         """
         if cls._geometry_cache is None:
-            cls._geometry_cache = SourceGeometryCache()
+            # v4.2.0: persistent disk tier behind the shared cache
+            disk_cache = get_disk_geometry_cache() if DISK_GEOMETRY_CACHE_ENABLED else None
+            cls._geometry_cache = SourceGeometryCache(disk_cache=disk_cache)
         return cls._geometry_cache
 
     def __init__(
@@ -274,7 +276,8 @@ class FilterEngineTask(QgsTask):
         self.warning_messages = []
 
         # Phase E13: Initialize extracted helper classes
-        self.geom_cache = GeometryCache()
+        # v4.2.0: shared persistent cache so prepared geometries survive restarts
+        self.geom_cache = GeometryCache.get_shared_instance()
         self.expr_cache = ExpressionCache()
         self._attribute_executor = None  # Lazy init
         self._spatial_executor = None  # Lazy init
@@ -542,6 +545,15 @@ class FilterEngineTask(QgsTask):
 
         return self._filter_orchestrator
 
+    def _get_source_srid(self):
+        """SRID of the source layer CRS (None if unknown, 4326 if unparsable)."""
+        if hasattr(self, 'source_layer_crs_authid') and self.source_layer_crs_authid:
+            try:
+                return int(self.source_layer_crs_authid.split(':')[1])
+            except (ValueError, IndexError):
+                return 4326  # Default to WGS84
+        return None
+
     def _get_expression_builder(self):
         """
         Get or create ExpressionBuilder (lazy initialization).
@@ -555,12 +567,7 @@ class FilterEngineTask(QgsTask):
         """
         # Get source WKT and SRID from prepared Spatialite geometry
         source_wkt = getattr(self, 'spatialite_source_geom', None)
-        source_srid = None
-        if hasattr(self, 'source_layer_crs_authid') and self.source_layer_crs_authid:
-            try:
-                source_srid = int(self.source_layer_crs_authid.split(':')[1])
-            except (ValueError, IndexError):
-                source_srid = 4326  # Default to WGS84
+        source_srid = self._get_source_srid()
 
         # Get source feature count (priority: task_features > ogr_source_geom > source_layer)
         source_feature_count = None
@@ -1075,6 +1082,8 @@ class FilterEngineTask(QgsTask):
             self.session_id = task_params["session_id"]
             logger.debug(f"   session_id extracted: {self.session_id}")
 
+        self._configure_query_profiler()
+
         try:
             # PHASE 14.7: Delegate to TaskRunOrchestrator service
             from ..services.task_run_orchestrator import execute_task_run
@@ -1345,6 +1354,10 @@ class FilterEngineTask(QgsTask):
             is_canceled_callback=self.isCanceled,
             set_progress_callback=self.setProgress,
             set_description_callback=self.setDescription,
+            source_wkt=getattr(self, 'spatialite_source_geom', None),
+            source_srid=self._get_source_srid(),
+            ogr_job_factory=self._build_ogr_fid_job,
+            temp_schema=self.current_materialized_view_schema,
         )
         if result.get('message'):
             self.message = result['message']
@@ -1352,6 +1365,18 @@ class FilterEngineTask(QgsTask):
             self._failed_layer_names = result['failed_layer_names']
         return result.get('success', True)
 
+    def _build_ogr_fid_job(self, layer):
+        """Build the OGR process pool job of a distant layer. Delegates to ogr_executor."""
+        if not OGR_EXECUTOR_AVAILABLE or not hasattr(ogr_executor, 'build_ogr_fid_job'):
+            return None
+        # OR combination selects with an empty subset (see execute_ogr_spatial_selection)
+        attribute_filter = None
+        if self.has_combine_operator and self.param_other_layers_combine_operator == 'OR':
+            attribute_filter = ''
+        return ogr_executor.build_ogr_fid_job(
+            layer, self.ogr_source_geom, self.current_predicates, attribute_filter
+        )
+
     def _log_filtering_summary(self, successful_filters: int, failed_filters: int, failed_layer_names=None):
         """Log summary of filtering results. Delegates to FilteringOrchestrator."""
         self._filtering_orchestrator._log_filtering_summary(
@@ -1413,6 +1438,20 @@ class FilterEngineTask(QgsTask):
         """Get optimization thresholds. Delegates to GeometryHandler."""
         return self._geometry_handler.get_optimization_thresholds(getattr(self, 'task_parameters', None))
 
+    def _get_mv_cache_config(self):
+        """Get materialized view cache settings (v4.2.0)."""
+        from ..optimization.config_provider import get_mv_cache_config
+        return get_mv_cache_config(getattr(self, 'task_parameters', None))
+
+    def _configure_query_profiler(self):
+        """Apply the QUERY_PROFILER settings to the shared profiler (v4.2.0)."""
+        from ..optimization.config_provider import get_query_profiler_config
+        from ...infrastructure.database.query_profiler import get_query_profiler
+        try:
+            get_query_profiler().configure(**get_query_profiler_config(getattr(self, 'task_parameters', None)))
+        except Exception as e:  # profiling is optional, never fail the task for it
+            logger.debug(f"Query profiler not configured: {e}")
+
     def _get_simplification_config(self):
         """Get simplification config. Delegates to GeometryHandler."""
         return self._geometry_handler.get_simplification_config(getattr(self, 'task_parameters', None))
@@ -1710,6 +1749,10 @@ class FilterEngineTask(QgsTask):
         builder.spatialite_source_geom = self.spatialite_source_geom
         builder.ogr_source_geom = self.ogr_source_geom
         builder.source_layer_crs_authid = self.source_layer_crs_authid
+        # v4.2.0: Tiled EXISTS evaluation reports per tile and stops on cancel
+        builder.is_canceled_callback = self.isCanceled
+        builder.progress_handler = self._create_tile_progress_handler(layer_props)
+        builder.temp_schema = self.current_materialized_view_schema
 
         # Build expression
         expression = builder.build(backend, layer_props, source_geom)
@@ -1721,6 +1764,19 @@ class FilterEngineTask(QgsTask):
 
         return expression
 
+    def _create_tile_progress_handler(self, layer_props):
+        """ProgressHandler mapping tiled EXISTS progress to the task progress (v4.2.0)."""
+        from ...adapters.qgis.tasks.progress_handler import ProgressHandler, ProgressPhase
+        handler = ProgressHandler(
+            task_id=getattr(self, 'session_id', None),
+            on_progress=lambda event: event.total_steps and self.setProgress(event.percent),
+            phase_weights={ProgressPhase.EXECUTING_FILTER: 100},
+            log_progress=False
+        )
+        handler.start(layer_props.get('layer_name'))
+        handler.start_phase(ProgressPhase.EXECUTING_FILTER)
+        return handler
+
     def _build_backend_expression(self, backend, layer_props, source_geom):
         """
         Build filter expression using backend.
@@ -2369,7 +2425,8 @@ class FilterEngineTask(QgsTask):
                 current_mv_schema=self.current_materialized_view_schema,
                 project_uuid=self.project_uuid,
                 session_id=self.session_id,
-                param_buffer_expression=getattr(self, 'param_buffer_expression', None)
+                param_buffer_expression=getattr(self, 'param_buffer_expression', None),
+                mv_cache_config=self._get_mv_cache_config()
             )
 
         # Module not available - this should not happen in production
@@ -2473,7 +2530,7 @@ class FilterEngineTask(QgsTask):
         import sqlite3
         session_name = self._get_session_prefixed_name(name)
         try:
-            temp_conn = sqlite3.connect(self.db_file_path)
+            temp_conn = self._safe_spatialite_connect()
             temp_cur = temp_conn.cursor()
             # Try to drop both new (fm_temp_) and legacy (mv_) tables
             # nosec B608 - session_name from _get_session_prefixed_name()
@@ -2570,7 +2627,8 @@ class FilterEngineTask(QgsTask):
                 get_session_name_fn=self._get_session_prefixed_name,
                 create_simple_mv_fn=self._create_simple_materialized_view_sql,
                 project_uuid=self.project_uuid,
-                current_mv_schema=self.current_materialized_view_schema
+                current_mv_schema=self.current_materialized_view_schema,
+                mv_cache_config=self._get_mv_cache_config()
             )
         elif use_postgresql:
             # PostgreSQL but module not available
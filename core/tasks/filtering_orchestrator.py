@@ -14,6 +14,7 @@ Methods extracted:
     - execute_reseting(): Reset all layers to saved/original subset state
     - manage_distant_layers_geometric_filtering(): Orchestrate geometric filtering
     - _filter_all_layers_with_progress(): Dispatch to parallel or sequential mode
+      (layers grouped by connection with FilterBatchPlanner, v4.2.0)
     - _filter_all_layers_parallel(): Parallel layer filtering with ThreadPoolExecutor
     - _filter_all_layers_sequential(): Sequential layer filtering (original behavior)
     - _log_filtering_summary(): Log summary of filtering results
@@ -36,6 +37,7 @@ from ...infrastructure.logging import setup_logger
 from ...infrastructure.constants import PROVIDER_POSTGRES
 from ...infrastructure.utils import is_layer_valid
 from ...infrastructure.parallel import ParallelFilterExecutor, ParallelConfig
+from .filter_batch_planner import FilterBatchPlanner
 from ...config.config import ENV_VARS
 
 # Setup logger with rotation
@@ -594,6 +596,10 @@ class FilteringOrchestrator:
         is_canceled_callback: Callable,
         set_progress_callback: Callable,
         set_description_callback: Callable,
+        source_wkt: Optional[str] = None,
+        source_srid: Optional[int] = None,
+        ogr_job_factory: Optional[Callable] = None,
+        temp_schema: Optional[str] = None,
     ) -> dict:
         """Iterate through all layers and apply filtering with progress tracking.
 
@@ -601,6 +607,14 @@ class FilteringOrchestrator:
         Updates task description to show current layer being processed.
         Progress is visible in QGIS task manager panel.
 
+        v4.2.0: Layers are grouped by database connection (FilterBatchPlanner);
+        the source geometry is uploaded once per shared connection and
+        per-group timings are reported.
+
+        v4.2.0: With PARALLEL_FILTERING.ogr_process_pool enabled, OGR layer
+        selections are computed in worker processes (ogr_job_factory builds
+        the per-layer jobs) before the sequential pass applies them.
+
         Args:
             layers: Dict of layers organized by provider type.
             layers_count: Total number of layers.
@@ -610,12 +624,17 @@ class FilteringOrchestrator:
             is_canceled_callback: Callable returning True if task was canceled.
             set_progress_callback: Callable(int) to report progress percentage.
             set_description_callback: Callable(str) to update task description.
+            source_wkt: Prepared source geometry WKT, staged once per connection.
+            source_srid: SRID of source_wkt.
+            ogr_job_factory: Callable(layer) -> OgrFidJob or None for the OGR process pool.
+            temp_schema: FilterMate temp schema receiving staged PostgreSQL source geometries.
 
         Returns:
             dict with keys:
                 - success (bool): True if all layers processed successfully.
                 - message (str or None): Error message if any failures.
                 - failed_layer_names (list): Names of layers that failed.
+                - batch_groups (list): Per-connection timing summaries.
         """
         result = {
             'success': True,
@@ -663,26 +682,45 @@ class FilteringOrchestrator:
             logger.debug("V3 multi-step not applicable - using legacy code")
         # =================================================================
 
+        # v4.2.0: Group layers by connection and stage the source geometry once per group
+        options = task_parameters.get('config', {}).get('APP', {}).get('OPTIONS', {})
+        batch_config = options.get('BATCH_FILTERING', {})
+        batch_groups = []
+        if batch_config.get('enabled', {}).get('value', True):
+            planner = FilterBatchPlanner(min_group_size=batch_config.get('min_group_size', {}).get('value', 2))
+            batch_groups = planner.plan(layers)
+            staged = planner.stage_source_geometry(batch_groups, source_wkt, source_srid, is_canceled_callback, temp_schema=temp_schema)
+            if staged:
+                logger.info(f"  Source geometry staged once for {staged} shared connection(s)")
+            layers = planner.ordered_layers(batch_groups)
+            execute_geometric_filtering_callback = planner.timed_filter_callback(
+                batch_groups, execute_geometric_filtering_callback
+            )
+
         # Check if parallel filtering is enabled
         parallel_config = task_parameters.get('config', {}).get('APP', {}).get('OPTIONS', {}).get('PARALLEL_FILTERING', {})
         parallel_enabled = parallel_config.get('enabled', {}).get('value', True)
         min_layers_for_parallel = parallel_config.get('min_layers', {}).get('value', 2)
         max_workers = parallel_config.get('max_workers', {}).get('value', 0)
+        if not parallel_config.get('ogr_process_pool', {}).get('value', False):
+            ogr_job_factory = None
+        ogr_process_workers = parallel_config.get('ogr_process_workers', {}).get('value', 0)
 
         # Use parallel execution if enabled and enough layers
         if parallel_enabled and total_layers >= min_layers_for_parallel:
-            par_result = self._filter_all_layers_parallel(
+            filter_result = self._filter_all_layers_parallel(
                 layers=layers,
                 layers_count=layers_count,
                 max_workers=max_workers,
+                ogr_job_factory=ogr_job_factory,
+                ogr_process_workers=ogr_process_workers,
                 execute_geometric_filtering_callback=execute_geometric_filtering_callback,
                 is_canceled_callback=is_canceled_callback,
                 set_progress_callback=set_progress_callback,
                 set_description_callback=set_description_callback,
             )
-            return par_result
         else:
-            seq_result = self._filter_all_layers_sequential(
+            filter_result = self._filter_all_layers_sequential(
                 layers=layers,
                 layers_count=layers_count,
                 execute_geometric_filtering_callback=execute_geometric_filtering_callback,
@@ -690,7 +728,10 @@ class FilteringOrchestrator:
                 set_progress_callback=set_progress_callback,
                 set_description_callback=set_description_callback,
             )
-            return seq_result
+
+        if batch_groups:
+            filter_result['batch_groups'] = FilterBatchPlanner.log_group_timings(batch_groups)
+        return filter_result
 
     def _filter_all_layers_parallel(
         self,
@@ -701,6 +742,8 @@ class FilteringOrchestrator:
         is_canceled_callback: Callable,
         set_progress_callback: Callable,
         set_description_callback: Callable,
+        ogr_job_factory: Optional[Callable] = None,
+        ogr_process_workers: int = 0,
     ) -> dict:
         """Filter all layers using parallel execution.
 
@@ -712,6 +755,8 @@ class FilteringOrchestrator:
             is_canceled_callback: Callable returning True if task was canceled.
             set_progress_callback: Callable(int) to report progress percentage.
             set_description_callback: Callable(str) to update task description.
+            ogr_job_factory: Optional Callable(layer) -> OgrFidJob enabling the OGR process pool.
+            ogr_process_workers: Worker processes for the OGR process pool (0 = auto).
 
         Returns:
             dict with keys: success, message, failed_layer_names.
@@ -740,7 +785,7 @@ class FilteringOrchestrator:
             max_workers=max_workers if max_workers > 0 else None,
             min_layers_for_parallel=1  # Already checked threshold
         )
-        executor = ParallelFilterExecutor(config.max_workers)
+        executor = ParallelFilterExecutor(config.max_workers, ogr_process_workers=ogr_process_workers)
 
         # Execute parallel filtering with required task_parameters
         # Include filtering params for OGR detection (thread safety)
@@ -757,7 +802,8 @@ class FilteringOrchestrator:
             all_layers,
             execute_geometric_filtering_callback,
             task_parameters,
-            cancel_check=is_canceled_callback
+            cancel_check=is_canceled_callback,
+            ogr_job_factory=ogr_job_factory
         )
 
         # Process results and update progress
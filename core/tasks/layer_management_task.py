@@ -58,7 +58,18 @@ from ...infrastructure.utils import (
     detect_layer_provider_type,
     get_best_display_field
 )
-from ...infrastructure.database.sql_utils import sanitize_sql_identifier
+
+# v4.2.0: Bulk registration helpers (catalog probes, single-transaction inserts)
+from .layer_registration import (
+    RegistrationTimings,
+    ensure_postgresql_indexes,
+    fetch_geopackage_geometry_columns,
+    fetch_postgresql_catalog,
+    get_spatial_index_queue,
+    insert_property_rows,
+    run_probes,
+    select_layer_properties,
+)
 
 # Additional utilities from infrastructure
 try:
@@ -194,6 +205,14 @@ class LayersManagementEngineTask(QgsTask):
         # This avoids opening/closing connections for each layer during init
         self._postgresql_connection_cache = {}
 
+        # v4.2.0: Catalog facts prefetched once per connection/file for the
+        # layers being registered (layer_id -> TableCatalog / geometry column)
+        self._table_catalogs = {}
+        self._catalog_geometry_columns = {}
+
+        # v4.2.0: Per-phase durations of the last add_layers run
+        self.registration_timings = None
+
         # THREAD SAFETY (v2.3.10): Queue for layer variable operations
         # QgsExpressionContextUtils calls must happen in main thread (finished() method)
         # This queue stores: (layer_id, variable_key, value) tuples for setLayerVariable
@@ -330,19 +349,15 @@ class LayersManagementEngineTask(QgsTask):
             if self.isCanceled() or result is False:
                 return False
 
-        total = len(self.layers)
-        for i, layer in enumerate(self.layers):
-            if total > 0:
-                self.setProgress((i / total) * 100)
-            if self.task_action == 'add_layers':
-                if isinstance(layer, QgsVectorLayer):
-                    if layer.id() not in self.project_layers.keys():
-                        result = self.add_project_layer(layer)
-                        # FIX: Don't stop on False - just skip non-spatial layers
-                        # add_project_layer returns False for non-spatial layers, which is OK
-                        if self.isCanceled():
-                            return False
-            elif self.task_action == 'remove_layers':
+        if self.task_action == 'add_layers':
+            # v4.2.0: Register all layers phase by phase instead of one by one
+            if self.register_project_layers() is False:
+                return False
+        elif self.task_action == 'remove_layers':
+            total = len(self.layers)
+            for i, layer in enumerate(self.layers):
+                if total > 0:
+                    self.setProgress((i / total) * 100)
                 if isinstance(layer, QgsVectorLayer):
                     if layer.id() in self.project_layers.keys():
                         result = self.remove_project_layer(layer)
@@ -361,17 +376,231 @@ class LayersManagementEngineTask(QgsTask):
         logger.info(f"manage_project_layers completed successfully: {len(self.project_layers)} layers in project_layers")
         return True
 
-    def _load_existing_layer_properties(self, layer):
+    def register_project_layers(self):
+        """
+        Register all new layers of the task in bulk (v4.2.0).
+
+        Phases (durations logged and kept in ``registration_timings``):
+        - existing: stored properties of every layer, one SELECT
+        - catalog: metadata probes, one per PostgreSQL connection or
+          GeoPackage file, run in parallel
+        - properties: PK detection and property building per layer (reads
+          the prefetched catalog instead of querying the database)
+        - persist: one Spatialite transaction for all property rows
+        - index_queue: PostgreSQL index setup queued to the background worker
+
+        Returns:
+            bool: False if canceled, True otherwise
+        """
+        timings = RegistrationTimings()
+        layers = []
+        for layer in self.layers:
+            if not isinstance(layer, QgsVectorLayer) or layer.id() in self.project_layers:
+                continue
+            if not layer.isSpatial():
+                logger.debug(f"register_project_layers: Skipping non-spatial layer '{layer.name()}'")
+                continue
+            layers.append(layer)
+
+        with timings.phase('existing'):
+            existing_properties = self.select_project_properties_from_spatialite([layer.id() for layer in layers])
+
+        with timings.phase('catalog'):
+            self._probe_layer_catalogs([layer for layer in layers if layer.id() not in existing_properties])
+
+        registered = []
+        with timings.phase('properties'):
+            total = len(layers)
+            for i, layer in enumerate(layers):
+                self.setProgress((i / total) * 100)
+                layer_props = self._prepare_project_layer(layer, existing_properties.get(layer.id(), []))
+                if self.isCanceled():
+                    return False
+                if layer_props:
+                    registered.append((layer, layer_props))
+
+        with timings.phase('persist'):
+            self.insert_layers_properties_to_spatialite(
+                [(layer.id(), layer_props) for layer, layer_props in registered]
+            )
+
+        with timings.phase('index_queue'):
+            queued = 0
+            for layer, layer_props in registered:
+                if self._queue_spatial_index(layer, layer_props):
+                    queued += 1
+                self.project_layers[layer.id()] = layer_props
+
+        self.registration_timings = timings
+        self.outputs['registration_timings'] = timings.as_dict()
+        logger.info(
+            f"Registered {len(registered)} layer(s) in {timings.total_ms:.0f} ms "
+            f"({timings.summary()}); {queued} spatial index job(s) queued"
+        )
+        return True
+
+    def _probe_layer_catalogs(self, layers):
+        """
+        Prefetch database metadata for layers being registered (v4.2.0).
+
+        Layers are grouped by PostgreSQL connection and by GeoPackage file;
+        each group is probed with a single query, groups in parallel. QGIS
+        objects are only read here, on the task thread; the probes themselves
+        only use database connections.
+
+        Fills ``_table_catalogs`` (PostgreSQL) and ``_catalog_geometry_columns``.
+        Layers of a failed probe are detected per layer as before.
+
+        Args:
+            layers (list): QgsVectorLayer objects without stored properties
+        """
+        from qgis.core import QgsDataSourceUri
+
+        use_postgresql = (
+            POSTGRESQL_AVAILABLE and PSYCOPG2_AVAILABLE
+            and CONNECTION_POOL_AVAILABLE and get_pool_manager is not None
+        )
+        postgresql_groups = {}
+        geopackage_groups = {}
+
+        for layer in layers:
+            try:
+                layer_provider_type = detect_layer_provider_type(layer)
+                if layer_provider_type == PROVIDER_POSTGRES and use_postgresql:
+                    uri = QgsDataSourceUri(layer.source())
+                    if not uri.table():
+                        continue
+                    cache_key = f"{uri.host()}:{uri.port()}:{uri.database()}"
+                    _, tables = postgresql_groups.setdefault(cache_key, (uri, {}))
+                    tables.setdefault((uri.schema() or 'public', uri.table()), []).append(layer.id())
+                elif layer_provider_type in (PROVIDER_SPATIALITE, PROVIDER_OGR):
+                    source = layer.source()
+                    source_path = source.split('|')[0]
+                    if not source_path.lower().endswith('.gpkg') or not os.path.isfile(source_path):
+                        continue
+                    table_name = QgsDataSourceUri(layer.dataProvider().dataSourceUri()).table()
+                    if not table_name:
+                        for part in source.split('|'):
+                            if part.startswith('layername='):
+                                table_name = part.split('=')[1]
+                                break
+                    if table_name:
+                        geopackage_groups.setdefault(source_path, []).append((layer.id(), table_name))
+            except (RuntimeError, AttributeError) as e:
+                logger.debug(f"Skipping catalog probe for layer {layer.id()}: {e}")
+
+        probes = {}
+        for cache_key, (uri, tables) in postgresql_groups.items():
+            probes[(PROVIDER_POSTGRES, cache_key)] = (
+                lambda uri=uri, tables=list(tables): self._probe_postgresql_catalog(uri, tables)
+            )
+        for source_path in geopackage_groups:
+            probes[(PROVIDER_OGR, source_path)] = (
+                lambda source_path=source_path: self._probe_geopackage(source_path)
+            )
+
+        results = run_probes(probes)
+
+        for cache_key, (uri, tables) in postgresql_groups.items():
+            catalogs = results.get((PROVIDER_POSTGRES, cache_key))
+            if catalogs is None:
+                continue
+            # The probe connected with psycopg2: no per-layer connection test needed
+            self._postgresql_connection_cache[cache_key] = True
+            for table_key, layer_ids in tables.items():
+                catalog = catalogs.get(table_key)
+                if catalog is None:
+                    continue
+                for layer_id in layer_ids:
+                    self._table_catalogs[layer_id] = catalog
+                    if catalog.geometry_columns:
+                        self._catalog_geometry_columns[layer_id] = catalog.geometry_columns[0]
+
+        for source_path, layer_tables in geopackage_groups.items():
+            geometry_columns = results.get((PROVIDER_OGR, source_path))
+            if not geometry_columns:
+                continue
+            for layer_id, table_name in layer_tables:
+                column = geometry_columns.get(table_name.lower())
+                if column:
+                    self._catalog_geometry_columns[layer_id] = column
+
+        logger.debug(
+            f"Catalog probes: {len(postgresql_groups)} PostgreSQL connection(s), "
+            f"{len(geopackage_groups)} GeoPackage file(s), "
+            f"{sum(1 for result in results.values() if result is None)} failed"
+        )
+
+    def _probe_postgresql_catalog(self, uri, tables):
+        """Read the catalog of ``tables`` on one pooled connection (probe thread)."""
+        with get_pool_manager().connection_from_uri(uri) as connexion:
+            return fetch_postgresql_catalog(connexion, tables)
+
+    def _probe_geopackage(self, source_path):
+        """Read gpkg_geometry_columns of one GeoPackage (probe thread)."""
+        from ...infrastructure.database.connection_pool import get_spatialite_pool_manager
+        with get_spatialite_pool_manager().connection(source_path, load_spatialite=False) as conn:
+            return fetch_geopackage_geometry_columns(conn)
+
+    def _queue_spatial_index(self, layer, layer_props):
+        """
+        Queue PostgreSQL index setup for a newly registered layer (v4.2.0).
+
+        Index creation runs on the background SpatialIndexQueue, never on the
+        project-open path. It is only queued when the prefetched catalog shows
+        a missing spatial or primary key index or missing statistics. Other
+        layers keep ``spatial_index_pending`` for on-demand indexing during
+        filtering (GeoPackage layers often already have an R-tree;
+        processing.run is very slow on large layers).
+
+        Args:
+            layer (QgsVectorLayer): Registered layer
+            layer_props (dict): Its properties; ``infos`` is updated
+
+        Returns:
+            bool: True if a job was queued
+        """
+        infos = layer_props["infos"]
+        catalog = self._table_catalogs.get(layer.id())
+        if catalog is None or not infos.get("psycopg2_connection_available"):
+            infos["spatial_index_pending"] = True
+            return False
+
+        geometry_field = infos.get("layer_geometry_field")
+        primary_key_name = infos.get("primary_key_name")
+        if not catalog.needs_index_setup(geometry_field, primary_key_name):
+            infos["spatial_index_pending"] = False
+            return False
+
+        from qgis.core import QgsDataSourceUri
+        uri = QgsDataSourceUri(layer.source())
+        layer_name = layer.name()
+
+        def create_indexes():
+            with get_pool_manager().connection_from_uri(uri) as connexion:
+                return ensure_postgresql_indexes(
+                    connexion, catalog.schema, catalog.table, geometry_field,
+                    primary_key_name, layer_name, catalog=catalog
+                )
+
+        key = (uri.host(), uri.port(), uri.database(), catalog.schema, catalog.table)
+        infos["spatial_index_pending"] = True
+        return get_spatial_index_queue().submit(key, create_indexes)
+
+    def _load_existing_layer_properties(self, layer, spatialite_results=None):
         """
         Load existing layer properties from Spatialite database.
 
         Args:
             layer (QgsVectorLayer): Layer to load properties for
+            spatialite_results (list): Already selected (meta_type, meta_key,
+                meta_value) rows; selected from the database when None
 
         Returns:
             dict: Dictionary with 'infos', 'exploring', 'filtering' keys, or empty dict if not found
         """
-        spatialite_results = self.select_properties_from_spatialite(layer.id())
+        if spatialite_results is None:
+            spatialite_results = self.select_properties_from_spatialite(layer.id())
         expected_count = self.CONFIG_DATA["CURRENT_PROJECT"]["OPTIONS"]["LAYERS"]["LAYER_PROPERTIES_COUNT"]
 
         if not spatialite_results:
@@ -592,8 +821,8 @@ class LayersManagementEngineTask(QgsTask):
                 if geom_col:
                     geometry_field = geom_col
                 else:
-                    # Fallback to default
-                    geometry_field = 'geom'
+                    # v4.2.0: Prefetched catalog, then default
+                    geometry_field = self._catalog_geometry_columns.get(layer.id(), 'geom')
 
                 logger.debug(f"PostgreSQL layer metadata: schema={source_schema}, geometry_field={geometry_field}")
 
@@ -622,6 +851,10 @@ class LayersManagementEngineTask(QgsTask):
             except (RuntimeError, AttributeError):
                 pass
 
+            # METHOD 1a (v4.2.0): gpkg_geometry_columns prefetched for the whole file
+            if not detected_geom_field:
+                detected_geom_field = self._catalog_geometry_columns.get(layer.id())
+
             # METHOD 1: Query GeoPackage metadata (for .gpkg files)
             if not detected_geom_field:
                 try:
@@ -901,6 +1134,8 @@ class LayersManagementEngineTask(QgsTask):
         """
         Add a spatial layer to the project with all necessary metadata and indexes.
 
+        Single-layer variant of register_project_layers().
+
         Args:
             layer (QgsVectorLayer): Layer to add
 
@@ -913,8 +1148,37 @@ class LayersManagementEngineTask(QgsTask):
             logger.debug(f"add_project_layer: Skipping non-spatial layer '{layer_name}'")
             return False
 
+        layer_props = self._prepare_project_layer(layer)
+        if not layer_props:
+            return False
+
+        # Save to database
+        self.insert_properties_to_spatialite(layer.id(), layer_props)
+
+        # Mark spatial index as pending — will be created on-demand during filtering
+        # (GeoPackage layers often already have rtree; processing.run is very slow on large layers)
+        layer_props["infos"]["spatial_index_pending"] = True
+
+        # Add to project layers dictionary
+        self.project_layers[layer.id()] = layer_props
+
+        return True
+
+    def _prepare_project_layer(self, layer, spatialite_results=None):
+        """
+        Load or build the properties of a spatial layer being added.
+
+        Args:
+            layer (QgsVectorLayer): Spatial layer to add
+            spatialite_results (list): Stored property rows of the layer, or
+                None to select them from the database
+
+        Returns:
+            dict: Layer properties ('infos', 'exploring', 'filtering'), or
+            False if canceled or no primary key could be determined
+        """
         # Try to load existing properties from database
-        layer_variables = self._load_existing_layer_properties(layer)
+        layer_variables = self._load_existing_layer_properties(layer, spatialite_results)
 
         if layer_variables:
             # CRITICAL: Validate PostgreSQL layers don't have virtual_id (legacy bug)
@@ -979,17 +1243,7 @@ class LayersManagementEngineTask(QgsTask):
         }
         layer_props["infos"]["layer_id"] = layer.id()
 
-        # Save to database
-        self.insert_properties_to_spatialite(layer.id(), layer_props)
-
-        # Mark spatial index as pending — will be created on-demand during filtering
-        # (GeoPackage layers often already have rtree; processing.run is very slow on large layers)
-        layer_props["infos"]["spatial_index_pending"] = True
-
-        # Add to project layers dictionary
-        self.project_layers[layer.id()] = layer_props
-
-        return True
+        return layer_props
 
     def remove_project_layer(self, layer):
         """
@@ -1116,12 +1370,10 @@ class LayersManagementEngineTask(QgsTask):
         """
         layer_provider = layer.providerType()
 
-        # Skip expensive featureCount() for non-PostgreSQL providers
-        # (GeoPackage iterates all features internally — very slow on 100k+ rows)
-        if layer_provider == 'postgres':
-            feature_count = layer.featureCount()
-        else:
-            feature_count = -1  # Unknown — will trust PK attributes
+        # Skip expensive featureCount(): GeoPackage iterates all features internally
+        # (very slow on 100k+ rows) and PostgreSQL may run a count(*) per table.
+        # v4.2.0: The declared primary key is trusted either way.
+        feature_count = -1  # Unknown — will trust PK attributes
 
         # CRITICAL FIX: For PostgreSQL layers, ALWAYS trust declared primary key
         # without checking uniqueness to avoid freeze on large tables.
@@ -1157,6 +1409,15 @@ class LayersManagementEngineTask(QgsTask):
                 logger.debug(f"Trusting declared primary key '{field.name()}' (avoiding thread-unsafe uniqueValues)")
                 return (field.name(), field_id, field.typeName(), field.isNumeric())
 
+        # v4.2.0: Single-column PRIMARY KEY from the prefetched PostgreSQL catalog
+        catalog = self._table_catalogs.get(layer.id())
+        if catalog is not None and len(catalog.primary_key) == 1:
+            field_idx = layer.fields().indexFromName(catalog.primary_key[0])
+            if field_idx >= 0:
+                field = layer.fields()[field_idx]
+                logger.debug(f"Layer '{layer.name()}': using catalog primary key '{field.name()}'")
+                return (field.name(), field_idx, field.typeName(), field.isNumeric())
+
         # No declared primary key - use improved detection for OGR layers
         logger.debug(f"Layer '{layer.name()}': No declared PRIMARY KEY, searching for suitable ID field")
         logger.debug(f"Available fields: {[f.name() for f in layer.fields()]}")
@@ -1302,6 +1563,9 @@ class LayersManagementEngineTask(QgsTask):
         """
         Internal method to create PostgreSQL indexes.
 
+        Delegates to layer_registration.ensure_postgresql_indexes() (v4.2.0),
+        shared with the background spatial index queue.
+
         Args:
             connexion: Active PostgreSQL connection
             schema: Schema name
@@ -1313,77 +1577,7 @@ class LayersManagementEngineTask(QgsTask):
         Returns:
             bool: True if successful
         """
-        try:
-            # Sanitize all identifiers from QGIS URI metadata
-            safe_schema = sanitize_sql_identifier(schema)
-            safe_table = sanitize_sql_identifier(table)
-            safe_geom = sanitize_sql_identifier(geometry_field)
-            safe_pk = sanitize_sql_identifier(primary_key_name)
-
-            with connexion.cursor() as cursor:
-                # PERFORMANCE: Check if GIST index already exists before creating
-                gist_index_name = sanitize_sql_identifier(f"{schema}_{table}_{geometry_field}_idx")
-                cursor.execute("""
-                    SELECT 1 FROM pg_indexes
-                    WHERE schemaname = %s AND tablename = %s AND indexname = %s
-                """, (schema, table, gist_index_name))
-                gist_exists = cursor.fetchone() is not None
-
-                if not gist_exists:
-                    logger.debug(f"Creating GIST spatial index on {safe_schema}.{safe_table}.{safe_geom}")
-                    cursor.execute(
-                        f'CREATE INDEX {gist_index_name} '
-                        f'ON "{safe_schema}"."{safe_table}" USING GIST ("{safe_geom}");'
-                    )
-                else:
-                    logger.debug(f"GIST index {gist_index_name} already exists, skipping")
-
-                # PERFORMANCE: Check if primary key index already exists
-                # Note: PostgreSQL auto-creates index for PRIMARY KEY, but not for manual 'id' fields
-                pk_index_name = sanitize_sql_identifier(f"{schema}_{table}_{primary_key_name}_idx")
-                cursor.execute("""
-                    SELECT 1 FROM pg_indexes
-                    WHERE schemaname = %s AND tablename = %s AND indexname = %s
-                """, (schema, table, pk_index_name))
-                pk_exists = cursor.fetchone() is not None
-
-                if not pk_exists and primary_key_name != 'ctid':
-                    logger.debug(f"Creating unique index on {safe_schema}.{safe_table}.{safe_pk}")
-                    try:
-                        cursor.execute(
-                            f'CREATE UNIQUE INDEX {pk_index_name} '
-                            f'ON "{safe_schema}"."{safe_table}" ("{safe_pk}");'
-                        )
-                    except (RuntimeError, OSError) as e:
-                        # May fail if column has duplicates - not critical
-                        logger.debug(f"Could not create unique index on {safe_pk}: {e}")
-                else:
-                    logger.debug(f"PK index for {safe_pk} already exists or not needed, skipping")
-
-                # PERFORMANCE: Skip CLUSTER at init - it's very slow on large tables
-                # CLUSTER will be done lazily during first filter if beneficial
-                # (Removed: ALTER TABLE ... CLUSTER ON ...)
-
-                # PERFORMANCE: Only ANALYZE if table has no statistics
-                cursor.execute("""
-                    SELECT 1 FROM pg_statistic s
-                    JOIN pg_class c ON s.starelid = c.oid
-                    JOIN pg_namespace n ON c.relnamespace = n.oid
-                    WHERE n.nspname = %s AND c.relname = %s
-                    LIMIT 1
-                """, (schema, table))
-                has_stats = cursor.fetchone() is not None
-
-                if not has_stats:
-                    logger.debug(f"Running ANALYZE on {safe_schema}.{safe_table} (no statistics found)")
-                    cursor.execute(f'ANALYZE "{safe_schema}"."{safe_table}";')
-                else:
-                    logger.debug(f"Table {safe_schema}.{safe_table} already has statistics, skipping ANALYZE")
-
-            connexion.commit()
-            logger.info(f"PostgreSQL layer {layer_name}: spatial index setup completed")
-        except (RuntimeError, OSError, AttributeError) as e:
-            logger.warning(f"Error creating spatial index for PostgreSQL layer {layer_name}: {e}")
+        if not ensure_postgresql_indexes(connexion, schema, table, geometry_field, primary_key_name, layer_name):
             return False
 
         if self.isCanceled():
@@ -1662,6 +1856,46 @@ class LayersManagementEngineTask(QgsTask):
             operation_name=f"select properties for layer {layer_id}"
         )
 
+    def select_project_properties_from_spatialite(self, layer_ids):
+        """
+        Select the stored properties of many layers with one query (v4.2.0).
+
+        Args:
+            layer_ids (list): Layer IDs to select properties for
+
+        Returns:
+            dict: layer_id -> list of (meta_type, meta_key, meta_value) tuples,
+            only for layers with stored properties
+        """
+        def do_select():
+            with self._safe_spatialite_connect() as conn:
+                return select_layer_properties(conn, self.project_uuid, layer_ids)
+
+        results = sqlite_execute_with_retry(
+            do_select,
+            operation_name=f"select properties for {len(layer_ids)} layers"
+        )
+        logger.debug(f"📖 Loaded stored properties of {len(results)}/{len(layer_ids)} layers")
+        return results
+
+    def _property_rows(self, layer_id, layer_props):
+        """
+        Yield (layer_id, meta_type, meta_key, meta_value) rows for a layer.
+
+        Values are serialized as stored in fm_project_layers_properties.
+        """
+        for key_group in layer_props:
+            for key in layer_props[key_group]:
+                value_typped, type_returned = self.return_typped_value(layer_props[key_group][key], 'save')
+                if type_returned in (list, dict):
+                    value_typped = json.dumps(value_typped)
+                yield (
+                    layer_id,
+                    key_group,
+                    key,
+                    value_typped.replace("\'", "\'\'") if type_returned in (str, dict, list) else value_typped
+                )
+
     def insert_properties_to_spatialite(self, layer_id, layer_props):
         """
         Insert layer properties into Spatialite database.
@@ -1672,43 +1906,37 @@ class LayersManagementEngineTask(QgsTask):
             layer_id (str): Layer ID
             layer_props (dict): Dictionary of layer properties to insert
         """
+        self.insert_layers_properties_to_spatialite([(layer_id, layer_props)])
+
+    def insert_layers_properties_to_spatialite(self, layers_props):
+        """
+        Insert the properties of many layers in one transaction (v4.2.0).
+
+        Uses retry logic to handle database lock contention from concurrent access.
+
+        Args:
+            layers_props (list): (layer_id, layer_props) tuples
+        """
+        if not layers_props:
+            return
+
+        rows = [
+            row
+            for layer_id, layer_props in layers_props
+            for row in self._property_rows(layer_id, layer_props)
+        ]
+
         def do_insert():
             with self._safe_spatialite_connect() as conn:
                 try:
-                    # Begin explicit transaction for better lock management
-                    conn.execute('BEGIN IMMEDIATE')
-                    cur = conn.cursor()
-                    for key_group in layer_props:
-                        for key in layer_props[key_group]:
-                            value_typped, type_returned = self.return_typped_value(layer_props[key_group][key], 'save')
-                            if type_returned in (list, dict):
-                                value_typped = json.dumps(value_typped)
-                            cur.execute(
-                                """INSERT INTO fm_project_layers_properties
-                                   VALUES(?, datetime(), ?, ?, ?, ?, ?)""",
-                                (
-                                    str(uuid.uuid4()),
-                                    str(self.project_uuid),
-                                    layer_id,
-                                    key_group,
-                                    key,
-                                    value_typped.replace("\'", "\'\'") if type_returned in (str, dict, list) else value_typped
-                                )
-                            )
-                    conn.commit()
-                    cur.close()
-                    return True
+                    return insert_property_rows(conn, self.project_uuid, rows)
                 except (sqlite3.Error, OSError, ValueError) as e:
                     logger.debug(f"Error inserting properties to Spatialite: {e}")
-                    try:
-                        conn.rollback()
-                    except (sqlite3.Error, OSError):
-                        pass
                     raise
 
         sqlite_execute_with_retry(
             do_insert,
-            operation_name=f"insert properties for layer {layer_id}"
+            operation_name=f"insert properties for {len(layers_props)} layer(s)"
         )
 
     def can_cast(self, dest_type, source_value):
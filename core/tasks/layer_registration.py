@@ -0,0 +1,528 @@
+"""
+Layer Registration
+
+Bulk helpers for LayersManagementEngineTask when a project is opened.
+
+v4.2.0 - Batched layer registration (October 2026)
+
+Registering layers one at a time opened two Spatialite connections per
+layer (property lookup, then an insert transaction) and probed each
+layer's database separately. With hundreds of layers that adds up to
+minutes. The task now works phase by phase over every layer:
+
+    - existing properties: one SELECT for the whole project
+    - catalog: one query per PostgreSQL connection returns the primary key,
+      indexed columns and geometry columns of all tables at once. One query
+      per GeoPackage file reads gpkg_geometry_columns. Probes for different
+      connections run in parallel (run_probes)
+    - persistence: every property row is written in one Spatialite
+      transaction (insert_property_rows)
+    - indexes: GIST/primary-key index setup goes to a background worker
+      (SpatialIndexQueue) and is skipped when the catalog shows it is
+      already done
+
+RegistrationTimings records how long each phase takes, for the
+project-open log line.
+
+Everything here works on database connections and plain values. Nothing
+touches QGIS objects, so the probes can run off the task thread.
+
+Location: core/tasks/layer_registration.py (Application Layer)
+"""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from ...infrastructure.logging import setup_logger
+from ...infrastructure.database.sql_utils import sanitize_sql_identifier
+from ...config.config import ENV_VARS
+
+logger = setup_logger(
+    'FilterMate.Tasks.LayerRegistration',
+    os.path.join(ENV_VARS.get("PATH_ABSOLUTE_PROJECT", "."), 'logs', 'filtermate_tasks.log'),
+    level=logging.INFO
+)
+
+# Concurrent catalog probes (one per database connection or file)
+PROBE_MAX_WORKERS = 4
+
+# Seconds the index worker waits for new jobs before its thread exits
+INDEX_QUEUE_IDLE_TIMEOUT = 30.0
+
+# Relation kinds that accept indexes: table, materialized view, partitioned table
+INDEXABLE_RELKINDS = ('r', 'm', 'p')
+
+# Index access methods that serve spatial predicates
+SPATIAL_INDEX_METHODS = ('gist', 'spgist', 'brin')
+
+# Primary key, geometry columns, leading index columns and analyze state of
+# a list of tables, in one round trip. Parameters: schema names, table names.
+POSTGRESQL_CATALOG_SQL = """
+    WITH wanted AS (
+        SELECT * FROM unnest(%s::text[], %s::text[]) AS w(schema_name, table_name)
+    )
+    SELECT n.nspname, c.relname, c.relkind,
+        ARRAY(
+            SELECT a.attname
+            FROM pg_index i
+            CROSS JOIN LATERAL unnest(i.indkey) WITH ORDINALITY AS k(attnum, position)
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+            WHERE i.indrelid = c.oid AND i.indisprimary
+            ORDER BY k.position
+        ) AS primary_key,
+        ARRAY(
+            SELECT a.attname
+            FROM pg_attribute a
+            JOIN pg_type t ON t.oid = a.atttypid
+            WHERE a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+              AND t.typname IN ('geometry', 'geography')
+            ORDER BY a.attnum
+        ) AS geometry_columns,
+        ARRAY(
+            SELECT am.amname || ':' || a.attname
+            FROM pg_index i
+            JOIN pg_class ic ON ic.oid = i.indexrelid
+            JOIN pg_am am ON am.oid = ic.relam
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+            WHERE i.indrelid = c.oid
+        ) AS indexes,
+        EXISTS (
+            SELECT 1 FROM pg_stats s
+            WHERE s.schemaname = n.nspname AND s.tablename = c.relname
+        ) AS analyzed
+    FROM wanted w
+    JOIN pg_namespace n ON n.nspname = w.schema_name
+    JOIN pg_class c ON c.relnamespace = n.oid AND c.relname = w.table_name
+"""
+
+_SELECT_PROPERTIES_SQL = (
+    "SELECT layer_id, meta_type, meta_key, meta_value FROM fm_project_layers_properties "
+    "WHERE fk_project = ?"
+)
+
+_INSERT_PROPERTY_SQL = (
+    "INSERT INTO fm_project_layers_properties VALUES(?, datetime(), ?, ?, ?, ?, ?)"
+)
+
+
+class RegistrationTimings:
+    """
+    Wall-clock duration of each registration phase, in milliseconds.
+
+    Usage:
+        timings = RegistrationTimings()
+        with timings.phase('catalog'):
+            ...
+        logger.info(timings.summary())
+    """
+
+    def __init__(self):
+        self._phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block and add it to phase ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000.0
+            self._phases[name] = self._phases.get(name, 0.0) + elapsed
+
+    @property
+    def total_ms(self) -> float:
+        return sum(self._phases.values())
+
+    def as_dict(self) -> Dict[str, float]:
+        """Phase durations in run order, rounded to 0.1 ms."""
+        return {name: round(ms, 1) for name, ms in self._phases.items()}
+
+    def summary(self) -> str:
+        return ", ".join(f"{name} {ms:.0f} ms" for name, ms in self._phases.items())
+
+
+@dataclass
+class TableCatalog:
+    """
+    Catalog facts about one PostgreSQL table.
+
+    Attributes:
+        schema: Schema name
+        table: Table name
+        relkind: pg_class.relkind ('r' table, 'v' view, 'm' materialized view...)
+        primary_key: Primary key columns, in key order (empty if none)
+        geometry_columns: geometry/geography columns, in column order
+        indexes: (access method, leading column) of every index
+        analyzed: Whether the planner has statistics for the table
+    """
+    schema: str
+    table: str
+    relkind: str = 'r'
+    primary_key: List[str] = field(default_factory=list)
+    geometry_columns: List[str] = field(default_factory=list)
+    indexes: List[Tuple[str, str]] = field(default_factory=list)
+    analyzed: bool = False
+
+    def has_index(self, column: str) -> bool:
+        return any(indexed == column for _, indexed in self.indexes)
+
+    def has_spatial_index(self, column: str) -> bool:
+        return any(
+            indexed == column and method in SPATIAL_INDEX_METHODS
+            for method, indexed in self.indexes
+        )
+
+    def needs_index_setup(self, geometry_field: str, primary_key_name: Optional[str]) -> bool:
+        """
+        Whether ensure_postgresql_indexes() would change anything.
+
+        Views and foreign tables cannot be indexed and never need it.
+        """
+        if self.relkind not in INDEXABLE_RELKINDS:
+            return False
+        if geometry_field in self.geometry_columns and not self.has_spatial_index(geometry_field):
+            return True
+        if primary_key_name and primary_key_name != 'ctid' and not self.has_index(primary_key_name):
+            return True
+        return not self.analyzed
+
+
+def fetch_postgresql_catalog(connexion, tables: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], TableCatalog]:
+    """
+    Read the catalog of many tables of one database in a single query.
+
+    Args:
+        connexion: psycopg2 connection
+        tables: (schema, table) pairs
+
+    Returns:
+        dict: (schema, table) -> TableCatalog, for the tables that exist
+    """
+    tables = list(dict.fromkeys(tables))
+    if not tables:
+        return {}
+
+    with connexion.cursor() as cursor:
+        cursor.execute(
+            POSTGRESQL_CATALOG_SQL,
+            ([schema for schema, _ in tables], [table for _, table in tables])
+        )
+        rows = cursor.fetchall()
+
+    catalogs = {}
+    for schema, table, relkind, primary_key, geometry_columns, indexes, analyzed in rows:
+        catalogs[(schema, table)] = TableCatalog(
+            schema=schema,
+            table=table,
+            relkind=relkind,
+            primary_key=list(primary_key or []),
+            geometry_columns=list(geometry_columns or []),
+            indexes=[tuple(entry.split(':', 1)) for entry in (indexes or [])],
+            analyzed=bool(analyzed),
+        )
+    return catalogs
+
+
+def fetch_geopackage_geometry_columns(conn: sqlite3.Connection) -> Dict[str, str]:
+    """
+    Read the geometry column of every table of a GeoPackage.
+
+    Returns:
+        dict: lower-cased table name -> geometry column name
+    """
+    rows = conn.execute("SELECT table_name, column_name FROM gpkg_geometry_columns").fetchall()
+    return {table.lower(): column for table, column in rows if table and column}
+
+
+def run_probes(probes: Dict[Hashable, Callable[[], Any]], max_workers: int = PROBE_MAX_WORKERS) -> Dict[Hashable, Any]:
+    """
+    Run independent metadata probes concurrently.
+
+    Each probe usually covers one database connection or file. A failed
+    probe maps to None, and its layers fall back to per-layer detection.
+
+    Args:
+        probes: key -> zero-argument callable
+        max_workers: Upper bound on concurrent probes
+
+    Returns:
+        dict: key -> probe result (None on failure)
+    """
+    results = {}
+    if not probes:
+        return results
+
+    workers = max(1, min(max_workers, len(probes)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='FilterMate-probe') as executor:
+        futures = {executor.submit(probe): key for key, probe in probes.items()}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except Exception as e:  # catch-all safety net: probe failures fall back to per-layer detection
+                logger.debug(f"Metadata probe {key} failed: {e}")
+                results[key] = None
+    return results
+
+
+def select_layer_properties(conn: sqlite3.Connection, project_uuid, layer_ids: Iterable[str]) -> Dict[str, List[Tuple]]:
+    """
+    Load the stored properties of many layers with one query.
+
+    Returns:
+        dict: layer_id -> [(meta_type, meta_key, meta_value), ...], only for
+        layers with stored properties
+    """
+    wanted = set(layer_ids)
+    properties: Dict[str, List[Tuple]] = {}
+    for layer_id, meta_type, meta_key, meta_value in conn.execute(_SELECT_PROPERTIES_SQL, (str(project_uuid),)):
+        if layer_id in wanted:
+            properties.setdefault(layer_id, []).append((meta_type, meta_key, meta_value))
+    return properties
+
+
+def insert_property_rows(conn: sqlite3.Connection, project_uuid, rows: Iterable[Tuple[str, str, str, Any]]) -> int:
+    """
+    Insert layer property rows in one transaction.
+
+    Args:
+        conn: Connection to the FilterMate database
+        project_uuid: Project the rows belong to
+        rows: (layer_id, meta_type, meta_key, meta_value) tuples
+
+    Returns:
+        int: Number of rows written
+
+    Raises:
+        sqlite3.Error: The transaction was rolled back
+    """
+    records = [
+        (str(uuid.uuid4()), str(project_uuid), layer_id, meta_type, meta_key, meta_value)
+        for layer_id, meta_type, meta_key, meta_value in rows
+    ]
+    if not records:
+        return 0
+
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        conn.executemany(_INSERT_PROPERTY_SQL, records)
+        conn.commit()
+    except (sqlite3.Error, OSError, ValueError):
+        try:
+            conn.rollback()
+        except (sqlite3.Error, OSError):
+            pass
+        raise
+    return len(records)
+
+
+def ensure_postgresql_indexes(connexion, schema, table, geometry_field, primary_key_name, layer_name=None,
+                              catalog: Optional[TableCatalog] = None) -> bool:
+    """
+    Create the GIST and primary key indexes of a table when missing, and
+    ANALYZE it when it has no statistics.
+
+    PERFORMANCE OPTIMIZATIONS (v2.4.0):
+    - Check if indexes already exist before creating (avoids slow CREATE IF NOT EXISTS)
+    - Skip CLUSTER operation (very slow on large tables, ~minutes for 100k+ rows)
+    - Only run ANALYZE if table has no statistics
+
+    Args:
+        connexion: Active PostgreSQL connection
+        schema: Schema name
+        table: Table name
+        geometry_field: Geometry column name
+        primary_key_name: Primary key column name
+        layer_name: Layer name for logging
+        catalog: Catalog of the table from fetch_postgresql_catalog(). When
+            given, existing indexes are matched by column and access method
+            instead of by name, and the existence checks are not re-queried.
+
+    Returns:
+        bool: True if successful
+    """
+    layer_name = layer_name or f"{schema}.{table}"
+    try:
+        # Sanitize all identifiers from QGIS URI metadata
+        safe_schema = sanitize_sql_identifier(schema)
+        safe_table = sanitize_sql_identifier(table)
+        safe_geom = sanitize_sql_identifier(geometry_field)
+        safe_pk = sanitize_sql_identifier(primary_key_name)
+
+        with connexion.cursor() as cursor:
+            # PERFORMANCE: Check if GIST index already exists before creating
+            gist_index_name = sanitize_sql_identifier(f"{schema}_{table}_{geometry_field}_idx")
+            if catalog is not None:
+                gist_exists = catalog.has_spatial_index(geometry_field)
+            else:
+                cursor.execute("""
+                    SELECT 1 FROM pg_indexes
+                    WHERE schemaname = %s AND tablename = %s AND indexname = %s
+                """, (schema, table, gist_index_name))
+                gist_exists = cursor.fetchone() is not None
+
+            if not gist_exists:
+                logger.debug(f"Creating GIST spatial index on {safe_schema}.{safe_table}.{safe_geom}")
+                cursor.execute(
+                    f'CREATE INDEX {gist_index_name} '
+                    f'ON "{safe_schema}"."{safe_table}" USING GIST ("{safe_geom}");'
+                )
+            else:
+                logger.debug(f"GIST index {gist_index_name} already exists, skipping")
+
+            # PERFORMANCE: Check if primary key index already exists
+            # Note: PostgreSQL auto-creates index for PRIMARY KEY, but not for manual 'id' fields
+            pk_index_name = sanitize_sql_identifier(f"{schema}_{table}_{primary_key_name}_idx")
+            if catalog is not None:
+                pk_exists = catalog.has_index(primary_key_name)
+            else:
+                cursor.execute("""
+                    SELECT 1 FROM pg_indexes
+                    WHERE schemaname = %s AND tablename = %s AND indexname = %s
+                """, (schema, table, pk_index_name))
+                pk_exists = cursor.fetchone() is not None
+
+            if not pk_exists and primary_key_name != 'ctid':
+                logger.debug(f"Creating unique index on {safe_schema}.{safe_table}.{safe_pk}")
+                try:
+                    cursor.execute(
+                        f'CREATE UNIQUE INDEX {pk_index_name} '
+                        f'ON "{safe_schema}"."{safe_table}" ("{safe_pk}");'
+                    )
+                except (RuntimeError, OSError) as e:
+                    # May fail if column has duplicates - not critical
+                    logger.debug(f"Could not create unique index on {safe_pk}: {e}")
+            else:
+                logger.debug(f"PK index for {safe_pk} already exists or not needed, skipping")
+
+            # PERFORMANCE: Only ANALYZE if table has no statistics
+            if catalog is not None:
+                has_stats = catalog.analyzed
+            else:
+                cursor.execute("""
+                    SELECT 1 FROM pg_statistic s
+                    JOIN pg_class c ON s.starelid = c.oid
+                    JOIN pg_namespace n ON c.relnamespace = n.oid
+                    WHERE n.nspname = %s AND c.relname = %s
+                    LIMIT 1
+                """, (schema, table))
+                has_stats = cursor.fetchone() is not None
+
+            if not has_stats:
+                logger.debug(f"Running ANALYZE on {safe_schema}.{safe_table} (no statistics found)")
+                cursor.execute(f'ANALYZE "{safe_schema}"."{safe_table}";')
+            else:
+                logger.debug(f"Table {safe_schema}.{safe_table} already has statistics, skipping ANALYZE")
+
+        connexion.commit()
+        logger.info(f"PostgreSQL layer {layer_name}: spatial index setup completed")
+    except (RuntimeError, OSError, AttributeError) as e:
+        logger.warning(f"Error creating spatial index for PostgreSQL layer {layer_name}: {e}")
+        return False
+
+    return True
+
+
+class SpatialIndexQueue:
+    """
+    Runs index creation jobs on one background thread, in submission order.
+
+    Jobs are keyed (for example by database and table) and a key that is
+    already pending is not queued again. The worker thread starts on the
+    first submission. It exits after INDEX_QUEUE_IDLE_TIMEOUT seconds
+    without work, so an idle plugin keeps no thread alive.
+    """
+
+    def __init__(self, idle_timeout: float = INDEX_QUEUE_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self._jobs: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = set()
+        self._worker: Optional[threading.Thread] = None
+        self._completed = 0
+        self._failed = 0
+
+    def submit(self, key: Hashable, job: Callable[[], Any]) -> bool:
+        """
+        Queue ``job`` unless a job with the same key is pending.
+
+        Returns:
+            bool: True if the job was queued
+        """
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+            # Enqueued under the lock: an exiting worker re-checks the queue
+            # under the same lock, so no job is left without a worker.
+            self._jobs.put((key, job))
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name='FilterMate-SpatialIndexQueue', daemon=True
+                )
+                self._worker.start()
+        return True
+
+    def _run(self):
+        while True:
+            try:
+                key, job = self._jobs.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                with self._lock:
+                    if self._jobs.empty():
+                        self._worker = None
+                        return
+                continue
+
+            failed = False
+            try:
+                if job() is False:
+                    failed = True
+            except Exception as e:  # catch-all safety net: one failed job must not stop the queue
+                failed = True
+                logger.warning(f"Spatial index job {key} failed: {e}")
+
+            with self._lock:
+                if failed:
+                    self._failed += 1
+                else:
+                    self._completed += 1
+                self._pending.discard(key)
+                if not self._pending:
+                    self._idle.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until all queued jobs ran. Returns False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._pending, timeout)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'pending': len(self._pending),
+                'completed': self._completed,
+                'failed': self._failed,
+            }
+
+
+_spatial_index_queue: Optional[SpatialIndexQueue] = None
+_spatial_index_queue_lock = threading.Lock()
+
+
+def get_spatial_index_queue() -> SpatialIndexQueue:
+    """Get the shared background spatial index queue."""
+    global _spatial_index_queue
+    with _spatial_index_queue_lock:
+        if _spatial_index_queue is None:
+            _spatial_index_queue = SpatialIndexQueue()
+        return _spatial_index_queue
@@ -322,7 +322,8 @@ class SubsetManagementHandler:
                                    source_schema, source_table, source_geom,
                                    current_mv_schema, project_uuid, session_id,
                                    param_buffer_expression,
-                                   pg_execute_filter_fn, pg_executor_available):
+                                   pg_execute_filter_fn, pg_executor_available,
+                                   mv_cache_config=None):
         """Execute filter action using PostgreSQL backend.
 
         Args:
@@ -355,6 +356,7 @@ class SubsetManagementHandler:
             param_buffer_expression: Buffer expression if any.
             pg_execute_filter_fn: PostgreSQL execute filter function.
             pg_executor_available: Whether PG executor is available.
+            mv_cache_config: Materialized view cache settings (v4.2.0).
 
         Returns:
             bool: True if successful.
@@ -387,7 +389,8 @@ class SubsetManagementHandler:
                 current_mv_schema=current_mv_schema,
                 project_uuid=project_uuid,
                 session_id=session_id,
-                param_buffer_expression=param_buffer_expression
+                param_buffer_expression=param_buffer_expression,
+                mv_cache_config=mv_cache_config
             )
 
         error_msg = (
@@ -482,9 +485,10 @@ class SubsetManagementHandler:
 
         # Drop temp table from filterMate_db using session-prefixed name
         import sqlite3
+        from ...infrastructure.utils.task_utils import spatialite_connect
         session_name = get_session_name_fn(name)
         try:
-            temp_conn = sqlite3.connect(db_file_path)
+            temp_conn = spatialite_connect(db_file_path)
             temp_cur = temp_conn.cursor()
             temp_cur.execute(f"DROP TABLE IF EXISTS fm_temp_{session_name}")  # nosec B608
             temp_cur.execute(f"DROP TABLE IF EXISTS mv_{session_name}")  # nosec B608
@@ -547,7 +551,8 @@ class SubsetManagementHandler:
                           get_session_name_fn, create_simple_mv_fn,
                           project_uuid, current_mv_schema,
                           pg_execute_unfilter_fn, pg_executor_available,
-                          ogr_execute_unfilter_fn, manage_spatialite_subset_fn):
+                          ogr_execute_unfilter_fn, manage_spatialite_subset_fn,
+                          mv_cache_config=None):
         """Execute unfilter action (restore previous filter state).
 
         Args:
@@ -572,6 +577,7 @@ class SubsetManagementHandler:
             pg_executor_available: Whether PG executor is available.
             ogr_execute_unfilter_fn: OGR unfilter function.
             manage_spatialite_subset_fn: Callback for Spatialite subset management.
+            mv_cache_config: Materialized view cache settings (v4.2.0).
 
         Returns:
             bool: True if successful.
@@ -591,7 +597,8 @@ class SubsetManagementHandler:
                 get_session_name_fn=get_session_name_fn,
                 create_simple_mv_fn=create_simple_mv_fn,
                 project_uuid=project_uuid,
-                current_mv_schema=current_mv_schema
+                current_mv_schema=current_mv_schema,
+                mv_cache_config=mv_cache_config
             )
         elif use_postgresql:
             error_msg = "PostgreSQL filter_actions module not available"
@@ -821,6 +828,12 @@ class SubsetManagementHandler:
                 # Log performance warning if needed
                 self.log_performance_warning_if_needed(use_spatialite, layer)
 
+                # v4.2.0: Quota of the content-addressed materialized view cache
+                mv_cache_config = None
+                if use_postgresql:
+                    from ..optimization.config_provider import get_mv_cache_config
+                    mv_cache_config = get_mv_cache_config(task_parameters)
+
                 # Execute appropriate action based on task_action
                 if task_action == 'filter':
                     current_seq_order = last_seq_order + 1
@@ -872,6 +885,7 @@ class SubsetManagementHandler:
                         param_buffer_expression=param_buffer_expression,
                         pg_execute_filter_fn=pg_execute_filter_fn,
                         pg_executor_available=pg_executor_available,
+                        mv_cache_config=mv_cache_config,
                     )
 
                 elif task_action == 'reset':
@@ -929,6 +943,7 @@ class SubsetManagementHandler:
                         pg_executor_available=pg_executor_available,
                         ogr_execute_unfilter_fn=ogr_execute_unfilter_fn,
                         manage_spatialite_subset_fn=manage_spatialite_subset_fn,
+                        mv_cache_config=mv_cache_config,
                     )
 
                 return True
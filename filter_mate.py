@@ -443,7 +443,11 @@ class FilterMate:
                     # Build user-friendly message
                     section_names = {
                         "GEOMETRY_SIMPLIFICATION": self.tr("Geometry Simplification"),
-                        "OPTIMIZATION_THRESHOLDS": self.tr("Optimization Thresholds")
+                        "OPTIMIZATION_THRESHOLDS": self.tr("Optimization Thresholds"),
+                        "MATERIALIZED_VIEW_CACHE": self.tr("Materialized View Cache"),
+                        "QUERY_PROFILER": self.tr("Query Profiler"),
+                        "TILED_EXISTS": self.tr("Tiled Spatial Filtering"),
+                        "GEOMETRY_TRANSPORT": self.tr("Source Geometry Transport")
                     }
                     friendly_names = [section_names.get(s, s) for s in added_sections]
                     sections_str = ", ".join(friendly_names)
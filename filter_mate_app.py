@@ -655,6 +655,21 @@ class FilterMateApp:
         if self._pending_add_layers_tasks < 0 or self._pending_add_layers_tasks > 10: self._pending_add_layers_tasks = 0; flags_reset = True
         return flags_reset
 
+    def _release_filter_side_tables(self, layer_ids):
+        """Release OGR ID tables (fm_tmp_ids_*) and PostgreSQL source geometries only referenced by layers leaving the project."""
+        try:
+            from .adapters.backends.ogr.filter_executor import release_ogr_fid_tables
+            from .infrastructure.database.geometry_transport import release_source_geometries
+            removed = {lid if isinstance(lid, str) else lid.id() for lid in layer_ids}
+            for layer_id in removed:
+                layer = self.PROJECT.mapLayer(layer_id)
+                if layer is None or not hasattr(layer, 'subsetString'):
+                    continue
+                release = release_source_geometries if layer.providerType() == 'postgres' else release_ogr_fid_tables
+                release(layer, layer.subsetString(), removed_layer_ids=removed)
+        except Exception as e:
+            logger.debug(f"FilterMate: filter table release on layer removal skipped: {e}")
+
     def _set_flag_with_timestamp(self, flag_name: str, value: bool):
         """Set flag with timestamp tracking (loading/initializing)."""
         import time
@@ -1304,6 +1319,10 @@ class FilterMateApp:
         # v4.1.0: STABILITY FIX - Check and reset stale flags before processing
         self._check_and_reset_stale_flags()
 
+        # v4.2.0: Layers are still in the project here (layersWillBeRemoved)
+        if task_name == 'remove_layers' and data:
+            self._release_filter_side_tables(data)
+
         # v4.1.0: CRITICAL - Skip layersAdded signals during project initialization
         if task_name == 'add_layers' and self._initializing_project:
             logger.debug("Skipping add_layers - project initialization in progress")
@@ -4113,11 +4113,7 @@ class FilterMateDockWidget(QtWidgets.QDockWidget, Ui_FilterMateDockWidgetBase):
                         lw = picker.list_widgets[picker.layer.id()]
                         logger.info(f"     list_widget count: {lw.count()}")
                         # Check how many checked items
-                        checked_count = 0
-                        for i in range(lw.count()):
-                            item = lw.item(i)
-                            if item and item.checkState() == Qt.Checked:
-                                checked_count += 1
+                        checked_count = len(lw.getCheckedFeatureIds())
                         logger.info(f"     checked items count: {checked_count}")
                     else:
                         logger.warning("     ⚠️ layer.id() NOT in list_widgets!")
@@ -4543,14 +4539,7 @@ class FilterMateDockWidget(QtWidgets.QDockWidget, Ui_FilterMateDockWidgetBase):
                             # Sync check states in list widget
                             self._syncing_from_qgis = True
                             try:
-                                from qgis.PyQt.QtCore import Qt
-                                for i in range(list_widget.count()):
-                                    item = list_widget.item(i)
-                                    item_pk = str(item.data(3)) if item.data(3) is not None else ""
-                                    should_check = item_pk in selected_pk_values
-                                    current_state = item.checkState() == Qt.Checked
-                                    if should_check != current_state:
-                                        item.setCheckState(Qt.Checked if should_check else Qt.Unchecked)
+                                list_widget.feature_model.setCheckedKeys(selected_pk_values)
                                 logger.debug(f"_fallback_sync: Synced {len(selected_pk_values)} items in multiple picker")
                             finally:
                                 self._syncing_from_qgis = False
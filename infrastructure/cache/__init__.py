@@ -5,6 +5,8 @@ Caching utilities for performance optimization:
 - QueryExpressionCache: LRU cache for spatial query expressions
 - CacheEntry: Cache entry with TTL and access tracking
 - SourceGeometryCache: Cache for pre-calculated source geometries
+- DiskGeometryCache: Persistent WKB tier behind WKTCache/SourceGeometryCache
+- FidSet: Run-length encoded FID set with set algebra on runs
 
 Migrated from modules/tasks/ (EPIC-1 v3.0).
 """
@@ -28,6 +30,17 @@ from .exploring_cache import ExploringFeaturesCache  # noqa: F401
 # WKT Cache (migrated from before_migration v4.1.0)
 from .wkt_cache import WKTCache, WKTCacheEntry, get_wkt_cache  # noqa: F401
 
+# Persistent disk tier behind WKT/geometry caches (v4.2.0)
+from .disk_geometry_cache import (  # noqa: F401
+    DiskGeometryCache,
+    MappedGeometry,
+    get_disk_geometry_cache,
+    layer_source_fingerprint,
+)
+
+# Compact run-length FID set (v4.2.0)
+from .fid_set import FidSet, FidSetDecodeError  # noqa: F401
+
 # Spatialite Persistent Cache (migrated from before_migration v4.1.0)
 from .spatialite_persistent_cache import (  # noqa: F401
     SpatialitePersistentCache,
@@ -50,6 +63,14 @@ __all__ = [
     'WKTCache',
     'WKTCacheEntry',
     'get_wkt_cache',
+    # Disk geometry cache (v4.2.0)
+    'DiskGeometryCache',
+    'MappedGeometry',
+    'get_disk_geometry_cache',
+    'layer_source_fingerprint',
+    # Compact FID set (v4.2.0)
+    'FidSet',
+    'FidSetDecodeError',
     # Spatialite Persistent Cache (v4.1.0)
     'SpatialitePersistentCache',
     'get_persistent_cache',
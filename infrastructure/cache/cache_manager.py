@@ -214,10 +214,32 @@ class CacheManager:
         """
         Get statistics for all caches.
 
+        Caches exposing ``get_tier_stats()`` (memory + persistent disk tier)
+        are reported live, one entry per tier named ``"<cache>.<tier>"``.
+
         Returns:
             Dictionary of cache name -> statistics
         """
-        return self._stats.copy()
+        stats = self._stats.copy()
+        for name, cache in self._caches.items():
+            get_tier_stats = getattr(cache, 'get_tier_stats', None)
+            if not callable(get_tier_stats):
+                continue
+            try:
+                tiers = get_tier_stats()
+            except Exception as e:  # Stats must never break callers
+                logger.debug(f"Tier stats unavailable for cache '{name}': {e}")
+                continue
+            stats.pop(name, None)
+            for tier, counters in tiers.items():
+                stats[f"{name}.{tier}"] = CacheStats(
+                    hits=counters.get('hits', 0),
+                    misses=counters.get('misses', 0),
+                    evictions=counters.get('evictions', 0),
+                    total_size=counters.get('total_size', 0),
+                    max_size=counters.get('max_size', 0),
+                )
+        return stats
 
     def clear_cache(self, name: str):
         """
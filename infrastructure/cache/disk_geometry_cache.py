@@ -0,0 +1,624 @@
+# -*- coding: utf-8 -*-
+"""
+Persistent Disk Geometry Cache for FilterMate
+
+Second cache tier behind WKTCache and SourceGeometryCache. Prepared source
+geometries (union, buffer, simplify of large selections) are written to disk
+as WKB blobs so they survive QGIS restarts.
+
+v4.2.0 - Persistent geometry cache tier (October 2026)
+
+Layout:
+    <plugin config dir>/geometry_cache/
+    ├── index.sqlite      ← key, layer, source fingerprint, size, LRU clock
+    └── <key>.wkb         ← one blob file per entry
+
+Features:
+- Keys derived from layer source, subset string, buffer, CRS and a
+  geometry (selection) hash
+- Size-bounded LRU eviction plus an age limit
+- Invalidation when the layer data source changes (URI, file mtime/size);
+  the stored fingerprint is a credential-free hash
+- Memory-mapped reads: blobs are exposed as a memoryview over the mapped
+  file, so large multipolygons are not copied into Python strings
+
+Limitations:
+    The source fingerprint only sees file-based changes. Edits made to a
+    database table by another client are not detected; call
+    ``invalidate_layer()`` when the layer signals a data change.
+
+Usage:
+    from infrastructure.cache.disk_geometry_cache import get_disk_geometry_cache
+
+    disk = get_disk_geometry_cache()
+    key = disk.make_key(layer.source(), layer.subsetString(), 10.0, 'EPSG:2154', fids_hash)
+    disk.put(key, wkb_bytes, layer.id(), layer_source_fingerprint(layer), srid=2154)
+
+    with disk.get(key, layer_source_fingerprint(layer)) as hit:
+        geometry = QgsGeometry(); geometry.fromWkb(hit.wkb)
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from ..constants import (
+    DISK_GEOMETRY_CACHE_DIRNAME,
+    DISK_GEOMETRY_CACHE_MAX_AGE_DAYS,
+    DISK_GEOMETRY_CACHE_MAX_BYTES,
+    DISK_GEOMETRY_CACHE_MAX_ENTRY_BYTES,
+)
+
+logger = logging.getLogger('FilterMate.Cache.DiskGeometry')
+
+try:
+    from ...config.config import ENV_VARS
+except ImportError:
+    ENV_VARS = {}
+
+try:
+    from osgeo import ogr
+    OGR_AVAILABLE = True
+except ImportError:
+    ogr = None
+    OGR_AVAILABLE = False
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+INDEX_DB_NAME = "index.sqlite"
+BLOB_SUFFIX = ".wkb"
+
+# Payload formats stored in the index
+FORMAT_WKB = 0
+FORMAT_WKT = 1  # UTF-8 WKT, used when GDAL/OGR cannot convert to WKB
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def _get_default_cache_dir() -> str:
+    """
+    Get the directory holding the disk geometry cache.
+
+    Returns:
+        str: Absolute path (not created)
+    """
+    plugin_dir = ENV_VARS.get("PLUGIN_CONFIG_DIRECTORY")
+    if not isinstance(plugin_dir, str) or not plugin_dir:
+        try:
+            from qgis.core import QgsApplication
+            settings_dir = QgsApplication.qgisSettingsDirPath()
+            plugin_dir = os.path.join(settings_dir, "FilterMate") if isinstance(settings_dir, str) else None
+        except ImportError:
+            plugin_dir = None
+        if not plugin_dir:
+            plugin_dir = os.path.join(os.path.expanduser("~"), ".filtermate")
+    return os.path.join(plugin_dir, DISK_GEOMETRY_CACHE_DIRNAME)
+
+
+_CREDENTIAL_RE = re.compile(r"\b(password|user|username)\s*=\s*('(?:[^'\\]|\\.)*'|\S+)", re.IGNORECASE)
+
+
+def layer_source_fingerprint(layer) -> str:
+    """
+    Fingerprint of a layer's data source.
+
+    Combines provider, source URI and, for file-based sources, the file
+    modification time and size. A changed fingerprint invalidates every
+    disk entry stored for the layer.
+
+    Credentials are stripped from the URI and the result is hashed, so
+    the index never holds connection strings.
+
+    Args:
+        layer: QgsVectorLayer
+
+    Returns:
+        str: Fingerprint (empty if the layer cannot be inspected)
+    """
+    try:
+        source = layer.source()
+        provider = layer.providerType()
+    except (AttributeError, RuntimeError):
+        return ""
+
+    parts = [str(provider), _CREDENTIAL_RE.sub(r"\1=", str(source))]
+    path = str(source).split('|')[0]
+    try:
+        stat = os.stat(path)
+        parts.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+    except (OSError, ValueError):
+        pass
+    return hashlib.sha256("|".join(parts).encode('utf-8')).hexdigest()
+
+
+def wkt_to_payload(wkt: str):
+    """
+    Encode WKT for disk storage.
+
+    Returns:
+        Tuple of (payload bytes, format) - WKB when GDAL/OGR is available
+    """
+    if OGR_AVAILABLE:
+        geom = ogr.CreateGeometryFromWkt(wkt)
+        if geom is not None:
+            return bytes(geom.ExportToIsoWkb()), FORMAT_WKB
+    return wkt.encode('utf-8'), FORMAT_WKT
+
+
+def payload_to_wkt(payload, geometry_format: int) -> Optional[str]:
+    """Decode a disk payload back to WKT (None if it cannot be decoded)."""
+    if geometry_format == FORMAT_WKT:
+        return str(payload, 'utf-8')
+    if OGR_AVAILABLE:
+        geom = ogr.CreateGeometryFromWkb(bytes(payload))
+        if geom is not None:
+            return geom.ExportToIsoWkt()
+    return None
+
+
+# =============================================================================
+# Mapped entry
+# =============================================================================
+
+class MappedGeometry:
+    """
+    Read-only view of one cached blob, backed by a memory-mapped file.
+
+    ``wkb`` is a memoryview over the mapping; slicing or passing it to
+    ``QgsGeometry.fromWkb`` does not copy the whole file into Python.
+    The mapping stays valid while any view on it is alive.
+    """
+
+    __slots__ = ('key', 'srid', 'geometry_format', 'metadata', '_mmap', '_view')
+
+    def __init__(self, key: str, mapped: mmap.mmap, srid: int,
+                 geometry_format: int, metadata: Optional[Dict[str, Any]] = None):
+        self.key = key
+        self.srid = srid
+        self.geometry_format = geometry_format
+        self.metadata = metadata or {}
+        self._mmap = mapped
+        self._view = memoryview(mapped)
+
+    @property
+    def wkb(self) -> memoryview:
+        """Zero-copy view over the stored payload."""
+        return self._view
+
+    @property
+    def size(self) -> int:
+        return len(self._view)
+
+    def to_bytes(self) -> bytes:
+        """Copy the payload into a bytes object."""
+        return self._view.tobytes()
+
+    def to_wkt(self) -> Optional[str]:
+        """Decode the payload as WKT (copies)."""
+        return payload_to_wkt(self._view, self.geometry_format)
+
+    def close(self):
+        """Release the view; the mapping closes once no other view uses it."""
+        try:
+            self._view.release()
+            self._mmap.close()
+        except BufferError:
+            # A caller still holds a slice of the view; the mapping is
+            # released when that slice is garbage collected.
+            pass
+
+    def __enter__(self) -> 'MappedGeometry':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"MappedGeometry(key={self.key[:12]}, size={self.size}, srid={self.srid})"
+
+
+# =============================================================================
+# Disk cache
+# =============================================================================
+
+class DiskGeometryCache:
+    """
+    Size-bounded, LRU-evicted on-disk store of geometry blobs.
+
+    Thread-safe: all index access goes through one lock; blob files are
+    written to a temporary name and renamed into place atomically.
+
+    Example:
+        disk = DiskGeometryCache("/tmp/fm_geom")
+        key = DiskGeometryCache.make_key("/data/parcels.gpkg|layername=parcels",
+                                         '"zone" = 3', 50.0, "EPSG:2154", "a1b2")
+        disk.put(key, wkb, "parcels_1234", fingerprint, srid=2154)
+        hit = disk.get(key, fingerprint)
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        max_entry_bytes: Optional[int] = None,
+        max_age_days: Optional[float] = None
+    ):
+        """
+        Initialize the disk cache, creating the directory and index if needed.
+
+        Args:
+            cache_dir: Cache directory (default: plugin config dir / geometry_cache)
+            max_bytes: Total size budget (default: DISK_GEOMETRY_CACHE_MAX_BYTES)
+            max_entry_bytes: Largest blob accepted (default: DISK_GEOMETRY_CACHE_MAX_ENTRY_BYTES)
+            max_age_days: Unused entries older than this are evicted
+
+        Raises:
+            OSError: If the directory cannot be created
+            sqlite3.Error: If the index cannot be opened
+        """
+        self.cache_dir = cache_dir or _get_default_cache_dir()
+        self.max_bytes = max_bytes or DISK_GEOMETRY_CACHE_MAX_BYTES
+        self.max_entry_bytes = max_entry_bytes or DISK_GEOMETRY_CACHE_MAX_ENTRY_BYTES
+        self.max_age_days = max_age_days if max_age_days is not None else DISK_GEOMETRY_CACHE_MAX_AGE_DAYS
+        self.index_path = os.path.join(self.cache_dir, INDEX_DB_NAME)
+        self._lock = threading.RLock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._init_index()
+        logger.info(f"✓ DiskGeometryCache initialized at: {self.cache_dir}")
+
+    # -------------------------------------------------------------------------
+    # Index
+    # -------------------------------------------------------------------------
+
+    @contextmanager
+    def _get_connection(self):
+        conn = None
+        try:
+            conn = sqlite3.connect(self.index_path, timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            yield conn
+        finally:
+            if conn:
+                conn.close()
+
+    def _init_index(self):
+        with self._get_connection() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS geometry_blobs (
+                    cache_key TEXT PRIMARY KEY,
+                    layer_id TEXT NOT NULL,
+                    source_fingerprint TEXT NOT NULL DEFAULT '',
+                    geometry_format INTEGER NOT NULL,
+                    srid INTEGER NOT NULL DEFAULT 0,
+                    size_bytes INTEGER NOT NULL,
+                    metadata TEXT,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_geometry_blobs_layer ON geometry_blobs(layer_id)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_geometry_blobs_access ON geometry_blobs(last_access)')
+            conn.commit()
+
+    def _blob_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + BLOB_SUFFIX)
+
+    def _unlink(self, key: str):
+        try:
+            os.remove(self._blob_path(key))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            # Windows refuses to delete a file that is still mapped
+            logger.debug(f"Disk geometry cache: could not remove blob {key[:12]}: {e}")
+
+    def _delete_rows(self, conn, keys) -> int:
+        for key in keys:
+            conn.execute('DELETE FROM geometry_blobs WHERE cache_key = ?', (key,))
+            self._unlink(key)
+        return len(keys)
+
+    # -------------------------------------------------------------------------
+    # Keys
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def make_key(
+        layer_source: str,
+        subset_string: Optional[str] = None,
+        buffer_value: Optional[float] = None,
+        crs: Optional[Any] = None,
+        geometry_hash: Optional[str] = None
+    ) -> str:
+        """
+        Build a disk cache key.
+
+        Args:
+            layer_source: Layer source URI (or layer ID for ID-scoped keys)
+            subset_string: Active subset string on the source layer
+            buffer_value: Buffer distance applied to the geometry
+            crs: Target CRS authid or SRID
+            geometry_hash: Hash of the selection the geometry was built from
+
+        Returns:
+            str: 40-character hexadecimal key (also the blob file name)
+        """
+        material = json.dumps(
+            [layer_source, subset_string or "", buffer_value, str(crs or ""), geometry_hash or ""],
+            default=str
+        )
+        return hashlib.sha1(material.encode('utf-8'), usedforsecurity=False).hexdigest()
+
+    # -------------------------------------------------------------------------
+    # Cache operations
+    # -------------------------------------------------------------------------
+
+    def get(self, key: str, source_fingerprint: Optional[str] = None) -> Optional[MappedGeometry]:
+        """
+        Look up a blob and map it read-only.
+
+        Args:
+            key: Key from :meth:`make_key`
+            source_fingerprint: Current fingerprint of the layer source; an entry
+                stored under a different fingerprint is deleted and misses
+
+        Returns:
+            MappedGeometry or None on miss
+        """
+        with self._lock:
+            with self._get_connection() as conn:
+                row = conn.execute(
+                    'SELECT * FROM geometry_blobs WHERE cache_key = ?', (key,)
+                ).fetchone()
+
+                if row is None:
+                    self._misses += 1
+                    return None
+
+                if source_fingerprint is not None and row['source_fingerprint'] != source_fingerprint:
+                    self._delete_rows(conn, [key])
+                    conn.commit()
+                    self._invalidations += 1
+                    self._misses += 1
+                    logger.debug(f"Disk geometry cache: source changed, dropped {key[:12]}")
+                    return None
+
+                try:
+                    with open(self._blob_path(key), 'rb') as f:
+                        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (OSError, ValueError) as e:
+                    # Missing or truncated blob: drop the orphaned index row
+                    logger.debug(f"Disk geometry cache: unreadable blob {key[:12]}: {e}")
+                    self._delete_rows(conn, [key])
+                    conn.commit()
+                    self._misses += 1
+                    return None
+
+                conn.execute(
+                    'UPDATE geometry_blobs SET last_access = ? WHERE cache_key = ?',
+                    (time.time(), key)
+                )
+                conn.commit()
+
+            self._hits += 1
+            metadata = json.loads(row['metadata']) if row['metadata'] else None
+            return MappedGeometry(key, mapped, row['srid'], row['geometry_format'], metadata)
+
+    def put(
+        self,
+        key: str,
+        payload: bytes,
+        layer_id: str,
+        source_fingerprint: str = "",
+        srid: int = 0,
+        geometry_format: int = FORMAT_WKB,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """
+        Store a blob, evicting least recently used entries over budget.
+
+        Args:
+            key: Key from :meth:`make_key`
+            payload: WKB (or UTF-8 WKT with FORMAT_WKT)
+            layer_id: Layer ID used by :meth:`invalidate_layer`
+            source_fingerprint: Fingerprint from :func:`layer_source_fingerprint`
+            srid: SRID of the geometry
+            geometry_format: FORMAT_WKB or FORMAT_WKT
+            metadata: Optional JSON-serializable extras (bbox, feature count...)
+
+        Returns:
+            bool: True if stored
+        """
+        size = len(payload)
+        if size == 0 or size > self.max_entry_bytes:
+            logger.debug(f"Disk geometry cache: refusing blob of {size} bytes")
+            return False
+
+        try:
+            metadata_json = json.dumps(metadata) if metadata else None
+        except (TypeError, ValueError):
+            metadata_json = None
+
+        with self._lock:
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(payload)
+                os.replace(tmp_path, self._blob_path(key))
+            except OSError as e:
+                logger.warning(f"Disk geometry cache: failed to write blob: {e}")
+                return False
+
+            now = time.time()
+            with self._get_connection() as conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO geometry_blobs
+                        (cache_key, layer_id, source_fingerprint, geometry_format, srid,
+                         size_bytes, metadata, created_at, last_access)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (key, layer_id, source_fingerprint or "", geometry_format, int(srid or 0),
+                      size, metadata_json, now, now))
+                self._evict(conn, now)
+                conn.commit()
+
+        logger.debug(f"Disk geometry cache: stored {key[:12]} ({size} bytes)")
+        return True
+
+    def _evict(self, conn, now: float):
+        """Drop expired entries, then LRU entries until under the size budget."""
+        if self.max_age_days:
+            cutoff = now - self.max_age_days * 86400
+            expired = [r[0] for r in conn.execute(
+                'SELECT cache_key FROM geometry_blobs WHERE last_access < ?', (cutoff,))]
+            self._evictions += self._delete_rows(conn, expired)
+
+        total = conn.execute('SELECT COALESCE(SUM(size_bytes), 0) FROM geometry_blobs').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        victims = []
+        for key, size in conn.execute(
+                'SELECT cache_key, size_bytes FROM geometry_blobs ORDER BY last_access ASC'):
+            if total <= self.max_bytes:
+                break
+            victims.append(key)
+            total -= size
+        self._evictions += self._delete_rows(conn, victims)
+        logger.debug(f"Disk geometry cache: evicted {len(victims)} entries")
+
+    def invalidate(self, key: str) -> bool:
+        """Remove one entry. Returns True if it existed."""
+        with self._lock, self._get_connection() as conn:
+            exists = conn.execute(
+                'SELECT 1 FROM geometry_blobs WHERE cache_key = ?', (key,)).fetchone()
+            if exists:
+                self._delete_rows(conn, [key])
+                conn.commit()
+            return bool(exists)
+
+    def invalidate_layer(self, layer_id: str, source_fingerprint: Optional[str] = None) -> int:
+        """
+        Remove entries stored for a layer.
+
+        Args:
+            layer_id: Layer ID
+            source_fingerprint: If given, only entries stored under a *different*
+                fingerprint are removed (i.e. after a data source change)
+
+        Returns:
+            int: Number of entries removed
+        """
+        with self._lock, self._get_connection() as conn:
+            if source_fingerprint is None:
+                rows = conn.execute(
+                    'SELECT cache_key FROM geometry_blobs WHERE layer_id = ?', (layer_id,))
+            else:
+                rows = conn.execute(
+                    'SELECT cache_key FROM geometry_blobs WHERE layer_id = ? AND source_fingerprint != ?',
+                    (layer_id, source_fingerprint))
+            count = self._delete_rows(conn, [r[0] for r in rows.fetchall()])
+            conn.commit()
+        if count:
+            self._invalidations += count
+            logger.info(f"Disk geometry cache: invalidated {count} entries for layer {layer_id}")
+        return count
+
+    def clear(self):
+        """Remove every entry and blob file."""
+        with self._lock, self._get_connection() as conn:
+            keys = [r[0] for r in conn.execute('SELECT cache_key FROM geometry_blobs')]
+            self._delete_rows(conn, keys)
+            conn.commit()
+        logger.info(f"Disk geometry cache cleared ({len(keys)} entries)")
+
+    # -------------------------------------------------------------------------
+    # Statistics
+    # -------------------------------------------------------------------------
+
+    @property
+    def hit_rate(self) -> float:
+        """Cache hit rate (0.0 to 1.0)."""
+        total = self._hits + self._misses
+        return self._hits / total if total > 0 else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock, self._get_connection() as conn:
+            entries, total_bytes = conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM geometry_blobs').fetchone()
+        return {
+            'entries': entries,
+            'total_bytes': total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_rate': self.hit_rate,
+            'evictions': self._evictions,
+            'invalidations': self._invalidations,
+        }
+
+    def __len__(self) -> int:
+        with self._lock, self._get_connection() as conn:
+            return conn.execute('SELECT COUNT(*) FROM geometry_blobs').fetchone()[0]
+
+    def __repr__(self) -> str:
+        return f"DiskGeometryCache(dir={self.cache_dir!r}, max_bytes={self.max_bytes})"
+
+
+# =============================================================================
+# Global instance
+# =============================================================================
+
+_disk_cache_instance: Optional[DiskGeometryCache] = None
+_disk_cache_lock = threading.Lock()
+
+
+def get_disk_geometry_cache() -> Optional[DiskGeometryCache]:
+    """
+    Get the global disk geometry cache.
+
+    Returns:
+        DiskGeometryCache, or None if the cache directory is unusable
+    """
+    global _disk_cache_instance
+    if _disk_cache_instance is None:
+        with _disk_cache_lock:
+            if _disk_cache_instance is None:
+                try:
+                    _disk_cache_instance = DiskGeometryCache()
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning(f"Disk geometry cache unavailable: {e}")
+                    return None
+    return _disk_cache_instance
+
+
+__all__ = [
+    'DiskGeometryCache',
+    'MappedGeometry',
+    'get_disk_geometry_cache',
+    'layer_source_fingerprint',
+    'wkt_to_payload',
+    'payload_to_wkt',
+    'FORMAT_WKB',
+    'FORMAT_WKT',
+    'OGR_AVAILABLE',
+]
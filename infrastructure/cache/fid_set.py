@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+"""
+Compact FID Set for FilterMate
+
+Run-length encoded, immutable set of feature IDs with set algebra that
+operates directly on the runs. Used by the persistent filter cache so that
+multi-step refinement scales with the number of distinct FID runs instead
+of the number of features.
+
+v4.2.0 - Compact FID storage (October 2026)
+
+Representation:
+    Sorted, non-overlapping, non-adjacent half-open runs ``[start, end)``
+    stored as a flat sequence ``[s0, e0, s1, e1, ...]``.
+
+Binary format (little-endian):
+    bytes 0-2   magic ``b'FMF'``
+    byte  3     codec (0 = raw int64 pairs, 1 = varint deltas)
+    bytes 4-7   run count (uint32)
+    bytes 8-15  FID count (uint64)
+    bytes 16-   payload
+
+    The raw codec is decoded zero-copy with ``memoryview.cast('q')``.
+    The varint codec stores the first start (zigzag) followed by
+    ``(gap - 1, length - 1)`` pairs, which is typically 2-4 bytes per run.
+
+Usage:
+    from infrastructure.cache.fid_set import FidSet
+
+    previous = FidSet.from_blob(row['fids_blob'])
+    refined = previous & FidSet.from_fids(new_fids)
+    blob = refined.to_blob()
+"""
+
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator, Optional, Sequence, Set, Tuple, Union
+
+FID_SET_MAGIC = b'FMF'
+FID_SET_HEADER = struct.Struct('<3sBIQ')
+
+CODEC_RAW = 0
+CODEC_VARINT = 1
+
+_NATIVE_LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+class FidSetDecodeError(ValueError):
+    """Raised when a blob is not a valid encoded FID set."""
+
+
+# =============================================================================
+# Varint helpers
+# =============================================================================
+
+def _zigzag(value: int) -> int:
+    return (value << 1) if value >= 0 else ((-value << 1) - 1)
+
+
+def _unzigzag(value: int) -> int:
+    return (value >> 1) if not value & 1 else -((value + 1) >> 1)
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(buf, pos: int) -> Tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        try:
+            byte = buf[pos]
+        except IndexError:
+            raise FidSetDecodeError("Truncated varint payload") from None
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+# =============================================================================
+# FidSet
+# =============================================================================
+
+class FidSet:
+    """
+    Immutable set of integer FIDs stored as sorted half-open runs.
+
+    Intersection, union and difference are linear merges over the runs of
+    both operands, so their cost is ``O(runs_a + runs_b)`` regardless of how
+    many features each run covers.
+
+    Example:
+        a = FidSet.from_fids([1, 2, 3, 10, 11])
+        b = FidSet.from_ranges([(2, 12)])
+        (a & b).to_list()   # [2, 3, 10, 11]
+        a.run_count         # 2
+    """
+
+    __slots__ = ('_bounds', '_count')
+
+    def __init__(self, bounds: Optional[Sequence[int]] = None, count: Optional[int] = None):
+        """
+        Wrap a canonical flat bounds sequence.
+
+        Use the ``from_*`` constructors; this does not validate ``bounds``.
+
+        Args:
+            bounds: Flat ``[s0, e0, s1, e1, ...]`` sequence (array or memoryview)
+            count: Number of FIDs, computed lazily if omitted
+        """
+        self._bounds = bounds if bounds is not None else array('q')
+        self._count = count
+
+    # -------------------------------------------------------------------------
+    # Constructors
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def from_fids(cls, fids: Iterable[int]) -> 'FidSet':
+        """Build a FidSet from any iterable of FIDs (duplicates allowed)."""
+        if isinstance(fids, FidSet):
+            return fids
+        bounds = array('q')
+        count = 0
+        start = end = None
+        for fid in sorted(set(fids)):
+            if end is not None and fid == end:
+                end += 1
+                continue
+            if start is not None:
+                bounds.append(start)
+                bounds.append(end)
+                count += end - start
+            start, end = fid, fid + 1
+        if start is not None:
+            bounds.append(start)
+            bounds.append(end)
+            count += end - start
+        return cls(bounds, count)
+
+    @classmethod
+    def from_ranges(cls, ranges: Iterable[Tuple[int, int]]) -> 'FidSet':
+        """Build a FidSet from half-open ``(start, end)`` ranges in any order."""
+        bounds = array('q')
+        for start, end in sorted(r for r in ranges if r[1] > r[0]):
+            if bounds and start <= bounds[-1]:
+                if end > bounds[-1]:
+                    bounds[-1] = end
+            else:
+                bounds.append(start)
+                bounds.append(end)
+        return cls(bounds)
+
+    @classmethod
+    def from_blob(cls, blob: Union[bytes, bytearray, memoryview]) -> 'FidSet':
+        """
+        Decode a blob produced by :meth:`to_blob`.
+
+        Raw-codec payloads are exposed as a ``memoryview`` over ``blob``
+        without copying on little-endian hosts.
+
+        Raises:
+            FidSetDecodeError: If the blob is malformed
+        """
+        view = memoryview(blob)
+        if len(view) < FID_SET_HEADER.size:
+            raise FidSetDecodeError("Blob too short for FID set header")
+        magic, codec, run_count, count = FID_SET_HEADER.unpack_from(view)
+        if magic != FID_SET_MAGIC:
+            raise FidSetDecodeError("Invalid FID set magic")
+        payload = view[FID_SET_HEADER.size:]
+
+        if codec == CODEC_RAW:
+            if len(payload) != run_count * 16:
+                raise FidSetDecodeError("Raw payload size does not match run count")
+            if _NATIVE_LITTLE_ENDIAN:
+                return cls(payload.cast('q'), count)
+            bounds = array('q')
+            bounds.frombytes(payload.tobytes())
+            bounds.byteswap()
+            return cls(bounds, count)
+
+        if codec == CODEC_VARINT:
+            bounds = array('q')
+            if run_count:
+                value, pos = _read_varint(payload, 0)
+                prev_end = _unzigzag(value)
+                for index in range(run_count):
+                    gap, pos = _read_varint(payload, pos)
+                    length, pos = _read_varint(payload, pos)
+                    start = prev_end + gap + (1 if index else 0)
+                    prev_end = start + length + 1
+                    bounds.append(start)
+                    bounds.append(prev_end)
+            return cls(bounds, count)
+
+        raise FidSetDecodeError(f"Unknown FID set codec: {codec}")
+
+    @classmethod
+    def from_text(cls, text: str) -> 'FidSet':
+        """Parse the legacy comma-separated FID representation."""
+        if not text:
+            return cls()
+        return cls.from_fids(int(f) for f in text.split(',') if f)
+
+    # -------------------------------------------------------------------------
+    # Encoding
+    # -------------------------------------------------------------------------
+
+    def to_blob(self, codec: Optional[int] = None) -> bytes:
+        """
+        Encode this set to bytes.
+
+        Args:
+            codec: CODEC_RAW, CODEC_VARINT or None to pick automatically.
+                   Auto keeps the zero-copy raw codec unless varint is at
+                   most half its size.
+
+        Returns:
+            bytes: Encoded FID set
+        """
+        run_count = self.run_count
+        header = FID_SET_HEADER.pack(FID_SET_MAGIC, CODEC_RAW, run_count, len(self))
+
+        if codec != CODEC_RAW:
+            payload = bytearray()
+            bounds = self._bounds
+            if run_count:
+                _write_varint(payload, _zigzag(bounds[0]))
+                prev_end = bounds[0]
+                for i in range(0, len(bounds), 2):
+                    start, end = bounds[i], bounds[i + 1]
+                    _write_varint(payload, start - prev_end - (1 if i else 0))
+                    _write_varint(payload, end - start - 1)
+                    prev_end = end
+            if codec == CODEC_VARINT or len(payload) * 2 <= run_count * 16:
+                header = FID_SET_HEADER.pack(FID_SET_MAGIC, CODEC_VARINT, run_count, len(self))
+                return header + bytes(payload)
+
+        raw = array('q', self._bounds)
+        if not _NATIVE_LITTLE_ENDIAN:
+            raw.byteswap()
+        return header + raw.tobytes()
+
+    # -------------------------------------------------------------------------
+    # Set protocol
+    # -------------------------------------------------------------------------
+
+    @property
+    def run_count(self) -> int:
+        """Number of contiguous FID runs."""
+        return len(self._bounds) // 2
+
+    def runs(self) -> Iterator[Tuple[int, int]]:
+        """Iterate over half-open ``(start, end)`` runs."""
+        bounds = self._bounds
+        for i in range(0, len(bounds), 2):
+            yield bounds[i], bounds[i + 1]
+
+    def __len__(self) -> int:
+        if self._count is None:
+            bounds = self._bounds
+            self._count = sum(bounds[i + 1] - bounds[i] for i in range(0, len(bounds), 2))
+        return self._count
+
+    def __bool__(self) -> bool:
+        return len(self._bounds) > 0
+
+    def __iter__(self) -> Iterator[int]:
+        for start, end in self.runs():
+            yield from range(start, end)
+
+    def __contains__(self, fid: int) -> bool:
+        bounds = self._bounds
+        lo, hi = 0, len(bounds) // 2
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if bounds[2 * mid + 1] <= fid:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo < len(bounds) // 2 and bounds[2 * lo] <= fid
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, FidSet):
+            return NotImplemented
+        return len(self._bounds) == len(other._bounds) and all(
+            a == b for a, b in zip(self._bounds, other._bounds)
+        )
+
+    def __hash__(self):
+        return hash(tuple(self._bounds))
+
+    def __repr__(self) -> str:
+        return f"FidSet(count={len(self)}, runs={self.run_count})"
+
+    def to_set(self) -> Set[int]:
+        """Expand to a Python set (costs one int object per FID)."""
+        return set(self)
+
+    def to_list(self) -> list:
+        """Expand to a sorted list of FIDs."""
+        return list(self)
+
+    # -------------------------------------------------------------------------
+    # Set algebra on runs
+    # -------------------------------------------------------------------------
+
+    def intersection(self, other: Iterable[int]) -> 'FidSet':
+        """Return FIDs present in both sets."""
+        other = FidSet.from_fids(other)
+        a, b = self._bounds, other._bounds
+        out = array('q')
+        i = j = 0
+        while i < len(a) and j < len(b):
+            start = max(a[i], b[j])
+            end = min(a[i + 1], b[j + 1])
+            if start < end:
+                out.append(start)
+                out.append(end)
+            if a[i + 1] < b[j + 1]:
+                i += 2
+            else:
+                j += 2
+        return FidSet(out)
+
+    def union(self, other: Iterable[int]) -> 'FidSet':
+        """Return FIDs present in either set."""
+        other = FidSet.from_fids(other)
+        a, b = self._bounds, other._bounds
+        out = array('q')
+        i = j = 0
+        while i < len(a) or j < len(b):
+            if j >= len(b) or (i < len(a) and a[i] <= b[j]):
+                start, end = a[i], a[i + 1]
+                i += 2
+            else:
+                start, end = b[j], b[j + 1]
+                j += 2
+            if out and start <= out[-1]:
+                if end > out[-1]:
+                    out[-1] = end
+            else:
+                out.append(start)
+                out.append(end)
+        return FidSet(out)
+
+    def difference(self, other: Iterable[int]) -> 'FidSet':
+        """Return FIDs in this set that are not in ``other``."""
+        other = FidSet.from_fids(other)
+        a, b = self._bounds, other._bounds
+        out = array('q')
+        j = 0
+        for i in range(0, len(a), 2):
+            start, end = a[i], a[i + 1]
+            while j < len(b) and b[j + 1] <= start:
+                j += 2
+            k = j
+            while k < len(b) and b[k] < end:
+                if b[k] > start:
+                    out.append(start)
+                    out.append(b[k])
+                start = max(start, b[k + 1])
+                k += 2
+            if start < end:
+                out.append(start)
+                out.append(end)
+        return FidSet(out)
+
+    __and__ = intersection
+    __or__ = union
+    __sub__ = difference
+
+
+__all__ = [
+    'FidSet',
+    'FidSetDecodeError',
+    'FID_SET_MAGIC',
+    'CODEC_RAW',
+    'CODEC_VARINT',
+]
@@ -27,9 +27,20 @@ Usage:
         cache.put(features, buffer_value, target_crs, geometry_data, layer_id, subset_string)
 
 Migrated from modules/tasks/geometry_cache.py (EPIC-1 v3.0).
+
+v4.2.0: Optional persistent disk tier (see disk_geometry_cache.py). WKT
+strings, WKB bytes and dicts carrying a 'wkt' or 'wkb' field are persisted;
+other geometry data (QgsGeometry, layers) stays memory-only.
 """
 
+import hashlib
+
 from ..logging import get_logger
+from .disk_geometry_cache import (
+    DiskGeometryCache,
+    FORMAT_WKB,
+    wkt_to_payload
+)
 
 logger = get_logger(__name__)
 
@@ -52,18 +63,26 @@ class SourceGeometryCache:
         _cache: Dictionary mapping cache keys to geometry data
         _max_cache_size: Maximum number of cached entries (default: 10)
         _access_order: FIFO list for cache eviction
+        _disk_cache: Optional persistent second tier
     """
 
-    def __init__(self, max_size: int = 10):
+    def __init__(self, max_size: int = 10, disk_cache: DiskGeometryCache = None):
         """
         Initialize source geometry cache.
 
         Args:
             max_size: Maximum number of cached entries (default: 10)
+            disk_cache: Optional DiskGeometryCache used as second tier
         """
         self._cache = {}
         self._max_cache_size = max_size
         self._access_order = []  # FIFO: First In, First Out
+        self._disk_cache = disk_cache
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._disk_hits = 0
+        self._disk_misses = 0
         logger.info(f"✓ SourceGeometryCache initialized (max size: {max_size})")
 
     def get_cache_key(self, features, buffer_value, target_crs_authid, layer_id=None, subset_string=None):
@@ -93,7 +112,70 @@ class SourceGeometryCache:
         # subset_string is critical: if filter changes, geometry must be recalculated
         return (feature_ids, buffer_value, target_crs_authid, layer_id, subset_string)
 
-    def get(self, features, buffer_value, target_crs_authid, layer_id=None, subset_string=None):
+    @staticmethod
+    def _disk_key(key, layer_source=None):
+        """Derive the disk tier key from a memory key."""
+        feature_ids, buffer_value, target_crs_authid, layer_id, subset_string = key
+        ids_hash = hashlib.sha1(
+            ",".join(str(fid) for fid in feature_ids).encode(), usedforsecurity=False
+        ).hexdigest()
+        return DiskGeometryCache.make_key(
+            layer_source or layer_id or "",
+            subset_string,
+            buffer_value,
+            target_crs_authid,
+            f"{layer_id}:{ids_hash}"
+        )
+
+    @staticmethod
+    def _to_disk_payload(geometry_data):
+        """
+        Split geometry data into (payload, format, metadata) for the disk tier.
+
+        Returns:
+            tuple or None if the data cannot be persisted
+        """
+        if isinstance(geometry_data, str):
+            payload, geometry_format = wkt_to_payload(geometry_data)
+            return payload, geometry_format, {'kind': 'wkt'}
+        if isinstance(geometry_data, (bytes, bytearray, memoryview)):
+            return bytes(geometry_data), FORMAT_WKB, {'kind': 'wkb'}
+        if isinstance(geometry_data, dict):
+            for field in ('wkb', 'wkt'):
+                value = geometry_data.get(field)
+                if value is None:
+                    continue
+                extra = {k: v for k, v in geometry_data.items() if k != field}
+                if field == 'wkt' and isinstance(value, str):
+                    payload, geometry_format = wkt_to_payload(value)
+                elif field == 'wkb' and isinstance(value, (bytes, bytearray, memoryview)):
+                    payload, geometry_format = bytes(value), FORMAT_WKB
+                else:
+                    return None
+                return payload, geometry_format, {'kind': 'dict', 'field': field, 'extra': extra}
+        return None
+
+    @staticmethod
+    def _from_disk_hit(hit):
+        """Rebuild geometry data from a MappedGeometry (None if undecodable)."""
+        kind = hit.metadata.get('kind')
+        field = hit.metadata.get('field')
+        if kind == 'wkb' or (kind == 'dict' and field == 'wkb'):
+            # Zero-copy: the view keeps the file mapping alive
+            value = hit.wkb
+        else:
+            value = hit.to_wkt()
+            hit.close()
+            if value is None:
+                return None
+        if kind == 'dict':
+            data = dict(hit.metadata.get('extra') or {})
+            data[field] = value
+            return data
+        return value
+
+    def get(self, features, buffer_value, target_crs_authid, layer_id=None, subset_string=None,
+            layer_source=None, source_fingerprint=None):
         """
         Retrieve geometry from cache if it exists.
 
@@ -103,6 +185,9 @@ class SourceGeometryCache:
             target_crs_authid: Target CRS authid
             layer_id: Source layer ID (optional)
             subset_string: Active subset string (optional)
+            layer_source: Source URI used in the disk key (optional, defaults to layer_id)
+            source_fingerprint: Current source fingerprint; disk entries stored
+                under another fingerprint are dropped (optional)
 
         Returns:
             dict or None: Cached geometry data (wkt, bbox, etc.) or None if not found
@@ -115,13 +200,26 @@ class SourceGeometryCache:
                 self._access_order.remove(key)
             self._access_order.append(key)
 
+            self._hits += 1
             logger.info("✓ Cache HIT: Geometry retrieved from cache")
             return self._cache[key]
 
+        self._misses += 1
+        if self._disk_cache is not None:
+            hit = self._disk_cache.get(self._disk_key(key, layer_source), source_fingerprint)
+            geometry_data = self._from_disk_hit(hit) if hit is not None else None
+            if geometry_data is not None:
+                self._disk_hits += 1
+                self._put_memory(key, geometry_data)
+                logger.info("✓ Disk cache HIT: Geometry restored from persistent cache")
+                return geometry_data
+            self._disk_misses += 1
+
         logger.debug("Cache MISS: Geometry not in cache")
         return None
 
-    def put(self, features, buffer_value, target_crs_authid, geometry_data, layer_id=None, subset_string=None):
+    def put(self, features, buffer_value, target_crs_authid, geometry_data, layer_id=None, subset_string=None,
+            layer_source=None, source_fingerprint=None):
         """
         Store geometry in cache.
 
@@ -132,9 +230,26 @@ class SourceGeometryCache:
             geometry_data: Data to cache (dict with wkt, bbox, etc.)
             layer_id: Source layer ID (optional)
             subset_string: Active subset string (optional)
+            layer_source: Source URI used in the disk key (optional)
+            source_fingerprint: Source fingerprint stored with the disk entry (optional)
         """
         key = self.get_cache_key(features, buffer_value, target_crs_authid, layer_id, subset_string)
-
+        self._put_memory(key, geometry_data)
+
+        if self._disk_cache is not None:
+            persisted = self._to_disk_payload(geometry_data)
+            if persisted is not None:
+                payload, geometry_format, metadata = persisted
+                try:
+                    self._disk_cache.put(
+                        self._disk_key(key, layer_source), payload, layer_id or "",
+                        source_fingerprint or "", geometry_format=geometry_format, metadata=metadata
+                    )
+                except (TypeError, ValueError) as e:
+                    logger.debug(f"Geometry not persisted to disk cache: {e}")
+
+    def _put_memory(self, key, geometry_data):
+        """Insert into the in-memory FIFO tier."""
         # Check cache limit
         if len(self._cache) >= self._max_cache_size:
             # Remove oldest entry (FIFO)
@@ -142,6 +257,7 @@ class SourceGeometryCache:
                 oldest_key = self._access_order.pop(0)
                 if oldest_key in self._cache:
                     del self._cache[oldest_key]
+                    self._evictions += 1
                     logger.debug(f"Cache full: Removed oldest entry (size: {self._max_cache_size})")
 
         # Store in cache
@@ -178,6 +294,9 @@ class SourceGeometryCache:
         if keys_to_remove:
             logger.debug(f"Cache invalidated {len(keys_to_remove)} entries for layer {layer_id}")
 
+        if self._disk_cache is not None:
+            self._disk_cache.invalidate_layer(layer_id)
+
         return len(keys_to_remove)
 
     def get_stats(self):
@@ -185,13 +304,45 @@ class SourceGeometryCache:
         Get cache statistics.
 
         Returns:
-            dict: Statistics including size, max_size
+            dict: Statistics including size, max_size and per-tier hits
         """
         return {
             'size': len(self._cache),
             'max_size': self._max_cache_size,
-            'access_order_length': len(self._access_order)
+            'access_order_length': len(self._access_order),
+            'hits': self._hits,
+            'misses': self._misses,
+            'disk_enabled': self._disk_cache is not None,
+            'disk_hits': self._disk_hits,
+            'disk_misses': self._disk_misses
+        }
+
+    def get_tier_stats(self):
+        """
+        Per-tier hit/miss counters for CacheManager.get_global_stats().
+
+        Returns:
+            dict: Tier name ('memory', 'disk') -> counters
+        """
+        tiers = {
+            'memory': {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'total_size': len(self._cache),
+                'max_size': self._max_cache_size,
+            }
         }
+        if self._disk_cache is not None:
+            disk_stats = self._disk_cache.get_stats()
+            tiers['disk'] = {
+                'hits': self._disk_hits,
+                'misses': self._disk_misses,
+                'evictions': disk_stats['evictions'],
+                'total_size': disk_stats['total_bytes'],
+                'max_size': disk_stats['max_bytes'],
+            }
+        return tiers
 
     def __len__(self):
         """Return current cache size."""
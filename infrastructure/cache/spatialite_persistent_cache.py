@@ -9,10 +9,13 @@ Migrated from: before_migration/modules/backends/spatialite_cache.py (807 lines)
 Target: infrastructure/cache/spatialite_persistent_cache.py
 
 v4.1.0 - Hexagonal Architecture Migration (January 2026)
+v4.2.0 - Compact binary FID storage (October 2026)
+v4.2.0 - Pooled connections (October 2026)
 
 Features:
 - Persistent FID cache for each layer's filter results
-- Multi-step filtering via FID intersection
+- Multi-step filtering via run-based FID set intersection (see fid_set.py)
+- Automatic migration of legacy comma-separated FID rows
 - Automatic cleanup of stale cache entries
 - Thread-safe operations with proper locking
 - Support for both GeoPackage and native Spatialite layers
@@ -24,8 +27,10 @@ Architecture:
         ├── layer_id: QGIS layer ID
         ├── layer_source: Layer source path/connection
         ├── cache_key: Hash of filter parameters
-        ├── fids: Comma-separated list of matching FIDs
+        ├── fids: Legacy comma-separated FIDs (empty since schema v2)
+        ├── fids_blob: Encoded FidSet (run-length, raw or varint codec)
         ├── fid_count: Number of FIDs in cache
+        ├── run_count: Number of contiguous FID runs
         ├── created_at: Timestamp of cache creation
         ├── expires_at: Timestamp when cache expires
         └── metadata: JSON with additional info
@@ -45,11 +50,14 @@ import hashlib
 import logging
 import threading
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional, Dict, Set, Tuple, Any
+from typing import Iterable, List, Optional, Dict, Set, Tuple, Any, Union
 from contextlib import contextmanager
 
 from qgis.core import QgsVectorLayer
 
+from .fid_set import FidSet, FidSetDecodeError
+from ..database.connection_pool import get_spatialite_pool_manager
+
 logger = logging.getLogger('FilterMate.Cache.SpatialitePersistent')
 
 # Import config to get plugin directory
@@ -68,6 +76,8 @@ CACHE_TABLE_NAME = "filter_cache"
 CACHE_DEFAULT_TTL_HOURS = 24  # Default cache time-to-live
 CACHE_MAX_ENTRIES = 1000  # Maximum cache entries before cleanup
 CACHE_CLEANUP_THRESHOLD = 500  # Cleanup when more than this many expired entries
+CACHE_SCHEMA_VERSION = 2  # v2: binary fids_blob column replaces comma-separated fids
+CACHE_MIGRATION_BATCH_SIZE = 200  # Legacy rows converted per fetch during migration
 
 
 # =============================================================================
@@ -234,15 +244,17 @@ class SpatialitePersistentCache:
             cursor = conn.cursor()
 
             # Create main cache table
-            cursor.execute('''
+            cursor.execute(f'''
                 CREATE TABLE IF NOT EXISTS {CACHE_TABLE_NAME} (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     layer_id TEXT NOT NULL,
                     layer_source TEXT NOT NULL,
                     layer_name TEXT,
                     cache_key TEXT NOT NULL,
-                    fids TEXT NOT NULL,
+                    fids TEXT NOT NULL DEFAULT '',
+                    fids_blob BLOB,
                     fid_count INTEGER NOT NULL,
+                    run_count INTEGER DEFAULT 0,
                     created_at TEXT NOT NULL,
                     expires_at TEXT NOT NULL,
                     step_number INTEGER DEFAULT 1,
@@ -255,12 +267,12 @@ class SpatialitePersistentCache:
             ''')
 
             # Create indexes for fast lookups
-            cursor.execute('''
+            cursor.execute(f'''
                 CREATE INDEX IF NOT EXISTS idx_cache_layer_key
                 ON {CACHE_TABLE_NAME} (layer_id, cache_key)
             ''')
 
-            cursor.execute('''
+            cursor.execute(f'''
                 CREATE INDEX IF NOT EXISTS idx_cache_expires
                 ON {CACHE_TABLE_NAME} (expires_at)
             ''')
@@ -293,23 +305,88 @@ class SpatialitePersistentCache:
                 )
             ''')
 
+            self._migrate_fid_storage(conn)
+
             conn.commit()
 
+    def _migrate_fid_storage(self, conn: sqlite3.Connection) -> int:
+        """
+        Upgrade a schema v1 cache to binary FID storage.
+
+        Adds the ``fids_blob``/``run_count`` columns when missing and
+        re-encodes legacy comma-separated ``fids`` rows as FidSet blobs,
+        clearing the TEXT column to reclaim space.
+
+        Args:
+            conn: Open connection to the cache database
+
+        Returns:
+            int: Number of rows converted
+        """
+        cursor = conn.cursor()
+        cursor.execute('PRAGMA user_version')
+        if cursor.fetchone()[0] >= CACHE_SCHEMA_VERSION:
+            return 0
+
+        cursor.execute(f'PRAGMA table_info({CACHE_TABLE_NAME})')
+        columns = {row[1] for row in cursor.fetchall()}
+        if 'fids_blob' not in columns:
+            cursor.execute(f'ALTER TABLE {CACHE_TABLE_NAME} ADD COLUMN fids_blob BLOB')
+        if 'run_count' not in columns:
+            cursor.execute(f'ALTER TABLE {CACHE_TABLE_NAME} ADD COLUMN run_count INTEGER DEFAULT 0')
+
+        converted = 0
+        while True:
+            cursor.execute(f'''
+                SELECT id, fids FROM {CACHE_TABLE_NAME}
+                WHERE fids_blob IS NULL AND fids != ''
+                LIMIT ?
+            ''', (CACHE_MIGRATION_BATCH_SIZE,))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            updates = []
+            for row in rows:
+                fid_set = FidSet.from_text(row[1])
+                updates.append((fid_set.to_blob(), fid_set.run_count, len(fid_set), row[0]))
+            cursor.executemany(f'''
+                UPDATE {CACHE_TABLE_NAME}
+                SET fids_blob = ?, run_count = ?, fid_count = ?, fids = ''
+                WHERE id = ?
+            ''', updates)
+            converted += len(updates)
+
+        cursor.execute(f'PRAGMA user_version = {CACHE_SCHEMA_VERSION}')
+        if converted:
+            logger.info(f"Cache migration: converted {converted} legacy FID rows to binary storage")
+        return converted
+
+    @staticmethod
+    def _decode_row_fids(row: sqlite3.Row) -> FidSet:
+        """Decode the FID set of a cache row, accepting legacy TEXT rows."""
+        blob = row['fids_blob']
+        if blob is not None:
+            return FidSet.from_blob(blob)
+        return FidSet.from_text(row['fids'])
+
     @contextmanager
     def _get_connection(self):
         """
         Get a thread-safe database connection.
 
+        v4.2.0: Taken from the Spatialite pool (no extension needed here);
+        close() returns it for reuse by the same thread.
+
         Yields:
             sqlite3.Connection: Database connection
         """
         conn = None
         try:
-            conn = sqlite3.connect(
-                self.db_path,
-                timeout=30,
-                check_same_thread=False
+            conn = get_spatialite_pool_manager().get_connection(
+                self.db_path, load_spatialite=False, timeout=30
             )
+            # Same transaction behaviour as a default sqlite3 connection
+            conn.isolation_level = ''
             conn.row_factory = sqlite3.Row
             yield conn
         finally:
@@ -323,7 +400,7 @@ class SpatialitePersistentCache:
     def store_filter_result(
         self,
         layer: QgsVectorLayer,
-        fids: List[int],
+        fids: Union[Iterable[int], FidSet],
         source_geom_wkt: str,
         predicates: List[str],
         buffer_value: float = 0.0,
@@ -337,7 +414,7 @@ class SpatialitePersistentCache:
 
         Args:
             layer: Filtered layer
-            fids: List of matching FIDs
+            fids: Matching FIDs (iterable or FidSet)
             source_geom_wkt: Source geometry WKT
             predicates: Spatial predicates used
             buffer_value: Buffer distance
@@ -363,7 +440,9 @@ class SpatialitePersistentCache:
             # Prepare data
             now = datetime.now(timezone.utc)
             expires = now + timedelta(hours=ttl_hours)
-            fids_str = ",".join(str(f) for f in sorted(fids))
+            fid_set = FidSet.from_fids(fids)
+            fids_blob = fid_set.to_blob()
+            fid_count = len(fid_set)
             predicates_str = json.dumps(predicates)
 
             metadata = {
@@ -376,16 +455,18 @@ class SpatialitePersistentCache:
                 cursor = conn.cursor()
 
                 # Upsert cache entry
-                cursor.execute('''
+                cursor.execute(f'''
                     INSERT OR REPLACE INTO {CACHE_TABLE_NAME} (
                         layer_id, layer_source, layer_name, cache_key,
-                        fids, fid_count, created_at, expires_at,
+                        fids, fids_blob, fid_count, run_count,
+                        created_at, expires_at,
                         step_number, source_geom_hash, predicates,
                         buffer_value, metadata
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ) VALUES (?, ?, ?, ?, '', ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ''', (
                     layer_id, layer_source, layer_name, cache_key,
-                    fids_str, len(fids), now.isoformat(), expires.isoformat(),
+                    sqlite3.Binary(fids_blob), fid_count, fid_set.run_count,
+                    now.isoformat(), expires.isoformat(),
                     step_number, source_geom_hash, predicates_str,
                     buffer_value, json.dumps(metadata)
                 ))
@@ -399,28 +480,28 @@ class SpatialitePersistentCache:
                         ) VALUES (?, ?, ?, ?, ?, ?)
                     ''', (
                         session_id, layer_id, step_number, cache_key,
-                        len(fids), now.isoformat()
+                        fid_count, now.isoformat()
                     ))
 
                 conn.commit()
 
             logger.debug(
-                f"Cache stored: {layer_name} → {len(fids)} FIDs "
-                f"(step {step_number}, key={cache_key[:8]})"
+                f"Cache stored: {layer_name} → {fid_count} FIDs in {fid_set.run_count} runs, "
+                f"{len(fids_blob)} bytes (step {step_number}, key={cache_key[:8]})"
             )
 
             return cache_key
 
-    def get_cached_fids(
+    def get_cached_fid_set(
         self,
         layer: QgsVectorLayer,
         source_geom_wkt: str,
         predicates: List[str],
         buffer_value: float = 0.0,
         use_centroids: bool = False
-    ) -> Optional[Set[int]]:
+    ) -> Optional[FidSet]:
         """
-        Get cached FIDs for a layer with given filter parameters.
+        Get cached FIDs for a layer as a compact FidSet.
 
         Args:
             layer: Layer to get cache for
@@ -430,7 +511,7 @@ class SpatialitePersistentCache:
             use_centroids: Whether centroids are used
 
         Returns:
-            Set of FIDs if cache hit, None if cache miss
+            FidSet if cache hit, None if cache miss
         """
         layer_id = layer.id()
         source_geom_hash = _hash_geometry(source_geom_wkt)
@@ -442,47 +523,66 @@ class SpatialitePersistentCache:
             cursor = conn.cursor()
 
             now = datetime.now(timezone.utc).isoformat()
-            cursor.execute('''
-                SELECT fids, fid_count FROM {CACHE_TABLE_NAME}
+            cursor.execute(f'''
+                SELECT fids, fids_blob, fid_count FROM {CACHE_TABLE_NAME}
                 WHERE layer_id = ? AND cache_key = ? AND expires_at > ?
             ''', (layer_id, cache_key, now))
 
             row = cursor.fetchone()
             if row:
-                fids_str = row['fids']
-                fids = set(int(f) for f in fids_str.split(',') if f)
+                try:
+                    fid_set = self._decode_row_fids(row)
+                except FidSetDecodeError as e:
+                    logger.warning(f"Cache entry unreadable for {layer.name()}: {e}")
+                    return None
                 logger.debug(
-                    f"Cache HIT: {layer.name()} → {len(fids)} FIDs (key={cache_key[:8]})"
+                    f"Cache HIT: {layer.name()} → {len(fid_set)} FIDs (key={cache_key[:8]})"
                 )
-                return fids
+                return fid_set
 
         return None
 
-    def get_previous_fids(
+    def get_cached_fids(
         self,
         layer: QgsVectorLayer,
-        current_source_geom_wkt: Optional[str] = None,
-        current_buffer_value: Optional[float] = None,
-        current_predicates: Optional[List[str]] = None
+        source_geom_wkt: str,
+        predicates: List[str],
+        buffer_value: float = 0.0,
+        use_centroids: bool = False
     ) -> Optional[Set[int]]:
         """
-        Get the most recent cached FIDs for a layer (for multi-step filtering).
-
-        Only returns previous FIDs if all filter parameters match:
-        - Source geometry hash must match
-        - Buffer value must match
-        - Predicates must match
+        Get cached FIDs for a layer with given filter parameters.
 
-        This prevents incorrect intersection when filter parameters change.
+        Prefer get_cached_fid_set() for large layers: this expands every FID
+        into a Python int.
 
         Args:
-            layer: Layer to get previous FIDs for
-            current_source_geom_wkt: Current source geometry WKT
-            current_buffer_value: Current buffer value
-            current_predicates: Current predicates list
+            layer: Layer to get cache for
+            source_geom_wkt: Source geometry WKT
+            predicates: Spatial predicates
+            buffer_value: Buffer distance
+            use_centroids: Whether centroids are used
 
         Returns:
-            Set of FIDs from most recent cache, None if no cache or parameter mismatch
+            Set of FIDs if cache hit, None if cache miss
+        """
+        fid_set = self.get_cached_fid_set(
+            layer, source_geom_wkt, predicates, buffer_value, use_centroids
+        )
+        return fid_set.to_set() if fid_set is not None else None
+
+    def _get_previous_entry(
+        self,
+        layer: QgsVectorLayer,
+        current_source_geom_wkt: Optional[str] = None,
+        current_buffer_value: Optional[float] = None,
+        current_predicates: Optional[List[str]] = None
+    ) -> Optional[Tuple[FidSet, int]]:
+        """
+        Get the most recent cache entry for a layer if its parameters match.
+
+        Returns:
+            Tuple of (FidSet, step number), None if no cache or parameter mismatch
         """
         layer_id = layer.id()
 
@@ -495,8 +595,9 @@ class SpatialitePersistentCache:
             cursor = conn.cursor()
 
             now = datetime.now(timezone.utc).isoformat()
-            cursor.execute('''
-                SELECT fids, fid_count, step_number, source_geom_hash, buffer_value, predicates
+            cursor.execute(f'''
+                SELECT fids, fids_blob, fid_count, step_number,
+                       source_geom_hash, buffer_value, predicates
                 FROM {CACHE_TABLE_NAME}
                 WHERE layer_id = ? AND expires_at > ?
                 ORDER BY created_at DESC
@@ -504,98 +605,146 @@ class SpatialitePersistentCache:
             ''', (layer_id, now))
 
             row = cursor.fetchone()
-            if row:
-                cached_geom_hash = row['source_geom_hash']
-                cached_buffer_value = row['buffer_value']
-                cached_predicates_str = row['predicates']
-
-                # Check geometry hash match
-                if current_geom_hash and cached_geom_hash:
-                    if current_geom_hash != cached_geom_hash:
+            if not row:
+                return None
+
+            cached_geom_hash = row['source_geom_hash']
+            cached_buffer_value = row['buffer_value']
+            cached_predicates_str = row['predicates']
+
+            # Check geometry hash match
+            if current_geom_hash and cached_geom_hash:
+                if current_geom_hash != cached_geom_hash:
+                    logger.debug(
+                        f"Cache SKIP: {layer.name()} → source geometry changed"
+                    )
+                    return None
+
+            # Check buffer_value match
+            if current_buffer_value is not None and cached_buffer_value is not None:
+                if abs(current_buffer_value - cached_buffer_value) > 0.001:
+                    logger.debug(
+                        f"Cache SKIP: {layer.name()} → buffer changed "
+                        f"({cached_buffer_value} → {current_buffer_value})"
+                    )
+                    return None
+
+            # Check predicates match
+            if current_predicates is not None and cached_predicates_str:
+                try:
+                    cached_predicates = json.loads(cached_predicates_str)
+                    if sorted(current_predicates) != sorted(cached_predicates):
                         logger.debug(
-                            f"Cache SKIP: {layer.name()} → source geometry changed"
+                            f"Cache SKIP: {layer.name()} → predicates changed"
                         )
                         return None
+                except (json.JSONDecodeError, TypeError):
+                    pass
 
-                # Check buffer_value match
-                if current_buffer_value is not None and cached_buffer_value is not None:
-                    if abs(current_buffer_value - cached_buffer_value) > 0.001:
-                        logger.debug(
-                            f"Cache SKIP: {layer.name()} → buffer changed "
-                            f"({cached_buffer_value} → {current_buffer_value})"
-                        )
-                        return None
+            try:
+                fid_set = self._decode_row_fids(row)
+            except FidSetDecodeError as e:
+                logger.warning(f"Cache entry unreadable for {layer.name()}: {e}")
+                return None
 
-                # Check predicates match
-                if current_predicates is not None and cached_predicates_str:
-                    try:
-                        cached_predicates = json.loads(cached_predicates_str)
-                        if sorted(current_predicates) != sorted(cached_predicates):
-                            logger.debug(
-                                f"Cache SKIP: {layer.name()} → predicates changed"
-                            )
-                            return None
-                    except (json.JSONDecodeError, TypeError):
-                        pass
-
-                fids_str = row['fids']
-                fids = set(int(f) for f in fids_str.split(',') if f)
-                step = row['step_number']
-                logger.debug(
-                    f"Previous FIDs: {layer.name()} → {len(fids)} FIDs (step {step})"
-                )
-                return fids
+            step = row['step_number']
+            logger.debug(
+                f"Previous FIDs: {layer.name()} → {len(fid_set)} FIDs "
+                f"in {fid_set.run_count} runs (step {step})"
+            )
+            return fid_set, step
 
-        return None
+    def get_previous_fid_set(
+        self,
+        layer: QgsVectorLayer,
+        current_source_geom_wkt: Optional[str] = None,
+        current_buffer_value: Optional[float] = None,
+        current_predicates: Optional[List[str]] = None
+    ) -> Optional[FidSet]:
+        """
+        Get the most recent cached FIDs for a layer as a compact FidSet.
+
+        See get_previous_fids() for the parameter-matching rules.
+        """
+        entry = self._get_previous_entry(
+            layer, current_source_geom_wkt, current_buffer_value, current_predicates
+        )
+        return entry[0] if entry else None
+
+    def get_previous_fids(
+        self,
+        layer: QgsVectorLayer,
+        current_source_geom_wkt: Optional[str] = None,
+        current_buffer_value: Optional[float] = None,
+        current_predicates: Optional[List[str]] = None
+    ) -> Optional[Set[int]]:
+        """
+        Get the most recent cached FIDs for a layer (for multi-step filtering).
+
+        Only returns previous FIDs if all filter parameters match:
+        - Source geometry hash must match
+        - Buffer value must match
+        - Predicates must match
+
+        This prevents incorrect intersection when filter parameters change.
+
+        Args:
+            layer: Layer to get previous FIDs for
+            current_source_geom_wkt: Current source geometry WKT
+            current_buffer_value: Current buffer value
+            current_predicates: Current predicates list
+
+        Returns:
+            Set of FIDs from most recent cache, None if no cache or parameter mismatch
+        """
+        fid_set = self.get_previous_fid_set(
+            layer, current_source_geom_wkt, current_buffer_value, current_predicates
+        )
+        return fid_set.to_set() if fid_set is not None else None
 
     def intersect_with_previous(
         self,
         layer: QgsVectorLayer,
-        new_fids: Set[int],
+        new_fids: Union[Set[int], FidSet],
         current_source_geom_wkt: Optional[str] = None,
         current_buffer_value: Optional[float] = None,
         current_predicates: Optional[List[str]] = None
-    ) -> Tuple[Set[int], int]:
+    ) -> Tuple[Union[Set[int], FidSet], int]:
         """
         Intersect new FIDs with previously cached FIDs for multi-step filtering.
 
         Only intersects if all filter parameters match to prevent incorrect results.
+        The intersection runs on FID runs, so passing a FidSet keeps the whole
+        step proportional to the number of runs rather than features.
 
         Args:
             layer: Layer being filtered
-            new_fids: New FIDs from current filter operation
+            new_fids: New FIDs from current filter operation (set or FidSet)
             current_source_geom_wkt: Current source geometry WKT
             current_buffer_value: Current buffer value
             current_predicates: Current predicates
 
         Returns:
-            Tuple of (intersected FIDs, step number)
+            Tuple of (intersected FIDs, step number). The FIDs have the same
+            type as ``new_fids``.
         """
-        previous_fids = self.get_previous_fids(
+        entry = self._get_previous_entry(
             layer, current_source_geom_wkt, current_buffer_value, current_predicates
         )
 
-        if previous_fids is not None:
-            # Intersect with previous results
-            intersected = new_fids & previous_fids
-
-            # Get previous step number
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT step_number FROM {CACHE_TABLE_NAME}
-                    WHERE layer_id = ?
-                    ORDER BY created_at DESC
-                    LIMIT 1
-                ''', (layer.id(),))
-                row = cursor.fetchone()
-                prev_step = row['step_number'] if row else 0
+        if entry is not None:
+            previous, prev_step = entry
+            new_set = FidSet.from_fids(new_fids)
+            intersected = previous & new_set
 
             logger.debug(
-                f"Multi-step intersection: {len(previous_fids)} ∩ {len(new_fids)} = {len(intersected)}"
+                f"Multi-step intersection: {len(previous)} ∩ {len(new_set)} = {len(intersected)} "
+                f"({previous.run_count} ∩ {new_set.run_count} runs)"
             )
 
-            return intersected, prev_step + 1
+            if isinstance(new_fids, FidSet):
+                return intersected, prev_step + 1
+            return intersected.to_set(), prev_step + 1
 
         return new_fids, 1
 
@@ -653,7 +802,7 @@ class SpatialitePersistentCache:
                 cursor = conn.cursor()
 
                 now = datetime.now(timezone.utc).isoformat()
-                cursor.execute('''
+                cursor.execute(f'''
                     DELETE FROM {CACHE_TABLE_NAME} WHERE expires_at < ?
                 ''', (now,))
 
@@ -678,7 +827,7 @@ class SpatialitePersistentCache:
         with self._lock:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute('''
+                cursor.execute(f'''
                     DELETE FROM {CACHE_TABLE_NAME} WHERE layer_id = ?
                 ''', (layer_id,))
                 deleted = cursor.rowcount
@@ -718,14 +867,19 @@ class SpatialitePersistentCache:
             cursor.execute(f'SELECT COUNT(*) as count FROM {CACHE_TABLE_NAME}')  # nosec B608
             total_entries = cursor.fetchone()['count']
 
-            cursor.execute('''
-                SELECT SUM(fid_count) as total_fids FROM {CACHE_TABLE_NAME}
+            cursor.execute(f'''
+                SELECT SUM(fid_count) as total_fids,
+                       SUM(run_count) as total_runs,
+                       SUM(LENGTH(fids_blob)) as fid_bytes
+                FROM {CACHE_TABLE_NAME}
             ''')
             row = cursor.fetchone()
-            total_fids = row['total_fids'] or 0 if row else 0
+            total_fids = (row['total_fids'] or 0) if row else 0
+            total_runs = (row['total_runs'] or 0) if row else 0
+            fid_bytes = (row['fid_bytes'] or 0) if row else 0
 
             now = datetime.now(timezone.utc).isoformat()
-            cursor.execute('''
+            cursor.execute(f'''
                 SELECT COUNT(*) as count FROM {CACHE_TABLE_NAME}
                 WHERE expires_at < ?
             ''', (now,))
@@ -739,6 +893,8 @@ class SpatialitePersistentCache:
                 "total_entries": total_entries,
                 "expired_entries": expired_entries,
                 "total_fids_cached": total_fids,
+                "total_fid_runs": total_runs,
+                "fid_storage_bytes": fid_bytes,
                 "db_size_bytes": db_size,
                 "db_size_mb": round(db_size / (1024 * 1024), 2)
             }
@@ -761,7 +917,7 @@ def get_persistent_cache() -> SpatialitePersistentCache:
 
 def store_filter_fids(
     layer: QgsVectorLayer,
-    fids: List[int],
+    fids: Union[Iterable[int], FidSet],
     source_geom_wkt: str,
     predicates: List[str],
     buffer_value: float = 0.0,
@@ -789,11 +945,11 @@ def get_previous_filter_fids(
 
 def intersect_filter_fids(
     layer: QgsVectorLayer,
-    new_fids: Set[int],
+    new_fids: Union[Set[int], FidSet],
     current_source_geom_wkt: Optional[str] = None,
     current_buffer_value: Optional[float] = None,
     current_predicates: Optional[List[str]] = None
-) -> Tuple[Set[int], int]:
+) -> Tuple[Union[Set[int], FidSet], int]:
     """Convenience function to intersect with previous FIDs."""
     return get_persistent_cache().intersect_with_previous(
         layer, new_fids, current_source_geom_wkt, current_buffer_value, current_predicates
@@ -822,4 +978,5 @@ __all__ = [
     'CACHE_DB_NAME',
     'CACHE_TABLE_NAME',
     'CACHE_DEFAULT_TTL_HOURS',
+    'CACHE_SCHEMA_VERSION',
 ]
@@ -15,6 +15,7 @@ Features:
 - Automatic expiration and eviction
 - Layer-based invalidation
 - Statistics tracking for monitoring
+- Optional persistent disk tier (v4.2.0, see disk_geometry_cache.py)
 """
 
 import threading
@@ -28,7 +29,13 @@ from collections import OrderedDict
 from ..constants import (
     WKT_CACHE_MAX_SIZE,
     WKT_CACHE_MAX_LENGTH,
-    WKT_CACHE_TTL_SECONDS
+    WKT_CACHE_TTL_SECONDS,
+    DISK_GEOMETRY_CACHE_ENABLED
+)
+from .disk_geometry_cache import (
+    DiskGeometryCache,
+    get_disk_geometry_cache,
+    wkt_to_payload
 )
 
 logger = logging.getLogger('FilterMate.Cache.WKT')
@@ -94,6 +101,10 @@ class WKTCache:
 
         # Invalidate when layer changes
         cache.invalidate_for_layer("layer_xyz")
+
+    With a ``disk_cache``, memory misses fall through to the persistent
+    tier and disk hits are promoted back into memory. Entries too large
+    for the memory tier are still persisted on disk.
     """
 
     _instance: Optional['WKTCache'] = None
@@ -103,7 +114,8 @@ class WKTCache:
         self,
         max_size: Optional[int] = None,
         max_wkt_length: Optional[int] = None,
-        ttl_seconds: Optional[int] = None
+        ttl_seconds: Optional[int] = None,
+        disk_cache: Optional[DiskGeometryCache] = None
     ):
         """
         Initialize WKT cache.
@@ -112,6 +124,7 @@ class WKTCache:
             max_size: Maximum number of entries (default: WKT_CACHE_MAX_SIZE)
             max_wkt_length: Maximum WKT length to cache (default: WKT_CACHE_MAX_LENGTH)
             ttl_seconds: Time-to-live in seconds (default: WKT_CACHE_TTL_SECONDS)
+            disk_cache: Optional persistent second tier
         """
         self.max_size = max_size or WKT_CACHE_MAX_SIZE
         self.max_wkt_length = max_wkt_length or WKT_CACHE_MAX_LENGTH
@@ -127,13 +140,20 @@ class WKTCache:
         self._evictions: int = 0
         self._expirations: int = 0
 
+        # Persistent tier
+        self._disk_cache = disk_cache
+        self._disk_hits: int = 0
+        self._disk_misses: int = 0
+
     @classmethod
     def get_instance(cls) -> 'WKTCache':
         """Get singleton instance of WKTCache."""
         if cls._instance is None:
             with cls._lock:
                 if cls._instance is None:
-                    cls._instance = WKTCache()
+                    disk_cache = get_disk_geometry_cache() if DISK_GEOMETRY_CACHE_ENABLED else None
+                    cls._instance = WKTCache(disk_cache=disk_cache)
+                    _register_with_cache_manager(cls._instance)
                     logger.info("✓ WKTCache initialized")
         return cls._instance
 
@@ -181,12 +201,19 @@ class WKTCache:
 
         return "|".join(parts)
 
-    def get(self, key: str) -> Optional[Tuple[str, int]]:
+    @staticmethod
+    def _disk_key(key: str) -> str:
+        """Disk tier key; WKT cache keys already encode layer, selection and buffer."""
+        return DiskGeometryCache.make_key(f"wkt|{key}")
+
+    def get(self, key: str, source_fingerprint: Optional[str] = None) -> Optional[Tuple[str, int]]:
         """
         Get WKT from cache.
 
         Args:
             key: Cache key
+            source_fingerprint: Current layer source fingerprint, checked
+                against disk entries (see layer_source_fingerprint)
 
         Returns:
             Tuple of (wkt, srid) or None if not found/expired
@@ -196,13 +223,16 @@ class WKTCache:
 
             if entry is None:
                 self._misses += 1
-                return None
+                return self._get_from_disk(key, source_fingerprint)
 
             if entry.is_expired:
                 self._remove(key)
                 self._expirations += 1
                 self._misses += 1
                 logger.debug(f"WKT cache expired: {key}")
+                # The disk copy is as old as the memory entry
+                if self._disk_cache is not None:
+                    self._disk_cache.invalidate(self._disk_key(key))
                 return None
 
             # Move to end (LRU)
@@ -213,12 +243,43 @@ class WKTCache:
             logger.debug(f"WKT cache hit: {key} (access #{entry.access_count})")
             return (entry.wkt, entry.srid)
 
+    def _get_from_disk(self, key: str, source_fingerprint: Optional[str]) -> Optional[Tuple[str, int]]:
+        """Look up the disk tier after a memory miss and promote the hit."""
+        if self._disk_cache is None:
+            return None
+
+        wkt = None
+        disk_key = self._disk_key(key)
+        hit = self._disk_cache.get(disk_key, source_fingerprint)
+        if hit is not None:
+            with hit:
+                created_at = hit.metadata.get('created_at', 0)
+                if time.time() - created_at <= self.ttl_seconds:
+                    wkt = hit.to_wkt()
+                    srid = hit.srid
+                    layer_id = hit.metadata.get('source_layer_id', '')
+            if wkt is None:
+                # Same TTL as the memory tier
+                self._disk_cache.invalidate(disk_key)
+                self._expirations += 1
+
+        if wkt is None:
+            self._disk_misses += 1
+            return None
+
+        self._disk_hits += 1
+        logger.debug(f"WKT disk cache hit: {key}")
+        if len(wkt) <= self.max_wkt_length:
+            self._put_memory(key, wkt, srid, layer_id, creation_time=created_at)
+        return (wkt, srid)
+
     def put(
         self,
         key: str,
         wkt: str,
         srid: int,
-        source_layer_id: str
+        source_layer_id: str,
+        source_fingerprint: str = ""
     ) -> bool:
         """
         Put WKT into cache.
@@ -228,15 +289,30 @@ class WKTCache:
             wkt: WKT geometry string
             srid: SRID
             source_layer_id: Source layer ID for invalidation
+            source_fingerprint: Layer source fingerprint stored with the disk entry
 
         Returns:
-            True if cached, False if too large
+            True if cached in at least one tier, False if too large
         """
+        stored_on_disk = False
+        if self._disk_cache is not None:
+            payload, geometry_format = wkt_to_payload(wkt)
+            stored_on_disk = self._disk_cache.put(
+                self._disk_key(key), payload, source_layer_id, source_fingerprint,
+                srid=srid, geometry_format=geometry_format,
+                metadata={'source_layer_id': source_layer_id, 'created_at': time.time()}
+            )
+
         # Check WKT length
         if len(wkt) > self.max_wkt_length:
             logger.debug(f"WKT too large to cache: {len(wkt)} > {self.max_wkt_length}")
-            return False
+            return stored_on_disk
+
+        return self._put_memory(key, wkt, srid, source_layer_id)
 
+    def _put_memory(self, key: str, wkt: str, srid: int, source_layer_id: str,
+                    creation_time: Optional[float] = None) -> bool:
+        """Insert into the in-memory LRU tier (creation_time keeps a disk entry's age)."""
         with self._cache_lock:
             # Evict if at capacity
             while len(self._cache) >= self.max_size:
@@ -249,6 +325,8 @@ class WKTCache:
                 srid=srid,
                 source_layer_id=source_layer_id
             )
+            if creation_time is not None:
+                entry.creation_time = creation_time
 
             self._cache[key] = entry
 
@@ -319,11 +397,12 @@ class WKTCache:
             True if entry was found and removed
         """
         with self._cache_lock:
+            found_on_disk = bool(self._disk_cache and self._disk_cache.invalidate(self._disk_key(key)))
             if key in self._cache:
                 self._remove(key)
                 logger.debug(f"WKT cache invalidated: {key}")
                 return True
-            return False
+            return found_on_disk
 
     def invalidate_for_layer(self, layer_id: str) -> int:
         """
@@ -347,6 +426,9 @@ class WKTCache:
             if keys:
                 logger.info(f"WKT cache: invalidated {len(keys)} entries for layer {layer_id}")
 
+            if self._disk_cache is not None:
+                self._disk_cache.invalidate_layer(layer_id)
+
             return len(keys)
 
     def clear(self):
@@ -389,6 +471,7 @@ class WKTCache:
         """Get cache statistics."""
         with self._cache_lock:
             total_wkt_size = sum(len(e.wkt) for e in self._cache.values())
+            disk_lookups = self._disk_hits + self._disk_misses
             return {
                 'entries': len(self._cache),
                 'layers': len(self._layer_keys),
@@ -397,9 +480,41 @@ class WKTCache:
                 'misses': self._misses,
                 'hit_rate': self.hit_rate,
                 'evictions': self._evictions,
-                'expirations': self._expirations
+                'expirations': self._expirations,
+                'disk_enabled': self._disk_cache is not None,
+                'disk_hits': self._disk_hits,
+                'disk_misses': self._disk_misses,
+                'disk_hit_rate': self._disk_hits / disk_lookups if disk_lookups else 0.0
             }
 
+    def get_tier_stats(self) -> Dict[str, Dict]:
+        """
+        Per-tier hit/miss counters for CacheManager.get_global_stats().
+
+        Returns:
+            Dict of tier name ('memory', 'disk') -> counters
+        """
+        with self._cache_lock:
+            tiers = {
+                'memory': {
+                    'hits': self._hits,
+                    'misses': self._misses,
+                    'evictions': self._evictions + self._expirations,
+                    'total_size': len(self._cache),
+                    'max_size': self.max_size,
+                }
+            }
+            if self._disk_cache is not None:
+                disk_stats = self._disk_cache.get_stats()
+                tiers['disk'] = {
+                    'hits': self._disk_hits,
+                    'misses': self._disk_misses,
+                    'evictions': disk_stats['evictions'],
+                    'total_size': disk_stats['total_bytes'],
+                    'max_size': disk_stats['max_bytes'],
+                }
+            return tiers
+
     def __len__(self) -> int:
         """Number of cached entries."""
         return len(self._cache)
@@ -412,6 +527,18 @@ class WKTCache:
         )
 
 
+def _register_with_cache_manager(cache: WKTCache):
+    """Expose the global WKT cache in CacheManager statistics."""
+    from .cache_manager import CacheConfig, CachePolicy, CacheManager
+    manager = CacheManager.get_instance()
+    if manager.get_cache("wkt") is None:
+        manager.register_cache(
+            "wkt", cache,
+            CacheConfig(name="wkt", max_size=cache.max_size, policy=CachePolicy.LRU,
+                        ttl_seconds=cache.ttl_seconds)
+        )
+
+
 # Convenience function
 def get_wkt_cache() -> WKTCache:
     """Get the global WKT cache instance."""
@@ -197,6 +197,13 @@ WKT_CACHE_MAX_SIZE = 10                 # Max number of WKT geometries to cache
 WKT_CACHE_MAX_LENGTH = 500000           # Max WKT length to cache (500KB)
 WKT_CACHE_TTL_SECONDS = 300             # Cache TTL (5 minutes)
 
+# Persistent on-disk geometry cache (second tier behind WKT/geometry caches)
+DISK_GEOMETRY_CACHE_ENABLED = True      # Persist prepared source geometries across sessions
+DISK_GEOMETRY_CACHE_DIRNAME = "geometry_cache"  # Sub-directory of the plugin config directory
+DISK_GEOMETRY_CACHE_MAX_BYTES = 256 * 1024 * 1024   # Total on-disk budget (256MB, LRU-evicted)
+DISK_GEOMETRY_CACHE_MAX_ENTRY_BYTES = 64 * 1024 * 1024  # Largest single blob accepted (64MB)
+DISK_GEOMETRY_CACHE_MAX_AGE_DAYS = 30   # Entries unused for longer are evicted
+
 # OGR Spatial Index settings
 SPATIAL_INDEX_AUTO_CREATE = True        # Auto-create spatial indexes
 SPATIAL_INDEX_MIN_FEATURES = 1000       # Min features to trigger auto-index
@@ -278,6 +285,14 @@ TABLE_PREFIX_MATERIALIZED = 'fm_temp_mv_'  # Materialized views
 TABLE_PREFIX_BUFFER = 'fm_temp_buf_'    # Buffer geometry tables
 TABLE_PREFIX_SOURCE = 'fm_temp_src_'    # Source selection tables/MVs
 
+# Binary source geometry transport (WKB uploaded once, referenced by id)
+GEOMETRY_TRANSPORT_ENABLED = True       # Upload large source geometries instead of inlining WKT
+GEOMETRY_TRANSPORT_MIN_WKT_LENGTH = 10000  # Below this, an inline WKT literal is cheaper
+# Source geometry table (PostgreSQL: in the FilterMate temp schema). Not fm_temp_*: rows may be
+# shared by several sessions, they are released by reference counting instead of session cleanup
+GEOMETRY_TRANSPORT_TABLE = 'fm_source_geoms'
+GEOMETRY_TRANSPORT_REFS_TABLE = 'fm_source_geom_refs'  # PostgreSQL: (geom_id, QGIS instance) in use
+
 # =============================================================================
 # UI Constants
 # =============================================================================
@@ -546,6 +561,11 @@ __all__ = [
     'WKT_CACHE_MAX_SIZE',
     'WKT_CACHE_MAX_LENGTH',
     'WKT_CACHE_TTL_SECONDS',
+    'DISK_GEOMETRY_CACHE_ENABLED',
+    'DISK_GEOMETRY_CACHE_DIRNAME',
+    'DISK_GEOMETRY_CACHE_MAX_BYTES',
+    'DISK_GEOMETRY_CACHE_MAX_ENTRY_BYTES',
+    'DISK_GEOMETRY_CACHE_MAX_AGE_DAYS',
     'SPATIAL_INDEX_AUTO_CREATE',
     'SPATIAL_INDEX_MIN_FEATURES',
     'FACTORY_CACHE_MAX_AGE',
@@ -590,6 +610,9 @@ __all__ = [
     'DEFAULT_TEMP_SCHEMA',
     'TABLE_PREFIX_TEMP',
     'TABLE_PREFIX_MATERIALIZED',
+    'GEOMETRY_TRANSPORT_ENABLED',
+    'GEOMETRY_TRANSPORT_MIN_WKT_LENGTH',
+    'GEOMETRY_TRANSPORT_TABLE',
     # UI constants
     'TAB_EXPLORING',
     'TAB_FILTERING',
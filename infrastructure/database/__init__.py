@@ -11,6 +11,8 @@ Exports:
     - SpatialitePreparedStatements: Spatialite implementation
     - NullPreparedStatements: Null object pattern implementation
     - Connection Pool: PostgreSQL connection pooling (v4.0.4)
+    - Spatialite Pool: per-file Spatialite/GeoPackage connection pooling (v4.2.0)
+    - Query Profiler: slow-query ring buffer with EXPLAIN capture (v4.2.0)
 """
 
 from .prepared_statements import (  # noqa: F401
@@ -32,6 +34,11 @@ from .connection_pool import (  # noqa: F401
     PostgreSQLConnectionPool,
     PostgreSQLPoolManager,
     PoolStats,
+    # v4.2.0: Spatialite/GeoPackage pooling
+    get_spatialite_pool_manager,
+    SpatialiteConnectionPool,
+    SpatialitePoolManager,
+    PooledSQLiteConnection,
     # Legacy compatibility
     get_pool,
     register_pool,
@@ -59,6 +66,13 @@ from .sql_utils import (  # noqa: F401
     format_pk_values_for_sql,
 )
 
+# v4.2.0: Slow-query profiler
+from .query_profiler import (  # noqa: F401
+    QueryProfiler,
+    QueryRecord,
+    get_query_profiler,
+)
+
 __all__ = [
     # Prepared Statements
     'PreparedStatementManager',
@@ -93,4 +107,8 @@ __all__ = [
     'safe_set_subset_string',
     'create_temp_spatialite_table',
     'format_pk_values_for_sql',
+    # Query Profiler (v4.2.0)
+    'QueryProfiler',
+    'QueryRecord',
+    'get_query_profiler',
 ]
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """
-PostgreSQL Connection Pool for FilterMate
+PostgreSQL and Spatialite Connection Pools for FilterMate
 
 Provides efficient connection pooling to avoid the overhead of opening/closing
 connections for each operation. Significantly improves performance for:
@@ -43,12 +43,26 @@ Usage:
             cursor = conn.cursor()
             cursor.execute("SELECT ...")
 
+Spatialite/GeoPackage (v4.2.0):
+    One pool per database file with mod_spatialite preloaded and WAL set
+    once per connection. close() on a pooled connection returns it, so
+    spatialite_connect() callers are unchanged:
+
+    conn = get_spatialite_pool_manager().get_connection(db_path)
+    try:
+        conn.execute("SELECT ...")
+    finally:
+        conn.close()
+
 Author: FilterMate Team
 Date: January 2026
 Migration: Restored from before_migration for v4.0.4
+v4.2.0 - Spatialite connection pool (October 2026)
 """
 
 import logging
+import os
+import sqlite3
 import threading
 import time
 import atexit
@@ -906,13 +920,496 @@ def pooled_connection_from_layer(layer, timeout: float = None) -> Generator:
             release_pooled_connection(conn, source_uri)
 
 
+# =============================================================================
+# Spatialite / GeoPackage connection pool (v4.2.0)
+# =============================================================================
+
+SPATIALITE_EXTENSIONS = ('mod_spatialite', 'mod_spatialite.dll', 'libspatialite')
+
+
+class PooledSQLiteConnection(sqlite3.Connection):
+    """
+    sqlite3 connection whose close() returns it to its pool.
+
+    Callers keep the plain connect/close pattern. Once released, the
+    connection refuses new statements like a closed one, so a stale
+    reference cannot run on a connection handed to another caller.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pool: Optional['SpatialiteConnectionPool'] = None
+        self._owner_thread = threading.get_ident()
+        self._leased = True
+        self._released_at = 0.0
+
+    def _check_leased(self):
+        if not self._leased:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+
+    def cursor(self, *args, **kwargs):
+        self._check_leased()
+        return super().cursor(*args, **kwargs)
+
+    def execute(self, *args, **kwargs):
+        self._check_leased()
+        return super().execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        self._check_leased()
+        return super().executemany(*args, **kwargs)
+
+    def executescript(self, *args, **kwargs):
+        self._check_leased()
+        return super().executescript(*args, **kwargs)
+
+    def close(self):
+        """Return the connection to its pool (closes it when unpooled)."""
+        if self._pool is not None:
+            if self._leased:
+                self._pool.release_connection(self)
+            return
+        super().close()
+
+    def _close_for_real(self):
+        super().close()
+
+
+class SpatialiteConnectionPool:
+    """
+    Per-file pool of SQLite connections with mod_spatialite preloaded.
+
+    Loading mod_spatialite and configuring WAL costs tens of milliseconds per
+    connection; the pool pays it once per connection instead of once per use.
+
+    Features:
+    - Extension loaded and PRAGMAs applied once, at connection creation
+    - Per-thread affinity: an idle connection is only handed back to the
+      thread that created it (QgsTask worker threads are reused)
+    - Session state reset on release: open transaction rolled back, TEMP
+      objects dropped, attached databases detached, row_factory cleared
+    - Idle eviction: connections unused for idle_timeout, or owned by a
+      thread that has exited, are closed
+    - PoolStats metrics, same get_stats() shape as PostgreSQLConnectionPool
+
+    No upper bound on connections in use: a task that nests two connections
+    on the same thread must not wait for itself.
+    """
+
+    DEFAULT_CONNECTION_TIMEOUT = 60.0  # sqlite3 busy timeout (seconds)
+    DEFAULT_IDLE_TIMEOUT = 180         # Same as PostgreSQLConnectionPool
+    DEFAULT_MAX_IDLE_PER_THREAD = 2
+
+    def __init__(
+        self,
+        db_path: str,
+        load_spatialite: bool = True,
+        timeout: float = None,
+        idle_timeout: float = None,
+        max_idle_per_thread: int = None
+    ):
+        """
+        Initialize Spatialite connection pool.
+
+        Args:
+            db_path: Path to the Spatialite/GeoPackage/SQLite file
+            load_spatialite: Load mod_spatialite in every connection
+            timeout: sqlite3 busy timeout for new connections (default: 60)
+            idle_timeout: Seconds before an idle connection is closed (default: 180)
+            max_idle_per_thread: Idle connections kept per thread (default: 2)
+        """
+        self.db_path = db_path
+        self.load_spatialite = load_spatialite
+        self.timeout = timeout or self.DEFAULT_CONNECTION_TIMEOUT
+        self.idle_timeout = idle_timeout if idle_timeout is not None else self.DEFAULT_IDLE_TIMEOUT
+        self.max_idle_per_thread = max_idle_per_thread or self.DEFAULT_MAX_IDLE_PER_THREAD
+
+        self._idle: Dict[int, list] = {}
+        self._active_connections: int = 0
+        self._lock = threading.RLock()
+        self._closed = False
+
+        self.stats = PoolStats()
+        self._pool_key = db_path
+
+        logger.debug(f"Spatialite connection pool created for {self._pool_key}")
+
+    def _create_connection(self) -> PooledSQLiteConnection:
+        """Open a connection, load mod_spatialite and apply PRAGMAs."""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.timeout,
+            isolation_level=None,
+            check_same_thread=False,
+            factory=PooledSQLiteConnection
+        )
+        try:
+            try:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+                conn.execute(f'PRAGMA busy_timeout={int(self.timeout * 1000)}')
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Could not configure PRAGMA settings for {self.db_path}: {e}")
+
+            if self.load_spatialite:
+                self._load_spatialite(conn)
+        except Exception:
+            conn._close_for_real()
+            raise
+
+        conn._pool = self
+        with self._lock:
+            self._active_connections += 1
+            self.stats.total_connections_created += 1
+            self.stats.peak_pool_size = max(self.stats.peak_pool_size, self._active_connections)
+        logger.debug(f"Created new Spatialite connection for {self._pool_key}")
+        return conn
+
+    @staticmethod
+    def _load_spatialite(conn: sqlite3.Connection):
+        """Load mod_spatialite, trying each platform name."""
+        last_error = None
+        try:
+            conn.enable_load_extension(True)
+            for extension in SPATIALITE_EXTENSIONS:
+                try:
+                    conn.load_extension(extension)
+                    break
+                except (OSError, sqlite3.OperationalError) as e:
+                    last_error = e
+            else:
+                raise last_error
+            conn.enable_load_extension(False)
+        except (AttributeError, OSError, sqlite3.OperationalError) as e:
+            logger.error(f"Could not load Spatialite extension: {e}")
+            raise sqlite3.OperationalError(f"Could not load Spatialite extension: {e}") from e
+
+    def get_connection(self, timeout: float = None) -> PooledSQLiteConnection:
+        """
+        Get a connection for the calling thread.
+
+        Reuses the thread's most recently released connection, else opens
+        a new one. Never waits: SQLite locking is left to busy_timeout.
+
+        Args:
+            timeout: Unused, kept for PostgreSQLConnectionPool compatibility
+
+        Returns:
+            PooledSQLiteConnection; close() releases it
+        """
+        self.evict_idle()
+        thread_id = threading.get_ident()
+
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError(f"Connection pool closed: {self._pool_key}")
+            idle = self._idle.get(thread_id)
+            conn = idle.pop() if idle else None
+
+        if conn is not None:
+            conn._leased = True
+            self.stats.total_connections_reused += 1
+            self.stats.update_hit_rate()
+            return conn
+
+        conn = self._create_connection()
+        self.stats.update_hit_rate()
+        return conn
+
+    def release_connection(self, conn: PooledSQLiteConnection):
+        """
+        Return a connection to its owner thread's idle list.
+
+        The connection is closed instead if its session state cannot be
+        reset, the pool is closed, or the thread already keeps enough.
+        """
+        if conn is None or not conn._leased:
+            return
+
+        conn._leased = False
+        try:
+            self._reset_connection(conn)
+        except Exception as e:
+            logger.debug(f"Discarding Spatialite connection that could not be reset: {e}")
+            self._close_connection(conn)
+            return
+
+        with self._lock:
+            idle = self._idle.setdefault(conn._owner_thread, [])
+            if not self._closed and len(idle) < self.max_idle_per_thread:
+                conn._released_at = time.time()
+                idle.append(conn)
+                self.stats.current_pool_size = sum(len(c) for c in self._idle.values())
+                return
+        self._close_connection(conn)
+
+    @staticmethod
+    def _reset_connection(conn: PooledSQLiteConnection):
+        """Give the next user the state of a freshly opened connection."""
+        if conn.in_transaction:
+            conn.rollback()
+        execute = super(PooledSQLiteConnection, conn).execute
+        for name, obj_type in execute(
+            "SELECT name, type FROM sqlite_temp_master WHERE type IN ('table', 'view')"
+        ).fetchall():
+            execute(f'DROP {obj_type.upper()} IF EXISTS temp."{name}"')  # nosec B608
+        for _, name, _ in execute("PRAGMA database_list").fetchall():
+            if name not in ('main', 'temp'):
+                execute(f'DETACH DATABASE "{name}"')
+        conn.set_progress_handler(None, 0)
+        conn.row_factory = None
+        conn.text_factory = str
+        conn.isolation_level = None
+
+    def evict_idle(self):
+        """Close idle connections past idle_timeout or owned by exited threads."""
+        now = time.time()
+        alive = {thread.ident for thread in threading.enumerate()}
+        evicted = []
+        with self._lock:
+            for thread_id in list(self._idle):
+                idle = self._idle[thread_id]
+                if thread_id not in alive:
+                    evicted.extend(idle)
+                    idle.clear()
+                else:
+                    keep = [c for c in idle if now - c._released_at <= self.idle_timeout]
+                    evicted.extend(c for c in idle if c not in keep)
+                    idle[:] = keep
+                if not idle:
+                    del self._idle[thread_id]
+            self.stats.current_pool_size = sum(len(c) for c in self._idle.values())
+
+        for conn in evicted:
+            self._close_connection(conn)
+        if evicted:
+            logger.debug(f"Evicted {len(evicted)} idle Spatialite connections from {self._pool_key}")
+
+    def _close_connection(self, conn: PooledSQLiteConnection):
+        """Close a connection and update counters."""
+        try:
+            conn._leased = False
+            conn._close_for_real()
+        except Exception as e:
+            logger.debug(f"Error closing Spatialite connection: {e}")
+        with self._lock:
+            self._active_connections = max(0, self._active_connections - 1)
+
+    @contextmanager
+    def connection(self, timeout: float = None) -> Generator:
+        """
+        Context manager for getting a pooled connection.
+
+        Usage:
+            with pool.connection() as conn:
+                conn.execute("SELECT ...")
+        """
+        conn = self.get_connection(timeout)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def close_all(self):
+        """Close idle connections; connections in use are closed on release."""
+        with self._lock:
+            self._closed = True
+            idle = [conn for conns in self._idle.values() for conn in conns]
+            self._idle.clear()
+            self.stats.current_pool_size = 0
+        for conn in idle:
+            self._close_connection(conn)
+        logger.debug(f"Spatialite connection pool closed for {self._pool_key}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics."""
+        self.stats.update_hit_rate()
+        with self._lock:
+            pooled = sum(len(c) for c in self._idle.values())
+            threads = len(self._idle)
+        return {
+            'pool_key': self._pool_key,
+            'active_connections': self._active_connections,
+            'pooled_connections': pooled,
+            'threads': threads,
+            'total_created': self.stats.total_connections_created,
+            'total_reused': self.stats.total_connections_reused,
+            'hit_rate': f"{self.stats.cache_hit_rate:.1%}",
+            'peak_size': self.stats.peak_pool_size,
+        }
+
+
+class SpatialitePoolManager:
+    """
+    Global manager for Spatialite/GeoPackage connection pools.
+
+    One pool per database file (resolved path) and extension setting.
+    In-memory databases are never pooled: every connection is a new database.
+
+    Usage:
+        manager = get_spatialite_pool_manager()
+        conn = manager.get_connection(db_path)
+        try:
+            conn.execute("SELECT ...")
+        finally:
+            conn.close()  # back to the pool
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        """Singleton pattern."""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        """Initialize pool manager (only once)."""
+        if self._initialized:
+            return
+
+        self._pools: Dict[Tuple[str, bool], SpatialiteConnectionPool] = {}
+        self._pools_lock = threading.RLock()
+        self._initialized = True
+
+    @staticmethod
+    def _get_pool_key(db_path: str, load_spatialite: bool) -> Tuple[str, bool]:
+        """Generate unique key for pool identification."""
+        return os.path.realpath(db_path), load_spatialite
+
+    def get_pool(
+        self,
+        db_path: str,
+        load_spatialite: bool = True,
+        timeout: float = None
+    ) -> SpatialiteConnectionPool:
+        """Get or create the pool for a database file."""
+        pool_key = self._get_pool_key(db_path, load_spatialite)
+
+        with self._pools_lock:
+            if pool_key not in self._pools:
+                self._pools[pool_key] = SpatialiteConnectionPool(
+                    pool_key[0], load_spatialite=load_spatialite, timeout=timeout
+                )
+            return self._pools[pool_key]
+
+    def get_connection(
+        self,
+        db_path: str,
+        load_spatialite: bool = True,
+        timeout: float = None
+    ) -> PooledSQLiteConnection:
+        """
+        Get a connection from the appropriate pool.
+
+        Args:
+            db_path: Database file path
+            load_spatialite: Load mod_spatialite in the connection
+            timeout: sqlite3 busy timeout for new connections
+
+        Returns:
+            PooledSQLiteConnection; close() releases it
+        """
+        if db_path == ':memory:' or str(db_path).startswith('file:'):
+            # Not a shareable file: build an unpooled connection the same way
+            conn = SpatialiteConnectionPool(db_path, load_spatialite, timeout)._create_connection()
+            conn._pool = None
+            return conn
+        return self.get_pool(db_path, load_spatialite, timeout).get_connection(timeout)
+
+    @contextmanager
+    def connection(
+        self,
+        db_path: str,
+        load_spatialite: bool = True,
+        timeout: float = None
+    ) -> Generator:
+        """Context manager for getting a pooled connection."""
+        conn = self.get_connection(db_path, load_spatialite, timeout)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def evict_idle(self):
+        """Run idle eviction on every pool."""
+        with self._pools_lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            pool.evict_idle()
+
+    def close_pool(self, db_path: str):
+        """Close the pools of a database file (e.g. before deleting it)."""
+        with self._pools_lock:
+            for load_spatialite in (True, False):
+                pool = self._pools.pop(self._get_pool_key(db_path, load_spatialite), None)
+                if pool is not None:
+                    pool.close_all()
+
+    def close_all_pools(self):
+        """Close all connection pools (call on plugin unload)."""
+        with self._pools_lock:
+            for pool_key, pool in list(self._pools.items()):
+                try:
+                    pool.close_all()
+                except Exception as e:
+                    logger.warning(f"Error closing Spatialite pool {pool_key[0]}: {e}")
+            self._pools.clear()
+
+    def get_all_stats(self) -> Dict[str, Dict]:
+        """Get statistics for all pools."""
+        with self._pools_lock:
+            return {
+                f"{path}{'' if spatialite else ' (sqlite)'}": pool.get_stats()
+                for (path, spatialite), pool in self._pools.items()
+            }
+
+    def log_stats(self):
+        """Log statistics for all pools."""
+        stats = self.get_all_stats()
+        if stats:
+            logger.info("=== Spatialite Connection Pool Statistics ===")
+            for pool_key, pool_stats in stats.items():
+                logger.info(
+                    f"  {pool_key}: "
+                    f"active={pool_stats['active_connections']}, "
+                    f"pooled={pool_stats['pooled_connections']}, "
+                    f"reused={pool_stats['total_reused']}, "
+                    f"hit_rate={pool_stats['hit_rate']}"
+                )
+
+
+_spatialite_pool_manager: Optional[SpatialitePoolManager] = None
+
+
+def get_spatialite_pool_manager() -> SpatialitePoolManager:
+    """
+    Get the global Spatialite pool manager.
+
+    Unlike get_pool_manager(), always available: sqlite3 is in the stdlib.
+
+    Returns:
+        SpatialitePoolManager singleton instance
+    """
+    global _spatialite_pool_manager
+
+    if _spatialite_pool_manager is None:
+        _spatialite_pool_manager = SpatialitePoolManager()
+
+    return _spatialite_pool_manager
+
+
 def cleanup_pools() -> None:
     """
     Clean up all connection pools.
 
     Call this when the plugin is unloaded to properly close all connections.
     """
-    global _pool_manager
+    global _pool_manager, _spatialite_pool_manager
 
     if _pool_manager is not None:
         _pool_manager.log_stats()
@@ -920,6 +1417,11 @@ def cleanup_pools() -> None:
         _pool_manager = None
         logger.info("✓ Connection pool cleanup complete")
 
+    if _spatialite_pool_manager is not None:
+        _spatialite_pool_manager.log_stats()
+        _spatialite_pool_manager.close_all_pools()
+        _spatialite_pool_manager = None
+
 
 # Legacy compatibility - simple pool registry for non-PostgreSQL pools
 _pools: Dict[str, Any] = {}
@@ -965,13 +1467,19 @@ def unregister_pool(name: str) -> None:
 # CRASH FIX (v2.8.6): Register atexit handler to ensure pools are cleaned up
 def _atexit_cleanup():
     """Cleanup handler called when Python interpreter exits."""
-    global _pool_manager
+    global _pool_manager, _spatialite_pool_manager
     if _pool_manager is not None:
         try:
             _pool_manager.close_all_pools()
             _pool_manager = None
         except Exception:
             pass  # Silently ignore errors during exit
+    if _spatialite_pool_manager is not None:
+        try:
+            _spatialite_pool_manager.close_all_pools()
+            _spatialite_pool_manager = None
+        except Exception:
+            pass
 
 
 atexit.register(_atexit_cleanup)
@@ -988,6 +1496,11 @@ __all__ = [
     'PostgreSQLConnectionPool',
     'PostgreSQLPoolManager',
     'PoolStats',
+    # v4.2.0: Spatialite/GeoPackage pooling
+    'get_spatialite_pool_manager',
+    'SpatialiteConnectionPool',
+    'SpatialitePoolManager',
+    'PooledSQLiteConnection',
     # Legacy compatibility
     'get_pool',
     'register_pool',
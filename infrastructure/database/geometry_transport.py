@@ -0,0 +1,488 @@
+# -*- coding: utf-8 -*-
+"""
+Binary Source Geometry Transport for FilterMate
+
+Uploads the prepared source geometry of a filter run once, as WKB bound to
+a query parameter, and lets every target-layer predicate reference it by id
+instead of embedding a ``GeomFromText('...')`` literal. This removes the
+float-to-text round trip, keeps subset strings short, and lets the database
+parse the geometry once per run instead of once per target layer.
+
+v4.2.0 - Binary geometry transport (October 2026)
+
+Storage:
+    Rows are content-addressed: ``geom_id`` is a hash of the WKB and SRID,
+    so the same source geometry is uploaded only once.
+
+    PostgreSQL: ``fm_source_geoms`` lives in the FilterMate temp schema,
+    never in a data schema. It is a regular table, not a session TEMP
+    table: QGIS evaluates subset strings on its own provider connection,
+    which cannot see another session's temporary objects. Each QGIS
+    instance using a row records it in ``fm_source_geom_refs``. Once no
+    layer subset of the project references a geometry any more (subset
+    change, layer removal), release_source_geometries() drops the
+    instance's reference and deletes the rows no instance references. The
+    WKB of recent uploads stays in memory so undo/redo can re-upload a
+    released geometry (ensure_source_geometries()). Rows of instances that
+    crashed stay until the temp schema is dropped.
+
+    GeoPackage and Spatialite files are only written to when the
+    APP.OPTIONS.GEOMETRY_TRANSPORT.local_files option is enabled
+    (see local_file_transport_enabled()); otherwise their filters keep the
+    inline WKT. Rows written there are kept as long as saved filters may
+    use them.
+
+References:
+    PostgreSQL:  (SELECT geom FROM "schema"."fm_source_geoms" WHERE geom_id = '...')
+    Spatialite:  GeomFromWKB((SELECT wkb FROM "fm_source_geoms" WHERE geom_id = '...'), srid)
+
+    Both are uncorrelated scalar subqueries, evaluated once per statement;
+    the PostgreSQL form keeps target GiST index usage.
+
+Usage:
+    from ...infrastructure.database.geometry_transport import (
+        wkt_to_wkb, upload_source_geometry_sqlite, sqlite_source_geometry_ref
+    )
+
+    wkb = wkt_to_wkb(source_wkt)
+    geom_id = upload_source_geometry_sqlite(db_path, wkb, 2154)
+    if geom_id:
+        source_sql = sqlite_source_geometry_ref(geom_id, 2154)
+"""
+
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Iterable, Optional, Set, Tuple
+
+from ..constants import GEOMETRY_TRANSPORT_REFS_TABLE, GEOMETRY_TRANSPORT_TABLE
+
+logger = logging.getLogger('FilterMate.Database.GeometryTransport')
+
+# Number of WKT -> WKB conversions kept (one per distinct source geometry)
+WKB_MEMO_SIZE = 4
+
+# WKB bytes of PostgreSQL uploads kept to re-upload released geometries (undo/redo)
+UPLOAD_MEMO_MAX_BYTES = 64 * 1024 * 1024
+
+# Identifies the references of this QGIS instance
+REFERENCE_HOLDER = uuid.uuid4().hex
+
+_POSTGRESQL_REF_RE = re.compile(
+    rf'"((?:[^"]|"")+)"\."{GEOMETRY_TRANSPORT_TABLE}" WHERE geom_id = \'([0-9a-f]{{20}})\''
+)
+
+_wkb_memo: "OrderedDict[str, bytes]" = OrderedDict()
+_memo_lock = threading.Lock()
+_ensured_postgresql_tables: Set[tuple] = set()
+_uploaded: "OrderedDict[str, Tuple[bytes, int]]" = OrderedDict()  # geom_id -> (wkb, srid), LRU
+_uploaded_bytes = 0
+
+
+# =============================================================================
+# Encoding
+# =============================================================================
+
+def source_geometry_id(wkb: bytes, srid: int) -> str:
+    """
+    Content-addressed identifier of an uploaded geometry.
+
+    Args:
+        wkb: Geometry as WKB
+        srid: SRID of the geometry
+
+    Returns:
+        str: 20-character hexadecimal id
+    """
+    digest = hashlib.sha1(f"{int(srid)}:".encode(), usedforsecurity=False)
+    digest.update(wkb)
+    return digest.hexdigest()[:20]
+
+
+def wkt_to_wkb(wkt: str) -> Optional[bytes]:
+    """
+    Convert WKT to WKB with QGIS, memoizing the last few conversions.
+
+    A filter run converts its source geometry once, however many target
+    layers reference it.
+
+    Returns:
+        bytes or None if the WKT cannot be parsed
+    """
+    key = hashlib.sha1(wkt.encode('utf-8'), usedforsecurity=False).hexdigest()
+    with _memo_lock:
+        wkb = _wkb_memo.get(key)
+        if wkb is not None:
+            _wkb_memo.move_to_end(key)
+            return wkb
+
+    try:
+        from qgis.core import QgsGeometry
+        geom = QgsGeometry.fromWkt(wkt)
+        if geom is None or geom.isNull() or geom.isEmpty():
+            return None
+        wkb = bytes(geom.asWkb())
+    except (ImportError, TypeError, ValueError) as e:
+        logger.debug(f"WKT to WKB conversion failed: {e}")
+        return None
+
+    if not wkb:
+        return None
+    with _memo_lock:
+        _wkb_memo[key] = wkb
+        while len(_wkb_memo) > WKB_MEMO_SIZE:
+            _wkb_memo.popitem(last=False)
+    return wkb
+
+
+def local_file_transport_enabled() -> bool:
+    """
+    Whether source geometries may be stored inside GeoPackage/Spatialite files.
+
+    Opt-in (APP.OPTIONS.GEOMETRY_TRANSPORT.local_files): the upload adds a
+    table to the user's file, kept as long as saved filters may use it.
+    """
+    try:
+        from ...config.config import ENV_VARS
+        options = ENV_VARS.get('CONFIG_DATA', {}).get('APP', {}).get('OPTIONS', {})
+        entry = options.get('GEOMETRY_TRANSPORT', {}).get('local_files', False)
+        return bool(entry.get('value', False) if isinstance(entry, dict) else entry)
+    except (ImportError, AttributeError):
+        return False
+
+
+# =============================================================================
+# PostgreSQL
+# =============================================================================
+
+def postgresql_source_geometry_ref(schema: str, geom_id: str) -> str:
+    """SQL expression returning the uploaded geometry on PostgreSQL."""
+    return (
+        f'(SELECT geom FROM "{schema}"."{GEOMETRY_TRANSPORT_TABLE}" '  # nosec B608
+        f"WHERE geom_id = '{geom_id}')"
+    )
+
+
+def postgresql_source_geometry_refs(subset_string: str) -> Set[Tuple[str, str]]:
+    """(schema, geom_id) of the uploaded geometries a subset string references."""
+    if not subset_string or GEOMETRY_TRANSPORT_TABLE not in subset_string:
+        return set()
+    return {(schema.replace('""', '"'), geom_id) for schema, geom_id in _POSTGRESQL_REF_RE.findall(subset_string)}
+
+
+def _remember_upload(geom_id: str, wkb: bytes, srid: int) -> None:
+    """Keep the WKB of an upload for ensure_source_geometries(), least recently used evicted."""
+    global _uploaded_bytes
+    with _memo_lock:
+        previous = _uploaded.pop(geom_id, None)
+        if previous is not None:
+            _uploaded_bytes -= len(previous[0])
+        _uploaded[geom_id] = (bytes(wkb), int(srid))
+        _uploaded_bytes += len(wkb)
+        while _uploaded_bytes > UPLOAD_MEMO_MAX_BYTES and len(_uploaded) > 1:
+            _, (evicted, _) = _uploaded.popitem(last=False)
+            _uploaded_bytes -= len(evicted)
+
+
+def upload_source_geometry_postgresql(
+    connexion,
+    schema: str,
+    wkb: bytes,
+    srid: int
+) -> Optional[str]:
+    """
+    Upload a source geometry to PostgreSQL as a bound WKB parameter.
+
+    The geometry is repaired with ST_MakeValid once, at upload. If a row with
+    the same id already exists, nothing is sent. Either way this QGIS
+    instance records a reference to it.
+
+    Args:
+        connexion: psycopg2 connection
+        schema: FilterMate temp schema (created if missing)
+        wkb: Geometry as WKB
+        srid: SRID of the geometry
+
+    Returns:
+        str: geom_id, or None if the upload failed (caller falls back to WKT)
+    """
+    geom_id = source_geometry_id(wkb, srid)
+    table = f'"{schema}"."{GEOMETRY_TRANSPORT_TABLE}"'
+    refs = f'"{schema}"."{GEOMETRY_TRANSPORT_REFS_TABLE}"'
+    table_key = (getattr(connexion, 'dsn', None) or id(connexion), schema)
+
+    try:
+        with connexion.cursor() as cursor:
+            if table_key not in _ensured_postgresql_tables:
+                cursor.execute(f'CREATE SCHEMA IF NOT EXISTS "{schema}"')
+                cursor.execute(
+                    f'CREATE TABLE IF NOT EXISTS {table} ('
+                    'geom_id TEXT PRIMARY KEY, '
+                    'srid INTEGER NOT NULL, '
+                    'geom geometry NOT NULL, '
+                    'created_at TIMESTAMP NOT NULL DEFAULT now())'
+                )
+                cursor.execute(
+                    f'CREATE INDEX IF NOT EXISTS "idx_{GEOMETRY_TRANSPORT_TABLE}_geom" '
+                    f'ON {table} USING GIST (geom)'
+                )
+                cursor.execute(
+                    f'CREATE TABLE IF NOT EXISTS {refs} ('
+                    'geom_id TEXT NOT NULL, '
+                    'holder TEXT NOT NULL, '
+                    'PRIMARY KEY (geom_id, holder))'
+                )
+
+            cursor.execute(f'SELECT 1 FROM {table} WHERE geom_id = %s', (geom_id,))  # nosec B608
+            if cursor.fetchone() is None:
+                cursor.execute(
+                    f'INSERT INTO {table} (geom_id, srid, geom) '  # nosec B608
+                    'VALUES (%s, %s, ST_MakeValid(ST_GeomFromWKB(%s, %s))) '
+                    'ON CONFLICT (geom_id) DO NOTHING',
+                    (geom_id, int(srid), bytes(wkb), int(srid))
+                )
+                logger.info(f"Source geometry uploaded to {schema}: {geom_id} ({len(wkb)} bytes WKB)")
+            cursor.execute(
+                f'INSERT INTO {refs} (geom_id, holder) VALUES (%s, %s) ON CONFLICT DO NOTHING',  # nosec B608
+                (geom_id, REFERENCE_HOLDER)
+            )
+        connexion.commit()
+        _ensured_postgresql_tables.add(table_key)
+        _remember_upload(geom_id, wkb, srid)
+        return geom_id
+    except Exception as e:  # psycopg2 errors do not share a base importable here
+        logger.warning(f"Source geometry upload failed, using inline WKT: {e}")
+        _ensured_postgresql_tables.discard(table_key)  # Table may have been dropped by cleanup
+        try:
+            connexion.rollback()
+        except Exception:
+            pass
+        return None
+
+
+def release_source_geometries_postgresql(connexion, refs: Iterable[Tuple[str, str]]) -> int:
+    """
+    Drop this instance's references to uploaded geometries.
+
+    Rows no QGIS instance references any more are deleted. Commits.
+
+    Args:
+        connexion: psycopg2 connection
+        refs: (schema, geom_id) no layer of this instance uses any more
+
+    Returns:
+        int: Number of geometry rows deleted
+    """
+    by_schema = {}
+    for schema, geom_id in refs:
+        by_schema.setdefault(schema, []).append(geom_id)
+
+    deleted = 0
+    try:
+        with connexion.cursor() as cursor:
+            for schema, geom_ids in by_schema.items():
+                table = f'"{schema}"."{GEOMETRY_TRANSPORT_TABLE}"'
+                refs_table = f'"{schema}"."{GEOMETRY_TRANSPORT_REFS_TABLE}"'
+                cursor.execute(
+                    f'DELETE FROM {refs_table} WHERE holder = %s AND geom_id = ANY(%s)',  # nosec B608
+                    (REFERENCE_HOLDER, geom_ids)
+                )
+                cursor.execute(
+                    f'DELETE FROM {table} g WHERE g.geom_id = ANY(%s) '  # nosec B608
+                    f'AND NOT EXISTS (SELECT 1 FROM {refs_table} r WHERE r.geom_id = g.geom_id)',
+                    (geom_ids,)
+                )
+                deleted += max(cursor.rowcount or 0, 0)
+        connexion.commit()
+    except Exception as e:  # release is best effort
+        logger.debug(f"Source geometry release failed: {e}")
+        try:
+            connexion.rollback()
+        except Exception:
+            pass
+        return 0
+    if deleted:
+        logger.debug(f"Released {deleted} source geometr{'y' if deleted == 1 else 'ies'}")
+    return deleted
+
+
+def ensure_source_geometries(layer, subset_string: str) -> int:
+    """
+    Re-upload released geometries referenced by ``subset_string``.
+
+    Call before applying a subset string that may come from history
+    (undo/redo): its geometries were released when the layer moved on.
+
+    Args:
+        layer: PostgreSQL layer the subset string is applied to
+        subset_string: Subset string about to be applied
+
+    Returns:
+        int: Number of geometries (re-)referenced
+    """
+    refs = postgresql_source_geometry_refs(subset_string)
+    if not refs:
+        return 0
+    with _memo_lock:
+        known = {(schema, geom_id): _uploaded[geom_id] for schema, geom_id in refs if geom_id in _uploaded}
+        for _, geom_id in known:
+            _uploaded.move_to_end(geom_id)
+    if len(known) < len(refs):
+        logger.debug(f"Source geometries {sorted(g for _, g in refs if (_, g) not in known)} cannot be re-uploaded")
+    if not known:
+        return 0
+
+    from .connection_pool import pooled_connection_from_layer
+    ensured = 0
+    with pooled_connection_from_layer(layer) as (connexion, _):
+        if not connexion:
+            return 0
+        for (schema, geom_id), (wkb, srid) in known.items():
+            ensured += upload_source_geometry_postgresql(connexion, schema, wkb, srid) == geom_id
+    return ensured
+
+
+def release_source_geometries(layer, subset_string: str, removed_layer_ids=None) -> int:
+    """
+    Release the geometries referenced by ``subset_string`` once no layer uses them.
+
+    Call after the layer's subset string was replaced, or with the layer in
+    ``removed_layer_ids`` when it is about to leave the project.
+
+    Args:
+        layer: PostgreSQL layer whose subset string is being cleared/replaced
+        subset_string: The subset string that is going away
+        removed_layer_ids: IDs of layers being removed (their subsets do not count)
+
+    Returns:
+        int: Number of geometry rows deleted
+    """
+    refs = postgresql_source_geometry_refs(subset_string)
+    if not refs:
+        return 0
+
+    removed = set(removed_layer_ids or ())
+    try:
+        from qgis.core import QgsProject
+        for other in QgsProject.instance().mapLayers().values():
+            if other.id() in removed or not hasattr(other, 'subsetString'):
+                continue
+            other_subset = other.subsetString() or ''
+            refs = {ref for ref in refs if ref[1] not in other_subset}
+    except Exception as e:
+        logger.debug(f"Could not check other layers for source geometry usage: {e}")
+        return 0
+    if not refs:
+        return 0
+
+    from .connection_pool import pooled_connection_from_layer
+    with pooled_connection_from_layer(layer) as (connexion, _):
+        if not connexion:
+            return 0
+        return release_source_geometries_postgresql(connexion, refs)
+
+
+# =============================================================================
+# Spatialite / GeoPackage
+# =============================================================================
+
+def sqlite_database_path(layer) -> Optional[str]:
+    """
+    Database file behind a Spatialite or GeoPackage layer.
+
+    Returns:
+        str or None if the layer is not backed by a local SQLite file
+    """
+    try:
+        provider = layer.providerType()
+        source = layer.source()
+    except (AttributeError, RuntimeError):
+        return None
+
+    if provider == 'spatialite':
+        from qgis.core import QgsDataSourceUri
+        path = QgsDataSourceUri(source).database()
+    elif provider == 'ogr':
+        path = source.split('|')[0]
+        if not path.lower().endswith(('.gpkg', '.sqlite', '.db')):
+            return None
+    else:
+        return None
+    return path if isinstance(path, str) and path else None
+
+
+def sqlite_source_geometry_ref(geom_id: str, srid: int) -> str:
+    """SQL expression returning the uploaded geometry on Spatialite/GeoPackage."""
+    return (
+        f'GeomFromWKB((SELECT wkb FROM "{GEOMETRY_TRANSPORT_TABLE}" '  # nosec B608
+        f"WHERE geom_id = '{geom_id}'), {int(srid)})"
+    )
+
+
+def upload_source_geometry_sqlite(
+    db_path: str,
+    wkb: bytes,
+    srid: int,
+    timeout: float = 30.0
+) -> Optional[str]:
+    """
+    Upload a source geometry into a Spatialite or GeoPackage file.
+
+    Uses a plain sqlite3 connection with a bound BLOB parameter; the
+    Spatialite extension is not needed to store it. Callers check
+    local_file_transport_enabled() first.
+
+    Args:
+        db_path: Database file path
+        wkb: Geometry as WKB
+        srid: SRID of the geometry
+        timeout: SQLite busy timeout in seconds
+
+    Returns:
+        str: geom_id, or None if the upload failed (caller falls back to WKT)
+    """
+    geom_id = source_geometry_id(wkb, srid)
+    conn = None
+    try:
+        conn = sqlite3.connect(db_path, timeout=timeout)
+        conn.execute(
+            f'CREATE TABLE IF NOT EXISTS "{GEOMETRY_TRANSPORT_TABLE}" ('
+            'geom_id TEXT PRIMARY KEY, '
+            'srid INTEGER NOT NULL, '
+            'wkb BLOB NOT NULL, '
+            "created_at TEXT NOT NULL DEFAULT (datetime('now')))"
+        )
+        inserted = conn.execute(
+            f'INSERT OR IGNORE INTO "{GEOMETRY_TRANSPORT_TABLE}" (geom_id, srid, wkb) VALUES (?, ?, ?)',  # nosec B608
+            (geom_id, int(srid), sqlite3.Binary(wkb))
+        ).rowcount
+        if inserted:
+            logger.info(f"Source geometry uploaded to {db_path}: {geom_id} ({len(wkb)} bytes WKB)")
+        conn.commit()
+        return geom_id
+    except sqlite3.Error as e:
+        logger.warning(f"Source geometry upload failed, using inline WKT: {e}")
+        return None
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+__all__ = [
+    'source_geometry_id',
+    'wkt_to_wkb',
+    'local_file_transport_enabled',
+    'postgresql_source_geometry_ref',
+    'postgresql_source_geometry_refs',
+    'upload_source_geometry_postgresql',
+    'release_source_geometries_postgresql',
+    'ensure_source_geometries',
+    'release_source_geometries',
+    'sqlite_database_path',
+    'sqlite_source_geometry_ref',
+    'upload_source_geometry_sqlite',
+]
@@ -0,0 +1,609 @@
+# -*- coding: utf-8 -*-
+"""
+FilterMate Query Profiler
+
+Statement-level profiling of the SQL run by the PostgreSQL and Spatialite
+backends, stored in a local SQLite ring buffer.
+
+v4.2.0 - Slow-query profiler (October 2026)
+
+Opt-in (APP.OPTIONS.QUERY_PROFILER.enabled). When enabled, every profiled
+statement records its backend, layer, wall time and row count. Statements
+slower than explain_threshold_ms also get their plan:
+
+- PostgreSQL: EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON), always rolled back
+  (savepoint, or BEGIN/ROLLBACK under autocommit) so neither its side
+  effects nor a failure reach the caller's transaction
+- Spatialite: EXPLAIN QUERY PLAN
+
+Plans are checked for the usual causes of slow filters and the record is
+flagged accordingly:
+
+- seq_scan:<table>          full scan of a large table
+- no_spatial_index:<table>  spatial predicate evaluated without GiST/R*Tree
+- nested_loop_blowup        nested loop far above its estimate, or a quadratic
+                            join of unindexed scans
+
+Architecture:
+    filtermate_profile.db (SQLite)
+    └── query_profile (table, oldest rows trimmed beyond `capacity`)
+        ├── id: Auto-increment primary key
+        ├── recorded_at: ISO timestamp (UTC)
+        ├── backend: 'postgresql' or 'spatialite'
+        ├── layer: Layer name or id, if known
+        ├── statement: SQL text
+        ├── wall_ms: Execution time
+        ├── row_count: Rows returned/affected (-1 if unknown)
+        ├── plan: JSON plan, or NULL below the threshold
+        └── flags: Comma-separated plan findings
+
+Usage:
+    profiler = get_query_profiler()
+    profiler.configure(enabled=True, explain_threshold_ms=500)
+    profiler.execute('postgresql', cursor, sql, layer='roads')
+    for record in profiler.slowest(10, flagged_only=True):
+        print(record.wall_ms, record.flags, record.statement)
+    profiler.export('/tmp/filtermate_profile.csv')
+"""
+
+import csv
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger('FilterMate.Database.QueryProfiler')
+
+try:
+    from ...config.config import ENV_VARS
+except ImportError:
+    ENV_VARS = {}
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+PROFILE_DB_NAME = "filtermate_profile.db"
+DEFAULT_PROFILE_CAPACITY = 5000             # Records kept in the ring buffer
+DEFAULT_EXPLAIN_THRESHOLD_MS = 500          # Statements slower than this get a plan
+LARGE_TABLE_ROWS = 100000                   # Rows scanned for a seq scan to be flagged
+NESTED_LOOP_MISESTIMATE = 100               # Actual/estimated rows ratio of a blowup
+NESTED_LOOP_MIN_ROWS = 10000                # Ignore misestimates on small results
+NESTED_LOOP_MAX_LOOPS = 100000              # Inner side executions of a blowup
+
+FLAG_SEQ_SCAN = "seq_scan"
+FLAG_NO_SPATIAL_INDEX = "no_spatial_index"
+FLAG_NESTED_LOOP = "nested_loop_blowup"
+
+_SPATIAL_PREDICATE = re.compile(
+    r'\b(?:ST_)?(?:Intersects|Contains|Within|DWithin|Overlaps|Touches|Crosses|Covers|CoveredBy|Disjoint|Equals)\s*\(|&&',
+    re.IGNORECASE
+)
+# SELECT body of CREATE [MATERIALIZED VIEW|TABLE] ... AS <select> [WITH [NO] DATA]
+_CREATE_AS = re.compile(
+    r'^\s*CREATE\s+(?:UNLOGGED\s+|TEMP(?:ORARY)?\s+)?(?:MATERIALIZED\s+VIEW|TABLE)\s+.+?\s+AS\s+(.+?)\s*'
+    r'(?:WITH\s+(?:NO\s+)?DATA)?\s*;?\s*$',
+    re.IGNORECASE | re.DOTALL
+)
+# Spatialite spatial index lookups are subqueries on the idx_/rtree_ tables
+_SPATIALITE_INDEX = re.compile(r'\b(?:idx_|rtree_)\w+|SpatialIndex|USING INDEX', re.IGNORECASE)
+# Full scans of a table (not of a subquery, an index or a virtual table)
+_SQLITE_FULL_SCAN = re.compile(
+    r'^SCAN (?:TABLE )?(?!SUBQUERY\b|CONSTANT\b)"?(\w+)"?(?!.*\b(?:USING|VIRTUAL)\b)', re.IGNORECASE
+)
+_SELECT_BODY = re.compile(r'^\(?\s*(?:SELECT|WITH)\b', re.IGNORECASE)
+
+
+@dataclass
+class QueryRecord:
+    """One profiled statement."""
+    backend: str
+    statement: str
+    wall_ms: float
+    row_count: int = -1
+    layer: Optional[str] = None
+    plan: Optional[Any] = None
+    flags: List[str] = field(default_factory=list)
+    recorded_at: Optional[str] = None
+    id: Optional[int] = None
+
+
+# =============================================================================
+# Plan analysis
+# =============================================================================
+
+def explainable_query(sql: str) -> Optional[str]:
+    """
+    Read-only query whose plan describes a statement.
+
+    SELECT/WITH statements are returned as-is; CREATE ... AS SELECT returns
+    its SELECT body. Other statements (indexes, ANALYZE, DROP...) have no
+    useful plan and return None.
+    """
+    stripped = sql.strip().rstrip(';').strip()
+    if _SELECT_BODY.match(stripped):
+        return stripped
+    match = _CREATE_AS.match(stripped)
+    if match and _SELECT_BODY.match(match.group(1)):
+        return match.group(1)
+    return None
+
+
+def _walk_plan(node: Dict[str, Any]):
+    yield node
+    for child in node.get('Plans', []):
+        yield from _walk_plan(child)
+
+
+def analyze_postgresql_plan(plan: Any) -> List[str]:
+    """
+    Flag slow patterns in an EXPLAIN (FORMAT JSON) plan.
+
+    Works on ANALYZE plans (actual rows and loops) and falls back to the
+    planner estimates otherwise.
+
+    Args:
+        plan: Parsed JSON result of EXPLAIN, i.e. [{"Plan": {...}, ...}]
+
+    Returns:
+        List of flags, without duplicates
+    """
+    if isinstance(plan, list):
+        plan = plan[0] if plan else {}
+    root = (plan or {}).get('Plan')
+    if not root:
+        return []
+
+    flags: List[str] = []
+    for node in _walk_plan(root):
+        node_type = node.get('Node Type', '')
+        relation = node.get('Relation Name', '?')
+        loops = node.get('Actual Loops', 1) or 1
+        actual = node.get('Actual Rows')
+        rows = node.get('Plan Rows', 0) if actual is None else actual
+
+        if node_type == 'Seq Scan':
+            scanned = (rows + node.get('Rows Removed by Filter', 0)) * loops
+            if scanned >= LARGE_TABLE_ROWS:
+                flags.append(f"{FLAG_SEQ_SCAN}:{relation}")
+            if _SPATIAL_PREDICATE.search(node.get('Filter', '')):
+                flags.append(f"{FLAG_NO_SPATIAL_INDEX}:{relation}")
+        elif node_type == 'Nested Loop':
+            if _SPATIAL_PREDICATE.search(node.get('Join Filter', '')):
+                inner = [c.get('Relation Name') for c in node.get('Plans', []) if c.get('Relation Name')]
+                flags.append(f"{FLAG_NO_SPATIAL_INDEX}:{inner[-1] if inner else '?'}")
+            estimate = max(node.get('Plan Rows', 0), 1)
+            inner_loops = max((c.get('Actual Loops', 0) for c in node.get('Plans', [])), default=0)
+            if ((actual is not None and actual >= NESTED_LOOP_MIN_ROWS
+                    and actual > estimate * NESTED_LOOP_MISESTIMATE)
+                    or inner_loops >= NESTED_LOOP_MAX_LOOPS):
+                flags.append(FLAG_NESTED_LOOP)
+    return list(dict.fromkeys(flags))
+
+
+def analyze_spatialite_plan(plan: Sequence[Sequence[Any]], sql: str) -> List[str]:
+    """
+    Flag slow patterns in an EXPLAIN QUERY PLAN result.
+
+    SQLite only joins with nested loops and gives no row counts, so the
+    checks are structural: unindexed full scans, a spatial predicate with
+    no spatial index lookup, and two or more unindexed scans in one query
+    (a quadratic join).
+
+    Args:
+        plan: Rows (id, parent, notused, detail) of EXPLAIN QUERY PLAN
+        sql: Profiled statement
+
+    Returns:
+        List of flags, without duplicates
+    """
+    details = [str(row[-1]) for row in plan]
+    full_scans = [m.group(1) for m in (_SQLITE_FULL_SCAN.match(d) for d in details) if m]
+
+    flags = [f"{FLAG_SEQ_SCAN}:{table}" for table in full_scans]
+    if full_scans and _SPATIAL_PREDICATE.search(sql) and not _SPATIALITE_INDEX.search(sql + ' ' + ' '.join(details)):
+        flags.extend(f"{FLAG_NO_SPATIAL_INDEX}:{table}" for table in full_scans)
+    if len(full_scans) >= 2:
+        flags.append(FLAG_NESTED_LOOP)
+    return list(dict.fromkeys(flags))
+
+
+def explain_postgresql(connexion, query: str, params: Optional[Sequence[Any]] = None) -> Optional[Any]:
+    """
+    EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) of a read-only query.
+
+    EXPLAIN ANALYZE runs the query, so whatever it changes (volatile
+    functions, data-modifying WITH) is always rolled back: to a savepoint
+    inside the caller's transaction, or with a BEGIN/ROLLBACK pair under
+    autocommit. A failing EXPLAIN leaves the caller's transaction usable.
+
+    Returns:
+        Parsed JSON plan, or None if it could not be obtained
+    """
+    if getattr(connexion, 'autocommit', False):
+        begin, undo = ["BEGIN"], ["ROLLBACK"]
+    else:
+        begin = ["SAVEPOINT fm_query_profile"]
+        undo = ["ROLLBACK TO SAVEPOINT fm_query_profile", "RELEASE SAVEPOINT fm_query_profile"]
+    try:
+        with connexion.cursor() as cursor:
+            for statement in begin:
+                cursor.execute(statement)
+            try:
+                cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}", params)
+                plan = cursor.fetchone()[0]
+            finally:
+                for statement in undo:
+                    cursor.execute(statement)
+        return json.loads(plan) if isinstance(plan, str) else plan
+    except Exception as e:
+        logger.debug(f"[QueryProfiler] EXPLAIN failed: {e}")
+        return None
+
+
+def explain_spatialite(conn: sqlite3.Connection, query: str, params: Sequence[Any] = ()) -> Optional[List[List[Any]]]:
+    """EXPLAIN QUERY PLAN of a query, or None if it could not be obtained."""
+    try:
+        return [list(row) for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", tuple(params or ())).fetchall()]
+    except Exception as e:
+        logger.debug(f"[QueryProfiler] EXPLAIN QUERY PLAN failed: {e}")
+        return None
+
+
+# =============================================================================
+# Storage
+# =============================================================================
+
+def _get_profile_db_path() -> str:
+    """Path of filtermate_profile.db, next to the other FilterMate databases."""
+    if "PLUGIN_CONFIG_DIRECTORY" in ENV_VARS:
+        plugin_dir = ENV_VARS["PLUGIN_CONFIG_DIRECTORY"]
+    else:
+        try:
+            from qgis.core import QgsApplication
+            plugin_dir = os.path.join(QgsApplication.qgisSettingsDirPath(), "FilterMate")
+        except ImportError:
+            plugin_dir = os.path.join(os.path.expanduser("~"), ".filtermate")
+    os.makedirs(plugin_dir, exist_ok=True)
+    return os.path.join(plugin_dir, PROFILE_DB_NAME)
+
+
+class QueryProfiler:
+    """
+    Records profiled statements in a SQLite ring buffer.
+
+    Disabled by default: execute() then only runs the statement. The
+    database file is created on the first record.
+
+    Thread-safe: statements may be profiled from several worker threads.
+    """
+
+    _COLUMNS = "id, recorded_at, backend, layer, statement, wall_ms, row_count, plan, flags"
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        enabled: bool = False,
+        explain_threshold_ms: float = DEFAULT_EXPLAIN_THRESHOLD_MS,
+        capacity: int = DEFAULT_PROFILE_CAPACITY
+    ):
+        """
+        Initialize the profiler.
+
+        Args:
+            db_path: Ring buffer database (default: filtermate_profile.db in the plugin directory)
+            enabled: Record statements
+            explain_threshold_ms: Wall time above which the plan is captured
+            capacity: Records kept; older ones are trimmed
+        """
+        self._db_path = db_path
+        self.enabled = enabled
+        self.explain_threshold_ms = explain_threshold_ms
+        self.capacity = max(1, capacity)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        enabled: Optional[bool] = None,
+        explain_threshold_ms: Optional[float] = None,
+        capacity: Optional[int] = None
+    ) -> None:
+        """Apply the QUERY_PROFILER settings."""
+        if enabled is not None:
+            self.enabled = bool(enabled)
+        if explain_threshold_ms is not None:
+            self.explain_threshold_ms = max(0, explain_threshold_ms)
+        if capacity is not None:
+            self.capacity = max(1, int(capacity))
+
+    @property
+    def db_path(self) -> str:
+        if self._db_path is None:
+            self._db_path = _get_profile_db_path()
+        return self._db_path
+
+    # === Profiling ===
+
+    def execute(
+        self,
+        backend: str,
+        cursor,
+        sql: str,
+        params: Optional[Sequence[Any]] = None,
+        layer: Optional[str] = None
+    ):
+        """
+        Execute a statement on a DB-API cursor and profile it.
+
+        The plan of a slow PostgreSQL statement is taken on the cursor's
+        connection before returning, i.e. before the caller commits.
+        Profiling errors are logged, never raised; statement errors are.
+        """
+        if not self.enabled:
+            return cursor.execute(sql, params) if params is not None else cursor.execute(sql)
+        start = time.perf_counter()
+        result = cursor.execute(sql, params) if params is not None else cursor.execute(sql)
+        wall_ms = (time.perf_counter() - start) * 1000
+        row_count = getattr(cursor, 'rowcount', -1)
+        if row_count is None:
+            row_count = -1
+        connexion = getattr(cursor, 'connection', None)
+        if backend == 'spatialite':
+            self.record_spatialite(connexion, sql, wall_ms, row_count, params or (), layer)
+        else:
+            self.record_postgresql(connexion, sql, wall_ms, row_count, params, layer)
+        return result
+
+    def record_postgresql(
+        self,
+        connexion,
+        sql: str,
+        wall_ms: float,
+        row_count: int = -1,
+        params: Optional[Sequence[Any]] = None,
+        layer: Optional[str] = None
+    ) -> Optional[QueryRecord]:
+        """Record a PostgreSQL statement, with its ANALYZE plan above the threshold."""
+        if not self.enabled:
+            return None
+        plan = None
+        query = explainable_query(sql) if wall_ms >= self.explain_threshold_ms else None
+        if query and connexion is not None:
+            plan = explain_postgresql(connexion, query, params)
+        flags = analyze_postgresql_plan(plan) if plan else []
+        return self.record(QueryRecord('postgresql', sql, wall_ms, row_count, layer, plan, flags))
+
+    def record_spatialite(
+        self,
+        conn: Optional[sqlite3.Connection],
+        sql: str,
+        wall_ms: float,
+        row_count: int = -1,
+        params: Sequence[Any] = (),
+        layer: Optional[str] = None
+    ) -> Optional[QueryRecord]:
+        """Record a Spatialite statement, with its query plan above the threshold."""
+        if not self.enabled:
+            return None
+        plan = None
+        query = explainable_query(sql) if wall_ms >= self.explain_threshold_ms else None
+        if query and conn is not None:
+            plan = explain_spatialite(conn, query, params)
+        flags = analyze_spatialite_plan(plan, sql) if plan else []
+        return self.record(QueryRecord('spatialite', sql, wall_ms, row_count, layer, plan, flags))
+
+    def record(self, record: QueryRecord) -> Optional[QueryRecord]:
+        """Store a record and trim the ring buffer; returns it with its id."""
+        record.recorded_at = record.recorded_at or datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+        try:
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    cursor = conn.execute(
+                        "INSERT INTO query_profile (recorded_at, backend, layer, statement, wall_ms, row_count, plan, flags) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            record.recorded_at, record.backend, record.layer, record.statement,
+                            record.wall_ms, record.row_count,
+                            json.dumps(record.plan) if record.plan is not None else None,
+                            ",".join(record.flags)
+                        )
+                    )
+                    record.id = cursor.lastrowid
+                    conn.execute("DELETE FROM query_profile WHERE id <= ?", (record.id - self.capacity,))
+        except Exception as e:
+            logger.warning(f"[QueryProfiler] Could not record statement: {e}")
+            return None
+        if record.flags:
+            logger.info(
+                f"[QueryProfiler] {record.backend} {record.wall_ms:.0f}ms "
+                f"({', '.join(record.flags)}): {record.statement[:200]}"
+            )
+        return record
+
+    # === Query API ===
+
+    def records(
+        self,
+        backend: Optional[str] = None,
+        layer: Optional[str] = None,
+        min_wall_ms: Optional[float] = None,
+        flag: Optional[str] = None,
+        flagged_only: bool = False,
+        order_by: str = 'recent',
+        limit: Optional[int] = 100
+    ) -> List[QueryRecord]:
+        """
+        Query the ring buffer.
+
+        Args:
+            backend: 'postgresql' or 'spatialite'
+            layer: Layer name or id
+            min_wall_ms: Minimum wall time
+            flag: Flag kind (e.g. 'seq_scan') or exact flag ('seq_scan:roads')
+            flagged_only: Only records with at least one flag
+            order_by: 'recent' (newest first) or 'slowest'
+            limit: Maximum records (None for all)
+
+        Returns:
+            List[QueryRecord]
+        """
+        clauses, params = [], []
+        if backend:
+            clauses.append("backend = ?")
+            params.append(backend)
+        if layer:
+            clauses.append("layer = ?")
+            params.append(layer)
+        if min_wall_ms is not None:
+            clauses.append("wall_ms >= ?")
+            params.append(min_wall_ms)
+        if flag:
+            clauses.append("((',' || flags || ',') LIKE ? OR (',' || flags || ',') LIKE ?)")
+            params.extend([f"%,{flag},%", f"%,{flag}:%"])
+        if flagged_only:
+            clauses.append("flags != ''")
+        sql = f"SELECT {self._COLUMNS} FROM query_profile"  # nosec B608
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY wall_ms DESC" if order_by == 'slowest' else " ORDER BY id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            rows = self._connection().execute(sql, params).fetchall()
+        return [self._to_record(row) for row in rows]
+
+    def slowest(self, count: int = 10, **filters) -> List[QueryRecord]:
+        """The `count` slowest recorded statements."""
+        return self.records(order_by='slowest', limit=count, **filters)
+
+    def flag_counts(self) -> Dict[str, int]:
+        """Number of records per flag kind."""
+        counts: Dict[str, int] = {}
+        with self._lock:
+            rows = self._connection().execute("SELECT flags FROM query_profile WHERE flags != ''").fetchall()
+        for (flags,) in rows:
+            for kind in {f.split(':', 1)[0] for f in flags.split(',')}:
+                counts[kind] = counts.get(kind, 0) + 1
+        return counts
+
+    def export(self, path: str, **filters) -> int:
+        """
+        Write records to a .csv file, or JSON for any other extension.
+
+        Args:
+            path: Output file
+            **filters: Passed to records() (all records by default)
+
+        Returns:
+            int: Number of exported records
+        """
+        filters.setdefault('limit', None)
+        rows = [asdict(record) for record in reversed(self.records(**filters))]
+        if path.lower().endswith('.csv'):
+            with open(path, 'w', newline='', encoding='utf-8') as handle:
+                writer = csv.DictWriter(handle, fieldnames=list(QueryRecord.__dataclass_fields__))
+                writer.writeheader()
+                for row in rows:
+                    row['plan'] = json.dumps(row['plan']) if row['plan'] is not None else ''
+                    row['flags'] = ",".join(row['flags'])
+                    writer.writerow(row)
+        else:
+            with open(path, 'w', encoding='utf-8') as handle:
+                json.dump(rows, handle, indent=2)
+        return len(rows)
+
+    def clear(self) -> None:
+        """Delete every record."""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM query_profile")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Record count, flagged count and configuration."""
+        with self._lock:
+            total, flagged = self._connection().execute(
+                "SELECT count(*), coalesce(sum(flags != ''), 0) FROM query_profile"
+            ).fetchone()
+        return {
+            'enabled': self.enabled,
+            'records': total,
+            'flagged': flagged,
+            'capacity': self.capacity,
+            'explain_threshold_ms': self.explain_threshold_ms,
+            'db_path': self.db_path,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # === Private Methods ===
+
+    def _connection(self) -> sqlite3.Connection:
+        """Shared connection, created with the table on first use (lock held)."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5)
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS query_profile ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                    "recorded_at TEXT NOT NULL, "
+                    "backend TEXT NOT NULL, "
+                    "layer TEXT, "
+                    "statement TEXT NOT NULL, "
+                    "wall_ms REAL NOT NULL, "
+                    "row_count INTEGER NOT NULL DEFAULT -1, "
+                    "plan TEXT, "
+                    "flags TEXT NOT NULL DEFAULT '')"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_query_profile_wall_ms ON query_profile(wall_ms)")
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _to_record(row) -> QueryRecord:
+        record_id, recorded_at, backend, layer, statement, wall_ms, row_count, plan, flags = row
+        return QueryRecord(
+            backend, statement, wall_ms, row_count, layer,
+            json.loads(plan) if plan else None,
+            flags.split(',') if flags else [],
+            recorded_at, record_id
+        )
+
+
+_query_profiler: Optional[QueryProfiler] = None
+_query_profiler_lock = threading.Lock()
+
+
+def get_query_profiler() -> QueryProfiler:
+    """Get the process-wide QueryProfiler (disabled until configured)."""
+    global _query_profiler
+    with _query_profiler_lock:
+        if _query_profiler is None:
+            _query_profiler = QueryProfiler()
+        return _query_profiler
+
+
+__all__ = [
+    'QueryProfiler',
+    'QueryRecord',
+    'get_query_profiler',
+    'analyze_postgresql_plan',
+    'analyze_spatialite_plan',
+    'explainable_query',
+    'DEFAULT_EXPLAIN_THRESHOLD_MS',
+    'DEFAULT_PROFILE_CAPACITY',
+]
@@ -180,10 +180,42 @@ def safe_set_subset_string(layer, subset_expression: str) -> bool:
                     preview += f"... ({len(subset_expression) - 500} more chars)"
                 logger.debug(f"[SQL]   Expression: {preview}")
 
+            # v4.2.0: OGR ID tables (fm_tmp_ids_*) follow the layer's subset string
+            ogr_fid_tables = None
+            if layer.providerType() == 'ogr':
+                old_subset = layer.subsetString() or ''
+                try:
+                    from ...adapters.backends.ogr import filter_executor as ogr_fid_tables
+                    ogr_fid_tables.ensure_ogr_fid_tables(layer, subset_expression)
+                except Exception as fid_err:
+                    logger.debug(f"[SQL]   OGR ID table rebuild skipped: {fid_err}")
+
+            # v4.2.0: So do uploaded PostgreSQL source geometries (fm_source_geoms)
+            source_geometries = None
+            if layer.providerType() == 'postgres':
+                old_subset = layer.subsetString() or ''
+                try:
+                    from . import geometry_transport as source_geometries
+                    source_geometries.ensure_source_geometries(layer, subset_expression)
+                except Exception as geom_err:
+                    logger.debug(f"[SQL]   Source geometry re-upload skipped: {geom_err}")
+
             # FIX 2026-02-11: Detach FeaturePickerWidget before subset change to prevent crash
             with feature_picker_guard(layer):
                 result = layer.setSubsetString(subset_expression)
 
+            if result and ogr_fid_tables is not None:
+                try:
+                    ogr_fid_tables.release_ogr_fid_tables(layer, old_subset)
+                except Exception as fid_err:
+                    logger.debug(f"[SQL]   OGR ID table release skipped: {fid_err}")
+
+            if result and source_geometries is not None:
+                try:
+                    source_geometries.release_source_geometries(layer, old_subset)
+                except Exception as geom_err:
+                    logger.debug(f"[SQL]   Source geometry release skipped: {geom_err}")
+
             if not result:
                 logger.warning(f"setSubsetString returned False for layer {layer.name()}")
                 # Additional diagnostics for failure
@@ -249,21 +281,15 @@ def create_temp_spatialite_table(
         True
     """
     import sqlite3
+    from .connection_pool import get_spatialite_pool_manager
 
     try:
-        conn = sqlite3.connect(db_path)
-        conn.enable_load_extension(True)
-
-        # Load Spatialite extension
+        # v4.2.0: Pooled connection with mod_spatialite already loaded
         try:
-            conn.load_extension('mod_spatialite')
-        except sqlite3.OperationalError:
-            try:
-                conn.load_extension('mod_spatialite.dll')  # Windows fallback
-            except Exception as e:
-                logger.error(f"Failed to load Spatialite extension: {e}")
-                conn.close()
-                return False
+            conn = get_spatialite_pool_manager().get_connection(db_path)
+        except sqlite3.OperationalError as e:
+            logger.error(f"Failed to load Spatialite extension: {e}")
+            return False
 
         cursor = conn.cursor()
 
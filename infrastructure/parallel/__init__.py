@@ -10,12 +10,15 @@ Exported Symbols:
     - FilterResult: Dataclass for single layer filtering result
     - ParallelFilterExecutor: Multi-threaded executor for layer filtering
     - ParallelConfig: Configuration for parallel execution tuning
+    - OgrProcessPool: Worker processes computing OGR layer FIDs with GDAL/OGR
+    - OgrFidJob / OgrFidResult: Picklable job and result of one OGR layer
 
 Thread Safety:
     - QGIS layers (QgsVectorLayer) are NOT thread-safe
     - OGR operations MUST run sequentially (direct layer manipulation)
     - PostgreSQL/Spatialite CAN run in parallel (database-only operations)
     - Geometric filtering MUST run sequentially (uses selectByLocation)
+    - OGR FIDs MAY be precomputed in worker processes (no QGIS objects involved)
 
 Performance:
     - 2-4× faster on multi-core systems for database-backed layers
@@ -25,6 +28,7 @@ Performance:
 Migration History:
     - v3.0: Created infrastructure/parallel/ package (EPIC-1)
     - v3.0: Migrated from modules/tasks/parallel_executor.py
+    - v4.2.0: Added OGR process pool (ogr_process_pool.py)
 """
 
 from .parallel_executor import (  # noqa: F401
@@ -32,9 +36,17 @@ from .parallel_executor import (  # noqa: F401
     ParallelFilterExecutor,
     ParallelConfig
 )
+from .ogr_process_pool import (  # noqa: F401
+    OgrFidJob,
+    OgrFidResult,
+    OgrProcessPool,
+)
 
 __all__ = [
     'FilterResult',
     'ParallelFilterExecutor',
-    'ParallelConfig'
+    'ParallelConfig',
+    'OgrFidJob',
+    'OgrFidResult',
+    'OgrProcessPool',
 ]
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+OGR Process Pool for FilterMate
+
+Computes spatial selections of file-based OGR layers in worker processes.
+
+QGIS layer objects are not thread-safe, so ParallelFilterExecutor runs OGR
+layers sequentially on the main thread (see parallel_executor.py). Worker
+processes do not touch QGIS layers at all: each one opens the data source
+with GDAL/OGR, applies the layer's subset string as an attribute filter,
+tests every candidate feature against the serialized source geometries and
+returns a compact FID array. The main thread then only applies the FIDs
+(selectByIds + setSubsetString), through the normal OGR filter path.
+
+v4.2.0 - OGR process pool (October 2026)
+
+Flow:
+    1. The task builds one picklable OgrFidJob per OGR target layer
+       (source geometries as WKB, already in the target CRS).
+    2. OgrProcessPool.evaluate() runs the jobs in spawned processes.
+    3. Results are published with publish_precomputed_fids().
+    4. The OGR executor picks them up with take_precomputed_fids() and skips
+       its in-process spatial scan. Any mismatch (other source, predicates
+       or subset string) returns None and the layer is computed in-process.
+
+Worker processes use the 'spawn' start method: forking a QGIS process is
+unsafe, and spawn is the only method available on Windows anyway. The job,
+result and worker function live in spawn_worker/filtermate_ogr_fid_worker.py,
+a top-level module outside the plugin package: the workers import only that
+module, the standard library and osgeo.
+
+Usage:
+    from ...infrastructure.parallel.ogr_process_pool import OgrProcessPool
+
+    pool = OgrProcessPool(max_workers=4)
+    results = pool.evaluate(jobs, cancel_check=task.isCanceled)
+    publish_precomputed_fids(jobs, results)
+"""
+
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger('FilterMate.Parallel.OgrProcessPool')
+
+# v4.2.0: The worker entry point is a top-level module outside the package
+# so spawned children unpickle it without importing the plugin (and PyQt).
+WORKER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'spawn_worker')
+if WORKER_DIR not in sys.path:
+    sys.path.append(WORKER_DIR)  # Inherited by spawned children
+
+from filtermate_ogr_fid_worker import (  # noqa: E402
+    OgrFidJob,
+    OgrFidResult,
+    evaluate_ogr_fid_job,
+)
+
+# Seconds between cancellation checks while waiting for workers
+POLL_INTERVAL = 0.2
+
+# Default worker count cap when max_workers is 0 / None
+DEFAULT_MAX_WORKERS = 4
+
+
+# =============================================================================
+# Layer sources
+# =============================================================================
+
+def ogr_layer_location(source: str) -> Tuple[str, Optional[str], int]:
+    """
+    Split a QGIS OGR layer source into path, layer name and layer index.
+
+    Args:
+        source: e.g. "/data/city.gpkg|layername=roads" or "/data/a.shp|layerid=0"
+
+    Returns:
+        (path, layer_name or None, layer_index)
+    """
+    parts = source.split('|')
+    layer_name, layer_index = None, 0
+    for option in parts[1:]:
+        key, _, value = option.partition('=')
+        key = key.strip().lower()
+        if key == 'layername' and value:
+            layer_name = value
+        elif key == 'layerid' and value.strip().isdigit():
+            layer_index = int(value)
+    return parts[0], layer_name, layer_index
+
+
+# =============================================================================
+# Pool
+# =============================================================================
+
+def _python_executable() -> Optional[str]:
+    """
+    Python interpreter used to spawn workers.
+
+    Inside QGIS, sys.executable is usually the QGIS binary (qgis.exe,
+    qgis-bin), which cannot run multiprocessing children.
+    """
+    executable = sys.executable or ''
+    if os.path.basename(executable).lower().startswith('python'):
+        return executable
+
+    names = ('python.exe', 'pythonw.exe') if os.name == 'nt' else (
+        f'python{sys.version_info[0]}.{sys.version_info[1]}', f'python{sys.version_info[0]}', 'python'
+    )
+    for prefix in (sys.exec_prefix, sys.prefix):
+        for folder in (prefix, os.path.join(prefix, 'bin')):
+            for name in names:
+                candidate = os.path.join(folder, name)
+                if os.path.isfile(candidate):
+                    return candidate
+    return None
+
+
+class OgrProcessPool:
+    """
+    Evaluate OgrFidJobs in spawned worker processes.
+
+    Workers are started per evaluate() call and shut down afterwards; a
+    filter run evaluates all its OGR layers in a single call.
+
+    Example:
+        >>> pool = OgrProcessPool(max_workers=4)
+        >>> results = pool.evaluate(jobs, cancel_check=task.isCanceled)
+        >>> fids = results[layer.id()].fid_set()
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Args:
+            max_workers: Worker processes. None or <= 0 means
+                         min(DEFAULT_MAX_WORKERS, CPU count - 1).
+        """
+        if max_workers is None or max_workers <= 0:
+            max_workers = min(DEFAULT_MAX_WORKERS, max(1, (os.cpu_count() or 2) - 1))
+        self._max_workers = max(1, max_workers)
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def evaluate(
+        self,
+        jobs: List[OgrFidJob],
+        cancel_check: Optional[Callable[[], bool]] = None
+    ) -> Dict[str, OgrFidResult]:
+        """
+        Run the jobs and collect their results by layer id.
+
+        Returns an empty dict when the pool cannot be started or breaks, and
+        a partial dict on cancellation; callers compute missing layers
+        in-process.
+        """
+        if not jobs:
+            return {}
+
+        executable = _python_executable()
+        if executable is None:
+            logger.warning("OGR process pool disabled: no Python interpreter found next to the QGIS binary")
+            return {}
+
+        context = multiprocessing.get_context('spawn')
+        context.set_executable(executable)
+        workers = min(self._max_workers, len(jobs))
+        start = time.perf_counter()
+        results: Dict[str, OgrFidResult] = {}
+
+        executor = None
+        canceled = False
+        try:
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            pending = {executor.submit(evaluate_ogr_fid_job, job) for job in jobs}
+            while pending:
+                if cancel_check and cancel_check():
+                    logger.info("OGR process pool canceled")
+                    canceled = True
+                    return results
+                done, pending = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    results[result.layer_id] = result
+                    if result.error:
+                        logger.warning(f"OGR worker failed for {result.layer_id}: {result.error}")
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning(f"OGR process pool unavailable, computing in-process: {e}")
+            return {}
+        finally:
+            if executor is not None:
+                # Do not block a canceled task on workers still scanning
+                executor.shutdown(wait=not canceled, cancel_futures=True)
+
+        succeeded = sum(1 for r in results.values() if r.success)
+        logger.info(
+            f"OGR process pool: {succeeded}/{len(jobs)} layer(s) evaluated by {workers} worker(s) "
+            f"in {(time.perf_counter() - start) * 1000:.0f}ms"
+        )
+        return results
+
+
+# =============================================================================
+# Precomputed FID registry
+# =============================================================================
+
+_precomputed_lock = threading.Lock()
+_precomputed: Dict[str, Tuple[str, FrozenSet[int], str, FrozenSet[int]]] = {}
+
+
+def publish_precomputed_fids(jobs: Iterable[OgrFidJob], results: Dict[str, OgrFidResult]) -> int:
+    """
+    Make successful results available to the OGR executor.
+
+    Returns:
+        int: Number of layers published
+    """
+    published = 0
+    with _precomputed_lock:
+        for job in jobs:
+            result = results.get(job.layer_id)
+            if result is None or not result.success:
+                continue
+            _precomputed[job.layer_id] = (
+                job.source_key, frozenset(job.predicates), job.attribute_filter or '', result.fid_set()
+            )
+            published += 1
+    return published
+
+
+def take_precomputed_fids(
+    layer_id: str,
+    source_key: str,
+    predicates: Iterable[int],
+    attribute_filter: Optional[str]
+) -> Optional[FrozenSet[int]]:
+    """
+    Pop the FIDs computed for a layer, if they match the current request.
+
+    Returns:
+        frozenset of FIDs, or None if nothing matching was precomputed
+    """
+    with _precomputed_lock:
+        entry = _precomputed.pop(layer_id, None)
+    if entry is None:
+        return None
+    entry_source, entry_predicates, entry_filter, fids = entry
+    if (entry_source, entry_predicates, entry_filter) != (source_key, frozenset(predicates), attribute_filter or ''):
+        logger.debug(f"Precomputed FIDs for {layer_id} do not match the current request, ignored")
+        return None
+    return fids
+
+
+def clear_precomputed_fids() -> None:
+    """Drop all unused precomputed results."""
+    with _precomputed_lock:
+        _precomputed.clear()
+
+
+__all__ = [
+    'OgrFidJob',
+    'OgrFidResult',
+    'OgrProcessPool',
+    'evaluate_ogr_fid_job',
+    'ogr_layer_location',
+    'publish_precomputed_fids',
+    'take_precomputed_fids',
+    'clear_precomputed_fids',
+]
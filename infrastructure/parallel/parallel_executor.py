@@ -43,6 +43,7 @@ import threading
 import time
 
 from ..logging import get_logger
+from .ogr_process_pool import OgrFidJob, OgrProcessPool, clear_precomputed_fids, publish_precomputed_fids
 
 logger = get_logger(__name__)
 
@@ -91,7 +92,7 @@ class ParallelFilterExecutor:
     DEFAULT_MAX_WORKERS = 4
     MIN_LAYERS_FOR_PARALLEL = 2  # Don't parallelize for less than 2 layers
 
-    def __init__(self, max_workers: Optional[int] = None):
+    def __init__(self, max_workers: Optional[int] = None, ogr_process_workers: Optional[int] = None):
         """
         Initialize parallel filter executor.
 
@@ -99,6 +100,8 @@ class ParallelFilterExecutor:
             max_workers: Maximum number of worker threads.
                         Defaults to min(4, CPU count).
                         Values <= 0 are treated as auto-detect.
+            ogr_process_workers: Worker processes for OGR FID precomputation
+                        (see ogr_process_pool.py). None or <= 0 = auto-detect.
         """
         import os
 
@@ -109,6 +112,7 @@ class ParallelFilterExecutor:
 
         # Ensure max_workers is always at least 1
         self._max_workers = max(1, max_workers)
+        self._ogr_process_workers = ogr_process_workers
         self._results: List[FilterResult] = []
         self._lock = threading.Lock()
         self._canceled = False
@@ -121,7 +125,8 @@ class ParallelFilterExecutor:
         filter_func: Callable,
         task_parameters: Dict[str, Any],
         progress_callback: Optional[Callable[[int, int, str], None]] = None,
-        cancel_check: Optional[Callable[[], bool]] = None
+        cancel_check: Optional[Callable[[], bool]] = None,
+        ogr_job_factory: Optional[Callable[[Any], Optional[OgrFidJob]]] = None
     ) -> List[FilterResult]:
         """
         Filter multiple layers in parallel (when thread-safe) or sequentially.
@@ -138,12 +143,18 @@ class ParallelFilterExecutor:
         - PostgreSQL/Spatialite: Parallel OK (database-only operations)
         - Mixed providers: Sequential (safest approach)
 
+        v4.2.0: When ogr_job_factory is given, the spatial selections of OGR
+        layers are computed beforehand in worker processes (GDAL/OGR only, no
+        QGIS objects) and the sequential pass only applies the FIDs.
+
         Args:
             layers: List of (layer, layer_props) tuples to filter
             filter_func: Function to call for each layer: filter_func(provider_type, layer, layer_props)
             task_parameters: Shared task parameters
             progress_callback: Optional callback(current, total, layer_name) for progress updates
             cancel_check: Optional callback() -> bool to check if canceled
+            ogr_job_factory: Optional callback(layer) -> OgrFidJob or None,
+                             enables the OGR process pool
 
         Returns:
             List[FilterResult]: Results for each layer
@@ -206,7 +217,9 @@ class ParallelFilterExecutor:
                 f"{len(shared_database_files)} shared database(s), max {max_layers} layers/db. "
                 f"Providers: {provider_types}"
             )
-            return self._filter_sequential(layers, filter_func, progress_callback, cancel_check)
+            return self._filter_sequential_with_ogr_pool(
+                layers, filter_func, progress_callback, cancel_check, ogr_job_factory
+            )
 
         # Force sequential execution for OGR layers to prevent access violations
         if has_ogr_layers:
@@ -216,7 +229,9 @@ class ParallelFilterExecutor:
                 "QGIS layer objects are not thread-safe. "
                 f"Providers: {provider_types}"
             )
-            return self._filter_sequential(layers, filter_func, progress_callback, cancel_check)
+            return self._filter_sequential_with_ogr_pool(
+                layers, filter_func, progress_callback, cancel_check, ogr_job_factory
+            )
 
         # Also force sequential if geometric filtering is enabled (uses layer operations)
         filtering_params = task_parameters.get("filtering", {})
@@ -227,7 +242,9 @@ class ParallelFilterExecutor:
                 "⚠️ Geometric filtering detected - using SEQUENTIAL execution for thread safety. "
                 "Geometric operations use selectByLocation which is not thread-safe."
             )
-            return self._filter_sequential(layers, filter_func, progress_callback, cancel_check)
+            return self._filter_sequential_with_ogr_pool(
+                layers, filter_func, progress_callback, cancel_check, ogr_job_factory
+            )
 
         logger.info(f"🚀 Starting parallel filtering of {layer_count} layers with {self._max_workers} workers")
         logger.debug(f"   Providers: {provider_types} (all database-backed, parallel OK)")
@@ -566,6 +583,64 @@ class ParallelFilterExecutor:
 
         return results
 
+    def _filter_sequential_with_ogr_pool(
+        self,
+        layers: List[Tuple[Any, Dict]],
+        filter_func: Callable,
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        cancel_check: Optional[Callable[[], bool]] = None,
+        ogr_job_factory: Optional[Callable[[Any], Optional[OgrFidJob]]] = None
+    ) -> List[FilterResult]:
+        """
+        Sequential filtering, with OGR FIDs precomputed in worker processes.
+
+        Layers whose job cannot be built or whose worker failed are computed
+        in-process by the sequential pass as before. Unused precomputed
+        results are dropped at the end.
+        """
+        if ogr_job_factory is None:
+            return self._filter_sequential(layers, filter_func, progress_callback, cancel_check)
+
+        try:
+            self._precompute_ogr_fids(layers, ogr_job_factory, cancel_check)
+            return self._filter_sequential(layers, filter_func, progress_callback, cancel_check)
+        finally:
+            clear_precomputed_fids()
+
+    def _precompute_ogr_fids(
+        self,
+        layers: List[Tuple[Any, Dict]],
+        ogr_job_factory: Callable[[Any], Optional[OgrFidJob]],
+        cancel_check: Optional[Callable[[], bool]] = None
+    ) -> int:
+        """
+        Evaluate the OGR layers' spatial selections in the process pool.
+
+        Returns:
+            int: Number of layers with published FIDs
+        """
+        jobs = []
+        for layer, _layer_props in layers:
+            try:
+                job = ogr_job_factory(layer)  # None for non-OGR or unsupported layers
+            except Exception as e:
+                logger.debug(f"No OGR process job for layer {layer}: {e}")
+                job = None
+            if job is not None:
+                jobs.append(job)
+
+        if len(jobs) < self.MIN_LAYERS_FOR_PARALLEL:
+            return 0
+
+        start_time = time.time()
+        pool = OgrProcessPool(self._ogr_process_workers)
+        published = publish_precomputed_fids(jobs, pool.evaluate(jobs, cancel_check))
+        logger.info(
+            f"🚀 OGR process pool: FIDs precomputed for {published}/{len(jobs)} layer(s) "
+            f"with {pool.max_workers} worker(s) in {(time.time() - start_time) * 1000:.0f}ms"
+        )
+        return published
+
     def _get_layer_database_path(self, layer) -> Optional[str]:
         """
         Extract the database file path from a layer's source.
@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""
+OGR FID worker for FilterMate's process pool
+
+Entry point executed in the spawned worker processes of OgrProcessPool
+(see ogr_process_pool.py).
+
+v4.2.0 - OGR process pool (October 2026)
+
+Spawned children unpickle jobs, results and the worker function by module
+name. This module therefore lives outside the plugin package (the folder
+has no __init__.py) and is imported under the top-level name
+``filtermate_ogr_fid_worker``. Unpickling never runs the plugin's package
+__init__ files, which import QGIS and PyQt. Only the standard library,
+osgeo and (optionally) shapely may be imported here.
+
+Source envelopes are indexed in a Sort-Tile-Recursive packed tree, so each
+target feature is only tested against the sources its envelope overlaps.
+When shapely 2 is available the sources are GEOS prepared geometries;
+otherwise the OGR predicates are used.
+"""
+
+import math
+import time
+from array import array
+from dataclasses import dataclass
+from typing import FrozenSet, List, Optional, Sequence, Tuple
+
+# selectbylocation predicate codes (same as adapters/backends/ogr/spatial_selection.py)
+PREDICATE_INTERSECTS = 0
+PREDICATE_CONTAINS = 1
+PREDICATE_DISJOINT = 2
+PREDICATE_EQUALS = 3
+PREDICATE_TOUCHES = 4
+PREDICATE_OVERLAPS = 5
+PREDICATE_WITHIN = 6
+PREDICATE_CROSSES = 7
+
+# Predicate code -> ogr.Geometry method called as target.<method>(source)
+_OGR_PREDICATES = {
+    PREDICATE_INTERSECTS: 'Intersects',
+    PREDICATE_CONTAINS: 'Contains',
+    PREDICATE_EQUALS: 'Equals',
+    PREDICATE_TOUCHES: 'Touches',
+    PREDICATE_OVERLAPS: 'Overlaps',
+    PREDICATE_WITHIN: 'Within',
+    PREDICATE_CROSSES: 'Crosses',
+}
+
+# Predicate code -> shapely function called as <function>(prepared source, target).
+# "target contains source" is "source within target" and vice versa.
+_SHAPELY_PREDICATES = {
+    PREDICATE_INTERSECTS: 'intersects',
+    PREDICATE_CONTAINS: 'within',
+    PREDICATE_EQUALS: 'equals',
+    PREDICATE_TOUCHES: 'touches',
+    PREDICATE_OVERLAPS: 'overlaps',
+    PREDICATE_WITHIN: 'contains',
+    PREDICATE_CROSSES: 'crosses',
+}
+
+# Children per STR tree node
+STR_NODE_CAPACITY = 10
+
+
+# =============================================================================
+# Jobs and results
+# =============================================================================
+
+
+@dataclass(frozen=True)
+class OgrFidJob:
+    """
+    Picklable description of one target layer evaluation.
+
+    Attributes:
+        layer_id: QGIS layer id of the target (used to route the result)
+        data_source: File path opened by ogr.Open() in the worker
+        layer_name: OGR layer name (None: use layer_index)
+        layer_index: OGR layer index when no name is given
+        predicates: selectbylocation predicate codes (0-7)
+        source_wkbs: One WKB per source feature, in the target layer CRS
+        attribute_filter: Target subset string applied as OGR attribute filter
+        source_key: Identifier of the source the WKBs were read from
+    """
+    layer_id: str
+    data_source: str
+    layer_name: Optional[str]
+    predicates: Tuple[int, ...]
+    source_wkbs: Tuple[bytes, ...]
+    attribute_filter: str = ''
+    source_key: str = ''
+    layer_index: int = 0
+
+
+@dataclass
+class OgrFidResult:
+    """Result of one OgrFidJob; ``fids`` is an array('q') as bytes."""
+    layer_id: str
+    fids: bytes = b''
+    count: int = 0
+    scanned: int = 0
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+    def fid_set(self) -> FrozenSet[int]:
+        """Decode the FID array."""
+        values = array('q')
+        values.frombytes(self.fids)
+        return frozenset(values)
+
+
+# =============================================================================
+# Source index
+# =============================================================================
+
+Envelope = Tuple[float, float, float, float]  # OGR order: (minx, maxx, miny, maxy)
+
+
+def _envelope_overlaps(a: Envelope, b: Envelope) -> bool:
+    return a[0] <= b[1] and b[0] <= a[1] and a[2] <= b[3] and b[2] <= a[3]
+
+
+def _envelope_union(envelopes: Sequence[Envelope]) -> Envelope:
+    return (
+        min(e[0] for e in envelopes), max(e[1] for e in envelopes),
+        min(e[2] for e in envelopes), max(e[3] for e in envelopes),
+    )
+
+
+class STRtree:
+    """
+    Static Sort-Tile-Recursive packed R-tree over envelopes.
+
+    Nodes are ``(envelope, payload)`` pairs: the payload of a leaf entry is
+    the index of its envelope, that of an inner node its child list.
+    """
+
+    def __init__(self, envelopes: Sequence[Envelope], node_capacity: int = STR_NODE_CAPACITY):
+        nodes = [(env, i) for i, env in enumerate(envelopes)]
+        while len(nodes) > node_capacity:
+            nodes = self._pack(nodes, node_capacity)
+        self._root = nodes
+
+    @staticmethod
+    def _pack(nodes: list, capacity: int) -> list:
+        parent_count = math.ceil(len(nodes) / capacity)
+        slice_size = capacity * math.ceil(math.sqrt(parent_count))
+        nodes = sorted(nodes, key=lambda n: n[0][0] + n[0][1])  # by x center
+        parents = []
+        for start in range(0, len(nodes), slice_size):
+            column = sorted(nodes[start:start + slice_size], key=lambda n: n[0][2] + n[0][3])  # by y center
+            for offset in range(0, len(column), capacity):
+                children = column[offset:offset + capacity]
+                parents.append((_envelope_union([n[0] for n in children]), children))
+        return parents
+
+    def query(self, envelope: Envelope) -> List[int]:
+        """Indexes of the envelopes overlapping ``envelope``."""
+        found = []
+        stack = [self._root]
+        while stack:
+            for node_envelope, payload in stack.pop():
+                if _envelope_overlaps(envelope, node_envelope):
+                    if isinstance(payload, list):
+                        stack.append(payload)
+                    else:
+                        found.append(payload)
+        return found
+
+
+def _load_shapely():
+    """shapely >= 2 (vectorized, preparable geometries), or None."""
+    try:
+        import shapely
+    except ImportError:
+        return None
+    return shapely if hasattr(shapely, 'prepare') else None
+
+
+class _Sources:
+    """Source geometries of a job, indexed, and prepared when shapely is available."""
+
+    def __init__(self, source_wkbs: Sequence[bytes], ogr, shapely=None):
+        self._shapely = shapely
+        self.geometries = []
+        envelopes = []
+        for wkb in source_wkbs:
+            geom = ogr.CreateGeometryFromWkb(wkb)
+            if geom is None or geom.IsEmpty():
+                continue
+            envelopes.append(geom.GetEnvelope())
+            if shapely is not None:
+                geom = shapely.from_wkb(bytes(wkb))
+                shapely.prepare(geom)
+            self.geometries.append(geom)
+        self.extent = _envelope_union(envelopes) if envelopes else None
+        self._tree = STRtree(envelopes)
+
+    def candidates(self, envelope: Envelope) -> List[int]:
+        return self._tree.query(envelope)
+
+    def convert_target(self, target):
+        """Target geometry in the representation test() expects."""
+        if self._shapely is None:
+            return target
+        return self._shapely.from_wkb(bytes(target.ExportToIsoWkb()))
+
+    def test(self, index: int, target, code: int) -> bool:
+        """Whether ``target <code> source[index]`` holds."""
+        source = self.geometries[index]
+        if self._shapely is None:
+            return getattr(target, _OGR_PREDICATES[code])(source)
+        return bool(getattr(self._shapely, _SHAPELY_PREDICATES[code])(source, target))
+
+
+# =============================================================================
+# Worker
+# =============================================================================
+
+def evaluate_ogr_fid_job(job: OgrFidJob) -> OgrFidResult:
+    """
+    Compute the target FIDs of one job with GDAL/OGR.
+
+    Semantics match NativeSpatialSelectionEngine.select_fids(): a target is
+    selected when ``target <predicate> source`` holds for at least one source
+    geometry; Disjoint selects targets intersecting no source geometry.
+
+    Never raises: errors are returned in OgrFidResult.error.
+    """
+    start = time.perf_counter()
+    try:
+        from osgeo import ogr
+    except ImportError as e:
+        return OgrFidResult(job.layer_id, error=f"GDAL Python bindings not available: {e}")
+
+    codes = set(job.predicates) or {PREDICATE_INTERSECTS}
+    unknown = codes - set(_OGR_PREDICATES) - {PREDICATE_DISJOINT}
+    if unknown:
+        return OgrFidResult(job.layer_id, error=f"Unsupported predicate codes: {sorted(unknown)}")
+    check_disjoint = PREDICATE_DISJOINT in codes
+    positive = [c for c in sorted(codes) if c != PREDICATE_DISJOINT]
+
+    try:
+        ogr.UseExceptions()
+        sources = _Sources(job.source_wkbs, ogr, _load_shapely())
+
+        datasource = ogr.Open(job.data_source, 0)
+        if datasource is None:
+            return OgrFidResult(job.layer_id, error=f"Cannot open {job.data_source}")
+        layer = (datasource.GetLayerByName(job.layer_name) if job.layer_name
+                 else datasource.GetLayer(job.layer_index))
+        if layer is None:
+            return OgrFidResult(job.layer_id, error=f"Layer not found: {job.layer_name or job.layer_index}")
+
+        layer.SetAttributeFilter(job.attribute_filter or None)
+        if sources.extent is not None and not check_disjoint:
+            # Every positive predicate implies envelope intersection with some source
+            extent = sources.extent
+            layer.SetSpatialFilterRect(extent[0], extent[2], extent[1], extent[3])
+        elif not check_disjoint:
+            return OgrFidResult(job.layer_id, elapsed_ms=(time.perf_counter() - start) * 1000)
+
+        fids = array('q')
+        scanned = 0
+        layer.ResetReading()
+        for feature in layer:
+            scanned += 1
+            target = feature.GetGeometryRef()
+            if target is None or target.IsEmpty():
+                if check_disjoint:
+                    fids.append(feature.GetFID())
+                continue
+
+            candidates = sources.candidates(target.GetEnvelope())
+            if not candidates:
+                if check_disjoint:
+                    fids.append(feature.GetFID())
+                continue
+
+            target = sources.convert_target(target)
+            is_match = False
+            intersects_any = False
+            for index in candidates:
+                for code in positive:
+                    if sources.test(index, target, code):
+                        is_match = True
+                        break
+                if is_match:
+                    break
+                if check_disjoint and not intersects_any:
+                    intersects_any = sources.test(index, target, PREDICATE_INTERSECTS)
+                    if intersects_any and not positive:
+                        break
+
+            if is_match or (check_disjoint and not intersects_any):
+                fids.append(feature.GetFID())
+
+        datasource = None  # Close before returning the result
+        return OgrFidResult(
+            job.layer_id,
+            fids=fids.tobytes(),
+            count=len(fids),
+            scanned=scanned,
+            elapsed_ms=(time.perf_counter() - start) * 1000,
+        )
+    except Exception as e:  # RuntimeError from ogr.UseExceptions() and driver errors
+        return OgrFidResult(job.layer_id, error=str(e), elapsed_ms=(time.perf_counter() - start) * 1000)
+
+
+__all__ = [
+    'OgrFidJob',
+    'OgrFidResult',
+    'evaluate_ogr_fid_job',
+]
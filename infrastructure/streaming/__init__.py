@@ -4,6 +4,7 @@ Infrastructure Streaming Package
 
 Provides streaming and batch processing utilities for large datasets:
 - result_streaming: Chunked exports for very large datasets
+- export_pipeline: Bounded reader/transform/writer pipeline behind exports
 
 Migrated from modules/tasks/ (EPIC-1 v3.0).
 """
@@ -14,10 +15,20 @@ from .result_streaming import (  # noqa: F401
     StreamingExporter,
     estimate_export_memory
 )
+from .export_pipeline import (  # noqa: F401
+    ExportPipeline,
+    PipelinePlan,
+    PipelineResult,
+    plan_export_pipeline
+)
 
 __all__ = [
     'StreamingConfig',
     'ExportProgress',
     'StreamingExporter',
-    'estimate_export_memory'
+    'estimate_export_memory',
+    'ExportPipeline',
+    'PipelinePlan',
+    'PipelineResult',
+    'plan_export_pipeline'
 ]
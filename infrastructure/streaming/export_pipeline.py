@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+"""
+Bounded Export Pipeline for FilterMate
+
+Runs a streaming export as a producer/consumer pipeline so reading,
+transforming and writing overlap instead of alternating:
+
+    reader thread --[bounded queue]--> transform thread --[bounded queue]--> writer
+
+- The reader pulls feature batches from the source (provider I/O).
+- The optional transform stage reprojects/simplifies geometries.
+- The writer drains the last queue on the calling thread, so the output
+  writer never crosses threads.
+
+Queues are bounded: a fast reader blocks when the writer falls behind
+(backpressure), which keeps the number of batches in flight - and therefore
+memory - constant whatever the feature count. The queue depth is derived
+from the memory ceiling with plan_export_pipeline().
+
+This module is QGIS-free; StreamingExporter supplies the batch source,
+the transform and the write callables.
+
+v4.2.0 - Write-behind streaming exports (October 2026)
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from ..logging import get_logger
+
+logger = get_logger(__name__)
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+STAGE_READ = 'read'
+STAGE_TRANSFORM = 'transform'
+STAGE_WRITE = 'write'
+
+# Smallest batch the planner will shrink to when a batch alone would exceed
+# the memory ceiling.
+MIN_PIPELINE_BATCH_SIZE = 100
+
+# Seconds a blocked stage waits before re-checking cancellation. Also the
+# cadence of progress reports while the writer waits on a slow reader.
+PIPELINE_POLL_INTERVAL = 0.25
+
+# End-of-stream marker passed down the queues
+_END = object()
+
+
+# =============================================================================
+# Planning
+# =============================================================================
+
+@dataclass
+class PipelinePlan:
+    """Batch size and queue depth chosen for an export."""
+
+    batch_size: int
+    queue_depth: int
+    batch_bytes: int
+    ceiling_bytes: int
+    batches_in_flight: int
+
+    @property
+    def peak_bytes(self) -> int:
+        """Upper bound of batch memory held by the pipeline."""
+        return self.batch_bytes * self.batches_in_flight
+
+
+def plan_export_pipeline(
+    batch_size: int,
+    prefetch_batches: int,
+    memory_limit_mb: int,
+    avg_geometry_vertices: int = 100,
+    with_transform: bool = False,
+) -> PipelinePlan:
+    """
+    Choose batch size and queue depth so batches in flight fit the ceiling.
+
+    Every stage holds one batch while working on it and each queue holds up
+    to ``queue_depth`` more. The depth is the largest value not above
+    ``prefetch_batches`` that keeps that total under ``memory_limit_mb``
+    (estimated with estimate_export_memory()). If a single batch per stage
+    already exceeds the ceiling the batch size is reduced instead.
+
+    Args:
+        batch_size: Requested features per batch
+        prefetch_batches: Maximum batches buffered per queue
+        memory_limit_mb: Memory ceiling in MB (0 = unlimited)
+        avg_geometry_vertices: Average vertices per geometry
+        with_transform: Whether a transform stage (and second queue) runs
+
+    Returns:
+        PipelinePlan
+    """
+    from .result_streaming import estimate_export_memory
+
+    stages = 3 if with_transform else 2
+    queues = 2 if with_transform else 1
+    batch_size = max(1, int(batch_size))
+    max_depth = max(1, int(prefetch_batches))
+    ceiling = max(0, int(memory_limit_mb)) * 1024 * 1024
+
+    batch_bytes = estimate_export_memory(batch_size, avg_geometry_vertices)
+    if ceiling <= 0:
+        depth = max_depth
+    else:
+        # Minimum footprint is one queued batch per queue plus one per stage
+        min_batches = queues + stages
+        if batch_bytes * min_batches > ceiling:
+            feature_bytes = max(1, estimate_export_memory(1, avg_geometry_vertices))
+            batch_size = max(MIN_PIPELINE_BATCH_SIZE, ceiling // (feature_bytes * min_batches))
+            batch_bytes = estimate_export_memory(batch_size, avg_geometry_vertices)
+        depth = (ceiling // max(1, batch_bytes) - stages) // queues
+        depth = max(1, min(max_depth, depth))
+
+    return PipelinePlan(
+        batch_size=batch_size,
+        queue_depth=depth,
+        batch_bytes=batch_bytes,
+        ceiling_bytes=ceiling,
+        batches_in_flight=depth * queues + stages,
+    )
+
+
+# =============================================================================
+# Pipeline
+# =============================================================================
+
+@dataclass
+class PipelineResult:
+    """Outcome of an ExportPipeline run."""
+
+    features_read: int = 0
+    features_transformed: int = 0
+    features_written: int = 0
+    batches_written: int = 0
+    elapsed_ms: float = 0.0
+    canceled: bool = False
+    error: Optional[BaseException] = None
+    error_stage: Optional[str] = None
+    stage_wait_ms: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def success(self) -> bool:
+        return self.error is None and not self.canceled
+
+
+class ExportPipeline:
+    """
+    Bounded reader -> transform -> writer pipeline.
+
+    ``batch_source`` is called on the reader thread and must return an
+    iterable of batches, so any provider iterator is created on the thread
+    that consumes it. ``transform_batch`` runs on its own thread and
+    ``write_batch`` on the thread calling run().
+
+    Example:
+        >>> pipeline = ExportPipeline(plan, cancel_check=task.isCanceled)
+        >>> result = pipeline.run(lambda: batches, write_batch=writer_fn)
+    """
+
+    def __init__(
+        self,
+        plan: PipelinePlan,
+        cancel_check: Optional[Callable[[], bool]] = None,
+        progress_callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        poll_interval: float = PIPELINE_POLL_INTERVAL,
+    ):
+        """
+        Initialize pipeline.
+
+        Args:
+            plan: Batch size / queue depth from plan_export_pipeline()
+            cancel_check: Callback returning True to stop the export
+            progress_callback: Called on the writer thread with the active
+                stage and a snapshot of the pipeline counters
+            poll_interval: Seconds between cancellation checks while blocked
+        """
+        self.plan = plan
+        self.cancel_check = cancel_check
+        self.progress_callback = progress_callback
+        self.poll_interval = poll_interval
+
+        self._stop = threading.Event()
+        self._errors: List[tuple] = []
+        self._counts = {STAGE_READ: 0, STAGE_TRANSFORM: 0, STAGE_WRITE: 0}
+        self._wait_ms = {STAGE_READ: 0.0, STAGE_TRANSFORM: 0.0, STAGE_WRITE: 0.0}
+        self._queues: List[queue.Queue] = []
+        self._batches_written = 0
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def run(
+        self,
+        batch_source: Callable[[], Iterable[List[Any]]],
+        write_batch: Callable[[List[Any]], int],
+        transform_batch: Optional[Callable[[List[Any]], List[Any]]] = None,
+    ) -> PipelineResult:
+        """
+        Run the pipeline until the source is exhausted, canceled or fails.
+
+        Args:
+            batch_source: Factory returning the batch iterable (reader thread)
+            write_batch: Writes one batch, returns features written
+            transform_batch: Optional per-batch transform (transform thread)
+
+        Returns:
+            PipelineResult
+        """
+        start = time.time()
+        result = PipelineResult()
+
+        read_queue = queue.Queue(maxsize=self.plan.queue_depth)
+        self._queues = [read_queue]
+        threads = [threading.Thread(
+            target=self._read, args=(batch_source, read_queue),
+            name='FilterMate-export-read', daemon=True,
+        )]
+        write_queue = read_queue
+        if transform_batch is not None:
+            write_queue = queue.Queue(maxsize=self.plan.queue_depth)
+            self._queues.append(write_queue)
+            threads.append(threading.Thread(
+                target=self._transform, args=(transform_batch, read_queue, write_queue),
+                name='FilterMate-export-transform', daemon=True,
+            ))
+
+        for thread in threads:
+            thread.start()
+
+        try:
+            self._write(write_batch, write_queue, result, upstream=threads[-1])
+        except Exception as e:
+            self._fail(STAGE_WRITE, e)
+        finally:
+            self._stop.set()
+            self._drain()
+            for thread in threads:
+                # A reader blocked inside the provider only notices the stop
+                # flag at its next batch; don't hold the caller hostage.
+                thread.join(timeout=self.poll_interval * 4)
+                if thread.is_alive():
+                    logger.debug(f"{thread.name} still finishing its batch after stop")
+
+        if self._errors:
+            result.error_stage, result.error = self._errors[0]
+        result.features_read = self._counts[STAGE_READ]
+        result.features_transformed = self._counts[STAGE_TRANSFORM]
+        result.features_written = self._counts[STAGE_WRITE]
+        result.stage_wait_ms = dict(self._wait_ms)
+        result.elapsed_ms = (time.time() - start) * 1000
+        return result
+
+    def queued_batches(self) -> int:
+        """Batches currently waiting in the pipeline queues."""
+        return sum(q.qsize() for q in self._queues)
+
+    # -------------------------------------------------------------------------
+    # Stages
+    # -------------------------------------------------------------------------
+
+    def _read(self, batch_source, out_queue: queue.Queue) -> None:
+        try:
+            for batch in batch_source():
+                if self._stop.is_set():
+                    return
+                if not batch:
+                    continue
+                self._counts[STAGE_READ] += len(batch)
+                if not self._put(out_queue, batch, STAGE_READ):
+                    return
+            self._put(out_queue, _END, STAGE_READ)
+        except Exception as e:
+            self._fail(STAGE_READ, e)
+
+    def _transform(self, transform_batch, in_queue: queue.Queue, out_queue: queue.Queue) -> None:
+        try:
+            while True:
+                batch = self._get(in_queue, STAGE_TRANSFORM)
+                if batch is None:
+                    return
+                if batch is _END:
+                    self._put(out_queue, _END, STAGE_TRANSFORM)
+                    return
+                batch = transform_batch(batch)
+                self._counts[STAGE_TRANSFORM] += len(batch)
+                if not self._put(out_queue, batch, STAGE_TRANSFORM):
+                    return
+        except Exception as e:
+            self._fail(STAGE_TRANSFORM, e)
+
+    def _write(self, write_batch, in_queue: queue.Queue, result: PipelineResult, upstream) -> None:
+        while True:
+            if self.cancel_check and self.cancel_check():
+                result.canceled = True
+                logger.warning("⚠️ Export canceled")
+                return
+            if self._errors:
+                return
+
+            started = time.time()
+            try:
+                batch = in_queue.get(timeout=self.poll_interval)
+            except queue.Empty:
+                self._wait_ms[STAGE_WRITE] += (time.time() - started) * 1000
+                # Writer is starved: report what the upstream stages are doing
+                if not upstream.is_alive() and in_queue.empty() and not self._errors:
+                    # Upstream died without an end marker (should not happen)
+                    return
+                self._report(STAGE_TRANSFORM if len(self._queues) > 1 else STAGE_READ)
+                continue
+            self._wait_ms[STAGE_WRITE] += (time.time() - started) * 1000
+
+            if batch is _END:
+                return
+            self._counts[STAGE_WRITE] += write_batch(batch)
+            self._batches_written += 1
+            result.batches_written = self._batches_written
+            self._report(STAGE_WRITE)
+
+    # -------------------------------------------------------------------------
+    # Helpers
+    # -------------------------------------------------------------------------
+
+    def _put(self, out_queue: queue.Queue, item, stage: str) -> bool:
+        """Put with backpressure; False if the pipeline stopped meanwhile."""
+        started = time.time()
+        try:
+            while not self._stop.is_set():
+                try:
+                    out_queue.put(item, timeout=self.poll_interval)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            self._wait_ms[stage] += (time.time() - started) * 1000
+
+    def _get(self, in_queue: queue.Queue, stage: str):
+        """Get honouring the stop flag; None if the pipeline stopped."""
+        started = time.time()
+        try:
+            while not self._stop.is_set():
+                try:
+                    return in_queue.get(timeout=self.poll_interval)
+                except queue.Empty:
+                    continue
+            return None
+        finally:
+            self._wait_ms[stage] += (time.time() - started) * 1000
+
+    def _fail(self, stage: str, error: BaseException) -> None:
+        logger.error(f"Export pipeline {stage} stage failed: {error}")
+        self._errors.append((stage, error))
+        self._stop.set()
+
+    def _drain(self) -> None:
+        """Drop queued batches so blocked producers and memory are released."""
+        for q in self._queues:
+            while True:
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    break
+
+    def _report(self, stage: str) -> None:
+        if not self.progress_callback:
+            return
+        self.progress_callback(stage, {
+            'features_read': self._counts[STAGE_READ],
+            'features_transformed': self._counts[STAGE_TRANSFORM],
+            'features_written': self._counts[STAGE_WRITE],
+            'batches_written': self._batches_written,
+            'queued_batches': self.queued_batches(),
+            'stage_wait_ms': dict(self._wait_ms),
+        })
@@ -10,6 +10,8 @@ Performance Benefits:
 - Prevents memory exhaustion on very large datasets (> 1M features)
 - Enables progress feedback during long exports
 - Configurable batch sizes
+- Reading, reprojection and writing overlap in a bounded pipeline
+  (see export_pipeline) with memory held constant by the queue depth
 
 Usage:
     from ...infrastructure.streaming import StreamingExporter, StreamingConfig
@@ -25,11 +27,26 @@ Usage:
 """
 
 import os
+from contextlib import contextmanager
+from functools import partial
 from typing import Optional, Callable, Dict, Any, Iterator, List
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import time
 
 from ..logging import get_logger
+from .export_pipeline import (
+    ExportPipeline,
+    STAGE_WRITE,
+    plan_export_pipeline,
+)
+
+# GDAL is optional: only used to tune SQLite-based writers
+try:
+    from osgeo import gdal
+    GDAL_AVAILABLE = True
+except ImportError:
+    gdal = None
+    GDAL_AVAILABLE = False
 
 logger = get_logger(__name__)
 
@@ -53,13 +70,25 @@ class StreamingConfig:
     # Timeout per batch in seconds
     batch_timeout: int = 60
 
+    # Batches buffered between pipeline stages (upper bound, the memory
+    # limit may lower it - see plan_export_pipeline)
+    prefetch_batches: int = 4
+
+    # Geometry simplification tolerance in target CRS units (0 = disabled)
+    simplify_tolerance: float = 0.0
+
+    # Disable SQLite fsync while writing GPKG/SQLite outputs (a crashed
+    # export is discarded anyway)
+    relax_sqlite_sync: bool = True
+
     @classmethod
     def for_large_dataset(cls) -> 'StreamingConfig':
         """Config optimized for large datasets (> 100k features)."""
         return cls(
             batch_size=10000,
             memory_limit_mb=1000,
-            commit_interval=25000
+            commit_interval=25000,
+            prefetch_batches=8
         )
 
     @classmethod
@@ -68,7 +97,8 @@ class StreamingConfig:
         return cls(
             batch_size=1000,
             memory_limit_mb=256,
-            commit_interval=5000
+            commit_interval=5000,
+            prefetch_batches=2
         )
 
 
@@ -84,6 +114,15 @@ class ExportProgress:
     current_batch: int
     total_batches: int
 
+    # Pipeline stage the report is about ('read', 'transform' or 'write')
+    stage: str = STAGE_WRITE
+    features_read: int = 0
+    features_transformed: int = 0
+    queued_batches: int = 0
+    # Time each stage spent blocked on its queues: a reader waiting long
+    # means the writer is the bottleneck and vice versa
+    stage_wait_ms: Dict[str, float] = field(default_factory=dict)
+
     @property
     def percent_complete(self) -> float:
         """Get completion percentage."""
@@ -107,7 +146,7 @@ class FeatureBatchIterator:
     only loading one batch at a time.
     """
 
-    def __init__(self, layer, batch_size: int = 5000, request=None):
+    def __init__(self, layer, batch_size: int = 5000, request=None, source=None):
         """
         Initialize batch iterator.
 
@@ -115,8 +154,11 @@ class FeatureBatchIterator:
             layer: QgsVectorLayer to iterate
             batch_size: Number of features per batch
             request: Optional QgsFeatureRequest for filtering
+            source: Optional feature source to read from instead of the
+                layer (a QgsVectorLayerFeatureSource for off-thread reads)
         """
         self.layer = layer
+        self.source = source if source is not None else layer
         self.batch_size = batch_size
         self.request = request
         self.total_features = layer.featureCount()
@@ -127,7 +169,7 @@ class FeatureBatchIterator:
         from qgis.core import QgsFeatureRequest
 
         request = self.request or QgsFeatureRequest()
-        features = self.layer.getFeatures(request)
+        features = self.source.getFeatures(request)
 
         batch = []
         for feature in features:
@@ -192,18 +234,25 @@ class StreamingExporter:
         format: str = 'gpkg',
         field_mapping: Optional[Dict[str, str]] = None,
         progress_callback: Optional[Callable[[ExportProgress], None]] = None,
-        cancel_check: Optional[Callable[[], bool]] = None
+        cancel_check: Optional[Callable[[], bool]] = None,
+        target_crs=None
     ) -> Dict[str, Any]:
         """
-        Export layer features using streaming/batching.
+        Export layer features using a bounded read/transform/write pipeline.
+
+        Features are read on a worker thread from a QgsVectorLayerFeatureSource,
+        optionally reprojected/simplified on a second thread, and written on
+        the calling thread. Bounded queues between the stages keep memory
+        under config.memory_limit_mb whatever the feature count.
 
         Args:
             source_layer: QgsVectorLayer to export
             output_path: Path for output file
             format: Output format ('gpkg', 'shp', 'geojson', etc.)
             field_mapping: Optional field name mapping
-            progress_callback: Callback for progress updates
+            progress_callback: Callback for progress updates (calling thread)
             cancel_check: Callback to check for cancellation
+            target_crs: Optional QgsCoordinateReferenceSystem to reproject to
 
         Returns:
             Dict with export results:
@@ -212,6 +261,7 @@ class StreamingExporter:
             - elapsed_time_ms: Total export time
             - success: True if completed successfully
             - error: Error message if failed
+            - stage_wait_ms: Time each pipeline stage spent blocked
         """
         self._canceled = False
         start_time = time.time()
@@ -221,13 +271,14 @@ class StreamingExporter:
         bytes_written = 0
 
         logger.info(f"🚀 Starting streaming export: {total_features:,} features → {output_path}")
-        logger.info(f"  Format: {format}, Batch size: {self.config.batch_size}")
 
         try:
             # Import QGIS writer
             from qgis.core import (
+                QgsCoordinateTransform,
+                QgsProject,
                 QgsVectorFileWriter,
-                QgsCoordinateTransformContext,
+                QgsVectorLayerFeatureSource,
                 QgsFields
             )
 
@@ -245,117 +296,139 @@ class StreamingExporter:
             }
             driver_name = driver_map.get(format.lower(), format.upper())
 
-            # Create batch iterator
-            batch_iterator = FeatureBatchIterator(
-                source_layer,
-                self.config.batch_size
+            transform_context = QgsProject.instance().transformContext()
+            source_crs = source_layer.crs()
+            output_crs = source_crs
+            coordinate_transform = None
+            if target_crs is not None and target_crs.isValid() and target_crs != source_crs:
+                output_crs = target_crs
+                coordinate_transform = QgsCoordinateTransform(source_crs, target_crs, transform_context)
+            simplify_tolerance = self.config.simplify_tolerance
+
+            transform_batch = None
+            if coordinate_transform is not None or simplify_tolerance > 0:
+                transform_batch = self._make_transform_stage(coordinate_transform, simplify_tolerance)
+
+            plan = plan_export_pipeline(
+                self.config.batch_size,
+                self.config.prefetch_batches,
+                self.config.memory_limit_mb,
+                avg_geometry_vertices=self._sample_avg_vertices(source_layer),
+                with_transform=transform_batch is not None
+            )
+            logger.info(
+                f"  Format: {format}, Batch size: {plan.batch_size}, "
+                f"queue depth: {plan.queue_depth} (≈{plan.peak_bytes / 1024 / 1024:.0f} MB in flight)"
             )
 
+            # Fields, with optional renaming
+            fields = source_layer.fields()
+            if field_mapping:
+                mapped_fields = QgsFields()
+                for layer_field in fields:
+                    if layer_field.name() in field_mapping:
+                        layer_field.setName(field_mapping[layer_field.name()])
+                    mapped_fields.append(layer_field)
+                fields = mapped_fields
+
+            options = QgsVectorFileWriter.SaveVectorOptions()
+            options.driverName = driver_name
+            options.fileEncoding = 'UTF-8'
+
+            # Feature sources are the thread-safe way to read a layer off the
+            # thread that owns it; it must be created here, read on the reader
+            feature_source = QgsVectorLayerFeatureSource(source_layer)
+            batch_iterator = FeatureBatchIterator(
+                source_layer, plan.batch_size, source=feature_source
+            )
             total_batches = batch_iterator.estimated_batches
-            current_batch = 0
-
-            # Setup writer options
-            transform_context = QgsCoordinateTransformContext()
-
-            # Create writer with first batch to initialize file
-            writer = None
-
-            for batch in batch_iterator:
-                current_batch += 1
-
-                # Check for cancellation
-                if cancel_check and cancel_check():
-                    self._canceled = True
-                    logger.warning("⚠️ Export canceled")
-                    break
-
-                # Create writer on first batch
-                if writer is None:
-                    # Get fields from layer
-                    fields = source_layer.fields()
-
-                    # Apply field mapping if provided
-                    if field_mapping:
-                        # Create new QgsFields with mapped names
-                        mapped_fields = QgsFields()
-                        for field in fields:
-                            if field.name() in field_mapping:
-                                field.setName(field_mapping[field.name()])
-                            mapped_fields.append(field)
-                        fields = mapped_fields
-
-                    # Create save options
-                    options = QgsVectorFileWriter.SaveVectorOptions()
-                    options.driverName = driver_name
-                    options.fileEncoding = 'UTF-8'
-
-                    # Create writer
-                    writer = QgsVectorFileWriter.create(
-                        output_path,
-                        fields,
-                        source_layer.wkbType(),
-                        source_layer.crs(),
-                        transform_context,
-                        options
-                    )
-
-                    if writer.hasError() != QgsVectorFileWriter.NoError:
-                        error_msg = writer.errorMessage()
-                        logger.error(f"Failed to create writer: {error_msg}")
-                        return {
-                            'features_exported': 0,
-                            'bytes_written': 0,
-                            'elapsed_time_ms': 0,
-                            'success': False,
-                            'error': error_msg
-                        }
-
-                # Write batch features
-                for feature in batch:
-                    if writer.addFeature(feature):
-                        features_exported += 1
-                    else:
-                        logger.warning(f"Failed to write feature {feature.id()}")
-
-                # Progress callback
-                if progress_callback:
-                    elapsed_ms = (time.time() - start_time) * 1000
-
-                    if features_exported > 0:
-                        ms_per_feature = elapsed_ms / features_exported
-                        remaining = total_features - features_exported
-                        estimated_remaining = remaining * ms_per_feature
-                    else:
-                        estimated_remaining = 0
-
-                    progress = ExportProgress(
-                        features_processed=features_exported,
-                        total_features=total_features,
-                        bytes_written=bytes_written,
-                        elapsed_time_ms=elapsed_ms,
-                        estimated_remaining_ms=estimated_remaining,
-                        current_batch=current_batch,
-                        total_batches=total_batches
-                    )
-                    progress_callback(progress)
-
-                logger.debug(f"Batch {current_batch}/{total_batches}: {features_exported:,} features exported")
 
-            # Cleanup
-            if writer:
+            def report(stage: str, counters: Dict[str, Any]) -> None:
+                if not progress_callback:
+                    return
+                written = counters['features_written']
+                elapsed_ms = (time.time() - start_time) * 1000
+                estimated_remaining = 0
+                if written > 0:
+                    estimated_remaining = (total_features - written) * elapsed_ms / written
+                size = os.path.getsize(output_path) if os.path.exists(output_path) else 0
+                progress_callback(ExportProgress(
+                    features_processed=written,
+                    total_features=total_features,
+                    bytes_written=size,
+                    elapsed_time_ms=elapsed_ms,
+                    estimated_remaining_ms=estimated_remaining,
+                    current_batch=counters['batches_written'],
+                    total_batches=total_batches,
+                    stage=stage,
+                    features_read=counters['features_read'],
+                    features_transformed=counters['features_transformed'],
+                    queued_batches=counters['queued_batches'],
+                    stage_wait_ms=counters['stage_wait_ms']
+                ))
+
+            with self._sqlite_write_options(driver_name):
+                writer = QgsVectorFileWriter.create(
+                    output_path,
+                    fields,
+                    source_layer.wkbType(),
+                    output_crs,
+                    transform_context,
+                    options
+                )
+
+                if writer.hasError() != QgsVectorFileWriter.NoError:
+                    error_msg = writer.errorMessage()
+                    logger.error(f"Failed to create writer: {error_msg}")
+                    return {
+                        'features_exported': 0,
+                        'bytes_written': 0,
+                        'elapsed_time_ms': 0,
+                        'success': False,
+                        'error': error_msg
+                    }
+
+                def write_batch(target, batch: List) -> int:
+                    written = 0
+                    for feature in batch:
+                        if target.addFeature(feature):
+                            written += 1
+                        else:
+                            logger.warning(f"Failed to write feature {feature.id()}")
+                    return written
+
+                def is_canceled() -> bool:
+                    return self._canceled or bool(cancel_check and cancel_check())
+
+                pipeline = ExportPipeline(plan, cancel_check=is_canceled, progress_callback=report)
+                # The writer is bound explicitly: no closure keeps it alive
+                result = pipeline.run(lambda: iter(batch_iterator), partial(write_batch, writer), transform_batch)
+
+                # Deleting the writer flushes and closes the datasource
                 del writer
 
+            features_exported = result.features_written
+            self._canceled = self._canceled or result.canceled
+
             # Get final file size
             if os.path.exists(output_path):
                 bytes_written = os.path.getsize(output_path)
 
             elapsed_ms = (time.time() - start_time) * 1000
 
+            if result.error is not None:
+                raise result.error
+
             if self._canceled:
                 logger.warning(f"Export canceled: {features_exported:,} features exported before cancellation")
             else:
                 logger.info(f"✓ Export complete: {features_exported:,} features in {elapsed_ms:.0f}ms")
                 logger.info(f"  Output size: {bytes_written / 1024 / 1024:.2f} MB")
+                logger.debug(
+                    "  Stage wait (ms): " + ", ".join(
+                        f"{stage}={ms:.0f}" for stage, ms in result.stage_wait_ms.items()
+                    )
+                )
 
             return {
                 'features_exported': features_exported,
@@ -363,7 +436,8 @@ class StreamingExporter:
                 'elapsed_time_ms': elapsed_ms,
                 'success': not self._canceled,
                 'canceled': self._canceled,
-                'error': None
+                'error': None,
+                'stage_wait_ms': result.stage_wait_ms
             }
 
         except Exception as e:
@@ -378,6 +452,68 @@ class StreamingExporter:
                 'error': str(e)
             }
 
+    @staticmethod
+    def _make_transform_stage(coordinate_transform, simplify_tolerance: float) -> Callable[[List], List]:
+        """Build the per-batch reprojection/simplification callable.
+
+        The returned callable runs on the transform thread only, so the
+        QgsCoordinateTransform instance is never shared between threads.
+        """
+        def transform_batch(batch: List) -> List:
+            for feature in batch:
+                if not feature.hasGeometry():
+                    continue
+                geometry = feature.geometry()
+                if coordinate_transform is not None:
+                    geometry.transform(coordinate_transform)
+                if simplify_tolerance > 0:
+                    geometry = geometry.simplify(simplify_tolerance)
+                feature.setGeometry(geometry)
+            return batch
+        return transform_batch
+
+    @staticmethod
+    def _sample_avg_vertices(layer, sample_size: int = 50) -> int:
+        """Average vertex count of the first features (for memory planning)."""
+        try:
+            from qgis.core import QgsFeatureRequest
+
+            request = QgsFeatureRequest().setLimit(sample_size).setNoAttributes()
+            counts = [
+                feature.geometry().constGet().nCoordinates()
+                for feature in layer.getFeatures(request)
+                if feature.hasGeometry()
+            ]
+            if counts:
+                return max(1, sum(counts) // len(counts))
+        except Exception as e:
+            logger.debug(f"Vertex sampling failed, using default: {e}")
+        return 100
+
+    @contextmanager
+    def _sqlite_write_options(self, driver_name: str):
+        """Relax SQLite durability while a GPKG/SQLite output is written.
+
+        QgsVectorFileWriter.create() does not expose its OGR transaction to
+        Python, so per-commit fsync is turned off through GDAL config options
+        instead. The options are thread-local: the datasource is opened on
+        this thread and other connections in the process are unaffected.
+        """
+        if not (GDAL_AVAILABLE and self.config.relax_sqlite_sync and driver_name in ('GPKG', 'SQLite')):
+            yield
+            return
+
+        cache_mb = max(64, self.config.memory_limit_mb // 4) if self.config.memory_limit_mb else 128
+        overrides = {'OGR_SQLITE_SYNCHRONOUS': 'OFF', 'OGR_SQLITE_CACHE': str(cache_mb)}
+        previous = {key: gdal.GetThreadLocalConfigOption(key) for key in overrides}
+        for key, value in overrides.items():
+            gdal.SetThreadLocalConfigOption(key, value)
+        try:
+            yield
+        finally:
+            for key, value in previous.items():
+                gdal.SetThreadLocalConfigOption(key, value)
+
     def should_use_streaming(self, layer) -> bool:
         """
         Determine if streaming should be used for a layer.
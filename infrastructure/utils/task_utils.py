@@ -39,6 +39,7 @@ except ImportError:
 
 # FilterMate imports
 from ..logging import setup_logger
+from ..database.connection_pool import get_spatialite_pool_manager
 from ...config.config import ENV_VARS
 
 # Setup logger with rotation
@@ -88,6 +89,10 @@ def spatialite_connect(db_path: str, timeout: float = SQLITE_TIMEOUT):
     Enables WAL (Write-Ahead Logging) mode for better concurrent access.
     WAL mode allows multiple readers and one writer simultaneously.
 
+    v4.2.0: Connections come from the per-file Spatialite pool, so
+    mod_spatialite and the PRAGMAs are loaded once per connection rather
+    than on every call. close() returns the connection to the pool.
+
     Args:
         db_path: Path to the SQLite/Spatialite database file
         timeout: Timeout in seconds for database lock (default 60 seconds)
@@ -99,33 +104,7 @@ def spatialite_connect(db_path: str, timeout: float = SQLITE_TIMEOUT):
         sqlite3.OperationalError: If connection fails or Spatialite extension unavailable
     """
     try:
-        # Connect with timeout to handle concurrent access
-        conn = sqlite3.connect(db_path, timeout=timeout, isolation_level=None)
-
-        # Enable WAL mode for better concurrency
-        try:
-            conn.execute('PRAGMA journal_mode=WAL')
-            conn.execute('PRAGMA synchronous=NORMAL')
-            conn.execute('PRAGMA busy_timeout=60000')  # 60 second busy timeout
-        except sqlite3.OperationalError as e:
-            logger.warning(f"Could not configure PRAGMA settings for {db_path}: {e}")
-
-        conn.enable_load_extension(True)
-
-        # Try to load Spatialite extension (multiple paths for compatibility)
-        try:
-            conn.load_extension('mod_spatialite')
-        except (OSError, sqlite3.OperationalError):
-            try:
-                conn.load_extension('mod_spatialite.dll')  # Windows
-            except (OSError, sqlite3.OperationalError):
-                try:
-                    conn.load_extension('libspatialite')  # Linux/Mac
-                except (OSError, sqlite3.OperationalError) as e:
-                    logger.error(f"Could not load Spatialite extension: {e}")
-                    raise
-
-        return conn
+        return get_spatialite_pool_manager().get_connection(db_path, timeout=timeout)
 
     except Exception as e:
         logger.error(f"Failed to connect to Spatialite database {db_path}: {e}")
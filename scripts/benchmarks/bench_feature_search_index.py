@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: feature picker filter box, linear scan vs FeatureSearchIndex.
+
+Display values are synthetic street addresses. For each row count the
+index build time is reported, then the latency of every keystroke while
+typing a few filter texts, for the scan the picker used before
+(``needle in display.lower()`` over every row) and for the index.
+
+The index module has no Qt dependency and is loaded from its file, so no
+QGIS environment is needed.
+
+    python scripts/benchmarks/bench_feature_search_index.py
+    python scripts/benchmarks/bench_feature_search_index.py --counts 10000 100000
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import time
+
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_spec = importlib.util.spec_from_file_location(
+    "fm_feature_search_index", os.path.join(PLUGIN_DIR, "ui", "widgets", "feature_search_index.py")
+)
+feature_search_index = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(feature_search_index)
+
+STREETS = ["Rue", "Avenue", "Chemin", "Place", "Boulevard", "Impasse", "Allée", "Route"]
+NAMES = ["de la Gare", "du Moulin", "des Écoles", "Victor Hugo", "Jean Jaurès", "de Paris", "du Port", "Pasteur"]
+TYPED = ["victor", "rue du m", "12", "avenue jean jaurès 4"]
+
+
+def _displays(count):
+    rng = random.Random(42)
+    return [
+        f"{rng.randrange(1, 400)} {rng.choice(STREETS)} {rng.choice(NAMES)} {rng.randrange(10000, 99999)}"
+        for _ in range(count)
+    ]
+
+
+def _scan(displays, text):
+    needle = text.lower()
+    return [row for row, display in enumerate(displays) if needle in display.lower()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--counts', type=int, nargs='+', default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'build (s)':>10} {'typed':<22} {'matches':>8} {'scan max (ms)':>14} {'index max (ms)':>15} {'index mean (ms)':>16}")
+    for count in args.counts:
+        displays = _displays(count)
+        start = time.perf_counter()
+        index = feature_search_index.FeatureSearchIndex()
+        index.add(displays)
+        build = time.perf_counter() - start
+
+        for typed in TYPED:
+            scan_times, index_times = [], []
+            for length in range(1, len(typed) + 1):
+                text = typed[:length]
+                start = time.perf_counter()
+                expected = _scan(displays, text)
+                scan_times.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                rows = index.search(text)
+                index_times.append(time.perf_counter() - start)
+                assert rows == expected, text
+            print(
+                f"{count:>8} {build:>10.2f} {typed!r:<22} {len(rows):>8} {max(scan_times) * 1000:>14.1f} "
+                f"{max(index_times) * 1000:>15.1f} {sum(index_times) * 1000 / len(index_times):>16.2f}"
+            )
+
+        start = time.perf_counter()
+        index.prefix("1")
+        first_prefix = time.perf_counter() - start
+        start = time.perf_counter()
+        rows = index.prefix("12 rue")
+        print(f"{count:>8} prefix '12 rue': {len(rows)} rows, {(time.perf_counter() - start) * 1000:.2f} ms "
+              f"(first query, sorting included: {first_prefix * 1000:.0f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Python memory of a three-step plan, ids fetched between steps
+vs candidates kept in temp tables with a streamed result.
+
+Creates a point table of each requested size in a scratch schema, then
+runs the same three-step plan (bbox, attribute, spatial predicate) twice:
+
+- "fetch": every step's ids are fetched with fetchall() and the next
+  step receives them as an IN list (what the executor did before);
+- "stream": MultiStepFilterExecutor, which keeps intermediate ids in
+  temp tables and streams the final ids into an array('q').
+
+Peak traced Python memory and wall time are printed per size. Both runs
+must return the same ids.
+
+Requires a QGIS Python environment with psycopg2, and a PostGIS database
+the user can create tables in:
+
+    python scripts/benchmarks/bench_multi_step_streaming.py \\
+        --dsn "dbname=gis user=postgres" --counts 100000 1000000 5000000
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+PLUGIN_PARENT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, PLUGIN_PARENT)
+
+import psycopg2  # noqa: E402
+
+SCHEMA = "fm_bench"
+TABLE = "points"
+
+# Step expressions: ~90% of rows in the bbox, then ~50%, then ~50%
+BBOX = '"geom" && ST_MakeEnvelope(0, 0, 900, 1000, 3857)'
+ATTRIBUTE = '"category" < 5'
+SPATIAL = 'ST_Intersects("geom", ST_MakeEnvelope(0, 0, 450, 1000, 3857))'
+
+
+def _create_table(conn, count):
+    with conn.cursor() as cur:
+        cur.execute(f'CREATE SCHEMA IF NOT EXISTS "{SCHEMA}"')
+        cur.execute(f'DROP TABLE IF EXISTS "{SCHEMA}"."{TABLE}"')
+        cur.execute(f'''
+            CREATE TABLE "{SCHEMA}"."{TABLE}" AS
+            SELECT i AS gid, i %% 10 AS category,
+                   ST_SetSRID(ST_MakePoint(random() * 1000, random() * 1000), 3857) AS geom
+            FROM generate_series(1, %s) AS i
+        ''', (count,))
+        cur.execute(f'ALTER TABLE "{SCHEMA}"."{TABLE}" ADD PRIMARY KEY (gid)')
+        cur.execute(f'CREATE INDEX ON "{SCHEMA}"."{TABLE}" USING GIST (geom)')
+        cur.execute(f'ANALYZE "{SCHEMA}"."{TABLE}"')
+    conn.commit()
+
+
+def _run_fetch(conn):
+    ids = None
+    with conn.cursor() as cur:
+        for expression in (BBOX, ATTRIBUTE, SPATIAL):
+            query = f'SELECT gid FROM "{SCHEMA}"."{TABLE}" WHERE ({expression})'
+            if ids is not None:
+                query += f" AND gid IN ({','.join(str(i) for i in ids)})"
+            cur.execute(query)
+            ids = [row[0] for row in cur.fetchall()]
+    conn.rollback()
+    return ids
+
+
+def _run_stream(conn, module):
+    executor = module.MultiStepFilterExecutor(conn, SCHEMA, TABLE, "gid", "geom", 3857)
+    steps = [
+        module.FilterStep(module.FilterStepType.BBOX_PREFILTER, BBOX, 1, 0.9),
+        module.FilterStep(module.FilterStepType.ATTRIBUTE_FILTER, ATTRIBUTE, 2, 0.5, True),
+        module.FilterStep(module.FilterStepType.SPATIAL_PREDICATE, SPATIAL, 3, 0.5, True),
+    ]
+    result = executor.execute_plan(steps)
+    conn.rollback()
+    if not result.success:
+        raise SystemExit(result.error)
+    return result.feature_ids
+
+
+def _measure(function, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    ids = function(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return ids, elapsed, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dsn', required=True, help="psycopg2 connection string")
+    parser.add_argument('--counts', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--keep', action='store_true', help="Keep the scratch schema")
+    args = parser.parse_args()
+
+    from filter_mate.core.strategies import multi_step_filter
+
+    conn = psycopg2.connect(args.dsn)
+    print(f"{'rows':>9} {'result':>9} {'fetch (s)':>10} {'fetch peak (MB)':>16} {'stream (s)':>11} {'stream peak (MB)':>17}")
+    try:
+        for count in args.counts:
+            _create_table(conn, count)
+            fetched, fetch_time, fetch_peak = _measure(_run_fetch, conn)
+            streamed, stream_time, stream_peak = _measure(_run_stream, conn, multi_step_filter)
+            assert sorted(fetched) == sorted(streamed)
+            print(f"{count:>9} {len(streamed):>9} {fetch_time:>10.2f} {fetch_peak:>16.1f} "
+                  f"{stream_time:>11.2f} {stream_peak:>17.1f}")
+    finally:
+        if not args.keep:
+            with conn.cursor() as cur:
+                cur.execute(f'DROP SCHEMA IF EXISTS "{SCHEMA}" CASCADE')
+            conn.commit()
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: OGR primary key subset strings (flat IN list vs ranges vs ID table).
+
+Without --layer, only subset string sizes are reported. With --layer, each
+predicate is also applied with setSubsetString() and the time to apply it
+and to iterate the filtered features is measured. Both modes need a QGIS
+Python environment because the plugin package imports qgis.
+
+    python scripts/benchmarks/bench_ogr_pk_predicates.py --counts 10000 200000
+    python scripts/benchmarks/bench_ogr_pk_predicates.py \\
+        --layer "/data/parcels.gpkg|layername=parcels" --counts 200000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+PLUGIN_PARENT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, PLUGIN_PARENT)
+
+
+def _id_sets(count, max_fid):
+    """Typical selection shapes: one block, blocks with holes, random sparse."""
+    rng = random.Random(42)
+    block = list(range(1, count + 1))
+    holes = [i for i in range(1, int(count * 1.1) + 1) if rng.random() > 0.1][:count]
+    sparse = sorted(rng.sample(range(1, max(max_fid, count * 5) + 1), count))
+    return {'contiguous': block, 'with_holes': holes, 'sparse': sparse}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--counts', type=int, nargs='+', default=[1000, 10000, 200000])
+    parser.add_argument('--layer', help="OGR layer URI for provider timings (needs QGIS)")
+    parser.add_argument('--pk', default='fid', help="Primary key field (default: fid)")
+    args = parser.parse_args()
+
+    layer = app = None
+    if args.layer:
+        from qgis.core import QgsApplication, QgsVectorLayer, QgsFeatureRequest
+        app = QgsApplication([], False)
+        app.initQgis()
+        layer = QgsVectorLayer(args.layer, 'bench', 'ogr')
+        if not layer.isValid():
+            raise SystemExit(f"Cannot open layer: {args.layer}")
+
+    from filter_mate.adapters.backends.ogr.filter_executor import build_ogr_pk_predicate, get_ogr_gpkg_path
+
+    db_path = get_ogr_gpkg_path(layer) if layer else None
+    max_fid = layer.featureCount() if layer else 0
+    print(f"{'ids':>8} {'shape':<11} {'mode':<9} {'subset bytes':>13} {'apply (s)':>10} {'fetch (s)':>10} {'rows':>8}")
+
+    for count in args.counts:
+        for shape, ids in _id_sets(count, max_fid).items():
+            modes = {
+                'flat': build_ogr_pk_predicate(args.pk, ids, min_run=len(ids) + 1, table_threshold=0),
+                'ranges': build_ogr_pk_predicate(args.pk, ids, table_threshold=0),
+            }
+            if db_path:
+                modes['id_table'] = build_ogr_pk_predicate(args.pk, ids, db_path=db_path, table_threshold=1)
+
+            for mode, predicate in modes.items():
+                apply_t = fetch_t = rows = ''
+                if layer:
+                    start = time.perf_counter()
+                    layer.setSubsetString(predicate)
+                    apply_t = f"{time.perf_counter() - start:.3f}"
+                    start = time.perf_counter()
+                    request = QgsFeatureRequest().setNoAttributes().setFlags(QgsFeatureRequest.NoGeometry)
+                    rows = sum(1 for _ in layer.getFeatures(request))
+                    fetch_t = f"{time.perf_counter() - start:.3f}"
+                    layer.setSubsetString('')
+                print(f"{count:>8} {shape:<11} {mode:<9} {len(predicate.encode()):>13} {apply_t:>10} {fetch_t:>10} {rows:>8}")
+
+    if app:
+        app.exitQgis()
+
+
+if __name__ == '__main__':
+    main()
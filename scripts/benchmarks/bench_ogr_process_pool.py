@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: OGR process pool vs sequential in-process native selection.
+
+Computes the spatial selection of several file layers against one source
+layer, first sequentially with NativeSpatialSelectionEngine (what the
+filter task does without the pool), then with OgrProcessPool, checks that
+both return the same FIDs and prints wall times.
+
+Requires a QGIS Python environment (e.g. OSGeo4W shell or python-qgis):
+
+    python scripts/benchmarks/bench_ogr_process_pool.py \\
+        --targets /data/parcels.gpkg|layername=parcels /data/buildings.shp \\
+        --source /data/zones.shp --predicates 0 --workers 4 --runs 3
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+PLUGIN_PARENT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, PLUGIN_PARENT)
+
+from qgis.core import QgsApplication, QgsVectorLayer  # noqa: E402
+
+
+def _load(uri, name):
+    layer = QgsVectorLayer(uri, name, 'ogr')
+    if not layer.isValid():
+        raise SystemExit(f"Cannot open layer: {uri}")
+    return layer
+
+
+def _time_sequential(targets, source, codes, engine_class):
+    start = time.perf_counter()
+    engine = engine_class(source)
+    fids = {target.id(): set(engine.select_fids(target, codes)) for target in targets}
+    return time.perf_counter() - start, fids
+
+
+def _time_pool(targets, source, codes, workers):
+    from filter_mate.adapters.backends.ogr.filter_executor import build_ogr_fid_job
+    from filter_mate.infrastructure.parallel.ogr_process_pool import OgrProcessPool
+
+    start = time.perf_counter()
+    jobs = [build_ogr_fid_job(target, source, {code: True for code in codes}) for target in targets]
+    jobs = [job for job in jobs if job is not None]
+    results = OgrProcessPool(workers).evaluate(jobs)
+    fids = {layer_id: set(result.fid_set()) for layer_id, result in results.items() if result.success}
+    return time.perf_counter() - start, fids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--targets', required=True, nargs='+', help="Target layer URIs (GeoPackage/Shapefile)")
+    parser.add_argument('--source', required=True, help="Comparison layer URI")
+    parser.add_argument('--predicates', type=int, nargs='+', default=[0],
+                        help="selectbylocation predicate codes (default: intersects)")
+    parser.add_argument('--workers', type=int, default=0, help="Worker processes (0 = auto)")
+    parser.add_argument('--runs', type=int, default=3, help="Runs per implementation")
+    args = parser.parse_args()
+
+    app = QgsApplication([], False)
+    app.initQgis()
+
+    from filter_mate.adapters.backends.ogr import filter_executor
+    from filter_mate.adapters.backends.ogr.spatial_selection import NativeSpatialSelectionEngine
+    filter_executor.OGR_PROCESS_POOL_MIN_FEATURES = 0  # Benchmark every target
+
+    targets = [_load(uri, f"target_{i}") for i, uri in enumerate(args.targets)]
+    source = _load(args.source, 'source')
+    print(f"{len(targets)} target(s): {sum(t.featureCount() for t in targets)} features, "
+          f"source: {source.featureCount()} features")
+
+    seq_times, pool_times = [], []
+    seq_fids = pool_fids = {}
+    for _ in range(args.runs):
+        elapsed, seq_fids = _time_sequential(targets, source, args.predicates, NativeSpatialSelectionEngine)
+        seq_times.append(elapsed)
+        elapsed, pool_fids = _time_pool(targets, source, args.predicates, args.workers)
+        pool_times.append(elapsed)
+
+    seq_t = statistics.median(seq_times)
+    pool_t = statistics.median(pool_times)
+    print(f"{'sequential (s)':>16}{'process pool (s)':>18}{'speedup':>10}{'match':>8}")
+    print(f"{seq_t:>16.3f}{pool_t:>18.3f}"
+          f"{seq_t / pool_t if pool_t else float('inf'):>9.1f}x"
+          f"{'yes' if seq_fids == pool_fids else 'NO':>8}")
+
+    app.exitQgis()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: native OGR spatial selection vs processing "qgis:selectbylocation".
+
+Runs both implementations on the same file layers, checks that they select
+the same FIDs for every predicate code and prints wall times.
+
+Requires a QGIS Python environment (e.g. OSGeo4W shell or python-qgis):
+
+    python scripts/benchmarks/bench_ogr_spatial_selection.py \\
+        --target /data/parcels_1m.gpkg|layername=parcels \\
+        --source /data/zones.shp \\
+        --predicates 0 6 --runs 3
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+PLUGIN_PARENT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.insert(0, PLUGIN_PARENT)
+
+from qgis.core import QgsApplication, QgsVectorLayer  # noqa: E402
+
+PREDICATE_NAMES = ['intersects', 'contains', 'disjoint', 'equals', 'touches', 'overlaps', 'within', 'crosses']
+
+
+def _load(uri, name):
+    layer = QgsVectorLayer(uri, name, 'ogr')
+    if not layer.isValid():
+        raise SystemExit(f"Cannot open layer: {uri}")
+    return layer
+
+
+def _time_processing(target, source, codes):
+    import processing
+    start = time.perf_counter()
+    processing.run("qgis:selectbylocation", {
+        'INPUT': target, 'INTERSECT': source, 'METHOD': 0, 'PREDICATE': codes
+    })
+    elapsed = time.perf_counter() - start
+    return elapsed, set(target.selectedFeatureIds())
+
+
+def _time_native(target, source, codes, select_by_location_native):
+    start = time.perf_counter()
+    fids = select_by_location_native(target, source, codes)
+    return time.perf_counter() - start, fids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', required=True, help="Target layer URI (GeoPackage/Shapefile)")
+    parser.add_argument('--source', required=True, help="Comparison layer URI")
+    parser.add_argument('--predicates', type=int, nargs='+', default=list(range(8)),
+                        help="selectbylocation predicate codes to benchmark (default: all)")
+    parser.add_argument('--runs', type=int, default=3, help="Runs per implementation")
+    args = parser.parse_args()
+
+    app = QgsApplication([], False)
+    app.initQgis()
+    from processing.core.Processing import Processing
+    Processing.initialize()
+
+    from filter_mate.adapters.backends.ogr.spatial_selection import select_by_location_native
+
+    target = _load(args.target, 'target')
+    source = _load(args.source, 'source')
+    print(f"target: {target.featureCount()} features, source: {source.featureCount()} features")
+    print(f"{'predicate':<12}{'processing (s)':>16}{'native (s)':>12}{'speedup':>10}{'match':>8}")
+
+    for code in args.predicates:
+        proc_times, native_times = [], []
+        proc_fids = native_fids = set()
+        for _ in range(args.runs):
+            elapsed, proc_fids = _time_processing(target, source, [code])
+            proc_times.append(elapsed)
+            target.removeSelection()
+            elapsed, native_fids = _time_native(target, source, [code], select_by_location_native)
+            native_times.append(elapsed)
+            target.removeSelection()
+        proc_t = statistics.median(proc_times)
+        native_t = statistics.median(native_times)
+        print(f"{PREDICATE_NAMES[code]:<12}{proc_t:>16.3f}{native_t:>12.3f}"
+              f"{proc_t / native_t if native_t else float('inf'):>9.1f}x"
+              f"{'yes' if proc_fids == native_fids else 'NO':>8}")
+
+    app.exitQgis()
+
+
+if __name__ == '__main__':
+    main()
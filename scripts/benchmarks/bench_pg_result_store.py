@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark: PostgreSQL filter result stores (materialized view vs PK-only table).
+
+For each table size, a synthetic point table is created (or reused with
+--keep) and a spatial filter selecting --selectivity of its rows is stored
+with each strategy:
+
+    materialized_view  full rows + GiST index + CLUSTER mark + ANALYZE,
+                       as built by the session MV path
+    pk_table           UNLOGGED table of primary keys + btree + ANALYZE
+                       (mv_cache.pk_table_commands)
+
+Reported: creation time, disk use (pg_total_relation_size) and provider
+fetch time, i.e. reading gid + geometry of the filtered layer through
+"gid" IN (SELECT "gid" FROM <store>) with a server-side cursor, as the
+QGIS provider does. Only psycopg2 is needed.
+
+    python scripts/benchmarks/bench_pg_result_store.py \\
+        --dsn "dbname=gis user=postgres" --rows 1000000 10000000 50000000
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+import types
+
+import psycopg2
+
+POSTGRESQL_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'adapters', 'backends', 'postgresql'
+)
+
+
+def _load_mv_cache():
+    """Load mv_cache without the plugin package (which needs qgis)."""
+    package = types.ModuleType('fm_bench_postgresql')
+    package.__path__ = [POSTGRESQL_DIR]
+    sys.modules[package.__name__] = package
+    for name in ('mv_reference_tracker', 'mv_cache'):
+        spec = importlib.util.spec_from_file_location(
+            f'{package.__name__}.{name}', os.path.join(POSTGRESQL_DIR, f'{name}.py')
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+def _ensure_table(cursor, table, rows):
+    cursor.execute("SELECT to_regclass(%s)", (f'public.{table}',))
+    if cursor.fetchone()[0]:
+        return
+    print(f"Creating public.{table} ({rows:,} rows)...")
+    cursor.execute(
+        f'CREATE TABLE public."{table}" AS '
+        'SELECT g AS gid, (g %% 10) AS kind, '
+        'ST_SetSRID(ST_MakePoint(random() * 1000, random() * 1000), 3857) AS geom '
+        'FROM generate_series(1, %s) AS g',
+        (rows,)
+    )
+    cursor.execute(f'ALTER TABLE public."{table}" ADD PRIMARY KEY (gid)')
+    cursor.execute(f'CREATE INDEX ON public."{table}" USING GIST (geom)')
+    cursor.execute(f'ANALYZE public."{table}"')
+
+
+def _materialized_view_commands(schema, name, query):
+    qualified = f'"{schema}"."{name}"'
+    return [
+        f'CREATE MATERIALIZED VIEW {qualified} AS {query} WITH DATA',
+        f'CREATE INDEX "{name}_cluster" ON {qualified} USING GIST (geom)',
+        f'ALTER MATERIALIZED VIEW {qualified} CLUSTER ON "{name}_cluster"',
+        f'ANALYZE VERBOSE {qualified}',
+    ]
+
+
+def _fetch(connection, table, store):
+    start = time.perf_counter()
+    with connection.cursor(name='fm_bench_fetch') as cursor:
+        cursor.itersize = 2000
+        cursor.execute(
+            f'SELECT gid, ST_AsBinary(geom) FROM public."{table}" '  # nosec B608
+            f'WHERE "gid" IN (SELECT "gid" FROM {store})'
+        )
+        rows = sum(1 for _ in cursor)
+    connection.rollback()
+    return time.perf_counter() - start, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dsn', required=True, help="psycopg2 connection string")
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000000, 10000000])
+    parser.add_argument('--selectivity', type=float, default=0.2, help="Fraction of rows selected (default: 0.2)")
+    parser.add_argument('--schema', default='filter_mate_temp')
+    parser.add_argument('--keep', action='store_true', help="Keep the synthetic tables for later runs")
+    args = parser.parse_args()
+
+    mv_cache = _load_mv_cache()
+    connection = psycopg2.connect(args.dsn)
+    connection.autocommit = True
+    # Server-side cursors need a transaction, like the provider's
+    fetch_connection = psycopg2.connect(args.dsn)
+    print(f"{'rows':>10} {'store':<18} {'create (s)':>11} {'disk (MB)':>10} {'fetch (s)':>10} {'selected':>10}")
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'CREATE SCHEMA IF NOT EXISTS "{args.schema}"')
+        for rows in args.rows:
+            table = f'fm_bench_points_{rows}'
+            _ensure_table(cursor, table, rows)
+            query = (
+                f'SELECT * FROM "public"."{table}" '  # nosec B608
+                f'WHERE ST_Intersects(geom, ST_MakeEnvelope(0, 0, {1000 * args.selectivity}, 1000, 3857))'
+            )
+            strategies = {
+                'materialized_view': (
+                    'fm_bench_mv', 'MATERIALIZED VIEW',
+                    _materialized_view_commands(args.schema, 'fm_bench_mv', query)
+                ),
+                'pk_table': (
+                    'fm_bench_pk', 'TABLE',
+                    mv_cache.pk_table_commands(args.schema, 'fm_bench_pk', query, 'gid')
+                ),
+            }
+            for label, (name, kind, commands) in strategies.items():
+                store = f'"{args.schema}"."{name}"'
+                cursor.execute(f'DROP {kind} IF EXISTS {store} CASCADE')
+                start = time.perf_counter()
+                for sql in commands:
+                    cursor.execute(sql)
+                create_t = time.perf_counter() - start
+                cursor.execute('SELECT pg_total_relation_size(%s::regclass)', (store,))
+                disk_mb = cursor.fetchone()[0] / (1024 * 1024)
+                fetch_t, selected = _fetch(fetch_connection, table, store)
+                print(f"{rows:>10} {label:<18} {create_t:>11.2f} {disk_mb:>10.1f} {fetch_t:>10.2f} {selected:>10}")
+                cursor.execute(f'DROP {kind} IF EXISTS {store} CASCADE')
+            if not args.keep:
+                cursor.execute(f'DROP TABLE IF EXISTS public."{table}"')
+
+    fetch_connection.close()
+    connection.close()
+
+
+if __name__ == '__main__':
+    main()
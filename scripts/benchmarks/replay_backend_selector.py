@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Replay: score the adaptive backend cost model against logged executions.
+
+Reads the samples persisted by AutoBackendSelector (backend_cost_model.json
+in the FilterMate config directory), replays them in time order and prints
+prediction error, 95% interval coverage and, for cases executed with several
+backend/strategy pairs, how often the model picked the fastest one.
+
+Pure Python, no QGIS environment needed:
+
+    python scripts/benchmarks/replay_backend_selector.py \\
+        ~/.local/share/QGIS/QGIS3/profiles/default/FilterMate/backend_cost_model.json \\
+        --half-life 14 --decisions 20
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+
+COST_MODEL_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'core', 'optimization', 'cost_model.py'
+)
+
+
+def _load_cost_model():
+    # Loaded from its file: the core.optimization package needs the QGIS plugin context
+    spec = importlib.util.spec_from_file_location('filtermate_cost_model', COST_MODEL_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('log', help="Persisted cost model JSON (execution log)")
+    parser.add_argument('--half-life', type=float, default=None, help="Sample half-life in days to replay with")
+    parser.add_argument('--decisions', type=int, default=10, help="Worst decisions to list")
+    args = parser.parse_args()
+
+    cost_model = _load_cost_model()
+    samples = cost_model.AdaptiveCostModel(path=args.log).load().samples()
+    if not samples:
+        raise SystemExit(f"No samples in {args.log}")
+
+    def factory(clock):
+        kwargs = {'clock': clock}
+        if args.half_life is not None:
+            kwargs['half_life_days'] = args.half_life
+        return cost_model.AdaptiveCostModel(**kwargs)
+
+    report = cost_model.replay_samples(samples, factory)
+    print(json.dumps(report.to_dict(), indent=2))
+
+    worst = sorted(report.decisions_log, key=lambda d: d['regret_ms'], reverse=True)[:args.decisions]
+    if worst:
+        print(f"\n{'predicate':<12}{'features':>10}  {'chosen':<26}{'best':<26}{'regret (ms)':>12}")
+        for d in worst:
+            print(f"{d['predicate']:<12}{d['feature_count']:>10}  {'/'.join(d['chosen']):<26}"
+                  f"{'/'.join(d['best']):<26}{d['regret_ms']:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
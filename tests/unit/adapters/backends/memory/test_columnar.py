@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the Memory backend columnar evaluator.
+
+Expression ASTs are built from small fake nodes exposing the same methods
+as QgsExpressionNode subclasses; enum values are injected through the
+``enums`` argument so no QGIS installation is needed.
+
+Module tested: adapters.backends.memory.columnar
+"""
+import importlib.util
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+_module_path = os.path.normpath(os.path.join(
+    os.path.dirname(__file__),
+    "..", "..", "..", "..", "..",
+    "adapters", "backends", "memory", "columnar.py"
+))
+_spec = importlib.util.spec_from_file_location("filter_mate_test.memory_columnar", _module_path)
+columnar = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = columnar
+_spec.loader.exec_module(columnar)
+
+ColumnarEvaluator = columnar.ColumnarEvaluator
+UnsupportedExpressionError = columnar.UnsupportedExpressionError
+
+ENUMS = (
+    {'bin': 'binary', 'un': 'unary', 'in': 'in', 'lit': 'literal', 'col': 'column', 'btw': 'between'},
+    {op: op for op in ('AND', 'OR', '=', '<>', '<', '<=', '>', '>=', 'IS', 'IS NOT',
+                       'LIKE', 'NOT LIKE', 'ILIKE', 'NOT ILIKE', '+')},
+    {'NOT': 'NOT', '-': '-'},
+)
+
+
+# ---------------------------------------------------------------------------
+# Fake AST nodes
+# ---------------------------------------------------------------------------
+
+class Col:
+    def __init__(self, name):
+        self._name = name
+
+    def nodeType(self):
+        return 'col'
+
+    def name(self):
+        return self._name
+
+
+class Lit:
+    def __init__(self, value):
+        self._value = value
+
+    def nodeType(self):
+        return 'lit'
+
+    def value(self):
+        return self._value
+
+
+class Bin:
+    def __init__(self, op, left, right):
+        self._op, self._left, self._right = op, left, right
+
+    def nodeType(self):
+        return 'bin'
+
+    def op(self):
+        return self._op
+
+    def opLeft(self):
+        return self._left
+
+    def opRight(self):
+        return self._right
+
+
+class Un:
+    def __init__(self, op, operand):
+        self._op, self._operand = op, operand
+
+    def nodeType(self):
+        return 'un'
+
+    def op(self):
+        return self._op
+
+    def operand(self):
+        return self._operand
+
+
+class _NodeList:
+    def __init__(self, items):
+        self._items = items
+
+    def list(self):
+        return self._items
+
+
+class In:
+    def __init__(self, node, items, negate=False):
+        self._node, self._items, self._negate = node, items, negate
+
+    def nodeType(self):
+        return 'in'
+
+    def node(self):
+        return self._node
+
+    def list(self):
+        return _NodeList(self._items)
+
+    def isNotIn(self):
+        return self._negate
+
+
+class Between:
+    def __init__(self, node, low, high, negate=False):
+        self._node, self._low, self._high, self._negate = node, low, high, negate
+
+    def nodeType(self):
+        return 'btw'
+
+    def node(self):
+        return self._node
+
+    def lowerBound(self):
+        return self._low
+
+    def higherBound(self):
+        return self._high
+
+    def isNotBetween(self):
+        return self._negate
+
+
+# Rows: fid = index
+POP = [100, None, 5000, 250, 80]
+NAME = ["Paris", "Lyon", None, "paris-sud", "Nice"]
+AREA = [1.5, 2.0, 3.25, None, 0.5]
+
+
+def _columns():
+    return {
+        'pop': columnar._to_column(POP),
+        'name': columnar._to_column(NAME),
+        'area': columnar._to_column(AREA),
+    }
+
+
+def _match(root):
+    mask = ColumnarEvaluator(root, enums=ENUMS).evaluate(_columns(), len(POP))
+    return set(np.flatnonzero(mask).tolist())
+
+
+class TestComparisons:
+
+    def test_equality_and_order(self):
+        assert _match(Bin('=', Col('pop'), Lit(250))) == {3}
+        assert _match(Bin('>', Col('pop'), Lit(90))) == {0, 2, 3}
+        assert _match(Bin('<=', Lit(100), Col('pop'))) == {0, 2, 3}
+
+    def test_not_equal_excludes_nulls(self):
+        assert _match(Bin('<>', Col('pop'), Lit(100))) == {2, 3, 4}
+
+    def test_string_comparison(self):
+        assert _match(Bin('=', Col('name'), Lit("Lyon"))) == {1}
+
+    def test_negative_literal(self):
+        assert _match(Bin('>', Col('area'), Un('-', Lit(1)))) == {0, 1, 2, 4}
+
+    def test_comparison_with_null_literal_matches_nothing(self):
+        assert _match(Bin('=', Col('pop'), Lit(None))) == set()
+
+
+class TestLogic:
+
+    def test_and_or(self):
+        expr = Bin('OR', Bin('=', Col('name'), Lit("Nice")),
+                   Bin('AND', Bin('>', Col('pop'), Lit(90)), Bin('<', Col('area'), Lit(2))))
+        assert _match(expr) == {0, 4}
+
+    def test_not_follows_three_valued_logic(self):
+        # NOT (pop > 90): NULL pop stays NULL -> not selected
+        assert _match(Un('NOT', Bin('>', Col('pop'), Lit(90)))) == {4}
+
+    def test_null_or_true_is_true(self):
+        expr = Bin('OR', Bin('>', Col('pop'), Lit(0)), Bin('=', Col('name'), Lit("Lyon")))
+        assert 1 in _match(expr)
+
+    def test_is_null(self):
+        assert _match(Bin('IS', Col('pop'), Lit(None))) == {1}
+        assert _match(Bin('IS NOT', Col('area'), Lit(None))) == {0, 1, 2, 4}
+
+
+class TestSetOperators:
+
+    def test_in_and_not_in(self):
+        assert _match(In(Col('name'), [Lit("Paris"), Lit("Nice")])) == {0, 4}
+        assert _match(In(Col('name'), [Lit("Paris"), Lit("Nice")], negate=True)) == {1, 3}
+
+    def test_in_integer_column_with_fractional_literals(self):
+        assert _match(In(Col('pop'), [Lit(100.5), Lit(250)])) == {3}
+        assert _match(In(Col('pop'), [Lit(100.0)])) == {0}
+        assert _match(In(Col('pop'), [Lit(100.5)], negate=True)) == {0, 2, 3, 4}
+        assert _match(In(Col('area'), [Lit(1.5), Lit(2)])) == {0, 1}
+
+    def test_between(self):
+        assert _match(Between(Col('pop'), Lit(90), Lit(300))) == {0, 3}
+        assert _match(Between(Col('pop'), Lit(90), Lit(300), negate=True)) == {2, 4}
+
+    def test_like_and_ilike(self):
+        assert _match(Bin('LIKE', Col('name'), Lit("Par%"))) == {0}
+        assert _match(Bin('ILIKE', Col('name'), Lit("par%"))) == {0, 3}
+        assert _match(Bin('NOT LIKE', Col('name'), Lit("%i%"))) == {1}
+        assert _match(Bin('LIKE', Col('name'), Lit("N_ce"))) == {4}
+
+
+class TestUnsupported:
+
+    @pytest.mark.parametrize("expr", [
+        Bin('+', Col('pop'), Lit(1)),
+        Bin('=', Col('pop'), Lit("100")),
+        Bin('=', Col('name'), Col('pop')),
+        In(Col('pop'), [Lit(1), Lit(None)]),
+        Bin('LIKE', Col('pop'), Lit("1%")),
+        Bin('=', Col('missing'), Lit(1)),
+    ])
+    def test_raises(self, expr):
+        with pytest.raises(UnsupportedExpressionError):
+            _match(expr)
+
+    def test_mixed_type_column(self):
+        with pytest.raises(UnsupportedExpressionError):
+            columnar._to_column([1, "a"])
@@ -6,6 +6,8 @@ Tests the pure functions in ogr/filter_executor.py:
 - format_ogr_pk_values(): PK value formatting for SQL
 - normalize_column_names_for_ogr(): Case normalization
 - build_ogr_simple_filter(): IN clause construction
+- compress_pk_ranges() / build_ogr_pk_predicate(): Range-compressed PK predicates
+- set_ogr_subset_string() / release_ogr_fid_tables(): ID table lifecycle
 - combine_ogr_filters(): Filter combination with AND/OR/NOT
 - register_temp_layer() / cleanup_ogr_temp_layers(): Registry
 - build_ogr_filter_from_selection(): Selection-based filter
@@ -75,6 +77,8 @@ _spec.loader.exec_module(_mod)
 format_ogr_pk_values = _mod.format_ogr_pk_values
 normalize_column_names_for_ogr = _mod.normalize_column_names_for_ogr
 build_ogr_simple_filter = _mod.build_ogr_simple_filter
+compress_pk_ranges = _mod.compress_pk_ranges
+build_ogr_pk_predicate = _mod.build_ogr_pk_predicate
 combine_ogr_filters = _mod.combine_ogr_filters
 register_temp_layer = _mod.register_temp_layer
 apply_ogr_subset = _mod.apply_ogr_subset
@@ -182,6 +186,140 @@ class TestBuildOgrSimpleFilter:
         assert result == '"fid" IN (42)'
 
 
+# ===========================================================================
+# Tests -- compress_pk_ranges / build_ogr_pk_predicate
+# ===========================================================================
+
+class TestCompressPkRanges:
+    def test_runs_and_singles(self):
+        ranges, singles = compress_pk_ranges([9, 1, 2, 3, 4, 5, 20, 7, 100, 101, 102, 103, 104, 105], min_run=5)
+        assert ranges == [(1, 5), (100, 105)]
+        assert singles == [7, 9, 20]
+
+    def test_short_runs_stay_single(self):
+        assert compress_pk_ranges([1, 2, 3], min_run=5) == ([], [1, 2, 3])
+
+    def test_duplicates_and_strings(self):
+        assert compress_pk_ranges(["3", "1", "2", 2, "4", "5"], min_run=5) == ([(1, 5)], [])
+
+    def test_non_integer_raises(self):
+        with pytest.raises(ValueError):
+            compress_pk_ranges(["a"])
+
+
+class TestBuildOgrPkPredicate:
+    def test_small_list_unchanged(self):
+        assert build_ogr_pk_predicate("id", [1, 2, 3]) == '"id" IN (1, 2, 3)'
+
+    def test_single_range(self):
+        assert build_ogr_pk_predicate("fid", list(range(1, 200001))) == '"fid" BETWEEN 1 AND 200000'
+
+    def test_ranges_mixed_with_in_list(self):
+        result = build_ogr_pk_predicate("fid", list(range(10, 20)) + [3, 50])
+        assert result == '("fid" BETWEEN 10 AND 19 OR "fid" IN (3, 50))'
+
+    def test_much_smaller_than_flat_list(self):
+        ids = [i for i in range(200000) if i % 1000 != 0]
+        flat = build_ogr_pk_predicate("fid", ids, min_run=len(ids) + 1)
+        compact = build_ogr_pk_predicate("fid", ids)
+        assert len(compact) * 50 < len(flat)
+
+    def test_text_keys_use_in_list(self):
+        assert build_ogr_pk_predicate("code", ["a", "b"], is_numeric=False) == '"code" IN (\'a\', \'b\')'
+
+    def test_non_integer_numeric_falls_back(self):
+        assert build_ogr_pk_predicate("id", [1.5, 2.5]) == '"id" IN (1.5, 2.5)'
+
+    def test_id_table_used_above_threshold(self, tmp_path):
+        import sqlite3
+        db_path = str(tmp_path / "data.gpkg")
+        sqlite3.connect(db_path).close()
+        ids = list(range(0, 100, 2))
+
+        result = build_ogr_pk_predicate("fid", ids, db_path=db_path, table_threshold=10)
+        assert result.startswith('"fid" IN (SELECT id FROM "fm_tmp_ids_')
+
+        table = result.split('"')[3]
+        conn = sqlite3.connect(db_path)
+        stored = [row[0] for row in conn.execute(f'SELECT id FROM "{table}" ORDER BY id')]
+        conn.close()
+        assert stored == ids
+
+        # Same ID set reuses the same table
+        assert build_ogr_pk_predicate("fid", list(reversed(ids)), db_path=db_path, table_threshold=10) == result
+
+    def test_unquoted_name(self):
+        assert build_ogr_pk_predicate("fid", list(range(1, 11)), quote_name=False) == 'fid BETWEEN 1 AND 10'
+
+    def test_no_id_table_without_gpkg(self):
+        result = build_ogr_pk_predicate("fid", list(range(0, 100, 2)), db_path=None, table_threshold=10)
+        assert result.startswith('"fid" IN (0, 2, 4')
+
+
+class TestOgrFidTableLifecycle:
+    """ID tables follow subset changes and layer removal."""
+
+    @pytest.fixture
+    def gpkg_layer(self, tmp_path, monkeypatch):
+        import sqlite3
+        db_path = str(tmp_path / "data.gpkg")
+        sqlite3.connect(db_path).close()
+        layer = MagicMock()
+        layer.id.return_value = "roads"
+        layer.providerType.return_value = "ogr"
+        layer.source.return_value = f"{db_path}|layername=roads"
+        layer.setSubsetString.side_effect = lambda subset: layer.subsetString.configure_mock(return_value=subset) or True
+        layer.setSubsetString(build_ogr_pk_predicate("fid", list(range(0, 100, 2)), db_path=db_path, table_threshold=10))
+
+        project = MagicMock()
+        project.mapLayers.return_value = {"roads": layer}
+        monkeypatch.setattr(sys.modules["qgis.core"], "QgsProject", MagicMock(instance=lambda: project))
+        return layer, db_path
+
+    @staticmethod
+    def _tables(db_path):
+        import sqlite3
+        conn = sqlite3.connect(db_path)
+        names = [r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE name LIKE 'fm_tmp_ids_%'")]
+        conn.close()
+        return names
+
+    def test_subset_change_drops_table_and_undo_rebuilds_it(self, gpkg_layer):
+        layer, db_path = gpkg_layer
+        predicate = layer.subsetString()
+        assert len(self._tables(db_path)) == 1
+
+        assert _mod.set_ogr_subset_string(layer, '"fid" < 10')
+        assert self._tables(db_path) == []
+
+        # Undo re-applies the old predicate: the table comes back
+        assert _mod.set_ogr_subset_string(layer, predicate)
+        assert len(self._tables(db_path)) == 1
+
+    def test_table_kept_while_a_layer_references_it(self, gpkg_layer):
+        layer, db_path = gpkg_layer
+        assert _mod.release_ogr_fid_tables(layer, layer.subsetString()) == 0
+        assert len(self._tables(db_path)) == 1
+
+    def test_layer_removal_drops_table(self, gpkg_layer):
+        layer, db_path = gpkg_layer
+        assert _mod.release_ogr_fid_tables(layer, layer.subsetString(), removed_layer_ids={"roads"}) == 1
+        assert self._tables(db_path) == []
+
+    def test_cached_ids_are_bounded(self, tmp_path, monkeypatch):
+        import sqlite3
+        db_path = str(tmp_path / "lru.gpkg")
+        sqlite3.connect(db_path).close()
+        monkeypatch.setattr(_mod, "OGR_FID_TABLE_MAX_CACHED_IDS", 100)
+
+        first = _mod.create_ogr_fid_table(db_path, list(range(0, 120, 2)))
+        second = _mod.create_ogr_fid_table(db_path, list(range(1, 121, 2)))
+        # 60 + 60 IDs exceed the budget: the least recently used table is forgotten
+        assert first not in _mod._fid_table_ids
+        assert second in _mod._fid_table_ids
+        assert _mod._fid_table_cached_count <= 100
+
+
 # ===========================================================================
 # Tests -- combine_ogr_filters
 # ===========================================================================
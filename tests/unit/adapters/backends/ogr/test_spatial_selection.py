@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the OGR native spatial selection engine.
+
+QGIS geometry classes are replaced by axis-aligned rectangle fakes so the
+predicate dispatch, its direction (target <predicate> source) and the
+Disjoint/any-source semantics of selectbylocation can be checked without
+GEOS.
+
+Module tested: adapters.backends.ogr.spatial_selection
+"""
+import importlib.util
+import os
+import sys
+
+import pytest
+
+
+_module_path = os.path.normpath(os.path.join(
+    os.path.dirname(__file__),
+    "..", "..", "..", "..", "..",
+    "adapters", "backends", "ogr", "spatial_selection.py"
+))
+_spec = importlib.util.spec_from_file_location(
+    "filter_mate_test.ogr_spatial_selection", _module_path
+)
+sel = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = sel
+_spec.loader.exec_module(sel)
+
+
+# ---------------------------------------------------------------------------
+# Rectangle fakes
+# ---------------------------------------------------------------------------
+
+class FakeRect:
+    def __init__(self, x0, y0=None, x1=None, y1=None):
+        if isinstance(x0, FakeRect):
+            x0, y0, x1, y1 = x0.box
+        self.box = (x0, y0, x1, y1)
+
+    def combineExtentWith(self, other):
+        a, b = self.box, other.box
+        self.box = (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+    def intersects(self, other):
+        a, b = self.box, other.box
+        return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+class FakeEngine:
+    """Rectangle predicates seen from the prepared (source) geometry."""
+
+    def __init__(self, rect):
+        self.rect = rect
+
+    def prepareGeometry(self):
+        pass
+
+    def intersects(self, other):
+        return self.rect.intersects(other)
+
+    def contains(self, other):
+        a, b = self.rect.box, other.box
+        return a[0] <= b[0] and a[1] <= b[1] and a[2] >= b[2] and a[3] >= b[3]
+
+    def within(self, other):
+        return FakeEngine(other).contains(self.rect)
+
+    def isEqual(self, other):
+        return self.rect.box == other.box
+
+    def touches(self, other):
+        a, b = self.rect.box, other.box
+        return self.intersects(other) and (a[2] == b[0] or b[2] == a[0] or a[3] == b[1] or b[3] == a[1])
+
+    def overlaps(self, other):
+        return self.intersects(other) and not self.touches(other) \
+            and not self.contains(other) and not self.within(other)
+
+    def crosses(self, other):
+        return False
+
+
+class FakeGeometry:
+    def __init__(self, rect):
+        self.rect = rect
+
+    def isNull(self):
+        return self.rect is None
+
+    def isEmpty(self):
+        return self.rect is None
+
+    def isGeosValid(self):
+        return True
+
+    def boundingBox(self):
+        return self.rect
+
+    def constGet(self):
+        return self.rect
+
+    def transform(self, transform):
+        self.rect = transform.apply(self.rect)
+
+    @staticmethod
+    def createGeometryEngine(rect):
+        return FakeEngine(rect)
+
+
+class FakeIndex:
+    def __init__(self):
+        self.items = {}
+
+    def addFeature(self, key, bbox):
+        self.items[key] = bbox
+
+    def intersects(self, rect):
+        return [k for k, b in self.items.items() if b.intersects(rect)]
+
+
+class FakeRequest:
+    def __init__(self):
+        self.filter_rect = None
+
+    def setSubsetOfAttributes(self, attrs):
+        return self
+
+    def setNoAttributes(self):
+        return self
+
+    def setFlags(self, flags):
+        return self
+
+    def setFilterRect(self, rect):
+        self.filter_rect = rect
+        return self
+
+
+class FakeFeature:
+    def __init__(self, fid, box):
+        self._fid = fid
+        self._geom = FakeGeometry(FakeRect(*box) if box else None)
+
+    def id(self):
+        return self._fid
+
+    def geometry(self):
+        # QgsFeature.geometry() returns a copy
+        return FakeGeometry(self._geom.rect)
+
+
+class FakeTransform:
+    """Fake reprojection between "EPSG:A" and "EPSG:B": B = A shifted by +100."""
+
+    def __init__(self, source_crs, target_crs, project):
+        self.shift = 100 if (source_crs, target_crs) == ("EPSG:A", "EPSG:B") else -100
+
+    def apply(self, rect):
+        x0, y0, x1, y1 = rect.box
+        return FakeRect(x0 + self.shift, y0 + self.shift, x1 + self.shift, y1 + self.shift)
+
+
+class FakeLayer:
+    def __init__(self, boxes, crs="EPSG:A"):
+        self.features = [FakeFeature(fid, box) for fid, box in boxes.items()]
+        self.requests = []
+        self.selection = None
+        self._crs = crs
+
+    def name(self):
+        return "fake"
+
+    def crs(self):
+        return self._crs
+
+    def getFeatures(self, request=None):
+        self.requests.append(request)
+        rect = getattr(request, "filter_rect", None)
+        for f in self.features:
+            if rect is None or (f.geometry().rect and f.geometry().rect.intersects(rect)):
+                yield f
+
+    def selectByIds(self, fids, behavior):
+        self.selection = (sorted(fids), behavior)
+
+
+@pytest.fixture(autouse=True)
+def fake_qgis(monkeypatch):
+    monkeypatch.setattr(sel, "QgsRectangle", FakeRect)
+    monkeypatch.setattr(sel, "QgsGeometry", FakeGeometry)
+    monkeypatch.setattr(sel, "QgsSpatialIndex", FakeIndex)
+    monkeypatch.setattr(sel, "QgsFeatureRequest", FakeRequest)
+    monkeypatch.setattr(sel, "QgsCoordinateTransform", FakeTransform)
+    monkeypatch.setattr(sel, "QgsProject", type("FakeProject", (), {"instance": staticmethod(lambda: None)}))
+
+
+# Source: one square (0,0)-(10,10)
+SOURCE = {1: (0, 0, 10, 10)}
+TARGET = {
+    10: (2, 2, 4, 4),        # inside source
+    11: (-5, -5, 20, 20),    # contains source
+    12: (10, 0, 15, 5),      # touches source edge
+    13: (5, 5, 15, 15),      # overlaps source
+    14: (50, 50, 60, 60),    # far away
+    15: (0, 0, 10, 10),      # equals source
+    16: None,                # null geometry
+}
+
+
+def _select(codes, source=SOURCE, target=TARGET):
+    engine = sel.NativeSpatialSelectionEngine(FakeLayer(source))
+    return engine.select_fids(FakeLayer(target), codes), engine
+
+
+class TestPredicates:
+    """Predicate semantics match selectbylocation (target <predicate> source)."""
+
+    def test_intersects(self):
+        fids, _ = _select([sel.PREDICATE_INTERSECTS])
+        assert fids == {10, 11, 12, 13, 15}
+
+    def test_within_means_target_inside_source(self):
+        fids, _ = _select([sel.PREDICATE_WITHIN])
+        assert fids == {10, 15}
+
+    def test_contains_means_target_contains_source(self):
+        fids, _ = _select([sel.PREDICATE_CONTAINS])
+        assert fids == {11, 15}
+
+    def test_equals_touches_overlaps(self):
+        assert _select([sel.PREDICATE_EQUALS])[0] == {15}
+        assert _select([sel.PREDICATE_TOUCHES])[0] == {12}
+        assert _select([sel.PREDICATE_OVERLAPS])[0] == {13}
+
+    def test_disjoint_selects_targets_intersecting_no_source(self):
+        fids, _ = _select([sel.PREDICATE_DISJOINT])
+        assert fids == {14, 16}
+
+    def test_multiple_predicates_are_ored(self):
+        fids, _ = _select([sel.PREDICATE_TOUCHES, sel.PREDICATE_DISJOINT])
+        assert fids == {12, 14, 16}
+
+    def test_any_source_feature_matches(self):
+        source = {1: (0, 0, 10, 10), 2: (48, 48, 70, 70)}
+        fids, _ = _select([sel.PREDICATE_WITHIN], source=source)
+        assert fids == {10, 14, 15}
+
+    def test_unknown_predicate_code(self):
+        with pytest.raises(ValueError):
+            _select([42])
+
+
+class TestEngineBehavior:
+    """Index reuse, bbox streaming and selection application."""
+
+    def test_target_request_uses_source_extent(self):
+        target = FakeLayer(TARGET)
+        engine = sel.NativeSpatialSelectionEngine(FakeLayer(SOURCE))
+        engine.select_fids(target, [sel.PREDICATE_INTERSECTS])
+        assert target.requests[-1].filter_rect.box == (0, 0, 10, 10)
+        assert engine.stats.target_scanned == 5
+
+    def test_disjoint_scans_all_targets(self):
+        target = FakeLayer(TARGET)
+        engine = sel.NativeSpatialSelectionEngine(FakeLayer(SOURCE))
+        engine.select_fids(target, [sel.PREDICATE_DISJOINT])
+        assert target.requests[-1].filter_rect is None
+
+    def test_prepared_geometries_built_lazily_and_reused(self):
+        source = {1: (0, 0, 10, 10), 2: (100, 100, 110, 110)}
+        engine = sel.NativeSpatialSelectionEngine(FakeLayer(source))
+        engine.select_fids(FakeLayer(TARGET), [sel.PREDICATE_INTERSECTS])
+        engine.select_fids(FakeLayer(TARGET), [sel.PREDICATE_WITHIN])
+        assert engine.stats.prepared_geometries == 1
+
+    def test_empty_source(self):
+        fids, _ = _select([sel.PREDICATE_INTERSECTS], source={1: None})
+        assert fids == set()
+
+    def test_canceled_feedback_returns_nothing(self, monkeypatch):
+        monkeypatch.setattr(sel, "CANCEL_CHECK_INTERVAL", 1)
+
+        class Canceled:
+            def isCanceled(self):
+                return True
+
+        engine = sel.NativeSpatialSelectionEngine(FakeLayer(SOURCE), feedback=Canceled())
+        assert engine.select_fids(FakeLayer(TARGET), [sel.PREDICATE_INTERSECTS]) == set()
+
+
+class TestReprojection:
+    """The source is reprojected into the target CRS before testing."""
+
+    # TARGET shifted into EPSG:B
+    TARGET_B = {fid: tuple(c + 100 for c in box) if box else None for fid, box in TARGET.items()}
+
+    def test_mixed_crs_source_is_transformed(self):
+        engine = sel.NativeSpatialSelectionEngine(FakeLayer(SOURCE, crs="EPSG:A"))
+        fids = engine.select_fids(FakeLayer(self.TARGET_B, crs="EPSG:B"), [sel.PREDICATE_WITHIN])
+        assert fids == {10, 15}
+
+    def test_untransformed_source_would_miss(self):
+        # Same coordinates, same CRS: nothing of TARGET_B is inside SOURCE
+        fids, _ = _select([sel.PREDICATE_WITHIN], target=self.TARGET_B)
+        assert fids == set()
+
+    def test_index_rebuilt_when_target_crs_changes(self):
+        engine = sel.NativeSpatialSelectionEngine(FakeLayer(SOURCE, crs="EPSG:A"))
+        assert engine.select_fids(FakeLayer(self.TARGET_B, crs="EPSG:B"), [sel.PREDICATE_WITHIN]) == {10, 15}
+        assert engine.select_fids(FakeLayer(TARGET, crs="EPSG:A"), [sel.PREDICATE_WITHIN]) == {10, 15}
+        assert engine.stats.source_features == 1
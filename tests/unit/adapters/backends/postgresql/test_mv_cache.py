@@ -0,0 +1,459 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the content-addressed materialized view cache.
+
+PostgreSQL is replaced by a fake connection that answers the catalog
+queries of the cache from in-memory tables and records executed DDL.
+
+Module tested: adapters.backends.postgresql.mv_cache
+"""
+import importlib.util
+import os
+import sys
+import types
+
+import pytest
+
+_package_dir = os.path.normpath(os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "..", "..", "adapters", "backends", "postgresql"
+))
+# Bare package so the module's relative import of mv_reference_tracker resolves
+_package = types.ModuleType("filter_mate_test.postgresql")
+_package.__path__ = [_package_dir]
+sys.modules.setdefault(_package.__name__, _package)
+
+_modules = {}
+for _name in ("mv_reference_tracker", "mv_cache"):
+    _spec = importlib.util.spec_from_file_location(
+        f"{_package.__name__}.{_name}", os.path.join(_package_dir, f"{_name}.py")
+    )
+    _modules[_name] = importlib.util.module_from_spec(_spec)
+    sys.modules[_spec.name] = _modules[_name]
+    _spec.loader.exec_module(_modules[_name])
+
+mv_cache = _modules["mv_cache"]
+MVReferenceTracker = _modules["mv_reference_tracker"].MVReferenceTracker
+MaterializedViewCache = mv_cache.MaterializedViewCache
+
+
+def create_mv_sql(schema, name, sql):
+    return f'CREATE MATERIALIZED VIEW IF NOT EXISTS "{schema}"."fm_temp_mv_{name}" AS {sql} WITH DATA;'
+
+
+class FakePostgres:
+    """Tables, their change log and the result stores of one fake database."""
+
+    def __init__(self):
+        # (schema, name) -> [oid, relkind, relfilenode, partition root]
+        self.relations = {("public", "roads"): [16001, "r", 1001, None]}
+        self.change_log = None  # relid -> logged write statements, once installed
+        self.triggers = {}  # relid -> trigger oid
+        self.trigger_error = None
+        self.stats = {}  # relid -> flushed [inserted, updated, deleted]
+        self.pending_stats = {}  # relid -> writes not yet reported to the statistics
+        self.contents = {}  # relid -> (row count, max xmin)
+        self.pages = {}  # relid -> size in pages (default 10)
+        self.track_counts = True
+        self.matviews = set()
+        self.catalog = {}
+        self.leases = {}  # (mv_name, holder, layer_id) -> renewed_at
+        self.after_select = None
+        self.executed = []
+        self.clock = 0.0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def write(self, schema, name):
+        """A committed INSERT/UPDATE/DELETE statement on a table."""
+        relid = self.relations[(schema, name)][0]
+        if relid in self.triggers:
+            self.change_log[relid] = self.change_log.get(relid, 0) + 1
+        self.pending_stats[relid] = self.pending_stats.get(relid, 0) + 1
+        rows, newest = self.contents.get(relid, (100, 500))
+        self.contents[relid] = (rows + 1, newest + 1)
+
+    def flush_stats(self):
+        """The writers report their statistics (about a second after commit)."""
+        for relid, inserted in self.pending_stats.items():
+            self.stats.setdefault(relid, [0, 0, 0])[0] += inserted
+        self.pending_stats = {}
+
+    def statements(self, keyword):
+        return [sql for sql in self.executed if sql.lstrip().startswith(keyword)]
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        db = self.db
+        db.executed.append(sql)
+        self.rows = []
+        if sql.startswith("EXPLAIN"):
+            scans = [{"Node Type": "Seq Scan", "Schema": s, "Relation Name": n}
+                     for s, n in db.relations if f'"{n}"' in sql]
+            self.rows = [([{"Plan": {"Node Type": "Append", "Plans": scans}}],)]
+        elif "AS t(schema_name" in sql:
+            wanted = set(zip(*params))
+            self.rows = [(s, n, *db.relations[(s, n)]) for s, n in wanted if (s, n) in db.relations]
+        elif sql.startswith("SELECT to_regclass"):
+            self.rows = [(7001, 7002) if db.change_log is not None else (None, None)]
+        elif sql.startswith('CREATE TABLE IF NOT EXISTS "fm_temp"."fm_table_versions"'):
+            db.change_log = {} if db.change_log is None else db.change_log
+        elif sql.startswith("SELECT tgrelid,"):
+            self.rows = [(relid, oid) for relid, oid in db.triggers.items() if relid in params[2]]
+        elif sql.startswith("SELECT oid, oid::regclass"):
+            self.rows = [(oid, f'"{s}"."{n}"') for (s, n), (oid, *_) in db.relations.items() if oid in params[0]]
+        elif sql.startswith("CREATE TRIGGER"):
+            if db.trigger_error:
+                raise db.trigger_error
+            qualified = sql.split(" ON ")[1].split(" FOR ")[0]
+            relid, = [oid for (s, n), (oid, *_) in db.relations.items() if f'"{s}"."{n}"' == qualified]
+            db.triggers[relid] = 9000 + len(db.triggers)
+        elif "pg_stat_get_tuples_inserted" in sql:
+            self.rows = [
+                (oid, f'"{s}"."{n}"', db.pages.get(oid, 10), *db.stats.get(oid, [0, 0, 0]), db.track_counts)
+                for (s, n), (oid, *_) in db.relations.items() if oid in params[0]
+            ]
+        elif sql.startswith("SELECT count(*), max(xmin"):
+            relid, = [oid for (s, n), (oid, *_) in db.relations.items() if sql.endswith(f'"{s}"."{n}"')]
+            self.rows = [db.contents.get(relid, (100, 500))]
+        elif sql.startswith("SELECT tgrelid::regclass"):
+            self.rows = [(f'"{s}"."{n}"',) for (s, n), (oid, *_) in db.relations.items() if oid in db.triggers]
+        elif sql.startswith("DROP TRIGGER"):
+            qualified = sql.split(" ON ")[1]
+            for (s, n), (oid, *_) in db.relations.items():
+                if f'"{s}"."{n}"' == qualified:
+                    db.triggers.pop(oid, None)
+        elif sql.startswith("DROP TABLE IF EXISTS \"fm_temp\".\"fm_table_versions\""):
+            db.change_log = None
+        elif sql.startswith("SELECT relid, sum(n)"):
+            self.rows = [(relid, n, 1) for relid, n in db.change_log.items() if relid in params[0]]
+        elif sql.startswith("UPDATE"):
+            name = params[0]
+            self.rowcount = int(name in db.catalog and name in db.matviews)
+            if self.rowcount:
+                db.catalog[name]["used"] = db.clock
+        elif sql.startswith("CREATE UNLOGGED TABLE IF NOT EXISTS"):
+            pass  # cache catalog
+        elif sql.startswith(("CREATE MATERIALIZED VIEW", "CREATE UNLOGGED TABLE")):
+            db.matviews.add(sql.split('"')[3])
+        elif sql.startswith("DROP"):
+            db.matviews.discard(sql.split('"')[3])
+        elif sql.startswith("SELECT pg_total_relation_size"):
+            self.rows = [(100 * 1024 * 1024,)]
+        elif sql.startswith('INSERT INTO "fm_temp"."fm_temp_mv_cache_leases"'):
+            holder, mv_names, layer_ids = params
+            for mv_name, layer_id in zip(mv_names, layer_ids):
+                db.leases[(mv_name, holder, layer_id)] = db.clock
+        elif sql.startswith('INSERT INTO "fm_temp"."fm_temp_mv_cache"'):
+            db.catalog[params[0]] = {"size": params[1], "used": db.clock}
+        elif sql.startswith('DELETE FROM "fm_temp"."fm_temp_mv_cache_leases"'):
+            ttl = mv_cache.LEASE_TTL_HOURS * 3600
+            db.leases = {
+                key: renewed for key, renewed in db.leases.items()
+                if (params is None and db.clock - renewed <= ttl) or (params is not None and key[1] != params[0])
+            }
+        elif sql.startswith("DELETE") and "last_used_at = %s" in sql:
+            name, used = params
+            if name in db.catalog and db.catalog[name]["used"] == used:
+                del db.catalog[name]
+                self.rows = [(name,)]
+        elif sql.startswith("SELECT mv_name"):
+            self.rows = [
+                (name, e["size"], db.clock - e["used"], e["used"],
+                 any(lease[0] == name for lease in db.leases))
+                for name, e in db.catalog.items()
+            ]
+            if db.after_select:
+                db.after_select()
+
+    def fetchall(self):
+        return self.rows
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+
+QUERY = 'SELECT * FROM "public"."roads" WHERE "roads"."kind" = \'motorway\''
+
+
+@pytest.fixture
+def db():
+    return FakePostgres()
+
+
+@pytest.fixture
+def cache():
+    return MaterializedViewCache(
+        quota_mb=1024, max_age_hours=24, tracker=MVReferenceTracker(), table_versioning="triggers"
+    )
+
+
+@pytest.fixture
+def stats_cache():
+    return MaterializedViewCache(quota_mb=1024, max_age_hours=24, tracker=MVReferenceTracker())
+
+
+def acquire(cache, db, layer_id, sql=QUERY):
+    return cache.acquire(db, "fm_temp", sql, "geom", layer_id, create_mv_sql)
+
+
+class TestContentKey:
+    def test_normalize_keeps_literals(self):
+        sql = "SELECT *\n  FROM  t WHERE name = 'a   b' ;"
+        assert mv_cache.normalize_query(sql) == "SELECT * FROM t WHERE name = 'a   b'"
+
+    def test_referenced_tables_from_plan(self):
+        plan = [{"Plan": {"Node Type": "Hash Join", "Plans": [
+            {"Node Type": "Seq Scan", "Schema": "public", "Relation Name": "roads"},
+            {"Node Type": "Hash", "Plans": [
+                {"Node Type": "Index Scan", "Schema": "land", "Relation Name": "parcels"},
+                {"Node Type": "Seq Scan", "Schema": "public", "Relation Name": "roads"},
+            ]},
+            {"Node Type": "Function Scan", "Function Name": "generate_series"},
+        ]}}]
+
+        class Connexion(FakePostgres):
+            def cursor(self):
+                cursor = FakeCursor(self)
+                cursor.execute = lambda sql, params=None: setattr(cursor, "rows", [(plan,)])
+                return cursor
+
+        # Unqualified names and views resolve to the tables scanned
+        assert mv_cache.referenced_tables(Connexion(), "SELECT * FROM roads_view JOIN parcels USING (id)") == [
+            ("public", "roads"), ("land", "parcels")
+        ]
+
+    def test_key_follows_query_and_versions(self):
+        versions = {("public", "roads"): "1001:7001.9000.10"}
+        key = mv_cache.content_key(QUERY, versions)
+        assert key == mv_cache.content_key(QUERY.replace(" ", "  ") + ";", versions)
+        assert key != mv_cache.content_key(QUERY, {("public", "roads"): "1001:7001.9000.11"})
+        assert key != mv_cache.content_key(QUERY.replace("motorway", "primary"), versions)
+
+
+class TestAcquire:
+    def test_identical_query_reused(self, cache, db):
+        first = acquire(cache, db, "layer_a")
+        assert not first.reused
+        assert first.name.startswith("fm_temp_mv_cache_")
+        assert len(db.statements("CREATE MATERIALIZED VIEW")) == 1
+
+        # Undo/redo or another layer with the same query: no rebuild
+        second = acquire(cache, db, "layer_b")
+        assert second.reused and second.name == first.name
+        assert len(db.statements("CREATE MATERIALIZED VIEW")) == 1
+        assert cache._tracker.get_reference_count(first.name) == 2
+        assert cache.get_stats()["hits"] == 1
+
+    def test_source_table_write_invalidates(self, cache, db):
+        first = acquire(cache, db, "layer_a")
+        assert len(db.statements("CREATE TRIGGER")) == 1
+        db.write("public", "roads")
+        second = acquire(cache, db, "layer_a")
+        assert not second.reused and second.name != first.name
+        # The trigger is installed once
+        assert len(db.statements("CREATE TRIGGER")) == 1
+        # The previous view is released but kept for undo
+        assert first.name in db.matviews
+        assert cache._tracker.is_evictable(first.name)
+
+    def test_partition_counts_root_writes(self, cache, db):
+        db.relations[("public", "roads_2026")] = [16002, "r", 1002, 16001]
+        sql = 'SELECT * FROM "public"."roads_2026"'
+        first = acquire(cache, db, "layer_a", sql)
+        assert len(db.statements("CREATE TRIGGER")) == 2
+        # A write through the partitioned table fires the root's trigger only
+        db.write("public", "roads")
+        assert acquire(cache, db, "layer_a", sql).name != first.name
+
+    def test_views_not_cached(self, cache, db):
+        db.relations[("public", "roads")][1] = "f"
+        assert acquire(cache, db, "layer_a") is None
+        assert not db.statements("CREATE MATERIALIZED VIEW")
+
+    def test_external_materialized_views_not_cached(self, cache, db):
+        db.relations[("public", "roads")][1] = "m"
+        assert acquire(cache, db, "layer_a") is None
+        # FilterMate views are replaced, never refreshed: relfilenode is their version
+        db.relations[("fm_temp", "fm_temp_mv_source")] = db.relations.pop(("public", "roads"))
+        assert acquire(cache, db, "layer_a", 'SELECT * FROM "fm_temp"."fm_temp_mv_source"') is not None
+        assert not db.statements("CREATE TRIGGER")
+
+    def test_trigger_not_allowed_not_cached(self, cache, db):
+        db.trigger_error = PermissionError("must be owner of table roads")
+        assert acquire(cache, db, "layer_a") is None
+        assert not db.statements("CREATE MATERIALIZED VIEW")
+        assert cache.get_stats()["uncacheable"] == 1
+
+    def test_disabled_by_zero_quota(self, db):
+        assert MaterializedViewCache(quota_mb=0, tracker=MVReferenceTracker()).acquire(
+            db, "fm_temp", QUERY, "geom", "layer_a", create_mv_sql) is None
+        assert not db.executed
+
+
+class TestStatisticsVersioning:
+    """Default mode: versions from statistics counters, no DDL on user tables."""
+
+    def test_no_trigger_installed(self, stats_cache, db):
+        first = acquire(stats_cache, db, "layer_a")
+        assert not first.reused
+        assert acquire(stats_cache, db, "layer_b").reused
+        assert not db.statements("CREATE TRIGGER")
+        assert not db.statements("CREATE TABLE IF NOT EXISTS")
+        assert db.change_log is None
+
+    def test_small_table_write_seen_immediately(self, stats_cache, db):
+        first = acquire(stats_cache, db, "layer_a")
+        db.write("public", "roads")
+        # count(*)/max(xmin) changed before the statistics are flushed
+        assert acquire(stats_cache, db, "layer_a").name != first.name
+
+    def test_large_table_write_seen_after_stats_flush(self, stats_cache, db):
+        db.pages[16001] = mv_cache.STATISTICS_EXACT_MAX_PAGES + 1
+        first = acquire(stats_cache, db, "layer_a")
+        assert not db.statements("SELECT count(*)")
+        db.write("public", "roads")
+        # Accepted staleness until the writer reports its statistics
+        assert acquire(stats_cache, db, "layer_a").name == first.name
+        db.flush_stats()
+        assert acquire(stats_cache, db, "layer_a").name != first.name
+
+    def test_large_table_without_track_counts_not_cached(self, stats_cache, db):
+        db.pages[16001] = mv_cache.STATISTICS_EXACT_MAX_PAGES + 1
+        db.track_counts = False
+        assert acquire(stats_cache, db, "layer_a") is None
+        assert stats_cache.get_stats()["uncacheable"] == 1
+
+    def test_unknown_mode_falls_back_to_statistics(self, stats_cache):
+        stats_cache.configure(table_versioning="magic")
+        assert stats_cache.table_versioning == mv_cache.VERSIONING_STATISTICS
+
+    def test_remove_change_counters(self, cache, db):
+        acquire(cache, db, "layer_a")
+        assert db.triggers
+        assert mv_cache.remove_change_counters(db, "fm_temp") == 1
+        assert not db.triggers
+        assert db.change_log is None
+        assert db.statements("DROP FUNCTION IF EXISTS")
+
+
+class TestPkTableStore:
+    def test_primary_keys_only(self, db):
+        cache = MaterializedViewCache(tracker=MVReferenceTracker(), result_store="pk_table")
+        view = cache.acquire(db, "fm_temp", QUERY + ";", "geom", "layer_a", create_mv_sql, primary_key_name="gid")
+        assert view.name.startswith("fm_temp_pk_cache_") and view.result_store == "pk_table"
+        assert not db.statements("CREATE MATERIALIZED VIEW")
+        create, = db.statements(f'CREATE UNLOGGED TABLE "fm_temp"."{view.name}"')
+        insert, = db.statements("INSERT INTO \"fm_temp\".\"fm_temp_pk")
+        assert create.endswith("WITH NO DATA")
+        assert insert.endswith(f'SELECT "gid" FROM ({QUERY}) AS fm_result')
+        assert any("USING btree (\"gid\")" in sql for sql in db.executed)
+
+        assert cache.acquire(db, "fm_temp", QUERY, "geom", "layer_b", create_mv_sql, primary_key_name="gid").reused
+        # Another primary key column is another result
+        other = cache.acquire(db, "fm_temp", QUERY, "geom", "layer_c", create_mv_sql, primary_key_name="fid")
+        assert not other.reused and other.name != view.name
+
+    def test_evicted_with_drop_table(self, db):
+        cache = MaterializedViewCache(quota_mb=50, tracker=MVReferenceTracker(), result_store="pk_table")
+        name = cache.acquire(db, "fm_temp", QUERY, "geom", "layer", create_mv_sql, primary_key_name="gid").name
+        cache.release("layer")
+        assert cache.evict(db, "fm_temp") == [name]
+        assert f'DROP TABLE IF EXISTS "fm_temp"."{name}" CASCADE' in db.executed
+
+    def test_unknown_store_falls_back(self):
+        cache = MaterializedViewCache(tracker=MVReferenceTracker())
+        cache.configure(result_store="parquet")
+        assert cache.result_store == "materialized_view"
+
+
+class TestEviction:
+    def test_least_recently_used_beyond_quota(self, db):
+        cache = MaterializedViewCache(quota_mb=250, tracker=MVReferenceTracker())
+        names = []
+        for i, kind in enumerate(("a", "b", "c")):
+            db.clock = i
+            names.append(acquire(cache, db, "layer", QUERY.replace("motorway", kind)).name)
+        # Three 100MB views over a 250MB quota: the oldest unused one is dropped
+        assert names[0] not in db.matviews
+        assert names[1] in db.matviews and names[2] in db.matviews
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_referenced_views_kept(self):
+        entries = [("old", 10, 1000.0), ("used", 10, 900.0), ("new", 10, 1.0)]
+        evicted = mv_cache.select_evictions(entries, 15, 500.0, lambda name: name != "used")
+        # The referenced stale entry stays, the newest one goes to fit the quota
+        assert evicted == ["old", "new"]
+        assert mv_cache.select_evictions(entries, 100, 500.0, lambda name: True) == ["old", "used"]
+
+    def test_views_leased_by_other_sessions_kept(self, db):
+        cache = MaterializedViewCache(quota_mb=50, tracker=MVReferenceTracker())
+        name = acquire(cache, db, "layer").name
+        assert (name, mv_cache.LEASE_HOLDER, "layer") in db.leases
+        cache.release("layer")
+        db.leases[(name, "other_qgis", "their_layer")] = db.clock
+        assert cache.evict(db, "fm_temp") == []
+        assert (name, mv_cache.LEASE_HOLDER, "layer") not in db.leases
+
+        # Leases an instance stopped renewing expire
+        db.clock += mv_cache.LEASE_TTL_HOURS * 3600 + 1
+        assert cache.evict(db, "fm_temp") == [name]
+        assert name not in db.matviews
+
+    def test_view_reused_during_eviction_kept(self, db):
+        cache = MaterializedViewCache(quota_mb=50, tracker=MVReferenceTracker())
+        name = acquire(cache, db, "layer").name
+        cache.release("layer")
+
+        def reused_elsewhere():
+            db.catalog[name]["used"] = db.clock + 1
+        db.after_select = reused_elsewhere
+        assert cache.evict(db, "fm_temp") == []
+        assert name in db.matviews and name in db.catalog
+
+
+class TestReferenceTracker:
+    def test_cached_views_never_reported_droppable(self):
+        tracker = MVReferenceTracker()
+        tracker.add_reference("fm_temp_mv_session_layer", "layer_a")
+        assert tracker.assign_cached_reference("cache_1", "layer_a") == set()
+        assert tracker.assign_cached_reference("cache_2", "layer_a") == {"cache_1"}
+
+        assert tracker.remove_all_references_for_layer("layer_a") == {"fm_temp_mv_session_layer"}
+        # The current cached view still follows the layer's filter
+        assert tracker.get_referencing_layers("cache_2") == {"layer_a"}
+        assert tracker.remove_reference("cache_2", "layer_a") is False
+        assert tracker.get_stats()["cached_mvs"] == 2
+
+    def test_release(self):
+        tracker = MVReferenceTracker()
+        tracker.assign_cached_reference("cache_1", "layer_a")
+        assert tracker.release_cached_reference("layer_a") == {"cache_1"}
+        assert tracker.is_evictable("cache_1")
+        tracker.forget_cached("cache_1")
+        assert tracker.get_stats()["cached_mvs"] == 0
+
+    def test_cached_references(self):
+        tracker = MVReferenceTracker()
+        tracker.add_reference("fm_temp_mv_session_layer", "layer_a")
+        tracker.assign_cached_reference("cache_1", "layer_a")
+        tracker.assign_cached_reference("cache_1", "layer_b")
+        assert tracker.cached_references() == {("cache_1", "layer_a"), ("cache_1", "layer_b")}
@@ -38,9 +38,14 @@ def _ensure_schema_mocks():
         f"{ROOT}.infrastructure": MagicMock(),
         f"{ROOT}.infrastructure.database": MagicMock(),
         f"{ROOT}.infrastructure.database.sql_utils": MagicMock(),
+        f"{ROOT}.infrastructure.database.query_profiler": MagicMock(),
     }
     # Provide a real sanitize function for testing
     mocks[f"{ROOT}.infrastructure.database.sql_utils"].sanitize_sql_identifier = lambda x: x
+    # Disabled profiler: statements run unchanged on the cursor
+    mocks[f"{ROOT}.infrastructure.database.query_profiler"].get_query_profiler.return_value.execute = (
+        lambda backend, cursor, sql, *args, **kwargs: cursor.execute(sql)
+    )
 
     for name, mock_obj in mocks.items():
         if name not in sys.modules:
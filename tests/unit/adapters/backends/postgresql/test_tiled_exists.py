@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the tiled, resumable EXISTS evaluation.
+
+PostgreSQL is replaced by a fake connection holding target rows (primary
+key and bbox center); tile conditions are evaluated on the centers and the
+fake keeps uncommitted rows apart so commits and rollbacks are checked.
+
+Module tested: adapters.backends.postgresql.tiled_exists
+"""
+import importlib.util
+import os
+import re
+import sys
+import types
+
+import pytest
+
+_package_dir = os.path.normpath(os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "..", "..", "adapters", "backends", "postgresql"
+))
+# Bare package so the module's relative import of mv_cache resolves
+_package = types.ModuleType("filter_mate_test.postgresql")
+_package.__path__ = [_package_dir]
+sys.modules.setdefault(_package.__name__, _package)
+
+_modules = {}
+for _name in ("mv_reference_tracker", "mv_cache", "tiled_exists"):
+    _spec = importlib.util.spec_from_file_location(
+        f"{_package.__name__}.{_name}", os.path.join(_package_dir, f"{_name}.py")
+    )
+    _modules[_name] = importlib.util.module_from_spec(_spec)
+    sys.modules[_spec.name] = _modules[_name]
+    _spec.loader.exec_module(_modules[_name])
+
+tiled_exists = _modules["tiled_exists"]
+Tile = tiled_exists.Tile
+TiledExistsEvaluator = tiled_exists.TiledExistsEvaluator
+
+GEOM = '"parcels"."geom"'
+EXPRESSION = ('EXISTS (SELECT 1 FROM "public"."zones" AS __source '
+              'WHERE ST_Intersects("parcels"."geom", __source."geom"))')
+
+
+def tile_predicate(condition):
+    """Python version of a tile condition, called with the bbox center."""
+    py = re.sub(rf'{re.escape(GEOM)} && ST_MakeEnvelope\([^)]*\) AND ', '', condition)
+    py = py.replace(f'(ST_XMin({GEOM}) + ST_XMax({GEOM})) / 2', 'cx')
+    py = py.replace(f'(ST_YMin({GEOM}) + ST_YMax({GEOM})) / 2', 'cy')
+    py = re.sub(r'(c[xy]) BETWEEN (\S+) AND (\S+)', r'\2 <= \1 <= \3', py)
+    py = py.replace('COALESCE(', '(').replace(', TRUE)', ')').replace('NOT ', 'not ').replace(' AND ', ' and ')
+    return lambda cx, cy: eval(py, {}, {'cx': cx, 'cy': cy})  # nosec B307 - test fake
+
+
+class QueryCanceled(Exception):
+    pgcode = '57014'
+
+
+class FakePostgres:
+    """Target rows, matches of the EXISTS expression and the tiled tables."""
+
+    def __init__(self, centers, matches, extent=(0.0, 0.0, 100.0, 100.0), max_rows_in_time=None):
+        self.centers = centers
+        self.matches = matches
+        self.extent = extent
+        self.max_rows_in_time = max_rows_in_time
+        self.tables = set()
+        self.result = set()
+        self.done = {}
+        self.executed = []
+        self.versioning_error = None
+        self.autocommit = True
+        self._reset()
+
+    def _reset(self):
+        self.pending_result = set()
+        self.pending_done = {}
+        self.timeout_ms = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.result |= self.pending_result
+        self.done.update(self.pending_done)
+        self._reset()
+
+    def rollback(self):
+        self._reset()
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+        self.rowcount = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        db = self.db
+        db.executed.append(sql)
+        if sql.startswith("EXPLAIN"):
+            scans = [{"Schema": "public", "Relation Name": name} for name in ("parcels", "zones")]
+            self.rows = [([{"Plan": {"Node Type": "Hash Join", "Plans": scans}}],)]
+        elif "AS t(schema_name" in sql:
+            self.rows = [("public", "parcels", 16001, "r", 2001, None), ("public", "zones", 16002, "r", 2002, None)]
+        elif "pg_stat_get_tuples_inserted" in sql:
+            if db.versioning_error:
+                raise db.versioning_error
+            # Large tables: statistics counters only
+            self.rows = [(16001, '"public"."parcels"', 10 ** 6, 12, 0, 0, True),
+                         (16002, '"public"."zones"', 10 ** 6, 4, 0, 0, True)]
+        elif sql.startswith("SELECT to_regclass"):
+            self.rows = [(params[0] if params[0] in db.tables else None,)]
+        elif sql.startswith("SELECT tile"):
+            self.rows = list(db.done.items())
+        elif "ST_EstimatedExtent" in sql:
+            self.rows = [(*db.extent, 2154, float(len(db.centers)))] if db.extent else [(None,) * 5 + (0.0,)]
+        elif sql.startswith("CREATE UNLOGGED TABLE"):
+            db.tables.add(sql.split()[6])
+        elif sql.startswith("SET LOCAL statement_timeout"):
+            db.timeout_ms = int(sql.split("=")[1])
+        elif sql.endswith("ON CONFLICT DO NOTHING"):
+            condition = sql.split(" WHERE ", 1)[1].split(f" AND ({EXPRESSION})")[0]
+            in_tile = tile_predicate(condition)
+            keys = [pk for pk, (cx, cy) in db.centers.items() if in_tile(cx, cy)]
+            if db.timeout_ms and db.max_rows_in_time is not None and len(keys) > db.max_rows_in_time:
+                raise QueryCanceled("canceling statement due to statement timeout")
+            inserted = {pk for pk in keys if pk in db.matches} - db.result
+            db.pending_result |= inserted
+            self.rowcount = len(inserted)
+        elif sql.startswith("INSERT INTO") and params:
+            db.pending_done[params[0]] = params[1]
+
+    def fetchone(self):
+        return self.rows[0]
+
+    def fetchall(self):
+        return self.rows
+
+
+class RecordingProgress:
+    def __init__(self):
+        self.updates = []
+
+    def update(self, current, total, message="", items_processed=0):
+        self.updates.append((current, total, items_processed))
+
+
+def make_db(**kwargs):
+    # A 20 x 20 lattice of targets, the last row on the extent edge, and two outside it
+    centers = {i * 20 + j: (j * 5.0 + 2.5 * (i % 2), i * 100.0 / 19) for i in range(20) for j in range(20)}
+    centers.update({1000: (150.0, 50.0), 1001: (-1.0, -1.0)})
+    matches = {pk for pk in centers if pk % 3 == 0}
+    return FakePostgres(centers, matches, **kwargs)
+
+
+def evaluate(db, evaluator=None, **kwargs):
+    evaluator = evaluator or TiledExistsEvaluator(rows_per_tile=50)
+    return evaluator.evaluate(db, "public", "parcels", "geom", "gid", EXPRESSION, "fm_temp", **kwargs)
+
+
+class TestTiles:
+    def test_grid_size(self):
+        assert tiled_exists.grid_size(-1, 50000) == 2
+        assert tiled_exists.grid_size(1000000, 50000) == 5
+        assert tiled_exists.grid_size(10 ** 9, 50000, max_tiles=1024) == 32
+
+    def test_every_center_in_exactly_one_tile(self):
+        extent = (0.0, 0.0, 100.0, 100.0)
+        tiles = tiled_exists.plan_tiles(extent, 3)
+        tiles = tiles[1:] + tiles[0].split()  # a split tile is replaced by its quadrants
+        points = [(x, y) for x in (-5.0, 0.0, 100 / 3, 50.0, 100.0, 101.0) for y in (0.0, 16.0, 100 / 3, 100.0)]
+        for x, y in points:
+            owners = [t.key for t in tiles if tile_predicate(t.condition(GEOM, 2154, extent))(x, y)]
+            assert len(owners) == 1, (x, y, owners)
+        assert 'ST_MakeEnvelope(0.0, 0.0,' in tiles[-4].condition(GEOM, 2154, extent)
+
+
+class TestEvaluate:
+    def test_matches_accumulated_with_progress(self):
+        db = make_db()
+        progress = RecordingProgress()
+        result = evaluate(db, progress_handler=progress)
+
+        assert result.complete and result.tiles_total == 10  # 3 x 3 grid and the rest tile
+        assert db.result == db.matches
+        assert result.rows == len(db.matches)
+        assert result.table_name.startswith("fm_temp_pk_tiles_")
+        assert result.expression == f'"gid" IN (SELECT "gid" FROM "fm_temp"."{result.table_name}")'
+        # Only the temp schema is written to
+        assert {table.split(".")[0] for table in db.tables} == {'"fm_temp"'}
+        assert progress.updates[-1][0] == progress.updates[-1][1] == 10 * tiled_exists.TILE_UNITS
+        assert [u[0] for u in progress.updates] == sorted(u[0] for u in progress.updates)
+        assert db.done["*"] == str(len(db.matches))
+        assert db.autocommit is True
+
+    def test_cancel_then_resume(self):
+        db = make_db()
+        checks = iter([False, False, False, True])
+        canceled = evaluate(db, cancel_check=lambda: next(checks))
+        assert not canceled.complete and canceled.tiles_done == 3
+        assert len([k for k in db.done if k not in ("#plan", "*")]) == 3
+
+        inserts = len([sql for sql in db.executed if sql.endswith("ON CONFLICT DO NOTHING")])
+        resumed = evaluate(db)
+        assert resumed.complete and resumed.tiles_resumed == 3
+        assert db.result == db.matches and resumed.rows == len(db.matches)
+        assert len([sql for sql in db.executed if sql.endswith("ON CONFLICT DO NOTHING")]) == inserts + 7
+
+        # Same query and table versions: the finished result is reused as is
+        executed = len(db.executed)
+        assert evaluate(db).expression == resumed.expression
+        assert not [sql for sql in db.executed[executed:] if sql.startswith(("CREATE", "INSERT"))]
+
+    def test_unversioned_tables_not_resumed(self):
+        db = make_db()
+        db.versioning_error = PermissionError("permission denied for table zones")
+        checks = iter([False, True])
+        canceled = evaluate(db, cancel_check=lambda: next(checks))
+        assert not canceled.complete
+        rerun = evaluate(db)
+        assert rerun.complete and rerun.tiles_resumed == 0
+        assert rerun.table_name != canceled.table_name
+
+    def test_timed_out_tile_split(self):
+        db = make_db(max_rows_in_time=30)
+        result = evaluate(db)
+        assert result.complete and db.result == db.matches
+        assert "split" in db.done.values()
+        assert any("/" in key for key in db.done)
+
+    def test_error_rolled_back(self):
+        db = make_db()
+        db.matches = None  # the tile statement fails
+        with pytest.raises(TypeError):
+            evaluate(db)
+        assert not db.pending_result and db.autocommit is True
+
+    def test_no_statistics(self):
+        db = make_db(extent=None)
+        assert evaluate(db) is None
+        assert not db.tables
@@ -264,6 +264,50 @@ class TestBuildExpression:
         assert expr == "1 = 0"
 
 
+# ===========================================================================
+# Tests -- R-tree pre-pass
+# ===========================================================================
+
+class _FakeRTree:
+    table_name = "rtree_buildings_geom"
+
+    def candidate_sql(self, frame_sql):
+        return f"ROWID IN (SELECT id FROM rtree_buildings_geom WHERE {frame_sql})"
+
+
+class TestRTreePrePass:
+    def _build(self, builder, mock_gpkg_layer, predicates):
+        return builder.build_expression(
+            layer_props={"layer_name": "buildings", "layer_geometry_field": "geom", "layer": mock_gpkg_layer},
+            predicates=predicates,
+            source_geom="POINT(0 0)",
+        )
+
+    def test_source_geometry_evaluated_once_per_statement(self, builder):
+        expr = builder.build_expression(
+            layer_props={"layer_name": "test", "layer_geometry_field": "geom"},
+            predicates={"intersects": True},
+            source_geom="POINT(0 0)",
+        )
+        assert expr.startswith('Intersects("geom", (SELECT Transform(MakeValid(GeomFromText(')
+
+    def test_predicates_run_on_candidates(self, builder, mock_gpkg_layer):
+        builder._find_layer_rtree = lambda *args: _FakeRTree()
+        expr = self._build(builder, mock_gpkg_layer, {"intersects": True})
+        candidates, predicate = expr.split(" AND ", 1)
+        assert candidates.startswith("ROWID IN (SELECT id FROM rtree_buildings_geom WHERE (SELECT ")
+        assert predicate.startswith('Intersects(GeomFromGPB("geom"), (SELECT ')
+
+    def test_disjoint_skips_prepass(self, builder, mock_gpkg_layer):
+        builder._find_layer_rtree = lambda *args: _FakeRTree()
+        expr = self._build(builder, mock_gpkg_layer, {"disjoint": True})
+        assert "rtree" not in expr
+
+    def test_no_index_keeps_plain_predicate(self, builder, mock_gpkg_layer):
+        builder._find_layer_rtree = lambda *args: None
+        assert self._build(builder, mock_gpkg_layer, {"intersects": True}).startswith("Intersects(")
+
+
 # ===========================================================================
 # Tests -- GeoPackage detection
 # ===========================================================================
@@ -383,6 +427,7 @@ class TestApplyFilter:
             'Intersects("geom", GeomFromText(\'POINT(0 0)\', 2154))'
         )
         assert result is True
+        assert builder.layer_timings[mock_spatialite_layer.name()] >= 0
 
     def test_combine_with_existing_filter(self, builder, mock_spatialite_layer):
         result = builder.apply_filter(
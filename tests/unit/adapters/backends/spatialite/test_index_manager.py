@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the R-tree candidate pre-pass of the Spatialite backend.
+
+Runs the generated candidate subquery on a plain sqlite3 database with a
+GeoPackage-style R-tree. The Spatialite MBR functions are replaced by
+Python functions reading a "minx miny maxx maxy" text geometry.
+
+Module tested: adapters.backends.spatialite.index_manager
+"""
+import importlib.util
+import os
+import sqlite3
+import sys
+
+import pytest
+
+_module_path = os.path.normpath(os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "..", "..",
+    "adapters", "backends", "spatialite", "index_manager.py"
+))
+_spec = importlib.util.spec_from_file_location("filter_mate_test.spatialite_index_manager", _module_path)
+index_manager = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = index_manager
+_spec.loader.exec_module(index_manager)
+
+RTreeIndexManager = index_manager.RTreeIndexManager
+RTreeLayout = index_manager.RTreeLayout
+
+
+def _bound(position):
+    return lambda geometry: float(geometry.split()[position])
+
+
+@pytest.fixture
+def conn():
+    """A 10x10 grid of unit boxes in a GeoPackage-style table and R-tree."""
+    try:
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE VIRTUAL TABLE rtree_Buildings_geom USING rtree(id, minx, maxx, miny, maxy)")
+    except sqlite3.OperationalError:
+        pytest.skip("SQLite built without R-tree")
+    conn.execute("CREATE TABLE Buildings (fid INTEGER PRIMARY KEY, name TEXT)")
+    for fid in range(100):
+        x, y = fid % 10, fid // 10
+        conn.execute("INSERT INTO Buildings VALUES (?, ?)", (fid + 1, f"b{fid}"))
+        conn.execute("INSERT INTO rtree_Buildings_geom VALUES (?, ?, ?, ?, ?)", (fid + 1, x, x + 1, y, y + 1))
+    for name, position in (("MbrMinX", 0), ("MbrMinY", 1), ("MbrMaxX", 2), ("MbrMaxY", 3)):
+        conn.create_function(name, 1, _bound(position))
+    yield conn
+    conn.close()
+
+
+class TestFindRTree:
+    def test_geopackage_layout_found_case_insensitively(self, conn):
+        layout = RTreeIndexManager(conn).find_rtree("buildings", "geom", geopackage=True)
+        assert layout.table_name == "rtree_Buildings_geom"
+        assert layout.id_column == "id"
+
+    def test_missing_index(self, conn):
+        assert RTreeIndexManager(conn).find_rtree("roads", "geom", geopackage=True) is None
+        # Spatialite layout of the same table does not exist either
+        assert RTreeIndexManager(conn).find_rtree("buildings", "geom") is None
+
+    def test_spatialite_layout_columns(self):
+        layout = RTreeLayout.spatialite("roads", "geometry")
+        assert (layout.table_name, layout.id_column, layout.min_x) == ("idx_roads_geometry", "pkid", "xmin")
+
+
+class TestCandidateSql:
+    def test_candidates_are_the_overlapping_boxes(self, conn):
+        layout = RTreeIndexManager(conn).find_rtree("Buildings", "geom", geopackage=True)
+        where = layout.candidate_sql("(SELECT '2.5 2.5 4.5 3.5')")
+        rows = conn.execute(f"SELECT fid FROM Buildings WHERE {where} ORDER BY fid").fetchall()
+        # Columns 2-4 of rows 2-3
+        expected = sorted(y * 10 + x + 1 for y in range(2, 4) for x in range(2, 5))
+        assert [r[0] for r in rows] == expected
+
+    def test_frame_evaluated_once(self, conn):
+        calls = []
+
+        def frame():
+            calls.append(1)
+            return "0 0 1 1"
+
+        conn.create_function("Frame", 0, frame)
+        layout = RTreeIndexManager(conn).find_rtree("Buildings", "geom", geopackage=True)
+        conn.execute(f"SELECT fid FROM Buildings WHERE {layout.candidate_sql('Frame()')}").fetchall()
+        assert len(calls) == 1
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the Spatialite query service.
+
+Runs real queries on a temporary SQLite file (mod_spatialite is not needed
+for plain SQL): streamed batches, read-only connections, pooling, progress
+and cancellation through the progress handler.
+
+Module tested: adapters.backends.spatialite.query_service
+"""
+import importlib.util
+import os
+import sqlite3
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+_package_dir = os.path.normpath(os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "..", "..", "adapters", "backends", "spatialite"
+))
+# Bare package so the module's relative import of interruptible_query resolves
+_package = types.ModuleType("filter_mate_test.spatialite")
+_package.__path__ = [_package_dir]
+sys.modules.setdefault(_package.__name__, _package)
+
+_spec = importlib.util.spec_from_file_location(
+    "filter_mate_test.spatialite.query_service", os.path.join(_package_dir, "query_service.py")
+)
+query_service = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = query_service
+_spec.loader.exec_module(query_service)
+
+SpatialiteQueryService = query_service.SpatialiteQueryService
+
+# Never-ending statement: only cancellation or timeout stops it
+ENDLESS_SQL = (
+    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) "
+    "SELECT count(*) FROM n"
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "layers.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE roads (fid INTEGER PRIMARY KEY, kind TEXT)")
+    conn.executemany("INSERT INTO roads VALUES (?, ?)", ((i, "road") for i in range(1, 10001)))
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def service():
+    service = SpatialiteQueryService(pool_size=1, batch_size=1000)
+    yield service
+    service.close()
+
+
+class TestStreaming:
+    def test_rows_delivered_in_batches(self, service, db_path):
+        handle = service.submit(db_path, "SELECT fid FROM roads ORDER BY fid")
+        batches = list(handle.batches())
+        assert [len(b) for b in batches] == [1000] * 10
+        assert batches[-1][-1] == (10000,)
+        assert handle.error is None and handle.row_count == 10000
+
+    def test_fetch_all_and_params(self, service, db_path):
+        rows, error = service.submit(db_path, "SELECT fid FROM roads WHERE fid <= ?", (3,)).fetch_all()
+        assert error is None
+        assert rows == [(1,), (2,), (3,)]
+
+    def test_connection_is_read_only(self, service, db_path):
+        rows, error = service.submit(db_path, "DELETE FROM roads").fetch_all()
+        assert rows == [] and error is not None
+        assert service.submit(db_path, "SELECT count(*) FROM roads").fetch_all()[0] == [(10000,)]
+
+    def test_error_raised_by_iter_batches(self, service, db_path):
+        with pytest.raises(sqlite3.OperationalError):
+            list(service.iter_batches(db_path, "SELECT nope FROM roads"))
+
+    def test_finished_query_profiled_on_its_connection(self, db_path):
+        recorded = []
+
+        class Profiler:
+            enabled = True
+
+            def record_spatialite(self, conn, sql, wall_ms, row_count, params, layer):
+                plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+                recorded.append((sql, row_count, layer, plan[0][-1]))
+
+        service = SpatialiteQueryService(profiler=Profiler())
+        rows, error = service.submit(db_path, "SELECT fid FROM roads WHERE kind = ?", ("road",), layer="Roads").fetch_all()
+        assert error is None and len(rows) == 10000
+        assert recorded == [("SELECT fid FROM roads WHERE kind = ?", 10000, "Roads", "SCAN roads")]
+        service.close()
+
+
+class TestPool:
+    def test_connection_reused(self, db_path):
+        opened = []
+
+        def connect(path):
+            opened.append(path)
+            return query_service.open_read_only_connection(path)
+
+        service = SpatialiteQueryService(pool_size=2, connect=connect)
+        for _ in range(3):
+            assert service.submit(db_path, "SELECT 1").fetch_all() == ([(1,)], None)
+        assert len(opened) == 1
+        service.close()
+
+    def test_early_stop_releases_connection(self, service, db_path):
+        handle = service.submit(db_path, "SELECT fid FROM roads", batch_size=10)
+        for _ in handle.batches():
+            break
+        assert handle.wait(2.0)
+        assert handle.cancelled
+        assert service.get_stats()['pools'] == {str(os.path.realpath(db_path)): 1}
+
+
+class TestCancellation:
+    def test_cancel_check_stops_query_within_milliseconds(self, service, db_path):
+        cancel = threading.Event()
+        handle = service.submit(db_path, ENDLESS_SQL, cancel_check=cancel.is_set)
+        time.sleep(0.1)
+        cancel.set()
+        start = time.monotonic()
+        assert handle.wait(1.0)
+        assert time.monotonic() - start < 0.2
+        assert handle.cancelled and "cancelled" in str(handle.error)
+
+    def test_cancel_from_consumer(self, service, db_path):
+        handle = service.submit(db_path, ENDLESS_SQL)
+        time.sleep(0.05)
+        handle.cancel()
+        rows, error = handle.fetch_all()
+        assert rows == [] and handle.cancelled
+
+    def test_timeout(self, service, db_path):
+        handle = service.submit(db_path, ENDLESS_SQL, timeout=0.2)
+        rows, error = handle.fetch_all()
+        assert rows == [] and "timeout" in str(error)
+        assert handle.timed_out and not handle.cancelled
+
+    def test_timeout_raised_by_iter_batches(self, service, db_path):
+        # A timed-out query must not pass for a complete result
+        with pytest.raises(query_service.QueryTimeoutError):
+            for _ in service.iter_batches(db_path, ENDLESS_SQL, timeout=0.2):
+                pass
+
+    def test_batches_queued_at_the_end_delivered(self):
+        handle = query_service.SpatialiteQueryHandle("SELECT 1", (), 10, None, 60.0, None, None)
+        queued = handle._queue.get
+
+        def get(*args, **kwargs):
+            # The worker queues its last batch and finishes while the consumer waits
+            if not handle.done:
+                handle._queue.put_nowait([(1,)])
+                handle._done.set()
+                raise query_service.queue.Empty
+            return queued(*args, **kwargs)
+        handle._queue.get = get
+        assert list(handle.batches()) == [[(1,)]]
+
+
+class TestProgress:
+    def test_progress_reported_until_done(self, service, db_path):
+        sql = "SELECT a.fid FROM roads AS a WHERE a.fid % 1000 = 0 AND (SELECT count(*) FROM roads) > 0"
+        reported = []
+        service.submit(db_path, sql).fetch_all(progress_callback=reported.append)
+        assert reported[-1] == 1.0
+
+        # The second run is measured against the recorded cost of the first
+        handle = service.submit(db_path, sql)
+        assert handle._expected_steps and handle._expected_steps > 0
+        handle.fetch_all()
+
+    def test_progress_from_expected_rows(self, service, db_path):
+        handle = service.submit(db_path, "SELECT fid FROM roads", batch_size=2500, expected_rows=10000)
+        seen = [handle.progress for _ in handle.batches()]
+        # Rows handed over so far against the estimate, capped until the end
+        assert 0.25 <= seen[0] <= 0.99
+        assert handle.progress == 1.0
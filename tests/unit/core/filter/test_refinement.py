@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for incremental refinement of narrowing geometric filters.
+
+Module tested: core.filter.refinement
+"""
+import pytest
+
+from core.filter.refinement import (
+    FilterSignature,
+    RefinementEngine,
+    RefinementKind,
+    build_restriction,
+    detect_refinement,
+    split_conjuncts,
+    strip_restriction,
+)
+
+
+class _Runs:
+    """Minimal FidSet stand-in: sorted half-open runs."""
+
+    def __init__(self, *runs):
+        self._runs = list(runs)
+
+    def runs(self):
+        return iter(self._runs)
+
+    def __len__(self):
+        return sum(end - start for start, end in self._runs)
+
+
+def _signature(**kwargs):
+    params = dict(
+        source_filter='"type" = \'road\'',
+        predicates=['ST_Intersects'],
+        buffer_value=100,
+        context=('source_layer', 'postgresql', 'gid'),
+    )
+    params.update(kwargs)
+    return FilterSignature.create(**params)
+
+
+class TestSplitConjuncts:
+    """Top-level AND splitting."""
+
+    @pytest.mark.parametrize("expression,expected", [
+        ('"a" = 1', ('"a" = 1',)),
+        ('("a" = 1) AND  "b" > 2', ('"a" = 1', '"b" > 2')),
+        ('("a" = 1 AND "b" > 2) AND "c" IS NULL', ('"a" = 1', '"b" > 2', '"c" IS NULL')),
+        ('"h" BETWEEN 1 AND 5 AND "a" = 1', ('"h" BETWEEN 1 AND 5', '"a" = 1')),
+        ("\"name\" = 'x AND y' and \"a\" = 1", ("\"name\" = 'x AND y'", '"a" = 1')),
+        ('"a" = 1 OR "b" = 2 AND "c" = 3', ('"a" = 1 OR "b" = 2 AND "c" = 3',)),
+        ('"brand" = 1', ('"brand" = 1',)),
+        ('', ()),
+        (None, ()),
+    ])
+    def test_split(self, expression, expected):
+        assert split_conjuncts(expression) == expected
+
+
+class TestDetectRefinement:
+    """Monotone narrowing rules."""
+
+    def test_and_append(self):
+        decision = detect_refinement(
+            _signature(),
+            _signature(source_filter='"type" = \'road\' AND "lanes" > 2'),
+        )
+        assert decision.kind is RefinementKind.AND_APPEND
+
+    def test_unchanged(self):
+        assert detect_refinement(_signature(), _signature()).kind is RefinementKind.UNCHANGED
+
+    def test_selection_subset(self):
+        decision = detect_refinement(
+            _signature(source_filter=None, source_fids=[1, 2, 3]),
+            _signature(source_filter=None, source_fids=[1, 3]),
+        )
+        assert decision.kind is RefinementKind.SELECTION_SUBSET
+
+    def test_buffer_shrink(self):
+        decision = detect_refinement(_signature(), _signature(buffer_value=50))
+        assert decision.kind is RefinementKind.BUFFER_SHRINK
+        assert detect_refinement(_signature(), _signature(buffer_value=0)).is_refinement
+
+    def test_combined_narrowing(self):
+        decision = detect_refinement(
+            _signature(),
+            _signature(source_filter='"type" = \'road\' AND "lanes" > 2', buffer_value=10),
+        )
+        assert decision.narrowed_by == (RefinementKind.AND_APPEND, RefinementKind.BUFFER_SHRINK)
+
+    @pytest.mark.parametrize("current", [
+        dict(source_filter='"type" = \'rail\''),
+        dict(source_filter='"type" = \'road\' OR "lanes" > 2'),
+        dict(buffer_value=200),
+        dict(predicates=['ST_Intersects', 'ST_Touches']),
+        dict(context=('other_layer', 'postgresql', 'gid')),
+        dict(source_filter=None, source_fids=[1]),
+    ])
+    def test_widening_or_unrelated_changes_run_in_full(self, current):
+        assert detect_refinement(_signature(), _signature(**current)).kind is RefinementKind.FULL
+
+    def test_buffer_shrink_not_monotone_for_contains(self):
+        previous = _signature(predicates=['ST_Contains'])
+        assert not detect_refinement(previous, _signature(predicates=['ST_Contains'], buffer_value=50)).is_refinement
+        # ...but a smaller source set is
+        assert detect_refinement(
+            previous, _signature(predicates=['ST_Contains'], source_filter='"type" = \'road\' AND "x" = 1')
+        ).is_refinement
+
+    def test_disjoint_never_refined(self):
+        previous = _signature(predicates=['ST_Disjoint'])
+        current = _signature(predicates=['ST_Disjoint'], source_filter='"type" = \'road\' AND "x" = 1')
+        assert detect_refinement(previous, current).kind is RefinementKind.FULL
+
+    def test_dynamic_buffer_not_compared(self):
+        previous = _signature(buffer_expression='"width" * 2')
+        current = _signature(buffer_expression='"width" * 2', buffer_value=50)
+        assert detect_refinement(previous, current).kind is RefinementKind.FULL
+
+
+class TestRestriction:
+    """Primary key predicates built from the held result."""
+
+    def test_runs_and_singles(self):
+        restriction = build_restriction("gid", _Runs((1, 100), (200, 201), (300, 302)))
+        assert restriction == '"gid" BETWEEN 1 AND 99 OR "gid" IN (200, 300, 301)'
+
+    def test_single_term_and_empty(self):
+        assert build_restriction("gid", _Runs((5, 6))) == '"gid" IN (5)'
+        assert build_restriction("gid", _Runs()) == "1 = 0"
+
+    def test_strip_restriction_round_trip(self):
+        engine = RefinementEngine()
+        engine.record("layer", _signature(), "s", "gid", _Runs((1, 100), (200, 201)))
+        subset = engine.plan("layer", _signature(), "s").apply("EXISTS (SELECT 1 FROM src AS __source WHERE x)")
+        assert strip_restriction(subset) == "EXISTS (SELECT 1 FROM src AS __source WHERE x)"
+        assert strip_restriction('("a" = 1) AND (b)') == '("a" = 1) AND (b)'
+
+
+class TestRefinementEngine:
+    """Planning against the held result of a layer."""
+
+    def test_plan_restricts_expression(self):
+        engine = RefinementEngine()
+        engine.record("layer", _signature(), "EXISTS (prev)", "gid", _Runs((1, 11)))
+
+        plan = engine.plan("layer", _signature(buffer_value=50), "EXISTS (prev)")
+        assert plan.is_refinement
+        assert plan.apply("EXISTS (new)") == '("gid" BETWEEN 1 AND 10) AND (EXISTS (new))'
+
+    def test_changed_subset_runs_in_full(self):
+        engine = RefinementEngine()
+        engine.record("layer", _signature(), "EXISTS (prev)", "gid", _Runs((1, 11)))
+        plan = engine.plan("layer", _signature(buffer_value=50), "")
+        assert not plan.is_refinement
+        assert plan.apply("EXISTS (new)") == "EXISTS (new)"
+
+    def test_fragmented_result_runs_in_full(self):
+        engine = RefinementEngine(max_terms=2)
+        engine.record("layer", _signature(), "s", "gid", _Runs((1, 2), (3, 4), (5, 6)))
+        assert not engine.plan("layer", _signature(), "s").is_refinement
+
+    def test_bounded_and_forget(self):
+        engine = RefinementEngine(max_layers=1)
+        engine.record("a", _signature(), "s", "gid", _Runs((1, 2)))
+        engine.record("b", _signature(), "s", "gid", _Runs((1, 2)))
+        assert engine.held("a") is None
+        engine.forget("b")
+        assert engine.held("b") is None
+
+    def test_changed_data_version_runs_in_full(self):
+        engine = RefinementEngine()
+        engine.record("layer", _signature(), "s", "gid", _Runs((1, 11)), data_version="s1.0.0")
+        assert engine.plan("layer", _signature(buffer_value=50), "s", "s1.0.0").is_refinement
+
+        plan = engine.plan("layer", _signature(buffer_value=50), "s", "s1.2.0")
+        assert not plan.is_refinement
+        assert engine.held("layer") is None
+
+    def test_data_change_signals_forget_held_result(self):
+        class _Signal:
+            def __init__(self):
+                self.slots = []
+
+            def connect(self, slot):
+                self.slots.append(slot)
+
+            def emit(self, *args):
+                for slot in self.slots:
+                    slot(*args)
+
+        class _Layer:
+            committedGeometriesChanges = _Signal()
+            dataChanged = _Signal()
+            willBeDeleted = _Signal()
+
+            def id(self):
+                return "layer"
+
+        layer = _Layer()
+        engine = RefinementEngine()
+        engine.watch(layer)
+        engine.watch(layer)
+        assert len(layer.dataChanged.slots) == 1
+
+        engine.record("layer", _signature(), "s", "gid", _Runs((1, 2)))
+        layer.committedGeometriesChanges.emit("layer", {1: None})
+        assert engine.held("layer") is None
+
+        engine.record("layer", _signature(), "s", "gid", _Runs((1, 2)))
+        layer.dataChanged.emit()
+        assert engine.held("layer") is None
+
+        # A deleted layer can be watched again under the same id (project reload)
+        layer.willBeDeleted.emit()
+        engine.watch(layer)
+        assert len(layer.dataChanged.slots) == 2
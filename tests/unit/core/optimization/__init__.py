@@ -0,0 +1 @@
+# FilterMate Core Optimization Unit Tests
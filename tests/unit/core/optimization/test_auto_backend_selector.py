@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for backend and strategy recommendation from the learned cost model.
+
+The module uses package-relative imports, so it is imported through an
+alias package rooted at the plugin directory.
+
+Module tested: core.optimization.auto_backend_selector
+"""
+import importlib
+import os
+import sys
+import types
+from unittest.mock import MagicMock
+
+_plugin_dir = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+if "filter_mate_test_pkg" not in sys.modules:
+    _package = types.ModuleType("filter_mate_test_pkg")
+    _package.__path__ = [_plugin_dir]
+    sys.modules["filter_mate_test_pkg"] = _package
+auto_backend_selector = importlib.import_module("filter_mate_test_pkg.core.optimization.auto_backend_selector")
+cost_model = importlib.import_module("filter_mate_test_pkg.core.optimization.cost_model")
+
+AutoBackendSelector = auto_backend_selector.AutoBackendSelector
+AdaptiveCostModel = cost_model.AdaptiveCostModel
+CostFeatures = cost_model.CostFeatures
+
+ALL_BACKENDS = ['postgresql', 'spatialite', 'ogr']
+
+
+def _layer(provider='postgres', count=1000):
+    layer = MagicMock()
+    layer.featureCount.return_value = count
+    layer.providerType.return_value = provider
+    layer.id.return_value = 'layer_1'
+    layer.name.return_value = 'roads'
+    layer.source.return_value = "dbname='gis' table=\"public\".\"roads\""
+    return layer
+
+
+def _train(selector, backend, strategy, per_1k_ms, base_ms, count=12):
+    for i in range(count):
+        n = 1000 * (i + 1)
+        selector.record_performance(
+            backend, 'layer_1', int(base_ms + per_1k_ms * n / 1000.0),
+            features=CostFeatures(n), strategy=strategy, predicate='intersects'
+        )
+
+
+class TestRecommendExecution:
+    """Ranking of learned predictions and cold-start estimates."""
+
+    def test_cold_start_uses_heuristics(self):
+        selector = AutoBackendSelector(AdaptiveCostModel())
+
+        recommendation = selector.recommend_execution(_layer(), {'predicate': 'intersects'}, ALL_BACKENDS)
+
+        assert not recommendation.from_model
+        assert recommendation.backend_type == 'postgresql'
+        assert recommendation.strategy == 'direct'
+
+    def test_predictions_not_ranked_against_heuristic_estimates(self):
+        selector = AutoBackendSelector(AdaptiveCostModel())
+        # Measured PostgreSQL latency far above the OGR constant-based estimate (100 ms)
+        _train(selector, 'postgresql', 'direct', per_1k_ms=50.0, base_ms=400.0)
+
+        recommendation = selector.recommend_execution(_layer(), {'predicate': 'intersects'}, ALL_BACKENDS)
+
+        assert recommendation.from_model
+        assert recommendation.backend_type == 'postgresql'
+        assert recommendation.estimated_time_ms > 400
+        assert recommendation.fallback_backend == 'ogr'
+        assert recommendation.alternatives[-1]['backend'] == 'ogr'
+        assert not recommendation.alternatives[-1]['from_model']
+
+    def test_fastest_prediction_wins(self):
+        selector = AutoBackendSelector(AdaptiveCostModel())
+        _train(selector, 'postgresql', 'direct', per_1k_ms=50.0, base_ms=400.0)
+        _train(selector, 'ogr', 'direct', per_1k_ms=5.0, base_ms=20.0)
+
+        recommendation = selector.recommend_execution(_layer(), {'predicate': 'intersects'}, ALL_BACKENDS)
+
+        assert recommendation.from_model
+        assert recommendation.backend_type == 'ogr'
+        assert recommendation.fallback_backend == 'postgresql'
+
+
+class TestRecordPerformance:
+    """Samples feed both the rolling history and the cost model."""
+
+    def test_features_train_cost_model(self):
+        selector = AutoBackendSelector(AdaptiveCostModel())
+
+        selector.record_performance('spatialite', 'layer_1', 120, features=CostFeatures(5000), predicate='within')
+        selector.record_performance('spatialite', 'layer_1', 80)
+
+        assert selector.cost_model.sample_count == 1
+        assert selector.performance_history['spatialite']['layer_1'] == [120, 80]
+
+    def test_unknown_backend_ignored(self):
+        selector = AutoBackendSelector(AdaptiveCostModel())
+
+        selector.record_performance('memory', 'layer_1', 10, features=CostFeatures(10))
+
+        assert selector.cost_model.sample_count == 0
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the v4.2.0 configuration accessors of the config provider.
+
+PURE PYTHON: the module is loaded from its file because the
+core.optimization package imports the plugin's infrastructure layer.
+
+Module tested: core.optimization.config_provider
+"""
+import importlib.util
+import json
+import os
+
+_root = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+_spec = importlib.util.spec_from_file_location(
+    "filter_mate_test.config_provider", os.path.join(_root, "core", "optimization", "config_provider.py")
+)
+config_provider = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(config_provider)
+
+
+def test_sections_read_from_shipped_config():
+    with open(os.path.join(_root, "config", "config.default.json"), encoding="utf-8") as handle:
+        config = json.load(handle)
+    config["APP"]["OPTIONS"]["QUERY_PROFILER"]["enabled"]["value"] = True
+    config["APP"]["OPTIONS"]["MATERIALIZED_VIEW_CACHE"]["result_store"]["value"] = "pk_table"
+
+    task_parameters = {"config": config}
+    assert config_provider.get_query_profiler_config(task_parameters)["enabled"] is True
+    assert config_provider.get_mv_cache_config(task_parameters)["result_store"] == "pk_table"
+    assert config_provider.get_mv_cache_config(task_parameters)["table_versioning"] == "statistics"
+    assert config_provider.get_tiled_exists_config(task_parameters) == config_provider.DEFAULT_TILED_EXISTS_CONFIG
+
+
+def test_defaults_without_section():
+    assert config_provider.get_query_profiler_config({"config": {"APP": {}}}) == \
+        config_provider.DEFAULT_QUERY_PROFILER_CONFIG
+    legacy = {"config": {"APP": {"SETTINGS": {"QUERY_PROFILER": {"capacity": {"value": 100}}}}}}
+    assert config_provider.get_query_profiler_config(legacy)["capacity"] == 100
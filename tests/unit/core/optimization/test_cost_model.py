@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the adaptive backend cost model and its replay harness.
+
+PURE PYTHON: the module is loaded from its file because the
+core.optimization package imports the plugin's infrastructure layer.
+
+Module tested: core.optimization.cost_model
+"""
+import importlib.util
+import os
+import sys
+
+import pytest
+
+_module_path = os.path.normpath(os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "..", "core", "optimization", "cost_model.py"
+))
+_spec = importlib.util.spec_from_file_location("filter_mate_test.cost_model", _module_path)
+cost_model = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = cost_model
+_spec.loader.exec_module(cost_model)
+
+AdaptiveCostModel = cost_model.AdaptiveCostModel
+CostFeatures = cost_model.CostFeatures
+CostSample = cost_model.CostSample
+
+DAY = 86400.0
+NOW = 1_790_000_000.0
+
+
+class Clock:
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _train(model, backend, strategy, per_1k_ms, base_ms=20.0, count=12, timestamp=NOW, predicate='intersects'):
+    """Record samples following latency = base + per_1k * n/1000 (+/- 2%)."""
+    for i in range(count):
+        n = 1000 * (i + 1) * 5
+        noise = 1.0 + (0.02 if i % 2 else -0.02)
+        model.record(backend, strategy, predicate, CostFeatures(n, vertex_count=100 * (i % 3)),
+                     (base_ms + per_1k_ms * n / 1000.0) * noise, timestamp=timestamp)
+
+
+# =========================================================================
+# Fitting and prediction
+# =========================================================================
+
+class TestPrediction:
+    """Tests for fitting, cold start and intervals."""
+
+    def test_cold_start_predicts_nothing(self):
+        model = AdaptiveCostModel(clock=Clock())
+        _train(model, 'postgresql', 'direct', 2.0, count=3)
+        assert model.predict('postgresql', 'direct', 'intersects', CostFeatures(10000)) is None
+
+    def test_learns_linear_latency_with_interval(self):
+        model = AdaptiveCostModel(clock=Clock())
+        _train(model, 'postgresql', 'direct', 2.0)
+
+        prediction = model.predict('postgresql', 'direct', 'ST_Intersects', CostFeatures(30000, vertex_count=100))
+        assert prediction.latency_ms == pytest.approx(80.0, rel=0.1)
+        assert prediction.lower_ms < prediction.latency_ms < prediction.upper_ms
+        assert not prediction.pooled
+        assert 0.5 <= prediction.confidence <= 0.99
+
+    def test_cold_predicate_uses_pooled_samples(self):
+        model = AdaptiveCostModel(clock=Clock())
+        _train(model, 'spatialite', 'two_phase', 1.0)
+        prediction = model.predict('spatialite', 'two_phase', 'touches', CostFeatures(20000))
+        assert prediction is not None and prediction.pooled
+
+    def test_stale_samples_decay(self):
+        clock = Clock()
+        model = AdaptiveCostModel(clock=clock, half_life_days=7)
+        _train(model, 'ogr', 'direct', 10.0, timestamp=NOW - 120 * DAY)
+        _train(model, 'ogr', 'direct', 1.0, timestamp=NOW)
+
+        prediction = model.predict('ogr', 'direct', 'intersects', CostFeatures(40000))
+        assert prediction.latency_ms == pytest.approx(60.0, rel=0.15)
+
+    def test_rank_orders_warm_candidates(self):
+        model = AdaptiveCostModel(clock=Clock())
+        _train(model, 'postgresql', 'direct', 3.0)
+        _train(model, 'postgresql', 'two_phase', 1.0)
+        ranking = model.rank(
+            [('postgresql', s) for s in cost_model.STRATEGIES], 'intersects', CostFeatures(50000)
+        )
+        assert [p.strategy for p in ranking] == ['two_phase', 'direct']
+
+
+# =========================================================================
+# Persistence
+# =========================================================================
+
+class TestPersistence:
+    """Tests for JSON save/load."""
+
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "model" / "cost.json")
+        model = AdaptiveCostModel(path=path, clock=Clock())
+        _train(model, 'postgresql', 'direct', 2.0)
+        assert model.save() and not model.dirty
+
+        loaded = AdaptiveCostModel(path=path, clock=Clock()).load()
+        assert loaded.sample_count == model.sample_count
+        features = CostFeatures(25000)
+        assert loaded.predict('postgresql', 'direct', 'intersects', features).latency_ms == pytest.approx(
+            model.predict('postgresql', 'direct', 'intersects', features).latency_ms
+        )
+
+    def test_corrupt_file_leaves_model_empty(self, tmp_path):
+        path = tmp_path / "cost.json"
+        path.write_text("{not json")
+        assert AdaptiveCostModel(path=str(path)).load().sample_count == 0
+
+
+# =========================================================================
+# Replay
+# =========================================================================
+
+class TestReplay:
+    """Tests for replay_samples()."""
+
+    def test_scores_predictions_and_choices(self):
+        samples = []
+        for i in range(30):
+            n = 2000 * (i % 10 + 1)
+            features = CostFeatures(n)
+            timestamp = NOW + i * 60
+            samples.append(CostSample('postgresql', 'direct', 'intersects', features, 10 + 3.0 * n / 1000, timestamp))
+            samples.append(CostSample('postgresql', 'two_phase', 'intersects', features, 40 + 1.0 * n / 1000, timestamp + 1))
+
+        report = cost_model.replay_samples(samples)
+        assert report.samples == 60
+        assert report.cold_predictions > 0 and report.predictions > 0
+        assert report.mean_abs_pct_error < 0.05
+        assert report.decisions > 0
+        assert report.optimal_rate > 0.9
+        assert report.to_dict()['regret_ms'] >= 0
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for pg_stats-based selectivity and the reltuples-versioned cache.
+
+PURE PYTHON: the module is loaded from its file because the
+core.optimization package imports the plugin's infrastructure layer.
+
+Module tested: core.optimization.pg_statistics
+"""
+import importlib.util
+import os
+import sys
+
+import pytest
+
+_module_path = os.path.normpath(os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "..", "core", "optimization", "pg_statistics.py"
+))
+_spec = importlib.util.spec_from_file_location("filter_mate_test.pg_statistics", _module_path)
+pg_statistics = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = pg_statistics
+_spec.loader.exec_module(pg_statistics)
+
+PgColumnStatistics = pg_statistics.PgColumnStatistics
+PgTableStatistics = pg_statistics.PgTableStatistics
+PgStatisticsCache = pg_statistics.PgStatisticsCache
+
+
+@pytest.fixture
+def table():
+    """100k rows: a skewed status column and a uniform 0-1000 height column."""
+    return PgTableStatistics(reltuples=100000, columns={
+        'status': PgColumnStatistics(
+            null_frac=0.1,
+            n_distinct=12,
+            most_common_vals=['active', 'closed'],
+            most_common_freqs=[0.6, 0.2],
+        ),
+        'height': PgColumnStatistics(
+            null_frac=0.0,
+            n_distinct=-0.5,
+            histogram_bounds=[str(v) for v in range(0, 1001, 100)],
+        ),
+        'code': PgColumnStatistics(null_frac=0.0, n_distinct=-1.0),
+    })
+
+
+class TestAttributeSelectivity:
+    """Planner rules applied to simple predicates."""
+
+    @pytest.mark.parametrize("expression,expected", [
+        ("\"status\" = 'active'", 0.6),
+        ("status = 'closed'", 0.2),
+        # Not an MCV: the remaining 10% spread over 10 other values
+        ("\"status\" = 'pending'", 0.01),
+        ("\"status\" <> 'active'", 0.3),
+        ("\"status\" IN ('active', 'pending')", 0.61),
+        ("\"status\" NOT IN ('active')", 0.3),
+        ('"status" IS NULL', 0.1),
+        ('"status" IS NOT NULL', 0.9),
+        ('"code" = 42', 1 / 100000),
+    ])
+    def test_equality_and_nulls(self, table, expression, expected):
+        assert table.attribute_selectivity(expression) == pytest.approx(expected, rel=1e-6)
+
+    @pytest.mark.parametrize("expression,expected", [
+        ('"height" < 250', 0.25),
+        ('"height" >= 250', 0.75),
+        ('"height" > 900', 0.1),
+        ('"height" < -5', 0.0),
+        ('"height" <= 5000', 1.0),
+        ('"height" BETWEEN 100 AND 300', 0.2),
+    ])
+    def test_ranges_use_histogram(self, table, expression, expected):
+        assert table.attribute_selectivity(expression) == pytest.approx(expected, abs=1e-6)
+
+    def test_conjunction_keeps_between_intact(self, table):
+        selectivity = table.attribute_selectivity(
+            "(\"status\" = 'closed') AND \"height\" BETWEEN 100 AND 300"
+        )
+        assert selectivity == pytest.approx(0.2 * 0.2)
+
+    @pytest.mark.parametrize("expression", [
+        "\"status\" LIKE 'act%'",
+        "\"status\" = 'a' OR \"status\" = 'b'",
+        '"unknown" = 1',
+        'upper("status") = \'ACTIVE\'',
+    ])
+    def test_unanswerable_predicates_return_none(self, table, expression):
+        assert table.attribute_selectivity(expression) is None
+
+    def test_unanalyzed_table(self):
+        assert not PgTableStatistics(reltuples=-1, columns={}).analyzed
+
+
+class TestCache:
+    """Entries and estimates are dropped when reltuples changes."""
+
+    def test_version_invalidation(self):
+        cache = PgStatisticsCache()
+        key = ('dsn', 'public', 'roads')
+        cache.put(key, 1000.0, 'stats')
+        cache.put_estimate(key, 1000.0, 'explain:x', 0.25)
+
+        assert cache.get(key, 1000.0) == 'stats'
+        assert cache.get_estimate(key, 1000.0, 'explain:x') == 0.25
+        # ANALYZE changed reltuples
+        assert cache.get(key, 1200.0) is None
+        assert cache.get_estimate(key, 1200.0, 'explain:x') is None
+        cache.put_estimate(key, 1200.0, 'explain:x', 0.5)
+        assert cache.get_estimate(key, 1000.0, 'explain:x') == 0.25
+
+    def test_bounded(self):
+        cache = PgStatisticsCache(max_tables=2, max_estimates=1)
+        for name in ('a', 'b', 'c'):
+            cache.put(('dsn', 'public', name), 1.0, name)
+        assert cache.get(('dsn', 'public', 'a'), 1.0) is None
+        cache.put_estimate(('dsn', 'public', 'c'), 1.0, 'e1', 0.1)
+        cache.put_estimate(('dsn', 'public', 'c'), 1.0, 'e2', 0.2)
+        assert cache.get_estimate(('dsn', 'public', 'c'), 1.0, 'e1') is None
+
+
+class TestExplainPlanRows:
+    """Row estimates read from EXPLAIN (FORMAT JSON)."""
+
+    def test_parsed_and_raw_output(self):
+        plan = [{"Plan": {"Node Type": "Seq Scan", "Plan Rows": 1234}}]
+        assert pg_statistics.explain_plan_rows(plan) == 1234.0
+        assert pg_statistics.explain_plan_rows('[{"Plan": {"Plan Rows": 7}}]') == 7.0
+        assert pg_statistics.explain_plan_rows("not json") is None
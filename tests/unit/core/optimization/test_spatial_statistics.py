@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for scanned layer statistics (density grid, vertex histogram,
+column sketches) and their persistence.
+
+PURE PYTHON: the statistics module is loaded from its file because the
+core.optimization package imports the plugin's infrastructure layer.
+
+Module tested: core.optimization.spatial_statistics
+"""
+import importlib.util
+import os
+import random
+import sys
+
+import pytest
+
+_module_path = os.path.normpath(os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "..", "core", "optimization", "spatial_statistics.py"
+))
+_spec = importlib.util.spec_from_file_location("filter_mate_test.spatial_statistics", _module_path)
+spatial_statistics = importlib.util.module_from_spec(_spec)
+sys.modules[_spec.name] = spatial_statistics
+_spec.loader.exec_module(spatial_statistics)
+
+HyperLogLog = spatial_statistics.HyperLogLog
+DensityGrid = spatial_statistics.DensityGrid
+VertexHistogram = spatial_statistics.VertexHistogram
+SpatialStatistics = spatial_statistics.SpatialStatistics
+SpatialStatisticsBuilder = spatial_statistics.SpatialStatisticsBuilder
+SpatialStatisticsStore = spatial_statistics.SpatialStatisticsStore
+
+EXTENT = (0.0, 0.0, 1000.0, 1000.0)
+
+
+def _clustered_boxes(count=20000, seed=7):
+    """90% of small boxes in the lower-left corner, the rest anywhere."""
+    rng = random.Random(seed)
+    boxes = []
+    for i in range(count):
+        if i % 10:
+            x, y = rng.uniform(0, 200), rng.uniform(0, 200)
+        else:
+            x, y = rng.uniform(0, 995), rng.uniform(0, 995)
+        boxes.append((x, y, x + 5.0, y + 5.0))
+    return boxes
+
+
+def _intersecting(boxes, query):
+    return sum(1 for b in boxes if b[0] <= query[2] and b[2] >= query[0] and b[1] <= query[3] and b[3] >= query[1])
+
+
+def _build(boxes, sample_size=None, columns=None, rows=None):
+    names = list(columns or [])
+    builder = SpatialStatisticsBuilder(EXTENT, len(boxes), names, sample_size, rng=random.Random(1))
+    for i, box in enumerate(boxes):
+        builder.add_feature(box, 4 + i % 7, rows[i] if rows else ())
+    return builder.build("sig-1")
+
+
+class TestHyperLogLog:
+    """Tests for the distinct-value sketch."""
+
+    @pytest.mark.parametrize("distinct", [10, 1000, 50000])
+    def test_estimate_within_error(self, distinct):
+        sketch = HyperLogLog()
+        for i in range(distinct * 2):
+            sketch.add(i % distinct)
+        assert sketch.estimate() == pytest.approx(distinct, rel=0.1)
+
+    def test_round_trip(self):
+        sketch = HyperLogLog()
+        for value in ("a", "b", 3, 3.5):
+            sketch.add(value)
+        assert HyperLogLog.from_dict(sketch.to_dict()).estimate() == sketch.estimate()
+
+
+class TestDensityGrid:
+    """Tests for bbox count estimates."""
+
+    @pytest.mark.parametrize("query", [
+        (0, 0, 100, 100),        # dense corner
+        (500, 500, 700, 700),    # sparse area
+        (190, 0, 400, 1000),     # straddles the cluster edge
+    ])
+    def test_estimates_follow_real_density(self, query):
+        boxes = _clustered_boxes()
+        grid = DensityGrid(EXTENT)
+        for box in boxes:
+            grid.add(box)
+        exact = _intersecting(boxes, query)
+        assert grid.estimate(query) == pytest.approx(exact, rel=0.15, abs=30)
+
+    def test_outside_extent_is_empty(self):
+        grid = DensityGrid(EXTENT)
+        grid.add((10, 10, 20, 20))
+        assert grid.estimate((2000, 2000, 3000, 3000)) == 0.0
+
+    def test_uniform_assumption_is_replaced(self):
+        stats = _build(_clustered_boxes())
+        # A quarter of the extent holds ~91% of the features, not 25%
+        assert stats.spatial_selectivity((0, 0, 500, 500)) > 0.85
+        assert stats.spatial_selectivity((500, 500, 1000, 1000)) < 0.05
+
+
+class TestVertexHistogram:
+    """Tests for the reservoir-sampled vertex counts."""
+
+    def test_reservoir_is_bounded_and_unbiased(self):
+        histogram = VertexHistogram(capacity=500, rng=random.Random(3))
+        for i in range(20000):
+            histogram.offer(10 if i < 10000 else 1000)
+        assert len(histogram.sample) == 500
+        assert histogram.seen == 20000
+        # Half of the stream is large: the first features alone would say 10
+        assert 400 < histogram.mean < 610
+        assert set(histogram.buckets()) == {16, 1024}
+
+
+class TestColumnSelectivity:
+    """Tests for column null fractions, distinct estimates and predicates."""
+
+    def _stats(self):
+        rows = [
+            (i % 4 if i % 10 else None, f"id-{i}")
+            for i in range(1000)
+        ]
+        return _build([(0, 0, 1, 1)] * 1000, columns=["category", "code"], rows=rows)
+
+    def test_null_fraction_and_distinct(self):
+        stats = self._stats()
+        category = stats.columns["category"]
+        assert category.null_fraction == pytest.approx(0.1)
+        assert category.distinct(1000) == pytest.approx(4, abs=0.5)
+        assert stats.columns["code"].distinct(1000) == pytest.approx(1000, rel=0.1)
+
+    @pytest.mark.parametrize("expression,expected", [
+        ('"category" = 2', 0.9 / 4),
+        ('"category" <> 2', 0.9 * 3 / 4),
+        ('"category" IN (1, 2)', 0.9 / 2),
+        ('"category" IS NULL', 0.1),
+        ('"Category" IS NOT NULL', 0.9),
+        ("\"code\" = 'id-5'", 1 / 1000),
+        ('"category" = 2 AND "category" IS NOT NULL', 0.9 / 4 * 0.9),
+    ])
+    def test_simple_predicates(self, expression, expected):
+        assert self._stats().attribute_selectivity(expression) == pytest.approx(expected, rel=0.1)
+
+    @pytest.mark.parametrize("expression", ['"category" > 2', 'length("code") = 4', '"missing" = 1'])
+    def test_unsupported_predicates(self, expression):
+        assert self._stats().attribute_selectivity(expression) is None
+
+    def test_sampled_unique_column_scales_to_layer(self):
+        column = spatial_statistics.ColumnStatistics()
+        for i in range(1000):
+            column.add(i)
+        assert column.distinct(100000) == pytest.approx(100000, rel=0.1)
+
+
+class TestStore:
+    """Tests for persistence and signature invalidation."""
+
+    def test_round_trip_and_signature_check(self, tmp_path):
+        path = str(tmp_path / "layer_statistics.json")
+        stats = _build(_clustered_boxes(2000), columns=["v"], rows=[(i % 3,) for i in range(2000)])
+        SpatialStatisticsStore(path).put("layer_1", stats)
+
+        store = SpatialStatisticsStore(path)
+        assert store.get("layer_1", "other-signature") is None
+        loaded = store.get("layer_1", "sig-1")
+        assert loaded.spatial_selectivity((0, 0, 100, 100)) == stats.spatial_selectivity((0, 0, 100, 100))
+        assert loaded.attribute_selectivity('"v" = 1') == stats.attribute_selectivity('"v" = 1')
+        assert loaded.avg_vertices == stats.avg_vertices
+
+        assert store.remove("layer_1") == 1
+        assert SpatialStatisticsStore(path).get("layer_1", "sig-1") is None
@@ -0,0 +1 @@
+# FilterMate Core Strategies Unit Tests
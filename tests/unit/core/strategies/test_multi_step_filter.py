@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the multi-step filter executor.
+
+The module uses package-relative imports, so it is imported through an
+alias package rooted at the plugin directory. The database is a fake
+psycopg2-style connection that records every statement.
+
+Module tested: core.strategies.multi_step_filter
+"""
+import importlib
+import os
+import sys
+import types
+from array import array
+
+import pytest
+
+_plugin_dir = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+if "filter_mate_test_pkg" not in sys.modules:
+    _package = types.ModuleType("filter_mate_test_pkg")
+    _package.__path__ = [_plugin_dir]
+    sys.modules["filter_mate_test_pkg"] = _package
+multi_step_filter = importlib.import_module("filter_mate_test_pkg.core.strategies.multi_step_filter")
+
+FilterStep = multi_step_filter.FilterStep
+FilterStepType = multi_step_filter.FilterStepType
+MultiStepFilterExecutor = multi_step_filter.MultiStepFilterExecutor
+
+
+class FakeCursor:
+    """Cursor that logs statements and answers from the connection's script."""
+
+    def __init__(self, conn, name=None):
+        self.conn = conn
+        self.name = name
+        self.rowcount = -1
+        self.itersize = None
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        statement = " ".join(query.split())
+        self.conn.log.append(statement)
+        if statement.startswith("SELECT reltuples"):
+            self._rows = [(self.conn.reltuples,)]
+        elif statement.startswith("CREATE TEMP TABLE"):
+            if self.conn.fail_temp_tables:
+                raise RuntimeError("cannot execute CREATE TABLE in a read-only transaction")
+            self.rowcount = self.conn.step_counts.pop(0)
+        elif self.name is not None:
+            if self.conn.fail_result:
+                raise RuntimeError("canceling statement due to statement timeout")
+            self._rows = list(self.conn.result_rows)
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchmany(self, size):
+        self.conn.fetch_sizes.append(size)
+        chunk, self._rows = self._rows[:size], self._rows[size:]
+        return chunk
+
+    def close(self):
+        self.conn.closed_cursors.append(self.name)
+
+
+class FakeConnection:
+    """psycopg2-like connection driven by plain attributes."""
+
+    def __init__(self, autocommit=False, server_version=150000):
+        self.autocommit = autocommit
+        self.server_version = server_version
+        self.reltuples = 100000
+        self.step_counts = []
+        self.result_rows = []
+        self.fail_temp_tables = False
+        self.fail_result = False
+        self.log = []
+        self.fetch_sizes = []
+        self.closed_cursors = []
+        self.named_cursors = []
+
+    def cursor(self, name=None, withhold=False):
+        if name is not None:
+            self.named_cursors.append((name, withhold))
+        return FakeCursor(self, name)
+
+    def statements(self, prefix):
+        return [s for s in self.log if s.startswith(prefix)]
+
+
+def _steps(*types_, chunk_size=None):
+    return [
+        FilterStep(step_type=step_type, expression=f"cond_{i}", chunk_size=chunk_size)
+        for i, step_type in enumerate(types_)
+    ]
+
+
+@pytest.fixture
+def conn():
+    return FakeConnection()
+
+
+@pytest.fixture
+def executor(conn):
+    return MultiStepFilterExecutor(conn, schema="public", table="roads", primary_key="gid", chunk_size=2)
+
+
+class TestQueries:
+    """SQL generated for a single step and for a chained plan."""
+
+    def test_step_query_restricted_to_previous_table(self, executor):
+        step = FilterStep(step_type=FilterStepType.ATTRIBUTE_FILTER, expression="status = 'open'")
+
+        query = executor._step_query(step, "fm_ms_abc_0")
+
+        assert query == (
+            'SELECT "gid" AS id FROM "public"."roads" WHERE (status = \'open\') '
+            'AND "gid" IN (SELECT id FROM "fm_ms_abc_0")'
+        )
+
+    def test_step_query_without_previous(self, executor):
+        step = FilterStep(step_type=FilterStepType.BBOX_PREFILTER, expression="geom && box")
+
+        assert "IN (SELECT" not in executor._step_query(step, None)
+
+    def test_step_query_rejects_unknown_type(self, executor):
+        step = FilterStep(step_type=FilterStepType.INDEX_SCAN, expression="true")
+
+        with pytest.raises(ValueError):
+            executor._step_query(step, None)
+
+    def test_chained_query_materialized_on_postgresql_12(self, executor):
+        steps = _steps(FilterStepType.BBOX_PREFILTER, FilterStepType.SPATIAL_PREDICATE)
+
+        query = executor._chained_query(steps, "fm_ms_abc_0")
+
+        assert query.startswith('WITH s0 AS MATERIALIZED (SELECT "gid" AS id')
+        assert 'IN (SELECT id FROM "fm_ms_abc_0")' in query
+        assert ', s1 AS MATERIALIZED (' in query
+        assert 'IN (SELECT id FROM "s0")' in query
+        assert query.endswith("SELECT id FROM s1")
+
+    def test_chained_query_plain_cte_before_postgresql_12(self, conn, executor):
+        conn.server_version = 110000
+
+        query = executor._chained_query(_steps(FilterStepType.BBOX_PREFILTER), None)
+
+        assert "MATERIALIZED" not in query
+        assert query.startswith("WITH s0 AS (SELECT")
+
+
+class TestMaterialize:
+    """Intermediate step tables and their savepoint."""
+
+    def test_creates_indexed_table_inside_savepoint(self, conn, executor):
+        conn.step_counts = [42]
+        executor._run_id = "fm_ms_run"
+
+        assert executor._materialize("SELECT 1 AS id", 0) == ("fm_ms_run_0", 42)
+        assert conn.log == [
+            "SAVEPOINT fm_materialize",
+            'CREATE TEMP TABLE "fm_ms_run_0" AS SELECT 1 AS id',
+            "RELEASE SAVEPOINT fm_materialize",
+            'CREATE INDEX ON "fm_ms_run_0" (id)',
+            'ANALYZE "fm_ms_run_0"',
+        ]
+
+    def test_failure_rolls_back_to_savepoint(self, conn, executor):
+        conn.fail_temp_tables = True
+        executor._run_id = "fm_ms_run"
+
+        assert executor._materialize("SELECT 1 AS id", 0) is None
+        assert conn.log[-1] == "ROLLBACK TO SAVEPOINT fm_materialize"
+        assert not conn.statements("RELEASE")
+
+    def test_no_savepoint_under_autocommit(self, executor):
+        conn = FakeConnection(autocommit=True)
+        conn.step_counts = [3]
+        executor.connection = conn
+        executor._run_id = "fm_ms_run"
+
+        executor._materialize("SELECT 1 AS id", 1)
+
+        assert not conn.statements("SAVEPOINT")
+        assert not conn.statements("RELEASE")
+
+
+class TestStreamIds:
+    """Fetching the final result through a named cursor."""
+
+    def test_integer_keys_packed_into_array(self, conn, executor):
+        conn.result_rows = [(1,), (2,), (3,), (4,), (5,)]
+        executor._run_id = "fm_ms_run"
+
+        ids = executor._stream_ids("SELECT id FROM t")
+
+        assert isinstance(ids, array) and ids.typecode == 'q'
+        assert list(ids) == [1, 2, 3, 4, 5]
+        assert conn.named_cursors == [("fm_ms_run_result", False)]
+        assert conn.fetch_sizes == [2, 2, 2, 2]
+        assert conn.closed_cursors == ["fm_ms_run_result"]
+
+    def test_text_keys_returned_as_list(self, conn, executor):
+        conn.result_rows = [("a",), ("b",)]
+
+        assert executor._stream_ids("SELECT id FROM t") == ["a", "b"]
+
+    def test_step_chunk_size_capped(self, conn, executor):
+        conn.result_rows = [(1,)]
+
+        executor._stream_ids("SELECT id FROM t", fetch_size=10 ** 6)
+
+        assert conn.fetch_sizes[0] == MultiStepFilterExecutor.MAX_CHUNK_SIZE
+
+    def test_cursor_held_under_autocommit(self, executor):
+        conn = FakeConnection(autocommit=True)
+        executor.connection = conn
+        executor._run_id = "fm_ms_run"
+
+        assert list(executor._stream_ids("SELECT id FROM t")) == []
+        assert conn.named_cursors == [("fm_ms_run_result", True)]
+
+
+class TestExecutePlan:
+    """Whole plans: temp tables, CTE fallback, cleanup."""
+
+    def test_intermediate_steps_kept_in_temp_tables(self, conn, executor):
+        conn.step_counts = [500, 40]
+        conn.result_rows = [(7,), (9,), (11,)]
+        steps = _steps(
+            FilterStepType.BBOX_PREFILTER, FilterStepType.ATTRIBUTE_FILTER, FilterStepType.SPATIAL_PREDICATE
+        )
+
+        result = executor.execute_plan(steps)
+
+        assert result.success, result.error
+        assert isinstance(result.feature_ids, array) and result.feature_ids.typecode == 'q'
+        assert list(result.feature_ids) == [7, 9, 11]
+        assert result.feature_count == 3
+        assert result.steps_executed == 3
+        assert [r.candidate_count for r in result.step_results] == [500, 40, 3]
+
+        created = conn.statements("CREATE TEMP TABLE")
+        assert len(created) == 2
+        first, second = (s.split('"')[1] for s in created)
+        assert f'IN (SELECT id FROM "{first}")' in created[1]
+        assert conn.statements("DROP TABLE") == [f'DROP TABLE IF EXISTS "{first}", "{second}"']
+        assert conn.log[-1].startswith("DROP TABLE")
+
+    def test_chains_remaining_steps_when_temp_tables_fail(self, conn, executor):
+        conn.fail_temp_tables = True
+        conn.result_rows = [(3,), (4,)]
+        steps = _steps(
+            FilterStepType.BBOX_PREFILTER, FilterStepType.ATTRIBUTE_FILTER, FilterStepType.SPATIAL_PREDICATE
+        )
+
+        result = executor.execute_plan(steps)
+
+        assert result.success, result.error
+        assert list(result.feature_ids) == [3, 4]
+        assert result.steps_executed == 3
+        assert "ROLLBACK TO SAVEPOINT fm_materialize" in conn.log
+        assert len(conn.statements("CREATE TEMP TABLE")) == 1
+        chained = conn.statements("WITH s0 AS MATERIALIZED")
+        assert len(chained) == 1 and chained[0].endswith("SELECT id FROM s2")
+        assert not conn.statements("DROP TABLE")
+
+    def test_stops_early_when_no_candidates_remain(self, conn, executor):
+        conn.step_counts = [0]
+        steps = _steps(FilterStepType.BBOX_PREFILTER, FilterStepType.SPATIAL_PREDICATE)
+
+        result = executor.execute_plan(steps)
+
+        assert result.success
+        assert result.steps_executed == 1
+        assert isinstance(result.feature_ids, array) and len(result.feature_ids) == 0
+        assert not conn.named_cursors
+        assert len(conn.statements("DROP TABLE")) == 1
+
+    def test_temp_tables_dropped_on_error(self, conn, executor):
+        conn.step_counts = [500]
+        conn.fail_result = True
+        steps = _steps(FilterStepType.BBOX_PREFILTER, FilterStepType.SPATIAL_PREDICATE)
+
+        result = executor.execute_plan(steps)
+
+        assert not result.success
+        assert "statement timeout" in result.error
+        assert len(conn.statements("DROP TABLE")) == 1
+        assert conn.closed_cursors
+
+    def test_progress_reported_per_step(self, conn, executor):
+        conn.step_counts = [10]
+        conn.result_rows = [(1,)]
+        calls = []
+
+        executor.execute_plan(
+            _steps(FilterStepType.ATTRIBUTE_FILTER, FilterStepType.SPATIAL_PREDICATE),
+            progress_callback=lambda name, current, total: calls.append((name, current, total)),
+        )
+
+        assert calls == [("ATTRIBUTE_FILTER", 1, 2), ("SPATIAL_PREDICATE", 2, 2)]
@@ -112,6 +112,7 @@ def _setup_handler_mocks():
         f'{ROOT}.infrastructure.database.prepared_statements': MagicMock(
             create_prepared_statements=MagicMock(return_value=None),
         ),
+        f'{ROOT}.infrastructure.database.sql_utils': MagicMock(),
 
         # config
         f'{ROOT}.config': MagicMock(),
@@ -179,8 +180,10 @@ def _setup_handler_mocks():
     handler_files = [
         'cleanup_handler',
         'export_handler',
+        'filter_batch_planner',
         'geometry_handler',
         'initialization_handler',
+        'layer_registration',
         'source_geometry_preparer',
         'subset_management_handler',
     ]
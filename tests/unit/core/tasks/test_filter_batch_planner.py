@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for FilterBatchPlanner (cross-layer batching by connection).
+
+Layers are mocks; the geometry transport module is replaced with a fake so
+no database is touched.
+
+Module tested: core.tasks.filter_batch_planner
+"""
+import sys
+import types
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+import pytest
+
+import core.tasks.filter_batch_planner as planner_module
+from core.tasks.filter_batch_planner import FilterBatchPlanner
+
+# Provider keys as seen by the module (infrastructure.constants is mocked)
+PG = planner_module.PROVIDER_POSTGRES
+SL = planner_module.PROVIDER_SPATIALITE
+
+
+PG_SOURCE = "dbname='gis' host=db.local port=5432 user='alice' password='secret' sslmode=disable table=\"{schema}\".\"{table}\" (geom)"
+
+
+def _layer(layer_id, source):
+    layer = MagicMock()
+    layer.id.return_value = layer_id
+    layer.name.return_value = layer_id
+    layer.source.return_value = source
+    return layer
+
+
+def _pg(layer_id, schema="public", host="db.local"):
+    source = PG_SOURCE.format(schema=schema, table=layer_id).replace("db.local", host)
+    return _layer(layer_id, source), {'layer_schema': schema}
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    """Fake geometry transport and constants for staging tests."""
+    fake = types.ModuleType('filter_mate.infrastructure.database.geometry_transport')
+    fake.wkt_to_wkb = MagicMock(return_value=b"\x01wkb")
+    fake.local_file_transport_enabled = MagicMock(return_value=True)
+    fake.upload_source_geometry_sqlite = MagicMock(return_value="sqliteid")
+    fake.sqlite_source_geometry_ref = lambda geom_id, srid: f"REF({geom_id},{srid})"
+    fake.upload_source_geometry_postgresql = MagicMock(return_value="pgid")
+    fake.postgresql_source_geometry_ref = lambda schema, geom_id: f"PGREF({schema},{geom_id})"
+    monkeypatch.setitem(sys.modules, fake.__name__, fake)
+
+    constants = sys.modules['filter_mate.infrastructure.constants']
+    monkeypatch.setattr(constants, 'GEOMETRY_TRANSPORT_ENABLED', True, raising=False)
+    monkeypatch.setattr(constants, 'GEOMETRY_TRANSPORT_MIN_WKT_LENGTH', 20, raising=False)
+    return fake
+
+
+# =========================================================================
+# Planning
+# =========================================================================
+
+class TestPlan:
+    """Tests for connection keys and grouping."""
+
+    def test_postgresql_key_ignores_table_schema_and_password(self):
+        layer_a, _ = _pg("roads", schema="public")
+        layer_b, _ = _pg("rivers", schema="hydro")
+        key = FilterBatchPlanner.connection_key(layer_a, PG)
+        assert key == FilterBatchPlanner.connection_key(layer_b, PG)
+        assert "secret" not in key
+        assert "dbname=gis" in key
+
+    def test_geopackage_layers_share_file_key(self):
+        a = _layer("a", "/data/city.gpkg|layername=roads")
+        b = _layer("b", "/data/city.gpkg|layername=parcels")
+        shp = _layer("c", "/data/trees.shp")
+        assert FilterBatchPlanner.connection_key(a, SL) == FilterBatchPlanner.connection_key(b, 'ogr')
+        assert FilterBatchPlanner.connection_key(shp, 'ogr') is None
+
+    def test_plan_groups_by_connection_and_keeps_order(self):
+        roads, rivers, remote = _pg("roads"), _pg("rivers"), _pg("remote", host="other")
+        shp = (_layer("trees", "/data/trees.shp"), {})
+        groups = FilterBatchPlanner().plan({PG: [roads, remote, rivers], 'ogr': [shp]})
+
+        assert [len(g.layers) for g in groups] == [2, 1, 1]
+        assert groups[0].layers == [roads, rivers]
+        assert groups[2].key == "layer:trees"
+
+        ordered = FilterBatchPlanner.ordered_layers(groups)
+        assert ordered[PG] == [roads, rivers, remote]
+
+
+# =========================================================================
+# Source staging
+# =========================================================================
+
+class TestStageSourceGeometry:
+    """Tests for once-per-connection source geometry upload."""
+
+    def test_sqlite_group_uploads_once_and_stamps_layers(self, transport):
+        layers = [(_layer(n, f"/data/city.gpkg|layername={n}"), {}) for n in ("a", "b", "c")]
+        planner = FilterBatchPlanner()
+        groups = planner.plan({SL: layers})
+
+        assert planner.stage_source_geometry(groups, "POLYGON((0 0,1 0,1 1,0 0))", 2154) == 1
+        transport.upload_source_geometry_sqlite.assert_called_once()
+        assert all(props['source_geometry_ref'] == "REF(sqliteid,2154)" for _, props in layers)
+        assert all(props['source_geometry_srid'] == 2154 for _, props in layers)
+
+    def test_single_layer_groups_and_small_wkt_are_not_staged(self, transport):
+        planner = FilterBatchPlanner()
+        single = planner.plan({SL: [(_layer("a", "/data/a.gpkg|layername=a"), {})]})
+        assert planner.stage_source_geometry(single, "POLYGON((0 0,1 0,1 1,0 0))", 2154) == 0
+
+        pair = planner.plan({SL: [(_layer(n, f"/d/b.gpkg|layername={n}"), {}) for n in "ab"]})
+        assert planner.stage_source_geometry(pair, "POINT(1 2)", 2154) == 0
+        transport.upload_source_geometry_sqlite.assert_not_called()
+
+    def test_local_files_not_written_without_opt_in(self, transport):
+        transport.local_file_transport_enabled.return_value = False
+        layers = [(_layer(n, f"/data/city.gpkg|layername={n}"), {}) for n in ("a", "b")]
+        planner = FilterBatchPlanner()
+
+        assert planner.stage_source_geometry(planner.plan({SL: layers}), "POLYGON((0 0,1 0,1 1,0 0))", 2154) == 0
+        transport.upload_source_geometry_sqlite.assert_not_called()
+
+    def test_postgresql_group_uploads_into_temp_schema(self, transport, monkeypatch):
+        pool = types.ModuleType('filter_mate.infrastructure.database.connection_pool')
+
+        @contextmanager
+        def pooled(layer):
+            yield MagicMock(), None
+        pool.pooled_connection_from_layer = pooled
+        monkeypatch.setitem(sys.modules, pool.__name__, pool)
+
+        layers = [_pg("roads", schema="data"), _pg("rivers", schema="hydro")]
+        planner = FilterBatchPlanner()
+        groups = planner.plan({PG: layers})
+
+        # Never staged into a data schema: without a temp schema the layers keep inline WKT
+        assert planner.stage_source_geometry(groups, "POLYGON((0 0,1 0,1 1,0 0))", 2154) == 0
+        transport.upload_source_geometry_postgresql.assert_not_called()
+
+        assert planner.stage_source_geometry(groups, "POLYGON((0 0,1 0,1 1,0 0))", 2154, temp_schema="filter_mate_temp") == 1
+        assert transport.upload_source_geometry_postgresql.call_args.args[1] == "filter_mate_temp"
+        assert all(props['source_geometry_ref'] == "PGREF(filter_mate_temp,pgid)" for _, props in layers)
+
+    def test_stale_reference_is_cleared(self, transport):
+        transport.upload_source_geometry_sqlite.return_value = None
+        props = {'source_geometry_ref': "REF(old,2154)", 'source_geometry_srid': 2154}
+        layers = [(_layer("a", "/d/c.gpkg|layername=a"), props), (_layer("b", "/d/c.gpkg|layername=b"), {})]
+        planner = FilterBatchPlanner()
+
+        assert planner.stage_source_geometry(planner.plan({SL: layers}), "POLYGON((0 0,1 0,1 1,0 0))", 2154) == 0
+        assert 'source_geometry_ref' not in props
+
+
+# =========================================================================
+# Timings
+# =========================================================================
+
+class TestTimedCallback:
+    """Tests for per-group timing instrumentation."""
+
+    def test_records_success_and_failure_per_group(self):
+        roads, rivers = _pg("roads"), _pg("rivers")
+        groups = FilterBatchPlanner().plan({PG: [roads, rivers]})
+        callback = FilterBatchPlanner.timed_filter_callback(
+            groups, lambda provider, layer, props: layer is roads[0]
+        )
+
+        assert callback(PG, *roads) is True
+        assert callback(PG, rivers[0], dict(rivers[1])) is False  # copied props
+
+        summary = FilterBatchPlanner.log_group_timings(groups)[0]
+        assert (summary['succeeded'], summary['failed'], summary['layer_count']) == (1, 1, 2)
+        assert summary['filtering_ms'] >= 0
+
+    def test_exception_counts_as_failure(self):
+        layer = _pg("roads")
+        groups = FilterBatchPlanner().plan({PG: [layer]})
+
+        def boom(provider, lyr, props):
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            FilterBatchPlanner.timed_filter_callback(groups, boom)(PG, *layer)
+        assert groups[0].failed == 1
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the bulk layer registration helpers.
+
+Property persistence runs on an in-memory SQLite database; the PostgreSQL
+catalog query is checked against a fake cursor returning catalog rows.
+
+Module tested: core.tasks.layer_registration
+"""
+import sqlite3
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.tasks.layer_registration import (
+    RegistrationTimings,
+    SpatialIndexQueue,
+    TableCatalog,
+    fetch_geopackage_geometry_columns,
+    fetch_postgresql_catalog,
+    insert_property_rows,
+    run_probes,
+    select_layer_properties,
+)
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    conn.execute(
+        "CREATE TABLE fm_project_layers_properties (id TEXT, _updated_at TEXT, fk_project TEXT, "
+        "layer_id TEXT, meta_type TEXT, meta_key TEXT, meta_value TEXT)"
+    )
+    yield conn
+    conn.close()
+
+
+class TestPropertyPersistence:
+    def test_rows_of_all_layers_in_one_transaction(self, conn):
+        statements = []
+        conn.set_trace_callback(statements.append)
+        rows = [(f"layer_{i}", "infos", "layer_name", f"name {i}") for i in range(300)]
+
+        assert insert_property_rows(conn, "project", rows) == 300
+        assert [s for s in statements if s.startswith(("BEGIN", "COMMIT"))] == ["BEGIN IMMEDIATE", "COMMIT"]
+
+        stored = select_layer_properties(conn, "project", ["layer_0", "layer_299", "missing"])
+        assert stored == {
+            "layer_0": [("infos", "layer_name", "name 0")],
+            "layer_299": [("infos", "layer_name", "name 299")],
+        }
+
+    def test_failed_insert_rolled_back(self, conn):
+        conn.execute("CREATE TRIGGER reject BEFORE INSERT ON fm_project_layers_properties "
+                     "WHEN NEW.meta_key = 'bad' BEGIN SELECT RAISE(ABORT, 'rejected'); END")
+        rows = [("a", "infos", "ok", "1"), ("a", "infos", "bad", "2")]
+        with pytest.raises(sqlite3.IntegrityError):
+            insert_property_rows(conn, "project", rows)
+        assert conn.execute("SELECT count(*) FROM fm_project_layers_properties").fetchone()[0] == 0
+
+    def test_other_projects_ignored(self, conn):
+        insert_property_rows(conn, "other", [("a", "infos", "k", "v")])
+        assert select_layer_properties(conn, "project", ["a"]) == {}
+
+
+class TestPostgresqlCatalog:
+    def test_one_query_for_all_tables(self):
+        cursor = MagicMock()
+        cursor.fetchall.return_value = [
+            ("public", "roads", "r", ["gid"], ["geom"], ["btree:gid", "gist:geom"], True),
+            ("public", "roads_view", "v", [], ["geom"], [], False),
+        ]
+        connexion = MagicMock()
+        connexion.cursor.return_value.__enter__.return_value = cursor
+
+        catalogs = fetch_postgresql_catalog(
+            connexion, [("public", "roads"), ("public", "roads_view"), ("public", "roads")]
+        )
+
+        cursor.execute.assert_called_once()
+        assert cursor.execute.call_args[0][1] == (["public", "public"], ["roads", "roads_view"])
+        roads = catalogs[("public", "roads")]
+        assert roads.primary_key == ["gid"]
+        assert roads.has_spatial_index("geom") and not roads.has_spatial_index("gid")
+        assert not roads.needs_index_setup("geom", "gid")
+        # Views cannot be indexed
+        assert not catalogs[("public", "roads_view")].needs_index_setup("geom", None)
+
+    def test_needs_index_setup(self):
+        catalog = TableCatalog("public", "parcels", geometry_columns=["geom"],
+                               indexes=[("btree", "id")], analyzed=True)
+        assert catalog.needs_index_setup("geom", "id")
+        catalog.indexes.append(("gist", "geom"))
+        assert not catalog.needs_index_setup("geom", "id")
+        assert catalog.needs_index_setup("geom", "code")
+        catalog.analyzed = False
+        assert catalog.needs_index_setup("geom", "id")
+
+
+def test_geopackage_geometry_columns(conn):
+    conn.execute("CREATE TABLE gpkg_geometry_columns (table_name TEXT, column_name TEXT)")
+    conn.execute("INSERT INTO gpkg_geometry_columns VALUES ('Buildings', 'geom'), ('roads', 'the_geom')")
+    assert fetch_geopackage_geometry_columns(conn) == {"buildings": "geom", "roads": "the_geom"}
+
+
+class TestRunProbes:
+    def test_probes_run_concurrently(self):
+        barrier = threading.Barrier(3, timeout=2)
+        results = run_probes({key: (lambda key=key: (barrier.wait(), key)[1]) for key in "abc"})
+        assert results == {"a": "a", "b": "b", "c": "c"}
+
+    def test_failed_probe_maps_to_none(self):
+        def fail():
+            raise RuntimeError("connection refused")
+
+        assert run_probes({"ok": lambda: 1, "ko": fail}) == {"ok": 1, "ko": None}
+
+
+class TestSpatialIndexQueue:
+    def test_jobs_run_in_background_in_order(self):
+        index_queue = SpatialIndexQueue()
+        started = threading.Event()
+        release = threading.Event()
+        ran = []
+
+        def slow():
+            started.set()
+            release.wait(2)
+            ran.append("slow")
+
+        assert index_queue.submit("a", slow)
+        assert index_queue.submit("b", lambda: ran.append("fast"))
+        # Submitting returns at once; a pending key is not queued twice
+        assert started.wait(2)
+        assert not index_queue.submit("b", lambda: ran.append("duplicate"))
+
+        release.set()
+        assert index_queue.wait(2)
+        assert ran == ["slow", "fast"]
+        assert index_queue.get_stats() == {"pending": 0, "completed": 2, "failed": 0}
+
+    def test_failures_counted_and_worker_exits_when_idle(self):
+        index_queue = SpatialIndexQueue(idle_timeout=0.05)
+
+        def fail():
+            raise RuntimeError("permission denied")
+
+        index_queue.submit("a", fail)
+        index_queue.submit("b", lambda: False)
+        assert index_queue.wait(2)
+        assert index_queue.get_stats()["failed"] == 2
+
+        deadline = time.monotonic() + 2
+        while index_queue._worker is not None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert index_queue._worker is None
+        # A new submission starts a new worker
+        assert index_queue.submit("a", lambda: None) and index_queue.wait(2)
+
+
+def test_registration_timings():
+    timings = RegistrationTimings()
+    with timings.phase("existing"):
+        pass
+    with timings.phase("persist"):
+        time.sleep(0.01)
+    with timings.phase("persist"):
+        pass
+
+    phases = timings.as_dict()
+    assert list(phases) == ["existing", "persist"]
+    assert phases["persist"] >= 10
+    assert timings.summary().startswith("existing ")
+    assert timings.total_ms == pytest.approx(sum(phases.values()), abs=0.1)
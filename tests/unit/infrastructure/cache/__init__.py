@@ -0,0 +1 @@
+# FilterMate Cache Infrastructure Unit Tests
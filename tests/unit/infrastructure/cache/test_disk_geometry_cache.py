@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the persistent disk geometry tier and its use by the WKT and
+source geometry caches.
+
+All tests use a temporary directory; GDAL/OGR is not required (WKT falls
+back to UTF-8 payloads when it is missing).
+
+Modules tested:
+    infrastructure.cache.disk_geometry_cache
+    infrastructure.cache.wkt_cache
+    infrastructure.cache.geometry_cache
+    infrastructure.cache.cache_manager
+"""
+import os
+from unittest.mock import MagicMock
+
+import pytest
+
+from infrastructure.cache.disk_geometry_cache import (
+    DiskGeometryCache,
+    FORMAT_WKB,
+    layer_source_fingerprint,
+)
+from infrastructure.cache import wkt_cache
+from infrastructure.cache.wkt_cache import WKTCache
+from infrastructure.cache.geometry_cache import SourceGeometryCache
+from infrastructure.cache.cache_manager import CacheManager
+
+
+WKB_POINT = bytes.fromhex("0101000000000000000000f03f0000000000000040")
+
+
+@pytest.fixture
+def disk(tmp_path):
+    return DiskGeometryCache(str(tmp_path / "geom"), max_bytes=1000, max_age_days=0)
+
+
+# =========================================================================
+# DiskGeometryCache
+# =========================================================================
+
+class TestDiskGeometryCache:
+    """Tests for the on-disk blob store."""
+
+    def test_put_get_roundtrip_is_memory_mapped(self, disk):
+        key = disk.make_key("/data/a.gpkg|layername=a", '"x" > 1', 10.0, "EPSG:2154", "h1")
+        assert disk.put(key, WKB_POINT, "layer_a", "fp1", srid=2154, metadata={'bbox': [0, 0, 1, 2]})
+
+        hit = disk.get(key, "fp1")
+        assert isinstance(hit.wkb, memoryview)
+        assert hit.wkb.tobytes() == WKB_POINT
+        assert hit.srid == 2154
+        assert hit.geometry_format == FORMAT_WKB
+        assert hit.metadata == {'bbox': [0, 0, 1, 2]}
+        hit.close()
+
+    def test_key_depends_on_every_component(self):
+        base = ("src", "subset", 1.0, "EPSG:4326", "h")
+        keys = {DiskGeometryCache.make_key(*base)}
+        for i, changed in enumerate(("src2", "subset2", 2.0, "EPSG:3857", "h2")):
+            parts = list(base)
+            parts[i] = changed
+            keys.add(DiskGeometryCache.make_key(*parts))
+        assert len(keys) == 6
+
+    def test_miss_and_hit_rate(self, disk):
+        assert disk.get("missing") is None
+        disk.put("k", WKB_POINT, "layer")
+        disk.get("k").close()
+        stats = disk.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['entries'] == 1
+        assert stats['total_bytes'] == len(WKB_POINT)
+
+    def test_lru_eviction_respects_size_budget(self, disk):
+        blob = b"x" * 400
+        disk.put("a", blob, "layer")
+        disk.put("b", blob, "layer")
+        disk.get("a").close()  # "b" becomes least recently used
+        disk.put("c", blob, "layer")
+
+        assert disk.get("b") is None
+        assert disk.get("a") is not None
+        assert disk.get("c") is not None
+        assert not os.path.exists(disk._blob_path("b"))
+        assert disk.get_stats()['total_bytes'] <= disk.max_bytes
+
+    def test_rejects_oversized_and_empty_blobs(self, tmp_path):
+        disk = DiskGeometryCache(str(tmp_path), max_bytes=1000, max_entry_bytes=10)
+        assert not disk.put("big", b"x" * 11, "layer")
+        assert not disk.put("empty", b"", "layer")
+        assert len(disk) == 0
+
+    def test_fingerprint_change_invalidates_entry(self, disk):
+        disk.put("k", WKB_POINT, "layer", "fp1")
+        assert disk.get("k", "fp2") is None
+        assert len(disk) == 0
+
+    def test_invalidate_layer_only_stale_fingerprints(self, disk):
+        disk.put("old", WKB_POINT, "layer", "fp1")
+        disk.put("new", WKB_POINT, "layer", "fp2")
+        disk.put("other", WKB_POINT, "other_layer", "fp1")
+
+        assert disk.invalidate_layer("layer", source_fingerprint="fp2") == 1
+        assert disk.get("new") is not None
+        assert disk.invalidate_layer("layer") == 1
+        assert disk.get("other") is not None
+
+    def test_missing_blob_file_is_a_miss(self, disk):
+        disk.put("k", WKB_POINT, "layer")
+        os.remove(disk._blob_path("k"))
+        assert disk.get("k") is None
+        assert len(disk) == 0
+
+    def test_entries_survive_reopen(self, tmp_path):
+        DiskGeometryCache(str(tmp_path)).put("k", WKB_POINT, "layer")
+        hit = DiskGeometryCache(str(tmp_path)).get("k")
+        assert hit.to_bytes() == WKB_POINT
+        hit.close()
+
+    def test_source_fingerprint_tracks_file_changes(self, tmp_path):
+        path = tmp_path / "data.gpkg"
+        path.write_bytes(b"one")
+        layer = MagicMock()
+        layer.source.return_value = f"{path}|layername=data"
+        layer.providerType.return_value = "ogr"
+
+        before = layer_source_fingerprint(layer)
+        path.write_bytes(b"longer content")
+        assert layer_source_fingerprint(layer) != before
+
+    def test_source_fingerprint_hides_credentials(self):
+        layer = MagicMock()
+        layer.providerType.return_value = "postgres"
+        layer.source.return_value = "dbname='gis' host=db user='bob' password='s3cret' table=\"public\".\"roads\""
+        fingerprint = layer_source_fingerprint(layer)
+
+        assert "s3cret" not in fingerprint and "bob" not in fingerprint
+        assert len(fingerprint) == 64
+        layer.source.return_value = "dbname='gis' host=db user='bob' password='rotated' table=\"public\".\"roads\""
+        assert layer_source_fingerprint(layer) == fingerprint
+
+
+# =========================================================================
+# Tiered caches
+# =========================================================================
+
+class TestWKTCacheDiskTier:
+    """Tests for WKTCache backed by the disk tier."""
+
+    def test_disk_hit_after_memory_loss(self, tmp_path):
+        disk = DiskGeometryCache(str(tmp_path))
+        WKTCache(disk_cache=disk).put("layer|buf:5", "POINT (1 2)", 4326, "layer")
+
+        restarted = WKTCache(disk_cache=disk)
+        wkt, srid = restarted.get("layer|buf:5")
+        assert wkt.replace(" ", "") == "POINT(12)"
+        assert srid == 4326
+        assert len(restarted) == 1  # promoted to memory
+
+        stats = restarted.get_stats()
+        assert stats['misses'] == 1
+        assert stats['disk_hits'] == 1
+
+    def test_expired_memory_entry_is_not_served_from_disk(self, tmp_path):
+        disk = DiskGeometryCache(str(tmp_path))
+        cache = WKTCache(disk_cache=disk)
+        cache.put("k", "POINT (1 2)", 4326, "layer")
+        cache._cache["k"].creation_time -= cache.ttl_seconds + 1
+
+        assert cache.get("k") is None
+        assert len(disk) == 0
+
+    def test_expired_disk_entry_is_a_miss_after_restart(self, tmp_path, monkeypatch):
+        disk = DiskGeometryCache(str(tmp_path))
+        WKTCache(disk_cache=disk).put("k", "POINT (1 2)", 4326, "layer")
+
+        restarted = WKTCache(disk_cache=disk)
+        now = wkt_cache.time.time()
+        monkeypatch.setattr(wkt_cache.time, "time", lambda: now + restarted.ttl_seconds + 1)
+        assert restarted.get("k") is None
+        assert len(disk) == 0
+
+    def test_too_long_for_memory_still_persisted(self, tmp_path):
+        cache = WKTCache(max_wkt_length=5, disk_cache=DiskGeometryCache(str(tmp_path)))
+        assert cache.put("k", "POINT (1 2)", 4326, "layer")
+        assert len(cache) == 0
+        assert cache.get("k")[1] == 4326
+
+    def test_invalidate_for_layer_clears_disk(self, tmp_path):
+        disk = DiskGeometryCache(str(tmp_path))
+        cache = WKTCache(disk_cache=disk)
+        cache.put("k", "POINT (1 2)", 4326, "layer")
+        cache.invalidate_for_layer("layer")
+        assert len(disk) == 0
+
+    def test_without_disk_tier_behaviour_unchanged(self):
+        cache = WKTCache(max_wkt_length=5)
+        assert not cache.put("k", "POINT (1 2)", 4326, "layer")
+        assert cache.get("k") is None
+
+
+class TestSourceGeometryCacheDiskTier:
+    """Tests for SourceGeometryCache backed by the disk tier."""
+
+    def test_wkb_restored_zero_copy(self, tmp_path):
+        disk = DiskGeometryCache(str(tmp_path))
+        SourceGeometryCache(disk_cache=disk).put([3, 1], 10.0, "EPSG:2154", WKB_POINT, "layer", "x > 1")
+
+        cached = SourceGeometryCache(disk_cache=disk).get([1, 3], 10.0, "EPSG:2154", "layer", "x > 1")
+        assert isinstance(cached, memoryview)
+        assert cached.tobytes() == WKB_POINT
+
+    def test_dict_with_wkt_restored(self, tmp_path):
+        disk = DiskGeometryCache(str(tmp_path))
+        data = {'wkt': "POINT (1 2)", 'bbox': [1, 2, 1, 2], 'feature_count': 2}
+        SourceGeometryCache(disk_cache=disk).put([1], None, "EPSG:4326", data, "layer")
+
+        cached = SourceGeometryCache(disk_cache=disk).get([1], None, "EPSG:4326", "layer")
+        assert cached['bbox'] == [1, 2, 1, 2]
+        assert cached['feature_count'] == 2
+        assert cached['wkt'].replace(" ", "") == "POINT(12)"
+
+    def test_subset_change_misses(self, tmp_path):
+        disk = DiskGeometryCache(str(tmp_path))
+        SourceGeometryCache(disk_cache=disk).put([1], None, "EPSG:4326", "POINT (1 2)", "layer", "a")
+        assert SourceGeometryCache(disk_cache=disk).get([1], None, "EPSG:4326", "layer", "b") is None
+
+    def test_prepared_geometry_survives_restart(self, tmp_path):
+        source = "/data/roads.gpkg|layername=roads"
+        SourceGeometryCache(disk_cache=DiskGeometryCache(str(tmp_path))).put(
+            [1, 2], 5.0, "EPSG:2154", {'wkt': "POINT (1 2)"}, "layer", "",
+            layer_source=source, source_fingerprint="fp1"
+        )
+
+        # New process: fresh memory tier, same cache directory
+        restarted = SourceGeometryCache(disk_cache=DiskGeometryCache(str(tmp_path)))
+        cached = restarted.get([2, 1], 5.0, "EPSG:2154", "layer", "", layer_source=source, source_fingerprint="fp1")
+        assert cached['wkt'].replace(" ", "") == "POINT(12)"
+        assert restarted.get_stats()['disk_hits'] == 1
+
+        edited = SourceGeometryCache(disk_cache=DiskGeometryCache(str(tmp_path)))
+        assert edited.get([1, 2], 5.0, "EPSG:2154", "layer", "", layer_source=source, source_fingerprint="fp2") is None
+
+    def test_unpersistable_data_stays_in_memory(self, tmp_path):
+        disk = DiskGeometryCache(str(tmp_path))
+        cache = SourceGeometryCache(disk_cache=disk)
+        cache.put([1], None, "EPSG:4326", object(), "layer")
+        assert len(disk) == 0
+        assert len(cache) == 1
+
+
+class TestCacheManagerTierStats:
+    """Tests for per-tier hit rates in CacheManager.get_global_stats()."""
+
+    def setup_method(self):
+        CacheManager.reset_instance()
+
+    def teardown_method(self):
+        CacheManager.reset_instance()
+
+    def test_reports_memory_and_disk_tiers(self, tmp_path):
+        cache = SourceGeometryCache(disk_cache=DiskGeometryCache(str(tmp_path)))
+        manager = CacheManager.get_instance()
+        manager.register_cache("geometry", cache)
+
+        cache.put([1], None, "EPSG:4326", "POINT (1 2)", "layer")
+        cache.get([1], None, "EPSG:4326", "layer")           # memory hit
+        cache.clear()
+        cache.get([1], None, "EPSG:4326", "layer")           # disk hit
+        cache.get([2], None, "EPSG:4326", "layer")           # miss in both
+
+        stats = manager.get_global_stats()
+        assert "geometry" not in stats
+        assert stats["geometry.memory"].hits == 1
+        assert stats["geometry.memory"].misses == 2
+        assert stats["geometry.disk"].hits == 1
+        assert stats["geometry.disk"].hit_rate == pytest.approx(0.5)
+
+    def test_plain_caches_keep_recorded_stats(self):
+        manager = CacheManager.get_instance()
+        manager.register_cache("plain", MagicMock(spec=['clear']))
+        manager.update_stats("plain", hit=True)
+        assert manager.get_global_stats()["plain"].hits == 1
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the compact run-length FID set and its use by the persistent cache.
+
+FidSet tests are PURE PYTHON. The persistent cache tests use a temporary
+SQLite file (no Spatialite extension required).
+
+Modules tested:
+    infrastructure.cache.fid_set
+    infrastructure.cache.spatialite_persistent_cache
+"""
+import sqlite3
+from unittest.mock import MagicMock
+
+import pytest
+
+from infrastructure.cache.fid_set import (
+    FidSet,
+    FidSetDecodeError,
+    CODEC_RAW,
+    CODEC_VARINT,
+)
+from infrastructure.cache import spatialite_persistent_cache as spc
+
+
+# =========================================================================
+# FidSet construction
+# =========================================================================
+
+class TestFidSetConstruction:
+    """Tests for FidSet constructors."""
+
+    def test_from_fids_builds_runs(self):
+        fs = FidSet.from_fids([5, 1, 2, 3, 3, 10, 11])
+        assert list(fs.runs()) == [(1, 4), (5, 6), (10, 12)]
+        assert len(fs) == 6
+        assert fs.run_count == 3
+
+    def test_empty(self):
+        fs = FidSet.from_fids([])
+        assert len(fs) == 0
+        assert not fs
+        assert fs.to_list() == []
+
+    def test_negative_fids(self):
+        fs = FidSet.from_fids([-3, -2, -1, 0, 7])
+        assert fs.to_list() == [-3, -2, -1, 0, 7]
+        assert fs.run_count == 2
+
+    def test_from_ranges_merges_overlaps(self):
+        fs = FidSet.from_ranges([(10, 20), (0, 5), (4, 12), (30, 30)])
+        assert list(fs.runs()) == [(0, 20)]
+
+    def test_from_text_legacy(self):
+        assert FidSet.from_text("3,1,2,,9").to_list() == [1, 2, 3, 9]
+        assert len(FidSet.from_text("")) == 0
+
+    def test_contains(self):
+        fs = FidSet.from_ranges([(0, 10), (20, 30)])
+        assert 0 in fs and 9 in fs and 25 in fs
+        assert 10 not in fs and -1 not in fs and 30 not in fs
+
+
+# =========================================================================
+# Encoding
+# =========================================================================
+
+class TestFidSetEncoding:
+    """Tests for to_blob()/from_blob() round trips."""
+
+    @pytest.mark.parametrize("codec", [CODEC_RAW, CODEC_VARINT, None])
+    def test_round_trip(self, codec):
+        fids = [-5, 0, 1, 2, 100, 101, 102, 5000, 2 ** 40]
+        fs = FidSet.from_fids(fids)
+        decoded = FidSet.from_blob(fs.to_blob(codec))
+        assert decoded == fs
+        assert decoded.to_list() == sorted(fids)
+        assert len(decoded) == len(fids)
+
+    def test_raw_decoding_is_zero_copy(self):
+        blob = FidSet.from_ranges([(0, 10), (20, 30)]).to_blob(CODEC_RAW)
+        decoded = FidSet.from_blob(blob)
+        assert isinstance(decoded._bounds, memoryview)
+
+    def test_contiguous_block_is_tiny(self):
+        fs = FidSet.from_ranges([(0, 5_000_000)])
+        assert len(fs.to_blob()) <= 32
+        assert len(FidSet.from_blob(fs.to_blob())) == 5_000_000
+
+    def test_auto_codec_prefers_varint_when_much_smaller(self):
+        fs = FidSet.from_fids(range(0, 20000, 2))
+        assert len(fs.to_blob()) < len(fs.to_blob(CODEC_RAW)) // 2
+
+    def test_invalid_blob(self):
+        with pytest.raises(FidSetDecodeError):
+            FidSet.from_blob(b"not a fid set blob")
+        with pytest.raises(FidSetDecodeError):
+            FidSet.from_blob(b"xx")
+
+
+# =========================================================================
+# Set algebra
+# =========================================================================
+
+class TestFidSetAlgebra:
+    """Run-based set algebra must match Python set semantics."""
+
+    A = [1, 2, 3, 4, 10, 11, 12, 20, 30, 31]
+    B = [0, 3, 4, 5, 11, 20, 21, 31, 32]
+
+    def test_intersection(self):
+        result = FidSet.from_fids(self.A) & FidSet.from_fids(self.B)
+        assert result.to_set() == set(self.A) & set(self.B)
+
+    def test_union(self):
+        result = FidSet.from_fids(self.A) | FidSet.from_fids(self.B)
+        assert result.to_set() == set(self.A) | set(self.B)
+        # canonical form: adjacent runs are coalesced
+        assert list((FidSet.from_fids([1, 2]) | FidSet.from_fids([3, 4])).runs()) == [(1, 5)]
+
+    def test_difference(self):
+        result = FidSet.from_fids(self.A) - FidSet.from_fids(self.B)
+        assert result.to_set() == set(self.A) - set(self.B)
+        result = FidSet.from_fids(self.B) - FidSet.from_fids(self.A)
+        assert result.to_set() == set(self.B) - set(self.A)
+
+    def test_difference_splits_runs(self):
+        result = FidSet.from_ranges([(0, 100)]) - FidSet.from_ranges([(10, 20), (50, 60)])
+        assert list(result.runs()) == [(0, 10), (20, 50), (60, 100)]
+
+    def test_operands_accept_plain_iterables(self):
+        assert FidSet.from_ranges([(0, 10)]).intersection({3, 4, 42}).to_list() == [3, 4]
+
+    def test_algebra_on_decoded_blobs(self):
+        a = FidSet.from_blob(FidSet.from_ranges([(0, 1_000_000)]).to_blob())
+        b = FidSet.from_blob(FidSet.from_ranges([(500_000, 2_000_000)]).to_blob(CODEC_VARINT))
+        assert list((a & b).runs()) == [(500_000, 1_000_000)]
+
+
+# =========================================================================
+# SpatialitePersistentCache storage
+# =========================================================================
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    db_path = str(tmp_path / spc.CACHE_DB_NAME)
+    monkeypatch.setattr(spc, "_get_cache_db_path", lambda: db_path)
+    spc.SpatialitePersistentCache.reset_instance()
+    instance = spc.SpatialitePersistentCache()
+    yield instance
+    spc.SpatialitePersistentCache.reset_instance()
+
+
+def _layer(layer_id="layer_1"):
+    layer = MagicMock()
+    layer.id.return_value = layer_id
+    layer.name.return_value = "roads"
+    layer.source.return_value = "/tmp/roads.gpkg|layername=roads"  # nosec B108
+    return layer
+
+
+class TestPersistentCacheFidStorage:
+    """Tests for binary FID storage in SpatialitePersistentCache."""
+
+    def test_store_and_get(self, cache):
+        layer = _layer()
+        cache.store_filter_result(layer, list(range(100)) + [500], "POINT(0 0)", ["intersects"])
+        fid_set = cache.get_cached_fid_set(layer, "POINT(0 0)", ["intersects"])
+        assert fid_set.run_count == 2
+        assert cache.get_cached_fids(layer, "POINT(0 0)", ["intersects"]) == set(range(100)) | {500}
+
+    def test_intersect_with_previous_keeps_input_type(self, cache):
+        layer = _layer()
+        cache.store_filter_result(layer, range(0, 1000), "POINT(0 0)", ["intersects"])
+
+        result, step = cache.intersect_with_previous(layer, FidSet.from_ranges([(900, 1100)]), "POINT(0 0)")
+        assert isinstance(result, FidSet)
+        assert list(result.runs()) == [(900, 1000)]
+        assert step == 2
+
+        result, _ = cache.intersect_with_previous(layer, {5, 2000}, "POINT(0 0)")
+        assert result == {5}
+
+    def test_stats_report_runs(self, cache):
+        cache.store_filter_result(_layer(), range(10), "POINT(0 0)", ["intersects"])
+        stats = cache.get_cache_stats()
+        assert stats["total_fids_cached"] == 10
+        assert stats["total_fid_runs"] == 1
+        assert stats["fid_storage_bytes"] > 0
+
+
+class TestPersistentCacheMigration:
+    """Legacy comma-separated rows are converted to blobs on open."""
+
+    def test_legacy_rows_are_migrated(self, tmp_path, monkeypatch):
+        db_path = str(tmp_path / spc.CACHE_DB_NAME)
+        conn = sqlite3.connect(db_path)
+        conn.execute(f'''
+            CREATE TABLE {spc.CACHE_TABLE_NAME} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                layer_id TEXT NOT NULL, layer_source TEXT NOT NULL, layer_name TEXT,
+                cache_key TEXT NOT NULL, fids TEXT NOT NULL, fid_count INTEGER NOT NULL,
+                created_at TEXT NOT NULL, expires_at TEXT NOT NULL,
+                step_number INTEGER DEFAULT 1, source_geom_hash TEXT, predicates TEXT,
+                buffer_value REAL DEFAULT 0, metadata TEXT,
+                UNIQUE(layer_id, cache_key)
+            )
+        ''')
+        conn.execute(
+            f"INSERT INTO {spc.CACHE_TABLE_NAME} (layer_id, layer_source, cache_key, fids, fid_count, "
+            "created_at, expires_at) VALUES ('l', 's', 'k', '1,2,3,7', 4, '2026', '9999')"
+        )
+        conn.commit()
+        conn.close()
+
+        monkeypatch.setattr(spc, "_get_cache_db_path", lambda: db_path)
+        spc.SpatialitePersistentCache.reset_instance()
+        try:
+            spc.SpatialitePersistentCache()
+        finally:
+            spc.SpatialitePersistentCache.reset_instance()
+
+        conn = sqlite3.connect(db_path)
+        fids, blob, run_count = conn.execute(
+            f"SELECT fids, fids_blob, run_count FROM {spc.CACHE_TABLE_NAME}"
+        ).fetchone()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        conn.close()
+
+        assert fids == ""
+        assert run_count == 2
+        assert FidSet.from_blob(blob).to_list() == [1, 2, 3, 7]
+        assert version == spc.CACHE_SCHEMA_VERSION
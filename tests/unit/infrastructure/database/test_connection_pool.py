@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the Spatialite/GeoPackage connection pool.
+
+Pools are created without mod_spatialite (load_spatialite=False) so the
+tests run on a plain SQLite build; extension loading is the only step
+not exercised.
+
+Module tested: infrastructure.database.connection_pool
+"""
+import sqlite3
+import threading
+
+import pytest
+
+from infrastructure.database.connection_pool import (
+    PooledSQLiteConnection,
+    SpatialiteConnectionPool,
+    SpatialitePoolManager,
+)
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = SpatialiteConnectionPool(str(tmp_path / "data.sqlite"), load_spatialite=False)
+    yield pool
+    pool.close_all()
+
+
+def _in_thread(function):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(function()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+class TestSpatialiteConnectionPool:
+    def test_close_returns_connection_for_reuse(self, pool):
+        conn = pool.get_connection()
+        assert isinstance(conn, PooledSQLiteConnection)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        conn.close()
+
+        assert pool.get_connection() is conn
+        stats = pool.get_stats()
+        assert (stats['total_created'], stats['total_reused']) == (1, 1)
+
+    def test_released_connection_rejects_statements(self, pool):
+        conn = pool.get_connection()
+        conn.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+    def test_nested_use_gets_separate_connections(self, pool):
+        outer = pool.get_connection()
+        inner = pool.get_connection()
+        assert inner is not outer
+        inner.close()
+        outer.close()
+        assert pool.get_stats()['pooled_connections'] == 2
+
+    def test_thread_affinity(self, pool):
+        conn = pool.get_connection()
+        conn.close()
+        other = _in_thread(pool.get_connection)
+        assert other is not conn
+        other.close()
+
+    def test_session_state_reset_on_release(self, pool):
+        conn = pool.get_connection()
+        conn.execute("CREATE TABLE roads (fid INTEGER PRIMARY KEY)")
+        conn.execute("CREATE TEMP TABLE scratch (x)")
+        conn.execute("BEGIN")
+        conn.execute("INSERT INTO roads VALUES (1)")
+        conn.row_factory = sqlite3.Row
+        conn.close()
+
+        conn = pool.get_connection()
+        assert conn.row_factory is None
+        assert conn.execute("SELECT count(*) FROM roads").fetchone()[0] == 0
+        assert conn.execute("SELECT count(*) FROM sqlite_temp_master").fetchone()[0] == 0
+        conn.close()
+
+    def test_idle_eviction(self, pool):
+        pool.idle_timeout = 0
+        conn = pool.get_connection()
+        conn.close()
+        pool.evict_idle()
+        stats = pool.get_stats()
+        assert (stats['pooled_connections'], stats['active_connections']) == (0, 0)
+
+    def test_connections_of_exited_threads_evicted(self, pool):
+        def use():
+            pool.get_connection().close()
+            return pool.get_stats()['pooled_connections']
+
+        assert _in_thread(use) == 1
+        pool.evict_idle()
+        assert pool.get_stats()['pooled_connections'] == 0
+
+    def test_closed_pool_closes_connections_on_release(self, pool):
+        conn = pool.get_connection()
+        pool.close_all()
+        conn.close()
+        assert pool.get_stats()['active_connections'] == 0
+        with pytest.raises(sqlite3.ProgrammingError):
+            pool.get_connection()
+
+
+class TestSpatialitePoolManager:
+    def test_one_pool_per_file(self, tmp_path):
+        manager = SpatialitePoolManager()
+        path = str(tmp_path / "a.gpkg")
+        try:
+            first = manager.get_connection(path, load_spatialite=False)
+            first.close()
+            second = manager.get_connection(str(tmp_path / "." / "a.gpkg"), load_spatialite=False)
+            assert second is first
+            second.close()
+        finally:
+            manager.close_pool(path)
+        assert not any(key.startswith(str(tmp_path)) for key in manager.get_all_stats())
+
+    def test_memory_database_not_pooled(self):
+        conn = SpatialitePoolManager().get_connection(":memory:", load_spatialite=False)
+        conn.execute("CREATE TABLE t (x)")
+        conn.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
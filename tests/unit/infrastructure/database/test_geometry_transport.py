@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for binary source geometry transport.
+
+SQLite uploads run against a real temporary database file (plain sqlite3,
+the Spatialite extension is not needed to store WKB). PostgreSQL uploads
+use a mocked psycopg2 connection.
+
+Module tested: infrastructure.database.geometry_transport
+"""
+import sqlite3
+import sys
+from contextlib import contextmanager
+from unittest.mock import MagicMock
+
+import pytest
+
+from infrastructure.constants import GEOMETRY_TRANSPORT_REFS_TABLE, GEOMETRY_TRANSPORT_TABLE
+from infrastructure.database import geometry_transport
+from infrastructure.database.geometry_transport import (
+    REFERENCE_HOLDER,
+    ensure_source_geometries,
+    local_file_transport_enabled,
+    postgresql_source_geometry_ref,
+    postgresql_source_geometry_refs,
+    release_source_geometries,
+    source_geometry_id,
+    sqlite_database_path,
+    sqlite_source_geometry_ref,
+    upload_source_geometry_postgresql,
+    upload_source_geometry_sqlite,
+)
+
+
+WKB_POINT = bytes.fromhex("0101000000000000000000f03f0000000000000040")
+
+
+def _rows(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(
+            f'SELECT geom_id, srid, wkb FROM "{GEOMETRY_TRANSPORT_TABLE}"'
+        ).fetchall()
+
+
+# =========================================================================
+# Identifiers and references
+# =========================================================================
+
+class TestReferences:
+    """Tests for ids and SQL references."""
+
+    def test_id_depends_on_srid_and_content(self):
+        ids = {
+            source_geometry_id(WKB_POINT, 4326),
+            source_geometry_id(WKB_POINT, 2154),
+            source_geometry_id(WKB_POINT + b"\x00", 4326),
+        }
+        assert len(ids) == 3
+        assert len(source_geometry_id(WKB_POINT, 4326)) == 20
+
+    def test_sqlite_reference_decodes_blob(self):
+        ref = sqlite_source_geometry_ref("abc", 2154)
+        assert ref.startswith("GeomFromWKB((SELECT wkb FROM")
+        assert ref.endswith(", 2154)")
+
+    def test_database_path_for_geopackage_only(self):
+        layer = MagicMock()
+        layer.providerType.return_value = "ogr"
+        layer.source.return_value = "/data/a.gpkg|layername=a"
+        assert sqlite_database_path(layer) == "/data/a.gpkg"
+
+        layer.source.return_value = "/data/a.shp"
+        assert sqlite_database_path(layer) is None
+
+        layer.providerType.return_value = "postgres"
+        assert sqlite_database_path(layer) is None
+
+    def test_postgresql_refs_are_parsed_from_subset(self):
+        geom_id = source_geometry_id(WKB_POINT, 2154)
+        subset = f'ST_Intersects("geom", {postgresql_source_geometry_ref("filter_mate_temp", geom_id)}) AND "id" > 3'
+        assert postgresql_source_geometry_refs(subset) == {("filter_mate_temp", geom_id)}
+        assert postgresql_source_geometry_refs('"id" > 3') == set()
+
+
+# =========================================================================
+# SQLite upload
+# =========================================================================
+
+class TestSqliteUpload:
+    """Tests for upload_source_geometry_sqlite()."""
+
+    def test_upload_stores_blob_once(self, tmp_path):
+        db_path = str(tmp_path / "data.gpkg")
+        geom_id = upload_source_geometry_sqlite(db_path, WKB_POINT, 4326)
+        assert upload_source_geometry_sqlite(db_path, WKB_POINT, 4326) == geom_id
+
+        rows = _rows(db_path)
+        assert rows == [(geom_id, 4326, WKB_POINT)]
+
+    def test_old_rows_are_kept(self, tmp_path):
+        # Saved projects and other sessions may still reference them
+        db_path = str(tmp_path / "data.gpkg")
+        old = upload_source_geometry_sqlite(db_path, WKB_POINT, 1)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                f'UPDATE "{GEOMETRY_TRANSPORT_TABLE}" SET created_at = datetime(\'now\', \'-30 days\')'
+            )
+
+        new = upload_source_geometry_sqlite(db_path, WKB_POINT, 3)
+        assert {row[0] for row in _rows(db_path)} == {old, new}
+
+    def test_local_files_off_by_default(self):
+        # User files are only written to on opt-in, and never cleaned up as fm_temp_*
+        assert local_file_transport_enabled() is False
+        assert not GEOMETRY_TRANSPORT_TABLE.startswith("fm_temp_")
+
+    def test_unwritable_database_returns_none(self, tmp_path):
+        assert upload_source_geometry_sqlite(str(tmp_path / "missing" / "x.gpkg"), WKB_POINT, 4326) is None
+
+
+# =========================================================================
+# PostgreSQL upload
+# =========================================================================
+
+class TestPostgresqlUpload:
+    """Tests for upload_source_geometry_postgresql()."""
+
+    def _connexion(self, existing=None):
+        connexion = MagicMock()
+        connexion.dsn = f"dbname=test_{id(connexion)}"
+        cursor = connexion.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = existing
+        return connexion, cursor
+
+    def test_wkb_is_bound_not_inlined(self):
+        connexion, cursor = self._connexion()
+        geom_id = upload_source_geometry_postgresql(connexion, "public", WKB_POINT, 2154)
+
+        assert geom_id == source_geometry_id(WKB_POINT, 2154)
+        insert = [c for c in cursor.execute.call_args_list if f'"{GEOMETRY_TRANSPORT_TABLE}" (' in c.args[0] and "INSERT" in c.args[0]]
+        assert len(insert) == 1
+        sql, params = insert[0].args
+        assert "ST_GeomFromWKB(%s, %s)" in sql
+        assert WKB_POINT in params
+        assert WKB_POINT.hex() not in sql
+        connexion.commit.assert_called_once()
+
+    def test_existing_geometry_is_not_resent(self):
+        connexion, cursor = self._connexion(existing=(1,))
+        assert upload_source_geometry_postgresql(connexion, "public", WKB_POINT, 2154)
+        inserts = [c.args for c in cursor.execute.call_args_list if "INSERT" in c.args[0]]
+        # Only this instance's reference is recorded
+        assert len(inserts) == 1
+        assert GEOMETRY_TRANSPORT_REFS_TABLE in inserts[0][0]
+        assert inserts[0][1] == (source_geometry_id(WKB_POINT, 2154), REFERENCE_HOLDER)
+
+    def test_tables_go_to_the_given_schema(self):
+        connexion, cursor = self._connexion()
+        upload_source_geometry_postgresql(connexion, "filter_mate_temp", WKB_POINT, 2154)
+        statements = [c.args[0] for c in cursor.execute.call_args_list]
+        assert statements[0] == 'CREATE SCHEMA IF NOT EXISTS "filter_mate_temp"'
+        assert all('"filter_mate_temp".' in sql for sql in statements[1:] if "TABLE" in sql)
+
+    def test_failure_rolls_back_and_returns_none(self):
+        connexion, cursor = self._connexion()
+        cursor.execute.side_effect = RuntimeError("permission denied")
+
+        assert upload_source_geometry_postgresql(connexion, "public", WKB_POINT, 2154) is None
+        connexion.rollback.assert_called_once()
+
+
+# =========================================================================
+# PostgreSQL release
+# =========================================================================
+
+class _Layer:
+    def __init__(self, layer_id, subset=""):
+        self._id = layer_id
+        self._subset = subset
+
+    def id(self):
+        return self._id
+
+    def subsetString(self):
+        return self._subset
+
+
+class TestPostgresqlRelease:
+    """Tests for release_source_geometries() and ensure_source_geometries()."""
+
+    @pytest.fixture
+    def env(self, monkeypatch):
+        connexion = MagicMock()
+        connexion.dsn = f"dbname=test_{id(connexion)}"
+        cursor = connexion.cursor.return_value.__enter__.return_value
+        cursor.fetchone.return_value = None
+        cursor.rowcount = 1
+
+        @contextmanager
+        def pooled(layer):
+            yield connexion, None
+
+        monkeypatch.setattr("infrastructure.database.connection_pool.pooled_connection_from_layer", pooled)
+        layers = {}
+        project = MagicMock()
+        project.mapLayers.return_value = layers
+        monkeypatch.setattr(sys.modules["qgis.core"], "QgsProject", MagicMock(instance=lambda: project))
+        monkeypatch.setattr(geometry_transport, "_uploaded", type(geometry_transport._uploaded)())
+        monkeypatch.setattr(geometry_transport, "_uploaded_bytes", 0)
+
+        geom_id = upload_source_geometry_postgresql(connexion, "filter_mate_temp", WKB_POINT, 2154)
+        subset = f'ST_Intersects("geom", {postgresql_source_geometry_ref("filter_mate_temp", geom_id)})'
+        cursor.execute.reset_mock()
+        return connexion, cursor, layers, subset
+
+    def _deletes(self, cursor):
+        return [c.args for c in cursor.execute.call_args_list if c.args[0].startswith("DELETE")]
+
+    def test_unreferenced_geometry_is_released(self, env):
+        connexion, cursor, layers, subset = env
+        layers["a"] = _Layer("a", '"id" > 3')
+
+        assert release_source_geometries(_Layer("a"), subset) == 1
+        refs_delete, geoms_delete = self._deletes(cursor)
+        assert GEOMETRY_TRANSPORT_REFS_TABLE in refs_delete[0]
+        assert refs_delete[1][0] == REFERENCE_HOLDER
+        # Rows still referenced by another QGIS instance are kept
+        assert "NOT EXISTS" in geoms_delete[0]
+
+    def test_geometry_used_by_another_layer_is_kept(self, env):
+        connexion, cursor, layers, subset = env
+        layers["a"] = _Layer("a", "")
+        layers["b"] = _Layer("b", subset)
+
+        assert release_source_geometries(_Layer("a"), subset) == 0
+        assert self._deletes(cursor) == []
+
+        # Unless that layer is being removed too
+        assert release_source_geometries(_Layer("a"), subset, removed_layer_ids=["b"]) == 1
+
+    def test_released_geometry_is_reuploaded_on_undo(self, env):
+        connexion, cursor, layers, subset = env
+        release_source_geometries(_Layer("a"), subset)
+        cursor.execute.reset_mock()
+
+        assert ensure_source_geometries(_Layer("a"), subset) == 1
+        insert = [c.args for c in cursor.execute.call_args_list if c.args[0].startswith("INSERT") and WKB_POINT in c.args[1]]
+        assert len(insert) == 1
+
+    def test_subset_without_transport_is_ignored(self, env):
+        connexion, cursor, layers, subset = env
+        assert release_source_geometries(_Layer("a"), '"id" > 3') == 0
+        assert ensure_source_geometries(_Layer("a"), '"id" > 3') == 0
+        cursor.execute.assert_not_called()
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the slow-query profiler.
+
+The ring buffer and Spatialite plans use real SQLite databases in tmp_path;
+PostgreSQL is a fake connection returning canned EXPLAIN JSON plans.
+
+Module tested: infrastructure.database.query_profiler
+"""
+import csv
+import json
+import sqlite3
+
+import pytest
+
+from infrastructure.database.query_profiler import (
+    QueryProfiler,
+    QueryRecord,
+    analyze_postgresql_plan,
+    analyze_spatialite_plan,
+    explainable_query,
+)
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    profiler = QueryProfiler(db_path=str(tmp_path / "profile.db"), enabled=True, explain_threshold_ms=0)
+    yield profiler
+    profiler.close()
+
+
+def seq_scan(relation, rows, removed=0, filter_sql=""):
+    return {"Node Type": "Seq Scan", "Relation Name": relation, "Plan Rows": rows,
+            "Actual Rows": rows, "Actual Loops": 1, "Rows Removed by Filter": removed, "Filter": filter_sql}
+
+
+class FakePgConnection:
+    autocommit = False
+
+    def __init__(self, plan, fail=False, autocommit=False):
+        self.plan = plan
+        self.fail = fail
+        self.autocommit = autocommit
+        self.executed = []
+
+    def cursor(self):
+        return FakePgCursor(self)
+
+
+class FakePgCursor:
+    rowcount = 42
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.connection.executed.append(sql)
+        if sql.startswith("EXPLAIN") and self.connection.fail:
+            raise RuntimeError("permission denied")
+
+    def fetchone(self):
+        return (json.dumps(self.connection.plan),)
+
+
+class TestExplainableQuery:
+    def test_select_body_of_create_as(self):
+        assert explainable_query("SELECT 1;") == "SELECT 1"
+        assert explainable_query(
+            'CREATE MATERIALIZED VIEW IF NOT EXISTS "s"."mv" AS SELECT * FROM t WHERE a = 1 WITH DATA;'
+        ) == "SELECT * FROM t WHERE a = 1"
+        assert explainable_query('CREATE INDEX ON "s"."mv" USING GIST (geom)') is None
+        assert explainable_query('ANALYZE "s"."mv"') is None
+
+
+class TestPostgresqlPlan:
+    def test_large_seq_scan_with_spatial_filter(self):
+        plan = [{"Plan": seq_scan("parcels", 20, removed=400000, filter_sql="st_intersects(geom, '0103...'::geometry)")}]
+        assert analyze_postgresql_plan(plan) == ["seq_scan:parcels", "no_spatial_index:parcels"]
+
+    def test_small_seq_scan_not_flagged(self):
+        assert analyze_postgresql_plan([{"Plan": seq_scan("lookup", 50)}]) == []
+
+    def test_nested_loop_blowup(self):
+        index_scan = {"Node Type": "Index Scan", "Relation Name": "roads", "Actual Rows": 5, "Actual Loops": 200000}
+        loop = {"Node Type": "Nested Loop", "Plan Rows": 10, "Actual Rows": 1000000, "Actual Loops": 1,
+                "Plans": [seq_scan("zones", 10), index_scan]}
+        assert analyze_postgresql_plan([{"Plan": loop}]) == ["nested_loop_blowup"]
+
+    def test_slow_statement_explained_in_savepoint(self, profiler):
+        connexion = FakePgConnection([{"Plan": seq_scan("roads", 500000)}])
+        with connexion.cursor() as cursor:
+            profiler.execute("postgresql", cursor, 'CREATE MATERIALIZED VIEW "s"."mv" AS SELECT * FROM roads WITH DATA',
+                             layer="roads")
+        assert connexion.executed[1:] == [
+            "SAVEPOINT fm_query_profile",
+            "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) SELECT * FROM roads",
+            "ROLLBACK TO SAVEPOINT fm_query_profile",
+            "RELEASE SAVEPOINT fm_query_profile",
+        ]
+        record, = profiler.records()
+        assert (record.layer, record.row_count, record.flags) == ("roads", 42, ["seq_scan:roads"])
+        assert record.plan[0]["Plan"]["Relation Name"] == "roads"
+
+    def test_failed_explain_rolled_back(self, profiler):
+        connexion = FakePgConnection(None, fail=True)
+        with connexion.cursor() as cursor:
+            profiler.execute("postgresql", cursor, "SELECT * FROM roads")
+        assert connexion.executed[-2:] == [
+            "ROLLBACK TO SAVEPOINT fm_query_profile",
+            "RELEASE SAVEPOINT fm_query_profile",
+        ]
+        assert profiler.records()[0].plan is None
+
+    def test_autocommit_explain_in_rolled_back_transaction(self, profiler):
+        connexion = FakePgConnection([{"Plan": seq_scan("roads", 10)}], autocommit=True)
+        with connexion.cursor() as cursor:
+            profiler.execute("postgresql", cursor, "SELECT * FROM roads")
+        assert connexion.executed[1:] == [
+            "BEGIN",
+            "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) SELECT * FROM roads",
+            "ROLLBACK",
+        ]
+        assert profiler.records()[0].plan is not None
+
+    def test_disabled_only_executes(self, tmp_path):
+        profiler = QueryProfiler(db_path=str(tmp_path / "profile.db"))
+        connexion = FakePgConnection(None)
+        with connexion.cursor() as cursor:
+            profiler.execute("postgresql", cursor, "SELECT 1")
+        assert connexion.executed == ["SELECT 1"]
+        assert not (tmp_path / "profile.db").exists()
+
+
+class TestSpatialitePlan:
+    @pytest.fixture
+    def conn(self):
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE roads (fid INTEGER PRIMARY KEY, kind TEXT, geom BLOB)")
+        conn.execute("CREATE TABLE zones (fid INTEGER PRIMARY KEY, geom BLOB)")
+        yield conn
+        conn.close()
+
+    def test_unindexed_join_flagged(self, conn, profiler):
+        sql = "SELECT roads.fid FROM roads, zones WHERE length(roads.geom) < length(zones.geom)"
+        record = profiler.record_spatialite(conn, sql, 1200.0, 3, layer="roads")
+        assert record.flags == ["seq_scan:roads", "seq_scan:zones", "nested_loop_blowup"]
+        assert any("SCAN" in str(row[-1]) for row in record.plan)
+
+    def test_spatial_predicate_without_index(self):
+        plan = [(2, 0, 0, "SCAN roads")]
+        sql = "SELECT fid FROM roads WHERE ST_Intersects(geom, GeomFromText('POINT(0 0)'))"
+        assert analyze_spatialite_plan(plan, sql) == ["seq_scan:roads", "no_spatial_index:roads"]
+        indexed = sql + " AND fid IN (SELECT pkid FROM idx_roads_geom WHERE xmin <= 0)"
+        assert "no_spatial_index:roads" not in analyze_spatialite_plan(plan, indexed)
+        assert analyze_spatialite_plan([(2, 0, 0, "SEARCH roads USING INTEGER PRIMARY KEY (rowid=?)")], sql) == []
+
+
+class TestRingBuffer:
+    def test_oldest_trimmed(self, profiler):
+        profiler.configure(capacity=3)
+        for i in range(5):
+            profiler.record(QueryRecord("spatialite", f"SELECT {i}", float(i)))
+        assert [r.statement for r in profiler.records()] == ["SELECT 4", "SELECT 3", "SELECT 2"]
+        assert profiler.get_stats()["records"] == 3
+
+    def test_query_api(self, profiler):
+        profiler.record(QueryRecord("postgresql", "SELECT a", 900.0, layer="roads", flags=["seq_scan:roads"]))
+        profiler.record(QueryRecord("postgresql", "SELECT b", 50.0, layer="roads"))
+        profiler.record(QueryRecord("spatialite", "SELECT c", 3000.0, layer="zones", flags=["nested_loop_blowup"]))
+
+        assert [r.statement for r in profiler.slowest(2)] == ["SELECT c", "SELECT a"]
+        assert [r.statement for r in profiler.records(backend="postgresql", min_wall_ms=100)] == ["SELECT a"]
+        assert [r.statement for r in profiler.records(layer="roads", flagged_only=True)] == ["SELECT a"]
+        assert [r.statement for r in profiler.records(flag="seq_scan")] == ["SELECT a"]
+        assert profiler.records(flag="seq_scan:zones") == []
+        assert profiler.flag_counts() == {"seq_scan": 1, "nested_loop_blowup": 1}
+        profiler.clear()
+        assert profiler.records() == []
+
+    def test_export(self, profiler, tmp_path):
+        profiler.record(QueryRecord("postgresql", "SELECT a", 900.0, 12, "roads", [{"Plan": {}}], ["seq_scan:roads"]))
+        profiler.record(QueryRecord("spatialite", "SELECT b", 10.0))
+
+        assert profiler.export(str(tmp_path / "profile.csv")) == 2
+        with open(tmp_path / "profile.csv", newline="", encoding="utf-8") as handle:
+            rows = list(csv.DictReader(handle))
+        assert [row["statement"] for row in rows] == ["SELECT a", "SELECT b"]
+        assert rows[0]["flags"] == "seq_scan:roads" and json.loads(rows[0]["plan"]) == [{"Plan": {}}]
+
+        assert profiler.export(str(tmp_path / "profile.json"), backend="spatialite") == 1
+        exported, = json.loads((tmp_path / "profile.json").read_text(encoding="utf-8"))
+        assert exported["statement"] == "SELECT b" and exported["flags"] == []
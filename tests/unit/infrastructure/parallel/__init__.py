@@ -0,0 +1 @@
+# FilterMate Parallel Infrastructure Unit Tests
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the OGR process pool and its precomputed FID registry.
+
+Registry, URI parsing and fallback tests are PURE PYTHON. The spawn tests
+start real worker processes. Worker tests need the GDAL Python bindings and
+are skipped without them.
+
+Module tested: infrastructure.parallel.ogr_process_pool
+"""
+import sys
+from array import array
+from unittest.mock import MagicMock
+
+import pytest
+
+from infrastructure.parallel import ogr_process_pool as pool_module
+from infrastructure.parallel.ogr_process_pool import (
+    OgrFidJob,
+    OgrFidResult,
+    OgrProcessPool,
+    clear_precomputed_fids,
+    evaluate_ogr_fid_job,
+    ogr_layer_location,
+    publish_precomputed_fids,
+    take_precomputed_fids,
+)
+from infrastructure.parallel.parallel_executor import ParallelFilterExecutor
+
+
+def _job(layer_id="roads", predicates=(0,), subset="", source="src"):
+    return OgrFidJob(
+        layer_id=layer_id, data_source="/data/city.gpkg", layer_name=layer_id,
+        predicates=predicates, source_wkbs=(), attribute_filter=subset, source_key=source,
+    )
+
+
+def _result(layer_id, fids):
+    return OgrFidResult(layer_id, fids=array('q', fids).tobytes(), count=len(fids))
+
+
+@pytest.fixture(autouse=True)
+def _empty_registry():
+    clear_precomputed_fids()
+    yield
+    clear_precomputed_fids()
+
+
+# =========================================================================
+# Jobs and results
+# =========================================================================
+
+class TestJobsAndResults:
+    """Tests for URI parsing and FID encoding."""
+
+    def test_layer_location(self):
+        assert ogr_layer_location("/d/city.gpkg|layername=roads") == ("/d/city.gpkg", "roads", 0)
+        assert ogr_layer_location("/d/multi.gml|layerid=2|subset=x") == ("/d/multi.gml", None, 2)
+        assert ogr_layer_location("/d/trees.shp") == ("/d/trees.shp", None, 0)
+
+    def test_fid_array_round_trip(self):
+        result = _result("roads", [3, 1, 2**40])
+        assert result.success
+        assert result.fid_set() == frozenset({1, 3, 2**40})
+
+
+# =========================================================================
+# Precomputed registry
+# =========================================================================
+
+class TestPrecomputedRegistry:
+    """Tests for publish/take semantics."""
+
+    def test_matching_request_takes_fids_once(self):
+        published = publish_precomputed_fids(
+            [_job(predicates=(0, 6), subset='"type" = 1')], {"roads": _result("roads", [1, 2])}
+        )
+        assert published == 1
+        assert take_precomputed_fids("roads", "src", [6, 0], '"type" = 1') == frozenset({1, 2})
+        assert take_precomputed_fids("roads", "src", [6, 0], '"type" = 1') is None
+
+    @pytest.mark.parametrize("source, predicates, subset", [
+        ("other", [0], ""),
+        ("src", [0, 2], ""),
+        ("src", [0], '"type" = 2'),
+    ])
+    def test_mismatched_request_is_ignored(self, source, predicates, subset):
+        publish_precomputed_fids([_job()], {"roads": _result("roads", [1])})
+        assert take_precomputed_fids("roads", source, predicates, subset) is None
+
+    def test_failed_results_are_not_published(self):
+        results = {"roads": OgrFidResult("roads", error="Cannot open")}
+        assert publish_precomputed_fids([_job(), _job("rivers")], results) == 0
+        assert take_precomputed_fids("roads", "src", [0], "") is None
+
+
+# =========================================================================
+# Pool and executor integration
+# =========================================================================
+
+class TestPoolFallback:
+    """Tests for the in-process fallback paths."""
+
+    def test_no_interpreter_returns_empty(self, monkeypatch):
+        monkeypatch.setattr(pool_module, '_python_executable', lambda: None)
+        assert OgrProcessPool(2).evaluate([_job()]) == {}
+        assert OgrProcessPool(2).evaluate([]) == {}
+
+    def test_executor_publishes_then_clears(self, monkeypatch):
+        seen = {}
+
+        def fake_evaluate(self, jobs, cancel_check=None):
+            return {job.layer_id: _result(job.layer_id, [7]) for job in jobs}
+
+        def fake_sequential(layers, filter_func, progress_callback, cancel_check):
+            seen['roads'] = take_precomputed_fids("roads", "src", [0], "")
+            return []
+
+        monkeypatch.setattr(OgrProcessPool, 'evaluate', fake_evaluate)
+        executor = ParallelFilterExecutor(max_workers=2, ogr_process_workers=2)
+        monkeypatch.setattr(executor, '_filter_sequential', fake_sequential)
+
+        layers = [(MagicMock(), {}), (MagicMock(), {}), (MagicMock(), {})]
+        jobs = iter([_job("roads"), _job("rivers"), None])
+        executor._filter_sequential_with_ogr_pool(layers, None, None, None, lambda layer: next(jobs))
+
+        assert seen['roads'] == frozenset({7})
+        assert take_precomputed_fids("rivers", "src", [0], "") is None  # cleared after the pass
+
+
+class TestSpawnedWorkers:
+    """Workers are real spawned processes that never import the plugin package."""
+
+    def test_worker_is_a_top_level_module(self):
+        assert evaluate_ogr_fid_job.__module__ == "filtermate_ogr_fid_worker"
+        assert OgrFidJob.__module__ == OgrFidResult.__module__ == "filtermate_ogr_fid_worker"
+
+    def test_spawned_worker_reports_back(self, tmp_path):
+        # Importing the plugin package needs PyQt5/QGIS, which the bare
+        # child interpreter does not have: a result only comes back if
+        # unpickling the job stayed outside the package.
+        job = OgrFidJob(
+            layer_id="roads", data_source=str(tmp_path / "missing.gpkg"), layer_name="roads",
+            predicates=(2,), source_wkbs=(),
+        )
+        results = OgrProcessPool(max_workers=1).evaluate([job])
+
+        assert set(results) == {"roads"}
+        assert results["roads"].error  # missing file, or no GDAL bindings in the child
+
+
+# =========================================================================
+# Worker source index (pure Python)
+# =========================================================================
+
+class TestSTRtree:
+    """The worker's STR tree returns exactly the overlapping envelopes."""
+
+    def test_matches_brute_force(self):
+        import random
+        worker = sys.modules[evaluate_ogr_fid_job.__module__]
+        rng = random.Random(7)
+
+        def envelope():
+            x, y = rng.uniform(0, 1000), rng.uniform(0, 1000)
+            return (x, x + rng.uniform(0, 30), y, y + rng.uniform(0, 30))
+
+        envelopes = [envelope() for _ in range(2000)]
+        tree = worker.STRtree(envelopes)
+        for _ in range(200):
+            query = envelope()
+            expected = {i for i, e in enumerate(envelopes) if worker._envelope_overlaps(query, e)}
+            assert set(tree.query(query)) == expected
+
+    def test_empty_and_small(self):
+        worker = sys.modules[evaluate_ogr_fid_job.__module__]
+        assert worker.STRtree([]).query((0, 1, 0, 1)) == []
+        assert worker.STRtree([(0, 1, 0, 1), (5, 6, 5, 6)]).query((0.5, 2, 0.5, 2)) == [0]
+
+
+# =========================================================================
+# Worker (GDAL)
+# =========================================================================
+
+class TestWorker:
+    """Tests for evaluate_ogr_fid_job() against a real GeoPackage."""
+
+    @pytest.fixture
+    def gpkg(self, tmp_path):
+        ogr = pytest.importorskip("osgeo.ogr")
+        path = str(tmp_path / "grid.gpkg")
+        datasource = ogr.GetDriverByName("GPKG").CreateDataSource(path)
+        layer = datasource.CreateLayer("cells", geom_type=ogr.wkbPolygon)
+        layer.CreateField(ogr.FieldDefn("kind", ogr.OFTInteger))
+        for i in range(10):
+            feature = ogr.Feature(layer.GetLayerDefn())
+            feature.SetField("kind", i % 2)
+            feature.SetGeometry(ogr.CreateGeometryFromWkt(
+                f"POLYGON(({i} 0,{i + 1} 0,{i + 1} 1,{i} 1,{i} 0))"))
+            layer.CreateFeature(feature)
+        datasource = None
+        return path, ogr
+
+    def _source(self, ogr, wkt):
+        return (bytes(ogr.CreateGeometryFromWkt(wkt).ExportToWkb()),)
+
+    def test_intersects_with_attribute_filter_and_disjoint(self, gpkg):
+        path, ogr = gpkg
+        source = self._source(ogr, "POLYGON((2.5 0.2,4.5 0.2,4.5 0.8,2.5 0.8,2.5 0.2))")
+        job = OgrFidJob("cells", path, "cells", (0,), source)
+
+        assert evaluate_ogr_fid_job(job).fid_set() == {3, 4, 5}  # GPKG FIDs start at 1
+        filtered = OgrFidJob("cells", path, "cells", (0,), source, attribute_filter='"kind" = 1')
+        assert evaluate_ogr_fid_job(filtered).fid_set() == {4}
+        disjoint = OgrFidJob("cells", path, "cells", (2,), source)
+        assert evaluate_ogr_fid_job(disjoint).count == 7
+
+    def test_missing_file_returns_error(self, gpkg):
+        _, ogr = gpkg
+        result = evaluate_ogr_fid_job(OgrFidJob("x", "/nonexistent.gpkg", None, (0,), ()))
+        assert not result.success
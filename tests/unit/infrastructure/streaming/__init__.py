@@ -0,0 +1 @@
+# FilterMate Streaming Infrastructure Unit Tests
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the bounded export pipeline.
+
+Batches are plain lists and the writer is a Python callable, so the
+pipeline runs without QGIS.
+
+Module tested: infrastructure.streaming.export_pipeline
+"""
+import threading
+import time
+
+import pytest
+
+from infrastructure.streaming.export_pipeline import (
+    STAGE_READ,
+    STAGE_WRITE,
+    ExportPipeline,
+    plan_export_pipeline,
+)
+from infrastructure.streaming.result_streaming import estimate_export_memory
+
+
+def _batches(count, size=10):
+    return [list(range(i * size, (i + 1) * size)) for i in range(count)]
+
+
+# =========================================================================
+# Planning
+# =========================================================================
+
+class TestPlanExportPipeline:
+    """Tests for queue depth / batch size selection."""
+
+    def test_unlimited_memory_uses_prefetch_depth(self):
+        plan = plan_export_pipeline(5000, prefetch_batches=4, memory_limit_mb=0)
+        assert (plan.batch_size, plan.queue_depth) == (5000, 4)
+        assert plan.batches_in_flight == 4 + 2
+
+    def test_depth_is_capped_by_memory_ceiling(self):
+        batch_bytes = estimate_export_memory(5000, 100)
+        limit_mb = (batch_bytes * 5) // (1024 * 1024) + 1
+        plan = plan_export_pipeline(5000, prefetch_batches=16, memory_limit_mb=limit_mb)
+
+        assert 1 <= plan.queue_depth < 16
+        assert plan.peak_bytes <= plan.ceiling_bytes
+
+    def test_batch_shrinks_when_one_batch_exceeds_ceiling(self):
+        plan = plan_export_pipeline(
+            100000, prefetch_batches=4, memory_limit_mb=8,
+            avg_geometry_vertices=1000, with_transform=True
+        )
+        assert plan.batch_size < 100000
+        assert plan.queue_depth >= 1
+        assert plan.peak_bytes <= plan.ceiling_bytes
+
+    def test_peak_does_not_depend_on_feature_count(self):
+        # The plan only looks at batch geometry, never at the total
+        small = plan_export_pipeline(5000, 4, 500)
+        assert small.peak_bytes < estimate_export_memory(10_000_000, 100)
+
+
+# =========================================================================
+# Pipeline
+# =========================================================================
+
+class TestExportPipeline:
+    """Tests for ExportPipeline.run()."""
+
+    def _plan(self, depth=2):
+        return plan_export_pipeline(10, prefetch_batches=depth, memory_limit_mb=0)
+
+    def test_all_batches_written_in_order_through_transform(self):
+        written = []
+        result = ExportPipeline(self._plan(), poll_interval=0.01).run(
+            lambda: iter(_batches(20)),
+            write_batch=lambda batch: written.extend(batch) or len(batch),
+            transform_batch=lambda batch: [x * 2 for x in batch],
+        )
+
+        assert result.success
+        assert written == [x * 2 for x in range(200)]
+        assert (result.features_read, result.features_transformed, result.features_written) == (200, 200, 200)
+        assert result.batches_written == 20
+
+    def test_reader_is_held_back_by_slow_writer(self):
+        depth = 2
+        pipeline = ExportPipeline(self._plan(depth), poll_interval=0.01)
+        max_ahead = []
+
+        def write(batch):
+            time.sleep(0.005)
+            ahead = pipeline._counts[STAGE_READ] - pipeline._counts[STAGE_WRITE]
+            max_ahead.append(ahead // 10)
+            return len(batch)
+
+        result = pipeline.run(lambda: iter(_batches(30)), write)
+        assert result.success
+        # queued batches + the one being written + the one the reader holds
+        assert max(max_ahead) <= depth + 2
+        assert result.stage_wait_ms[STAGE_READ] > 0
+
+    def test_cancel_stops_blocked_reader(self):
+        cancel = threading.Event()
+
+        def endless():
+            while True:
+                yield [0] * 10
+
+        def write(batch):
+            cancel.set()
+            return len(batch)
+
+        started = time.time()
+        result = ExportPipeline(self._plan(), cancel_check=cancel.is_set, poll_interval=0.01).run(endless, write)
+
+        assert result.canceled and not result.success
+        assert result.features_written == 10
+        assert time.time() - started < 2
+
+    def test_stage_error_is_reported(self):
+        def broken():
+            yield [1, 2]
+            raise RuntimeError("provider gone")
+
+        result = ExportPipeline(self._plan(), poll_interval=0.01).run(broken, len)
+        assert result.error_stage == STAGE_READ
+        assert str(result.error) == "provider gone"
+        assert not result.success
+
+    def test_progress_reports_stage_counters(self):
+        reports = []
+        result = ExportPipeline(
+            self._plan(), poll_interval=0.01,
+            progress_callback=lambda stage, counters: reports.append((stage, counters)),
+        ).run(lambda: iter(_batches(3)), len)
+
+        assert result.success
+        writes = [c for stage, c in reports if stage == STAGE_WRITE]
+        assert [c['features_written'] for c in writes] == [10, 20, 30]
+        assert writes[-1]['batches_written'] == 3
+        assert set(writes[-1]['stage_wait_ms']) == {'read', 'transform', 'write'}
+
+
+@pytest.mark.parametrize("with_transform", [False, True])
+def test_plan_accounts_for_transform_queue(with_transform):
+    plan = plan_export_pipeline(10, prefetch_batches=3, memory_limit_mb=0, with_transform=with_transform)
+    assert plan.batches_in_flight == (3 * 2 + 3 if with_transform else 3 + 2)
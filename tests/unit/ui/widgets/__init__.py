@@ -0,0 +1 @@
+# FilterMate UI Widget Unit Tests
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the feature picker list storage.
+
+Only FeatureListStore and FeatureSearchIndex are exercised: they hold
+rows, paging, filtering and checked keys without Qt. The modules are
+loaded from their files under a stand-in package so the ui package (and
+its Qt widgets) is not imported.
+
+Modules tested: ui.widgets.feature_list_model, ui.widgets.feature_search_index
+"""
+import importlib.util
+import pathlib
+import sys
+import types
+
+import pytest
+
+_WIDGETS_DIR = pathlib.Path(__file__).resolve().parents[4] / "ui" / "widgets"
+_package = types.ModuleType("fm_widgets")
+_package.__path__ = [str(_WIDGETS_DIR)]
+sys.modules.setdefault("fm_widgets", _package)
+
+
+def _load(name):
+    spec = importlib.util.spec_from_file_location(f"fm_widgets.{name}", _WIDGETS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+feature_search_index = _load("feature_search_index")
+feature_list_model = _load("feature_list_model")
+
+FeatureListStore = feature_list_model.FeatureListStore
+FeatureSearchIndex = feature_search_index.FeatureSearchIndex
+
+
+def _store(count=10, numeric=True):
+    store = FeatureListStore(numeric_keys=numeric)
+    store.append((f"name {i}", i) for i in range(count))
+    return store
+
+
+class TestKeys:
+    """Tests for primary key normalization."""
+
+    def test_numeric_keys_match_across_types(self):
+        store = FeatureListStore(numeric_keys=True)
+        assert store.key("5") == store.key(5.0) == store.key(5) == 5
+        assert store.key(2.5) == 2.5
+        assert store.key("abc") == "abc"
+
+    def test_text_keys_stay_text(self):
+        store = FeatureListStore(numeric_keys=False)
+        assert store.key(5) == "5"
+        assert store.key(None) is None
+
+
+class TestPaging:
+    """Tests for canFetchMore/fetchMore bookkeeping."""
+
+    def test_pages_until_exhausted(self):
+        store = _store(25)
+        assert store.loaded == 0 and store.can_fetch_more()
+        assert store.fetch_more(10) == (0, 9)
+        assert store.fetch_more(10) == (10, 19)
+        assert store.fetch_more(10) == (20, 24)
+        assert not store.can_fetch_more()
+
+    def test_appended_rows_become_fetchable(self):
+        store = _store(5)
+        store.fetch_more(10)
+        assert not store.can_fetch_more()
+        store.append([("late", 99)])
+        assert store.can_fetch_more()
+        assert store.row(store.fetch_more(10)[0]) == ("late", 99)
+
+    def test_filter_restricts_view_and_follows_appends(self):
+        store = _store(20)
+        store.set_filter("NAME 1")
+        assert store.visible_count() == 11  # 1, 10..19
+        store.fetch_more(100)
+        assert store.row(0) == ("name 1", 1)
+
+        store.append([("name 100", 100), ("other", 101)])
+        assert store.visible_count() == 12
+        store.set_filter("")
+        assert store.visible_count() == 22
+
+
+class TestCheckedState:
+    """Tests for checked keys independent of loaded rows."""
+
+    def test_toggle_and_set_checked(self):
+        store = _store(5)
+        store.fetch_more(5)
+        assert store.toggle(2) is True
+        assert store.is_checked(2)
+        assert store.toggle(2) is False
+
+        assert store.set_checked(["1", 3, 42]) == 2
+        assert store.checked == {1, 3, 42}
+
+    def test_checks_survive_reset_and_reload(self):
+        store = _store(5)
+        store.set_checked([4])
+        store.reset()
+        assert store.checked_rows() == [("4", 4)]  # row not loaded yet
+        store.append([("four", 4)])
+        assert store.checked_rows() == [("four", 4)]
+
+    @pytest.mark.parametrize("checked", [True, False])
+    def test_check_all(self, checked):
+        store = _store(3)
+        store.set_checked([1])
+        store.check_all(checked)
+        assert store.checked == ({0, 1, 2} if checked else set())
+
+
+class TestSearchIndex:
+    """Tests for the trigram/prefix search index behind the filter box."""
+
+    DISPLAYS = ["Rue de la Gare", "Avenue Victor Hugo", "rue du Port", "12", "Place Victor", "x"]
+
+    @pytest.fixture(params=[True, False], ids=["numpy", "pure-python"])
+    def index(self, request, monkeypatch):
+        if request.param and not feature_search_index.NUMPY_AVAILABLE:
+            pytest.skip("NumPy not installed")
+        monkeypatch.setattr(feature_search_index, "NUMPY_AVAILABLE", request.param)
+        index = FeatureSearchIndex()
+        index.add(self.DISPLAYS)
+        return index
+
+    def _scan(self, text, displays=None):
+        return [i for i, d in enumerate(displays or self.DISPLAYS) if text.lower() in d.lower()]
+
+    @pytest.mark.parametrize("text", ["", "r", "ru", "rue", "RUE D", "victor", "victor hugo", "2", "x", "zzz", "o"])
+    def test_search_matches_scan(self, index, text):
+        assert index.search(text) == self._scan(text)
+
+    def test_narrowing_and_widening_queries(self, index):
+        for text in ["v", "vi", "vic", "victor", "vic", "v", "", "rue du", "ru"]:
+            assert index.search(text) == self._scan(text), text
+
+    def test_update_reindexes_row(self, index):
+        displays = list(self.DISPLAYS)
+        assert index.search("gare") == [0]
+        index.update(0, "Impasse du Moulin")
+        index.update(3, "Gare 12")
+        displays[0], displays[3] = "Impasse du Moulin", "Gare 12"
+        for text in ["gare", "moulin", "12", "du", "rue"]:
+            assert index.search(text) == self._scan(text, displays), text
+
+    def test_prefix(self, index):
+        assert index.prefix("rue") == [0, 2]
+        assert index.prefix("PLACE v") == [4]
+        index.add(["Rue Neuve"])
+        assert index.prefix("rue") == [0, 2, 6]
+        assert index.prefix("q") == []
+
+    def test_store_filters_through_attached_index(self):
+        store = _store(30)
+        index = FeatureSearchIndex()
+        index.add(display for display, _ in store.rows)
+        assert store.attach_index(index)
+        assert not store.attach_index(FeatureSearchIndex())
+
+        store.set_filter("NAME 2")
+        assert store.visible_count() == 11  # 2, 20..29
+        store.append([("name 200", 200)])
+        store.set_filter("name 20")
+        assert [key for _, key in store.visible_rows()] == [20, 200]
+        store.reset()
+        assert store.index is None
+
+    def test_store_display_updates_reach_index(self):
+        store = _store(30)
+        index = FeatureSearchIndex()
+        index.add(display for display, _ in store.rows)
+        store.attach_index(index)
+
+        assert store.update_displays({5: "renamed", 6: "name 6", 99: "missing"}) == [5]
+        assert store.rows[5] == ("renamed", 5)
+        store.set_filter("renam")
+        assert [key for _, key in store.visible_rows()] == [5]
+        store.set_filter("name 5")
+        assert store.visible_count() == 0
+
+    def test_store_sort_rebuilds_index(self):
+        store = _store(30)
+        index = FeatureSearchIndex()
+        index.add(display for display, _ in store.rows)
+        store.attach_index(index)
+        store.set_filter("name 2")
+
+        store.sort(key=lambda row: row[1], reverse=True)
+
+        assert store.index is not index and len(store.index) == 30
+        assert [key for _, key in store.visible_rows()] == [29, 28, 27, 26, 25, 24, 23, 22, 21, 20, 2]
+        assert store.loaded == 0
@@ -13,12 +13,12 @@ import logging
 from typing import Dict, Optional, TYPE_CHECKING
 
 try:
-    from qgis.PyQt.QtCore import Qt, QSize
+    from qgis.PyQt.QtCore import QSize
     from qgis.PyQt.QtWidgets import (
         QWidget, QHBoxLayout, QLayout, QSizePolicy
     )
 except ImportError:
-    from PyQt5.QtCore import Qt, QSize
+    from PyQt5.QtCore import QSize
     from PyQt5.QtWidgets import (
         QWidget, QHBoxLayout, QLayout, QSizePolicy
     )
@@ -164,24 +164,12 @@ class UILayoutController(BaseController):
         dw._syncing_from_qgis = True
 
         try:
-            checked_count = 0
-            unchecked_count = 0
-
-            for i in range(list_widget.count()):
-                item = list_widget.item(i)
-                item_pk_value = item.data(3)  # data(3) = PRIMARY KEY value
-                item_pk_str = str(item_pk_value) if item_pk_value is not None else item_pk_value
-
-                if item_pk_str in selected_pk_values:
-                    # CHECK features selected in QGIS
-                    if item.checkState() != Qt.Checked:
-                        item.setCheckState(Qt.Checked)
-                        checked_count += 1
-                else:
-                    # UNCHECK features not selected in QGIS
-                    if item.checkState() != Qt.Unchecked:
-                        item.setCheckState(Qt.Unchecked)
-                        unchecked_count += 1
+            # Checked state lives in the list model as a set of primary keys
+            previously_checked = set(list_widget.getCheckedFeatureIds())
+            list_widget.feature_model.setCheckedKeys(selected_pk_values)
+            now_checked = set(list_widget.getCheckedFeatureIds())
+            checked_count = len(now_checked - previously_checked)
+            unchecked_count = len(previously_checked - now_checked)
 
             logger.debug(f"sync_multiple_selection_from_qgis: checked={checked_count}, unchecked={unchecked_count}")
 
@@ -12,6 +12,7 @@ from .custom_widgets import (  # noqa: F401
     QgsCheckableComboBoxLayer,
     QgsCheckableComboBoxFeaturesListPickerWidget
 )
+from .feature_list_model import FeatureListModel  # noqa: F401
 
 __all__ = [
     'FavoritesWidget',
@@ -21,4 +22,5 @@ __all__ = [
     'ListWidgetWrapper',
     'QgsCheckableComboBoxLayer',
     'QgsCheckableComboBoxFeaturesListPickerWidget',
+    'FeatureListModel',
 ]
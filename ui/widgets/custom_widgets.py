@@ -8,7 +8,7 @@ Date: January 2026 - Updated with full functionality restoration
 Custom QGIS widgets not available in qgis.gui:
 - QgsCheckableComboBoxLayer: Multi-select layer combobox with context menu and geometry filtering
 - QgsCheckableComboBoxFeaturesListPickerWidget: Multi-select feature picker with async loading
-- ListWidgetWrapper: Feature list storage with sorting capabilities
+- ListWidgetWrapper: Lazily-paged feature list view (see feature_list_model)
 - ItemDelegate: Custom delegate for checkable items with icons
 
 Usage:
@@ -50,8 +50,7 @@ from qgis.PyQt.QtWidgets import (
     QApplication,
     QComboBox,
     QLineEdit,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
     QMenu,
     QSizePolicy,
     QStyle,
@@ -63,15 +62,13 @@ from qgis.PyQt.QtWidgets import (
     QWidget
 )
 from qgis.core import (
+    QgsApplication,
     QgsExpression,
-    QgsExpressionContext,
-    QgsExpressionContextUtils,
-    QgsFeatureRequest,
     QgsTask
 )
 
-# Import safe iteration utilities for OGR/GeoPackage error handling
-from ...infrastructure.utils import safe_iterate_features, is_layer_valid
+from ...infrastructure.utils import is_layer_valid
+from .feature_list_model import FeatureListLoadTask, FeatureListModel, read_feature_displays
 
 logger = logging.getLogger('FilterMate.UI.Widgets.CustomWidgets')
 
@@ -387,15 +384,18 @@ class QgsCheckableComboBoxLayer(QComboBox):
         painter.drawControl(QStyle.CE_ComboBoxLabel, opt)
 
 
-class ListWidgetWrapper(QListWidget):
+class ListWidgetWrapper(QListView):
     """
-    Wrapper for QListWidget that stores feature list metadata.
+    Feature list view that stores feature list metadata.
 
     Restored from before_migration/modules/widgets.py for full functionality.
     Stores display expression, filter state, and feature lists for the picker widget.
+
+    v4.2.0: Backed by a lazily-paged FeatureListModel instead of one
+    QListWidgetItem per feature; checked state is a set of primary keys.
     """
 
-    def __init__(self, identifier_field_name, primary_key_is_numeric, parent=None):
+    def __init__(self, identifier_field_name, primary_key_is_numeric, parent=None, font_by_state=None):
         super(ListWidgetWrapper, self).__init__(parent)
 
         # Dynamic sizing based on config - match before_migration/UIConfig compact profile
@@ -411,6 +411,10 @@ class ListWidgetWrapper(QListWidget):
         self.setMinimumHeight(list_min_height)
         # FIX 2026-01-18: Explicit sizePolicy to ensure list expands in parent layout
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        # All rows share one height, so the view can skip per-row size hints
+        self.setUniformItemSizes(True)
+        self.feature_model = FeatureListModel(font_by_state, primary_key_is_numeric, parent=self)
+        self.setModel(self.feature_model)
         self.identifier_field_name = identifier_field_name
         self.identifier_field_type_numeric = primary_key_is_numeric
         self.filter_expression = ''
@@ -418,12 +422,31 @@ class ListWidgetWrapper(QListWidget):
         self.display_expression = ''
         self.field_flag = False
         self.subset_string = ''
-        self.features_list = []
         self.filter_expression_features_id_list = []
         self.visible_features_list = []
         self.selected_features_list = []
         self.limit = 1000
         self.total_features_list_count = 0
+        # (expression, ascending, subset) of the last started load
+        self.load_signature = None
+
+    @property
+    def features_list(self):
+        """Loaded (display, primary key) rows in list order."""
+        return self.feature_model.store.rows
+
+    def count(self):
+        """Number of feature rows loaded so far (including filtered-out rows)."""
+        return len(self.feature_model.store.rows)
+
+    def isLoading(self):
+        """True while a background load is filling the list."""
+        return self.feature_model.loading
+
+    def clear(self):
+        """Remove all rows (checked keys are kept)."""
+        self.feature_model.endLoad(self.feature_model.beginLoad())
+        self.load_signature = None
 
     def setFilterExpression(self, filter_expression):
         self.filter_expression = filter_expression
@@ -447,7 +470,9 @@ class ListWidgetWrapper(QListWidget):
         self.total_features_list_count = total_features_list_count
 
     def setFeaturesList(self, features_list):
-        self.features_list = features_list
+        self.feature_model.beginLoad()
+        self.feature_model.appendRows(list(features_list), self.feature_model.generation)
+        self.feature_model.endLoad(self.feature_model.generation)
 
     def setFilterExpressionFeaturesIdList(self, filter_expression_features_id_list):
         self.filter_expression_features_id_list = filter_expression_features_id_list
@@ -460,15 +485,15 @@ class ListWidgetWrapper(QListWidget):
 
     def setCheckedByFeatureIds(self, feature_ids, parent_widget=None):
         """
-        Check items in the list widget by matching feature IDs.
+        Check items in the list by matching feature IDs.
 
         This method updates the visual checkbox state (unlike setSelectedFeaturesList
-        which only stores data). The feature ID is stored in item.data(3).
+        which only stores data). Every other item is unchecked.
 
         Args:
             feature_ids: List of feature IDs to check
-            parent_widget: Optional parent QgsCheckableComboBoxFeaturesListPickerWidget
-                          for accessing font_by_state styling
+            parent_widget: Unused, kept for API compatibility (fonts come
+                from the model)
 
         Returns:
             int: Number of items that were successfully checked
@@ -476,46 +501,18 @@ class ListWidgetWrapper(QListWidget):
         if not feature_ids:
             return 0
 
-        # Convert to set for O(1) lookup
-        feature_ids_set = set(feature_ids)
-        checked_count = 0
-
-        for i in range(self.count()):
-            item = self.item(i)
-            if item:
-                item_fid = item.data(3)  # Feature ID is stored in data(3)
-
-                if item_fid in feature_ids_set:
-                    item.setCheckState(Qt.Checked)
-                    # Update font styling if parent_widget provided
-                    if parent_widget and hasattr(parent_widget, 'font_by_state'):
-                        # Check if item is in subset (data(4) == "True")
-                        is_in_subset = item.data(4) == "True"
-                        if is_in_subset:
-                            item.setData(6, parent_widget.font_by_state['checked'][0])
-                            item.setData(9, QBrush(parent_widget.font_by_state['checked'][1]))
-                        else:
-                            item.setData(6, parent_widget.font_by_state['checkedFiltered'][0])
-                            item.setData(9, QBrush(parent_widget.font_by_state['checkedFiltered'][1]))
-                    checked_count += 1
-                else:
-                    # Uncheck items not in the selection
-                    if item.checkState() == Qt.Checked:
-                        item.setCheckState(Qt.Unchecked)
-                        if parent_widget and hasattr(parent_widget, 'font_by_state'):
-                            is_in_subset = item.data(4) == "True"
-                            if is_in_subset:
-                                item.setData(6, parent_widget.font_by_state['unChecked'][0])
-                                item.setData(9, QBrush(parent_widget.font_by_state['unChecked'][1]))
-                            else:
-                                item.setData(6, parent_widget.font_by_state['unCheckedFiltered'][0])
-                                item.setData(9, QBrush(parent_widget.font_by_state['unCheckedFiltered'][1]))
+        feature_ids = list(feature_ids)
+        checked_count = self.feature_model.setCheckedKeys(feature_ids)
 
         # Also update the stored selected_features_list
         self.selected_features_list = [[str(fid), fid, True] for fid in feature_ids]
 
         return checked_count
 
+    def getCheckedFeatureIds(self):
+        """Checked primary keys, in list order."""
+        return [key for _, key in self.feature_model.store.checked_rows()]
+
     def setLimit(self, limit):
         self.limit = limit
 
@@ -547,6 +544,9 @@ class ListWidgetWrapper(QListWidget):
         return self.features_list
 
     def getVisibleFeaturesList(self):
+        if self.visible_features_list is None:
+            # Follows the model filter, built only when asked for
+            return [[display_value, fid] for display_value, fid in self.feature_model.store.visible_rows()]
         return self.visible_features_list
 
     def getSelectedFeaturesList(self):
@@ -570,7 +570,8 @@ class ListWidgetWrapper(QListWidget):
             is_in_subset = k[1] not in nonSubset_features_list
             return (is_in_subset, display_value)
 
-        self.features_list.sort(key=safe_sort_key, reverse=reverse)
+        # The store rebuilds its search index and filtered view over the new order
+        self.feature_model.sortRows(safe_sort_key, reverse)
 
 
 class QgsCheckableComboBoxFeaturesListPickerWidget(QWidget):
@@ -578,7 +579,7 @@ class QgsCheckableComboBoxFeaturesListPickerWidget(QWidget):
     A widget for selecting multiple features from a layer with async loading.
 
     Restored from before_migration/modules/widgets.py with full functionality:
-    - Asynchronous population using QgsTask (PopulateListEngineTask)
+    - Asynchronous population using QgsTask (FeatureListLoadTask), paged into the view
     - Live search/filter with debouncing (300ms)
     - Multi-select with checkboxes and font styling by state
     - Context menu (Select All, Deselect All, subset filtering)
@@ -709,6 +710,15 @@ class QgsCheckableComboBoxFeaturesListPickerWidget(QWidget):
         self._filter_debounce_timer.setInterval(300)  # 300ms debounce delay
         self._filter_debounce_timer.timeout.connect(self._execute_filter)
 
+        # v4.2.0: Edits of the current layer, applied to its list in one batch
+        self._edit_layer = None
+        self._edited_fids = set()
+        self._edits_need_reload = False
+        self._edit_timer = QTimer(self)
+        self._edit_timer.setSingleShot(True)
+        self._edit_timer.setInterval(300)
+        self._edit_timer.timeout.connect(self._apply_layer_edits)
+
     def setSortOrder(self, order='ASC', field=None):
         """Set the sort order for the features list."""
         self._sort_order = order
@@ -730,10 +740,9 @@ class QgsCheckableComboBoxFeaturesListPickerWidget(QWidget):
         if not is_layer_valid(self.layer) or self.layer.id() not in self.list_widgets:
             return selection
 
-        for i in range(self.list_widgets[self.layer.id()].count()):
-            item = self.list_widgets[self.layer.id()].item(i)
-            if item and item.checkState() == Qt.Checked:
-                selection.append([item.data(0), item.data(3), item.data(6), item.data(9)])
+        font, color = self.font_by_state['checked']
+        for display_value, fid in self.list_widgets[self.layer.id()].feature_model.store.checked_rows():
+            selection.append([display_value, fid, font, QBrush(color)])
         selection.sort(key=lambda k: k[0])
         return selection
 
@@ -817,6 +826,7 @@ class QgsCheckableComboBoxFeaturesListPickerWidget(QWidget):
 
                 self.layer = layer
                 self._cached_layer_name = layer.name()
+                self._track_layer_edits(layer)
 
                 # Ensure the widget exists for the new layer
                 widget_already_existed = self.layer.id() in self.list_widgets
@@ -1023,7 +1033,7 @@ class QgsCheckableComboBoxFeaturesListPickerWidget(QWidget):
                     logger.warning(f"Could not restore checked items: {restore_err}")
 
     def _populate_features_sync(self, expression, preserve_checked=False):
-        """Populate features list synchronously.
+        """Populate features list.
 
         FIX 2026-01-19: Added explicit visual refresh after population to ensure
         the list is displayed correctly.
@@ -1031,91 +1041,61 @@ class QgsCheckableComboBoxFeaturesListPickerWidget(QWidget):
         FIX 2026-01-19 v4: Added preserve_checked parameter to maintain checkbox state
         during repopulation. This prevents the auto-uncheck issue.
 
+        v4.2.0: Despite the name, rows now come from a FeatureListLoadTask and
+        are paged into the view; this returns as soon as the load is queued.
+        A load still running for the same expression/order/subset is reused.
+
         Args:
             expression: The display expression to use
-            preserve_checked: If True, save and restore checked items after population
+            preserve_checked: If True, keep checked items across the reload
         """
         if not is_layer_valid(self.layer) or self.layer.id() not in self.list_widgets:
             return
 
-        list_widget = self.list_widgets[self.layer.id()]
+        layer_id = self.layer.id()
+        list_widget = self.list_widgets[layer_id]
+        model = list_widget.feature_model
 
-        # FIX 2026-01-19 v4: Save checked items BEFORE clearing
-        saved_checked_fids = []
-        if preserve_checked:
-            saved_checked_fids = self.getCheckedFeatureIds()
-            if saved_checked_fids:
-                logger.debug(f"_populate_features_sync: Preserving {len(saved_checked_fids)} checked items")
+        if not preserve_checked:
+            model.checkAll(False)
 
-        list_widget.clear()
+        display_expression = expression or list_widget.getIdentifierFieldName()
+        ascending = self._sort_order != 'DESC'
+        signature = (display_expression, ascending, self.layer.subsetString())
 
-        # Build expression
-        expr = QgsExpression(expression) if expression and not QgsExpression(expression).isField() else None
-        context = QgsExpressionContext()
-        context.appendScopes(QgsExpressionContextUtils.globalProjectLayerScopes(self.layer))
-
-        identifier_field = list_widget.getIdentifierFieldName()
-
-        # Request features
-        request = QgsFeatureRequest()
-        request.setFlags(QgsFeatureRequest.NoGeometry)
+        if signature == list_widget.load_signature and model.loading:
+            logger.debug(f"_populate_features_sync: Reusing current load for '{display_expression}'")
+        else:
+            running = self.tasks['loadFeaturesList'].get(layer_id)
+            if isinstance(running, QgsTask):
+                try:
+                    running.cancel()
+                except RuntimeError:
+                    pass
 
-        features_data = []
-        for feature in safe_iterate_features(self.layer, request):
+            generation = model.beginLoad()
+            list_widget.load_signature = signature
+            list_widget.setTotalFeaturesListCount(0)
             try:
-                fid = feature[identifier_field] if identifier_field else feature.id()
-
-                if expr:
-                    context.setFeature(feature)
-                    display_value = str(expr.evaluate(context))
-                else:
-                    # Simple field access
-                    display_value = str(feature[expression]) if expression else str(fid)
-
-                # UUID FIX v4.0: Ensure fid is converted to string for UUID/text PKs
-                # This ensures proper handling when building SQL expressions later
-                fid_value = str(fid) if not isinstance(fid, (int, float)) else fid
-                features_data.append((display_value, fid_value))
+                task = FeatureListLoadTask(
+                    self.layer,
+                    display_expression,
+                    list_widget.getIdentifierFieldName(),
+                    model.store.key,
+                    generation,
+                    ascending=ascending
+                )
             except Exception as e:
-                logger.debug(f"Error processing feature: {e}")
-                continue
-
-        # Sort features
-        reverse = self._sort_order == 'DESC'
-        features_data.sort(key=lambda x: (x[0] if x[0] is not None else ""), reverse=reverse)
-
-        # FIX 2026-01-19 v4: Build set of checked FIDs for O(1) lookup
-        checked_fid_set = set()
-        if saved_checked_fids:
-            for fid in saved_checked_fids:
-                checked_fid_set.add(fid)
-                # Also add string version for comparison
-                if not isinstance(fid, str):
-                    checked_fid_set.add(str(fid))
-
-        # Populate list widget
-        for display_value, fid in features_data:
-            item = QListWidgetItem(display_value)
-            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
-
-            # FIX 2026-01-19 v4: Restore checked state if in saved list
-            is_checked = fid in checked_fid_set
-            item.setCheckState(Qt.Checked if is_checked else Qt.Unchecked)
-
-            item.setData(0, display_value)
-            item.setData(3, fid)
-            item.setData(4, "True")
-            # Set font/color based on checked state
-            if is_checked:
-                item.setData(6, self.font_by_state['checked'][0])
-                item.setData(9, QBrush(self.font_by_state['checked'][1]))
-            else:
-                item.setData(6, self.font_by_state['unChecked'][0])
-                item.setData(9, QBrush(self.font_by_state['unChecked'][1]))
-            list_widget.addItem(item)
+                logger.warning(f"Could not start feature list load for {layer_id}: {e}")
+                model.endLoad(generation)
+                list_widget.load_signature = None
+                return
 
-        list_widget.setFeaturesList(features_data)
-        list_widget.setTotalFeaturesListCount(len(features_data))
+            task.signals.rowsReady.connect(model.appendRows)
+            task.signals.indexReady.connect(model.attachIndex)
+            task.signals.loadFinished.connect(partial(self._on_features_list_loaded, layer_id))
+            self.tasks['loadFeaturesList'][layer_id] = task
+            QgsApplication.taskManager().addTask(task)
 
         # FIX 2026-01-19: Force visual refresh after population
         # This ensures the list is displayed correctly, especially after layer changes
@@ -1133,10 +1113,81 @@ class QgsCheckableComboBoxFeaturesListPickerWidget(QWidget):
         # and parent groupbox allocate space for the populated list widget
         self.updateGeometry()
 
-        self.connect_filter_lineEdit()
+    def _track_layer_edits(self, layer):
+        """Follow feature edits of ``layer`` (and stop following the previous layer)."""
+        if layer is self._edit_layer:
+            return
+        if self._edit_layer is not None:
+            try:
+                self._edit_layer.attributeValueChanged.disconnect(self._on_layer_attribute_changed)
+                self._edit_layer.featureAdded.disconnect(self._on_layer_features_changed)
+                self._edit_layer.featureDeleted.disconnect(self._on_layer_features_changed)
+            except (TypeError, RuntimeError):
+                pass
+        self._edit_timer.stop()
+        self._edited_fids = set()
+        self._edits_need_reload = False
+        self._edit_layer = layer
+        layer.attributeValueChanged.connect(self._on_layer_attribute_changed)
+        layer.featureAdded.connect(self._on_layer_features_changed)
+        layer.featureDeleted.connect(self._on_layer_features_changed)
+
+    def _on_layer_attribute_changed(self, fid, field_index, value):
+        """Queue an edited feature for a display (and search index) update."""
+        if not is_layer_valid(self.layer) or self.layer.id() not in self.list_widgets:
+            return
+        identifier_field = self.list_widgets[self.layer.id()].getIdentifierFieldName()
+        if identifier_field and self.layer.fields().at(field_index).name() == identifier_field:
+            # The row key itself changed
+            self._edits_need_reload = True
+        else:
+            self._edited_fids.add(fid)
+        self._edit_timer.start()
+
+    def _on_layer_features_changed(self, fid):
+        """Queue a reload of the list after features were added or deleted."""
+        self._edits_need_reload = True
+        self._edit_timer.start()
+
+    def _apply_layer_edits(self):
+        """Bring the current layer's list in line with the queued edits."""
+        fids, self._edited_fids = self._edited_fids, set()
+        reload, self._edits_need_reload = self._edits_need_reload, False
+        if not is_layer_valid(self.layer) or self.layer.id() not in self.list_widgets:
+            return
+        list_widget = self.list_widgets[self.layer.id()]
+        model = list_widget.feature_model
+        expression = list_widget.getDisplayExpression()
+        if reload or model.loading:
+            # Rows move or the running load would hand over a stale index
+            list_widget.load_signature = None
+            self._populate_features_sync(expression, preserve_checked=True)
+        elif fids:
+            try:
+                displays = read_feature_displays(
+                    self.layer, fids, expression or list_widget.getIdentifierFieldName(),
+                    list_widget.getIdentifierFieldName(), model.store.key
+                )
+            except Exception as e:
+                logger.debug(f"Could not read edited features of {self.layer.id()}: {e}")
+                return
+            model.updateDisplays(displays)
 
-        restored_count = len([fid for fid in saved_checked_fids if fid in checked_fid_set]) if saved_checked_fids else 0
-        logger.debug(f"Populated {len(features_data)} features (restored {restored_count} checked), visible={list_widget.isVisible()}")
+    def _on_features_list_loaded(self, layer_id, generation, total_rows):
+        """Finish a background feature list load (main thread)."""
+        list_widget = self.list_widgets.get(layer_id)
+        if list_widget is None:
+            return
+        model = list_widget.feature_model
+        if generation != model.generation:
+            return
+        model.endLoad(generation)
+        list_widget.setTotalFeaturesListCount(total_rows)
+        self.tasks['loadFeaturesList'].pop(layer_id, None)
+        self.connect_filter_lineEdit()
+        if list_widget.getFilterText():
+            self.filter_items(list_widget.getFilterText())
+        logger.debug(f"Loaded {total_rows} features for {layer_id} ({len(model.store.checked)} checked)")
 
     def eventFilter(self, obj, event):
         """Handle mouse events for feature selection and context menu."""
@@ -1147,37 +1198,12 @@ class QgsCheckableComboBoxFeaturesListPickerWidget(QWidget):
             return False
 
         if event.type() == QEvent.MouseButtonPress and obj == self.list_widgets[self.layer.id()].viewport():
-            identifier_field_name = self.list_widgets[self.layer.id()].getIdentifierFieldName()
-
-            try:
-                nonSubset_features_list = [feature[identifier_field_name] for feature in safe_iterate_features(self.layer)]
-            except Exception:
-                nonSubset_features_list = []
+            list_widget = self.list_widgets[self.layer.id()]
 
             if event.button() == Qt.LeftButton:
-                clicked_item = self.list_widgets[self.layer.id()].itemAt(event.pos())
-                if clicked_item is not None:
-                    id_item = clicked_item.data(3)
-                    if clicked_item.checkState() == Qt.Checked:
-                        clicked_item.setCheckState(Qt.Unchecked)
-                        if id_item in nonSubset_features_list:
-                            clicked_item.setData(6, self.font_by_state['unChecked'][0])
-                            clicked_item.setData(9, QBrush(self.font_by_state['unChecked'][1]))
-                            clicked_item.setData(4, "True")
-                        else:
-                            clicked_item.setData(6, self.font_by_state['unCheckedFiltered'][0])
-                            clicked_item.setData(9, QBrush(self.font_by_state['unCheckedFiltered'][1]))
-                            clicked_item.setData(4, "False")
-                    else:
-                        clicked_item.setCheckState(Qt.Checked)
-                        if id_item in nonSubset_features_list:
-                            clicked_item.setData(6, self.font_by_state['checked'][0])
-                            clicked_item.setData(9, QBrush(self.font_by_state['checked'][1]))
-                            clicked_item.setData(4, "True")
-                        else:
-                            clicked_item.setData(6, self.font_by_state['checkedFiltered'][0])
-                            clicked_item.setData(9, QBrush(self.font_by_state['checkedFiltered'][1]))
-                            clicked_item.setData(4, "False")
+                index = list_widget.indexAt(event.pos())
+                if index.isValid():
+                    list_widget.feature_model.toggleRow(index.row())
 
                     # Emit update signal
                     self._emit_checked_items_update()
@@ -1380,7 +1406,7 @@ class QgsCheckableComboBoxFeaturesListPickerWidget(QWidget):
             logger.error("Could not determine identifier field")
             return
 
-        self.list_widgets[self.layer.id()] = ListWidgetWrapper(pk_name, pk_is_numeric, self)
+        self.list_widgets[self.layer.id()] = ListWidgetWrapper(pk_name, pk_is_numeric, self, font_by_state=self.font_by_state)
         self.list_widgets[self.layer.id()].viewport().installEventFilter(self)
         self.layout.addWidget(self.list_widgets[self.layer.id()])
         # FIX 2026-01-18: Ensure list widget is visible after adding to layout
@@ -1392,20 +1418,16 @@ class QgsCheckableComboBoxFeaturesListPickerWidget(QWidget):
         self.updateGeometry()
 
     def select_all(self, x):
-        """Select all items based on action type."""
+        """Select all items based on action type.
+
+        Listed rows are read from the layer with its subset applied, so they
+        all belong to the subset and 'Select All (non subset)' checks nothing.
+        """
         if not is_layer_valid(self.layer) or self.layer.id() not in self.list_widgets:
             return
 
-        list_widget = self.list_widgets[self.layer.id()]
-        for i in range(list_widget.count()):
-            item = list_widget.item(i)
-            if item:
-                if x == 'Select All':
-                    item.setCheckState(Qt.Checked)
-                elif x == 'Select All (subset)' and item.data(4) == "True":
-                    item.setCheckState(Qt.Checked)
-                elif x == 'Select All (non subset)' and item.data(4) == "False":
-                    item.setCheckState(Qt.Checked)
+        if x in ('Select All', 'Select All (subset)'):
+            self.list_widgets[self.layer.id()].feature_model.checkAll(True)
 
         self._emit_checked_items_update()
 
@@ -1415,15 +1437,8 @@ class QgsCheckableComboBoxFeaturesListPickerWidget(QWidget):
             return
 
         list_widget = self.list_widgets[self.layer.id()]
-        for i in range(list_widget.count()):
-            item = list_widget.item(i)
-            if item:
-                if x == 'De-select All':
-                    item.setCheckState(Qt.Unchecked)
-                elif x == 'De-select All (subset)' and item.data(4) == "True":
-                    item.setCheckState(Qt.Unchecked)
-                elif x == 'De-select All (non subset)' and item.data(4) == "False":
-                    item.setCheckState(Qt.Unchecked)
+        if x in ('De-select All', 'De-select All (subset)'):
+            list_widget.feature_model.checkAll(False)
 
         # Clear selected_features_list in the wrapper
         list_widget.setSelectedFeaturesList([])
@@ -1444,26 +1459,10 @@ class QgsCheckableComboBoxFeaturesListPickerWidget(QWidget):
         list_widget = self.list_widgets[self.layer.id()]
         list_widget.setFilterText(self.filter_txt)
 
-        filter_lower = self.filter_txt.lower()
-        visible_count = 0
+        list_widget.feature_model.setFilterText(self.filter_txt)
 
-        for i in range(list_widget.count()):
-            item = list_widget.item(i)
-            if item:
-                if not filter_lower or filter_lower in item.text().lower():
-                    item.setHidden(False)
-                    visible_count += 1
-                else:
-                    item.setHidden(True)
-
-        # Update visible features list
-        visible_features = []
-        for i in range(list_widget.count()):
-            item = list_widget.item(i)
-            if item and not item.isHidden():
-                visible_features.append([item.data(0), item.data(3)])
-
-        list_widget.setVisibleFeaturesList(visible_features)
+        # Visible features now follow the model filter (see getVisibleFeaturesList)
+        list_widget.setVisibleFeaturesList(None)
 
         # FIX 2026-01-19 v4: Force visual refresh after filtering
         list_widget.viewport().update()
@@ -1496,11 +1495,7 @@ class QgsCheckableComboBoxFeaturesListPickerWidget(QWidget):
                 self.deselect_all('De-select All')
             else:
                 # Silent deselect - also clear items_le since we're not calling _emit_checked_items_update
-                list_widget = self.list_widgets[self.layer.id()]
-                for i in range(list_widget.count()):
-                    item = list_widget.item(i)
-                    if item:
-                        item.setCheckState(Qt.Unchecked)
+                self.list_widgets[self.layer.id()].feature_model.checkAll(False)
                 self.items_le.clear()
             return 0
 
@@ -1546,15 +1541,7 @@ class QgsCheckableComboBoxFeaturesListPickerWidget(QWidget):
         if not is_layer_valid(self.layer) or self.layer.id() not in self.list_widgets:
             return []
 
-        feature_ids = []
-        list_widget = self.list_widgets[self.layer.id()]
-
-        for i in range(list_widget.count()):
-            item = list_widget.item(i)
-            if item and item.checkState() == Qt.Checked:
-                feature_ids.append(item.data(3))
-
-        return feature_ids
+        return self.list_widgets[self.layer.id()].getCheckedFeatureIds()
 
 
 __all__ = [
@@ -0,0 +1,581 @@
+# -*- coding: utf-8 -*-
+"""
+Lazily-paged feature list model for the multiple selection picker.
+
+The picker used to create one QListWidgetItem per feature after a full
+synchronous scan and a Python sort, which froze the dock on large layers.
+This module splits that work in three:
+
+- FeatureListStore: plain-Python row storage. Rows are (display, key)
+  tuples, checked state is a set of keys, and a text filter is an index
+  list over the rows, answered by a FeatureSearchIndex when one is
+  attached. No Qt, so it is unit-testable.
+- FeatureListModel: QAbstractListModel over a store. Rows are exposed to
+  the view in pages through canFetchMore()/fetchMore(), so the view only
+  ever lays out what has been scrolled to.
+- FeatureListLoadTask: QgsTask that evaluates display values on a worker
+  thread from a QgsVectorLayerFeatureSource. Ordering is delegated to the
+  provider with QgsFeatureRequest.addOrderBy() (compiled to ORDER BY on
+  PostgreSQL, Spatialite and GeoPackage; QGIS sorts locally otherwise).
+  Rows are streamed back in chunks, the first one page-sized so the list
+  shows up before the scan completes. On large layers the task also
+  builds the search index of the display values.
+
+Edited display values are applied to the rows and the index in place
+(read_feature_displays() + FeatureListModel.updateDisplays()); the
+picker reloads the list when features are added or deleted.
+
+v4.2.0 - Virtualized feature picker (October 2026)
+"""
+
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from qgis.PyQt.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QObject,
+    Qt,
+    pyqtSignal
+)
+from qgis.PyQt.QtGui import QBrush
+from qgis.core import (
+    QgsExpression,
+    QgsExpressionContext,
+    QgsExpressionContextUtils,
+    QgsFeatureRequest,
+    QgsTask,
+    QgsVectorLayerFeatureSource
+)
+
+from .feature_search_index import FeatureSearchIndex
+
+logger = logging.getLogger('FilterMate.UI.Widgets.FeatureListModel')
+
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+# Rows handed to the view per fetchMore() call
+FEATURE_LIST_PAGE_SIZE = 500
+
+# Rows per chunk streamed from the load task (the first chunk is one page)
+FEATURE_LIST_LOAD_CHUNK = 5000
+
+# Layers with fewer features are filtered by a plain scan, without index
+FEATURE_SEARCH_INDEX_MIN_ROWS = 10000
+
+# Legacy item data roles, kept so existing callers reading item.data(3) /
+# item.data(4) keep working against the model
+PK_ROLE = 3
+SUBSET_ROLE = 4
+
+
+# =============================================================================
+# Storage
+# =============================================================================
+
+class FeatureListStore:
+    """
+    Row storage, paging cursor, text filter and checked keys.
+
+    Keys are normalized so ``5``, ``5.0`` and ``"5"`` match on numeric
+    primary keys and everything compares as text otherwise.
+    """
+
+    def __init__(self, numeric_keys: bool = True):
+        self.numeric_keys = numeric_keys
+        self.rows: List[Tuple[str, Any]] = []
+        self.checked = set()
+        self.loaded = 0
+        self.filter_text = ''
+        self.index: Optional[FeatureSearchIndex] = None
+        self._view: Optional[List[int]] = None
+
+    # -------------------------------------------------------------------------
+    # Keys
+    # -------------------------------------------------------------------------
+
+    def key(self, value):
+        """Normalize a primary key value for checked-state lookups."""
+        if value is None:
+            return None
+        if self.numeric_keys and not isinstance(value, bool):
+            try:
+                number = float(value)
+                return int(number) if number.is_integer() else number
+            except (TypeError, ValueError):
+                pass
+        return str(value)
+
+    # -------------------------------------------------------------------------
+    # Rows and paging
+    # -------------------------------------------------------------------------
+
+    def reset(self) -> None:
+        """Drop rows, index and paging state; checked keys are kept."""
+        self.rows = []
+        self.index = None
+        self.loaded = 0
+        self._view = [] if self.filter_text else None
+
+    def append(self, rows: Iterable[Tuple[str, Any]]) -> None:
+        """Append (display, key) rows in load order."""
+        start = len(self.rows)
+        self.rows.extend(rows)
+        if self.index is not None:
+            self.index.add(display for display, _ in self.rows[start:])
+        if self._view is not None:
+            needle = self.filter_text
+            self._view.extend(
+                i for i in range(start, len(self.rows))
+                if needle in self.rows[i][0].lower()
+            )
+
+    def update_displays(self, displays: Dict[Any, str]) -> List[int]:
+        """Replace the display text of the rows whose key is in ``displays``.
+
+        The search index is updated in place. Returns the changed rows.
+        """
+        changed = []
+        for row, (old, key) in enumerate(self.rows):
+            display = displays.get(key)
+            if display is None or display == old:
+                continue
+            self.rows[row] = (display, key)
+            if self.index is not None:
+                self.index.update(row, display)
+            changed.append(row)
+        return changed
+
+    def sort(self, key: Callable, reverse: bool = False) -> None:
+        """Re-order the rows and rebuild the index and filter over the new order."""
+        self.rows.sort(key=key, reverse=reverse)
+        if self.index is not None:
+            # Index rows are list positions
+            self.index = FeatureSearchIndex(self.index.gram_size)
+            self.index.add(display for display, _ in self.rows)
+        self.set_filter(self.filter_text)
+
+    def attach_index(self, index: FeatureSearchIndex) -> bool:
+        """Use ``index`` for text filters if it covers exactly the current rows."""
+        if len(index) != len(self.rows):
+            return False
+        self.index = index
+        return True
+
+    def visible_count(self) -> int:
+        """Rows matching the filter, loaded into the view or not."""
+        return len(self.rows) if self._view is None else len(self._view)
+
+    def can_fetch_more(self) -> bool:
+        return self.loaded < self.visible_count()
+
+    def fetch_more(self, page_size: int = FEATURE_LIST_PAGE_SIZE) -> Tuple[int, int]:
+        """Advance the paging cursor; returns the (first, last) new rows."""
+        first = self.loaded
+        self.loaded = min(self.visible_count(), self.loaded + max(1, page_size))
+        return first, self.loaded - 1
+
+    def row(self, position: int) -> Tuple[str, Any]:
+        """(display, key) at a view position."""
+        if self._view is not None:
+            position = self._view[position]
+        return self.rows[position]
+
+    def visible_rows(self) -> List[Tuple[str, Any]]:
+        """All rows matching the filter, in order."""
+        if self._view is None:
+            return list(self.rows)
+        return [self.rows[i] for i in self._view]
+
+    def set_filter(self, text: str) -> None:
+        """Restrict the view to rows whose display contains ``text``."""
+        self.filter_text = (text or '').lower()
+        if self.filter_text and self.index is not None:
+            self._view = self.index.search(self.filter_text)
+        elif self.filter_text:
+            needle = self.filter_text
+            self._view = [i for i, (display, _) in enumerate(self.rows) if needle in display.lower()]
+        else:
+            self._view = None
+        self.loaded = 0
+
+    # -------------------------------------------------------------------------
+    # Checked state
+    # -------------------------------------------------------------------------
+
+    def is_checked(self, position: int) -> bool:
+        return self.row(position)[1] in self.checked
+
+    def toggle(self, position: int) -> bool:
+        """Flip the checked state of a view row; returns the new state."""
+        key = self.row(position)[1]
+        if key in self.checked:
+            self.checked.discard(key)
+            return False
+        self.checked.add(key)
+        return True
+
+    def set_checked(self, values: Iterable, exclusive: bool = True) -> int:
+        """Check ``values`` (unchecking the rest if exclusive).
+
+        Returns:
+            int: Number of known rows that end up checked from ``values``
+        """
+        keys = {self.key(v) for v in values}
+        keys.discard(None)
+        if exclusive:
+            self.checked = keys
+        else:
+            self.checked |= keys
+        return sum(1 for _, key in self.rows if key in keys)
+
+    def check_all(self, checked: bool = True) -> None:
+        """Check or uncheck every known row."""
+        if checked:
+            self.checked.update(key for _, key in self.rows)
+        else:
+            self.checked.clear()
+
+    def checked_rows(self) -> List[Tuple[str, Any]]:
+        """Checked (display, key) rows in list order.
+
+        Keys checked before their row was loaded are appended with their
+        key as display text.
+        """
+        found = [(display, key) for display, key in self.rows if key in self.checked]
+        if len(found) < len(self.checked):
+            seen = {key for _, key in found}
+            found.extend((str(key), key) for key in self.checked if key not in seen)
+        return found
+
+
+# =============================================================================
+# Qt model
+# =============================================================================
+
+class FeatureListModel(QAbstractListModel):
+    """
+    Checkable, lazily-paged list model over a FeatureListStore.
+
+    Args:
+        font_by_state: Picker font/colour table ('checked'/'unChecked')
+        numeric_keys: Whether primary keys are numeric
+        page_size: Rows added to the view per fetchMore()
+    """
+
+    checkedChanged = pyqtSignal()
+
+    def __init__(self, font_by_state=None, numeric_keys=True, page_size=FEATURE_LIST_PAGE_SIZE, parent=None):
+        super().__init__(parent)
+        self.store = FeatureListStore(numeric_keys)
+        self.font_by_state = font_by_state or {}
+        self.page_size = page_size
+        self.generation = 0
+        self.loading = False
+
+    # -------------------------------------------------------------------------
+    # QAbstractListModel interface
+    # -------------------------------------------------------------------------
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.store.loaded
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self.store.can_fetch_more()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self.store.can_fetch_more():
+            return
+        first = self.store.loaded
+        last = min(self.store.visible_count(), first + self.page_size) - 1
+        self.beginInsertRows(QModelIndex(), first, last)
+        self.store.fetch_more(self.page_size)
+        self.endInsertRows()
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self.store.loaded:
+            return None
+        display, key = self.store.row(index.row())
+        if role == Qt.DisplayRole:
+            return display
+        if role == Qt.CheckStateRole:
+            return Qt.Checked if key in self.store.checked else Qt.Unchecked
+        if role == PK_ROLE:
+            return key
+        if role == SUBSET_ROLE:
+            # Rows are read from the layer with its subset applied
+            return "True"
+        if role in (Qt.FontRole, Qt.ForegroundRole):
+            state = 'checked' if key in self.store.checked else 'unChecked'
+            style = self.font_by_state.get(state)
+            if style is None:
+                return None
+            return style[0] if role == Qt.FontRole else QBrush(style[1])
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid():
+            return False
+        if (value == Qt.Checked) != self.store.is_checked(index.row()):
+            self.toggleRow(index.row())
+        return True
+
+    # -------------------------------------------------------------------------
+    # Rows
+    # -------------------------------------------------------------------------
+
+    def beginLoad(self) -> int:
+        """Clear rows for a new load; returns the load generation."""
+        self.beginResetModel()
+        self.store.reset()
+        self.generation += 1
+        self.loading = True
+        self.endResetModel()
+        return self.generation
+
+    def appendRows(self, rows, generation: int) -> None:
+        """Add loaded rows; rows from a superseded load are ignored."""
+        if generation != self.generation:
+            return
+        self.store.append(rows)
+        # Fill the first page as soon as rows arrive; later pages are
+        # pulled by the view through fetchMore() while scrolling
+        if self.store.loaded < self.page_size and self.store.can_fetch_more():
+            self.fetchMore()
+
+    def attachIndex(self, index, generation: int) -> None:
+        """Take over the search index built by the load of ``generation``."""
+        if generation == self.generation and not self.store.attach_index(index):
+            logger.debug("Search index does not match the loaded rows, filtering by scan")
+
+    def endLoad(self, generation: int) -> None:
+        if generation == self.generation:
+            self.loading = False
+
+    def setFilterText(self, text: str) -> None:
+        self.beginResetModel()
+        self.store.set_filter(text)
+        self.store.fetch_more(self.page_size)
+        self.endResetModel()
+
+    def sortRows(self, key, reverse: bool = False) -> None:
+        """Re-order the loaded rows (the view restarts at the first page)."""
+        self.beginResetModel()
+        self.store.sort(key, reverse)
+        self.store.fetch_more(self.page_size)
+        self.endResetModel()
+
+    def updateDisplays(self, displays) -> None:
+        """Show new display text for edited features, keyed like the rows."""
+        changed = self.store.update_displays(displays)
+        if not changed:
+            return
+        if self.store.filter_text:
+            # Edited rows may enter or leave the filtered view
+            self.setFilterText(self.store.filter_text)
+        elif changed[0] < self.store.loaded:
+            last = min(changed[-1], self.store.loaded - 1)
+            self.dataChanged.emit(self.index(changed[0], 0), self.index(last, 0), [Qt.DisplayRole])
+
+    # -------------------------------------------------------------------------
+    # Checked state
+    # -------------------------------------------------------------------------
+
+    def toggleRow(self, row: int) -> bool:
+        state = self.store.toggle(row)
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole, Qt.FontRole, Qt.ForegroundRole])
+        self.checkedChanged.emit()
+        return state
+
+    def setCheckedKeys(self, values, exclusive: bool = True) -> int:
+        count = self.store.set_checked(values, exclusive)
+        self._checked_state_changed()
+        return count
+
+    def checkAll(self, checked: bool = True) -> None:
+        self.store.check_all(checked)
+        self._checked_state_changed()
+
+    def _checked_state_changed(self) -> None:
+        if self.store.loaded:
+            self.dataChanged.emit(
+                self.index(0, 0), self.index(self.store.loaded - 1, 0),
+                [Qt.CheckStateRole, Qt.FontRole, Qt.ForegroundRole]
+            )
+        self.checkedChanged.emit()
+
+
+# =============================================================================
+# Background load
+# =============================================================================
+
+def read_feature_displays(layer, fids, display_expression, identifier_field, store_key) -> Dict[Any, str]:
+    """
+    Display text of some features, keyed like the picker rows.
+
+    Used on the main thread for edited features, with the same display
+    rules as FeatureListLoadTask. Features that no longer exist are
+    skipped.
+    """
+    expression = QgsExpression(display_expression)
+    field_name = None
+    context = None
+    if expression.isField() or layer.fields().indexFromName(display_expression) >= 0:
+        field_name = display_expression.replace('"', '') if expression.isField() else display_expression
+    else:
+        context = QgsExpressionContext()
+        context.appendScopes(QgsExpressionContextUtils.globalProjectLayerScopes(layer))
+        expression.prepare(context)
+
+    request = QgsFeatureRequest()
+    request.setFilterFids(list(fids))
+    request.setFlags(QgsFeatureRequest.NoGeometry)
+    displays = {}
+    for feature in layer.getFeatures(request):
+        raw_key = feature[identifier_field] if identifier_field else feature.id()
+        if context is not None:
+            context.setFeature(feature)
+            display = expression.evaluate(context)
+        else:
+            display = feature[field_name]
+        displays[store_key(raw_key)] = str(display)
+    return displays
+
+
+class FeatureListLoadSignals(QObject):
+    """Signals for FeatureListLoadTask (delivered on the main thread)."""
+
+    # Args: (rows: list of (display, key), generation: int)
+    rowsReady = pyqtSignal(list, int)
+
+    # Args: (index: FeatureSearchIndex, generation: int)
+    indexReady = pyqtSignal(object, int)
+
+    # Args: (generation: int, total_rows: int)
+    loadFinished = pyqtSignal(int, int)
+
+
+class FeatureListLoadTask(QgsTask):
+    """
+    Evaluate display values for the feature picker on a worker thread.
+
+    The feature source and the expression context are created in the
+    constructor (main thread); run() only reads them. The search index is
+    filled on the worker thread and handed to the model from finished().
+    """
+
+    def __init__(self, layer, display_expression, identifier_field, store_key,
+                 generation, ascending=True, chunk_size=FEATURE_LIST_LOAD_CHUNK,
+                 first_chunk_size=FEATURE_LIST_PAGE_SIZE):
+        """
+        Args:
+            layer: QgsVectorLayer to list
+            display_expression: Field name or expression for display text
+            identifier_field: Primary key field (None = feature id)
+            store_key: Key normalizer (FeatureListStore.key)
+            generation: Model load generation the rows belong to
+            ascending: Sort order of the display values
+            chunk_size: Rows per rowsReady emission
+            first_chunk_size: Rows in the first emission
+        """
+        super().__init__(f"FilterMate: listing {layer.name()}", QgsTask.CanCancel)
+        self.signals = FeatureListLoadSignals()
+        self.layer_id = layer.id()
+        self.generation = generation
+        self.identifier_field = identifier_field
+        self.store_key = store_key
+        self.chunk_size = chunk_size
+        self.first_chunk_size = first_chunk_size
+        self.total_rows = 0
+        self.exception = None
+
+        self._source = QgsVectorLayerFeatureSource(layer)
+        self._total = max(0, layer.featureCount())
+        self.index = FeatureSearchIndex() if self._total >= FEATURE_SEARCH_INDEX_MIN_ROWS else None
+
+        fields = layer.fields()
+        expression = QgsExpression(display_expression)
+        self._field_name = None
+        self._expression = None
+        if expression.isField() or fields.indexFromName(display_expression) >= 0:
+            self._field_name = display_expression.replace('"', '') if expression.isField() else display_expression
+        else:
+            self._expression = expression
+            self._context = QgsExpressionContext()
+            self._context.appendScopes(QgsExpressionContextUtils.globalProjectLayerScopes(layer))
+            self._expression.prepare(self._context)
+
+        self.request = QgsFeatureRequest()
+        self.request.setFlags(QgsFeatureRequest.NoGeometry)
+        attributes = set()
+        if self._expression is not None:
+            attributes.update(self._expression.referencedColumns())
+        elif self._field_name:
+            attributes.add(self._field_name)
+        if identifier_field:
+            attributes.add(identifier_field)
+        if QgsFeatureRequest.ALL_ATTRIBUTES not in attributes:
+            self.request.setSubsetOfAttributes(
+                [name for name in attributes if fields.indexFromName(name) >= 0], fields
+            )
+        order_expression = QgsExpression.quotedColumnRef(self._field_name) if self._field_name else display_expression
+        self.request.addOrderBy(order_expression, ascending)
+
+    def run(self):
+        try:
+            chunk = []
+            limit = self.first_chunk_size
+            for feature in self._source.getFeatures(self.request):
+                if self.isCanceled():
+                    return False
+                if self.identifier_field:
+                    raw_key = feature[self.identifier_field]
+                else:
+                    raw_key = feature.id()
+                if self._expression is not None:
+                    self._context.setFeature(feature)
+                    display = self._expression.evaluate(self._context)
+                else:
+                    display = feature[self._field_name]
+                chunk.append((str(display), self.store_key(raw_key)))
+
+                if len(chunk) >= limit:
+                    self._emit(chunk)
+                    chunk = []
+                    limit = self.chunk_size
+            if chunk:
+                self._emit(chunk)
+            return True
+        except Exception as e:
+            self.exception = e
+            return False
+
+    def _emit(self, chunk):
+        if self.index is not None:
+            self.index.add(display for display, _ in chunk)
+        self.total_rows += len(chunk)
+        self.signals.rowsReady.emit(chunk, self.generation)
+        if self._total:
+            self.setProgress(min(100.0, self.total_rows * 100.0 / self._total))
+
+    def finished(self, result):
+        if self.exception is not None:
+            logger.warning(f"Feature list load failed for {self.layer_id}: {self.exception}")
+        elif not result:
+            logger.debug(f"Feature list load canceled for {self.layer_id}")
+        elif self.index is not None:
+            self.signals.indexReady.emit(self.index, self.generation)
+        self.signals.loadFinished.emit(self.generation, self.total_rows)
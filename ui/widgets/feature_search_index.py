@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+In-memory search index over the display values of a feature list.
+
+The picker filter box used to test every row with ``needle in
+display.lower()`` on each keystroke. On a 1M row list that scan alone is
+longer than the debounce delay. FeatureSearchIndex answers the same
+"contains" query from:
+
+- a trigram posting index (gram -> ascending array of rows). The rows of
+  the rarest trigram of the query are the candidates, and only those are
+  verified against the lowered text.
+- the result of the previous query: typing usually extends the filter
+  text, and the new matches are a subset of the previous ones.
+- a small cache for 1-2 character queries, which have no trigram of
+  their own.
+- a sorted array of the lowered values for prefix queries (bisect).
+
+With NumPy, posting arrays are combined as boolean row masks: queries of
+up to three characters are answered exactly from the postings of the
+trigrams that contain them, and longer queries only verify the rows
+present in every posting. Without NumPy, 1-2 character queries scan the
+lowered values and longer queries verify the rarest posting.
+
+Rows are positions in the feature list, so results keep list order. The
+index has no Qt dependency: FeatureListLoadTask builds it on its worker
+thread while it reads the features, then hands it to the store.
+
+v4.2.0 - Feature picker search index (October 2026)
+"""
+
+from array import array
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Dict, Iterable, List
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Length of the indexed n-grams
+SEARCH_GRAM_SIZE = 3
+
+# Results of short (< SEARCH_GRAM_SIZE) queries kept for re-use
+SEARCH_SHORT_QUERY_CACHE = 32
+
+# Above this many previous matches, a narrowing query uses the row masks
+# instead of verifying the previous result row by row
+SEARCH_REFINE_MAX_ROWS = 16384
+
+# Upper bound for prefix queries on the sorted array
+_PREFIX_END = '\U0010ffff'
+
+
+class FeatureSearchIndex:
+    """
+    Substring and prefix search over lowered display values.
+
+    Rows are added in list order with add(); a row can be re-indexed
+    with update() when its display value changes.
+    """
+
+    def __init__(self, gram_size: int = SEARCH_GRAM_SIZE):
+        self.gram_size = gram_size
+        self.texts: List[str] = []
+        self._postings: Dict[str, array] = {}
+        self._sorted_texts: List[str] = []
+        self._sorted_rows: List[int] = []
+        self._sorted_stale = False
+        self._short = OrderedDict()
+        self._last = None
+        # Rows too short to hold a gram (never in any posting)
+        self._gramless: List[int] = []
+
+    def __len__(self):
+        return len(self.texts)
+
+    # -------------------------------------------------------------------------
+    # Maintenance
+    # -------------------------------------------------------------------------
+
+    def _grams(self, text: str):
+        n = self.gram_size
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    def add(self, displays: Iterable[str]) -> None:
+        """Index display values as the next rows of the list."""
+        texts = self.texts
+        postings = self._postings
+        row = len(texts)
+        for display in displays:
+            text = display.lower()
+            texts.append(text)
+            if len(text) < self.gram_size:
+                self._gramless.append(row)
+            for gram in self._grams(text):
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = array('i')
+                posting.append(row)
+            row += 1
+        self._sorted_stale = True
+        self._forget_results()
+
+    def update(self, row: int, display: str) -> None:
+        """Re-index one row after its display value changed."""
+        old = self.texts[row]
+        text = display.lower()
+        if text == old:
+            return
+        if len(old) < self.gram_size:
+            self._gramless.remove(row)
+        if len(text) < self.gram_size:
+            insort(self._gramless, row)
+        old_grams = self._grams(old)
+        new_grams = self._grams(text)
+        for gram in old_grams - new_grams:
+            posting = self._postings[gram]
+            del posting[bisect_left(posting, row)]
+            if not posting:
+                del self._postings[gram]
+        for gram in new_grams - old_grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                posting = self._postings[gram] = array('i')
+            insort(posting, row)
+        self.texts[row] = text
+        self._sorted_stale = True
+        self._forget_results()
+
+    def _forget_results(self) -> None:
+        self._short.clear()
+        self._last = None
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def search(self, text: str) -> List[int]:
+        """Rows whose display contains ``text`` (case-insensitive), in order."""
+        needle = (text or '').lower()
+        texts = self.texts
+        if not needle:
+            return list(range(len(texts)))
+
+        if len(needle) < self.gram_size:
+            cached = self._short.get(needle)
+            if cached is not None:
+                self._short.move_to_end(needle)
+                self._last = (needle, cached)
+                return list(cached)
+
+        last = self._last
+        if NUMPY_AVAILABLE and (last is None or last[0] not in needle or len(last[1]) > SEARCH_REFINE_MAX_ROWS):
+            rows = self._search_masks(needle)
+        else:
+            rows = self._search_postings(needle, last)
+
+        if len(needle) < self.gram_size:
+            self._short[needle] = rows
+            if len(self._short) > SEARCH_SHORT_QUERY_CACHE:
+                self._short.popitem(last=False)
+        self._last = (needle, rows)
+        return list(rows)
+
+    def _search_postings(self, needle: str, last) -> List[int]:
+        """Verify the smallest candidate list: rarest posting or last result."""
+        texts = self.texts
+        candidates = None
+        if len(needle) >= self.gram_size:
+            for gram in self._grams(needle):
+                posting = self._postings.get(gram)
+                if posting is None:
+                    return []
+                if candidates is None or len(posting) < len(candidates):
+                    candidates = posting
+        # Matches of a longer needle are among the matches of the previous one
+        if last is not None and last[0] in needle and (candidates is None or len(last[1]) < len(candidates)):
+            candidates = last[1]
+
+        if candidates is None:
+            return [row for row, value in enumerate(texts) if needle in value]
+        return [row for row in candidates if needle in texts[row]]
+
+    def _search_masks(self, needle: str) -> List[int]:
+        """Combine postings as NumPy row masks, verifying only when inexact."""
+        texts = self.texts
+        if len(needle) <= self.gram_size:
+            # Every occurrence lies inside a trigram window: exact union
+            mask = np.zeros(len(texts), dtype=bool)
+            for gram, posting in self._postings.items():
+                if needle in gram:
+                    mask[np.frombuffer(posting, dtype=np.int32)] = True
+            rows = np.flatnonzero(mask).tolist()
+            if self._gramless:
+                rows.extend(row for row in self._gramless if needle in texts[row])
+                rows.sort()
+            return rows
+
+        postings = []
+        for gram in self._grams(needle):
+            posting = self._postings.get(gram)
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        mask = np.zeros(len(texts), dtype=bool)
+        mask[np.frombuffer(postings[0], dtype=np.int32)] = True
+        other = np.empty_like(mask)
+        for posting in postings[1:]:
+            other.fill(False)
+            other[np.frombuffer(posting, dtype=np.int32)] = True
+            mask &= other
+        return [row for row in np.flatnonzero(mask).tolist() if needle in texts[row]]
+
+    def prefix(self, text: str) -> List[int]:
+        """Rows whose display starts with ``text`` (case-insensitive), in order."""
+        needle = (text or '').lower()
+        if self._sorted_stale:
+            self._sorted_rows = sorted(range(len(self.texts)), key=self.texts.__getitem__)
+            self._sorted_texts = [self.texts[row] for row in self._sorted_rows]
+            self._sorted_stale = False
+        start = bisect_left(self._sorted_texts, needle)
+        end = bisect_left(self._sorted_texts, needle + _PREFIX_END, start)
+        return sorted(self._sorted_rows[start:end])